@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Backfill des vecteurs sparse BM25 dans Qdrant knowbase_chunks_v2 (Layer R).
+
+Les points ingérés avant l'ajout du vecteur sparse `bm25` n'ont pas de
+représentation lexicale : le retriever hybrid retombe alors sur le scroll
+MatchText. Ce script calcule le vecteur sparse depuis le payload `text`.
+
+Une collection créée sans config sparse doit être recréée (--rebuild) :
+Qdrant ne permet pas d'ajouter un vecteur nommé à une collection existante.
+
+Usage:
+    python app/scripts/backfill_layer_r_sparse.py              # update_vectors
+    python app/scripts/backfill_layer_r_sparse.py --rebuild    # recrée la collection (hors trafic)
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recrée la collection si elle n'a pas de vecteur sparse")
+    args = parser.parse_args()
+
+    from knowbase.retrieval.qdrant_layer_r import backfill_layer_r_sparse
+
+    t0 = time.time()
+    n = backfill_layer_r_sparse(batch_size=args.batch_size, rebuild=args.rebuild)
+    logger.info(f"[Backfill] {n} points with sparse BM25 vectors in {time.time() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,18 @@ OUT_DIR = Path("/data/poc_a/structures")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def build_find_in_index(doc_id: str, structure: dict) -> None:
+    """Précalcule l'index find_in (TF-IDF + embeddings mmap) et la forme
+    compacte .v5s (texte lu à la demande) du doc écrit."""
+    try:
+        from knowbase.runtime_v5.section_index import build_section_index
+        from knowbase.runtime_v5.structure_loader import DocumentStructure, write_compact_structure
+        write_compact_structure(structure, OUT_DIR)
+        build_section_index(doc_id, DocumentStructure(structure), structures_dir=OUT_DIR)
+    except Exception as e:
+        print(f"  WARN section index {doc_id[:50]}: {type(e).__name__}: {e}")
+
+
 def section_hash(doc_id: str, page: int, idx: int) -> str:
     h = hashlib.sha1(f"{doc_id}|page{page}|p{idx}".encode("utf-8")).hexdigest()
     return f"sec_{h[:14]}"
@@ -109,6 +121,7 @@ def main():
                     pass
 
             out.write_text(json.dumps(structure, indent=2, ensure_ascii=False), encoding="utf-8")
+            build_find_in_index(doc_id, structure)
             written += 1
             print(f"  ✓ {doc_id[:60]}: {len(structure['sections'])} sections")
         except Exception as e:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Migration blue/green de Qdrant knowbase_chunks_v2 (Layer R) vers un profil.
+
+Construit knowbase_chunks_v2__{profile}_{ts} depuis la collection servie,
+mesure le recall@k contre elle et bascule l'alias knowbase_chunks_v2.
+Profils : float32 (historique), int8, binary (cf retrieval/layer_r_profiles.py).
+
+Usage:
+    python app/scripts/migrate_layer_r_collection.py --profile int8 --dry-run
+    python app/scripts/migrate_layer_r_collection.py --profile int8 --legacy-cutover   # 1re migration
+    python app/scripts/migrate_layer_r_collection.py --profile binary --min-recall 0.9 --drop-old
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", required=True, choices=["float32", "int8", "binary"])
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--dry-run", action="store_true", help="Construit + mesure sans basculer l'alias")
+    parser.add_argument("--legacy-cutover", action="store_true",
+                        help="Remplace la collection physique knowbase_chunks_v2 par l'alias")
+    parser.add_argument("--drop-old", action="store_true", help="Supprime l'ancienne collection après bascule")
+    args = parser.parse_args()
+
+    from knowbase.retrieval.layer_r_migration import migrate_layer_r_collection
+
+    report = migrate_layer_r_collection(
+        args.profile,
+        batch_size=args.batch_size,
+        k=args.k,
+        n_queries=args.n_queries,
+        min_recall=args.min_recall,
+        switch=not args.dry_run,
+        legacy_cutover=args.legacy_cutover,
+        drop_old=args.drop_old,
+    )
+    print(json.dumps(report.to_dict(), indent=2))
+    return 0 if report.switched or args.dry_run else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
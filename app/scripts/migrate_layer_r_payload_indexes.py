@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Ajoute les payload indexes Layer R manquants à une collection existante.
+
+Les collections créées avant le layout partitionné n'indexent que
+axis_release_id/axis_version (+ text) : chaque filtre tenant_id / doc_id
+(recherche, delete_doc_from_layer_r) parcourt alors tout le payload. Ce
+script crée les indexes keyword manquants (tenant_id en partition tenant,
+doc_id, chunk_id, kind, section_id) sur la collection physique servie.
+Idempotent, sans interruption de service (Qdrant indexe en arrière-plan).
+
+Usage:
+    python app/scripts/migrate_layer_r_payload_indexes.py
+    python app/scripts/migrate_layer_r_payload_indexes.py --collection knowbase_chunks_v2__int8_20260101000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collection", default=None,
+                        help="Collection physique (défaut : cible de l'alias Layer R)")
+    args = parser.parse_args()
+
+    from knowbase.common.clients.qdrant_client import get_qdrant_client
+    from knowbase.retrieval.qdrant_layer_r import ensure_payload_indexes, resolve_layer_r_collection
+
+    client = get_qdrant_client()
+    collection = args.collection or resolve_layer_r_collection(client)
+    created = ensure_payload_indexes(collection, client=client)
+    logger.info(f"[Migration] {collection}: {len(created)} index(es) created {created}")
+
+    schema = client.get_collection(collection).payload_schema or {}
+    for field_name, info in sorted(schema.items()):
+        params = getattr(info, "params", None)
+        tenant = " (tenant)" if getattr(params, "is_tenant", False) else ""
+        logger.info(f"[Migration]   {field_name}: {info.data_type}{tenant} points={info.points}")
+
+
+if __name__ == "__main__":
+    main()
@@ -36,6 +36,18 @@ from pathlib import Path
 OUT_DIR = Path("/app/data/poc_a/structures")
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+
+def build_find_in_index(doc_id: str, structure: dict) -> None:
+    """Précalcule l'index find_in (TF-IDF + embeddings mmap) et la forme
+    compacte .v5s (texte lu à la demande) du doc écrit."""
+    try:
+        from knowbase.runtime_v5.section_index import build_section_index
+        from knowbase.runtime_v5.structure_loader import DocumentStructure, write_compact_structure
+        write_compact_structure(structure, OUT_DIR)
+        build_section_index(doc_id, DocumentStructure(structure), structures_dir=OUT_DIR)
+    except Exception as e:
+        print(f"  WARN section index {doc_id[:50]}: {type(e).__name__}: {e}")
+
 # Mapping doc_id (KG) → fichier PDF
 # Étendu à TOUS les PDFs aerospace pour bench Robustness 170q complet
 # doc_id construit comme: <stem>_<hash> où hash est le suffixe du hash Qdrant existant
@@ -205,6 +217,7 @@ def main():
             with open(out_file, "w", encoding="utf-8") as f:
                 json.dump(structure, f, indent=2, ensure_ascii=False)
             print(f"  Saved → {out_file}")
+            build_find_in_index(doc_id, structure)
         except Exception as e:
             print(f"  ERROR: {type(e).__name__}: {e}")
             import traceback
@@ -0,0 +1,184 @@
+"""
+Bench du fallback fuzzy de l'AnchorResolverV2 (Pass 1.3b) : FuzzyAnchorIndex vs scan complet.
+
+Document synthétique de N DocItems (phrases de 8 à 60 mots) et A assertions :
+- 1/3 extraits exacts d'un DocItem           (match exact)
+- 1/3 DocItems bruités (~5 % de caractères)   (fuzzy >= 0.85 attendu)
+- 1/3 phrases sans rapport                    (échec)
+
+Mesure :
+- resolve_s / brute_resolve_s   : _resolve_by_text_search sur les A assertions
+- mapping_s / brute_mapping_s   : build_chunk_to_docitem_mapping (chunks = C regroupements
+                                  de DocItems voisins, texte éventuellement bruité)
+- ratio_calls                   : appels à SequenceMatcher.ratio() côté index
+- identical                     : égalité stricte des ancrages et du mapping
+
+Le scan complet d'origine ne tourne que sur --brute-sample assertions / chunks ;
+ses temps sont extrapolés à A et C (identical porte sur l'échantillon).
+
+Usage:
+    python benchmark/bench_anchor_resolver_fuzzy.py
+    python benchmark/bench_anchor_resolver_fuzzy.py --docitems 1000 --assertions 300 --chunks 200 --brute-sample 300
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from knowbase.stratified.models import DocItem, DocItemType  # noqa: E402
+from knowbase.stratified.pass1.anchor_resolver import (  # noqa: E402
+    AnchorResolverV2,
+    build_chunk_to_docitem_mapping,
+)
+from knowbase.stratified.models import AssertionType  # noqa: E402
+from knowbase.stratified.pass1.assertion_extractor import RawAssertion  # noqa: E402
+from knowbase.stratified.pass1.fuzzy_anchor_index import FuzzyAnchorIndex  # noqa: E402
+
+WORDS = (
+    "system data process configuration module service integration security user "
+    "access role authorization transaction database table field value report "
+    "analytics cloud platform application interface workflow approval document "
+    "invoice payment order customer supplier material plant warehouse delivery "
+    "the a of to and in for with on by is are must should can will be this that"
+).split()
+
+
+def sentence(rng, n_min=8, n_max=60):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(n_min, n_max))).capitalize() + "."
+
+
+def perturb(rng, text, rate=0.05):
+    chars = list(text)
+    for i in range(len(chars)):
+        if rng.random() < rate:
+            chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(chars)
+
+
+def brute_text_search(resolver, assertion):
+    """_resolve_by_text_search d'origine : scan complet de tous les DocItems."""
+    best_match, best_score = None, 0
+    for docitem_id, docitem in resolver.docitems.items():
+        span = resolver._find_span_in_docitem(assertion.text, docitem)
+        if span:
+            return docitem_id, span
+        score = SequenceMatcher(None, assertion.text, docitem.text).ratio()
+        if score > best_score:
+            best_score, best_match = score, docitem_id
+    if best_score >= resolver.FUZZY_THRESHOLD and best_match:
+        return best_match, (0, min(len(assertion.text), len(resolver.docitems[best_match].text)))
+    return None
+
+
+def brute_mapping(chunks, docitems):
+    mapping = {}
+    for chunk_id, chunk_text in chunks.items():
+        found = []
+        for docitem_id, docitem in docitems.items():
+            if docitem_id in chunk_id:
+                found.append(docitem_id)
+            elif chunk_text and docitem.text:
+                if chunk_text in docitem.text or docitem.text in chunk_text:
+                    found.append(docitem_id)
+                elif SequenceMatcher(None, chunk_text, docitem.text).ratio() > 0.8:
+                    found.append(docitem_id)
+        mapping[chunk_id] = found
+    return mapping
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docitems", type=int, default=1000)
+    parser.add_argument("--assertions", type=int, default=300)
+    parser.add_argument("--chunks", type=int, default=200)
+    parser.add_argument("--brute-sample", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    docitems = {}
+    for n in range(args.docitems):
+        docitem_id = f"di_{n:05d}"
+        docitems[docitem_id] = DocItem(
+            docitem_id=docitem_id, type=DocItemType.PARAGRAPH, text=sentence(rng),
+            char_start=0, char_end=0, order=n, section_id=f"s{n // 20}",
+        )
+    texts = [d.text for d in docitems.values()]
+
+    assertions = []
+    for n in range(args.assertions):
+        source = rng.choice(texts)
+        kind = n % 3
+        if kind == 0:
+            words = source.split()
+            start = rng.randint(0, max(0, len(words) - 5))
+            text = " ".join(words[start:start + 5])
+        elif kind == 1:
+            text = perturb(rng, source)
+        else:
+            text = sentence(rng)
+        assertions.append(RawAssertion(
+            assertion_id=f"a{n}", text=text, assertion_type=AssertionType.DEFINITIONAL,
+            chunk_id="unmapped", start_char=0, end_char=len(text), confidence=0.9,
+        ))
+
+    chunks = {}
+    for n in range(args.chunks):
+        start = rng.randrange(len(texts))
+        text = " ".join(texts[start:start + rng.randint(1, 3)])
+        chunks[f"chunk_{n}"] = perturb(rng, text, rate=0.02) if n % 2 else text
+
+    resolver = AnchorResolverV2()
+    resolver.set_context({}, docitems, chunks)
+
+    t0 = time.perf_counter()
+    fast = []
+    for assertion in assertions:
+        result = resolver._resolve_by_text_search(assertion)
+        fast.append((result.anchor.docitem_id, (result.anchor.span_start, result.anchor.span_end))
+                    if result.success else None)
+    resolve_s = time.perf_counter() - t0
+    ratio_calls = resolver._get_fuzzy_index().ratio_calls
+
+    sample = min(args.brute_sample, len(assertions))
+    t0 = time.perf_counter()
+    brute = [brute_text_search(resolver, a) for a in assertions[:sample]]
+    brute_resolve_s = (time.perf_counter() - t0) * len(assertions) / max(1, sample)
+
+    t0 = time.perf_counter()
+    mapping = build_chunk_to_docitem_mapping(chunks, docitems, FuzzyAnchorIndex(docitems))
+    mapping_s = time.perf_counter() - t0
+
+    sample_chunks = dict(list(chunks.items())[:args.brute_sample])
+    t0 = time.perf_counter()
+    expected_mapping = brute_mapping(sample_chunks, docitems)
+    brute_mapping_s = (time.perf_counter() - t0) * len(chunks) / max(1, len(sample_chunks))
+
+    results = {
+        "docitems": args.docitems,
+        "assertions": args.assertions,
+        "chunks": args.chunks,
+        "resolved": sum(1 for r in fast if r),
+        "resolve_s": round(resolve_s, 3),
+        "brute_resolve_s": round(brute_resolve_s, 3),
+        "ratio_calls": ratio_calls,
+        "mapping_s": round(mapping_s, 3),
+        "brute_mapping_s": round(brute_mapping_s, 3),
+        "brute_sample": sample,
+        "identical": fast[:sample] == brute
+        and all(mapping[chunk_id] == found for chunk_id, found in expected_mapping.items()),
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Bench du blocking lexical CorpusER : similarity join vs scan O(K²).
+
+Mesure, pour K lex_keys synthétiques (5k -> 100k) :
+- join_s          : wallclock du LexKeySimilarityJoin (buckets de longueur + filtre vectorisé + vérif JW)
+- pairs_in_window : paires dans la fenêtre de longueur (filtre vectorisé)
+- pairs_verified  : paires vérifiées avec lex_score
+- pairs_matched   : paires >= 0.85
+- brute_s         : wallclock du double-boucle d'origine (uniquement si K <= --brute-max,
+                    sinon extrapolé depuis un échantillon)
+- identical       : égalité des paires (quand le brute force a tourné)
+
+Usage:
+    python benchmark/bench_corpus_er_similarity_join.py
+    python benchmark/bench_corpus_er_similarity_join.py --sizes 5000 20000 --brute-max 5000
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from knowbase.consolidation.lex_utils import compute_lex_key, lex_score  # noqa: E402
+from knowbase.consolidation.similarity_join import LexKeySimilarityJoin  # noqa: E402
+
+
+VOCAB_SIZE = 3000
+
+# Fréquences des lettres (anglais/français) : une distribution uniforme serait
+# irréaliste et pénaliserait artificiellement le prefix filtering.
+LETTER_FREQ = {
+    "e": 12.7, "t": 9.1, "a": 8.2, "o": 7.5, "i": 7.0, "n": 6.7, "s": 6.3,
+    "h": 6.1, "r": 6.0, "d": 4.3, "l": 4.0, "c": 2.8, "u": 2.8, "m": 2.4,
+    "w": 2.4, "f": 2.2, "g": 2.0, "y": 2.0, "p": 1.9, "b": 1.5, "v": 1.0,
+    "k": 0.8, "j": 0.15, "x": 0.15, "q": 0.1, "z": 0.07,
+}
+
+
+def make_vocab(rng):
+    letters = list(LETTER_FREQ)
+    weights = list(LETTER_FREQ.values())
+    words = set()
+    while len(words) < VOCAB_SIZE:
+        n = rng.randint(3, 11)
+        words.add("".join(rng.choices(letters, weights=weights, k=n)))
+    return sorted(words)
+
+
+def make_keys(k, seed=42):
+    """Noms de concepts synthétiques (1-4 mots) avec variantes typographiques."""
+    rng = random.Random(seed)
+    vocab = make_vocab(rng)
+    keys = set()
+    while len(keys) < k:
+        name = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 4)))
+        r = rng.random()
+        if r < 0.15 and len(name) > 4:
+            pos = rng.randrange(len(name))
+            name = name[:pos] + rng.choice(string.ascii_lowercase) + name[pos + 1:]
+        elif r < 0.25:
+            name = name + "s"
+        key = compute_lex_key(name)
+        if key:
+            keys.add(key)
+    return sorted(keys)
+
+
+def brute_force(keys, threshold=0.85, max_len_diff=5):
+    pairs = []
+    for i, key_a in enumerate(keys):
+        for j in range(i + 1, len(keys)):
+            key_b = keys[j]
+            if abs(len(key_a) - len(key_b)) > max_len_diff:
+                continue
+            if lex_score(key_a, key_b) >= threshold:
+                pairs.append((i, j))
+    return pairs
+
+
+def brute_force_estimate(keys, sample=2000, seed=7):
+    """Extrapole le temps du scan complet depuis un échantillon de lignes."""
+    rng = random.Random(seed)
+    rows = rng.sample(range(len(keys)), min(sample, len(keys)))
+    t0 = time.perf_counter()
+    for i in rows:
+        key_a = keys[i]
+        for j in range(i + 1, len(keys)):
+            key_b = keys[j]
+            if abs(len(key_a) - len(key_b)) > 5:
+                continue
+            lex_score(key_a, key_b)
+    elapsed = time.perf_counter() - t0
+    return elapsed * len(keys) / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 10000, 20000, 50000, 100000])
+    parser.add_argument("--brute-max", type=int, default=5000)
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results = []
+    for k in args.sizes:
+        keys = make_keys(k)
+        join = LexKeySimilarityJoin(threshold=0.85, max_len_diff=5)
+
+        t0 = time.perf_counter()
+        pairs = join.join(keys)
+        join_s = time.perf_counter() - t0
+
+        row = {"k": len(keys), "join_s": round(join_s, 2), **join.stats}
+
+        if k <= args.brute_max:
+            t0 = time.perf_counter()
+            expected = brute_force(keys)
+            row["brute_s"] = round(time.perf_counter() - t0, 2)
+            row["identical"] = expected == pairs
+        else:
+            row["brute_s_estimated"] = round(brute_force_estimate(keys), 1)
+
+        results.append(row)
+        print(json.dumps(row), flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
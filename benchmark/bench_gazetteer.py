@@ -0,0 +1,131 @@
+"""
+Bench du gazetteer compilé (GazetteerMatcher) vs boucle de sous-chaînes.
+
+Corpus synthétique : F surface forms (1 à 3 mots, ~F/2 concepts) et C chunks
+de W mots. Pour chaque taille de gazetteer (--forms, échelle croissante) :
+- brute_s    : « for form in forms: if form in chunk.lower() » sur chaque chunk
+               (ancienne convert_chunks_for_relation_extraction), mesuré sur
+               --brute-sample chunks puis extrapolé à C
+- compile_s  : construction de l'automate
+- match_s    : GazetteerMatcher.keys_in sur les C chunks
+- speedup    : brute_s / (compile_s + match_s)
+- identical  : mêmes concepts (et même forme retenue) sur l'échantillon
+
+Usage:
+    python benchmark/bench_gazetteer.py
+    python benchmark/bench_gazetteer.py --forms 500 1000 5000 --chunks 2000 --words 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from knowbase.common.gazetteer import GazetteerMatcher  # noqa: E402
+
+SYLLABLES = "ka lo mi ra te su no vi pa de ri on ex ta ul sa fe go".split()
+FILLER = "the a of to and in for with on by is are must should can will be this that data system".split()
+
+
+def word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def make_forms(rng, n_forms):
+    vocab = [word(rng) for _ in range(max(50, n_forms))]
+    forms = set()
+    while len(forms) < n_forms:
+        forms.add(" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 3))))
+    forms = sorted(forms)
+    # ~2 formes par concept, ordre d'insertion conservé (comme proto_by_surface)
+    proto_by_surface = {}
+    for i, form in enumerate(forms):
+        proto_by_surface.setdefault(form, []).append(f"c{i // 2}")
+    return vocab, proto_by_surface
+
+
+def make_chunks(rng, vocab, n_chunks, n_words):
+    chunks = []
+    for _ in range(n_chunks):
+        chunks.append(" ".join(
+            (rng.choice(vocab) if rng.random() < 0.15 else rng.choice(FILLER)).capitalize()
+            if rng.random() < 0.1 else (rng.choice(vocab) if rng.random() < 0.15 else rng.choice(FILLER))
+            for _ in range(n_words)
+        ))
+    return chunks
+
+
+def brute_anchors(proto_by_surface, text):
+    text_lower = text.lower()
+    found = {}
+    for form, protos in proto_by_surface.items():
+        if form in text_lower:
+            for proto in protos:
+                found.setdefault(proto, form)
+    return found
+
+
+def run(n_forms, n_chunks, n_words, brute_sample, seed):
+    rng = random.Random(seed)
+    vocab, proto_by_surface = make_forms(rng, n_forms)
+    chunks = make_chunks(rng, vocab, n_chunks, n_words)
+    sample = chunks[:brute_sample]
+
+    t0 = time.perf_counter()
+    brute = [brute_anchors(proto_by_surface, text) for text in sample]
+    brute_s = (time.perf_counter() - t0) * n_chunks / max(len(sample), 1)
+
+    t0 = time.perf_counter()
+    matcher = GazetteerMatcher()
+    for form, protos in proto_by_surface.items():
+        for proto in protos:
+            matcher.add(proto, form)
+    matcher.keys_in("")  # compilation (paresseuse)
+    compile_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    compiled = [matcher.keys_in(text) for text in chunks]
+    match_s = time.perf_counter() - t0
+
+    identical = all(
+        list(a.items()) == list(b.items()) for a, b in zip(brute, compiled[:len(sample)])
+    )
+    return {
+        "forms": n_forms,
+        "chunks": n_chunks,
+        "words_per_chunk": n_words,
+        "brute_s": round(brute_s, 3),
+        "compile_s": round(compile_s, 3),
+        "match_s": round(match_s, 3),
+        "speedup": round(brute_s / max(compile_s + match_s, 1e-9), 1),
+        "avg_hits_per_chunk": round(sum(len(c) for c in compiled) / max(n_chunks, 1), 1),
+        "identical": identical,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--forms", type=int, nargs="+", default=[500, 1000, 2500, 5000])
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=200, help="Mots par chunk")
+    parser.add_argument("--brute-sample", type=int, default=200, help="Chunks mesurés en mode boucle")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    results = []
+    for n_forms in args.forms:
+        row = run(n_forms, args.chunks, args.words, args.brute_sample, args.seed)
+        results.append(row)
+        print(json.dumps(row), flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
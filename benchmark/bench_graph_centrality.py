@@ -0,0 +1,157 @@
+"""
+Bench de latence du GraphCentralityScorer (Gatekeeper) sur gros documents.
+
+Document synthétique de --words mots et N candidats (--entities, échelle
+croissante, 3000+ pour les gros documents). Pour chaque N :
+- graph_s          : construction du graphe de co-occurrence (produit creux)
+- old_graph_s      : ancienne boucle fenêtre × entité, mesurée sur
+                     --old-window-sample fenêtres puis extrapolée
+- centrality_s     : PageRank creux + betweenness échantillonnée (budgétée)
+- score_entities_s : latence complète score_entities
+- exact_s          : nx.pagerank + nx.betweenness_centrality exacts (--exact)
+- spearman_*       : corrélation de rang approx / exact (pagerank,
+                     betweenness, centralité combinée)
+- stats            : itérations PageRank, pivots, borne ε atteinte
+
+Usage:
+    python benchmark/bench_graph_centrality.py
+    python benchmark/bench_graph_centrality.py --entities 1000 3000 5000 --exact
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import networkx as nx  # noqa: E402
+from scipy.stats import spearmanr  # noqa: E402
+
+from knowbase.agents.gatekeeper.graph_centrality_scorer import GraphCentralityScorer  # noqa: E402
+
+LETTERS = "abcdefghijklmnop"
+
+
+def make_document(rng, n_words, n_entities):
+    vocab = ["".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 7))) for _ in range(max(2000, n_entities * 2))]
+    # Zipf léger : quelques termes très fréquents, longue traîne
+    weights = [1.0 / (i + 1) ** 0.6 for i in range(len(vocab))]
+    text = " ".join(rng.choices(vocab, weights=weights, k=n_words))
+    names = set()
+    while len(names) < n_entities:
+        names.add(" ".join(rng.choice(vocab[: n_entities * 2]) for _ in range(rng.randint(1, 2))))
+    return text, [{"text": name} for name in sorted(names)]
+
+
+def old_graph_seconds(scorer, candidates, text, window_sample):
+    """Ancienne boucle (entité dans fenêtre), extrapolée depuis un échantillon de fenêtres."""
+    window_size = scorer._get_adaptive_window_size(len(text))
+    names = [c["text"].lower() for c in candidates]
+    words = re.findall(r"\b\w+\b", text.lower())
+    n_windows = len(words) - window_size + 1
+    sample = min(window_sample, n_windows)
+    t0 = time.perf_counter()
+    for i in range(sample):
+        window = words[i:i + window_size]
+        present = [name for name in names if all(word in window for word in name.split())]
+        for j, e1 in enumerate(present):
+            for e2 in present[j + 1:]:
+                tuple(sorted([e1, e2]))
+    return (time.perf_counter() - t0) * n_windows / max(sample, 1)
+
+
+def exact_scores(scorer, graph):
+    pagerank = nx.pagerank(graph, weight="weight", max_iter=100)
+    degree = nx.degree_centrality(graph)
+    betweenness = nx.betweenness_centrality(graph, weight="weight")
+    max_pr = max(pagerank.values()) or 1.0
+    w = scorer.centrality_weights
+    combined = {
+        v: w["pagerank"] * pagerank[v] / max_pr + w["degree"] * degree[v] + w["betweenness"] * betweenness[v]
+        for v in graph
+    }
+    return pagerank, betweenness, combined
+
+
+def run(n_entities, args):
+    rng = random.Random(args.seed)
+    text, candidates = make_document(rng, args.words, n_entities)
+    scorer = GraphCentralityScorer(centrality_budget_s=args.budget)
+
+    t0 = time.perf_counter()
+    nodes, weights = scorer._cooccurrence_matrix(candidates, text)
+    graph_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    centrality = scorer._centrality_from_matrix(nodes, weights)
+    centrality_s = time.perf_counter() - t0
+    stats = dict(scorer.last_centrality_stats)
+
+    t0 = time.perf_counter()
+    scorer.score_entities([dict(c) for c in candidates], text)
+    score_s = time.perf_counter() - t0
+
+    row = {
+        "entities": n_entities,
+        "words": args.words,
+        "nodes": stats.get("nodes"),
+        "edges": stats.get("edges"),
+        "graph_s": round(graph_s, 3),
+        "old_graph_s": round(old_graph_seconds(scorer, candidates, text, args.old_window_sample), 1),
+        "centrality_s": round(centrality_s, 3),
+        "score_entities_s": round(score_s, 3),
+        "stats": stats,
+    }
+
+    if args.exact:
+        import numpy as np
+        from knowbase.agents.gatekeeper.graph_centrality_scorer import sampled_betweenness, sparse_pagerank
+
+        graph = scorer._build_cooccurrence_graph(candidates, text)
+        t0 = time.perf_counter()
+        pagerank, betweenness, combined = exact_scores(scorer, graph)
+        row["exact_s"] = round(time.perf_counter() - t0, 3)
+
+        approx_pr, _, _ = sparse_pagerank(weights, tol=scorer.pagerank_tol)
+        approx_bc, _ = sampled_betweenness(weights, stats["betweenness_target_pivots"])
+        order = list(nodes)
+        row["spearman_pagerank"] = round(spearmanr(approx_pr, [pagerank[v] for v in order])[0], 4)
+        row["spearman_betweenness"] = round(spearmanr(approx_bc, [betweenness[v] for v in order])[0], 4)
+        row["spearman_centrality"] = round(
+            spearmanr([centrality[v] for v in order], [combined[v] for v in order])[0], 4
+        )
+        row["max_abs_error_betweenness"] = round(
+            float(np.max(np.abs(approx_bc - np.array([betweenness[v] for v in order])))), 4
+        )
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entities", type=int, nargs="+", default=[500, 1000, 3000])
+    parser.add_argument("--words", type=int, default=30000, help="Mots du document")
+    parser.add_argument("--budget", type=float, default=10.0, help="Budget centralité (s)")
+    parser.add_argument("--old-window-sample", type=int, default=100)
+    parser.add_argument("--exact", action="store_true", help="Comparer aux scores networkx exacts")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    results = []
+    for n_entities in args.entities:
+        row = run(n_entities, args)
+        results.append(row)
+        print(json.dumps(row), flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Bench des profils de collection Layer R (float32 / int8 / binary).
+
+Pour chaque profil, copie la collection servie (knowbase_chunks_v2) dans une
+collection temporaire bench_layer_r_{profile}, attend la fin de
+l'indexation puis mesure :
+- ram_est_mb    : RAM résidente estimée (vecteurs servis en RAM + HNSW niveau 0)
+- p50_ms/p99_ms : latence query_points avec les SearchParams du profil
+- recall@k      : vs top-k exact (brute force) sur la collection source
+- build_s       : copie + indexation
+
+Requêtes : vecteurs denses échantillonnés dans la collection source (la
+même distribution que les embeddings de questions e5 "query:").
+
+Usage:
+    python benchmark/bench_layer_r_profiles.py
+    python benchmark/bench_layer_r_profiles.py --profiles int8 binary --n-queries 500 --keep
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qdrant_client.models import CollectionStatus, SearchParams  # noqa: E402
+
+from knowbase.common.clients.qdrant_client import get_qdrant_client  # noqa: E402
+from knowbase.retrieval.layer_r_migration import sample_query_vectors  # noqa: E402
+from knowbase.retrieval.layer_r_profiles import PROFILES  # noqa: E402
+from knowbase.retrieval.qdrant_layer_r import (  # noqa: E402
+    VECTOR_SIZE,
+    copy_layer_r_points,
+    create_layer_r_collection,
+    resolve_layer_r_collection,
+)
+from knowbase.retrieval.sparse_bm25 import collection_has_sparse  # noqa: E402
+
+
+def wait_indexed(client, name, timeout_s=3600):
+    t0 = time.time()
+    while time.time() - t0 < timeout_s:
+        if client.get_collection(name).status == CollectionStatus.GREEN:
+            return
+        time.sleep(1.0)
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES))
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--keep", action="store_true", help="Garde les collections de bench")
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    client = get_qdrant_client()
+    source = resolve_layer_r_collection(client)
+    n_points = client.get_collection(source).points_count or 0
+    queries = sample_query_vectors(client, source, args.n_queries)
+    expected = [
+        {p.id for p in client.query_points(source, query=q, limit=args.k,
+                                           search_params=SearchParams(exact=True)).points}
+        for q in queries
+    ]
+
+    results = []
+    for name in args.profiles:
+        profile = PROFILES[name]
+        bench_name = f"bench_layer_r_{name}"
+        if client.collection_exists(bench_name):
+            client.delete_collection(bench_name)
+
+        t0 = time.perf_counter()
+        create_layer_r_collection(client, bench_name, sparse=collection_has_sparse(client, source), profile=profile)
+        copy_layer_r_points(client, source, bench_name)
+        wait_indexed(client, bench_name)
+        build_s = time.perf_counter() - t0
+
+        params = profile.search_params()
+        latencies, recall = [], 0.0
+        for q, exp in zip(queries, expected):
+            t = time.perf_counter()
+            got = client.query_points(bench_name, query=q, limit=args.k, search_params=params).points
+            latencies.append((time.perf_counter() - t) * 1000.0)
+            recall += len(exp & {p.id for p in got}) / max(1, len(exp))
+
+        row = {
+            "profile": name,
+            "points": n_points,
+            "ram_est_mb": round(profile.estimate_ram_bytes(n_points, VECTOR_SIZE) / 2**20, 1),
+            "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+            "p99_ms": round(percentile(latencies, 0.99), 2) if latencies else 0.0,
+            f"recall@{args.k}": round(recall / max(1, len(queries)), 4),
+            "build_s": round(build_s, 1),
+        }
+        results.append(row)
+        print(json.dumps(row), flush=True)
+
+        if not args.keep:
+            client.delete_collection(bench_name)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
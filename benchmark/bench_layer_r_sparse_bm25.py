@@ -0,0 +1,148 @@
+"""
+Bench retrieval Layer R : BM25 MatchText (4 mots-clés) vs vecteur sparse BM25.
+
+Pour chaque question du gold set (ground_truth_doc_id), mesure sur
+knowbase_chunks_v2 :
+- dense          : query_points e5-large
+- match_text     : scroll MatchText sur _extract_bm25_keywords (ancien BM25)
+- sparse         : query_points using="bm25" (TF/IDF BM25 réels)
+- hybrid_match   : RRF dense + match_text (ancien _hybrid_search)
+- hybrid_sparse  : RRF dense + sparse (nouveau _hybrid_search)
+
+Sorties par méthode : recall@k doc-level (ground_truth_doc_id dans les docs
+des top-k chunks), latence p50/p95 (ms, hors encodage de la question).
+
+Pré-requis : Qdrant peuplé + vecteurs sparse (app/scripts/backfill_layer_r_sparse.py).
+
+Usage:
+    python benchmark/bench_layer_r_sparse_bm25.py
+    python benchmark/bench_layer_r_sparse_bm25.py --questions benchmark/questions/aero_smoke_test.json --k 5 10
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from qdrant_client.models import FieldCondition, Filter, MatchText, MatchValue  # noqa: E402
+
+from knowbase.api.services.retriever import _extract_bm25_keywords  # noqa: E402
+from knowbase.common.clients.qdrant_client import get_qdrant_client  # noqa: E402
+from knowbase.retrieval.qdrant_layer_r import COLLECTION_NAME  # noqa: E402
+from knowbase.retrieval.sparse_bm25 import (  # noqa: E402
+    SPARSE_VECTOR_NAME,
+    build_query_sparse_vector,
+)
+
+RRF_K = 60
+METHODS = ("dense", "match_text", "sparse", "hybrid_match", "hybrid_sparse")
+
+
+def rrf(*rankings, limit):
+    scores = {}
+    for ranking in rankings:
+        for rank, pid in enumerate(ranking):
+            scores[pid] = scores.get(pid, 0.0) + 1.0 / (RRF_K + rank)
+    return [pid for pid, _ in sorted(scores.items(), key=lambda x: -x[1])][:limit]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000.0
+
+
+def run_question(client, question, query_vector, query_filter, limit):
+    doc_of = {}
+
+    def dense():
+        pts = client.query_points(COLLECTION_NAME, query=query_vector, limit=limit,
+                                  with_payload=["doc_id"], query_filter=query_filter).points
+        return pts
+
+    def match_text():
+        keywords = _extract_bm25_keywords(question)
+        if not keywords:
+            return []
+        flt = Filter(must=list(query_filter.must) + [
+            FieldCondition(key="text", match=MatchText(text=" ".join(keywords)))])
+        pts, _ = client.scroll(COLLECTION_NAME, scroll_filter=flt, limit=limit,
+                               with_payload=["doc_id"], with_vectors=False)
+        return pts
+
+    def sparse():
+        vec = build_query_sparse_vector(question)
+        if vec is None:
+            return []
+        return client.query_points(COLLECTION_NAME, query=vec, using=SPARSE_VECTOR_NAME, limit=limit,
+                                   with_payload=["doc_id"], query_filter=query_filter).points
+
+    rankings, latency = {}, {}
+    for name, fn in (("dense", dense), ("match_text", match_text), ("sparse", sparse)):
+        pts, latency[name] = timed(fn)
+        for p in pts:
+            doc_of[p.id] = (p.payload or {}).get("doc_id")
+        rankings[name] = [p.id for p in pts]
+
+    for name, parts in (("hybrid_match", ("dense", "match_text")), ("hybrid_sparse", ("dense", "sparse"))):
+        ids, fuse_ms = timed(lambda: rrf(*(rankings[p] for p in parts), limit=limit))
+        rankings[name] = ids
+        latency[name] = sum(latency[p] for p in parts) + fuse_ms
+
+    return {name: [doc_of.get(pid) for pid in ids] for name, ids in rankings.items()}, latency
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", default=os.path.join(os.path.dirname(__file__), "questions", "aero_all_290q.json"))
+    parser.add_argument("--tenant", default="default")
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 10, 30])
+    parser.add_argument("--limit", type=int, default=None, help="Nombre max de questions")
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    from knowbase.common.clients.embeddings import get_embedding_manager
+
+    questions = json.load(open(args.questions, encoding="utf-8"))
+    questions = [q for q in questions if q.get("ground_truth_doc_id")][: args.limit]
+    client = get_qdrant_client()
+    encoder = get_embedding_manager()
+    query_filter = Filter(must=[FieldCondition(key="tenant_id", match=MatchValue(value=args.tenant))])
+    max_k = max(args.k)
+
+    hits = {m: {k: 0 for k in args.k} for m in METHODS}
+    latencies = {m: [] for m in METHODS}
+    for q in questions:
+        vec = encoder.encode([f"query: {q['question']}"], normalize_embeddings=True)[0].tolist()
+        docs, latency = run_question(client, q["question"], vec, query_filter, max_k)
+        for m in METHODS:
+            latencies[m].append(latency[m])
+            for k in args.k:
+                hits[m][k] += q["ground_truth_doc_id"] in docs[m][:k]
+
+    results = []
+    for m in METHODS:
+        row = {"method": m, "n": len(questions)}
+        row.update({f"recall@{k}": round(hits[m][k] / max(1, len(questions)), 3) for k in args.k})
+        row["p50_ms"] = round(statistics.median(latencies[m]), 1) if latencies[m] else 0.0
+        row["p95_ms"] = round(percentile(latencies[m], 0.95), 1)
+        results.append(row)
+        print(json.dumps(row), flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
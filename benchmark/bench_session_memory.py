@@ -0,0 +1,107 @@
+"""
+Bench overhead par tour de la mémoire de conversation (SessionMemoryStore).
+
+Simule N sessions × T tours (append user + append assistant + get) et mesure :
+- append_p50_us / append_p95_us : ajout d'un message (Redis RPUSH + HINCRBY)
+- get_p50_us / get_p95_us       : lecture résumé + fenêtre (HGET ver, + LRANGE si version changée)
+- hit_rate, redis_loads, db_loads, evictions, cached_sessions
+
+Deux workers (deux stores sur le même Redis) alternent les requêtes d'une
+même session pour mesurer le coût du partage. Le loader PostgreSQL est
+simulé (pas de DB) ; le summarizer est une concaténation (pas d'appel LLM).
+
+Usage:
+    python benchmark/bench_session_memory.py
+    python benchmark/bench_session_memory.py --sessions 500 --turns 40 --lru 128 --local-only
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from knowbase.memory.session_memory_store import REDIS_PREFIX, SessionMemoryStore  # noqa: E402
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+
+def timed_us(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--lru", type=int, default=256)
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--local-only", action="store_true", help="Sans Redis (LRU local seul)")
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    redis = None
+    if not args.local_only:
+        from knowbase.common.clients.redis_client import get_redis_client
+        redis = get_redis_client().client
+
+    def summarizer(previous, messages):
+        return (previous + " " + " ".join(m["content"][:20] for m in messages))[-2000:]
+
+    workers = [
+        SessionMemoryStore(redis_client=redis, window=args.window, max_sessions=args.lru, summarizer=summarizer)
+        for _ in range(2)
+    ]
+    for w in workers:
+        w._redis_resolved = True
+
+    def loader():
+        return "", []
+
+    append_us, get_us = [], []
+    t0 = time.perf_counter()
+    for turn in range(args.turns):
+        for s in range(args.sessions):
+            sid = f"bench-{s}"
+            worker = workers[(turn + s) % 2]
+            append_us.append(timed_us(lambda: worker.append(sid, "user", f"question {turn} " * 20, loader)))
+            append_us.append(timed_us(lambda: worker.append(sid, "assistant", f"answer {turn} " * 60, loader)))
+            get_us.append(timed_us(lambda: worker.get(sid, loader)))
+    elapsed = time.perf_counter() - t0
+
+    stats = [w.stats() for w in workers]
+    row = {
+        "mode": "local" if args.local_only else "redis",
+        "sessions": args.sessions,
+        "turns": args.turns,
+        "append_p50_us": round(statistics.median(append_us), 1),
+        "append_p95_us": round(percentile(append_us, 0.95), 1),
+        "get_p50_us": round(statistics.median(get_us), 1),
+        "get_p95_us": round(percentile(get_us, 0.95), 1),
+        "per_turn_ms": round(elapsed * 1000 / (args.sessions * args.turns), 3),
+        "hit_rate": round(sum(s["hits"] for s in stats) / max(1, sum(s["hits"] + s["misses"] for s in stats)), 4),
+        "redis_loads": sum(s["redis_loads"] for s in stats),
+        "db_loads": sum(s["db_loads"] for s in stats),
+        "evictions": sum(s["evictions"] for s in stats),
+        "cached_sessions": [s["cached_sessions"] for s in stats],
+    }
+    print(json.dumps(row), flush=True)
+
+    if redis is not None:
+        for s in range(args.sessions):
+            redis.delete(f"{REDIS_PREFIX}:bench-{s}:meta", f"{REDIS_PREFIX}:bench-{s}:win")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(row, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Bench démarrage par rôle de processus : temps jusqu'à la première requête et RSS.
+
+Rôles :
+- api              : lance uvicorn (create_app, factory) et interroge --probe-path
+                     jusqu'au premier 200 → ready_s = temps jusqu'à la 1re requête
+- ingestion_worker : nouvel interpréteur, import du worker + preload_models(role)
+- pass2_worker     : idem avec le rôle pass2_worker
+
+Mesure par rôle (médiane sur --repeat lancements à froid) :
+- ready_s   : lancement du processus → prêt (1re réponse HTTP / préchargement fini)
+- import_s  : workers — import de knowbase.ingestion.queue.worker
+- preload_s : workers — préchargement des modèles du rôle (détail par élément)
+- rss_mb    : RSS du processus une fois prêt
+
+Les services (Qdrant, Redis, Neo4j, LLM) doivent être joignables comme en
+production ; sinon réduire le préchargement (--preload api=none).
+
+Usage:
+    python benchmark/bench_startup.py
+    python benchmark/bench_startup.py --roles api --repeat 3 --lazy-routers runtime_legacy,admin
+    python benchmark/bench_startup.py --roles ingestion_worker pass2_worker --preload pass2_worker=none
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, SRC)
+
+from knowbase.common.preload import PROCESS_ROLE_ENV, preload_env_var  # noqa: E402
+
+ROLES = ("api", "ingestion_worker", "pass2_worker")
+
+_WORKER_DRIVER = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from knowbase.ingestion.queue import worker
+import_s = time.perf_counter() - t0
+report = worker.preload_models(sys.argv[1])
+print("BENCH" + json.dumps({
+    "import_s": import_s,
+    "preload_s": report.total_s,
+    "preload": report.to_dict()["timings"],
+    "rss_mb": report.rss_mb,
+}), flush=True)
+"""
+
+
+def process_rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_api(env, probe_path, timeout_s):
+    port = free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "knowbase.api.main:create_app", "--factory",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=SRC, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    url = f"http://127.0.0.1:{port}{probe_path}"
+    try:
+        while time.perf_counter() - t0 < timeout_s:
+            if proc.poll() is not None:
+                raise RuntimeError(f"API exited: {proc.stderr.read().decode(errors='replace')[-800:]}")
+            try:
+                with urllib.request.urlopen(url, timeout=2) as resp:
+                    if resp.status == 200:
+                        return {"ready_s": time.perf_counter() - t0, "rss_mb": process_rss_mb(proc.pid)}
+            except (urllib.error.URLError, ConnectionError, socket.timeout):
+                time.sleep(0.05)
+        raise TimeoutError(f"API not ready after {timeout_s}s")
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+def run_worker(role, env, timeout_s):
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", _WORKER_DRIVER, role],
+        cwd=SRC, env=env, capture_output=True, text=True, timeout=timeout_s,
+    )
+    ready_s = time.perf_counter() - t0
+    for line in proc.stdout.splitlines():
+        if line.startswith("BENCH"):
+            row = json.loads(line[len("BENCH"):])
+            row["ready_s"] = ready_s
+            return row
+    raise RuntimeError(f"{role} failed: {proc.stderr[-800:]}")
+
+
+def median_row(runs):
+    row = {}
+    for key in ("ready_s", "import_s", "preload_s", "rss_mb"):
+        values = [r[key] for r in runs if key in r]
+        if values:
+            row[key] = round(statistics.median(values), 3 if key != "rss_mb" else 1)
+    if runs and "preload" in runs[0]:
+        row["preload"] = {
+            name: round(statistics.median(r["preload"].get(name, 0.0) for r in runs), 3)
+            for name in runs[0]["preload"]
+        }
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--roles", nargs="+", default=list(ROLES), choices=ROLES)
+    parser.add_argument("--repeat", type=int, default=1, help="Lancements à froid par rôle (médiane)")
+    parser.add_argument("--preload", nargs="*", default=[],
+                        help="Surcharge role=items (ex: api=none, pass2_worker=openai)")
+    parser.add_argument("--lazy-routers", default=None, help="API_LAZY_ROUTERS pour le rôle api")
+    parser.add_argument("--disabled-routers", default=None, help="API_DISABLED_ROUTERS pour le rôle api")
+    parser.add_argument("--probe-path", default="/docs", help="Route interrogée pour le rôle api")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    base_env = os.environ.copy()
+    base_env["PYTHONPATH"] = SRC + os.pathsep + base_env.get("PYTHONPATH", "")
+    for override in args.preload:
+        role, _, items = override.partition("=")
+        base_env[preload_env_var(role)] = items
+    if args.lazy_routers is not None:
+        base_env["API_LAZY_ROUTERS"] = args.lazy_routers
+    if args.disabled_routers is not None:
+        base_env["API_DISABLED_ROUTERS"] = args.disabled_routers
+
+    results = []
+    for role in args.roles:
+        env = dict(base_env, **{PROCESS_ROLE_ENV: role})
+        runs = []
+        for _ in range(args.repeat):
+            if role == "api":
+                runs.append(run_api(env, args.probe_path, args.timeout))
+            else:
+                runs.append(run_worker(role, env, args.timeout))
+        row = {"role": role, "repeat": args.repeat, "preload_items": env.get(preload_env_var(role), "default")}
+        row.update(median_row(runs))
+        results.append(row)
+        print(json.dumps(row), flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Bench persistance Structural Graph : statements par ligne (historique) vs UNWIND.
+
+Document synthétique de N DocItems (P pages, S sections, chunks issus du
+TypeAwareChunker). Deux modes :
+- row    : un tx.run par nœud et par relation DERIVED_FROM / SUBSECTION_OF,
+           DocItems/chunks par batch de 500 (persistance d'origine, rejouée ici)
+- unwind : StructuralGraphBuilder.persist_to_neo4j_sync (statements UNWIND +
+           props_hash), lancé deux fois : 1re écriture puis re-persistance à
+           l'identique (idempotente : written doit valoir 0)
+
+Mesure par mode :
+- wall_s        : temps total (préparation des paramètres + exécution)
+- transactions  : nombre de execute_write
+- statements    : nombre de tx.run
+- written       : nœuds (ré)écrits (mode unwind, avec --neo4j-uri uniquement)
+
+Sans --neo4j-uri, la session est simulée (aucun aller-retour) : seuls les
+comptes et le coût côté client sont mesurés. Avec --neo4j-uri, les nœuds du
+tenant de bench sont supprimés avant chaque mode.
+
+Usage:
+    python benchmark/bench_structural_unwind.py
+    python benchmark/bench_structural_unwind.py --docitems 20000 --neo4j-uri bolt://localhost:7687 --neo4j-password secret
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from knowbase.structural import graph_builder  # noqa: E402
+from knowbase.structural import neo4j_schema  # noqa: E402,F401  (import du driver hors mesure)
+from knowbase.structural.graph_builder import StructuralGraphBuilder, StructuralGraphBuildResult  # noqa: E402
+from knowbase.structural.models import (  # noqa: E402
+    DocItem,
+    DocItemType,
+    DocumentVersion,
+    PageContext,
+    SectionInfo,
+    StructuralProfile,
+)
+from knowbase.structural.type_aware_chunker import TypeAwareChunker  # noqa: E402
+
+TENANT = "bench_structural_unwind"
+WORDS = (
+    "system data process configuration module service integration security user "
+    "access role authorization transaction database table field value report "
+    "the a of to and in for with on by is are must should can will be this that"
+).split()
+
+_ROW_VERSION = """
+    MERGE (v:DocumentVersion {tenant_id: $tenant_id, doc_id: $doc_id, doc_version_id: $doc_version_id})
+    SET v += $props
+    WITH v
+    MATCH (d:DocumentContext {tenant_id: $tenant_id, doc_id: $doc_id})
+    MERGE (d)-[:HAS_VERSION]->(v)
+"""
+_ROW_PAGE = """
+    MERGE (p:PageContext {tenant_id: $tenant_id, doc_version_id: $doc_version_id, page_no: $page_no})
+    SET p += $props
+    WITH p
+    MATCH (v:DocumentVersion {tenant_id: $tenant_id, doc_version_id: $doc_version_id})
+    MERGE (v)-[:HAS_PAGE]->(p)
+"""
+_ROW_SECTION = """
+    MERGE (s:SectionContext {tenant_id: $tenant_id, doc_version_id: $doc_version_id, section_id: $section_id})
+    SET s += $props
+    WITH s
+    MATCH (v:DocumentVersion {tenant_id: $tenant_id, doc_version_id: $doc_version_id})
+    MERGE (v)-[:HAS_SECTION]->(s)
+"""
+_ROW_SUBSECTION = """
+    MATCH (child:SectionContext {tenant_id: $tenant_id, doc_version_id: $doc_version_id, section_id: $child_id})
+    MATCH (parent:SectionContext {tenant_id: $tenant_id, doc_version_id: $doc_version_id, section_id: $parent_id})
+    MERGE (child)-[:SUBSECTION_OF]->(parent)
+"""
+_ROW_DOCITEM = """
+    MERGE (i:DocItem {tenant_id: $tenant_id, doc_id: $doc_id, doc_version_id: $doc_version_id, item_id: $item_id})
+    SET i += $props
+    WITH i
+    OPTIONAL MATCH (s:SectionContext {tenant_id: $tenant_id, doc_version_id: $doc_version_id, section_id: $section_id})
+    FOREACH (_ IN CASE WHEN s IS NOT NULL THEN [1] ELSE [] END | MERGE (s)-[:CONTAINS]->(i))
+    WITH i
+    OPTIONAL MATCH (p:PageContext {tenant_id: $tenant_id, doc_version_id: $doc_version_id, page_no: $page_no})
+    FOREACH (_ IN CASE WHEN p IS NOT NULL THEN [1] ELSE [] END | MERGE (i)-[:ON_PAGE]->(p))
+"""
+_ROW_CHUNK = """
+    MERGE (c:TypeAwareChunk {tenant_id: $tenant_id, chunk_id: $chunk_id})
+    SET c += $props
+"""
+_ROW_DERIVED_FROM = """
+    MATCH (c:TypeAwareChunk {tenant_id: $tenant_id, chunk_id: $chunk_id})
+    MATCH (i:DocItem {tenant_id: $tenant_id, doc_version_id: $doc_version_id, item_id: $item_id})
+    MERGE (c)-[:DERIVED_FROM]->(i)
+"""
+
+
+def build_document(n_items, n_pages, n_sections, seed=7):
+    rng = random.Random(seed)
+    version_id = "v1:bench"
+    common = {"tenant_id": TENANT, "doc_id": "bench_doc", "doc_version_id": version_id}
+    sections = [
+        SectionInfo(
+            section_id=f"sec_{s}", section_path=f"Section {s}", section_level=1 if s % 5 == 0 else 2,
+            parent_section_id=None if s % 5 == 0 else f"sec_{s - s % 5}", **common,
+        )
+        for s in range(n_sections)
+    ]
+    items = []
+    for n in range(n_items):
+        item_type = DocItemType.TABLE if n % 25 == 24 else DocItemType.TEXT
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 60)))
+        items.append(DocItem(
+            item_id=f"item_{n}", item_type=item_type, text=text,
+            page_no=n * n_pages // n_items + 1, reading_order_index=n,
+            section_id=sections[n * n_sections // n_items].section_id, **common,
+        ))
+    by_section = {}
+    for item in items:
+        by_section.setdefault(item.section_id, []).append(item)
+    for section in sections:
+        members = by_section.get(section.section_id, [])
+        section.item_ids = [i.item_id for i in members]
+        section.structural_profile = StructuralProfile.from_items(members) if members else None
+    pages = [
+        PageContext(page_no=p, page_width=612.0, page_height=792.0, **common)
+        for p in range(1, n_pages + 1)
+    ]
+    chunks = TypeAwareChunker(**common).create_chunks(items, sections)
+    version = DocumentVersion(page_count=n_pages, item_count=n_items, **common)
+    return StructuralGraphBuildResult(
+        doc_items=items, sections=sections, chunks=chunks,
+        doc_version=version, page_contexts=pages, doc_dict={},
+    )
+
+
+def row_plan(result, batch_size=500):
+    """Transactions de la persistance historique (un statement par ligne)."""
+    v = result.doc_version
+    key = {"tenant_id": v.tenant_id, "doc_version_id": v.doc_version_id}
+    first = [(_ROW_VERSION, dict(key, doc_id=v.doc_id, props=v.to_neo4j_properties()))]
+    first += [(_ROW_PAGE, dict(key, page_no=p.page_no, props=p.to_neo4j_properties())) for p in result.page_contexts]
+    sections = []
+    for s in result.sections:
+        sections.append((_ROW_SECTION, dict(key, section_id=s.section_id, props=s.to_neo4j_properties())))
+        if s.parent_section_id:
+            sections.append((_ROW_SUBSECTION, dict(key, child_id=s.section_id, parent_id=s.parent_section_id)))
+    plan = [first, sections]
+    for i in range(0, len(result.doc_items), batch_size):
+        plan.append([
+            (_ROW_DOCITEM, dict(
+                key, doc_id=item.doc_id, item_id=item.item_id, section_id=item.section_id,
+                page_no=item.page_no, props=item.to_neo4j_properties(),
+            ))
+            for item in result.doc_items[i:i + batch_size]
+        ])
+    for i in range(0, len(result.chunks), batch_size):
+        statements = []
+        for chunk in result.chunks[i:i + batch_size]:
+            statements.append((_ROW_CHUNK, dict(key, chunk_id=chunk.chunk_id, props=chunk.to_neo4j_properties())))
+            statements += [
+                (_ROW_DERIVED_FROM, dict(key, chunk_id=chunk.chunk_id, item_id=item_id))
+                for item_id in chunk.item_ids
+            ]
+        plan.append(statements)
+    return plan
+
+
+class SimulatedResult:
+    def single(self):
+        return {"written": 0}
+
+    def consume(self):
+        return None
+
+
+class SimulatedSession:
+    """Session sans serveur : compte transactions et statements."""
+
+    def __init__(self, counters):
+        self.counters = counters
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, params=None):
+        self.counters["statements"] += 1
+        return SimulatedResult()
+
+    def execute_write(self, fn, *args):
+        self.counters["transactions"] += 1
+        return fn(self, *args)
+
+
+class CountingClient:
+    """Adaptateur Neo4jClient (driver + is_connected) qui compte les appels."""
+
+    def __init__(self, driver=None):
+        self._driver = driver
+        self.driver = self
+        self.counters = {"transactions": 0, "statements": 0}
+
+    def is_connected(self):
+        return True
+
+    def session(self, database=None):
+        if self._driver is None:
+            return SimulatedSession(self.counters)
+        return _CountingSession(self._driver.session(database=database), self.counters)
+
+
+class _CountingSession:
+    def __init__(self, session, counters):
+        self.session = session
+        self.counters = counters
+
+    def __enter__(self):
+        self.session.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self.session.__exit__(*exc)
+
+    def run(self, query, params=None):
+        return self.session.run(query, params)
+
+    def execute_write(self, fn, *args):
+        counters = self.counters
+
+        def counted(tx, *a):
+            class Tx:
+                def run(self, query, params=None):
+                    counters["statements"] += 1
+                    return tx.run(query, params)
+            return fn(Tx(), *a)
+
+        counters["transactions"] += 1
+        return self.session.execute_write(counted, *args)
+
+
+def run_row_mode(result, client):
+    t0 = time.perf_counter()
+    with client.session(database="neo4j") as session:
+        for statements in row_plan(result):
+            session.execute_write(
+                lambda tx, stmts: [tx.run(query, params).consume() for query, params in stmts],
+                statements,
+            )
+    return time.perf_counter() - t0
+
+
+def run_unwind_mode(result, client):
+    t0 = time.perf_counter()
+    stats = StructuralGraphBuilder(persist_artifacts=False).persist_to_neo4j_sync(result, neo4j_client=client)
+    return time.perf_counter() - t0, stats
+
+
+def cleanup(driver):
+    with driver.session(database="neo4j") as session:
+        session.run(
+            "MATCH (n) WHERE n.tenant_id = $tenant "
+            "CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 5000 ROWS",
+            tenant=TENANT,
+        ).consume()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docitems", type=int, default=20000)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--sections", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=None, help="STRUCTURAL_PERSIST_BATCH_SIZE")
+    parser.add_argument("--neo4j-uri", default=None, help="Neo4j réel (sinon session simulée)")
+    parser.add_argument("--neo4j-user", default=os.getenv("NEO4J_USER", "neo4j"))
+    parser.add_argument("--neo4j-password", default=os.getenv("NEO4J_PASSWORD", ""))
+    parser.add_argument("--output", default=None, help="Fichier JSON de résultats")
+    args = parser.parse_args()
+
+    if args.batch_size:
+        graph_builder.STRUCTURAL_PERSIST_BATCH_SIZE = args.batch_size
+    # Persistance legacy (DocumentContext + PageContext) quel que soit le flag V2
+    graph_builder.is_feature_enabled = lambda name: False
+
+    t0 = time.perf_counter()
+    result = build_document(args.docitems, args.pages, args.sections)
+    build_s = time.perf_counter() - t0
+
+    driver = None
+    if args.neo4j_uri:
+        from neo4j import GraphDatabase
+
+        driver = GraphDatabase.driver(args.neo4j_uri, auth=(args.neo4j_user, args.neo4j_password))
+
+    rows = []
+    try:
+        if driver:
+            cleanup(driver)
+        client = CountingClient(driver)
+        wall = run_row_mode(result, client)
+        rows.append(dict(mode="row", wall_s=round(wall, 3), **client.counters))
+
+        for mode in ("unwind", "unwind_repersist"):
+            if driver and mode == "unwind":
+                cleanup(driver)
+            client = CountingClient(driver)
+            wall, stats = run_unwind_mode(result, client)
+            rows.append(dict(
+                mode=mode, wall_s=round(wall, 3), written=stats["written"], **client.counters,
+            ))
+    finally:
+        if driver:
+            cleanup(driver)
+            driver.close()
+
+    report = {
+        "docitems": len(result.doc_items),
+        "pages": len(result.page_contexts),
+        "sections": len(result.sections),
+        "chunks": len(result.chunks),
+        "build_s": round(build_s, 3),
+        "backend": "neo4j" if driver else "simulated",
+        "batch_size": graph_builder.STRUCTURAL_PERSIST_BATCH_SIZE,
+        "modes": rows,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
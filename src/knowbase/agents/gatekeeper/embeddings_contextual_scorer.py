@@ -260,14 +260,20 @@ class EmbeddingsContextualScorer:
         all_contexts_flat = []
         entity_context_indices = {}  # Map entity → (start_idx, end_idx) dans all_contexts_flat
 
+        # Mentions de toutes les entités en une seule passe (gazetteer compilé)
+        entity_names = [
+            entity.get("text", "") or entity.get("name", "") for entity in candidates
+        ]
+        contexts_by_name = self._extract_contexts_for_entities(
+            [name for name in entity_names if name], full_text
+        )
+
         current_idx = 0
-        for entity in candidates:
-            entity_name = entity.get("text", "") or entity.get("name", "")
-            if not entity_name:
+        for entity_name in entity_names:
+            if not entity_name or entity_name in all_contexts_by_entity:
                 continue
 
-            # Extraire toutes les mentions (si multi-occurrence activé)
-            contexts = self._extract_all_mentions_contexts(entity_name, full_text)
+            contexts = contexts_by_name.get(entity_name)
 
             if contexts:
                 all_contexts_by_entity[entity_name] = contexts
@@ -370,31 +376,65 @@ class EmbeddingsContextualScorer:
         Returns:
             Liste de contextes (window mots avant + après chaque mention)
         """
-        contexts = []
+        return self._extract_contexts_for_entities([entity_name], full_text).get(entity_name, [])
 
-        # Tokeniser le texte (mots simples)
-        words = re.findall(r'\b\w+\b', full_text)
+    def _extract_contexts_for_entities(
+        self,
+        entity_names: List[str],
+        full_text: str
+    ) -> Dict[str, List[str]]:
+        """
+        Contextes de toutes les mentions de plusieurs entités, en une passe.
+
+        Le texte est tokenisé une fois (mots \\w+), les tokens minuscules sont
+        joints par un espace et toutes les entités sont cherchées ensemble
+        avec un GazetteerMatcher à bornes de mots : un hit correspond
+        exactement à une séquence de tokens égale aux tokens de l'entité.
+
+        Le nom d'entité est tokenisé comme le texte (avant : split() sur les
+        espaces, si bien que « SAP S/4HANA Cloud » n'était jamais trouvé).
+
+        Returns:
+            {entity_name: [contextes]} (10 premières mentions max par entité)
+        """
+        from bisect import bisect_right
 
-        # Rechercher toutes les positions de l'entité
-        entity_words = entity_name.lower().split()
-        text_lower = [w.lower() for w in words]
+        from knowbase.common.gazetteer import GazetteerMatcher
 
-        for i in range(len(text_lower) - len(entity_words) + 1):
-            # Check si l'entité commence à la position i
-            if text_lower[i:i + len(entity_words)] == entity_words:
-                # Extraire contexte (window mots avant/après)
-                start = max(0, i - self.context_window // 2)
-                end = min(len(words), i + len(entity_words) + self.context_window // 2)
+        words = re.findall(r'\b\w+\b', full_text)
+        lowered = [w.lower() for w in words]
+        token_text = " ".join(lowered)
+
+        # Offsets de début de chaque token dans token_text (longueurs après
+        # lower() : "İ".lower() fait 2 caractères)
+        token_starts = []
+        offset = 0
+        for word in lowered:
+            token_starts.append(offset)
+            offset += len(word) + 1
+
+        matcher = GazetteerMatcher(case_fold=False, word_boundary=True)
+        for name in dict.fromkeys(entity_names):
+            # Tokeniser puis mettre en minuscules, comme le texte : lower() avant
+            # \w+ couperait « İstanbul » en « i stanbul » (U+0307 n'est pas \w)
+            matcher.add(name, " ".join(w.lower() for w in re.findall(r'\b\w+\b', name)))
+
+        contexts: Dict[str, List[str]] = defaultdict(list)
+        for hit in matcher.find_all(token_text):
+            entity_contexts = contexts[hit.key]
+            # Limiter à 10 occurrences max (éviter explosion mémoire)
+            if len(entity_contexts) >= 10:
+                continue
 
-                context_words = words[start:end]
-                context = " ".join(context_words)
-                contexts.append(context)
+            first = bisect_right(token_starts, hit.start) - 1
+            last = bisect_right(token_starts, hit.end - 1) - 1
 
-                # Limiter à 10 occurrences max (éviter explosion mémoire)
-                if len(contexts) >= 10:
-                    break
+            # Extraire contexte (window mots avant/après)
+            start = max(0, first - self.context_window // 2)
+            end = min(len(words), last + 1 + self.context_window // 2)
+            entity_contexts.append(" ".join(words[start:end]))
 
-        return contexts
+        return dict(contexts)
 
     def _score_entity_with_precomputed_embeddings(
         self,
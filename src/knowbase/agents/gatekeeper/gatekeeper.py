@@ -1198,6 +1198,11 @@ class GatekeeperDelegate(BaseAgent):
                 f"{promoted_count} promoted, {failed_count} failed"
             )
 
+            # Phase 2.12 v1.2: indexer les nouveaux concepts dans le blocking index ER
+            if canonical_ids:
+                from knowbase.entity_resolution.incremental import notify_concepts_created
+                notify_concepts_created(tenant_id_for_batch, canonical_ids)
+
             # Problème 1: Retourner mapping pour persistance relations
             return PromoteConceptsOutput(
                 success=True,
@@ -12,17 +12,192 @@ Filtrage contextuel basé sur l'analyse de graphe de co-occurrence.
 **Impact attendu**: +20-30% précision, 100% language-agnostic, $0 coût, <100ms
 
 Référence: doc/ongoing/ANALYSE_FILTRAGE_CONTEXTUEL_GENERALISTE.md
+
+**Coût borné (gros documents, 3000+ candidats)**:
+- Graphe de co-occurrence = produit creux fenêtres × entités (W^T W), au lieu
+  d'un test « entité dans fenêtre » par fenêtre et par entité
+- PageRank par power iteration sur la matrice creuse (tolérance GATEKEEPER_PAGERANK_TOL)
+- Betweenness échantillonnée (k pivots, Brandes) : k dérivé d'une borne
+  d'erreur additive ε avec confiance 1-δ (Hoeffding), exacte si k >= n
+- Budget temps par échéance (GATEKEEPER_CENTRALITY_BUDGET_S) vérifié entre
+  itérations / pivots : fonctionne dans n'importe quel thread (RQ, pools),
+  contrairement à l'ancien SIGALRM réservé au thread principal
 """
 
-from typing import Dict, Any, List, Tuple, Set
+from typing import Dict, Any, List, Optional, Tuple
 import logging
+import os
+import random
 import re
 import math
+import time
 from collections import defaultdict, Counter
+from heapq import heappop, heappush
+from itertools import count
+
 import networkx as nx
+import numpy as np
+from scipy import sparse
 
 logger = logging.getLogger(__name__)
 
+# Budget temps total de la centralité (PageRank + betweenness), en secondes
+CENTRALITY_BUDGET_S = float(os.getenv("GATEKEEPER_CENTRALITY_BUDGET_S", "10"))
+# Critère d'arrêt PageRank : ||x_k - x_k-1||_1 < n * tol (comme networkx)
+PAGERANK_TOL = float(os.getenv("GATEKEEPER_PAGERANK_TOL", "1e-6"))
+PAGERANK_ALPHA = 0.85
+PAGERANK_MAX_ITER = 100
+# Betweenness échantillonnée : erreur additive max ε (normalisée) avec proba 1-δ
+BETWEENNESS_EPSILON = float(os.getenv("GATEKEEPER_BETWEENNESS_EPSILON", "0.2"))
+BETWEENNESS_DELTA = float(os.getenv("GATEKEEPER_BETWEENNESS_DELTA", "0.1"))
+BETWEENNESS_SEED = 42
+
+
+def betweenness_pivots(n: int, epsilon: float, delta: float) -> int:
+    """
+    Nombre de pivots garantissant |b~(v) - b(v)| <= ε pour tout v avec proba 1-δ.
+
+    Borne de Hoeffding + union bound sur les n nœuds : chaque pivot apporte
+    une contribution normalisée dans [0, 1], d'où k = ln(2n/δ) / (2ε²).
+    """
+    if n <= 2:
+        return n
+    return min(n, math.ceil(math.log(2 * n / delta) / (2 * epsilon ** 2)))
+
+
+def betweenness_error_bound(n: int, pivots: int, delta: float) -> float:
+    """Borne ε atteinte avec `pivots` pivots (0.0 si calcul exact)."""
+    if pivots >= n:
+        return 0.0
+    if pivots <= 0:
+        return 1.0
+    return math.sqrt(math.log(2 * n / delta) / (2 * pivots))
+
+
+def sparse_pagerank(
+    weights: sparse.csr_matrix,
+    alpha: float = PAGERANK_ALPHA,
+    tol: float = PAGERANK_TOL,
+    max_iter: int = PAGERANK_MAX_ITER,
+    deadline: Optional[float] = None,
+) -> Tuple[np.ndarray, int, bool]:
+    """
+    PageRank pondéré par power iteration (même itération que nx.pagerank).
+
+    Returns:
+        (scores, itérations, convergé) — en cas d'échéance ou de max_iter
+        atteint, le dernier itéré est rendu (approximation, pas des zéros)
+    """
+    n = weights.shape[0]
+    out_weight = np.asarray(weights.sum(axis=1)).ravel()
+    inv_out = np.divide(1.0, out_weight, out=np.zeros(n), where=out_weight != 0)
+    transition_t = (sparse.diags(inv_out) @ weights).T.tocsr()
+    dangling = out_weight == 0
+
+    x = np.full(n, 1.0 / n)
+    iteration = 0
+    for iteration in range(1, max_iter + 1):
+        x_last = x
+        x = alpha * (transition_t @ x_last + x_last[dangling].sum() / n) + (1 - alpha) / n
+        if np.abs(x - x_last).sum() < n * tol:
+            return x, iteration, True
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+    return x, iteration, False
+
+
+def sampled_betweenness(
+    weights: sparse.csr_matrix,
+    pivots: int,
+    seed: int = BETWEENNESS_SEED,
+    deadline: Optional[float] = None,
+) -> Tuple[np.ndarray, int]:
+    """
+    Betweenness normalisée (poids = distances) estimée depuis `pivots` sources.
+
+    Brandes (Dijkstra + accumulation) depuis chaque pivot, puis mise à
+    l'échelle de networkx (betweenness_centrality(k=...)) : identique au
+    calcul exact quand pivots >= n. Les pivots sont tirés une fois ; si
+    l'échéance tombe, l'estimation utilise les pivots déjà traités.
+
+    Returns:
+        (scores, pivots effectivement traités)
+    """
+    n = weights.shape[0]
+    bc = [0.0] * n
+    if n <= 2 or pivots <= 0:
+        return np.zeros(n), 0
+
+    indptr, indices, data = weights.indptr, weights.indices, weights.data
+    adjacency = [
+        [(int(w), float(d)) for w, d in zip(indices[indptr[v]:indptr[v + 1]], data[indptr[v]:indptr[v + 1]]) if w != v]
+        for v in range(n)
+    ]
+    sources = list(range(n)) if pivots >= n else random.Random(seed).sample(range(n), pivots)
+
+    done = 0
+    for s in sources:
+        if deadline is not None and done and time.monotonic() >= deadline:
+            break
+        # Dijkstra (variante Eppstein de networkx) avec comptage des plus courts chemins
+        stack: List[int] = []
+        preds: List[List[int]] = [[] for _ in range(n)]
+        sigma = [0.0] * n
+        sigma[s] = 1.0
+        seen = [math.inf] * n
+        seen[s] = 0.0
+        visited = [False] * n
+        counter = count()
+        heap = [(0.0, next(counter), s, s)]
+        while heap:
+            dist, _, pred, v = heappop(heap)
+            if visited[v]:
+                continue
+            sigma[v] += sigma[pred]
+            stack.append(v)
+            visited[v] = True
+            for w, weight in adjacency[v]:
+                vw_dist = dist + weight
+                if not visited[w] and vw_dist < seen[w]:
+                    seen[w] = vw_dist
+                    heappush(heap, (vw_dist, next(counter), v, w))
+                    sigma[w] = 0.0
+                    preds[w] = [v]
+                elif vw_dist == seen[w]:
+                    sigma[w] += sigma[v]
+                    preds[w].append(v)
+        # Accumulation des dépendances
+        delta = [0.0] * n
+        while stack:
+            w = stack.pop()
+            coeff = (1 + delta[w]) / sigma[w]
+            for v in preds[w]:
+                delta[v] += sigma[v] * coeff
+            if w != s:
+                bc[w] += delta[w]
+        done += 1
+
+    scores = np.asarray(bc)
+    # Normalisation (paires (s, t) valides, extrémités exclues) — cf networkx _rescale
+    n_pairs = n - 1
+    if done >= n:
+        return scores / (n_pairs * (n_pairs - 1)), done
+    sampled = np.zeros(n, dtype=bool)
+    sampled[sources[:done]] = True
+    scale_source = 1 / ((done - 1) * (n_pairs - 1)) if done > 1 else 0.0
+    scale_other = 1 / (done * (n_pairs - 1))
+    return np.where(sampled, scores * scale_source, scores * scale_other), done
+
+
+def degree_centrality(weights: sparse.csr_matrix) -> np.ndarray:
+    """nx.degree_centrality sur la matrice d'adjacence (boucle comptée 2 fois)."""
+    n = weights.shape[0]
+    if n <= 1:
+        return np.ones(n)
+    self_loops = weights.diagonal() != 0
+    degree = np.diff(weights.indptr) + self_loops
+    return degree / (n - 1)
+
 
 class GraphCentralityScorer:
     """
@@ -43,7 +218,11 @@ class GraphCentralityScorer:
         min_centrality: float = 0.15,
         centrality_weights: Dict[str, float] = None,
         enable_tf_idf: bool = True,
-        enable_salience: bool = True
+        enable_salience: bool = True,
+        centrality_budget_s: float = CENTRALITY_BUDGET_S,
+        pagerank_tol: float = PAGERANK_TOL,
+        betweenness_epsilon: float = BETWEENNESS_EPSILON,
+        betweenness_delta: float = BETWEENNESS_DELTA,
     ):
         """
         Initialiser le scorer.
@@ -53,6 +232,10 @@ class GraphCentralityScorer:
             centrality_weights: Poids pour PageRank/Degree/Betweenness
             enable_tf_idf: Activer TF-IDF weighting
             enable_salience: Activer salience scoring (position)
+            centrality_budget_s: Budget temps PageRank + betweenness (échéance)
+            pagerank_tol: Tolérance de convergence PageRank
+            betweenness_epsilon: Erreur additive max de la betweenness échantillonnée
+            betweenness_delta: Probabilité de dépasser betweenness_epsilon
         """
         self.min_centrality = min_centrality
         self.centrality_weights = centrality_weights or {
@@ -62,6 +245,12 @@ class GraphCentralityScorer:
         }
         self.enable_tf_idf = enable_tf_idf
         self.enable_salience = enable_salience
+        self.centrality_budget_s = centrality_budget_s
+        self.pagerank_tol = pagerank_tol
+        self.betweenness_epsilon = betweenness_epsilon
+        self.betweenness_delta = betweenness_delta
+        # Diagnostics du dernier calcul de centralité (itérations, pivots, ε, durée)
+        self.last_centrality_stats: Dict[str, Any] = {}
 
         logger.info(
             f"[OSMOSE] GraphCentralityScorer initialisé "
@@ -113,8 +302,8 @@ class GraphCentralityScorer:
             f"(doc_length={len(full_text)} chars)"
         )
 
-        # 1. Build co-occurrence graph
-        graph = self._build_cooccurrence_graph(candidates, full_text)
+        # 1. Build co-occurrence graph (matrice d'adjacence creuse)
+        nodes, weights = self._cooccurrence_matrix(candidates, full_text)
 
         # 2. Calculate TF-IDF weights (optionnel)
         tf_idf_scores = {}
@@ -122,7 +311,7 @@ class GraphCentralityScorer:
             tf_idf_scores = self._calculate_tf_idf(candidates, full_text)
 
         # 3. Calculate centrality scores
-        centrality_scores = self._calculate_centrality(graph)
+        centrality_scores = self._centrality_from_matrix(nodes, weights)
 
         # 4. Calculate salience scores (optionnel)
         salience_scores = {}
@@ -199,9 +388,34 @@ class GraphCentralityScorer:
         Returns:
             Graph NetworkX avec poids TF-IDF sur edges
         """
+        nodes, weights = self._cooccurrence_matrix(candidates, full_text)
         graph = nx.Graph()
+        graph.add_nodes_from(nodes)
+        upper = sparse.triu(weights).tocoo()
+        graph.add_weighted_edges_from(
+            (nodes[i], nodes[j], float(w)) for i, j, w in zip(upper.row, upper.col, upper.data)
+        )
+        return graph
 
-        # Déterminer fenêtre adaptive
+    def _cooccurrence_matrix(
+        self,
+        candidates: List[Dict[str, Any]],
+        full_text: str
+    ) -> Tuple[List[str], sparse.csr_matrix]:
+        """
+        Matrice d'adjacence creuse du graphe de co-occurrence.
+
+        Une entité est présente dans une fenêtre glissante de mots si tous
+        ses mots y figurent. Plutôt que de tester chaque entité dans chaque
+        fenêtre, on construit la matrice de présence W (fenêtres × entités)
+        depuis les positions des mots, et W^T W donne en une fois le nombre
+        de fenêtres partagées par chaque paire. Les comptes sont ceux de
+        l'ancienne boucle, doublons de candidats compris (paire comptée
+        m_e × m_f fois, boucle e-e comptée C(m_e, 2) fois).
+
+        Returns:
+            (nœuds dans l'ordre des candidats, matrice symétrique de poids log(count + 1))
+        """
         window_size = self._get_adaptive_window_size(len(full_text))
 
         # Extraire tous les noms d'entités (normalisés)
@@ -210,50 +424,71 @@ class GraphCentralityScorer:
             for e in candidates
             if (e.get("text") or e.get("name"))
         ]
-
-        if not entity_names:
-            return graph
-
-        # Ajouter tous les nœuds
-        for name in entity_names:
-            graph.add_node(name)
+        nodes = list(dict.fromkeys(entity_names))
+        n = len(nodes)
 
         # Tokeniser le texte (mots simples)
         words = re.findall(r'\b\w+\b', full_text.lower())
-
-        # Sliding window pour détecter co-occurrences
-        cooccurrences = defaultdict(int)
-
-        for i in range(len(words) - window_size + 1):
-            window = words[i:i + window_size]
-
-            # Trouver entités dans cette fenêtre
-            entities_in_window = []
-            for entity_name in entity_names:
-                # Check si l'entité est dans la fenêtre (approximatif)
-                entity_words = entity_name.split()
-                if all(word in window for word in entity_words):
-                    entities_in_window.append(entity_name)
-
-            # Ajouter co-occurrences (paires uniques)
-            if len(entities_in_window) >= 2:
-                for j, e1 in enumerate(entities_in_window):
-                    for e2 in entities_in_window[j + 1:]:
-                        pair = tuple(sorted([e1, e2]))
-                        cooccurrences[pair] += 1
-
-        # Ajouter edges avec poids
-        for (e1, e2), count in cooccurrences.items():
-            # Poids: log(count) pour éviter domination des paires fréquentes
-            weight = math.log(count + 1)
-            graph.add_edge(e1, e2, weight=weight)
+        n_windows = len(words) - window_size + 1
+        if not nodes or n_windows <= 0:
+            return nodes, sparse.csr_matrix((n, n))
+
+        positions: Dict[str, List[int]] = defaultdict(list)
+        for i, word in enumerate(words):
+            positions[word].append(i)
+
+        window_rows = []
+        entity_cols = []
+        for col, name in enumerate(nodes):
+            present = np.ones(n_windows, dtype=bool)
+            for word in set(name.split()):
+                if word not in positions:
+                    present[:] = False
+                    break
+                present &= self._word_window_coverage(positions[word], n_windows, window_size)
+            rows = np.flatnonzero(present)
+            window_rows.append(rows)
+            entity_cols.append(np.full(len(rows), col))
+
+        rows = np.concatenate(window_rows)
+        presence = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, np.concatenate(entity_cols))),
+            shape=(n_windows, n),
+        )
+        shared = (presence.T @ presence).tocoo()
+
+        name_counts = Counter(entity_names)
+        multiplicity = np.array([name_counts[name] for name in nodes], dtype=np.float64)
+        counts = np.where(
+            shared.row == shared.col,
+            shared.data * multiplicity[shared.row] * (multiplicity[shared.row] - 1) / 2,
+            shared.data * multiplicity[shared.row] * multiplicity[shared.col],
+        )
+        keep = counts > 0
+        # Poids: log(count) pour éviter domination des paires fréquentes
+        weights = sparse.csr_matrix(
+            (np.log(counts[keep] + 1), (shared.row[keep], shared.col[keep])),
+            shape=(n, n),
+        )
 
         logger.debug(
-            f"[OSMOSE] Graph construit: {graph.number_of_nodes()} nœuds, "
-            f"{graph.number_of_edges()} edges (window={window_size})"
+            f"[OSMOSE] Graph construit: {n} nœuds, "
+            f"{(weights.nnz + int((weights.diagonal() != 0).sum())) // 2} edges (window={window_size})"
         )
 
-        return graph
+        return nodes, weights
+
+    @staticmethod
+    def _word_window_coverage(word_positions: List[int], n_windows: int, window_size: int) -> np.ndarray:
+        """Fenêtres [i, i + window_size) contenant au moins une occurrence du mot."""
+        pos = np.asarray(word_positions)
+        starts = np.maximum(pos - window_size + 1, 0)
+        ends = np.minimum(pos, n_windows - 1) + 1
+        valid = starts < ends
+        diff = np.zeros(n_windows + 1, dtype=np.int64)
+        np.add.at(diff, starts[valid], 1)
+        np.add.at(diff, ends[valid], -1)
+        return np.cumsum(diff[:-1]) > 0
 
     def _calculate_tf_idf(
         self,
@@ -284,6 +519,7 @@ class GraphCentralityScorer:
 
         # Calculer fréquence de chaque mot (pour IDF)
         word_counts = Counter(words)
+        max_word_freq = max(word_counts.values())
 
         # Calculer TF-IDF pour chaque entité
         for entity in candidates:
@@ -300,7 +536,6 @@ class GraphCentralityScorer:
             # Approximation: IDF basé sur fréquence relative (single doc)
             # Termes rares (faible fréquence) → IDF élevé
             # Termes fréquents → IDF faible
-            max_word_freq = max(word_counts.values())
             avg_word_freq = sum(word_counts.get(w, 0) for w in entity_words) / len(entity_words)
 
             # IDF inversement proportionnel à la fréquence relative
@@ -335,82 +570,99 @@ class GraphCentralityScorer:
         Returns:
             Dict {entity_name → centrality_score [0-1]}
         """
-        scores = {}
+        nodes = list(graph.nodes())
+        if not nodes:
+            return {}
+        weights = nx.to_scipy_sparse_array(graph, nodelist=nodes, weight="weight", format="csr")
+        return self._centrality_from_matrix(nodes, sparse.csr_matrix(weights))
 
-        if graph.number_of_nodes() == 0:
+    def _centrality_from_matrix(
+        self,
+        nodes: List[str],
+        weights: sparse.csr_matrix
+    ) -> Dict[str, float]:
+        """
+        Centralité combinée sur la matrice d'adjacence creuse, à coût borné.
+
+        PageRank puis betweenness partagent une échéance unique
+        (centrality_budget_s) : PageRank rend son dernier itéré, la
+        betweenness s'estime sur les pivots déjà traités. Diagnostics dans
+        self.last_centrality_stats.
+        """
+        scores: Dict[str, float] = {}
+        n = len(nodes)
+
+        if n == 0:
             return scores
 
         # Éviter calculs sur graphes vides ou trop petits
-        if graph.number_of_edges() == 0:
+        if weights.nnz == 0:
             # Graphe sans edges: tous les nœuds ont score 0
-            for node in graph.nodes():
+            for node in nodes:
                 scores[node] = 0.0
             return scores
 
+        t0 = time.monotonic()
+        deadline = t0 + self.centrality_budget_s
+
         # 1. PageRank (importance globale)
-        # P1.3: Timeout 10s pour éviter PageRank infini sur graphes complexes
         try:
-            import signal
-
-            def timeout_handler(signum, frame):
-                raise TimeoutError("PageRank timeout après 10s")
-
-            # Activer timeout (UNIX uniquement, skip sur Windows)
-            try:
-                signal.signal(signal.SIGALRM, timeout_handler)
-                signal.alarm(10)  # 10 secondes max
-            except AttributeError:
-                # Windows n'a pas SIGALRM, skip timeout
-                pass
-
-            try:
-                pagerank = nx.pagerank(graph, weight="weight", max_iter=100)
-            finally:
-                try:
-                    signal.alarm(0)  # Désactiver timeout
-                except AttributeError:
-                    pass
-
-        except TimeoutError as te:
-            logger.warning(f"[OSMOSE] PageRank timeout (P1.3 protection): {te}, fallback degree centrality")
-            pagerank = {node: 0.0 for node in graph.nodes()}
+            pagerank, iterations, converged = sparse_pagerank(
+                weights, tol=self.pagerank_tol, deadline=deadline
+            )
         except Exception as e:
             logger.warning(f"[OSMOSE] PageRank échoué: {e}, utilisation degree centrality")
-            pagerank = {node: 0.0 for node in graph.nodes()}
+            pagerank, iterations, converged = np.zeros(n), 0, False
+        if not converged:
+            logger.warning(
+                f"[OSMOSE] PageRank non convergé ({iterations} itérations, "
+                f"budget {self.centrality_budget_s}s), dernier itéré utilisé"
+            )
 
         # 2. Degree Centrality (nombre de connexions)
-        degree_centrality = nx.degree_centrality(graph)
+        degree = degree_centrality(weights)
 
-        # 3. Betweenness Centrality (position de pont)
+        # 3. Betweenness Centrality (position de pont), échantillonnée si n > k
+        target_pivots = betweenness_pivots(n, self.betweenness_epsilon, self.betweenness_delta)
         try:
-            betweenness = nx.betweenness_centrality(graph, weight="weight")
+            betweenness, pivots = sampled_betweenness(weights, target_pivots, deadline=deadline)
         except Exception as e:
             logger.warning(f"[OSMOSE] Betweenness échoué: {e}, utilisation 0.0")
-            betweenness = {node: 0.0 for node in graph.nodes()}
+            betweenness, pivots = np.zeros(n), 0
+
+        elapsed = time.monotonic() - t0
+        self.last_centrality_stats = {
+            "nodes": n,
+            "edges": (weights.nnz + int((weights.diagonal() != 0).sum())) // 2,
+            "pagerank_iterations": iterations,
+            "pagerank_converged": converged,
+            "betweenness_pivots": pivots,
+            "betweenness_target_pivots": target_pivots,
+            "betweenness_epsilon": round(betweenness_error_bound(n, pivots, self.betweenness_delta), 4),
+            "budget_exhausted": time.monotonic() >= deadline,
+            "elapsed_ms": int(elapsed * 1000),
+        }
+        if pivots < target_pivots:
+            logger.warning(
+                f"[OSMOSE] Betweenness: budget {self.centrality_budget_s}s atteint après "
+                f"{pivots}/{target_pivots} pivots (ε≈{self.last_centrality_stats['betweenness_epsilon']})"
+            )
+        logger.debug(f"[OSMOSE] Centrality stats: {self.last_centrality_stats}")
 
         # Normalisation de PageRank [0-1]
-        max_pagerank = max(pagerank.values()) if pagerank else 1.0
-        pagerank_norm = {
-            node: score / max_pagerank if max_pagerank > 0 else 0.0
-            for node, score in pagerank.items()
-        }
+        max_pagerank = float(pagerank.max())
+        pagerank_norm = pagerank / max_pagerank if max_pagerank > 0 else np.zeros(n)
 
         # Betweenness déjà normalisé [0-1]
 
         # 4. Combinaison pondérée
-        for node in graph.nodes():
-            pr = pagerank_norm.get(node, 0.0)
-            dc = degree_centrality.get(node, 0.0)
-            bc = betweenness.get(node, 0.0)
-
-            # Poids configurables
-            combined = (
-                self.centrality_weights["pagerank"] * pr +
-                self.centrality_weights["degree"] * dc +
-                self.centrality_weights["betweenness"] * bc
-            )
-
-            scores[node] = combined
+        combined = (
+            self.centrality_weights["pagerank"] * pagerank_norm +
+            self.centrality_weights["degree"] * degree +
+            self.centrality_weights["betweenness"] * betweenness
+        )
+        for node, score in zip(nodes, combined):
+            scores[node] = float(score)
 
         return scores
 
@@ -441,6 +693,7 @@ class GraphCentralityScorer:
         # Zones spéciales (approximatif)
         # Titre/Abstract: premiers 10% du texte
         title_zone_end = int(text_length * 0.1)
+        text_lower = full_text.lower()
 
         for entity in candidates:
             entity_name = (entity.get("text", "") or entity.get("name", "")).lower()
@@ -449,7 +702,6 @@ class GraphCentralityScorer:
 
             # Trouver toutes les positions de l'entité
             positions = []
-            text_lower = full_text.lower()
             start = 0
             while True:
                 pos = text_lower.find(entity_name, start)
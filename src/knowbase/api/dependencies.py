@@ -2,7 +2,7 @@
 
 import logging
 from functools import lru_cache
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 from fastapi import Request
 
@@ -16,6 +16,9 @@ from knowbase.config.settings import get_settings
 from fastapi import Depends, HTTPException, status, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+if TYPE_CHECKING:
+    from knowbase.common.preload import PreloadReport
+
 
 @lru_cache(maxsize=1)
 def get_logger() -> logging.Logger:
@@ -30,13 +33,33 @@ def configure_logging() -> logging.Logger:
     return setup_logging(settings.logs_dir, "app_debug.log", "knowbase.api")
 
 
-def warm_clients() -> None:
-    ensure_qdrant_collection(
-        get_settings().qdrant_collection,
-        get_sentence_transformer().get_sentence_embedding_dimension() or 1024,
-    )
-    get_openai_client()
-    get_qdrant_client()
+def warm_clients() -> PreloadReport:
+    """Précharge les clients du rôle `api` (OSMOSE_PRELOAD_API pour surcharger).
+
+    Défaut : collection Qdrant (charge l'encodeur pour la dimension), OpenAI,
+    Qdrant. `reranker` et `embeddings` sont disponibles en option ; tout ce
+    qui n'est pas préchargé est chargé à la première requête.
+    """
+    from knowbase.common.preload import ROLE_API, run_preloads
+
+    def _ensure_collection() -> None:
+        ensure_qdrant_collection(
+            get_settings().qdrant_collection,
+            get_sentence_transformer().get_sentence_embedding_dimension() or 1024,
+        )
+
+    def _reranker() -> None:
+        from knowbase.common.clients.reranker import get_cross_encoder
+
+        get_cross_encoder()
+
+    return run_preloads(ROLE_API, {
+        "qdrant_collection": _ensure_collection,
+        "embeddings": lambda: get_sentence_transformer(),
+        "openai": lambda: get_openai_client(),
+        "qdrant": lambda: get_qdrant_client(),
+        "reranker": _reranker,
+    })
 
 
 # === Auth dependencies (Phase 0) ===
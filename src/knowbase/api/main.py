@@ -13,14 +13,9 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from knowbase.api.dependencies import configure_logging, get_settings, warm_clients
-from knowbase.api.routers import ingest, search, status, imports, solutions, downloads, token_analysis, facts, ontology, entities, entity_types, jobs, document_types, admin, auth, documents, concepts, domain_context, insights, sessions, claims, entity_resolution, burst, navigation, analytics, markers, claimfirst, verify, gpu, backup, wiki, kg_hygiene, domain_packs, post_import, corpus_intelligence, atlas, kg_health, relations_explorer, runtime_v2, runtime_v3, runtime_v4, runtime_v4_poc, runtime_v4_2, runtime_v5, runtime_v6
-# Pipeline Stratified V2 — DEPRECATED 2026-05-01 (cf project_dispatcher_docs_in_stale.md).
-# Le pipeline productif est ClaimFirst. Stratified V2 produisait concepts=0/osmose_s=0
-# systématiquement. Router non inclus mais le code reste (utilities pass0/pass1 utilisées par ClaimFirst).
-# from knowbase.stratified.api import router as stratified_v2_router
-# MVP V1 - Challenge de Texte (Usage B)
-from knowbase.api.routers import challenge as challenge_router
-# living_ontology désactivé - génère trop de bruit en mode domain-agnostic (voir OSMOSE_STATUS_ACTUEL.md)
+from knowbase.api.router_registry import include_routers
+# Routers déclarés dans router_registry.ROUTER_SPECS, importés dans create_app()
+# (Stratified V2 et living_ontology non montés, cf. commentaires du registre).
 
 
 def create_app() -> FastAPI:
@@ -226,85 +221,9 @@ def create_app() -> FastAPI:
     if public_root.exists():
         app.mount("/static", StaticFiles(directory=public_root), name="static")
 
-    app.include_router(search.router, prefix="/api")  # Search API - enrichi KG
-    app.include_router(ingest.router)
-    app.include_router(status.router, prefix="/api")
-    app.include_router(imports.router, prefix="/api")
-    app.include_router(solutions.router)  # Déjà avec préfixe /api/solutions
-    app.include_router(downloads.router)  # Déjà avec préfixe /api/downloads
-    app.include_router(token_analysis.router, prefix="/api")  # Analyse des tokens et coûts
-    app.include_router(facts.router, prefix="/api")  # Facts API - Neo4j Native (Phase 2)
-    app.include_router(ontology.router, prefix="/api")  # Ontology API - Catalogues entités
-    app.include_router(entities.router, prefix="/api")  # Entities API - Gestion entités dynamiques (Phase 1)
-    app.include_router(entity_types.router, prefix="/api")  # Entity Types Registry - Workflow validation types (Phase 2)
-    app.include_router(jobs.router, prefix="/api")  # Jobs API - Monitoring jobs async RQ (Phase 5B)
-    app.include_router(document_types.router, prefix="/api")  # Document Types - Guidage extraction LLM (Phase 6)
-    app.include_router(documents.router, prefix="/api")  # Documents API - Document Backbone lifecycle (Phase 1 Week 4)
-    app.include_router(admin.router, prefix="/api")  # Admin API - Purge data, health check (Phase 7)
-    app.include_router(auth.router, prefix="/api")  # Auth API - JWT Authentication (Phase 0)
-    app.include_router(concepts.router, prefix="/api")  # Concepts API - Explain concepts (Phase 2 POC)
-    app.include_router(domain_context.router, prefix="/api")  # Domain Context - Configuration contexte métier global
-    app.include_router(insights.router, prefix="/api")  # 🌊 OSMOSE Insights - Découverte connaissances cachées (Phase 2.3)
-    # living_ontology.router désactivé - fonctionnalité mise en pause (génère du bruit)
-    app.include_router(sessions.router, prefix="/api")  # 🧠 Memory Layer - Sessions de conversation (Phase 2.5)
-    app.include_router(claims.router)  # 🌊 OSMOSE Claims API - KG/RAG Contract, consolidation (Phase 2.11)
-    app.include_router(entity_resolution.router)  # 🌊 OSMOSE Entity Resolution - Déduplication cross-doc (Phase 2.12)
-    app.include_router(burst.router)  # 🚀 OSMOSE Burst Mode - EC2 Spot compute provider (Phase 2)
-    app.include_router(navigation.router, prefix="/api")  # 🧭 Navigation Layer - Exploration corpus-level (ADR)
-    app.include_router(analytics.router, prefix="/api")  # 📊 Import Analytics - Dashboard analyse imports V2
-    app.include_router(markers.router, prefix="/api")  # 🏷️ Markers API - Liste markers pour diff queries (PR3)
-    app.include_router(corpus_intelligence.router, prefix="/api")  # 🧠 Corpus Intelligence - Heatmap, Bubble, Audit, Contradictions
-    app.include_router(kg_health.router, prefix="/api")  # 🩺 KG Health Score - Diagnostic intrinseque qualite du graphe
-    app.include_router(relations_explorer.router, prefix="/api")  # 🔗 Relations Explorer V3.3 - Mini-runtime LOGICAL_RELATION (S3.E)
-    # Runtime V1.1 supprimé 30/04/2026 (P1) — voir runtime_v2 ci-dessous
-    app.include_router(runtime_v2.router, prefix="/api")  # 🌟 Runtime V2 — Pipeline anchor-driven (Vision recentrée 30/04/2026)
-    app.include_router(runtime_v3.router, prefix="/api")  # 🌟 Runtime V3 — Refonte minimaliste 5 stages (CH-39, 2026-05-05)
-    app.include_router(runtime_v4.router, prefix="/api")  # 🌟 Runtime V4 — Pipeline Facts-First (CH-41 + CH-42 leviers, 2026-05-07)
-    app.include_router(runtime_v4_poc.router, prefix="/api")  # 🧪 Runtime V4 POC — Tiered Architecture (CH-49.POC, 2026-05-09)
-    app.include_router(runtime_v4_2.router, prefix="/api")  # 🌟 Runtime V4.2 — Tiered Pipeline production (CH-49 Phase 1, 2026-05-10)
-    app.include_router(runtime_v5.router)  # 🌟 Runtime V5.1 — Reading Agent (CH-52, 2026-05-13) — prefix interne /api/runtime_v5
-    app.include_router(runtime_v6.router, prefix="/api")  # 🌟 Runtime V6 — Parse→Plan→Execute→Evaluate→Synthesize (Phase A3, 2026-05-21)
-
-    # 🖥️ OSMOSE GPU Infrastructure - Health check & restart services EC2
-    app.include_router(gpu.router)  # Endpoints: /api/gpu/health, /api/gpu/restart-service
-
-    # 🔥 OSMOSE Pipeline Claim-First (Pivot Épistémique)
-    app.include_router(claimfirst.router)  # Endpoints: /api/claimfirst/status, /api/claimfirst/jobs, etc.
-
-    # 🌊 Stratified V2 router DÉPRECATED 2026-05-01 — endpoints retournent 404.
-    # Voir project_dispatcher_docs_in_stale.md. Pipeline productif = ClaimFirst.
-    # app.include_router(stratified_v2_router, prefix="/api")
-
-    # 🌊 OSMOSE MVP V1 - Challenge de Texte (Usage B)
-    app.include_router(challenge_router.router)  # Endpoint: /api/v2/challenge
-
-    # 🔍 OSMOSE Verification - Vérification texte contre KG
-    app.include_router(verify.router)  # Endpoints: /api/verify/analyze, /api/verify/correct
-
-    # 💾 OSMOSE Backup & Restore - Sauvegarde et restauration complète
-    app.include_router(backup.router, prefix="/api")  # Endpoints: /api/backup/list, /api/backup/create, etc.
-
-    # 📚 OSMOSE Wiki — Generation Console (Phase 3 Concept Assembly Engine)
-    app.include_router(wiki.router)  # Endpoints: /api/wiki/generate, /api/wiki/status, /api/wiki/article, /api/wiki/concepts/search
-
-    # 🌊 OSMOSE Atlas — Narrative knowledge atlas (dual-axis: product + theme)
-    app.include_router(atlas.router)  # Endpoints: /api/atlas/homepage, /api/atlas/topics, /api/atlas/topic/{id}
-
-    # 🧹 OSMOSE KG Hygiene — Nettoyage autonome + Rollback
-    app.include_router(kg_hygiene.router)  # Endpoints: /api/admin/kg-hygiene/run, /actions, /stats, etc.
-
-    # 📦 OSMOSE Domain Packs — Packages métier activables (NER spécialisé)
-    app.include_router(domain_packs.router)  # Endpoints: /api/admin/domain-packs/
-
-    # 🔄 OSMOSE Post-Import — Pipeline enrichissement qualité KG
-    app.include_router(post_import.router)  # Endpoints: /api/admin/post-import/
-
-    from knowbase.api.routers import benchmarks
-    app.include_router(benchmarks.router)  # Endpoints: /api/benchmarks
-
-    # 🗺️ OSMOSE Carte du Référentiel — anatomie documentaire (#456)
-    from knowbase.api.routers import referentiel
-    app.include_router(referentiel.router)  # Endpoints: /api/referentiel/map, /api/referentiel/tensions
+    # Routers : import + montage via le registre (désactivation / montage
+    # différé par API_DISABLED_ROUTERS / API_LAZY_ROUTERS)
+    app.state.router_report = include_routers(app)
 
     return app
 
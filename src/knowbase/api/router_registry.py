@@ -0,0 +1,247 @@
+"""
+Registre des routers de l'API.
+
+main.py importait ~45 routers en tête de module : chaque reload uvicorn
+payait l'import de tous les runtime_* (pipelines, clients Neo4j, modèles)
+avant de servir la moindre requête. Les routers sont désormais déclarés ici
+(module, préfixe, groupe) et importés par include_routers() au moment de
+l'assemblage, avec le temps d'import de chacun.
+
+Variables d'environnement (noms de routers ou de groupes, séparés par des
+virgules) :
+
+    API_DISABLED_ROUTERS="runtime_legacy,benchmarks"   # non montés
+    API_LAZY_ROUTERS="runtime_legacy,admin"            # montés à la 1re requête
+
+Un router différé est importé et monté par un middleware à la première
+requête dont le chemin commence par son `path_prefix` (ou sur /openapi.json) ;
+seuls les routers dont le préfixe d'URL est connu peuvent être différés, les
+autres restent montés au démarrage.
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from fastapi import FastAPI, Request
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+ROUTERS_PACKAGE = "knowbase.api.routers"
+
+DISABLED_ROUTERS_ENV = "API_DISABLED_ROUTERS"
+LAZY_ROUTERS_ENV = "API_LAZY_ROUTERS"
+
+
+@dataclass(frozen=True)
+class RouterSpec:
+    """Déclaration d'un router : module sous knowbase.api.routers + montage."""
+
+    module: str
+    prefix: str = ""
+    group: str = "core"
+    # Préfixe d'URL complet servi par le router (requis pour le montage différé)
+    path_prefix: Optional[str] = None
+
+    @property
+    def import_path(self) -> str:
+        return f"{ROUTERS_PACKAGE}.{self.module}"
+
+    def matches(self, selectors: Set[str]) -> bool:
+        return self.module in selectors or self.group in selectors
+
+    def serves(self, path: str) -> bool:
+        return self.path_prefix is not None and (
+            path == self.path_prefix or path.startswith(self.path_prefix + "/")
+        )
+
+
+# Ordre = ordre de montage historique (l'ordre compte pour les routes en conflit)
+ROUTER_SPECS: tuple = (
+    RouterSpec("search", "/api"),  # Search API - enrichi KG
+    RouterSpec("ingest"),
+    RouterSpec("status", "/api"),
+    RouterSpec("imports", "/api"),
+    RouterSpec("solutions", path_prefix="/api/solutions"),
+    RouterSpec("downloads", path_prefix="/api/downloads"),
+    RouterSpec("token_analysis", "/api", path_prefix="/api/tokens"),  # Analyse des tokens et coûts
+    RouterSpec("facts", "/api", path_prefix="/api/facts"),  # Facts API - Neo4j Native (Phase 2)
+    RouterSpec("ontology", "/api", path_prefix="/api/ontology"),  # Catalogues entités
+    RouterSpec("entities", "/api", path_prefix="/api/entities"),  # Gestion entités dynamiques (Phase 1)
+    RouterSpec("entity_types", "/api", path_prefix="/api/entity-types"),  # Workflow validation types (Phase 2)
+    RouterSpec("jobs", "/api", path_prefix="/api/jobs"),  # Monitoring jobs async RQ (Phase 5B)
+    RouterSpec("document_types", "/api", path_prefix="/api/document-types"),  # Guidage extraction LLM (Phase 6)
+    RouterSpec("documents", "/api", path_prefix="/api/documents"),  # Document Backbone lifecycle
+    RouterSpec("admin", "/api", path_prefix="/api/admin"),  # Purge data, health check (Phase 7)
+    RouterSpec("auth", "/api", path_prefix="/api/auth"),  # JWT Authentication (Phase 0)
+    RouterSpec("concepts", "/api", path_prefix="/api/concepts"),  # Explain concepts (Phase 2 POC)
+    RouterSpec("domain_context", "/api", path_prefix="/api/domain-context"),  # Contexte métier global
+    RouterSpec("insights", "/api", path_prefix="/api/insights"),  # 🌊 OSMOSE Insights (Phase 2.3)
+    # living_ontology désactivé - fonctionnalité mise en pause (génère du bruit)
+    RouterSpec("sessions", "/api", path_prefix="/api/sessions"),  # 🧠 Memory Layer (Phase 2.5)
+    RouterSpec("claims", path_prefix="/api/claims"),  # 🌊 KG/RAG Contract, consolidation (Phase 2.11)
+    RouterSpec("entity_resolution", path_prefix="/api/entity-resolution"),  # Déduplication cross-doc (Phase 2.12)
+    RouterSpec("burst", group="admin", path_prefix="/api/burst"),  # 🚀 EC2 Spot compute provider
+    RouterSpec("navigation", "/api", path_prefix="/api/navigation"),  # 🧭 Navigation Layer
+    RouterSpec("analytics", "/api", path_prefix="/api/analytics"),  # 📊 Import Analytics V2
+    RouterSpec("markers", "/api", path_prefix="/api/markers"),  # 🏷️ Markers pour diff queries (PR3)
+    RouterSpec("corpus_intelligence", "/api", path_prefix="/api/corpus-intelligence"),  # 🧠 Heatmap, Audit...
+    RouterSpec("kg_health", "/api", path_prefix="/api/kg-health"),  # 🩺 KG Health Score
+    RouterSpec("relations_explorer", "/api", group="admin", path_prefix="/api/admin/relations"),  # 🔗 V3.3
+    # Runtime V1.1 supprimé 30/04/2026 (P1)
+    RouterSpec("runtime_v2", "/api", group="runtime_legacy", path_prefix="/api/runtime_v2"),  # anchor-driven
+    RouterSpec("runtime_v3", "/api", group="runtime_legacy", path_prefix="/api/runtime_v3"),  # 5 stages (CH-39)
+    RouterSpec("runtime_v4", "/api", group="runtime_legacy", path_prefix="/api/runtime_v4"),  # Facts-First (CH-41)
+    RouterSpec("runtime_v4_poc", "/api", group="runtime_legacy", path_prefix="/api/runtime_v4_poc"),  # CH-49.POC
+    RouterSpec("runtime_v4_2", "/api", group="runtime_legacy", path_prefix="/api/runtime_v4_2"),  # CH-49 Phase 1
+    RouterSpec("runtime_v5", group="runtime", path_prefix="/api/runtime_v5"),  # Reading Agent (CH-52), préfixe interne
+    RouterSpec("runtime_v6", "/api", group="runtime", path_prefix="/api/runtime_v6"),  # Parse→Plan→Execute (A3)
+    RouterSpec("gpu", group="admin", path_prefix="/api/gpu"),  # 🖥️ Health check & restart services EC2
+    RouterSpec("claimfirst", path_prefix="/api/claimfirst"),  # 🔥 Pipeline Claim-First
+    # Stratified V2 DÉPRECATED 2026-05-01 — pipeline productif = ClaimFirst
+    RouterSpec("challenge", path_prefix="/api/v2/challenge"),  # 🌊 MVP V1 - Challenge de Texte (Usage B)
+    RouterSpec("verify", path_prefix="/api/verify"),  # 🔍 Vérification texte contre KG
+    RouterSpec("backup", "/api", group="admin", path_prefix="/api/backup"),  # 💾 Sauvegarde / restauration
+    RouterSpec("wiki", path_prefix="/api/wiki"),  # 📚 Wiki Generation Console (Phase 3)
+    RouterSpec("atlas", path_prefix="/api/atlas"),  # 🌊 Narrative knowledge atlas
+    RouterSpec("kg_hygiene", group="admin", path_prefix="/api/admin/kg-hygiene"),  # 🧹 Nettoyage + Rollback
+    RouterSpec("domain_packs", group="admin", path_prefix="/api/admin/domain-packs"),  # 📦 NER spécialisé
+    RouterSpec("post_import", group="admin", path_prefix="/api/admin/post-import"),  # 🔄 Enrichissement KG
+    RouterSpec("benchmarks", group="admin", path_prefix="/api/benchmarks"),
+    RouterSpec("referentiel", path_prefix="/api/referentiel"),  # 🗺️ Carte du Référentiel (#456)
+)
+
+
+@dataclass
+class RouterLoadReport:
+    """Routers montés / différés / désactivés et temps d'import par router."""
+
+    import_s: Dict[str, float] = field(default_factory=dict)
+    deferred: List[str] = field(default_factory=list)
+    disabled: List[str] = field(default_factory=list)
+
+    @property
+    def total_s(self) -> float:
+        return sum(self.import_s.values())
+
+    def slowest(self, n: int = 5) -> List[tuple]:
+        return sorted(self.import_s.items(), key=lambda kv: kv[1], reverse=True)[:n]
+
+
+def _selectors(raw: Optional[str]) -> Set[str]:
+    return {s.strip() for s in (raw or "").split(",") if s.strip()}
+
+
+def load_router(spec: RouterSpec):
+    """Importe le module du router et retourne son `router`."""
+    return importlib.import_module(spec.import_path).router
+
+
+def _include(app: FastAPI, spec: RouterSpec) -> float:
+    t0 = time.perf_counter()
+    router = load_router(spec)
+    elapsed = time.perf_counter() - t0
+    if spec.prefix:
+        app.include_router(router, prefix=spec.prefix)
+    else:
+        app.include_router(router)
+    return elapsed
+
+
+class LazyRouterMounter:
+    """Monte les routers différés à la première requête qui les concerne."""
+
+    def __init__(self, app: FastAPI, specs: Iterable[RouterSpec], report: RouterLoadReport):
+        self.app = app
+        self.pending: List[RouterSpec] = list(specs)
+        self.report = report
+        self._lock = threading.Lock()
+
+    def mount(self, specs: Sequence[RouterSpec]) -> None:
+        with self._lock:
+            for spec in specs:
+                if spec not in self.pending:
+                    continue  # monté entre-temps par une autre requête
+                self.report.import_s[spec.module] = _include(self.app, spec)
+                self.pending.remove(spec)
+                logger.info(
+                    f"[OSMOSE:Routers] Lazy-mounted {spec.module} "
+                    f"({self.report.import_s[spec.module]:.2f}s)"
+                )
+            self.app.openapi_schema = None
+
+    async def dispatch(self, request: Request, call_next):
+        if self.pending:
+            path = request.url.path
+            if path == self.app.openapi_url:
+                targets = list(self.pending)
+            else:
+                targets = [spec for spec in self.pending if spec.serves(path)]
+            if targets:
+                await run_in_threadpool(self.mount, targets)
+        return await call_next(request)
+
+
+def include_routers(
+    app: FastAPI,
+    specs: Sequence[RouterSpec] = ROUTER_SPECS,
+    disabled: Optional[str] = None,
+    lazy: Optional[str] = None,
+) -> RouterLoadReport:
+    """
+    Importe et monte les routers déclarés, dans l'ordre.
+
+    Args:
+        disabled: sélecteurs (modules ou groupes) non montés
+                  (défaut: env API_DISABLED_ROUTERS)
+        lazy: sélecteurs montés à la première requête (défaut: env API_LAZY_ROUTERS)
+    """
+    disabled_sel = _selectors(disabled if disabled is not None else os.getenv(DISABLED_ROUTERS_ENV))
+    lazy_sel = _selectors(lazy if lazy is not None else os.getenv(LAZY_ROUTERS_ENV))
+    report = RouterLoadReport()
+    deferred: List[RouterSpec] = []
+
+    for spec in specs:
+        if spec.matches(disabled_sel):
+            report.disabled.append(spec.module)
+            continue
+        if spec.matches(lazy_sel):
+            if spec.path_prefix:
+                deferred.append(spec)
+                report.deferred.append(spec.module)
+                continue
+            logger.warning(
+                f"[OSMOSE:Routers] {spec.module} has no path_prefix, cannot be lazy — mounting now"
+            )
+        report.import_s[spec.module] = _include(app, spec)
+
+    if deferred:
+        mounter = LazyRouterMounter(app, deferred, report)
+        app.middleware("http")(mounter.dispatch)
+        app.state.lazy_router_mounter = mounter
+
+    logger.info(
+        f"[OSMOSE:Routers] {len(report.import_s)} router(s) mounted in {report.total_s:.1f}s "
+        f"({len(report.deferred)} deferred, {len(report.disabled)} disabled) — slowest: "
+        + ", ".join(f"{name}={s:.2f}s" for name, s in report.slowest())
+    )
+    return report
+
+
+__all__ = [
+    "DISABLED_ROUTERS_ENV",
+    "LAZY_ROUTERS_ENV",
+    "ROUTER_SPECS",
+    "LazyRouterMounter",
+    "RouterLoadReport",
+    "RouterSpec",
+    "include_routers",
+    "load_router",
+]
@@ -1,26 +1,14 @@
-from . import (
-    search,
-    ingest,
-    status,
-    imports,
-    solutions,
-    downloads,
-    token_analysis,
-    facts,
-    ontology,
-    entities,
-    entity_types,
-    jobs,
-    document_types,
-    admin,
-    auth,  # Phase 0 - JWT Authentication
-    domain_context,  # Domain Context - Configuration contexte métier global
-    documents,  # Documents API - Document Backbone lifecycle (Phase 1)
-    concepts,  # Concepts API - Explain concepts (Phase 2 POC)
-    insights,  # OSMOSE Insights - Découverte connaissances cachées (Phase 2.3)
-    sessions,  # Memory Layer - Sessions de conversation (Phase 2.5)
-    backup,  # Backup & Restore - Sauvegarde/restauration complète
-)
+"""
+Routers FastAPI.
+
+Pas d'import au chargement du package : chaque router tire ses services
+(runtime_*, Neo4j, modèles...). `from knowbase.api.routers import search`
+n'importe que `search` ; l'assemblage de l'application passe par
+`knowbase.api.router_registry`.
+"""
+
+import importlib
+from typing import Any
 
 __all__ = [
     "search",
@@ -45,3 +33,9 @@ __all__ = [
     "sessions",
     "backup",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return importlib.import_module(f"{__name__}.{name}")
@@ -6,6 +6,7 @@ REST endpoints for Entity Resolution management.
 Endpoints:
 - GET /api/entity-resolution/stats - Get overall statistics
 - POST /api/entity-resolution/run - Run entity resolution pipeline
+- POST /api/entity-resolution/run-incremental - Resolve new concepts only (or full sweep)
 - GET /api/entity-resolution/deferred - Get pending deferred candidates
 - POST /api/entity-resolution/reevaluate - Trigger reevaluation of deferred
 - DELETE /api/entity-resolution/cache - Clear score cache
@@ -22,6 +23,7 @@ from fastapi import APIRouter, HTTPException, Query, BackgroundTasks
 
 from knowbase.entity_resolution import (
     get_entity_resolution_pipeline,
+    get_incremental_resolver,
     get_deferred_store,
     get_deferred_reevaluator,
     get_score_cache,
@@ -61,6 +63,13 @@ class RunRequest(BaseModel):
     dry_run: bool = Field(False, description="Simulate without actual merges")
 
 
+class IncrementalRunRequest(BaseModel):
+    """Request to run incremental entity resolution."""
+    concept_ids: List[str] = Field(default_factory=list, description="Newly created concept IDs")
+    full_sweep: bool = Field(False, description="Rebuild the blocking index and run a full sweep")
+    dry_run: bool = Field(False, description="Simulate without actual merges")
+
+
 class RunResponse(BaseModel):
     """Response from entity resolution run."""
     success: bool
@@ -219,6 +228,47 @@ async def run_pipeline(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/run-incremental", response_model=RunResponse)
+async def run_incremental(
+    request: IncrementalRunRequest,
+    tenant_id: str = Query("default", description="Tenant ID")
+):
+    """
+    Run incremental entity resolution.
+
+    Resolves only the given new concepts against the standing blocking index.
+    Use full_sweep=true for periodic reconciliation (full run + index rebuild).
+    """
+    try:
+        resolver = get_incremental_resolver(tenant_id)
+
+        if request.full_sweep:
+            result = resolver.full_sweep(dry_run=request.dry_run)
+        elif request.concept_ids:
+            result = resolver.resolve_new_concepts(
+                request.concept_ids,
+                dry_run=request.dry_run
+            )
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="concept_ids is required unless full_sweep=true"
+            )
+
+        return RunResponse(
+            success=len(result.errors) == 0,
+            message=f"Processed {result.candidates_generated} candidates, "
+                    f"{result.merges_successful} merges",
+            result={**result.to_dict(), "index": resolver.get_stats()}
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"[EntityResolutionAPI] Error running incremental pipeline: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/deferred", response_model=DeferredListResponse)
 async def get_deferred(
     tenant_id: str = Query("default", description="Tenant ID"),
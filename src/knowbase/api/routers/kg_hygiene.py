@@ -399,6 +399,9 @@ async def approve_action(action_id: str):
             )
             # Mettre à jour le before_state si enrichi
             persister.save_action(action)
+
+            from knowbase.wiki.atlas_views import invalidate_atlas_views
+            invalidate_atlas_views(action.tenant_id, reason=f"hygiene approve {action_id}")
             return {"success": True, "action_id": action_id, "new_status": "APPLIED"}
         else:
             logger.warning(
@@ -1908,10 +1908,13 @@ def _run_c6_pivots(tenant_id: str, progress=None) -> dict:
 
 
 def _run_build_perspectives(tenant_id: str, progress=None) -> dict:
-    """Reconstruit les Perspectives V2 (HDBSCAN + labellisation LLM).
+    """Met a jour les Perspectives V2 (incremental, rebuild HDBSCAN si derive).
 
     Skip conditionnel : si moins de MIN_NEW_CLAIMS nouveaux claims depuis
     le dernier build, on saute l'etape (evite le cout inutile a chaque petit ajout).
+    Sinon les nouveaux claims sont rattaches aux Perspectives existantes ; le
+    rebuild complet (UMAP + HDBSCAN + labellisation LLM) n'est lance que sans
+    modele sauvegarde ou au-dela des seuils de derive.
     """
     from knowbase.common.clients.neo4j_client import get_neo4j_client
 
@@ -1949,16 +1952,20 @@ def _run_build_perspectives(tenant_id: str, progress=None) -> dict:
         return {"skipped": True, "new_claims": new_claims, "threshold": MIN_NEW_CLAIMS}
 
     # --- Build ---
-    _p(15, f"{new_claims} nouveaux claims detectes, lancement build Perspectives...")
+    _p(15, f"{new_claims} nouveaux claims detectes, mise a jour Perspectives...")
 
     from knowbase.perspectives.orchestrator import run_perspective_engine
     stats = run_perspective_engine(
         tenant_id=tenant_id,
         dry_run=False,
         skip_llm=False,
+        mode=os.environ.get("PERSPECTIVE_BUILD_MODE", "auto"),
     )
 
-    _p(100, f"{stats.get('perspectives', 0)} perspectives, {stats.get('claims_linked', 0)} claims lies")
+    if stats.get("mode") == "incremental":
+        _p(100, f"{stats.get('assigned', 0)} claims rattaches, {stats.get('outliers', 0)} outliers")
+    else:
+        _p(100, f"{stats.get('perspectives', 0)} perspectives, {stats.get('claims_linked', 0)} claims lies")
     return {
         "skipped": False,
         "new_claims_trigger": new_claims,
@@ -202,6 +202,8 @@ def _get_agent_for_model(llm_model: str) -> ReasoningAgentV51:
         tracer=default.tracer,
         metrics=default.metrics,
         verifier=default.verifier,
+        max_parallel_tools=default.max_parallel_tools,
+        tool_timeout_s=default.tool_timeout_s,
     )
     _agents_by_model[llm_model] = custom_agent
     return custom_agent
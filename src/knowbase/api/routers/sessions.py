@@ -38,7 +38,7 @@ from knowbase.api.schemas.sessions import (
     SummaryResponse,
     KeyPointSchema
 )
-from knowbase.api.dependencies import get_current_user
+from knowbase.api.dependencies import get_current_user, require_admin
 from knowbase.memory import (
     get_session_manager,
     get_context_resolver,
@@ -129,6 +129,19 @@ async def list_sessions(
     )
 
 
+@router.get(
+    "/memory/stats",
+    summary="Métriques mémoire de conversation",
+    description="Cache local + Redis de la mémoire de conversation (hits, chargements, évictions)."
+)
+async def get_memory_stats(
+    admin: dict = Depends(require_admin),
+    manager: SessionManager = Depends(get_manager)
+):
+    """Métriques du SessionMemoryStore de ce worker."""
+    return manager.get_memory_stats()
+
+
 @router.get(
     "/{session_id}",
     response_model=SessionResponse,
@@ -3,7 +3,7 @@ API pour l'analyse des tokens et coûts LLM
 """
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 
 from knowbase.api.dependencies import get_current_user, get_tenant_id, require_admin
@@ -47,7 +47,7 @@ def get_token_stats(
     return {
         "stats_by_model": stats_by_model,
         "total_cost": tracker.get_total_cost(),
-        "total_usage_count": len(tracker.usage_history)
+        "total_usage_count": sum(data["total_calls"] for data in stats_by_model.values())
     }
 
 
@@ -61,7 +61,7 @@ def get_cockpit_costs():
     stats = tracker.get_stats_by_model()
 
     total_cost = tracker.get_total_cost()
-    total_calls = len(tracker.usage_history)
+    total_calls = sum(data.get("total_calls", 0) for data in stats.values())
 
     by_model = {}
     for model, data in stats.items():
@@ -77,6 +77,31 @@ def get_cockpit_costs():
     }
 
 
+@router.get("/aggregates")
+def get_token_aggregates(
+    current_user: dict = Depends(get_current_user),
+    tenant_id: str = Depends(get_tenant_id),
+):
+    """
+    Agrégats par (model, task_type, provider) : tokens, coût, erreurs, latences p50/p95.
+
+    **Sécurité**: Requiert authentification JWT (tous rôles).
+    """
+    return get_token_tracker().get_aggregates()
+
+
+@router.get("/metrics")
+def get_prometheus_metrics():
+    """
+    Export Prometheus (format texte) — pas d'auth requise (scrape).
+    Compteurs/histogrammes LLM : tokens, coût, latence, erreurs.
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST
+    from knowbase.common.metrics import get_metrics
+
+    return Response(content=get_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
 @router.get("/estimate-deck")
 def estimate_deck_cost(
     num_slides: int = Query(..., description="Nombre de slides dans le deck"),
@@ -165,23 +190,13 @@ def get_cost_by_task_type(
     """
     tracker = get_token_tracker()
 
-    # Grouper par task_type
-    task_stats = {}
-    for usage in tracker.usage_history:
-        if usage.task_type not in task_stats:
-            task_stats[usage.task_type] = {
-                "total_calls": 0,
-                "total_input_tokens": 0,
-                "total_output_tokens": 0,
-                "total_cost": 0.0,
-                "models_used": set()
-            }
-
-        task_stats[usage.task_type]["total_calls"] += 1
-        task_stats[usage.task_type]["total_input_tokens"] += usage.input_tokens
-        task_stats[usage.task_type]["total_output_tokens"] += usage.output_tokens
-        task_stats[usage.task_type]["total_cost"] += tracker.calculate_cost(usage)
-        task_stats[usage.task_type]["models_used"].add(usage.model)
+    # Grouper par task_type (agrégats glissants du tracker)
+    task_stats = tracker.get_stats_by_task_type()
+    for task_type in task_stats:
+        task_stats[task_type]["models_used"] = set()
+    for agg in tracker.get_aggregates():
+        if agg["calls"] and agg["task_type"] in task_stats:
+            task_stats[agg["task_type"]]["models_used"].add(agg["model"])
 
     # Convertir les sets en listes pour JSON
     for task_type in task_stats:
@@ -230,7 +245,7 @@ def reset_token_tracking(
     **Sécurité**: Requiert authentification JWT avec rôle 'admin'.
     """
     tracker = get_token_tracker()
-    tracker.usage_history.clear()
+    tracker.reset()
 
     return {"message": "Token tracking data cleared"}
 
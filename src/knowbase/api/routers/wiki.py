@@ -4,18 +4,19 @@ Router Wiki — Knowledge Atlas (Phase 4) + Generation Console (Phase 3).
 Phase 3 : ConceptResolver → EvidencePackBuilder → SectionPlanner → ConstrainedGenerator
 Phase 4 : Persistence Neo4j + navigation Atlas + intelligence visuelle
 
-⚠️ Job store en mémoire (POC) — perdu au restart. Articles persistés en Neo4j.
+Jobs unitaires : état en mémoire du process API (+ Redis pour les jobs batch).
+Batch : file Redis + lanes RQ (knowbase.wiki.batch_jobs), repris au restart worker.
+Articles persistés en Neo4j.
 """
 
 from __future__ import annotations
 
 import logging
 import uuid
-from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
 
 from knowbase.api.dependencies import get_tenant_id
 from knowbase.api.schemas.wiki import (
@@ -24,7 +25,6 @@ from knowbase.api.schemas.wiki import (
     WikiArticleListResponse,
     WikiArticleResponse,
     WikiBatchGenerateRequest,
-    WikiBatchJobItem,
     WikiBatchLinkRequest,
     WikiBatchLinkStatus,
     WikiBatchStatus,
@@ -65,6 +65,7 @@ from knowbase.api.schemas.wiki import (
     WikiStartHere,
     WikiTier1Concept,
 )
+from knowbase.wiki.jobs import WikiJobState, run_wiki_pipeline
 
 logger = logging.getLogger("[OSMOSE] wiki_router")
 
@@ -72,24 +73,6 @@ router = APIRouter(prefix="/api/wiki", tags=["wiki"])
 
 # ── Job store en mémoire (POC) ──────────────────────────────────────────
 
-
-@dataclass
-class WikiJobState:
-    job_id: str
-    concept_name: str
-    language: str
-    tenant_id: str
-    status: str = "pending"  # pending | running | completed | completed_with_warnings | failed
-    progress: Optional[str] = None
-    error: Optional[str] = None
-    markdown: Optional[str] = None
-    article_data: Optional[dict] = None
-    resolution_info: Optional[dict] = None
-    article_slug: Optional[str] = None
-    created_at: str = ""
-    completed_at: Optional[str] = None
-
-
 _wiki_jobs: Dict[str, WikiJobState] = {}
 _active_jobs: Dict[str, str] = {}  # clé logique → job_id
 
@@ -113,6 +96,16 @@ def _is_reusable(job: WikiJobState) -> bool:
     return False
 
 
+def _get_job(job_id: str) -> Optional[WikiJobState]:
+    """Job unitaire (mémoire du process) ou job batch (Redis, écrit par les lanes worker)."""
+    job = _wiki_jobs.get(job_id)
+    if job is None:
+        from knowbase.wiki.batch_jobs import get_wiki_batch_store
+
+        job = get_wiki_batch_store().load_job(job_id)
+    return job
+
+
 # ── Phase 3 — Endpoints Génération ──────────────────────────────────────
 
 
@@ -168,7 +161,7 @@ async def generate_article(
     summary="Statut d'un job de génération wiki",
 )
 async def get_job_status(job_id: str) -> WikiJobStatus:
-    job = _wiki_jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Job '{job_id}' introuvable")
     return WikiJobStatus(
@@ -186,7 +179,7 @@ async def get_job_status(job_id: str) -> WikiJobStatus:
     summary="Récupérer l'article wiki généré (par job_id)",
 )
 async def get_article(job_id: str) -> WikiArticleResponse:
-    job = _wiki_jobs.get(job_id)
+    job = _get_job(job_id)
     if not job:
         raise HTTPException(status_code=404, detail=f"Job '{job_id}' introuvable")
 
@@ -275,16 +268,28 @@ def _get_persister():
     return WikiArticlePersister(get_neo4j_client().driver)
 
 
+def _set_view_headers(response: Response, view) -> None:
+    """Fraîcheur d'une vue Atlas matérialisée (stale-while-revalidate)."""
+    response.headers["Age"] = str(int(view.age_s))
+    response.headers["X-Atlas-View-Stale"] = "1" if view.stale else "0"
+    if view.version is not None:
+        response.headers["X-Atlas-View-Version"] = str(view.version)
+
+
 @router.get(
     "/home",
     response_model=WikiHomeResponse,
     summary="Homepage Atlas (stats + Tier 1 + récents + gaps)",
 )
 async def get_home(
+    response: Response,
     tenant_id: str = Depends(get_tenant_id),
 ) -> WikiHomeResponse:
-    persister = _get_persister()
-    data = persister.get_home_data(tenant_id)
+    from knowbase.wiki.atlas_views import HOME_VIEW, get_atlas_view_store
+
+    view = get_atlas_view_store().get(tenant_id, HOME_VIEW)
+    _set_view_headers(response, view)
+    data = view.payload
 
     # Charger le domain context depuis PostgreSQL
     domain_ctx = None
@@ -351,12 +356,16 @@ async def get_home(
 )
 async def get_domain_page(
     facet_key: str,
+    response: Response,
     tenant_id: str = Depends(get_tenant_id),
 ) -> WikiDomainPageResponse:
-    persister = _get_persister()
-    data = persister.get_domain_data(facet_key, tenant_id)
-    if not data:
+    from knowbase.wiki.atlas_views import domain_view, get_atlas_view_store
+
+    view = get_atlas_view_store().get(tenant_id, domain_view(facet_key))
+    if view is None or not view.payload:
         raise HTTPException(status_code=404, detail=f"Domaine '{facet_key}' introuvable")
+    _set_view_headers(response, view)
+    data = view.payload
 
     return WikiDomainPageResponse(
         facet_id=data["facet_id"],
@@ -587,10 +596,6 @@ Résumé (en français, 2-3 phrases max) :"""
 
 # ── Admin : Scoring & Batch Generation ──────────────────────────────────
 
-# Batch state en mémoire (POC)
-_batch_states: Dict[str, WikiBatchStatus] = {}
-
-
 # ── Admin : Concept Linking ────────────────────────────────────────────
 
 _link_batch_states: Dict[str, WikiBatchLinkStatus] = {}
@@ -735,7 +740,6 @@ async def get_scoring(
 )
 async def batch_generate(
     request: WikiBatchGenerateRequest,
-    background_tasks: BackgroundTasks,
     tenant_id: str = Depends(get_tenant_id),
 ) -> WikiBatchStatus:
     """Lance la génération batch des articles pour les concepts Tier 1..max_tier."""
@@ -781,39 +785,35 @@ async def batch_generate(
             language=request.language,
         )
 
-    # Créer le batch
-    batch_id = str(uuid.uuid4())
-    jobs = [
-        WikiBatchJobItem(
-            concept_name=c.entity_name,
-            entity_type=c.entity_type,
-            importance_tier=c.importance_tier,
-            status="queued",
-        )
-        for c in candidates
-    ]
+    # Créer le batch (Redis) et lancer les lanes RQ du tenant
+    from knowbase.wiki.batch_jobs import get_wiki_batch_store
 
-    batch = WikiBatchStatus(
-        batch_id=batch_id,
-        status="running",
-        total=len(jobs),
-        queued=len(jobs),
-        language=request.language,
-        jobs=jobs,
-    )
-    _batch_states[batch_id] = batch
-
-    # Lancer en background
-    background_tasks.add_task(
-        _run_batch_generation, batch_id, request.language, tenant_id
-    )
+    store = get_wiki_batch_store()
+    try:
+        batch_id = store.create_batch(
+            tenant_id,
+            request.language,
+            [
+                {
+                    "concept_name": c.entity_name,
+                    "entity_type": c.entity_type,
+                    "importance_tier": c.importance_tier,
+                    "entity_id": c.entity_id,
+                }
+                for c in candidates
+            ],
+        )
+        store.ensure_lanes(tenant_id)
+    except Exception as e:
+        logger.error(f"[OSMOSE:Wiki] Batch non lancé (Redis/RQ indisponible) : {e}")
+        raise HTTPException(status_code=503, detail=f"File de génération indisponible : {e}")
 
     logger.info(
-        f"[OSMOSE:Wiki] Batch {batch_id} lancé : {len(jobs)} articles "
+        f"[OSMOSE:Wiki] Batch {batch_id} lancé : {len(candidates)} articles "
         f"(tier<={request.max_tier}, lang={request.language})"
     )
 
-    return batch
+    return WikiBatchStatus(**store.get_batch(batch_id))
 
 
 @router.get(
@@ -822,10 +822,32 @@ async def batch_generate(
     summary="Statut d'un batch de génération",
 )
 async def get_batch_status(batch_id: str) -> WikiBatchStatus:
-    batch = _batch_states.get(batch_id)
+    from knowbase.wiki.batch_jobs import get_wiki_batch_store
+
+    batch = get_wiki_batch_store().get_batch(batch_id)
     if not batch:
         raise HTTPException(status_code=404, detail=f"Batch '{batch_id}' introuvable")
-    return batch
+    return WikiBatchStatus(**batch)
+
+
+@router.post(
+    "/admin/batch-resume/{batch_id}",
+    response_model=WikiBatchStatus,
+    summary="Reprendre un batch suspendu (vLLM revenu)",
+)
+async def resume_batch(batch_id: str) -> WikiBatchStatus:
+    from knowbase.wiki.batch_jobs import get_wiki_batch_store
+
+    store = get_wiki_batch_store()
+    batch = store.get_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail=f"Batch '{batch_id}' introuvable")
+    if batch["status"] != "suspended":
+        raise HTTPException(status_code=409, detail=f"Batch non suspendu (statut: {batch['status']})")
+
+    requeued = store.resume_batch(batch_id)
+    logger.info(f"[OSMOSE:Wiki] Batch {batch_id} repris : {requeued} articles remis en file")
+    return WikiBatchStatus(**store.get_batch(batch_id))
 
 
 # ── Pipeline background ─────────────────────────────────────────────────
@@ -835,348 +857,7 @@ def _run_wiki_pipeline(
     job_id: str, concept_name: str, language: str, tenant_id: str
 ) -> None:
     """Exécute le pipeline wiki complet en arrière-plan + persistence Neo4j."""
-    job = _wiki_jobs[job_id]
-    try:
-        job.status = "running"
-
-        # 1. Résolution du concept
-        job.progress = "Résolution du concept..."
-        from knowbase.common.clients.neo4j_client import get_neo4j_client
-        from knowbase.wiki.concept_resolver import ConceptResolver
-
-        neo4j_client = get_neo4j_client()
-        resolver = ConceptResolver(neo4j_client.driver)
-        resolved = resolver.resolve(concept_name, tenant_id)
-
-        job.resolution_info = {
-            "resolution_method": resolved.resolution_method,
-            "resolution_confidence": resolved.resolution_confidence,
-            "matched_entities": len(resolved.entity_ids),
-            "ambiguity_notes": resolved.ambiguity_notes,
-        }
-
-        # 2. Construction de l'evidence pack
-        job.progress = "Construction de l'evidence pack..."
-        from knowbase.common.clients.embeddings import get_embedding_manager
-        from knowbase.common.clients import get_qdrant_client
-        from knowbase.wiki.evidence_pack_builder import EvidencePackBuilder
-
-        qdrant_client = get_qdrant_client()
-        embedding_manager = get_embedding_manager()
-        builder = EvidencePackBuilder(neo4j_client.driver, qdrant_client, embedding_manager)
-        pack = builder.build(resolved, tenant_id)
-
-        # 3. Planification des sections
-        job.progress = "Planification des sections..."
-        from knowbase.wiki.section_planner import SectionPlanner
-
-        planner = SectionPlanner()
-        plan = planner.plan(pack)
-
-        # 4. Génération de l'article
-        section_count = len(plan.sections)
-        job.progress = f"Génération de l'article ({section_count} sections)..."
-        from knowbase.wiki.constrained_generator import ConstrainedGenerator
-
-        generator = ConstrainedGenerator(language)
-        article = generator.generate(pack, plan)
-        markdown = generator.render_markdown(article)
-
-        # 5. Déterminer statut terminal
-        confidence = article.average_confidence
-        gap_count = len(article.all_gaps)
-        is_fuzzy = resolved.resolution_method == "fuzzy"
-
-        if confidence < 0.5 or gap_count > 3 or is_fuzzy:
-            terminal_status = "completed_with_warnings"
-        else:
-            terminal_status = "completed"
-
-        # 6. Persistence Neo4j (non-bloquant pour le statut du job)
-        job.progress = "Persistence de l'article..."
-        article_slug = plan.slug
-        try:
-            from knowbase.wiki.persistence import WikiArticlePersister
-            from knowbase.wiki.importance_scorer import ImportanceScorer, compute_importance
-
-            persister = WikiArticlePersister(neo4j_client.driver)
-
-            # Calcul de l'importance pour cette entité
-            scorer = ImportanceScorer(neo4j_client.driver)
-            all_scored = scorer.score_all_concepts(tenant_id)
-            scored_map = {s.entity_name.lower(): s for s in all_scored}
-            entity_scored = scored_map.get(resolved.canonical_name.lower())
-
-            importance_score = entity_scored.importance_score if entity_scored else compute_importance(
-                resolved.claim_count, len(resolved.doc_ids), 0
-            )
-            importance_tier = entity_scored.importance_tier if entity_scored else 3
-
-            # Construire source_details depuis le pack
-            source_details = [
-                {
-                    "doc_id": s.doc_id,
-                    "doc_title": s.doc_title,
-                    "doc_type": s.doc_type,
-                    "unit_count": s.unit_count,
-                    "contribution_pct": round(s.contribution_pct, 1),
-                }
-                for s in pack.source_index
-            ]
-
-            # Construire related_concepts (co-occurrence) + enrichir depuis le markdown
-            related_concepts_data = [
-                {
-                    "entity_name": rc.entity_name,
-                    "entity_type": rc.entity_type,
-                    "co_occurrence_count": rc.co_occurrence_count,
-                }
-                for rc in pack.related_concepts[:8]
-            ]
-            related_concepts_data = persister.enrich_related_from_markdown(
-                markdown=markdown,
-                existing_related=related_concepts_data,
-                concept_name=resolved.canonical_name,
-                tenant_id=tenant_id,
-            )
-
-            persister.save_article(
-                slug=article_slug,
-                title=resolved.canonical_name,
-                tenant_id=tenant_id,
-                entity_type=resolved.entity_type,
-                language=language,
-                markdown=markdown,
-                sections_count=len(article.sections),
-                total_citations=article.total_citations,
-                generation_confidence=round(confidence, 3),
-                all_gaps=article.all_gaps,
-                source_count=len(pack.source_index),
-                unit_count=len(pack.units),
-                source_details=source_details,
-                resolution_method=resolved.resolution_method,
-                resolution_confidence=resolved.resolution_confidence,
-                importance_score=importance_score,
-                importance_tier=importance_tier,
-                entity_ids=resolved.entity_ids,
-                related_concepts=related_concepts_data,
-            )
-
-            job.article_slug = article_slug
-            logger.info(
-                f"[OSMOSE:Wiki] Article '{article_slug}' persisté en Neo4j "
-                f"(tier={importance_tier})"
-            )
-
-            # V2 : Linking incrémental — linker ce nouvel article + re-linker les impactés
-            job.progress = "Linking incrémental..."
-            try:
-                from knowbase.wiki.concept_linker import ConceptLinker
-
-                linker = ConceptLinker(neo4j_client.driver, tenant_id)
-                link_summary = linker.link_incrementally(article_slug)
-
-                new_result = link_summary.get("new_article")
-                impacted = link_summary.get("impacted", [])
-                link_count = new_result.link_count if new_result and new_result.success else 0
-
-                logger.info(
-                    f"[OSMOSE:Wiki] Linking incrémental pour '{article_slug}' : "
-                    f"{link_count} liens, {len(impacted)} articles re-linkés"
-                )
-            except Exception as link_err:
-                # Le linking incrémental est best-effort — ne bloque pas la génération
-                logger.warning(
-                    f"[OSMOSE:Wiki] Linking incrémental échoué pour '{article_slug}': {link_err}"
-                )
-
-        except Exception as persist_err:
-            # La persistence échoue silencieusement — l'article est toujours disponible via job_id
-            logger.error(
-                f"[OSMOSE:Wiki] Erreur persistence pour '{concept_name}': {persist_err}",
-                exc_info=True,
-            )
-
-        job.status = terminal_status
-        job.markdown = markdown
-        job.article_data = {
-            "sections_count": len(article.sections),
-            "total_citations": article.total_citations,
-            "generation_confidence": round(confidence, 3),
-            "all_gaps": article.all_gaps,
-            "source_count": len(pack.source_index),
-            "unit_count": len(pack.units),
-            "generated_at": article.generated_at,
-        }
-        job.completed_at = datetime.now(timezone.utc).isoformat()
-        job.progress = None
-
-        logger.info(
-            f"[OSMOSE:Wiki] Article généré pour '{concept_name}' — "
-            f"statut={terminal_status}, confiance={confidence:.2f}, "
-            f"sections={len(article.sections)}, citations={article.total_citations}"
-        )
-
-    except ValueError as e:
-        job.status = "failed"
-        job.error = str(e)
-        job.progress = None
-        logger.warning(f"[OSMOSE:Wiki] Concept introuvable : {e}")
-
-    except Exception as e:
-        # Propager VLLMUnavailableError pour que le batch puisse s'arrêter
-        from knowbase.common.llm_router import VLLMUnavailableError
-        if isinstance(e, VLLMUnavailableError):
-            job.status = "failed"
-            job.error = "vLLM indisponible"
-            job.progress = None
-            logger.error(f"[OSMOSE:Wiki] vLLM down — pipeline arrêté pour '{concept_name}'")
-            raise  # remonter au batch
-
-        job.status = "failed"
-        job.error = f"Erreur interne : {str(e)}"
-        job.progress = None
-        logger.error(f"[OSMOSE:Wiki] Erreur pipeline pour '{concept_name}': {e}", exc_info=True)
-
-
-def _run_batch_generation(batch_id: str, language: str, tenant_id: str) -> None:
-    """Exécute la génération batch séquentielle des articles wiki."""
-    from knowbase.common.llm_router import VLLMUnavailableError
-
-    batch = _batch_states[batch_id]
-
-    for i, batch_job in enumerate(batch.jobs):
-        concept_name = batch_job.concept_name
-        batch_job.status = "running"
-        batch.running = sum(1 for j in batch.jobs if j.status == "running")
-        batch.queued = sum(1 for j in batch.jobs if j.status == "queued")
-
-        logger.info(
-            f"[OSMOSE:Wiki:Batch] [{i + 1}/{batch.total}] Génération '{concept_name}'..."
-        )
-
-        # Créer un job unitaire et exécuter le pipeline
-        job_id = str(uuid.uuid4())
-        job = WikiJobState(
-            job_id=job_id,
-            concept_name=concept_name,
-            language=language,
-            tenant_id=tenant_id,
-            created_at=datetime.now(timezone.utc).isoformat(),
-        )
-        _wiki_jobs[job_id] = job
-        batch_job.job_id = job_id
-
-        try:
-            _run_wiki_pipeline(job_id, concept_name, language, tenant_id)
-
-            if job.status in ("completed", "completed_with_warnings"):
-                batch_job.status = "completed"
-                batch_job.article_slug = job.article_slug
-                batch.completed += 1
-            else:
-                batch_job.status = "failed"
-                batch_job.error = job.error
-                batch.failed += 1
-
-        except VLLMUnavailableError:
-            # vLLM down — arrêter tout le batch proprement
-            batch_job.status = "failed"
-            batch_job.error = "vLLM indisponible"
-            batch.failed += 1
-
-            # Marquer tous les jobs restants comme annulés
-            for remaining_job in batch.jobs[i + 1:]:
-                remaining_job.status = "cancelled"
-
-            batch.running = 0
-            batch.queued = 0
-            batch.status = "suspended"
-
-            cancelled_count = len(batch.jobs) - (i + 1)
-            logger.error(
-                f"[OSMOSE:Wiki:Batch] vLLM DOWN — batch {batch_id} suspendu "
-                f"après {batch.completed} OK, {batch.failed} échecs. "
-                f"{cancelled_count} articles annulés."
-            )
-            return
-
-        except Exception as e:
-            batch_job.status = "failed"
-            batch_job.error = str(e)
-            batch.failed += 1
-            logger.error(f"[OSMOSE:Wiki:Batch] Erreur '{concept_name}': {e}")
-
-        batch.running = sum(1 for j in batch.jobs if j.status == "running")
-        batch.queued = sum(1 for j in batch.jobs if j.status == "queued")
-
-    # Terminé
-    batch.running = 0
-    batch.queued = 0
-    if batch.failed > 0:
-        batch.status = "completed_with_errors"
-    else:
-        batch.status = "completed"
-
-    logger.info(
-        f"[OSMOSE:Wiki:Batch] Batch {batch_id} terminé : "
-        f"{batch.completed} OK, {batch.failed} échecs sur {batch.total}"
-    )
-
-    # Regénérer le résumé éditorial du corpus après un batch réussi
-    if batch.completed > 0:
-        try:
-            _regenerate_summary_sync(tenant_id)
-        except Exception as e:
-            logger.warning(f"[OSMOSE:Wiki:Batch] Résumé éditorial non regénéré: {e}")
-
-
-def _regenerate_summary_sync(tenant_id: str) -> None:
-    """Regénère le domain_summary via LLM (appel synchrone pour background tasks)."""
-    from knowbase.common.clients.neo4j_client import get_neo4j_client
-    from knowbase.wiki.persistence import WikiArticlePersister
-
-    neo4j_client = get_neo4j_client()
-    persister = WikiArticlePersister(neo4j_client.driver)
-    data = persister.get_home_data(tenant_id)
-    narrative = data.get("corpus_narrative", {})
-    stats = data.get("corpus_stats", {})
-    domains = data.get("knowledge_domains", [])
-
-    top_entities = [e["name"] for e in narrative.get("top_entities", [])[:8]]
-    doc_types = [d["type"] for d in narrative.get("doc_type_distribution", [])[:5]]
-    domain_names = [d["name"] for d in domains[:6]]
-
-    prompt = f"""Tu es un rédacteur éditorial pour un Atlas de connaissances.
-Écris un résumé de 2-3 phrases décrivant le contenu de ce corpus documentaire.
-Le résumé doit être informatif, professionnel, et donner envie d'explorer les articles.
-Pas de formule de politesse, pas de "bienvenue", va droit au sujet.
-
-Données du corpus :
-- {stats.get('total_documents', 0)} documents sources
-- {stats.get('total_claims', 0)} faits extraits
-- {stats.get('total_articles', 0)} articles de synthèse
-- Types de documents : {', '.join(doc_types) if doc_types else 'non spécifié'}
-- Concepts les plus documentés : {', '.join(top_entities) if top_entities else 'non spécifié'}
-- Domaines thématiques : {', '.join(domain_names) if domain_names else 'non spécifié'}
-
-Résumé (en français, 2-3 phrases max) :"""
-
-    from knowbase.common.llm_router import get_llm_router, TaskType
-
-    router_llm = get_llm_router()
-    summary = router_llm.complete(prompt, task=TaskType.SHORT_ENRICHMENT)
-    summary = summary.strip().strip('"').strip()
-
-    if len(summary) >= 30:
-        from knowbase.ontology.domain_context_store import DomainContextStore
-
-        store = DomainContextStore()
-        profile = store.get_profile(tenant_id)
-        if profile:
-            profile.domain_summary = summary
-            store.save_profile(profile)
-            logger.info(f"[ATLAS] domain_summary auto-regénéré ({len(summary)} chars)")
+    run_wiki_pipeline(_wiki_jobs[job_id])
 
 
 def _run_batch_linking(
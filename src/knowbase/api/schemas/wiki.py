@@ -475,7 +475,7 @@ class WikiBatchJobItem(BaseModel):
     entity_type: str = "concept"
     importance_tier: int = 3
     job_id: Optional[str] = None
-    status: str = "queued"  # queued | running | completed | failed
+    status: str = "queued"  # queued | running | completed | failed | cancelled
     article_slug: Optional[str] = None
     error: Optional[str] = None
 
@@ -484,7 +484,7 @@ class WikiBatchStatus(BaseModel):
     """État global du batch de génération."""
 
     batch_id: str
-    status: str = "running"  # running | completed | completed_with_errors
+    status: str = "running"  # running | completed | completed_with_errors | suspended
     total: int = 0
     completed: int = 0
     failed: int = 0
@@ -135,40 +135,44 @@ class PurgeService:
 
         try:
             from knowbase.common.clients import get_qdrant_client, ensure_qdrant_collection, get_sentence_transformer
+            from knowbase.common.clients.qdrant_client import reset_ensured_collections
             from knowbase.retrieval.qdrant_layer_r import (
                 COLLECTION_NAME as LAYER_R_COLLECTION,
-                VECTOR_SIZE as LAYER_R_VECTOR_SIZE,
-                DISTANCE as LAYER_R_DISTANCE,
+                bootstrap_layer_r,
+                layer_r_exists,
+                reset_layer_r_ready,
+                resolve_layer_r_collection,
             )
-            from qdrant_client.models import VectorParams
 
             qdrant_client = get_qdrant_client()
             total_points = 0
             purged_collections = []
 
             # --- 1. Collection principale (knowbase) ---
+            # Si elle est la collection Layer R (défaut), purge faite en étape 2
             collection_name = settings.qdrant_collection
-            try:
-                collection_info = qdrant_client.get_collection(collection_name)
-                total_points += collection_info.points_count
-                qdrant_client.delete_collection(collection_name)
-                vector_size = get_sentence_transformer().get_sentence_embedding_dimension() or 1024
-                ensure_qdrant_collection(collection_name, vector_size)
-                purged_collections.append(collection_name)
-                logger.info(f"✅ Collection '{collection_name}' purgée et recréée ({collection_info.points_count} points)")
-            except Exception as e:
-                logger.warning(f"⚠️ Collection '{collection_name}': {e}")
+            if collection_name != LAYER_R_COLLECTION:
+                try:
+                    collection_info = qdrant_client.get_collection(collection_name)
+                    total_points += collection_info.points_count
+                    qdrant_client.delete_collection(collection_name)
+                    reset_ensured_collections()
+                    vector_size = get_sentence_transformer().get_sentence_embedding_dimension() or 1024
+                    ensure_qdrant_collection(collection_name, vector_size)
+                    purged_collections.append(collection_name)
+                    logger.info(f"✅ Collection '{collection_name}' purgée et recréée ({collection_info.points_count} points)")
+                except Exception as e:
+                    logger.warning(f"⚠️ Collection '{collection_name}': {e}")
 
             # --- 2. Collection Layer R (knowbase_chunks_v2) ---
             try:
-                if qdrant_client.collection_exists(LAYER_R_COLLECTION):
+                if layer_r_exists(qdrant_client):
                     layer_r_info = qdrant_client.get_collection(LAYER_R_COLLECTION)
                     total_points += layer_r_info.points_count
-                    qdrant_client.delete_collection(LAYER_R_COLLECTION)
-                    qdrant_client.create_collection(
-                        collection_name=LAYER_R_COLLECTION,
-                        vectors_config=VectorParams(size=LAYER_R_VECTOR_SIZE, distance=LAYER_R_DISTANCE),
-                    )
+                    qdrant_client.delete_collection(resolve_layer_r_collection(qdrant_client))
+                    # Recréée avec la config Layer R complète (profil, sparse, payload indexes)
+                    reset_layer_r_ready()
+                    bootstrap_layer_r()
                     purged_collections.append(LAYER_R_COLLECTION)
                     logger.info(f"✅ Collection '{LAYER_R_COLLECTION}' purgée et recréée ({layer_r_info.points_count} points)")
             except Exception as e:
@@ -36,6 +36,8 @@ logger = logging.getLogger("query-decomposer")
 
 MIN_QUERY_LENGTH = 40
 MAX_SUB_QUERIES = 4
+# Valeurs max par axe dans le prompt (les plus documentees ; 0 = toutes)
+MAX_AXIS_VALUES = int(os.getenv("DECOMPOSE_MAX_AXIS_VALUES", "50"))
 
 # ── Data models ───────────────────────────────────────────────────────────────
 
@@ -97,73 +99,18 @@ def _get_known_axis_values() -> dict[str, list[str]]:
     - Biomedical : {"study_phase": ["Phase I","Phase II"], "population": ["adult","pediatric"]}
     - Legal : {"jurisdiction": ["FR","DE","EU"], "effective_date": ["2020","2023"]}
 
-    Strategie en 2 etapes :
-    1. Neo4j ApplicabilityAxis (axis_key + known_values)
-    2. Qdrant : echantillon des champs axis_* pour decouvrir des axes non-Neo4j
+    Source : catalogue d'axes en cache process (retrieval.axis_catalogue) —
+    ApplicabilityAxis Neo4j + facet counts Qdrant exacts, invalide par
+    l'ingestion. Par question : un lookup de dict, aucun aller-retour reseau.
+    Au-dela de MAX_AXIS_VALUES valeurs, seules les valeurs couvrant le plus de
+    documents sont proposees au LLM.
     """
-    axes: dict[str, list[str]] = {}
-
-    # 1. Neo4j ApplicabilityAxis
-    try:
-        from knowbase.common.clients.neo4j_client import get_neo4j_client
-        driver = get_neo4j_client().driver
-        with driver.session() as session:
-            result = session.run(
-                "MATCH (a:ApplicabilityAxis) "
-                "RETURN a.axis_key AS key, a.known_values AS vals"
-            )
-            for record in result:
-                key = record["key"]
-                vals = record["vals"]
-                if key and vals:
-                    # Filtrer les valeurs nulles/vides
-                    clean_vals = sorted([v for v in vals if v and str(v).strip()])
-                    if clean_vals:
-                        axes[key] = clean_vals
-    except Exception as e:
-        logger.debug(f"[DECOMPOSE] Neo4j axis query failed: {e}")
-
-    # 2. Qdrant : echantillonner des champs axis_* pour completer
     try:
-        from knowbase.retrieval.qdrant_layer_r import get_qdrant_client
-        from knowbase.config.settings import get_settings
-        settings = get_settings()
-        client = get_qdrant_client()
-        collection = settings.qdrant_collection
-
-        results, _ = client.scroll(
-            collection_name=collection,
-            limit=100,
-            with_payload=True,
-            with_vectors=False,
-        )
-
-        from collections import defaultdict
-        qdrant_axes: dict[str, set[str]] = defaultdict(set)
-        for point in results:
-            for key, value in point.payload.items():
-                if key.startswith("axis_") and value and str(value).strip():
-                    # Retirer le prefixe "axis_" pour avoir la cle brute
-                    axis_key = key[5:]  # "axis_release_id" → "release_id"
-                    qdrant_axes[axis_key].add(str(value))
-
-        # Fusionner : Qdrant complete Neo4j (valeurs que Neo4j n'a pas)
-        for axis_key, vals in qdrant_axes.items():
-            if axis_key in axes:
-                existing = set(axes[axis_key])
-                merged = sorted(existing | vals)
-                if len(merged) > len(axes[axis_key]):
-                    axes[axis_key] = merged
-            else:
-                axes[axis_key] = sorted(vals)
-
+        from knowbase.retrieval.axis_catalogue import get_axis_catalogue
+        return get_axis_catalogue().known_values(MAX_AXIS_VALUES or None)
     except Exception as e:
-        logger.debug(f"[DECOMPOSE] Qdrant axis discovery failed: {e}")
-
-    if axes:
-        logger.info(f"[DECOMPOSE] Known axes: {{{', '.join(f'{k}: {len(v)} values' for k, v in axes.items())}}}")
-
-    return axes
+        logger.debug(f"[DECOMPOSE] Axis catalogue unavailable: {e}")
+        return {}
 
 
 # ── Structural detection (no LLM) ────────────────────────────────────────────
@@ -4,8 +4,9 @@ OSMOSIS Retriever — Hybrid dense+BM25 Qdrant search (invariant Type A).
 Ce module isole le retrieval pur du KG. Les chunks retournes sont
 IDENTIQUES a ceux d'un RAG classique. Zero KG, zero enrichissement.
 
-Hybrid search : combine dense (embeddings e5-large) + sparse (BM25 text index)
-via Qdrant Query API avec fusion RRF. Le dense capture la semantique,
+Hybrid search : combine dense (embeddings e5-large) + sparse (vecteur BM25
+nommé, IDF Qdrant ; fallback text index MatchText sur les collections sans
+vecteur sparse) via Qdrant Query API avec fusion RRF. Le dense capture la semantique,
 le BM25 capture les termes exacts (noms produits, versions, codes).
 
 C'est le socle invariant de non-regression : OSMOSIS >= RAG sur Type A.
@@ -15,14 +16,22 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass, field
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue
-from sentence_transformers import SentenceTransformer
 
 from knowbase.config.settings import Settings
 from knowbase.common.clients import rerank_chunks
+from knowbase.retrieval.layer_r_profiles import search_params_for
+from knowbase.retrieval.sparse_bm25 import (
+    SPARSE_VECTOR_NAME,
+    build_query_sparse_vector,
+    collection_has_sparse,
+)
+
+if TYPE_CHECKING:  # sentence_transformers tire torch/transformers (~10s d'import)
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
@@ -134,6 +143,7 @@ def retrieve_chunks(
             limit=top_k,
             with_payload=True,
             query_filter=query_filter,
+            search_params=search_params_for(qdrant_client, settings.qdrant_collection),
         )
 
     # En mode hybrid RRF, les scores sont des rangs fusionnes (<<1.0)
@@ -271,7 +281,10 @@ def _hybrid_search(
     Hybrid dense + BM25 avec fusion RRF manuelle.
 
     1. Dense search (embeddings e5-large) → top N resultats avec score cosine
-    2. BM25 scroll (text index Qdrant) → top N resultats par pertinence lexicale
+    2. BM25 → top N resultats par pertinence lexicale :
+       - vecteur sparse `bm25` de la question complete (TF/IDF BM25 reels)
+         si la collection le declare
+       - sinon scroll MatchText sur 4 mots-cles (ancien comportement)
     3. Fusion RRF : score = 1/(k + rank_dense) + 1/(k + rank_bm25)
 
     Le dense capture la semantique, le BM25 capture les termes exacts
@@ -290,13 +303,29 @@ def _hybrid_search(
             limit=PREFETCH_LIMIT,
             with_payload=True,
             query_filter=query_filter,
+            search_params=search_params_for(qdrant_client, collection_name),
         )
         dense_hits = dense_results.points if hasattr(dense_results, "points") else dense_results
 
-        # ── 2. BM25 scroll (text-only, sans vecteur) ────────────
+        # ── 2. BM25 ─────────────────────────────────────────────
         bm25_hits = []
-        keywords = _extract_bm25_keywords(question)
-        if keywords:
+        sparse_query = (
+            build_query_sparse_vector(question)
+            if collection_has_sparse(qdrant_client, collection_name) else None
+        )
+        keywords = [] if sparse_query is not None else _extract_bm25_keywords(question)
+        if sparse_query is not None:
+            bm25_results = qdrant_client.query_points(
+                collection_name=collection_name,
+                query=sparse_query,
+                using=SPARSE_VECTOR_NAME,
+                limit=PREFETCH_LIMIT,
+                with_payload=True,
+                query_filter=query_filter,
+            )
+            bm25_hits = bm25_results.points if hasattr(bm25_results, "points") else bm25_results
+        elif keywords:
+            # Fallback collection sans vecteur sparse : scroll text index
             keyword_query = " ".join(keywords)
             bm25_conditions = [
                 FieldCondition(key="text", match=MatchText(text=keyword_query)),
@@ -372,7 +401,8 @@ def _hybrid_search(
 
         logger.info(
             f"[OSMOSIS:Retriever] Hybrid RRF: "
-            f"dense={len(dense_hits)}, bm25={len(bm25_hits)}, "
+            f"dense={len(dense_hits)}, bm25={len(bm25_hits)} "
+            f"({'sparse' if sparse_query is not None else 'match_text'}), "
             f"merged={len(all_points)} (both={both}, dense_only={dense_only}, bm25_only={bm25_only}), "
             f"returning top {min(top_k, len(rrf_scored))}"
         )
@@ -390,6 +420,7 @@ def _hybrid_search(
                 limit=top_k,
                 with_payload=True,
                 query_filter=query_filter,
+                search_params=search_params_for(qdrant_client, collection_name),
             )
             return results.points if hasattr(results, "points") else results
         except Exception:
@@ -3,11 +3,10 @@ from __future__ import annotations
 import os
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import FieldCondition, Filter, MatchAny, MatchValue, HasIdCondition
-from sentence_transformers import SentenceTransformer
 
 from knowbase.config.settings import Settings
 from knowbase.common.clients import rerank_chunks
@@ -18,6 +17,9 @@ from .retriever import embed_query, retrieve_chunks as _retrieve_chunks
 from .kg_signal_detector import detect_signals, SignalReport
 from .signal_policy import build_policy
 
+if TYPE_CHECKING:  # sentence_transformers tire torch/transformers (~10s d'import)
+    from sentence_transformers import SentenceTransformer
+
 
 # ---------------------------------------------------------------------------
 # ContradictionEnvelope — contrat de sortie pour les tensions KG
@@ -1507,11 +1509,8 @@ def search_documents(
             import time as _time
             _persp_start = _time.time()
 
-            from knowbase.perspectives.scorer import (
-                resolve_subject_ids_from_claims,
-                load_all_perspectives,
-                score_perspectives,
-            )
+            from knowbase.perspectives.index import get_perspective_index
+            from knowbase.perspectives.scorer import resolve_subject_ids_from_claims
             from knowbase.perspectives.strategy_analyzer import analyze_response_strategy
             import asyncio as _asyncio
 
@@ -1522,20 +1521,17 @@ def search_documents(
             _perspectives_subject_ids = subject_ids
             _perspectives_resolution_mode = resolution_mode
 
-            # 2. Charger TOUTES les Perspectives du tenant (theme-scoped V2)
+            # 2. Index de TOUTES les Perspectives du tenant (theme-scoped V2)
+            #    Cache process, recharge seulement apres un rebuild (version Redis).
             #    Le subject_id est utilise comme boost dans le scoring, pas comme filtre.
             _load_start = _time.time()
-            perspectives = load_all_perspectives(tenant_id)
+            perspective_index = get_perspective_index(tenant_id)
+            perspectives = perspective_index.perspectives
             _load_ms = int((_time.time() - _load_start) * 1000)
 
             if perspectives:
                 _score_start = _time.time()
-                scored = score_perspectives(
-                    question_embedding=query_vector,
-                    question=query,
-                    perspectives=perspectives,
-                    boost_subject_ids=subject_ids,
-                )
+                scored = perspective_index.score(query_vector, boost_subject_ids=subject_ids)
                 _score_ms = int((_time.time() - _score_start) * 1000)
                 _perspectives_consulted = scored
 
@@ -864,6 +864,30 @@ class ClaimFirstOrchestrator:
         Returns:
             ClaimFirstResult avec tous les artefacts
         """
+        result = self.extract_stage(doc_id, cache_result, tenant_id, job_manager)
+        self.persist_graph_stage(result, job_manager)
+        self.persist_vectors_stage(result, cache_result, job_manager)
+        return result
+
+    # =========================================================================
+    # Étages de process_and_persist (enchaînés en séquence ci-dessus, ou
+    # recouverts entre documents par le mode pipeline du worker)
+    # =========================================================================
+
+    def extract_stage(
+        self,
+        doc_id: str,
+        cache_result: CacheLoadResult,
+        tenant_id: Optional[str] = None,
+        job_manager: Optional[Any] = None,
+    ) -> ClaimFirstResult:
+        """
+        Étage 1 — extraction (CPU + LLM) : process() encadré des checkpoints
+        extract / post_extract.
+
+        Mute l'état partagé de l'orchestrateur (SubjectAnchors, FacetRegistry,
+        stats) : un seul thread à la fois.
+        """
         # P4.4 — checkpoint init si JobManager fourni
         if job_manager is not None:
             try:
@@ -888,6 +912,19 @@ class ClaimFirstOrchestrator:
             except Exception as exc:
                 logger.warning(f"[OSMOSE:ClaimFirst] JobManager checkpoint failed: {exc}")
 
+        return result
+
+    def persist_graph_stage(
+        self,
+        result: ClaimFirstResult,
+        job_manager: Optional[Any] = None,
+    ) -> ClaimFirstResult:
+        """
+        Étage 2 — persistance Neo4j (Phases 7, 7.5, 7.6), checkpoint
+        post_claim_persist.
+        """
+        doc_id = result.doc_id
+
         # Phase 7: Persist Neo4j
         if self.persist_enabled and self.persister:
             logger.info("[OSMOSE:ClaimFirst] Phase 7: Persisting to Neo4j...")
@@ -973,6 +1010,21 @@ class ClaimFirstOrchestrator:
                     f"(non-blocking): {e}"
                 )
 
+        return result
+
+    def persist_vectors_stage(
+        self,
+        result: ClaimFirstResult,
+        cache_result: CacheLoadResult,
+        job_manager: Optional[Any] = None,
+    ) -> ClaimFirstResult:
+        """
+        Étage 3 — embeddings + Qdrant Layer R + bridge claim↔chunk (Phase 8),
+        checkpoint done. Doit suivre persist_graph_stage du même document
+        (le bridge met à jour les claims Neo4j).
+        """
+        doc_id = result.doc_id
+
         # Phase 8: Persist chunks to Qdrant Layer R
         # ADR: Unite de preuve vs Unite de lecture.
         # Les TypeAwareChunks du cache sont l'unite de lecture :
@@ -208,6 +208,10 @@ class ClaimPersister:
                     session, result.doc_context, result.detected_axes
                 )
 
+            if result.detected_axes or (result.doc_context and result.doc_context.axis_values):
+                from knowbase.retrieval.axis_catalogue import bump_axis_catalogue_version
+                bump_axis_catalogue_version()
+
             # 1. Passages — conditionnel via OSMOSE_SKIP_PASSAGE_PERSIST
             skip_passage_persist = os.getenv("OSMOSE_SKIP_PASSAGE_PERSIST", "true").lower() == "true"
 
@@ -10,6 +10,8 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import threading
 import time
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -83,6 +85,7 @@ def claimfirst_process_job(
     doc_ids: List[str],
     tenant_id: str = "default",
     cache_dir: str = "/data/extraction_cache",
+    pipeline_mode: Optional[str] = None,
 ) -> dict:
     """
     RQ job pour le pipeline claim-first.
@@ -91,6 +94,9 @@ def claimfirst_process_job(
         doc_ids: Liste des document IDs à traiter
         tenant_id: Tenant ID
         cache_dir: Répertoire du cache d'extraction
+        pipeline_mode: "sequential" (défaut) ou "overlapped" — étages
+            extraction / Neo4j / Qdrant recouverts entre documents
+            (env CLAIMFIRST_PIPELINE_MODE)
 
     Returns:
         Statistiques de traitement
@@ -176,220 +182,226 @@ def claimfirst_process_job(
     # Persistence incrémentale des facets (crash-resilient)
     FACET_PERSIST_INTERVAL = 10  # Persister les facets toutes les N docs
 
-    for i, doc_id in enumerate(doc_ids):
-        filename = filename_map.get(doc_id, doc_id[:40])
-        logger.info(
-            f"[OSMOSE:ClaimFirst:Worker] === Document {i+1}/{len(doc_ids)}: {filename} ==="
+    # Mode pipeline : extraction du doc N+1 recouverte avec la persistance du doc N
+    pipeline_mode = (pipeline_mode or os.getenv("CLAIMFIRST_PIPELINE_MODE", "sequential")).lower()
+
+    if pipeline_mode == "overlapped":
+        results["pipeline"] = _run_overlapped_pipeline(
+            doc_ids=doc_ids,
+            orchestrator=orchestrator,
+            tenant_id=tenant_id,
+            cache_map=cache_map,
+            filename_map=filename_map,
+            results=results,
+            redis_client=redis_client,
+            neo4j_driver=neo4j_driver,
+            facet_registry=facet_registry,
+            facet_persist_interval=FACET_PERSIST_INTERVAL,
+            max_consecutive_empty=MAX_CONSECUTIVE_EMPTY,
         )
-        try:
-            _update_state(
-                redis_client,
-                status="PROCESSING",
-                current_document=doc_id,
-                current_filename=filename,
-                processed=i,
-                failed=results["failed"],
-                skipped=results["skipped"],
-                total_claims=results["total_claims"],
-                total_entities=results["total_entities"],
-                phase="LOADING",
+    else:
+        for i, doc_id in enumerate(doc_ids):
+            filename = filename_map.get(doc_id, doc_id[:40])
+            logger.info(
+                f"[OSMOSE:ClaimFirst:Worker] === Document {i+1}/{len(doc_ids)}: {filename} ==="
             )
-            _emit_phase(redis_client, "EXTRACTING", "running", i, len(doc_ids))
-
-            # Trouver le cache
-            cache_path = cache_map.get(doc_id)
-            if not cache_path:
-                logger.warning(f"[OSMOSE:ClaimFirst:Worker] No cache for {doc_id}, skipping")
-                results["skipped"] += 1
-                _update_state(redis_client, skipped=results["skipped"],
-                              errors=json.dumps(results["errors"]))
-                continue
-
-            # Charger depuis le cache
-            cache_result = load_pass0_from_cache(cache_path, tenant_id)
-            if not cache_result.success:
-                logger.error(f"[OSMOSE:ClaimFirst:Worker] Failed to load cache for {doc_id}")
-                results["failed"] += 1
-                results["errors"].append(f"{filename}: cache load failed")
-                _update_state(redis_client, failed=results["failed"],
-                              errors=json.dumps(results["errors"]))
-                continue
-
-            # Traiter
-            _update_state(redis_client, phase="EXTRACTING")
-            _emit_phase(redis_client, "EXTRACTING", "running", i, len(doc_ids))
-
-            # Heartbeat thread pour cockpit (fix bug instrumentation)
-            # orchestrator.process_and_persist peut prendre 30-60 min sur 1 doc volumineux
-            # (CS-25 amdt 1500 pages) sans émettre d'update Redis intermédiaire.
-            # Sans ce heartbeat, le cockpit voit la clé osmose:claimfirst:state figée
-            # et déclenche une fausse alerte "idle X min" alors que ClaimFirst tourne bien.
-            # Le thread daemon update simplement updated_at toutes les 30s.
-            import threading as _threading
-            _heartbeat_stop = _threading.Event()
-
-            def _heartbeat_loop():
-                while not _heartbeat_stop.wait(30):
-                    try:
-                        _update_state(
-                            redis_client,
-                            phase="EXTRACTING",
-                            phase_status="running",
-                        )
-                    except Exception:
-                        pass  # Non-bloquant : si Redis indisponible, l'orchestrator continue
-
-            _heartbeat_thread = _threading.Thread(target=_heartbeat_loop, daemon=True)
-            _heartbeat_thread.start()
-
-            # P4.6 — JobManager pour résilience (checkpoints Redis)
-            try:
-                from knowbase.ingestion.resilience import JobManager
-                _job_manager = JobManager()
-            except Exception as _exc:
-                logger.warning(f"[ClaimFirst] JobManager unavailable: {_exc}")
-                _job_manager = None
-
             try:
-                result = orchestrator.process_and_persist(
-                    doc_id=doc_id,
-                    cache_result=cache_result,
-                    tenant_id=tenant_id,
-                    job_manager=_job_manager,
+                _update_state(
+                    redis_client,
+                    status="PROCESSING",
+                    current_document=doc_id,
+                    current_filename=filename,
+                    processed=i,
+                    failed=results["failed"],
+                    skipped=results["skipped"],
+                    total_claims=results["total_claims"],
+                    total_entities=results["total_entities"],
+                    phase="LOADING",
                 )
-            except Exception as _exc:
-                # P4.6 — marquer FAILED dans JobManager pour audit + retry
-                if _job_manager is not None:
-                    try:
-                        from knowbase.ingestion.resilience import JobStateEnum
-                        _job_manager.update_state(doc_id, JobStateEnum.FAILED, error=str(_exc))
-                    except Exception:
-                        pass
-                raise
-            finally:
-                _heartbeat_stop.set()
-                _heartbeat_thread.join(timeout=2)
-
-            # Mettre à jour les stats
-            results["processed"] += 1
-            results["total_claims"] += result.claim_count
-            results["total_entities"] += result.entity_count
-
-            _update_state(
-                redis_client,
-                processed=results["processed"],
-                total_claims=results["total_claims"],
-                total_entities=results["total_entities"],
-                phase="PERSISTED",
-            )
+                _emit_phase(redis_client, "EXTRACTING", "running", i, len(doc_ids))
+
+                # Trouver le cache
+                cache_path = cache_map.get(doc_id)
+                if not cache_path:
+                    logger.warning(f"[OSMOSE:ClaimFirst:Worker] No cache for {doc_id}, skipping")
+                    results["skipped"] += 1
+                    _update_state(redis_client, skipped=results["skipped"],
+                                  errors=json.dumps(results["errors"]))
+                    continue
 
-            logger.info(
-                f"[OSMOSE:ClaimFirst:Worker] Processed {doc_id}: "
-                f"{result.claim_count} claims, {result.entity_count} entities"
-            )
+                # Charger depuis le cache
+                cache_result = load_pass0_from_cache(cache_path, tenant_id)
+                if not cache_result.success:
+                    logger.error(f"[OSMOSE:ClaimFirst:Worker] Failed to load cache for {doc_id}")
+                    results["failed"] += 1
+                    results["errors"].append(f"{filename}: cache load failed")
+                    _update_state(redis_client, failed=results["failed"],
+                                  errors=json.dumps(results["errors"]))
+                    continue
 
-            # Persistence incrémentale des facets (crash-resilient)
-            if (results["processed"] % FACET_PERSIST_INTERVAL == 0
-                    and neo4j_driver and results["processed"] > 0):
+                # Traiter
+                _update_state(redis_client, phase="EXTRACTING")
+                _emit_phase(redis_client, "EXTRACTING", "running", i, len(doc_ids))
+
+                # Heartbeat thread pour cockpit (fix bug instrumentation)
+                # orchestrator.process_and_persist peut prendre 30-60 min sur 1 doc volumineux
+                # (CS-25 amdt 1500 pages) sans émettre d'update Redis intermédiaire.
+                # Sans ce heartbeat, le cockpit voit la clé osmose:claimfirst:state figée
+                # et déclenche une fausse alerte "idle X min" alors que ClaimFirst tourne bien.
+                # Le thread daemon update simplement updated_at toutes les 30s.
+                import threading as _threading
+                _heartbeat_stop = _threading.Event()
+
+                def _heartbeat_loop():
+                    while not _heartbeat_stop.wait(30):
+                        try:
+                            _update_state(
+                                redis_client,
+                                phase="EXTRACTING",
+                                phase_status="running",
+                            )
+                        except Exception:
+                            pass  # Non-bloquant : si Redis indisponible, l'orchestrator continue
+
+                _heartbeat_thread = _threading.Thread(target=_heartbeat_loop, daemon=True)
+                _heartbeat_thread.start()
+
+                # P4.6 — JobManager pour résilience (checkpoints Redis)
                 try:
-                    fp = facet_registry.persist_to_neo4j(neo4j_driver)
-                    if fp > 0:
-                        logger.info(
-                            f"[OSMOSE:ClaimFirst:Worker] Incremental facet persist: "
-                            f"{fp} facets saved (checkpoint at doc {results['processed']})"
-                        )
-                except Exception as e:
-                    logger.warning(
-                        f"[OSMOSE:ClaimFirst:Worker] Incremental facet persist failed: {e}"
+                    from knowbase.ingestion.resilience import JobManager
+                    _job_manager = JobManager()
+                except Exception as _exc:
+                    logger.warning(f"[ClaimFirst] JobManager unavailable: {_exc}")
+                    _job_manager = None
+
+                try:
+                    result = orchestrator.process_and_persist(
+                        doc_id=doc_id,
+                        cache_result=cache_result,
+                        tenant_id=tenant_id,
+                        job_manager=_job_manager,
                     )
+                except Exception as _exc:
+                    # P4.6 — marquer FAILED dans JobManager pour audit + retry
+                    if _job_manager is not None:
+                        try:
+                            from knowbase.ingestion.resilience import JobStateEnum
+                            _job_manager.update_state(doc_id, JobStateEnum.FAILED, error=str(_exc))
+                        except Exception:
+                            pass
+                    raise
+                finally:
+                    _heartbeat_stop.set()
+                    _heartbeat_thread.join(timeout=2)
+
+                # Mettre à jour les stats
+                results["processed"] += 1
+                results["total_claims"] += result.claim_count
+                results["total_entities"] += result.entity_count
 
-            # Circuit breaker : détecter docs vides consécutifs (vLLM down silencieux)
-            if result.claim_count == 0:
-                consecutive_empty += 1
-                if consecutive_empty >= MAX_CONSECUTIVE_EMPTY:
-                    # Vérifier si vLLM est réellement down avant de couper
-                    vllm_actually_down = False
-                    try:
-                        import httpx
-                        burst_state = redis_client.get("osmose:burst:state")
-                        if burst_state:
-                            import json as _json
-                            bs = _json.loads(burst_state)
-                            vllm_url = bs.get("vllm_url", "")
-                            if vllm_url:
-                                resp = httpx.get(f"{vllm_url}/v1/models", timeout=5.0)
-                                vllm_actually_down = resp.status_code != 200
-                    except Exception:
-                        vllm_actually_down = True
-
-                    if vllm_actually_down:
-                        remaining = doc_ids[i + 1:]
-                        logger.error(
-                            f"[OSMOSE:ClaimFirst:Worker] CIRCUIT BREAKER: "
-                            f"{consecutive_empty} documents consécutifs avec 0 claims "
-                            f"ET vLLM confirmé down. Arrêt du job. "
-                            f"{len(remaining)} documents restants non traités."
-                        )
-                        # Persister les facets avant arrêt
-                        if neo4j_driver:
-                            try:
-                                fp = facet_registry.persist_to_neo4j(neo4j_driver)
-                                logger.info(f"[OSMOSE:ClaimFirst:Worker] Emergency facet persist: {fp} facets saved before circuit breaker")
-                            except Exception:
-                                pass
-                        results["circuit_breaker"] = True
-                        results["remaining_doc_ids"] = remaining
-                        _update_state(
-                            redis_client,
-                            status="STOPPED_CIRCUIT_BREAKER",
-                            phase="VLLM_UNAVAILABLE",
-                            remaining=len(remaining),
-                        )
-                        break
-                    else:
-                        logger.warning(
-                            f"[OSMOSE:ClaimFirst:Worker] {consecutive_empty} docs "
-                            f"consécutifs à 0 claims mais vLLM OK — on continue."
-                        )
-                        consecutive_empty = 0
-            else:
-                consecutive_empty = 0
+                _update_state(
+                    redis_client,
+                    processed=results["processed"],
+                    total_claims=results["total_claims"],
+                    total_entities=results["total_entities"],
+                    phase="PERSISTED",
+                )
 
-        except Exception as e:
-            # Circuit breaker : arrêt immédiat si vLLM explicitement down
-            error_str = str(e)
-            if "vLLM" in error_str or "VLLMUnavailable" in type(e).__name__:
-                remaining = doc_ids[i + 1:]
-                logger.error(
-                    f"[OSMOSE:ClaimFirst:Worker] CIRCUIT BREAKER (vLLM error): {e}. "
-                    f"Arrêt du job. {len(remaining)} documents restants."
+                logger.info(
+                    f"[OSMOSE:ClaimFirst:Worker] Processed {doc_id}: "
+                    f"{result.claim_count} claims, {result.entity_count} entities"
                 )
-                # Persister les facets avant arrêt
-                if neo4j_driver:
+
+                # Persistence incrémentale des facets (crash-resilient)
+                if (results["processed"] % FACET_PERSIST_INTERVAL == 0
+                        and neo4j_driver and results["processed"] > 0):
                     try:
                         fp = facet_registry.persist_to_neo4j(neo4j_driver)
-                        logger.info(f"[OSMOSE:ClaimFirst:Worker] Emergency facet persist: {fp} facets saved before circuit breaker")
-                    except Exception:
-                        pass
-                results["failed"] += 1
-                results["errors"].append(f"{doc_id}: {error_str}")
-                results["circuit_breaker"] = True
-                results["remaining_doc_ids"] = remaining
-                _update_state(
-                    redis_client,
-                    status="STOPPED_CIRCUIT_BREAKER",
-                    phase="VLLM_UNAVAILABLE",
-                    remaining=len(remaining),
-                    failed=results["failed"],
-                    errors=json.dumps(results["errors"]),
-                )
-                break
+                        if fp > 0:
+                            logger.info(
+                                f"[OSMOSE:ClaimFirst:Worker] Incremental facet persist: "
+                                f"{fp} facets saved (checkpoint at doc {results['processed']})"
+                            )
+                    except Exception as e:
+                        logger.warning(
+                            f"[OSMOSE:ClaimFirst:Worker] Incremental facet persist failed: {e}"
+                        )
 
-            logger.error(f"[OSMOSE:ClaimFirst:Worker] Error processing {doc_id}: {e}")
-            results["failed"] += 1
-            results["errors"].append(f"{filename}: {error_str}")
-            _update_state(redis_client, failed=results["failed"],
-                          errors=json.dumps(results["errors"]))
+                # Circuit breaker : détecter docs vides consécutifs (vLLM down silencieux)
+                if result.claim_count == 0:
+                    consecutive_empty += 1
+                    if consecutive_empty >= MAX_CONSECUTIVE_EMPTY:
+                        # Vérifier si vLLM est réellement down avant de couper
+                        vllm_actually_down = _vllm_confirmed_down(redis_client)
+
+                        if vllm_actually_down:
+                            remaining = doc_ids[i + 1:]
+                            logger.error(
+                                f"[OSMOSE:ClaimFirst:Worker] CIRCUIT BREAKER: "
+                                f"{consecutive_empty} documents consécutifs avec 0 claims "
+                                f"ET vLLM confirmé down. Arrêt du job. "
+                                f"{len(remaining)} documents restants non traités."
+                            )
+                            # Persister les facets avant arrêt
+                            if neo4j_driver:
+                                try:
+                                    fp = facet_registry.persist_to_neo4j(neo4j_driver)
+                                    logger.info(f"[OSMOSE:ClaimFirst:Worker] Emergency facet persist: {fp} facets saved before circuit breaker")
+                                except Exception:
+                                    pass
+                            results["circuit_breaker"] = True
+                            results["remaining_doc_ids"] = remaining
+                            _update_state(
+                                redis_client,
+                                status="STOPPED_CIRCUIT_BREAKER",
+                                phase="VLLM_UNAVAILABLE",
+                                remaining=len(remaining),
+                            )
+                            break
+                        else:
+                            logger.warning(
+                                f"[OSMOSE:ClaimFirst:Worker] {consecutive_empty} docs "
+                                f"consécutifs à 0 claims mais vLLM OK — on continue."
+                            )
+                            consecutive_empty = 0
+                else:
+                    consecutive_empty = 0
+
+            except Exception as e:
+                # Circuit breaker : arrêt immédiat si vLLM explicitement down
+                error_str = str(e)
+                if "vLLM" in error_str or "VLLMUnavailable" in type(e).__name__:
+                    remaining = doc_ids[i + 1:]
+                    logger.error(
+                        f"[OSMOSE:ClaimFirst:Worker] CIRCUIT BREAKER (vLLM error): {e}. "
+                        f"Arrêt du job. {len(remaining)} documents restants."
+                    )
+                    # Persister les facets avant arrêt
+                    if neo4j_driver:
+                        try:
+                            fp = facet_registry.persist_to_neo4j(neo4j_driver)
+                            logger.info(f"[OSMOSE:ClaimFirst:Worker] Emergency facet persist: {fp} facets saved before circuit breaker")
+                        except Exception:
+                            pass
+                    results["failed"] += 1
+                    results["errors"].append(f"{doc_id}: {error_str}")
+                    results["circuit_breaker"] = True
+                    results["remaining_doc_ids"] = remaining
+                    _update_state(
+                        redis_client,
+                        status="STOPPED_CIRCUIT_BREAKER",
+                        phase="VLLM_UNAVAILABLE",
+                        remaining=len(remaining),
+                        failed=results["failed"],
+                        errors=json.dumps(results["errors"]),
+                    )
+                    break
+
+                logger.error(f"[OSMOSE:ClaimFirst:Worker] Error processing {doc_id}: {e}")
+                results["failed"] += 1
+                results["errors"].append(f"{filename}: {error_str}")
+                _update_state(redis_client, failed=results["failed"],
+                              errors=json.dumps(results["errors"]))
 
     # Phase 8.5 : Persister le FacetRegistry (après TOUS les documents)
     if neo4j_driver:
@@ -535,6 +547,11 @@ def claimfirst_process_job(
         f"{results['failed']} failed, {results['skipped']} skipped"
     )
 
+    # Vues Atlas matérialisées : le corpus a changé, recalcul de la home
+    if results["processed"] > 0:
+        from knowbase.wiki.atlas_views import invalidate_atlas_views
+        invalidate_atlas_views(tenant_id, reason="claimfirst ingestion", refresh_home=True)
+
     # Cleanup driver
     if neo4j_driver:
         neo4j_driver.close()
@@ -542,6 +559,240 @@ def claimfirst_process_job(
     return results
 
 
+def _vllm_confirmed_down(redis_client: redis.Redis) -> bool:
+    """Vérifie via /v1/models que le vLLM du burst est réellement indisponible."""
+    try:
+        import httpx
+        burst_state = redis_client.get("osmose:burst:state")
+        if burst_state:
+            bs = json.loads(burst_state)
+            vllm_url = bs.get("vllm_url", "")
+            if vllm_url:
+                resp = httpx.get(f"{vllm_url}/v1/models", timeout=5.0)
+                return resp.status_code != 200
+        return False
+    except Exception:
+        return True
+
+
+class _DocumentSkipped(Exception):
+    """Document sans cache d'extraction (compté en skipped, pas en failed)."""
+
+
+class _CacheLoadFailed(RuntimeError):
+    """Cache d'extraction illisible (failed, sans JobState créé)."""
+
+
+def _run_overlapped_pipeline(
+    doc_ids: List[str],
+    orchestrator,
+    tenant_id: str,
+    cache_map: Dict[str, str],
+    filename_map: Dict[str, str],
+    results: dict,
+    redis_client: redis.Redis,
+    neo4j_driver,
+    facet_registry,
+    facet_persist_interval: int,
+    max_consecutive_empty: int,
+) -> dict:
+    """
+    Traite les documents en pipeline à 3 étages reliés par des files bornées :
+
+    - extract : chargement cache + orchestrator.extract_stage (CPU + LLM)
+    - graph   : orchestrator.persist_graph_stage (Neo4j)
+    - vectors : orchestrator.persist_vectors_stage (embeddings + Qdrant + bridge)
+
+    Le document N+1 est extrait pendant que le document N est persisté.
+    L'étage extract reste à 1 thread : process() mute l'état partagé de
+    l'orchestrateur (SubjectAnchors, FacetRegistry). Concurrence des étages
+    de persistance et taille des files : CLAIMFIRST_PIPELINE_GRAPH_WORKERS,
+    CLAIMFIRST_PIPELINE_VECTOR_WORKERS, CLAIMFIRST_PIPELINE_QUEUE_SIZE.
+
+    Mêmes checkpoints JobManager que process_and_persist (extract →
+    post_extract → post_claim_persist → done), donc même reprise via
+    resilience.recovery. Met à jour `results` en place.
+
+    Returns:
+        Rapport du pipeline (utilisation par étage, docs/heure)
+    """
+    from knowbase.ingestion.stage_pipeline import Stage, StagePipeline
+    from knowbase.stratified.pass0.cache_loader import load_pass0_from_cache
+
+    try:
+        from knowbase.ingestion.resilience import JobManager
+        job_manager = JobManager()
+    except Exception as exc:
+        logger.warning(f"[ClaimFirst] JobManager unavailable: {exc}")
+        job_manager = None
+
+    total = len(doc_ids)
+    state = {"consecutive_empty": 0, "facet_checkpoints": 0}
+
+    def extract(doc_id: str):
+        # Persistance incrémentale des facets, dans le thread qui mute le registre
+        checkpoints = results["processed"] // facet_persist_interval
+        if neo4j_driver and checkpoints > state["facet_checkpoints"]:
+            state["facet_checkpoints"] = checkpoints
+            try:
+                fp = facet_registry.persist_to_neo4j(neo4j_driver)
+                if fp > 0:
+                    logger.info(
+                        f"[OSMOSE:ClaimFirst:Worker] Incremental facet persist: "
+                        f"{fp} facets saved (checkpoint at doc {results['processed']})"
+                    )
+            except Exception as e:
+                logger.warning(f"[OSMOSE:ClaimFirst:Worker] Incremental facet persist failed: {e}")
+
+        cache_path = cache_map.get(doc_id)
+        if not cache_path:
+            raise _DocumentSkipped(doc_id)
+        cache_result = load_pass0_from_cache(cache_path, tenant_id)
+        if not cache_result.success:
+            raise _CacheLoadFailed("cache load failed")
+
+        _update_state(
+            redis_client,
+            current_document=doc_id,
+            current_filename=filename_map.get(doc_id, doc_id[:40]),
+        )
+        result = orchestrator.extract_stage(
+            doc_id=doc_id,
+            cache_result=cache_result,
+            tenant_id=tenant_id,
+            job_manager=job_manager,
+        )
+        return cache_result, result
+
+    def persist_graph(payload):
+        cache_result, result = payload
+        orchestrator.persist_graph_stage(result, job_manager=job_manager)
+        return cache_result, result
+
+    def persist_vectors(payload):
+        cache_result, result = payload
+        return orchestrator.persist_vectors_stage(result, cache_result, job_manager=job_manager)
+
+    pipeline = StagePipeline(
+        [
+            Stage("extract", extract, concurrency=1),
+            Stage("graph", persist_graph,
+                  concurrency=int(os.getenv("CLAIMFIRST_PIPELINE_GRAPH_WORKERS", "1"))),
+            Stage("vectors", persist_vectors,
+                  concurrency=int(os.getenv("CLAIMFIRST_PIPELINE_VECTOR_WORKERS", "1"))),
+        ],
+        queue_size=int(os.getenv("CLAIMFIRST_PIPELINE_QUEUE_SIZE", "2")),
+    )
+
+    def on_done(doc_id: str, result) -> None:
+        results["processed"] += 1
+        results["total_claims"] += result.claim_count
+        results["total_entities"] += result.entity_count
+        _update_state(
+            redis_client,
+            processed=results["processed"],
+            total_claims=results["total_claims"],
+            total_entities=results["total_entities"],
+        )
+        _emit_phase(redis_client, "PIPELINE", "running", results["processed"], total)
+        logger.info(
+            f"[OSMOSE:ClaimFirst:Worker] Processed {doc_id}: "
+            f"{result.claim_count} claims, {result.entity_count} entities"
+        )
+
+        # Circuit breaker : docs vides consécutifs (vLLM down silencieux)
+        if result.claim_count:
+            state["consecutive_empty"] = 0
+            return
+        state["consecutive_empty"] += 1
+        if state["consecutive_empty"] < max_consecutive_empty:
+            return
+        if _vllm_confirmed_down(redis_client):
+            logger.error(
+                f"[OSMOSE:ClaimFirst:Worker] CIRCUIT BREAKER: "
+                f"{state['consecutive_empty']} documents consécutifs avec 0 claims "
+                f"ET vLLM confirmé down. Arrêt de l'alimentation du pipeline."
+            )
+            pipeline.stop()
+        else:
+            logger.warning(
+                f"[OSMOSE:ClaimFirst:Worker] {state['consecutive_empty']} docs "
+                f"consécutifs à 0 claims mais vLLM OK — on continue."
+            )
+            state["consecutive_empty"] = 0
+
+    def on_error(doc_id: str, stage: str, exc: BaseException) -> None:
+        filename = filename_map.get(doc_id, doc_id[:40])
+        if isinstance(exc, _DocumentSkipped):
+            logger.warning(f"[OSMOSE:ClaimFirst:Worker] No cache for {doc_id}, skipping")
+            results["skipped"] += 1
+            _update_state(redis_client, skipped=results["skipped"])
+            return
+
+        error_str = str(exc)
+        logger.error(f"[OSMOSE:ClaimFirst:Worker] Error processing {doc_id} ({stage}): {exc}")
+        results["failed"] += 1
+        results["errors"].append(f"{filename}: {error_str}")
+        _update_state(redis_client, failed=results["failed"], errors=json.dumps(results["errors"]))
+
+        # P4.6 — marquer FAILED dans JobManager pour audit + retry
+        if job_manager is not None and not isinstance(exc, _CacheLoadFailed):
+            try:
+                from knowbase.ingestion.resilience import JobStateEnum
+                job_manager.update_state(doc_id, JobStateEnum.FAILED, error=error_str)
+            except Exception:
+                pass
+
+        # Circuit breaker : arrêt immédiat si vLLM explicitement down
+        if "vLLM" in error_str or "VLLMUnavailable" in type(exc).__name__:
+            logger.error(
+                f"[OSMOSE:ClaimFirst:Worker] CIRCUIT BREAKER (vLLM error): {exc}. "
+                f"Arrêt de l'alimentation du pipeline."
+            )
+            pipeline.stop()
+
+    # Heartbeat cockpit : un document peut rester 30-60 min dans un étage
+    heartbeat_stop = threading.Event()
+
+    def _heartbeat_loop():
+        while not heartbeat_stop.wait(30):
+            try:
+                _update_state(redis_client, phase="PIPELINE", phase_status="running")
+            except Exception:
+                pass
+
+    _update_state(redis_client, status="PROCESSING", phase="PIPELINE")
+    _emit_phase(redis_client, "PIPELINE", "started", 0, total)
+    heartbeat_thread = threading.Thread(target=_heartbeat_loop, daemon=True)
+    heartbeat_thread.start()
+    try:
+        report = pipeline.run(doc_ids, on_done=on_done, on_error=on_error)
+    finally:
+        heartbeat_stop.set()
+        heartbeat_thread.join(timeout=2)
+
+    report_dict = report.to_dict()
+    _update_state(redis_client, pipeline_stats=json.dumps(report_dict))
+
+    if report.stopped:
+        unstarted = set(report.unstarted)
+        remaining = [d for d in doc_ids if d in unstarted]
+        logger.error(
+            f"[OSMOSE:ClaimFirst:Worker] Pipeline stopped by circuit breaker. "
+            f"{len(remaining)} documents restants non traités."
+        )
+        results["circuit_breaker"] = True
+        results["remaining_doc_ids"] = remaining
+        _update_state(
+            redis_client,
+            status="STOPPED_CIRCUIT_BREAKER",
+            phase="VLLM_UNAVAILABLE",
+            remaining=len(remaining),
+        )
+
+    return report_dict
+
+
 def _detect_cross_doc_chains(neo4j_driver, tenant_id: str) -> dict:
     """
     Détecte et persiste les chaînes cross-document après import.
@@ -0,0 +1,113 @@
+"""
+Automate Aho-Corasick — recherche multi-motifs en une seule passe.
+
+Remplace les boucles `for form in forms: if form in text` lorsque le même
+ensemble de motifs est cherché dans beaucoup de textes : l'automate est
+compilé une fois, puis chaque texte est parcouru une seule fois, quel que
+soit le nombre de motifs (O(len(text) + nb_hits)).
+
+Sémantique : sous-chaîne exacte, occurrences chevauchantes incluses —
+identique à `pattern in text` pour chaque motif. La normalisation (casse,
+etc.) est à la charge de l'appelant, sur les motifs ET sur le texte.
+
+Usage:
+    automaton = AhoCorasickAutomaton(["sap hana", "hana", "s/4hana"])
+    automaton.find_all("sap hana runs on s/4hana")   # {0, 1, 2}
+    for end, pid in automaton.iter_matches(text): ...
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class AhoCorasickAutomaton:
+    """
+    Automate compilé sur une liste de motifs.
+
+    Les motifs sont identifiés par leur index dans `patterns` ; les doublons
+    sont conservés (chaque index est rapporté). Le motif vide n'est jamais
+    rapporté : `"" in text` étant toujours vrai, l'appelant le traite à part.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(patterns)
+        # Transitions par état ; état 0 = racine
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Motifs se terminant exactement sur l'état
+        self._out: List[List[int]] = [[]]
+        # Lien vers l'état suffixe le plus proche ayant une sortie (-1 = aucun)
+        self._dict_link: List[int] = [-1]
+
+        for pid, pattern in enumerate(self.patterns):
+            if pattern:
+                self._insert(pattern, pid)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def _insert(self, pattern: str, pid: int) -> None:
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._dict_link.append(-1)
+                self._goto[state][ch] = nxt
+            state = nxt
+        self._out[state].append(pid)
+
+    def _build_links(self) -> None:
+        """Liens d'échec et de dictionnaire, en largeur depuis la racine."""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                fail_state = self._fail[nxt]
+                self._dict_link[nxt] = (
+                    fail_state if self._out[fail_state] else self._dict_link[fail_state]
+                )
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        Occurrences de tous les motifs dans `text`.
+
+        Yields:
+            (end, pattern_id) — le motif occupe text[end - len(motif) + 1 : end + 1]
+        """
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        state = 0
+        for i, ch in enumerate(text):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                for pid in out[state]:
+                    yield i, pid
+            link = dict_link[state]
+            while link > 0:
+                for pid in out[link]:
+                    yield i, pid
+                link = dict_link[link]
+
+    def find_all(self, text: str) -> Set[int]:
+        """Index des motifs présents au moins une fois dans `text`."""
+        return {pid for _, pid in self.iter_matches(text)}
+
+
+__all__ = ["AhoCorasickAutomaton"]
@@ -1,9 +1,43 @@
-from .http import get_http_client
-from .openai_client import get_openai_client, get_async_openai_client
-from .anthropic_client import get_anthropic_client, is_anthropic_available
-from .qdrant_client import get_qdrant_client, ensure_qdrant_collection, ensure_qa_collection
-from .embeddings import get_sentence_transformer
-from .reranker import get_cross_encoder, rerank_chunks
+"""
+Clients partagés (HTTP, LLM, Qdrant, embeddings, reranker).
+
+Les sous-modules sont importés à la demande (PEP 562) : `from
+knowbase.common.clients import get_qdrant_client` ne charge que le client
+Qdrant, pas sentence-transformers / torch tirés par le reranker.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_LAZY_EXPORTS = {
+    "get_http_client": ".http",
+    "get_openai_client": ".openai_client",
+    "get_async_openai_client": ".openai_client",
+    "get_anthropic_client": ".anthropic_client",
+    "is_anthropic_available": ".anthropic_client",
+    "get_qdrant_client": ".qdrant_client",
+    "ensure_qdrant_collection": ".qdrant_client",
+    "ensure_qa_collection": ".qdrant_client",
+    "get_sentence_transformer": ".embeddings",
+    "get_cross_encoder": ".reranker",
+    "rerank_chunks": ".reranker",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "get_http_client",
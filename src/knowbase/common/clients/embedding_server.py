@@ -0,0 +1,550 @@
+"""
+Serveur d'embeddings partagé entre processus locaux (API, workers RQ).
+
+Chaque processus chargeait sa propre copie du modèle (multilingual-e5-large :
+~2 GB de RAM et plusieurs secondes de cold start par copie), et les petites
+requêtes concurrentes n'étaient jamais regroupées.
+
+Mode partagé (optionnel, EMBEDDINGS_SHARED_SOCKET) :
+- un seul processus serveur détient le modèle
+  (python -m knowbase.common.clients.embedding_server, ou lancé par le
+  worker au démarrage via ensure_embedding_server)
+- micro-batching dynamique : les requêtes arrivant pendant quelques ms
+  (EMBEDDINGS_SHARED_MAX_WAIT_MS) sont encodées en un seul appel, jusqu'à
+  EMBEDDINGS_SHARED_MAX_BATCH textes
+- les clients passent par l'interface existante EmbeddingModelManager.encode ;
+  si le serveur est injoignable, retour au modèle en process
+
+Adresse : chemin de socket Unix (défaut) ou "tcp://host:port" quand les
+processus ne partagent pas de système de fichiers (containers séparés).
+
+Protocole : trames préfixées par leur longueur (4 octets big-endian).
+  requête  : JSON {"op": "encode", "texts": [...], "kwargs": {...}} | {"op": "info"}
+  réponse  : JSON {"ok": true, "shape": [n, d], "dtype": "float32"} + trame brute
+             ou JSON {"ok": false, "error": "..."}
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SHARED_SOCKET_ENV = "EMBEDDINGS_SHARED_SOCKET"
+SERVER_PROCESS_ENV = "EMBEDDINGS_SHARED_SERVER_PROCESS"
+
+MAX_BATCH = int(os.getenv("EMBEDDINGS_SHARED_MAX_BATCH", "64"))
+MAX_WAIT_MS = float(os.getenv("EMBEDDINGS_SHARED_MAX_WAIT_MS", "5"))
+CLIENT_TIMEOUT_S = float(os.getenv("EMBEDDINGS_SHARED_TIMEOUT_S", "300"))
+RETRY_AFTER_S = float(os.getenv("EMBEDDINGS_SHARED_RETRY_S", "30"))
+STARTUP_TIMEOUT_S = float(os.getenv("EMBEDDINGS_SHARED_STARTUP_TIMEOUT_S", "180"))
+
+# kwargs de SentenceTransformer.encode qui changent le résultat (transmis au
+# serveur et utilisés pour regrouper les requêtes compatibles)
+FORWARDED_KWARGS = ("normalize_embeddings", "prompt_name", "prompt")
+# kwargs sans effet sur le résultat (le serveur choisit son propre batching)
+IGNORED_KWARGS = ("batch_size", "show_progress_bar", "convert_to_numpy")
+
+_HEADER = struct.Struct(">I")
+
+
+class SharedEmbeddingUnavailable(RuntimeError):
+    """Serveur partagé injoignable ou en erreur."""
+
+
+class UnsupportedEncodeKwargs(SharedEmbeddingUnavailable):
+    """Requête non servable à distance (encodage local, serveur toujours sain)."""
+
+
+def get_shared_address() -> Optional[str]:
+    """Adresse du serveur partagé, None si le mode est désactivé ou si on EST le serveur."""
+    if os.getenv(SERVER_PROCESS_ENV) == "1":
+        return None
+    return os.getenv(SHARED_SOCKET_ENV) or None
+
+
+def split_encode_kwargs(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    kwargs transmissibles au serveur.
+
+    Raises:
+        UnsupportedEncodeKwargs: kwarg non supporté à distance
+            (convert_to_tensor, output_value, ...) → encodage local
+    """
+    forwarded = {}
+    for key, value in kwargs.items():
+        if key in FORWARDED_KWARGS:
+            if value is not None:
+                forwarded[key] = value
+        elif key in IGNORED_KWARGS:
+            if key == "convert_to_numpy" and value is False:
+                raise UnsupportedEncodeKwargs("convert_to_numpy=False")
+        else:
+            raise UnsupportedEncodeKwargs(f"unsupported encode kwarg: {key}")
+    return forwarded
+
+
+# =============================================================================
+# Trames
+# =============================================================================
+
+def _send_frame(sock: socket.socket, payload: bytes) -> None:
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return _recv_exact(sock, size)
+
+
+def _parse_address(address: str) -> Tuple[int, Any]:
+    if address.startswith("tcp://"):
+        host, _, port = address[len("tcp://"):].rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, address
+
+
+# =============================================================================
+# Micro-batching
+# =============================================================================
+
+@dataclass
+class _Pending:
+    texts: List[str]
+    kwargs: Dict[str, Any]
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[np.ndarray] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def group_key(self) -> str:
+        return json.dumps(self.kwargs, sort_keys=True)
+
+
+class MicroBatcher:
+    """
+    Regroupe les requêtes concurrentes en un appel d'encodage.
+
+    Après la première requête, attend au plus `max_wait_ms` d'autres requêtes
+    (ou jusqu'à `max_batch` textes), puis encode chaque groupe de kwargs
+    identiques en un seul appel et redistribue les lignes.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[..., np.ndarray],
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait_s = max(0.0, max_wait_ms) / 1000.0
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._stats = {"requests": 0, "texts": 0, "batches": 0}
+        self._thread = threading.Thread(target=self._loop, name="EmbeddingMicroBatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str], **kwargs) -> np.ndarray:
+        """Encode `texts` (bloquant) au sein du prochain micro-batch."""
+        pending = _Pending(list(texts), kwargs)
+        self._queue.put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def stats(self) -> Dict[str, float]:
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "avg_batch_texts": round(self._stats["texts"] / batches, 1) if batches else 0.0,
+        }
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.monotonic() + self.max_wait_s
+            stop = False
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+                size += len(nxt.texts)
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[_Pending]) -> None:
+        groups: Dict[str, List[_Pending]] = {}
+        for pending in batch:
+            groups.setdefault(pending.group_key, []).append(pending)
+
+        for members in groups.values():
+            texts = [t for p in members for t in p.texts]
+            try:
+                embeddings = np.asarray(self.encode_fn(texts, **members[0].kwargs))
+                offset = 0
+                for pending in members:
+                    pending.result = embeddings[offset:offset + len(pending.texts)]
+                    offset += len(pending.texts)
+            except Exception as exc:
+                for pending in members:
+                    pending.error = exc
+            self._stats["batches"] += 1
+            self._stats["texts"] += len(texts)
+            self._stats["requests"] += len(members)
+            for pending in members:
+                pending.done.set()
+
+
+# =============================================================================
+# Serveur
+# =============================================================================
+
+class _Handler(socketserver.BaseRequestHandler):
+
+    def handle(self) -> None:
+        server: "EmbeddingServer" = self.server.embedding_server  # type: ignore[attr-defined]
+        sock = self.request
+        while True:
+            try:
+                request = json.loads(_recv_frame(sock))
+            except (ConnectionError, OSError, struct.error):
+                return
+            try:
+                if request.get("op") == "info":
+                    _send_frame(sock, json.dumps({"ok": True, **server.info()}).encode())
+                    continue
+                embeddings = server.batcher.submit(request.get("texts") or [], **(request.get("kwargs") or {}))
+                embeddings = np.ascontiguousarray(embeddings)
+                header = {"ok": True, "shape": list(embeddings.shape), "dtype": str(embeddings.dtype)}
+                _send_frame(sock, json.dumps(header).encode())
+                _send_frame(sock, embeddings.tobytes())
+            except (ConnectionError, OSError):
+                return
+            except Exception as exc:
+                logger.error(f"[EMBEDDINGS:SHARED] Encode failed: {exc}")
+                _send_frame(sock, json.dumps({"ok": False, "error": str(exc)}).encode())
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class EmbeddingServer:
+    """
+    Serveur local : un modèle, micro-batching, N clients.
+
+    Args:
+        address: Chemin de socket Unix ou "tcp://host:port"
+        encode_fn: Fonction d'encodage (défaut : modèle de EmbeddingModelManager)
+        info_fn: Métadonnées exposées via op=info (modèle, dimension)
+    """
+
+    def __init__(
+        self,
+        address: str,
+        encode_fn: Callable[..., np.ndarray],
+        info_fn: Optional[Callable[[], Dict[str, Any]]] = None,
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+    ):
+        self.address = address
+        self.batcher = MicroBatcher(encode_fn, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        self._info_fn = info_fn
+        family, bind = _parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(address):
+                os.unlink(address)
+            self._server = _UnixServer(bind, _Handler)
+        else:
+            self._server = _TCPServer(bind, _Handler)
+        self._server.embedding_server = self  # type: ignore[attr-defined]
+        self._thread: Optional[threading.Thread] = None
+
+    def info(self) -> Dict[str, Any]:
+        info = dict(self._info_fn()) if self._info_fn else {}
+        info["batcher"] = self.batcher.stats()
+        return info
+
+    def serve_forever(self) -> None:
+        logger.info(f"[EMBEDDINGS:SHARED] Serving on {self.address}")
+        self._server.serve_forever()
+
+    def start(self) -> "EmbeddingServer":
+        """Sert dans un thread (tests, intégration in-process)."""
+        self._thread = threading.Thread(target=self.serve_forever, name="EmbeddingServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self.batcher.close()
+        family, _ = _parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+# =============================================================================
+# Client
+# =============================================================================
+
+class EmbeddingServerClient:
+    """Client du serveur partagé (une connexion par thread, réutilisée)."""
+
+    def __init__(self, address: str, timeout: float = CLIENT_TIMEOUT_S):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        """
+        Raises:
+            SharedEmbeddingUnavailable: serveur injoignable ou erreur d'encodage
+        """
+        forwarded = split_encode_kwargs(kwargs)
+        header, payload = self._call({"op": "encode", "texts": list(texts), "kwargs": forwarded}, expect_payload=True)
+        # frombuffer est en lecture seule : copie modifiable (comme SentenceTransformer.encode)
+        return np.frombuffer(payload, dtype=header["dtype"]).reshape(header["shape"]).copy()
+
+    def info(self) -> Dict[str, Any]:
+        header, _ = self._call({"op": "info"}, expect_payload=False)
+        return header
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        previous, self.timeout = self.timeout, timeout
+        try:
+            self.info()
+            return True
+        except SharedEmbeddingUnavailable:
+            return False
+        finally:
+            self.timeout = previous
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _connect(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            family, target = _parse_address(self.address)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(target)
+            self._local.sock = sock
+        sock.settimeout(self.timeout)
+        return sock
+
+    def _call(self, request: Dict[str, Any], expect_payload: bool) -> Tuple[Dict[str, Any], bytes]:
+        body = json.dumps(request).encode()
+        for attempt in range(2):
+            try:
+                sock = self._connect()
+                _send_frame(sock, body)
+                header = json.loads(_recv_frame(sock))
+                payload = _recv_frame(sock) if expect_payload and header.get("ok") else b""
+                break
+            except (OSError, ConnectionError, struct.error) as exc:
+                self.close()
+                # Connexion réutilisée fermée côté serveur (redémarrage) : un seul retry
+                if attempt == 1:
+                    raise SharedEmbeddingUnavailable(f"{self.address}: {exc}") from exc
+        if not header.get("ok"):
+            raise SharedEmbeddingUnavailable(header.get("error") or "server error")
+        return header, payload
+
+
+_client: Optional[EmbeddingServerClient] = None
+_client_lock = threading.Lock()
+
+
+def get_shared_embedding_client() -> Optional[EmbeddingServerClient]:
+    """Client singleton, None si le mode partagé n'est pas configuré."""
+    global _client
+    address = get_shared_address()
+    if address is None:
+        return None
+    if _client is None or _client.address != address:
+        with _client_lock:
+            if _client is None or _client.address != address:
+                _client = EmbeddingServerClient(address)
+    return _client
+
+
+def reset_shared_embedding_client() -> None:
+    """Reset du singleton (tests)."""
+    global _client
+    if _client is not None:
+        _client.close()
+    _client = None
+
+
+# =============================================================================
+# Démarrage (worker) et point d'entrée serveur
+# =============================================================================
+
+def ensure_embedding_server(
+    address: Optional[str] = None,
+    startup_timeout_s: float = STARTUP_TIMEOUT_S,
+    autostart: bool = True,
+) -> bool:
+    """
+    Garantit qu'un serveur partagé répond, en le lançant si nécessaire
+    (autostart=False : simple vérification).
+
+    Plusieurs workers peuvent démarrer en même temps : un verrou fichier
+    (adresse + ".lock") désigne celui qui lance le processus serveur, les
+    autres attendent qu'il réponde.
+
+    Returns:
+        True si le serveur répond (les workers n'ont alors pas à charger le modèle)
+    """
+    address = address or get_shared_address()
+    if not address:
+        return False
+    client = EmbeddingServerClient(address)
+    try:
+        if client.ping():
+            return True
+        if not autostart:
+            logger.warning(f"[EMBEDDINGS:SHARED] Embedding server not reachable on {address}")
+            return False
+
+        import fcntl
+
+        lock_path = (address if not address.startswith("tcp://") else
+                     os.path.join("/tmp", "embedding_server_" + address[6:].replace(":", "_"))) + ".lock"
+        with open(lock_path, "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                owner = True
+            except OSError:
+                owner = False
+
+            if owner and not client.ping():
+                logger.info(f"[EMBEDDINGS:SHARED] Starting embedding server on {address}")
+                subprocess.Popen(
+                    [sys.executable, "-m", "knowbase.common.clients.embedding_server", "--address", address],
+                    env={**os.environ, SERVER_PROCESS_ENV: "1"},
+                    start_new_session=True,
+                )
+
+            deadline = time.monotonic() + startup_timeout_s
+            while time.monotonic() < deadline:
+                if client.ping():
+                    logger.info(f"[EMBEDDINGS:SHARED] Embedding server ready on {address}")
+                    return True
+                time.sleep(1.0)
+    except Exception as exc:
+        logger.warning(f"[EMBEDDINGS:SHARED] Could not ensure embedding server: {exc}")
+    finally:
+        client.close()
+
+    logger.warning(f"[EMBEDDINGS:SHARED] Embedding server not reachable on {address}, in-process fallback")
+    return False
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serveur d'embeddings partagé (micro-batching)")
+    parser.add_argument("--address", default=os.getenv(SHARED_SOCKET_ENV, "/tmp/knowbase-embeddings.sock"))
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s: %(message)s")
+    # Ce processus encode en local (pas de boucle vers lui-même)
+    os.environ[SERVER_PROCESS_ENV] = "1"
+
+    from knowbase.common.clients.embeddings import get_embedding_manager
+
+    manager = get_embedding_manager()
+    manager.get_model()  # chargement avant d'accepter des connexions
+
+    def info() -> Dict[str, Any]:
+        return {
+            "model_name": manager.get_status().get("model_name"),
+            "dimension": manager.get_sentence_embedding_dimension(),
+            "pid": os.getpid(),
+        }
+
+    server = EmbeddingServer(
+        args.address,
+        encode_fn=lambda texts, **kw: manager.encode(texts, batch_size=args.max_batch, **kw),
+        info_fn=info,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = [
+    "EmbeddingServer",
+    "EmbeddingServerClient",
+    "MicroBatcher",
+    "SharedEmbeddingUnavailable",
+    "UnsupportedEncodeKwargs",
+    "ensure_embedding_server",
+    "get_shared_address",
+    "get_shared_embedding_client",
+    "reset_shared_embedding_client",
+    "split_encode_kwargs",
+]
@@ -5,6 +5,9 @@ Phase 2.x: Ajout du mécanisme de timeout pour libérer la mémoire GPU
 après une période d'inactivité (utile en développement).
 
 Mode Burst: Support pour basculer vers un service embeddings distant (EC2 Spot).
+
+Mode partagé: un serveur local unique sert tous les processus
+(voir embedding_server.py, EMBEDDINGS_SHARED_SOCKET).
 """
 
 from __future__ import annotations
@@ -18,6 +21,13 @@ from typing import Optional, List, Dict, Any
 import numpy as np
 import requests
 
+from knowbase.common.clients.embedding_server import (
+    RETRY_AFTER_S as SHARED_RETRY_AFTER_S,
+    EmbeddingServerClient,
+    SharedEmbeddingUnavailable,
+    UnsupportedEncodeKwargs,
+    get_shared_embedding_client,
+)
 from knowbase.config.settings import get_settings
 
 logger = logging.getLogger(__name__)
@@ -61,6 +71,10 @@ class EmbeddingModelManager:
         self._monitor_thread: Optional[threading.Thread] = None
         self._stop_monitor = threading.Event()
 
+        # === Mode serveur partagé (EMBEDDINGS_SHARED_SOCKET) ===
+        # Jusqu'à quand le serveur est considéré injoignable (fallback local)
+        self._shared_down_until: float = 0.0
+
         # === Mode Burst ===
         self._burst_mode = False
         self._burst_endpoint: Optional[str] = None
@@ -94,11 +108,25 @@ class EmbeddingModelManager:
         Returns:
             SentenceTransformer model
         """
-        from sentence_transformers import SentenceTransformer
-
         settings = get_settings()
         name = model_name or settings.embeddings_model
 
+        # Mode partagé : proxy vers le serveur pour le modèle par défaut
+        if name == settings.embeddings_model and device is None and cache_folder is None:
+            if self._shared_client() is not None:
+                return SharedEmbeddingModel(self)
+
+        return self._load_model(name, device, cache_folder)
+
+    def _load_model(
+        self,
+        name: str,
+        device: Optional[str] = None,
+        cache_folder: Optional[str] = None,
+    ):
+        """Charge (ou réutilise) le modèle dans ce processus."""
+        from sentence_transformers import SentenceTransformer
+
         with self._model_lock:
             # Mettre à jour le temps d'accès
             self._last_access_time = time.time()
@@ -142,6 +170,7 @@ class EmbeddingModelManager:
         Encode des phrases avec le modèle d'embedding.
 
         En mode Burst, utilise le service distant EC2 Spot.
+        En mode partagé, utilise le serveur d'embeddings local (micro-batching).
         Sinon, utilise le modèle local.
 
         Args:
@@ -162,8 +191,22 @@ class EmbeddingModelManager:
         if self._burst_mode and self._burst_endpoint:
             return self._encode_remote(sentences)
 
-        # === Mode Normal : utiliser le modèle local ===
-        model = self.get_model()
+        return self._encode_shared_or_local(sentences, **kwargs)
+
+    def _encode_shared_or_local(self, sentences: List[str], **kwargs) -> np.ndarray:
+        """Serveur partagé si configuré et joignable, sinon modèle en process."""
+        client = self._shared_client()
+        if client is not None:
+            try:
+                if isinstance(sentences, str):
+                    return client.encode([sentences], **kwargs)[0]
+                return client.encode(sentences, **kwargs)
+            except UnsupportedEncodeKwargs:
+                pass  # requête non servable à distance, le serveur reste utilisable
+            except SharedEmbeddingUnavailable as e:
+                self._mark_shared_down(e)
+
+        model = self.load_local_model()
 
         with self._model_lock:
             self._last_access_time = time.time()
@@ -493,6 +536,27 @@ class EmbeddingModelManager:
         )
         return embeddings
 
+    # =========================================================================
+    # Mode serveur partagé
+    # =========================================================================
+
+    def load_local_model(self):
+        """Charge le modèle par défaut dans ce processus, même en mode partagé (fallback)."""
+        return self._load_model(get_settings().embeddings_model)
+
+    def _shared_client(self) -> Optional[EmbeddingServerClient]:
+        """Client du serveur partagé, None si désactivé ou marqué injoignable."""
+        if time.time() < self._shared_down_until:
+            return None
+        return get_shared_embedding_client()
+
+    def _mark_shared_down(self, error: Exception) -> None:
+        self._shared_down_until = time.time() + SHARED_RETRY_AFTER_S
+        logger.warning(
+            f"[EMBEDDINGS:SHARED] Shared server unavailable ({error}) → "
+            f"in-process model for {SHARED_RETRY_AFTER_S:.0f}s"
+        )
+
     def unload_model(self):
         """
         Force le déchargement du modèle et libère la mémoire GPU.
@@ -733,8 +797,37 @@ class EmbeddingModelManager:
         # En mode burst, on ne peut pas connaître la dimension sans appeler le service
         if self._burst_mode:
             return None
-        model = self.get_model()
-        return model.get_sentence_embedding_dimension()
+        return self.get_model().get_sentence_embedding_dimension()
+
+
+class SharedEmbeddingModel:
+    """
+    Proxy retourné par get_model() en mode partagé.
+
+    Expose le sous-ensemble de SentenceTransformer utilisé par les appelants
+    (encode, get_sentence_embedding_dimension) ; retombe sur le modèle en
+    process si le serveur devient injoignable.
+    """
+
+    def __init__(self, manager: EmbeddingModelManager):
+        self._manager = manager
+        self._dimension: Optional[int] = None
+
+    def encode(self, sentences, **kwargs):
+        return self._manager._encode_shared_or_local(sentences, **kwargs)
+
+    def get_sentence_embedding_dimension(self) -> Optional[int]:
+        if self._dimension is None:
+            client = self._manager._shared_client()
+            try:
+                if client is None:
+                    raise SharedEmbeddingUnavailable("shared mode disabled")
+                self._dimension = client.info().get("dimension")
+            except SharedEmbeddingUnavailable as e:
+                self._manager._mark_shared_down(e)
+                model = self._manager.load_local_model()
+                self._dimension = model.get_sentence_embedding_dimension()
+        return self._dimension
 
 
 # Instance singleton
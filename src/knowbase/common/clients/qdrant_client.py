@@ -10,6 +10,8 @@ from qdrant_client.models import (
     PointStruct,
     Filter,
     FieldCondition,
+    KeywordIndexParams,
+    KeywordIndexType,
     MatchValue
 )
 
@@ -34,18 +36,55 @@ def get_qdrant_client() -> QdrantClient:
     return QdrantClient(url=settings.qdrant_url, timeout=300)
 
 
+# Collections déjà vérifiées/créées par ce process (évite collection_exists par appel)
+_ensured_collections: set[str] = set()
+
+
 def ensure_qdrant_collection(
     collection_name: str,
     vector_size: int,
     distance: Distance = Distance.COSINE,
 ) -> None:
-    client = get_qdrant_client()
-    if client.collection_exists(collection_name):
+    if collection_name in _ensured_collections:
         return
-    client.create_collection(
-        collection_name=collection_name,
-        vectors_config=VectorParams(size=vector_size, distance=distance),
-    )
+    from knowbase.retrieval.qdrant_layer_r import COLLECTION_NAME as LAYER_R_COLLECTION, bootstrap_layer_r
+
+    if collection_name == LAYER_R_COLLECTION:
+        # Collection Layer R : profil, sparse bm25 et payload indexes complets
+        bootstrap_layer_r()
+        _ensured_collections.add(collection_name)
+        return
+    client = get_qdrant_client()
+    if not client.collection_exists(collection_name):
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=VectorParams(size=vector_size, distance=distance),
+        )
+    ensure_tenant_index(collection_name)
+    _ensured_collections.add(collection_name)
+
+
+def ensure_tenant_index(collection_name: str) -> None:
+    """Index keyword tenant_id (partition tenant) : filtre de toutes les recherches multi-tenant."""
+    client = get_qdrant_client()
+    try:
+        schema = client.get_collection(collection_name).payload_schema or {}
+        existing = schema.get("tenant_id")
+        if existing is not None and getattr(existing.params, "is_tenant", False):
+            return
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name="tenant_id",
+            field_schema=KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True),
+        )
+        logger.info(f"[QDRANT] Created tenant_id tenant index on {collection_name}")
+    except Exception as e:
+        logger.warning(f"[QDRANT] tenant_id index on {collection_name} failed: {e}")
+
+
+def reset_ensured_collections() -> None:
+    """Oublie les collections vérifiées (tests, collection purgée)."""
+    _ensured_collections.clear()
 
 
 def ensure_qa_collection(vector_size: int) -> None:
@@ -250,10 +289,8 @@ def upsert_chunks(
     """
     client = get_qdrant_client()
 
-    # Vérifier/créer collection
-    if not client.collection_exists(collection_name):
-        logger.warning(f"[QDRANT:Chunks] Collection {collection_name} doesn't exist, creating...")
-        ensure_qdrant_collection(collection_name, vector_size=1024)
+    # Vérifier/créer collection (une fois par process)
+    ensure_qdrant_collection(collection_name, vector_size=1024)
 
     chunk_ids = []
     all_points = []
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from functools import lru_cache
-from typing import Any, Optional
-
-from sentence_transformers import CrossEncoder
+from typing import TYPE_CHECKING, Any, Optional
 
 from knowbase.config.settings import get_settings
 
+if TYPE_CHECKING:  # sentence_transformers tire torch/transformers (~10s d'import)
+    from sentence_transformers import CrossEncoder
+
 
 @lru_cache(maxsize=None)
 def get_cross_encoder(
@@ -14,6 +15,8 @@ def get_cross_encoder(
     device: Optional[str] = None,
     cache_folder: Optional[str] = None,
 ) -> CrossEncoder:
+    from sentence_transformers import CrossEncoder
+
     settings = get_settings()
     name = model_name or getattr(settings, 'reranker_model', 'cross-encoder/ms-marco-MiniLM-L-6-v2')
     kwargs: dict[str, object] = {}
@@ -5,13 +5,15 @@ from __future__ import annotations
 import os
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import httpx
 from openai import OpenAI
 from qdrant_client import QdrantClient
 from qdrant_client.models import Distance, VectorParams
-from sentence_transformers import SentenceTransformer
+
+if TYPE_CHECKING:  # sentence_transformers tire torch/transformers (~10s d'import)
+    from sentence_transformers import SentenceTransformer
 
 
 def get_project_root() -> Path:
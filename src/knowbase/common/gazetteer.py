@@ -0,0 +1,226 @@
+"""
+Gazetteer compilé — toutes les surface forms des concepts d'un document,
+cherchées en une seule passe par texte.
+
+Remplace les boucles « pour chaque forme : form in text.lower() » des
+chemins d'extraction (conversion des chunks pour l'extraction de relations,
+co-occurrences, contextes du Gatekeeper). Les formes sont normalisées et
+compilées une fois dans un AhoCorasickAutomaton ; chaque texte est ensuite
+parcouru une seule fois et tous les hits (clé, forme, span) sont rapportés.
+
+Options :
+- case_fold     : str.lower() sur formes ET texte (sémantique historique)
+- accent_fold   : suppression des diacritiques (NFKD), « Schéma » == « schema »
+- word_boundary : un hit doit être délimité par des caractères non-mot
+                  (\\w) aux bords de la forme qui sont eux-mêmes des
+                  caractères de mot (« c++ » reste trouvable dans « c++17 »
+                  côté droit, « sap » ne l'est plus dans « sapphire »)
+
+Sans word_boundary, la sémantique est celle de `form in text` (occurrences
+chevauchantes incluses). Les spans sont exprimés dans le texte d'origine,
+même quand la normalisation change la longueur du texte.
+
+Usage:
+    matcher = GazetteerMatcher(word_boundary=True)
+    matcher.add("c1", "SAP HANA")
+    matcher.add("c2", "HANA")
+    matcher.find_all("SAP HANA on-premise")
+    # [GazetteerHit(key='c1', form='sap hana', start=0, end=8),
+    #  GazetteerHit(key='c2', form='hana', start=4, end=8)]
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from knowbase.common.aho_corasick import AhoCorasickAutomaton
+
+
+@dataclass(frozen=True)
+class GazetteerHit:
+    """Occurrence d'une forme : text[start:end] dans le texte d'origine."""
+    key: Hashable
+    form: str
+    start: int
+    end: int
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class GazetteerMatcher:
+    """
+    Ensemble (clé, surface form) compilé en automate Aho-Corasick.
+
+    Une même forme peut appartenir à plusieurs clés, et une clé avoir
+    plusieurs formes. Les hits d'une même position de départ sont rendus
+    dans l'ordre d'enregistrement (add), comme un tri stable par position
+    sur des recherches faites forme par forme. Les formes vides (après
+    normalisation) sont ignorées.
+
+    L'automate est (re)compilé paresseusement au premier find après un add.
+    """
+
+    def __init__(
+        self,
+        case_fold: bool = True,
+        accent_fold: bool = False,
+        word_boundary: bool = False,
+    ):
+        self.case_fold = case_fold
+        self.accent_fold = accent_fold
+        self.word_boundary = word_boundary
+        # Formes normalisées distinctes → [(ordre d'enregistrement, clé)]
+        self._form_ids: Dict[str, int] = {}
+        self._forms: List[str] = []
+        self._entries: List[List[Tuple[int, Hashable]]] = []
+        self._registered = 0
+        self._automaton: Optional[AhoCorasickAutomaton] = None
+        self._fold_cache: Dict[str, str] = {}
+
+    @classmethod
+    def from_forms(
+        cls,
+        forms_by_key: Dict[Hashable, Iterable[str]],
+        **options,
+    ) -> "GazetteerMatcher":
+        """Matcher construit depuis {clé: [formes]} (ordre du dict conservé)."""
+        matcher = cls(**options)
+        for key, forms in forms_by_key.items():
+            matcher.add_many(key, forms)
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._forms)
+
+    @property
+    def forms(self) -> List[str]:
+        return list(self._forms)
+
+    def add(self, key: Hashable, form: Optional[str]) -> None:
+        """Enregistre une surface form pour `key`."""
+        if not form:
+            return
+        normalized = self.normalize(form)
+        if not normalized:
+            return
+        fid = self._form_ids.get(normalized)
+        if fid is None:
+            fid = len(self._forms)
+            self._form_ids[normalized] = fid
+            self._forms.append(normalized)
+            self._entries.append([])
+            self._automaton = None
+        self._entries[fid].append((self._registered, key))
+        self._registered += 1
+
+    def add_many(self, key: Hashable, forms: Iterable[Optional[str]]) -> None:
+        for form in forms:
+            self.add(key, form)
+
+    # ------------------------------------------------------------------
+    # Normalisation
+    # ------------------------------------------------------------------
+
+    def normalize(self, text: str) -> str:
+        """Normalisation appliquée aux formes (identique à celle des textes)."""
+        return self._fold(text)[0]
+
+    def _fold_char(self, ch: str) -> str:
+        folded = self._fold_cache.get(ch)
+        if folded is None:
+            folded = "".join(
+                c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c)
+            )
+            if self.case_fold:
+                folded = folded.lower()
+            self._fold_cache[ch] = folded
+        return folded
+
+    def _fold(self, text: str) -> Tuple[str, Optional[List[int]]]:
+        """
+        Texte normalisé + table index normalisé → index d'origine.
+
+        La table vaut None quand les deux textes sont alignés caractère à
+        caractère (cas ASCII, ou lower() sans changement de longueur).
+        """
+        if text.isascii():
+            return (text.lower() if self.case_fold else text), None
+        if not self.accent_fold:
+            folded = text.lower() if self.case_fold else text
+            if len(folded) == len(text):
+                return folded, None
+
+        chars: List[str] = []
+        index: List[int] = []
+        for i, ch in enumerate(text):
+            folded_ch = self._fold_char(ch) if self.accent_fold else (ch.lower() if self.case_fold else ch)
+            chars.append(folded_ch)
+            index.extend([i] * len(folded_ch))
+        return "".join(chars), index
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def _compiled(self) -> AhoCorasickAutomaton:
+        if self._automaton is None:
+            self._automaton = AhoCorasickAutomaton(self._forms)
+        return self._automaton
+
+    def iter_spans(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Occurrences brutes, dans l'ordre de fin dans le texte.
+
+        Yields:
+            (start, end, form_id) — offsets dans le texte d'origine
+        """
+        if not text or not self._forms:
+            return
+        folded, index = self._fold(text)
+        forms = self._forms
+        check_boundary = self.word_boundary
+        n = len(folded)
+
+        for last, fid in self._compiled().iter_matches(folded):
+            form = forms[fid]
+            start = last - len(form) + 1
+            end = last + 1
+            if check_boundary and (
+                (start > 0 and _is_word_char(form[0]) and _is_word_char(folded[start - 1]))
+                or (end < n and _is_word_char(form[-1]) and _is_word_char(folded[end]))
+            ):
+                continue
+            if index is not None:
+                start, end = index[start], index[last] + 1
+            yield start, end, fid
+
+    def find_all(self, text: str) -> List[GazetteerHit]:
+        """Tous les hits (clé, forme, span), triés par position puis ordre d'enregistrement."""
+        ranked = []
+        for start, end, fid in self.iter_spans(text):
+            form = self._forms[fid]
+            for order, key in self._entries[fid]:
+                ranked.append((start, order, GazetteerHit(key, form, start, end)))
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [hit for _, _, hit in ranked]
+
+    def keys_in(self, text: str) -> Dict[Hashable, str]:
+        """
+        Clés présentes dans `text` → première forme trouvée.
+
+        Ordre : formes dans l'ordre d'enregistrement, puis clés de chaque
+        forme — équivalent de « for form in forms: if form in text ».
+        """
+        found: Dict[Hashable, str] = {}
+        for fid in sorted({fid for _, _, fid in self.iter_spans(text)}):
+            for _, key in self._entries[fid]:
+                if key not in found:
+                    found[key] = self._forms[fid]
+        return found
+
+
+__all__ = ["GazetteerHit", "GazetteerMatcher"]
@@ -10,6 +10,8 @@ redirigés vers vLLM au lieu d'OpenAI, permettant des économies importantes.
 """
 from __future__ import annotations
 
+import functools
+import inspect
 import json
 import logging
 import os
@@ -22,7 +24,7 @@ import yaml
 
 from knowbase.config.settings import get_settings
 from knowbase.common.clients import get_openai_client, get_async_openai_client, get_anthropic_client, is_anthropic_available
-from knowbase.common.token_tracker import track_tokens
+from knowbase.common.token_tracker import track_llm_call, track_tokens
 
 # Import conditionnel pour SageMaker
 try:
@@ -42,6 +44,68 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+# Préfixe de modèle utilisé par track_tokens pour chaque provider
+_PROVIDER_MODEL_PREFIX = {
+    "deepinfra": "deepinfra/",
+    "novita": "novita/",
+    "vllm": "vllm/",
+    "ollama": "ollama/",
+}
+
+
+def _instrumented_call(provider: str):
+    """Mesure latence + erreurs d'un _call_<provider> (token_tracker → Prometheus).
+
+    Les tokens restent comptés par track_tokens à l'intérieur de l'appel.
+    """
+    def labels(router, args, kwargs):
+        if provider == "burst":
+            model = f"burst/{router._burst_model}"
+            task_type = args[3] if len(args) > 3 else kwargs.get("task_type")
+        else:
+            model = _PROVIDER_MODEL_PREFIX.get(provider, "") + str(args[0] if args else kwargs.get("model"))
+            task_type = args[4] if len(args) > 4 else kwargs.get("task_type")
+        return model, getattr(task_type, "value", str(task_type))
+
+    def record(router, args, kwargs, start, error):
+        try:
+            model, task_type = labels(router, args, kwargs)
+            track_llm_call(
+                model, task_type, time.perf_counter() - start, provider=provider,
+                error_type=type(error).__name__ if error else None,
+            )
+        except Exception as e:
+            logger.debug(f"[LLM_ROUTER] Call metrics skipped: {e}")
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(self, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await fn(self, *args, **kwargs)
+                except Exception as e:
+                    record(self, args, kwargs, start, e)
+                    raise
+                record(self, args, kwargs, start, None)
+                return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(self, *args, **kwargs)
+            except Exception as e:
+                record(self, args, kwargs, start, e)
+                raise
+            record(self, args, kwargs, start, None)
+            return result
+        return wrapper
+
+    return decorator
+
+
 class VLLMUnavailableError(Exception):
     """
     Exception levée quand vLLM est configuré (burst mode) mais temporairement indisponible.
@@ -1429,6 +1493,7 @@ class LLMRouter:
                     return await self._call_openai_async(default_model, messages, temperature, max_tokens, task_type, **kwargs)
             raise
 
+    @_instrumented_call("openai")
     def _call_openai(
         self,
         model: str,
@@ -1458,10 +1523,11 @@ class LLMRouter:
             logger.info(f"[TOKENS] {model} - Input: {prompt_tokens}, Output: {completion_tokens}, Total: {total_tokens}")
 
             # Tracking pour analyse des coûts
-            track_tokens(model, task_type.value, prompt_tokens, completion_tokens)
+            track_tokens(model, task_type.value, prompt_tokens, completion_tokens, provider="openai")
 
         return response.choices[0].message.content or ""
 
+    @_instrumented_call("openai")
     async def _call_openai_async(
         self,
         model: str,
@@ -1491,7 +1557,7 @@ class LLMRouter:
             logger.info(f"[TOKENS:ASYNC] {model} - Input: {prompt_tokens}, Output: {completion_tokens}, Total: {total_tokens}")
 
             # Tracking pour analyse des coûts
-            track_tokens(model, task_type.value, prompt_tokens, completion_tokens)
+            track_tokens(model, task_type.value, prompt_tokens, completion_tokens, provider="openai")
 
         return response.choices[0].message.content or ""
 
@@ -1541,6 +1607,7 @@ class LLMRouter:
                 api_kwargs['extra_body']['chat_template_kwargs'] = {"enable_thinking": False}
                 api_kwargs['extra_body']['reasoning_effort'] = "none"
 
+    @_instrumented_call("deepinfra")
     def _call_deepinfra(self, model, messages, temperature, max_tokens, task_type, **kwargs):
         """Appel vers DeepInfra (API OpenAI-compatible)."""
         enable_thinking = kwargs.pop('enable_thinking', False)
@@ -1554,10 +1621,11 @@ class LLMRouter:
         )
         if response.usage:
             track_tokens(f"deepinfra/{model}", task_type.value,
-                         response.usage.prompt_tokens, response.usage.completion_tokens)
+                         response.usage.prompt_tokens, response.usage.completion_tokens, provider="deepinfra")
             logger.info(f"[TOKENS:DEEPINFRA] {model} - In: {response.usage.prompt_tokens}, Out: {response.usage.completion_tokens}")
         return response.choices[0].message.content or ""
 
+    @_instrumented_call("deepinfra")
     async def _call_deepinfra_async(self, model, messages, temperature, max_tokens, task_type, **kwargs):
         """Appel async vers DeepInfra."""
         enable_thinking = kwargs.pop('enable_thinking', False)
@@ -1571,7 +1639,7 @@ class LLMRouter:
         )
         if response.usage:
             track_tokens(f"deepinfra/{model}", task_type.value,
-                         response.usage.prompt_tokens, response.usage.completion_tokens)
+                         response.usage.prompt_tokens, response.usage.completion_tokens, provider="deepinfra")
             logger.info(f"[TOKENS:DEEPINFRA:ASYNC] {model} - In: {response.usage.prompt_tokens}, Out: {response.usage.completion_tokens}")
         return response.choices[0].message.content or ""
 
@@ -1618,6 +1686,7 @@ class LLMRouter:
             )
         return self._novita_async_client
 
+    @_instrumented_call("novita")
     def _call_novita(self, model, messages, temperature, max_tokens, task_type, **kwargs):
         """Appel vers Novita (API OpenAI-compatible)."""
         enable_thinking = kwargs.pop('enable_thinking', False)
@@ -1633,10 +1702,11 @@ class LLMRouter:
         )
         if response.usage:
             track_tokens(f"novita/{model}", task_type.value,
-                         response.usage.prompt_tokens, response.usage.completion_tokens)
+                         response.usage.prompt_tokens, response.usage.completion_tokens, provider="novita")
             logger.info(f"[TOKENS:NOVITA] {model} - In: {response.usage.prompt_tokens}, Out: {response.usage.completion_tokens}")
         return response.choices[0].message.content or ""
 
+    @_instrumented_call("novita")
     async def _call_novita_async(self, model, messages, temperature, max_tokens, task_type, **kwargs):
         """Appel async vers Novita."""
         enable_thinking = kwargs.pop('enable_thinking', False)
@@ -1652,10 +1722,11 @@ class LLMRouter:
         )
         if response.usage:
             track_tokens(f"novita/{model}", task_type.value,
-                         response.usage.prompt_tokens, response.usage.completion_tokens)
+                         response.usage.prompt_tokens, response.usage.completion_tokens, provider="novita")
             logger.info(f"[TOKENS:NOVITA:ASYNC] {model} - In: {response.usage.prompt_tokens}, Out: {response.usage.completion_tokens}")
         return response.choices[0].message.content or ""
 
+    @_instrumented_call("anthropic")
     def _call_anthropic(
         self,
         model: str,
@@ -1697,10 +1768,11 @@ class LLMRouter:
             logger.info(f"[TOKENS] {model} - Input: {input_tokens}, Output: {output_tokens}, Total: {total_tokens}")
 
             # Tracking pour analyse des coûts
-            track_tokens(model, task_type.value, input_tokens, output_tokens)
+            track_tokens(model, task_type.value, input_tokens, output_tokens, provider="anthropic")
 
         return response.content[0].text if response.content else ""
 
+    @_instrumented_call("sagemaker")
     def _call_sagemaker(
         self,
         model: str,
@@ -1766,7 +1838,7 @@ class LLMRouter:
             logger.info(f"[TOKENS] {model} - Input: {input_tokens}, Output: {output_tokens}, Total: {input_tokens + output_tokens}")
 
             # Tracking pour analyse des coûts
-            track_tokens(model, task_type.value, input_tokens, output_tokens)
+            track_tokens(model, task_type.value, input_tokens, output_tokens, provider="sagemaker")
 
             return generated_text
 
@@ -1845,6 +1917,7 @@ class LLMRouter:
             logger.warning(f"Format de réponse SageMaker inattendu pour {model}: {result}")
             return str(result)
 
+    @_instrumented_call("vllm")
     def _call_vllm(
         self,
         model: str,
@@ -1891,7 +1964,7 @@ class LLMRouter:
                 logger.info(f"[TOKENS:vLLM] {actual_model} - Input: {prompt_tokens}, Output: {completion_tokens}, Total: {total_tokens}")
 
                 # Tracking pour analyse des coûts (vLLM = coût compute, pas API)
-                track_tokens(f"vllm/{actual_model}", task_type.value, prompt_tokens, completion_tokens)
+                track_tokens(f"vllm/{actual_model}", task_type.value, prompt_tokens, completion_tokens, provider="vllm")
 
             return response.choices[0].message.content or ""
 
@@ -1899,6 +1972,7 @@ class LLMRouter:
             logger.error(f"[vLLM] Error calling {actual_model}: {e}")
             raise
 
+    @_instrumented_call("vllm")
     async def _call_vllm_async(
         self,
         model: str,
@@ -1938,7 +2012,7 @@ class LLMRouter:
                 total_tokens = response.usage.total_tokens
                 logger.info(f"[TOKENS:vLLM:ASYNC] {actual_model} - Input: {prompt_tokens}, Output: {completion_tokens}, Total: {total_tokens}")
 
-                track_tokens(f"vllm/{actual_model}", task_type.value, prompt_tokens, completion_tokens)
+                track_tokens(f"vllm/{actual_model}", task_type.value, prompt_tokens, completion_tokens, provider="vllm")
 
             return response.choices[0].message.content or ""
 
@@ -1956,6 +2030,7 @@ class LLMRouter:
     # champ "reasoning", laissant "content" vide. Seule l'API native permet
     # de désactiver le thinking proprement.
 
+    @_instrumented_call("ollama")
     def _call_ollama(
         self,
         model: str,
@@ -2000,10 +2075,11 @@ class LLMRouter:
             f"Total: {total_tokens}, Time: {elapsed:.1f}s"
         )
 
-        track_tokens(f"ollama/{model}", task_type.value, prompt_tokens, completion_tokens)
+        track_tokens(f"ollama/{model}", task_type.value, prompt_tokens, completion_tokens, provider="ollama")
 
         return content
 
+    @_instrumented_call("ollama")
     async def _call_ollama_async(
         self,
         model: str,
@@ -2048,7 +2124,7 @@ class LLMRouter:
             f"Total: {total_tokens}, Time: {elapsed:.1f}s"
         )
 
-        track_tokens(f"ollama/{model}", task_type.value, prompt_tokens, completion_tokens)
+        track_tokens(f"ollama/{model}", task_type.value, prompt_tokens, completion_tokens, provider="ollama")
 
         return content
 
@@ -2056,6 +2132,7 @@ class LLMRouter:
     # Méthodes Burst Mode - Appels vers EC2 Spot vLLM
     # =========================================================================
 
+    @_instrumented_call("burst")
     def _call_burst_vllm(
         self,
         messages: List[Dict[str, Any]],
@@ -2151,7 +2228,7 @@ class LLMRouter:
             logger.info(f"[TOKENS:BURST:vLLM] {self._burst_model} - Input: {prompt_tokens}, Output: {completion_tokens}, Total: {total_tokens}")
 
             # Tracking pour analyse des coûts (burst = coût EC2 Spot, pas API)
-            track_tokens(f"burst/{self._burst_model}", task_type.value, prompt_tokens, completion_tokens)
+            track_tokens(f"burst/{self._burst_model}", task_type.value, prompt_tokens, completion_tokens, provider="burst")
 
         content = response.choices[0].message.content or ""
 
@@ -2174,6 +2251,7 @@ class LLMRouter:
 
         return content
 
+    @_instrumented_call("burst")
     async def _call_burst_vllm_async(
         self,
         messages: List[Dict[str, Any]],
@@ -2279,7 +2357,7 @@ class LLMRouter:
             total_tokens = response.usage.total_tokens
             logger.info(f"[TOKENS:BURST:vLLM:ASYNC] {self._burst_model} - Input: {prompt_tokens}, Output: {completion_tokens}, Total: {total_tokens}")
 
-            track_tokens(f"burst/{self._burst_model}", task_type.value, prompt_tokens, completion_tokens)
+            track_tokens(f"burst/{self._burst_model}", task_type.value, prompt_tokens, completion_tokens, provider="burst")
 
         content = response.choices[0].message.content or ""
 
@@ -5,6 +5,9 @@ Métriques business pour monitoring:
 - Compteurs: merge_total, undo_total, bootstrap_total
 - Histogrammes: merge_duration, backfill_duration
 - Gauges: quarantine_queue_size, circuit_breaker_state
+- LLM: llm_requests_total, llm_errors_total, llm_tokens_total, llm_cost_usd_total,
+  llm_request_duration_seconds, llm_tokens_per_call (alimentés par LLMRouter
+  via token_tracker)
 
 Usage:
     from knowbase.common.metrics import (
@@ -86,6 +89,54 @@ circuit_breaker_state = Gauge(
 )
 
 
+# LLM (labels : provider, model, task_type ; direction = input|output)
+LLM_LABELS = ['provider', 'model', 'task_type']
+
+llm_requests_counter = Counter(
+    'llm_requests_total',
+    'Total LLM calls',
+    LLM_LABELS + ['status'],  # success, error
+    registry=registry
+)
+
+llm_errors_counter = Counter(
+    'llm_errors_total',
+    'Total failed LLM calls',
+    LLM_LABELS + ['error_type'],
+    registry=registry
+)
+
+llm_tokens_counter = Counter(
+    'llm_tokens_total',
+    'Total LLM tokens',
+    LLM_LABELS + ['direction'],
+    registry=registry
+)
+
+llm_cost_counter = Counter(
+    'llm_cost_usd_total',
+    'Estimated LLM cost (USD)',
+    LLM_LABELS,
+    registry=registry
+)
+
+llm_duration = Histogram(
+    'llm_request_duration_seconds',
+    'LLM call latency',
+    LLM_LABELS,
+    buckets=[0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 40.0, 80.0, 160.0],
+    registry=registry
+)
+
+llm_tokens_per_call = Histogram(
+    'llm_tokens_per_call',
+    'Tokens per LLM call',
+    ['provider', 'task_type', 'direction'],
+    buckets=[64, 256, 1024, 2048, 4096, 8192, 16384, 32768],
+    registry=registry
+)
+
+
 def record_merge(status: str = "success"):
     """Helper pour enregistrer merge avec métrique"""
     merge_counter.labels(status=status).inc()
@@ -101,6 +152,38 @@ def record_bootstrap(status: str = "success"):
     bootstrap_counter.labels(status=status).inc()
 
 
+def record_llm_usage(
+    provider: str,
+    model: str,
+    task_type: str,
+    input_tokens: int,
+    output_tokens: int,
+    cost: float,
+):
+    """Helper pour enregistrer tokens + coût d'un appel LLM"""
+    labels = dict(provider=provider, model=model, task_type=task_type)
+    llm_tokens_counter.labels(direction="input", **labels).inc(input_tokens)
+    llm_tokens_counter.labels(direction="output", **labels).inc(output_tokens)
+    llm_cost_counter.labels(**labels).inc(cost)
+    llm_tokens_per_call.labels(provider=provider, task_type=task_type, direction="input").observe(input_tokens)
+    llm_tokens_per_call.labels(provider=provider, task_type=task_type, direction="output").observe(output_tokens)
+
+
+def record_llm_call(
+    provider: str,
+    model: str,
+    task_type: str,
+    duration_s: float,
+    error_type: str = None,
+):
+    """Helper pour enregistrer latence + statut d'un appel LLM"""
+    labels = dict(provider=provider, model=model, task_type=task_type)
+    llm_duration.labels(**labels).observe(duration_s)
+    llm_requests_counter.labels(status="error" if error_type else "success", **labels).inc()
+    if error_type:
+        llm_errors_counter.labels(error_type=error_type, **labels).inc()
+
+
 def timed_operation(histogram: Histogram):
     """Décorateur pour mesurer durée opération"""
     def decorator(func: Callable) -> Callable:
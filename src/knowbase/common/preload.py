@@ -0,0 +1,140 @@
+"""
+Préchargement des clients / modèles par rôle de processus.
+
+Chaque processus (API, worker d'ingestion, worker Pass 2) ne précharge que
+ce qu'il utilise vraiment : le worker Pass 2 n'a pas besoin de
+l'encodeur d'embeddings au démarrage, l'API n'a pas besoin de spaCy.
+
+Le rôle vient de OSMOSE_PROCESS_ROLE (défaut fourni par le point d'entrée).
+La liste de préchargement d'un rôle se surcharge par variable d'env :
+
+    OSMOSE_PRELOAD_API="openai,qdrant"           # pas d'encodeur au boot
+    OSMOSE_PRELOAD_INGESTION_WORKER="openai,qdrant,embeddings,reranker"
+    OSMOSE_PRELOAD_PASS2_WORKER="none"            # tout en lazy
+
+Les préchargeurs eux-mêmes (nom → callable) sont fournis par le point
+d'entrée : run_preloads() ne fait que sélectionner, ordonner, chronométrer.
+Un élément non préchargé reste chargé à la première utilisation (singletons
+get_x existants).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PROCESS_ROLE_ENV = "OSMOSE_PROCESS_ROLE"
+
+ROLE_API = "api"
+ROLE_INGESTION_WORKER = "ingestion_worker"
+ROLE_PASS2_WORKER = "pass2_worker"
+
+# Ordre = ordre d'exécution
+ROLE_PRELOADS: Dict[str, tuple] = {
+    # qdrant_collection charge l'encodeur (dimension de la collection)
+    ROLE_API: ("qdrant_collection", "openai", "qdrant"),
+    ROLE_INGESTION_WORKER: ("openai", "qdrant", "embeddings", "layer_r"),
+    # Pass 2 : LLM + Neo4j + extraction de prédicats (spaCy), pas d'encodage
+    ROLE_PASS2_WORKER: ("openai", "spacy"),
+}
+
+_DISABLED_VALUES = {"", "none", "off", "false", "0"}
+
+
+@dataclass
+class PreloadReport:
+    """Résultat du préchargement d'un processus."""
+
+    role: str
+    timings: Dict[str, float] = field(default_factory=dict)
+    unknown: List[str] = field(default_factory=list)
+    total_s: float = 0.0
+    rss_mb: float = 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "role": self.role,
+            "timings": {k: round(v, 3) for k, v in self.timings.items()},
+            "unknown": self.unknown,
+            "total_s": round(self.total_s, 3),
+            "rss_mb": round(self.rss_mb, 1),
+        }
+
+
+def get_process_role(default: str) -> str:
+    """Rôle du processus courant (OSMOSE_PROCESS_ROLE, sinon `default`)."""
+    return os.getenv(PROCESS_ROLE_ENV, "").strip().lower() or default
+
+
+def preload_env_var(role: str) -> str:
+    return f"OSMOSE_PRELOAD_{role.upper()}"
+
+
+def get_preload_list(role: str) -> List[str]:
+    """Éléments à précharger pour `role` (surcharge env, sinon défaut du rôle)."""
+    raw = os.getenv(preload_env_var(role))
+    if raw is None:
+        return list(ROLE_PRELOADS.get(role, ()))
+    if raw.strip().lower() in _DISABLED_VALUES:
+        return []
+    return [item.strip().lower() for item in raw.split(",") if item.strip()]
+
+
+def run_preloads(
+    role: str,
+    preloaders: Mapping[str, Callable[[], object]],
+    items: Optional[Sequence[str]] = None,
+) -> PreloadReport:
+    """
+    Exécute les préchargeurs sélectionnés pour `role`, dans l'ordre de la liste.
+
+    Les exceptions remontent (comportement historique : l'API ne démarre pas
+    sans Qdrant) ; les préchargeurs best-effort gèrent leurs erreurs eux-mêmes.
+    Un nom sans préchargeur pour ce point d'entrée est ignoré avec un warning.
+    """
+    from knowbase.common.startup_profile import current_rss_mb
+
+    selected = list(items) if items is not None else get_preload_list(role)
+    report = PreloadReport(role=role)
+    start = time.perf_counter()
+
+    for name in selected:
+        fn = preloaders.get(name)
+        if fn is None:
+            report.unknown.append(name)
+            logger.warning(
+                f"[OSMOSE:Preload] Unknown preload '{name}' for role {role} "
+                f"(available: {', '.join(sorted(preloaders))})"
+            )
+            continue
+        t0 = time.perf_counter()
+        fn()
+        report.timings[name] = time.perf_counter() - t0
+
+    report.total_s = time.perf_counter() - start
+    report.rss_mb = current_rss_mb()
+    logger.info(
+        f"[OSMOSE:Preload] role={role} {len(report.timings)} preload(s) in "
+        f"{report.total_s:.1f}s, rss={report.rss_mb:.0f}MB"
+        + (" — " + ", ".join(f"{k}={v:.1f}s" for k, v in report.timings.items()) if report.timings else "")
+    )
+    return report
+
+
+__all__ = [
+    "PROCESS_ROLE_ENV",
+    "ROLE_API",
+    "ROLE_INGESTION_WORKER",
+    "ROLE_PASS2_WORKER",
+    "ROLE_PRELOADS",
+    "PreloadReport",
+    "get_process_role",
+    "get_preload_list",
+    "preload_env_var",
+    "run_preloads",
+]
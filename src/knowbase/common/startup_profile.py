@@ -0,0 +1,216 @@
+"""
+Profil de démarrage : coût d'import de chaque router / module de service.
+
+Lance un interpréteur neuf (`python -X importtime`) qui importe les modules
+d'un rôle dans l'ordre et mesure, pour chacun :
+- le temps d'import marginal (ce que ce module ajoute après les précédents)
+- le delta de RSS
+- les dépendances les plus coûteuses tirées par cet import (temps propre
+  d'après -X importtime)
+
+En mode --isolated, un interpréteur par module : coût à froid de chaque
+module seul (dépendances partagées comprises).
+
+Usage:
+    python -m knowbase.common.startup_profile --role api
+    python -m knowbase.common.startup_profile --role ingestion_worker --isolated --json profile.json
+    python -m knowbase.common.startup_profile --modules knowbase.api.routers.runtime_v4 --top 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+_MARKER = "#startup_profile "
+
+# Répertoire contenant le package knowbase (PYTHONPATH de l'interpréteur profilé)
+_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_WORKER_MODULES = (
+    "knowbase.ingestion.queue.worker",
+    "knowbase.ingestion.queue.jobs_v2",
+    "knowbase.claimfirst.worker_job",
+    "knowbase.ingestion.queue.reprocess_job",
+)
+_PASS2_MODULES = (
+    "knowbase.ingestion.queue.worker",
+    "knowbase.ingestion.queue.pass2_jobs",
+    "knowbase.ingestion.pass2_orchestrator",
+    "knowbase.relations.predicate_extractor",
+)
+
+# Script exécuté dans l'interpréteur profilé (stderr : lignes -X importtime
+# entrecoupées de marqueurs JSON, un par module). Ce module n'importe que la
+# stdlib : il ne fausse pas la mesure.
+_DRIVER = r"""
+import json, sys, time
+from knowbase.common.startup_profile import current_rss_mb as rss
+for name in sys.argv[1:]:
+    sys.stderr.write("MARKER" + json.dumps({"begin": name}) + "\n"); sys.stderr.flush()
+    rss0, t0, error = rss(), time.perf_counter(), None
+    try:
+        __import__(name)  # importlib.import_module() échappe à -X importtime
+    except BaseException as exc:
+        error = f"{type(exc).__name__}: {exc}"[:300]
+    sys.stderr.flush()
+    sys.stderr.write("MARKER" + json.dumps({
+        "end": name, "seconds": time.perf_counter() - t0,
+        "rss_delta_mb": rss() - rss0, "rss_mb": rss(), "error": error,
+    }) + "\n"); sys.stderr.flush()
+""".replace("MARKER", _MARKER)
+
+
+@dataclass
+class ModuleImportCost:
+    """Coût d'import d'un module."""
+
+    module: str
+    seconds: float = 0.0
+    rss_delta_mb: float = 0.0
+    rss_mb: float = 0.0
+    error: Optional[str] = None
+    # (module importé, temps propre en s), les plus coûteux d'abord
+    top_dependencies: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def current_rss_mb() -> float:
+    """RSS courante du processus en Mo (VmRSS Linux, sinon pic getrusage)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def parse_importtime(lines: Sequence[str]) -> List[Tuple[str, float, float]]:
+    """Lignes `-X importtime` → [(module, self_s, cumulative_s)]."""
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # ligne d'en-tête
+        entries.append((parts[2].strip(), self_us / 1e6, cumulative_us / 1e6))
+    return entries
+
+
+def role_modules(role: str) -> List[str]:
+    """Modules profilés pour un rôle (api : dépendances puis chaque router)."""
+    if role == "api":
+        from knowbase.api.router_registry import ROUTER_SPECS
+
+        return ["knowbase.api.dependencies"] + [spec.import_path for spec in ROUTER_SPECS]
+    if role == "ingestion_worker":
+        return list(_WORKER_MODULES)
+    if role == "pass2_worker":
+        return list(_PASS2_MODULES)
+    raise ValueError(f"Unknown role: {role}")
+
+
+def _run_driver(modules: Sequence[str], top: int, python: str) -> List[ModuleImportCost]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (_SRC_ROOT, env.get("PYTHONPATH")) if p)
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", _DRIVER, *modules],
+        capture_output=True, text=True, env=env,
+    )
+    results: List[ModuleImportCost] = []
+    segment: List[str] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith(_MARKER):
+            segment.append(line)
+            continue
+        payload = json.loads(line[len(_MARKER):])
+        if "begin" in payload:
+            segment = []
+            continue
+        deps = sorted(
+            ((name, self_s) for name, self_s, _ in parse_importtime(segment)),
+            key=lambda d: d[1], reverse=True,
+        )
+        results.append(ModuleImportCost(
+            module=payload["end"],
+            seconds=payload["seconds"],
+            rss_delta_mb=payload["rss_delta_mb"],
+            rss_mb=payload["rss_mb"],
+            error=payload["error"],
+            top_dependencies=[(name, round(s, 4)) for name, s in deps[:top]],
+        ))
+    if not results and proc.returncode != 0:
+        raise RuntimeError(f"Profiling interpreter failed: {proc.stderr[-500:]}")
+    return results
+
+
+def profile_imports(
+    modules: Sequence[str],
+    top: int = 5,
+    isolated: bool = False,
+    python: Optional[str] = None,
+) -> List[ModuleImportCost]:
+    """Mesure le coût d'import de `modules` dans des interpréteurs neufs."""
+    python = python or sys.executable
+    if not isolated:
+        return _run_driver(modules, top, python)
+    results: List[ModuleImportCost] = []
+    for module in modules:
+        results.extend(_run_driver([module], top, python))
+    return results
+
+
+def format_report(costs: Sequence[ModuleImportCost], sort: bool = True) -> str:
+    rows = sorted(costs, key=lambda c: c.seconds, reverse=True) if sort else list(costs)
+    width = max([len(c.module) for c in rows] + [6])
+    lines = [f"{'module':<{width}}  {'import_s':>8}  {'rss_mb':>7}  top dependencies (self s)"]
+    for c in rows:
+        deps = c.error or ", ".join(f"{name}={s:.2f}" for name, s in c.top_dependencies[:3])
+        lines.append(f"{c.module:<{width}}  {c.seconds:8.2f}  {c.rss_delta_mb:+7.0f}  {deps}")
+    lines.append(f"{'TOTAL':<{width}}  {sum(c.seconds for c in rows):8.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time profile of routers / service modules")
+    parser.add_argument("--role", default="api", choices=["api", "ingestion_worker", "pass2_worker"])
+    parser.add_argument("--modules", nargs="+", help="Modules à profiler (remplace ceux du rôle)")
+    parser.add_argument("--isolated", action="store_true", help="Un interpréteur par module (coût à froid)")
+    parser.add_argument("--top", type=int, default=5, help="Dépendances les plus lourdes par module")
+    parser.add_argument("--json", dest="json_path", help="Écrit le profil en JSON")
+    args = parser.parse_args(argv)
+
+    modules = args.modules or role_modules(args.role)
+    costs = profile_imports(modules, top=args.top, isolated=args.isolated)
+    print(format_report(costs))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "role": None if args.modules else args.role,
+                "isolated": args.isolated,
+                "modules": [asdict(c) for c in costs],
+            }, f, indent=2)
+    return 0
+
+
+__all__ = [
+    "ModuleImportCost",
+    "current_rss_mb",
+    "format_report",
+    "parse_importtime",
+    "profile_imports",
+    "role_modules",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,38 @@
 """
 Module de tracking des tokens et calculs de coûts LLM
 Permet de calculer les coûts selon les modèles utilisés et comparer avec Bedrock
+
+Mémoire bornée pour les ingestions longues (10k+ appels) :
+- agrégats glissants par (model, task_type, provider) : compteurs exacts
+  + ring buffer des dernières latences (p50/p95)
+- usage_history = fenêtre des TOKEN_TRACKER_HISTORY_MAX derniers appels
+- fichier jsonl écrit par un thread d'écriture en batch (un open par batch)
+- export Prometheus (common/metrics.py) : tokens, coût, latence, erreurs
 """
 from __future__ import annotations
 
+import atexit
 import json
 import logging
-from dataclasses import dataclass
+import os
+import queue
+import threading
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+HISTORY_MAX = int(os.getenv("TOKEN_TRACKER_HISTORY_MAX", "5000"))
+LATENCY_WINDOW = int(os.getenv("TOKEN_TRACKER_LATENCY_WINDOW", "512"))
+FLUSH_INTERVAL_S = float(os.getenv("TOKEN_TRACKER_FLUSH_INTERVAL_S", "2.0"))
+FLUSH_BATCH_SIZE = 256
+
+# Préfixes de modèle posés par LLMRouter (deepinfra/Qwen/..., burst/..., ...)
+_PREFIX_PROVIDERS = ("deepinfra", "novita", "vllm", "ollama", "burst")
+
 
 @dataclass
 class TokenUsage:
@@ -29,6 +49,70 @@ class TokenUsage:
         return self.input_tokens + self.output_tokens
 
 
+@dataclass
+class UsageAggregate:
+    """Agrégat glissant d'une clé (model, task_type, provider)."""
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    errors: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        values = sorted(self.latencies)
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class _BoundedHistory(list):
+    """Liste des derniers appels, tronquée par blocs (append amorti O(1))."""
+
+    def __init__(self, maxlen: int):
+        super().__init__()
+        self.maxlen = maxlen
+
+    def append(self, item) -> None:
+        super().append(item)
+        if len(self) > self.maxlen + max(1, self.maxlen // 4):
+            del self[: len(self) - self.maxlen]
+
+
+class _UsageFileWriter:
+    """Thread d'écriture jsonl : les appels s'empilent, écriture par batch."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._queue: "queue.Queue[dict]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="token-tracker-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: dict) -> None:
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        """Bloque jusqu'à écriture de tous les records soumis."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < FLUSH_BATCH_SIZE:
+                    batch.append(self._queue.get(timeout=FLUSH_INTERVAL_S))
+            except queue.Empty:
+                pass
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(r) + "\n" for r in batch))
+            except Exception as e:
+                logger.error(f"Erreur sauvegarde token tracking: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
 @dataclass
 class ModelPricing:
     """Tarification d'un modèle LLM."""
@@ -87,36 +171,25 @@ class TokenTracker:
         "claude-opus-4-7": ModelPricing("claude-opus-4-7", 0.015, 0.075, "anthropic"),
     }
 
-    def __init__(self, log_file: Optional[Path] = None):
-        self.usage_history: List[TokenUsage] = []
+    def __init__(self, log_file: Optional[Path] = None, history_max: int = HISTORY_MAX):
+        self.usage_history: List[TokenUsage] = _BoundedHistory(history_max)
         self.log_file = log_file
-        self._session_start_index = 0  # Pour tracking par document
+        self._lock = threading.Lock()
+        self._aggregates: Dict[Tuple[str, str, str], UsageAggregate] = {}
+        self._session_stats: Dict[str, Dict[str, float]] = {}  # Pour tracking par document
         self._warned_models: set = set()  # Éviter warnings répétitifs
+        self._writer: Optional[_UsageFileWriter] = None
+        self._writer_path: Optional[Path] = None
 
     def start_session(self) -> None:
         """Marque le début d'une session de tracking (nouveau document)."""
-        self._session_start_index = len(self.usage_history)
+        with self._lock:
+            self._session_stats = {}
 
     def get_session_stats(self) -> Dict[str, Dict[str, float]]:
         """Statistiques de la session courante uniquement."""
-        session_usage = self.usage_history[self._session_start_index:]
-        stats = {}
-
-        for usage in session_usage:
-            if usage.model not in stats:
-                stats[usage.model] = {
-                    "total_calls": 0,
-                    "total_input_tokens": 0,
-                    "total_output_tokens": 0,
-                    "total_cost": 0.0
-                }
-
-            stats[usage.model]["total_calls"] += 1
-            stats[usage.model]["total_input_tokens"] += usage.input_tokens
-            stats[usage.model]["total_output_tokens"] += usage.output_tokens
-            stats[usage.model]["total_cost"] += self.calculate_cost(usage)
-
-        return stats
+        with self._lock:
+            return {model: dict(data) for model, data in self._session_stats.items()}
 
     def get_session_summary(self) -> str:
         """Génère un résumé formaté de la session courante."""
@@ -164,9 +237,10 @@ class TokenTracker:
         task_type: str,
         input_tokens: int,
         output_tokens: int,
-        context: str = ""
+        context: str = "",
+        provider: Optional[str] = None,
     ) -> None:
-        """Ajoute une utilisation de tokens."""
+        """Ajoute une utilisation de tokens (provider : même clé que record_call)."""
         usage = TokenUsage(
             model=model,
             task_type=task_type,
@@ -175,20 +249,107 @@ class TokenTracker:
             timestamp=datetime.now(),
             context=context
         )
-
-        self.usage_history.append(usage)
-
-        # Log pour debug
         cost = self.calculate_cost(usage)
-        logger.info(
+        provider = provider or self.provider_for_model(model)
+
+        with self._lock:
+            self.usage_history.append(usage)
+            agg = self._aggregate(model, task_type, provider)
+            agg.calls += 1
+            agg.input_tokens += input_tokens
+            agg.output_tokens += output_tokens
+            agg.cost += cost
+            session = self._session_stats.setdefault(model, {
+                "total_calls": 0,
+                "total_input_tokens": 0,
+                "total_output_tokens": 0,
+                "total_cost": 0.0
+            })
+            session["total_calls"] += 1
+            session["total_input_tokens"] += input_tokens
+            session["total_output_tokens"] += output_tokens
+            session["total_cost"] += cost
+
+        logger.debug(
             f"[TOKEN_TRACKER] {model} ({task_type}) - "
             f"In: {input_tokens}, Out: {output_tokens}, "
             f"Cost: ${cost:.4f} - {context}"
         )
+        _export(lambda m: m.record_llm_usage(provider, model, task_type, input_tokens, output_tokens, cost))
 
         # Sauvegarde optionnelle
         if self.log_file:
-            self._save_to_file(usage)
+            self._save_to_file(usage, cost)
+
+    def record_call(
+        self,
+        model: str,
+        task_type: str,
+        duration_s: float,
+        provider: Optional[str] = None,
+        error_type: Optional[str] = None,
+    ) -> None:
+        """Enregistre la latence (et l'erreur éventuelle) d'un appel LLM."""
+        provider = provider or self.provider_for_model(model)
+        with self._lock:
+            agg = self._aggregate(model, task_type, provider)
+            agg.latencies.append(duration_s)
+            if error_type:
+                agg.errors += 1
+        _export(lambda m: m.record_llm_call(provider, model, task_type, duration_s, error_type))
+
+    def _aggregate(self, model: str, task_type: str, provider: str) -> UsageAggregate:
+        key = (model, task_type, provider)
+        agg = self._aggregates.get(key)
+        if agg is None:
+            agg = self._aggregates[key] = UsageAggregate()
+        return agg
+
+    def provider_for_model(self, model: str) -> str:
+        """Provider d'un modèle (préfixe LLMRouter, sinon table de prix)."""
+        prefix = model.split("/", 1)[0]
+        if prefix in _PREFIX_PROVIDERS:
+            return prefix
+        pricing = self.MODEL_PRICING.get(model)
+        if pricing:
+            return pricing.provider
+        if model.startswith("claude"):
+            return "anthropic"
+        if model.startswith(("gpt", "o1", "o3", "o4")):
+            return "openai"
+        return "unknown"
+
+    def get_aggregates(self) -> List[Dict[str, object]]:
+        """Agrégats par (model, task_type, provider), latences p50/p95 glissantes."""
+        with self._lock:
+            items = list(self._aggregates.items())
+            return [
+                {
+                    "model": model,
+                    "task_type": task_type,
+                    "provider": provider,
+                    "calls": agg.calls,
+                    "input_tokens": agg.input_tokens,
+                    "output_tokens": agg.output_tokens,
+                    "cost": agg.cost,
+                    "errors": agg.errors,
+                    "latency_p50_s": agg.latency_percentile(0.5),
+                    "latency_p95_s": agg.latency_percentile(0.95),
+                }
+                for (model, task_type, provider), agg in items
+            ]
+
+    def reset(self) -> None:
+        """Vide historique, agrégats et session (les compteurs Prometheus restent monotones)."""
+        with self._lock:
+            self.usage_history.clear()
+            self._aggregates.clear()
+            self._session_stats = {}
+
+    def flush(self) -> None:
+        """Attend l'écriture sur disque des usages en attente."""
+        if self._writer is not None:
+            self._writer.flush()
 
     def calculate_cost(self, usage: TokenUsage) -> float:
         """Calcule le coût d'une utilisation."""
@@ -213,35 +374,47 @@ class TokenTracker:
         task_type: Optional[str] = None,
         context_filter: Optional[str] = None
     ) -> float:
-        """Calcule le coût total selon des filtres."""
-        filtered_usage = self.usage_history
-
-        if task_type:
-            filtered_usage = [u for u in filtered_usage if u.task_type == task_type]
+        """Calcule le coût total selon des filtres.
 
+        Sans context_filter : agrégats (exacts sur toute la vie du process).
+        Avec context_filter : fenêtre usage_history (HISTORY_MAX derniers appels).
+        """
         if context_filter:
-            filtered_usage = [u for u in filtered_usage if context_filter in u.context]
+            filtered_usage = [u for u in list(self.usage_history) if context_filter in u.context]
+            if task_type:
+                filtered_usage = [u for u in filtered_usage if u.task_type == task_type]
+            return sum(self.calculate_cost(usage) for usage in filtered_usage)
 
-        return sum(self.calculate_cost(usage) for usage in filtered_usage)
+        with self._lock:
+            return sum(
+                agg.cost for (_, agg_task, _), agg in self._aggregates.items()
+                if task_type is None or agg_task == task_type
+            )
 
     def get_stats_by_model(self) -> Dict[str, Dict[str, float]]:
         """Statistiques par modèle."""
-        stats = {}
-
-        for usage in self.usage_history:
-            if usage.model not in stats:
-                stats[usage.model] = {
+        return self._stats_by(0)
+
+    def get_stats_by_task_type(self) -> Dict[str, Dict[str, float]]:
+        """Statistiques par type de tâche."""
+        return self._stats_by(1)
+
+    def _stats_by(self, key_index: int) -> Dict[str, Dict[str, float]]:
+        stats: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for key, agg in self._aggregates.items():
+                if agg.calls == 0:
+                    continue
+                entry = stats.setdefault(key[key_index], {
                     "total_calls": 0,
                     "total_input_tokens": 0,
                     "total_output_tokens": 0,
                     "total_cost": 0.0
-                }
-
-            stats[usage.model]["total_calls"] += 1
-            stats[usage.model]["total_input_tokens"] += usage.input_tokens
-            stats[usage.model]["total_output_tokens"] += usage.output_tokens
-            stats[usage.model]["total_cost"] += self.calculate_cost(usage)
-
+                })
+                entry["total_calls"] += agg.calls
+                entry["total_input_tokens"] += agg.input_tokens
+                entry["total_output_tokens"] += agg.output_tokens
+                entry["total_cost"] += agg.cost
         return stats
 
     def estimate_deck_cost(
@@ -319,23 +492,43 @@ class TokenTracker:
 
         return comparisons
 
-    def _save_to_file(self, usage: TokenUsage) -> None:
-        """Sauvegarde dans un fichier de log."""
+    def _save_to_file(self, usage: TokenUsage, cost: float) -> None:
+        """Sauvegarde dans un fichier de log (thread d'écriture en batch)."""
+        if self._writer is None or self._writer_path != self.log_file:
+            self._writer = _UsageFileWriter(Path(self.log_file))
+            self._writer_path = self.log_file
+            atexit.register(self._writer.flush)
+        self._writer.submit({
+            "timestamp": usage.timestamp.isoformat(),
+            "model": usage.model,
+            "task_type": usage.task_type,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "total_tokens": usage.total_tokens,
+            "cost": cost,
+            "context": usage.context
+        })
+
+
+_metrics_module = None
+_metrics_unavailable = False
+
+
+def _export(record) -> None:
+    """Export Prometheus best-effort (prometheus_client optionnel)."""
+    global _metrics_module, _metrics_unavailable
+    if _metrics_unavailable:
+        return
+    if _metrics_module is None:
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                data = {
-                    "timestamp": usage.timestamp.isoformat(),
-                    "model": usage.model,
-                    "task_type": usage.task_type,
-                    "input_tokens": usage.input_tokens,
-                    "output_tokens": usage.output_tokens,
-                    "total_tokens": usage.total_tokens,
-                    "cost": self.calculate_cost(usage),
-                    "context": usage.context
-                }
-                f.write(json.dumps(data) + "\n")
-        except Exception as e:
-            logger.error(f"Erreur sauvegarde token tracking: {e}")
+            from knowbase.common import metrics as _metrics_module
+        except ImportError:
+            _metrics_unavailable = True
+            return
+    try:
+        record(_metrics_module)
+    except Exception as e:
+        logger.debug(f"[TOKEN_TRACKER] Prometheus export failed: {e}")
 
 
 # Instance globale
@@ -358,8 +551,20 @@ def track_tokens(
     task_type: str,
     input_tokens: int,
     output_tokens: int,
-    context: str = ""
+    context: str = "",
+    provider: Optional[str] = None,
 ) -> None:
     """Fonction utilitaire pour tracker des tokens."""
     tracker = get_token_tracker()
-    tracker.add_usage(model, task_type, input_tokens, output_tokens, context)
\ No newline at end of file
+    tracker.add_usage(model, task_type, input_tokens, output_tokens, context, provider)
+
+
+def track_llm_call(
+    model: str,
+    task_type: str,
+    duration_s: float,
+    provider: Optional[str] = None,
+    error_type: Optional[str] = None,
+) -> None:
+    """Fonction utilitaire pour tracker latence/erreur d'un appel LLM."""
+    get_token_tracker().record_call(model, task_type, duration_s, provider, error_type)
\ No newline at end of file
@@ -19,6 +19,8 @@ from .types import (
     DecisionType,
     MergeProposal,
     MergeResult,
+    MergeRequest,
+    BatchMergeStats,
     CorpusERConfig,
 )
 from .lex_utils import compute_lex_key, lex_score
@@ -53,6 +55,8 @@ __all__ = [
     "DecisionType",
     "MergeProposal",
     "MergeResult",
+    "MergeRequest",
+    "BatchMergeStats",
     "CorpusERConfig",
     # Utils
     "compute_lex_key",
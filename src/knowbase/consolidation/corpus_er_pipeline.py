@@ -15,7 +15,7 @@ Pipeline Flow (v2 with PATCH-ER-04/05/06 + LLM Gate V1):
    - MERGE + low conf → PROPOSE_ONLY (no auto-merge)
 7. PATCH-ER-05: Decide v2 (AUTO_MERGE, PROPOSE_ONLY, REJECT)
 8. PATCH-ER-06: Cap proposals (budget)
-9. Execute AUTO_MERGE via MergeStore
+9. Execute AUTO_MERGE via MergeStore (batched, merge chains collapsed)
 10. Store proposals for manual review
 
 Author: Claude Code
@@ -38,11 +38,12 @@ from knowbase.common.clients.embeddings import get_embedding_manager
 from knowbase.config.settings import get_settings
 
 from .types import (
-    DecisionType, MergeProposal, MergeResult, MergeScores,
+    DecisionType, MergeProposal, MergeRequest, MergeResult, MergeScores,
     CorpusERConfig, CorpusERStats, ERStatus, RejectReason
 )
 from .lex_utils import compute_lex_key, lex_score, extract_acronym, is_acronym_of
 from .merge_store import MergeStore, get_merge_store
+from .similarity_join import LexKeySimilarityJoin, find_acronym_pairs
 
 # LLM Merge Gate (V1)
 from knowbase.entity_resolution.llm_merge_gate import (
@@ -333,38 +334,34 @@ class CorpusERPipeline:
                             processed_pairs.add(pair_key)
 
         # 2. Similar lex_keys (Jaro-Winkler >= 0.85)
+        # Similarity join (length window + prefix filtering) au lieu du scan O(K²)
         lex_keys = list(lex_key_index.keys())
-        for i, key_a in enumerate(lex_keys):
-            for key_b in lex_keys[i+1:]:
-                if abs(len(key_a) - len(key_b)) > 5:
-                    continue
-
-                sim = lex_score(key_a, key_b)
-                if sim >= 0.85:
-                    for id_a in lex_key_index[key_a]:
-                        for id_b in lex_key_index[key_b]:
-                            pair_key = "|".join(sorted([id_a, id_b]))
-                            if pair_key not in processed_pairs:
-                                candidates.add((id_a, id_b))
-                                processed_pairs.add(pair_key)
-
-        # 3. Acronym matching
-        acronym_index: Dict[str, List[str]] = defaultdict(list)
-        for concept in concepts:
+        lex_join = LexKeySimilarityJoin(threshold=0.85, max_len_diff=5)
+        for i, j in lex_join.join(lex_keys):
+            for id_a in lex_key_index[lex_keys[i]]:
+                for id_b in lex_key_index[lex_keys[j]]:
+                    pair_key = "|".join(sorted([id_a, id_b]))
+                    if pair_key not in processed_pairs:
+                        candidates.add((id_a, id_b))
+                        processed_pairs.add(pair_key)
+        logger.info(f"[CorpusER] Lex-key similarity join: {lex_join.stats}")
+
+        # 3. Acronym matching (index des initiales au lieu de groupes × concepts)
+        acronym_index: Dict[str, List[int]] = defaultdict(list)
+        for i, concept in enumerate(concepts):
             acronym = extract_acronym(concept["name"])
             if acronym:
-                acronym_index[acronym].append(concept["id"])
-
-        for acronym, acronym_ids in acronym_index.items():
-            for concept in concepts:
-                if concept["id"] in acronym_ids:
-                    continue
-                if is_acronym_of(acronym, concept["name"]):
-                    for acr_id in acronym_ids:
-                        pair_key = "|".join(sorted([acr_id, concept["id"]]))
-                        if pair_key not in processed_pairs:
-                            candidates.add((acr_id, concept["id"]))
-                            processed_pairs.add(pair_key)
+                acronym_index[acronym].append(i)
+
+        names = [concept["name"] for concept in concepts]
+        for acronym, idx in find_acronym_pairs(names, acronym_index):
+            concept_id = concepts[idx]["id"]
+            for acr_idx in acronym_index[acronym]:
+                acr_id = concepts[acr_idx]["id"]
+                pair_key = "|".join(sorted([acr_id, concept_id]))
+                if pair_key not in processed_pairs:
+                    candidates.add((acr_id, concept_id))
+                    processed_pairs.add(pair_key)
 
         return list(candidates)
 
@@ -667,24 +664,26 @@ class CorpusERPipeline:
         stats: CorpusERStats,
         dry_run: bool
     ) -> None:
-        """Execute merge decisions."""
+        """
+        Execute merge decisions.
+
+        AUTO_MERGE decisions are collected and executed together via
+        MergeStore.execute_merges_batch (merge chains collapsed, grouped
+        UNWIND rewiring) once all proposals have been stored.
+        """
+        merge_requests: List[MergeRequest] = []
+
         for d in decisions:
             if d.decision == DecisionType.AUTO_MERGE:
                 if not dry_run:
-                    result = self.merge_store.execute_merge(
+                    merge_requests.append(MergeRequest(
                         source_id=d.source_id,
                         target_id=d.target_id,
                         lex_score=d.scores.lex_score,
                         sem_score=d.scores.sem_score,
                         compat_score=d.scores.compat_score,
                         merge_reason=d.reason
-                    )
-                    if result.success:
-                        stats.auto_merges += 1
-                        stats.edges_rewired += result.edges_rewired
-                        stats.instance_of_rewired += result.instance_of_rewired
-                    else:
-                        stats.errors.append(result.error or "Unknown merge error")
+                    ))
                 else:
                     stats.auto_merges += 1
 
@@ -705,6 +704,18 @@ class CorpusERPipeline:
                 self.merge_store.store_proposal(proposal)
                 stats.proposals_created += 1
 
+        if merge_requests:
+            results, batch_stats = self.merge_store.execute_merges_batch(merge_requests)
+            for result in results:
+                if result.success:
+                    stats.auto_merges += 1
+                    stats.edges_rewired += result.edges_rewired
+                    stats.instance_of_rewired += result.instance_of_rewired
+                else:
+                    stats.errors.append(result.error or "Unknown merge error")
+            stats.merges_per_s = batch_stats.merges_per_s
+            stats.edges_rewired_per_s = batch_stats.edges_per_s
+
     def _pick_source_target(
         self,
         concept_a: Dict[str, Any],
@@ -0,0 +1,121 @@
+"""
+Merge Chain Resolution for batched Corpus ER merges
+
+Réduit une liste de décisions AUTO_MERGE (source -> target) en clusters dont
+chaque source pointe directement vers sa cible FINALE (union-find) :
+
+    A -> B, B -> C   =>   A -> C, B -> C
+
+Le rewiring n'est alors fait qu'une fois par source, vers la cible finale,
+au lieu de déplacer les arêtes de A vers B puis de B vers C.
+
+Règles (alignées sur l'exécution séquentielle d'origine) :
+- une source ne fusionne qu'une fois : la première décision gagne, les
+  suivantes pour la même source sont ignorées (skipped)
+- une décision qui fermerait un cycle (cible finale == source) est ignorée
+- les clusters ne sont jamais fusionnés entre eux par transitivité inverse :
+  A -> B et A -> C ne fusionne PAS B et C
+
+Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from .types import MergeRequest
+
+
+@dataclass
+class ResolvedMerge:
+    """A source merged directly into its final target."""
+    request: MergeRequest
+    target_id: str                   # Cible finale (racine du cluster)
+
+    @property
+    def source_id(self) -> str:
+        return self.request.source_id
+
+    @property
+    def collapsed(self) -> bool:
+        """True si la cible finale diffère de la cible décidée (chaîne)."""
+        return self.target_id != self.request.target_id
+
+
+@dataclass
+class MergeChainResolution:
+    """Result of merge chain resolution."""
+    merges: List[ResolvedMerge] = field(default_factory=list)
+    skipped: List[MergeRequest] = field(default_factory=list)
+    clusters: Dict[str, List[str]] = field(default_factory=dict)   # target -> sources
+
+    def cluster_ids(self, target_id: str) -> List[str]:
+        """All concept IDs of a cluster (target first)."""
+        return [target_id] + self.clusters.get(target_id, [])
+
+
+class MergeChainResolver:
+    """
+    Union-find orienté : chaque nœud a au plus un parent (sa cible), la racine
+    d'un arbre est la cible finale du cluster.
+
+    Une source n'est unie qu'une fois, alors qu'elle est encore racine, ce qui
+    garde les arbres acycliques ; find() compresse les chemins.
+    """
+
+    def __init__(self):
+        self._parent: Dict[str, str] = {}
+
+    def find(self, concept_id: str) -> str:
+        root = concept_id
+        while root in self._parent:
+            root = self._parent[root]
+        # Path compression
+        while concept_id != root:
+            next_id = self._parent[concept_id]
+            self._parent[concept_id] = root
+            concept_id = next_id
+        return root
+
+    def union(self, source_id: str, target_id: str) -> bool:
+        """Attach source under target. False if source already merged or cycle."""
+        if source_id in self._parent:
+            return False
+        if self.find(target_id) == source_id:
+            return False
+        self._parent[source_id] = target_id
+        return True
+
+    def resolve(self, requests: Sequence[MergeRequest]) -> MergeChainResolution:
+        """
+        Collapse merge requests into final-target clusters.
+
+        Args:
+            requests: Merge requests, in decision order
+
+        Returns:
+            MergeChainResolution (one ResolvedMerge per accepted source)
+        """
+        resolution = MergeChainResolution()
+        accepted: List[MergeRequest] = []
+
+        for request in requests:
+            if request.source_id == request.target_id:
+                resolution.skipped.append(request)
+            elif self.union(request.source_id, request.target_id):
+                accepted.append(request)
+            else:
+                resolution.skipped.append(request)
+
+        for request in accepted:
+            final_target = self.find(request.source_id)
+            resolution.merges.append(ResolvedMerge(request=request, target_id=final_target))
+            resolution.clusters.setdefault(final_target, []).append(request.source_id)
+
+        return resolution
+
+
+def resolve_merge_chains(requests: Sequence[MergeRequest]) -> MergeChainResolution:
+    """Convenience wrapper: resolve merge chains with a fresh union-find."""
+    return MergeChainResolver().resolve(requests)
@@ -11,13 +11,16 @@ Date: 2026-01-01
 from __future__ import annotations
 
 import logging
+import time
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 
 from knowbase.common.clients.neo4j_client import Neo4jClient
 from knowbase.config.settings import get_settings
 
-from .types import MergeProposal, MergeResult, DecisionType
+from .types import MergeProposal, MergeResult, MergeRequest, BatchMergeStats, DecisionType
+from .merge_chains import MergeChainResolution, ResolvedMerge, resolve_merge_chains
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +32,9 @@ TYPED_EDGE_TYPES = [
     "DEFINES", "MITIGATES"
 ]
 
+# Sources per UNWIND transaction in execute_merges_batch
+MERGE_BATCH_SIZE = 500
+
 
 class MergeStore:
     """
@@ -38,6 +44,7 @@ class MergeStore:
     - Store MergeProposal nodes for audit
     - Execute merges with MERGED_INTO edges
     - Rewire typed edges to target
+    - Batched merges with merge-chain resolution (execute_merges_batch)
     - Rollback support
     """
 
@@ -239,6 +246,294 @@ class MergeStore:
                 error=str(e)
             )
 
+    def execute_merges_batch(
+        self,
+        requests: Sequence[MergeRequest],
+        batch_size: int = MERGE_BATCH_SIZE
+    ) -> Tuple[List[MergeResult], BatchMergeStats]:
+        """
+        Execute many merges with grouped UNWIND transactions.
+
+        Merge chains are collapsed first (A->B, B->C => A->C, B->C), so each
+        source is rewired exactly once, directly to its final target. Per
+        chunk of `batch_size` sources:
+        1. One transaction for MERGED_INTO edges + status updates
+        2. One transaction per typed edge type and direction
+        3. One transaction each for INSTANCE_OF and MENTIONED_IN
+
+        Rollback metadata is the same as execute_merge (MERGED_INTO edge,
+        merged_into_id, target.merged_from, rewired_from on rewired edges),
+        with the final target in place of the decided one, so rollback_merge
+        works per source.
+
+        Args:
+            requests: Merge requests, in decision order
+            batch_size: Sources per UNWIND transaction
+
+        Returns:
+            (MergeResult per accepted source, BatchMergeStats)
+        """
+        start = time.perf_counter()
+        stats = BatchMergeStats(requested=len(requests))
+
+        resolution = resolve_merge_chains(requests)
+        stats.skipped = len(resolution.skipped)
+        stats.chains_collapsed = sum(1 for m in resolution.merges if m.collapsed)
+        if resolution.skipped:
+            logger.info(
+                f"[MergeStore] Batch: skipped {stats.skipped} merges "
+                f"(source already merged or cycle)"
+            )
+
+        results: List[MergeResult] = []
+        for i in range(0, len(resolution.merges), batch_size):
+            chunk = resolution.merges[i:i + batch_size]
+            results.extend(self._execute_merge_chunk(chunk, resolution, stats))
+
+        for result in results:
+            if result.success:
+                stats.merges += 1
+                stats.edges_rewired += result.edges_rewired
+                stats.instance_of_rewired += result.instance_of_rewired
+            else:
+                stats.failed += 1
+
+        stats.duration_s = time.perf_counter() - start
+        logger.info(
+            f"[MergeStore] Batch merged {stats.merges}/{stats.requested} "
+            f"(collapsed={stats.chains_collapsed}, skipped={stats.skipped}, failed={stats.failed}) "
+            f"edges={stats.edges_rewired}, instance_of={stats.instance_of_rewired}, "
+            f"tx={stats.transactions} in {stats.duration_s:.2f}s "
+            f"({stats.merges_per_s:.1f} merges/s, {stats.edges_per_s:.1f} edges/s)"
+        )
+        return results, stats
+
+    def _execute_merge_chunk(
+        self,
+        chunk: List[ResolvedMerge],
+        resolution: MergeChainResolution,
+        stats: BatchMergeStats
+    ) -> List[MergeResult]:
+        """Execute one chunk of resolved merges (see execute_merges_batch)."""
+        rows = [
+            {
+                "source_id": m.source_id,
+                "target_id": m.target_id,
+                "decided_target_id": m.request.target_id,
+                "merge_score": m.request.merge_score,
+                "merge_reason": m.request.merge_reason,
+                "lex_score": m.request.lex_score,
+                "sem_score": m.request.sem_score,
+                "compat_score": m.request.compat_score,
+                "merged_by": m.request.merged_by,
+            }
+            for m in chunk
+        ]
+
+        create_merge_query = """
+        UNWIND $merges AS m
+        MATCH (source:CanonicalConcept {canonical_id: m.source_id, tenant_id: $tenant_id})
+        MATCH (target:CanonicalConcept {canonical_id: m.target_id, tenant_id: $tenant_id})
+
+        CREATE (source)-[:MERGED_INTO {
+            merged_at: datetime(),
+            merge_score: m.merge_score,
+            merge_reason: m.merge_reason,
+            lex_score: m.lex_score,
+            sem_score: m.sem_score,
+            compat_score: m.compat_score,
+            merged_by: m.merged_by,
+            decided_target_id: m.decided_target_id,
+            reversible: true
+        }]->(target)
+
+        SET source.er_status = 'MERGED',
+            source.merged_into_id = m.target_id,
+            source.merged_at = datetime()
+
+        SET target.merged_from = coalesce(target.merged_from, []) + m.source_id
+
+        RETURN m.source_id AS source_id
+        """
+
+        try:
+            created = self._execute_query(create_merge_query, {
+                "merges": rows,
+                "tenant_id": self.tenant_id,
+            })
+            stats.transactions += 1
+        except Exception as e:
+            logger.error(f"[MergeStore] Batch merge failed: {e}")
+            return [
+                MergeResult(
+                    success=False,
+                    source_id=m.source_id,
+                    target_id=m.target_id,
+                    merge_reason=m.request.merge_reason,
+                    error=str(e)
+                )
+                for m in chunk
+            ]
+
+        merged_ids = {r["source_id"] for r in created}
+
+        # Intra-cluster edges are left in place (same as the target exclusion
+        # of execute_merge): rewiring them would create self-loops on the target.
+        rewire_rows = [
+            {
+                "source_id": m.source_id,
+                "target_id": m.target_id,
+                "cluster_ids": resolution.cluster_ids(m.target_id),
+            }
+            for m in chunk if m.source_id in merged_ids
+        ]
+
+        edges: Dict[str, int] = defaultdict(int)
+        instance_of: Dict[str, int] = defaultdict(int)
+        if rewire_rows:
+            for edge_type in TYPED_EDGE_TYPES:
+                for source_id, count in self._rewire_typed_edges_batch(
+                    rewire_rows, edge_type, stats
+                ).items():
+                    edges[source_id] += count
+            for source_id, count in self._rewire_mentioned_in_batch(rewire_rows, stats).items():
+                edges[source_id] += count
+            instance_of = self._rewire_instance_of_batch(rewire_rows, stats)
+
+        results = []
+        for m in chunk:
+            if m.source_id in merged_ids:
+                results.append(MergeResult(
+                    success=True,
+                    source_id=m.source_id,
+                    target_id=m.target_id,
+                    merge_reason=m.request.merge_reason,
+                    edges_rewired=edges.get(m.source_id, 0),
+                    instance_of_rewired=instance_of.get(m.source_id, 0),
+                ))
+            else:
+                results.append(MergeResult(
+                    success=False,
+                    source_id=m.source_id,
+                    target_id=m.target_id,
+                    merge_reason=m.request.merge_reason,
+                    error="Source or target concept not found"
+                ))
+        return results
+
+    def _run_batch_count(
+        self,
+        query: str,
+        rows: List[Dict[str, Any]],
+        label: str,
+        stats: BatchMergeStats
+    ) -> Dict[str, int]:
+        """Run an UNWIND rewiring query, return rewired count per source."""
+        try:
+            records = self._execute_query(query, {
+                "merges": rows,
+                "tenant_id": self.tenant_id,
+            })
+            stats.transactions += 1
+        except Exception as e:
+            logger.warning(f"[MergeStore] Batch rewire {label} failed: {e}")
+            return {}
+        return {r["source_id"]: r["count"] for r in records if r["count"]}
+
+    def _rewire_typed_edges_batch(
+        self,
+        rows: List[Dict[str, Any]],
+        edge_type: str,
+        stats: BatchMergeStats
+    ) -> Dict[str, int]:
+        """Rewire outgoing and incoming edges of one typed edge type."""
+        out_query = f"""
+        UNWIND $merges AS m
+        MATCH (source:CanonicalConcept {{canonical_id: m.source_id, tenant_id: $tenant_id}})
+              -[r:{edge_type}]->(other:CanonicalConcept)
+        WHERE NOT other.canonical_id IN m.cluster_ids
+
+        MATCH (target:CanonicalConcept {{canonical_id: m.target_id, tenant_id: $tenant_id}})
+
+        MERGE (target)-[new_r:{edge_type}]->(other)
+        ON CREATE SET new_r = properties(r),
+                      new_r.rewired_from = m.source_id,
+                      new_r.rewired_at = datetime()
+
+        DELETE r
+
+        RETURN m.source_id AS source_id, count(*) AS count
+        """
+
+        in_query = f"""
+        UNWIND $merges AS m
+        MATCH (other:CanonicalConcept)-[r:{edge_type}]->
+              (source:CanonicalConcept {{canonical_id: m.source_id, tenant_id: $tenant_id}})
+        WHERE NOT other.canonical_id IN m.cluster_ids
+
+        MATCH (target:CanonicalConcept {{canonical_id: m.target_id, tenant_id: $tenant_id}})
+
+        MERGE (other)-[new_r:{edge_type}]->(target)
+        ON CREATE SET new_r = properties(r),
+                      new_r.rewired_from = m.source_id,
+                      new_r.rewired_at = datetime()
+
+        DELETE r
+
+        RETURN m.source_id AS source_id, count(*) AS count
+        """
+
+        counts = self._run_batch_count(out_query, rows, f"out {edge_type}", stats)
+        for source_id, count in self._run_batch_count(
+            in_query, rows, f"in {edge_type}", stats
+        ).items():
+            counts[source_id] = counts.get(source_id, 0) + count
+        return counts
+
+    def _rewire_instance_of_batch(
+        self,
+        rows: List[Dict[str, Any]],
+        stats: BatchMergeStats
+    ) -> Dict[str, int]:
+        """Rewire INSTANCE_OF edges from ProtoConcepts (batched)."""
+        query = """
+        UNWIND $merges AS m
+        MATCH (proto:ProtoConcept)-[r:INSTANCE_OF]->
+              (source:CanonicalConcept {canonical_id: m.source_id, tenant_id: $tenant_id})
+
+        MATCH (target:CanonicalConcept {canonical_id: m.target_id, tenant_id: $tenant_id})
+
+        MERGE (proto)-[:INSTANCE_OF]->(target)
+
+        DELETE r
+
+        RETURN m.source_id AS source_id, count(*) AS count
+        """
+        return self._run_batch_count(query, rows, "INSTANCE_OF", stats)
+
+    def _rewire_mentioned_in_batch(
+        self,
+        rows: List[Dict[str, Any]],
+        stats: BatchMergeStats
+    ) -> Dict[str, int]:
+        """Rewire MENTIONED_IN edges to SectionContexts (batched)."""
+        query = """
+        UNWIND $merges AS m
+        MATCH (source:CanonicalConcept {canonical_id: m.source_id, tenant_id: $tenant_id})
+              -[r:MENTIONED_IN]->(ctx:SectionContext)
+
+        MATCH (target:CanonicalConcept {canonical_id: m.target_id, tenant_id: $tenant_id})
+
+        MERGE (target)-[new_r:MENTIONED_IN]->(ctx)
+        ON CREATE SET new_r.rewired_from = m.source_id,
+                      new_r.rewired_at = datetime()
+
+        DELETE r
+
+        RETURN m.source_id AS source_id, count(*) AS count
+        """
+        return self._run_batch_count(query, rows, "MENTIONED_IN", stats)
+
     def _rewire_outgoing_edges(self, source_id: str, target_id: str) -> int:
         """Rewire outgoing typed edges from source to target."""
         count = 0
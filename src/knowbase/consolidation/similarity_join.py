@@ -0,0 +1,260 @@
+"""
+Similarity Join for Corpus Entity Resolution blocking
+
+Remplace les boucles O(K²) de CorpusERPipeline._find_candidates :
+- lex_key × lex_key avec Jaro-Winkler >= 0.85
+- groupe d'acronymes × concepts avec is_acronym_of
+
+Les deux moteurs sont EXACTS : ils ne retirent que des paires qui ne peuvent
+pas atteindre le seuil, puis vérifient les survivantes avec les mêmes
+fonctions que le pipeline (lex_score, is_acronym_of). L'ensemble de candidats
+est identique à l'ancien scan.
+
+Filtres (Jaro-Winkler, poids préfixe 0.1, préfixe <= 4) :
+- JW >= t avec un préfixe commun l  =>  Jaro >= (t - 0.1l) / (1 - 0.1l)
+  (pour t = 0.85 : Jaro >= 0.75 au pire, l = 4)
+- Jaro <= (c/|a| + c/|b| + 1) / 3, c = recouvrement des multisets de caractères
+  (chaque match Jaro apparie deux caractères identiques)
+- donc c >= 1.25·|a|·|b| / (|a| + |b|)  et  |a|/|b| >= 0.25
+
+Moteur : buckets de longueur (fenêtre |Δlen| <= 5) + filtre de recouvrement
+de caractères (q-grammes de taille 1) vectorisé numpy, avec le seuil Jaro
+propre au préfixe commun de chaque paire. Les q-grammes de taille >= 2 ne sont
+pas utilisables : une transposition conserve les matches Jaro mais casse les
+bigrammes ("abcd" / "badc" : Jaro 0.83, aucun bigramme commun).
+
+Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from .lex_utils import lex_score
+
+
+JW_PREFIX_WEIGHT = 0.1
+JW_MAX_PREFIX = 4
+
+# Tolérance float : les bornes sont comparées avec une marge qui ne peut
+# qu'ajouter des paires à vérifier (jamais en retirer).
+_EPS = 1e-9
+
+
+def _min_jaro_for_prefix(threshold: float, prefix_len: int) -> float:
+    """Jaro minimal pour atteindre threshold en Jaro-Winkler avec ce préfixe commun."""
+    boost = prefix_len * JW_PREFIX_WEIGHT
+    return (threshold - boost) / (1 - boost)
+
+
+class LexKeySimilarityJoin:
+    """
+    Self-join exact des lex_keys sur Jaro-Winkler >= threshold.
+
+    Usage:
+        join = LexKeySimilarityJoin(threshold=0.85, max_len_diff=5)
+        pairs = join.join(lex_keys)   # [(i, j), ...] avec i < j
+
+    Les paires sont des indices dans la séquence d'entrée, triées, de sorte que
+    l'orientation et l'ordre correspondent au double-boucle d'origine.
+
+    Les clés sont regroupées par longueur ; chaque bucket de longueur L n'est
+    comparé qu'aux buckets [L - max_len_diff, L]. Le filtre de recouvrement de
+    caractères (histogrammes, seuil Jaro dépendant du préfixe commun) est
+    vectorisé par blocs numpy ; seules les paires survivantes passent par
+    lex_score.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        max_len_diff: int = 5,
+        block_cells: int = 8_000_000,
+    ):
+        """
+        Args:
+            threshold: Seuil Jaro-Winkler
+            max_len_diff: Écart de longueur maximal entre deux clés comparées
+            block_cells: Taille max d'un bloc (lignes × colonnes × alphabet)
+        """
+        self.threshold = threshold
+        self.max_len_diff = max_len_diff
+        self.block_cells = block_cells
+
+        # Coefficient k(l) tel que c >= k(l)·a·b/(a+b), indexé par le préfixe commun
+        self._overlap_coef = np.array([
+            3 * _min_jaro_for_prefix(threshold, l) - 1
+            for l in range(JW_MAX_PREFIX + 1)
+        ])
+
+        # Statistiques du dernier join
+        self.stats: Dict[str, int] = {}
+
+    def join(self, keys: Sequence[str]) -> List[Tuple[int, int]]:
+        """
+        Retourne toutes les paires (i, j), i < j, telles que
+        |len(keys[i]) - len(keys[j])| <= max_len_diff et lex_score >= threshold.
+        """
+        n = len(keys)
+        self.stats = {
+            "keys": n,
+            "pairs_total": n * (n - 1) // 2,
+            "pairs_in_window": 0,
+            "pairs_verified": 0,
+        }
+        rows = [i for i in range(n) if keys[i]]
+        if len(rows) < 2:
+            self.stats["pairs_matched"] = 0
+            return []
+
+        alphabet = {ch: col for col, ch in enumerate(sorted({ch for i in rows for ch in keys[i]}))}
+        hist = np.zeros((len(rows), len(alphabet)), dtype=np.int32)
+        heads = np.full((len(rows), JW_MAX_PREFIX), -1, dtype=np.int32)
+        lengths = np.zeros(len(rows), dtype=np.int32)
+        for r, i in enumerate(rows):
+            key = keys[i]
+            lengths[r] = len(key)
+            for ch in key:
+                hist[r, alphabet[ch]] += 1
+            for t, ch in enumerate(key[:JW_MAX_PREFIX]):
+                heads[r, t] = alphabet[ch]
+        row_ids = np.array(rows)
+
+        by_length: Dict[int, np.ndarray] = {
+            int(length): np.flatnonzero(lengths == length)
+            for length in np.unique(lengths)
+        }
+
+        pairs: Set[Tuple[int, int]] = set()
+        for length, xs in by_length.items():
+            ys = np.concatenate([
+                by_length[l] for l in range(length - self.max_len_diff, length + 1)
+                if l in by_length
+            ])
+            chunk = max(1, self.block_cells // max(1, len(ys) * len(alphabet)))
+            for start in range(0, len(xs), chunk):
+                self._join_block(
+                    xs[start:start + chunk], ys, length,
+                    hist, heads, lengths, row_ids, keys, pairs,
+                )
+
+        self.stats["pairs_matched"] = len(pairs)
+        return sorted(pairs)
+
+    def _join_block(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        length: int,
+        hist: np.ndarray,
+        heads: np.ndarray,
+        lengths: np.ndarray,
+        row_ids: np.ndarray,
+        keys: Sequence[str],
+        pairs: Set[Tuple[int, int]],
+    ) -> None:
+        """Filtre de recouvrement vectorisé sur un bloc, puis vérification JW."""
+        # Chaque paire n'est évaluée qu'une fois : à longueur égale, x < y
+        valid = (lengths[ys][None, :] < length) | (ys[None, :] > xs[:, None])
+        self.stats["pairs_in_window"] += int(valid.sum())
+
+        overlap = np.minimum(hist[xs][:, None, :], hist[ys][None, :, :]).sum(axis=2)
+
+        # Préfixe commun (<= 4), borné par la longueur la plus courte
+        len_y = lengths[ys][None, :]
+        prefix = np.zeros(valid.shape, dtype=np.int32)
+        running = np.ones(valid.shape, dtype=bool)
+        for t in range(JW_MAX_PREFIX):
+            running &= (heads[xs, t][:, None] == heads[ys, t][None, :]) & (t < len_y) & (t < length)
+            prefix += running
+
+        need = self._overlap_coef[prefix] * length * len_y / (length + len_y)
+        candidates = np.argwhere(valid & (overlap + _EPS >= need))
+
+        for xi, yi in candidates:
+            a = int(row_ids[xs[xi]])
+            b = int(row_ids[ys[yi]])
+            if a > b:
+                a, b = b, a
+            self.stats["pairs_verified"] += 1
+            if lex_score(keys[a], keys[b]) >= self.threshold:
+                pairs.add((a, b))
+
+
+class AcronymIndex:
+    """
+    Index des initiales pour l'appariement acronyme -> forme développée.
+
+    Reproduit is_acronym_of(acronym, full_text) :
+    - full_text a >= 2 mots
+    - initiales = premières lettres (alphabétiques) des mots, en majuscules
+    - les lettres de l'acronyme sont une sous-chaîne des initiales
+
+    Au lieu de tester chaque (groupe d'acronymes × concept), on énumère les
+    sous-chaînes des initiales de chaque nom (bornées par la longueur maximale
+    des acronymes connus) et on les cherche dans un dict.
+    """
+
+    def __init__(self, acronyms: Iterable[str]):
+        self._by_letters: Dict[str, List[str]] = defaultdict(list)
+        for acronym in acronyms:
+            letters = "".join(c for c in acronym.upper() if c.isalpha())
+            if letters:
+                self._by_letters[letters].append(acronym)
+        self._lengths = sorted({len(k) for k in self._by_letters})
+
+    @staticmethod
+    def initials(full_text: str) -> str:
+        words = [w for w in full_text.split() if len(w) > 0]
+        if len(words) < 2:
+            return ""
+        return "".join(w[0].upper() for w in words if w[0].isalpha())
+
+    def match(self, full_text: str) -> Set[str]:
+        """Acronymes connus dont full_text est une expansion possible."""
+        found: Set[str] = set()
+        if not full_text or not self._lengths:
+            return found
+        initials = self.initials(full_text)
+        for length in self._lengths:
+            if length > len(initials):
+                break
+            for start in range(len(initials) - length + 1):
+                hits = self._by_letters.get(initials[start:start + length])
+                if hits:
+                    found.update(hits)
+        return found
+
+
+def find_acronym_pairs(
+    names: Sequence[str],
+    acronym_groups: Dict[str, List[int]],
+) -> List[Tuple[str, int]]:
+    """
+    Paires (acronyme, index du concept) pour lesquelles is_acronym_of est vrai.
+
+    Args:
+        names: Noms des concepts (dans l'ordre de chargement)
+        acronym_groups: acronyme -> indices des concepts portant cet acronyme
+
+    Returns:
+        Paires ordonnées comme la double boucle d'origine
+        (acronymes dans l'ordre du dict, concepts dans l'ordre de `names`),
+        sans les concepts appartenant au groupe de l'acronyme.
+    """
+    index = AcronymIndex(acronym_groups.keys())
+    matches: Dict[str, List[int]] = defaultdict(list)
+    for i, name in enumerate(names):
+        for acronym in index.match(name):
+            matches[acronym].append(i)
+
+    pairs: List[Tuple[str, int]] = []
+    for acronym, members in acronym_groups.items():
+        member_set = set(members)
+        for i in matches.get(acronym, ()):
+            if i not in member_set:
+                pairs.append((acronym, i))
+    return pairs
@@ -134,6 +134,60 @@ class MergeResult:
         }
 
 
+@dataclass
+class MergeRequest:
+    """A merge to execute (input of MergeStore.execute_merges_batch)."""
+    source_id: str
+    target_id: str
+    lex_score: float
+    sem_score: float
+    compat_score: float
+    merge_reason: str
+    merged_by: str = "auto"
+
+    @property
+    def merge_score(self) -> float:
+        return 0.4 * self.lex_score + 0.4 * self.sem_score + 0.2 * self.compat_score
+
+
+@dataclass
+class BatchMergeStats:
+    """Statistics from a batched merge execution."""
+    requested: int = 0
+    merges: int = 0
+    chains_collapsed: int = 0           # Sources rewired to a final target != decided target
+    skipped: int = 0                    # Duplicate source / cycle
+    failed: int = 0
+    edges_rewired: int = 0
+    instance_of_rewired: int = 0
+    transactions: int = 0
+    duration_s: float = 0.0
+
+    @property
+    def merges_per_s(self) -> float:
+        return self.merges / self.duration_s if self.duration_s > 0 else 0.0
+
+    @property
+    def edges_per_s(self) -> float:
+        edges = self.edges_rewired + self.instance_of_rewired
+        return edges / self.duration_s if self.duration_s > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requested": self.requested,
+            "merges": self.merges,
+            "chains_collapsed": self.chains_collapsed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "edges_rewired": self.edges_rewired,
+            "instance_of_rewired": self.instance_of_rewired,
+            "transactions": self.transactions,
+            "duration_s": round(self.duration_s, 3),
+            "merges_per_s": round(self.merges_per_s, 1),
+            "edges_per_s": round(self.edges_per_s, 1),
+        }
+
+
 @dataclass
 class CorpusERConfig:
     """
@@ -245,6 +299,8 @@ class CorpusERStats:
 
     edges_rewired: int = 0
     instance_of_rewired: int = 0
+    merges_per_s: float = 0.0
+    edges_rewired_per_s: float = 0.0
 
     duration_ms: float = 0.0
     errors: List[str] = field(default_factory=list)
@@ -273,6 +329,8 @@ class CorpusERStats:
             },
             "edges_rewired": self.edges_rewired,
             "instance_of_rewired": self.instance_of_rewired,
+            "merges_per_s": self.merges_per_s,
+            "edges_rewired_per_s": self.edges_rewired_per_s,
             "duration_ms": self.duration_ms,
             "errors": self.errors[:10],
         }
@@ -12,6 +12,7 @@ Components:
 - DeferredReevaluator: Batch job for DEFER resolution
 - DeferredStore: Storage for deferred merge candidates
 - ScoreCache: Redis cache for pairwise scores
+- BlockingIndex / IncrementalEntityResolver: delta-only resolution (v1.2)
 
 Author: Claude Code
 Date: 2025-12-26
@@ -37,6 +38,7 @@ from .config import (
     DEFER_CONFIG,
     CACHE_CONFIG,
     CROSS_ENCODER_CONFIG,
+    INCREMENTAL_CONFIG,
 )
 
 # Components
@@ -56,6 +58,10 @@ from .pipeline import (
     PipelineResult,
 )
 
+# Incremental mode (v1.2)
+from .blocking_index import BlockingIndex
+from .incremental import IncrementalEntityResolver, get_incremental_resolver
+
 # LLM Merge Gate (V1)
 from .llm_merge_gate import (
     LLMMergeGate,
@@ -83,6 +89,7 @@ __all__ = [
     "DEFER_CONFIG",
     "CACHE_CONFIG",
     "CROSS_ENCODER_CONFIG",
+    "INCREMENTAL_CONFIG",
     # Components
     "CandidateFinder",
     "get_candidate_finder",
@@ -104,6 +111,10 @@ __all__ = [
     "get_entity_resolution_pipeline",
     "run_entity_resolution",
     "PipelineResult",
+    # Incremental mode (v1.2)
+    "BlockingIndex",
+    "IncrementalEntityResolver",
+    "get_incremental_resolver",
     # LLM Merge Gate (V1)
     "LLMMergeGate",
     "LLMGateConfig",
@@ -0,0 +1,380 @@
+"""
+Phase 2.12 v1.2 - Blocking Index
+
+Standing lexical blocking index (acronym + prefix) for incremental entity
+resolution. Kept warm in process and persisted in Redis between runs so that
+a small import only resolves its new concepts instead of reloading the
+whole tenant.
+
+Redis layout:
+- er:blocking:{tenant}:concepts  HASH  concept_id -> JSON record
+- er:blocking:{tenant}:meta      HASH  built_at, last_full_sweep_at, version
+
+`version` is bumped (HINCRBY) by every write, so a worker holding a warm
+copy reloads it when another worker (or a merge elsewhere) changed the
+persisted index.
+
+Only the concept records are persisted; the acronym and prefix indices are
+derived from them on load (pure in-memory work, no Neo4j round-trip).
+
+Semantic blocking stays on the Qdrant `concepts_proto` collection, which is
+already a persistent ANN index.
+
+Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import redis
+
+from knowbase.config.settings import get_settings
+from .candidate_finder import extract_acronym, is_acronym_of, normalize_for_blocking
+from .config import BLOCKING_CONFIG, INCREMENTAL_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingIndex:
+    """
+    Acronym/prefix blocking index with Redis persistence.
+
+    Records mirror the dicts returned by CandidateFinder._load_concepts
+    (id, name, type, surface_forms, definition).
+    """
+
+    def __init__(
+        self,
+        tenant_id: str = "default",
+        redis_client: Optional[redis.Redis] = None,
+        persist: bool = True,
+    ):
+        """
+        Initialize BlockingIndex.
+
+        Args:
+            tenant_id: Tenant ID
+            redis_client: Redis client (creates one if None and persist=True)
+            persist: If False, index lives in memory only
+        """
+        if redis_client is None and persist:
+            settings = get_settings()
+            redis_client = redis.Redis(
+                host=settings.redis_host,
+                port=settings.redis_port, password=getattr(settings, "redis_password", None) or os.getenv("REDIS_PASSWORD") or None,
+                db=0,
+                decode_responses=True
+            )
+        self.redis = redis_client
+        self.tenant_id = tenant_id
+        self.prefix = f"{INCREMENTAL_CONFIG['redis_prefix']}{tenant_id}:"
+
+        self.concepts: Dict[str, Dict[str, Any]] = {}
+        self._acronym_index: Dict[str, Set[str]] = {}
+        self._prefix_index: Dict[str, Set[str]] = {}
+        self._loaded = False
+        self._version: Optional[int] = None
+
+    # =========================================================================
+    # Key helpers (same normalization as CandidateFinder)
+    # =========================================================================
+
+    @staticmethod
+    def _acronym_key(name: str) -> Optional[str]:
+        return extract_acronym(name)
+
+    @staticmethod
+    def _prefix_key(name: str) -> Optional[str]:
+        normalized = normalize_for_blocking(name)
+        min_len = BLOCKING_CONFIG["prefix_min_length"]
+        if len(normalized) >= min_len:
+            return normalized[:min_len]
+        return None
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def __contains__(self, concept_id: str) -> bool:
+        return concept_id in self.concepts
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    # =========================================================================
+    # Mutations
+    # =========================================================================
+
+    def _index(self, concept: Dict[str, Any]) -> None:
+        concept_id = concept["id"]
+        name = concept.get("name") or ""
+
+        acronym = self._acronym_key(name)
+        if acronym:
+            self._acronym_index.setdefault(acronym, set()).add(concept_id)
+
+        prefix = self._prefix_key(name)
+        if prefix:
+            self._prefix_index.setdefault(prefix, set()).add(concept_id)
+
+    def _unindex(self, concept: Dict[str, Any]) -> None:
+        concept_id = concept["id"]
+        name = concept.get("name") or ""
+
+        for key, index in (
+            (self._acronym_key(name), self._acronym_index),
+            (self._prefix_key(name), self._prefix_index),
+        ):
+            if key and key in index:
+                index[key].discard(concept_id)
+                if not index[key]:
+                    del index[key]
+
+    def add_concepts(self, concepts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add (or refresh) concepts in the index and persist them.
+
+        Returns:
+            Number of concepts indexed
+        """
+        records = {}
+        for concept in concepts:
+            if not concept or not concept.get("id"):
+                continue
+            previous = self.concepts.get(concept["id"])
+            if previous:
+                self._unindex(previous)
+            record = {
+                "id": concept["id"],
+                "name": concept.get("name"),
+                "type": concept.get("type"),
+                "surface_forms": list(concept.get("surface_forms") or []),
+                "definition": concept.get("definition"),
+            }
+            self.concepts[record["id"]] = record
+            self._index(record)
+            records[record["id"]] = json.dumps(record)
+
+        if records and self.redis is not None:
+            try:
+                self.redis.hset(f"{self.prefix}concepts", mapping=records)
+            except Exception as e:
+                logger.warning(f"[BlockingIndex] Error persisting concepts: {e}")
+            self._bump_version()
+
+        return len(records)
+
+    def remove_concepts(self, concept_ids: Iterable[str]) -> int:
+        """Remove concepts from the index (e.g. merged-away sources)."""
+        removed = []
+        for concept_id in concept_ids:
+            concept = self.concepts.pop(concept_id, None)
+            if concept:
+                self._unindex(concept)
+                removed.append(concept_id)
+
+        if removed and self.redis is not None:
+            try:
+                self.redis.hdel(f"{self.prefix}concepts", *removed)
+            except Exception as e:
+                logger.warning(f"[BlockingIndex] Error removing concepts: {e}")
+            self._bump_version()
+
+        return len(removed)
+
+    def apply_merge(
+        self,
+        survivor_id: str,
+        merged_id: str,
+        migrated_aliases: Optional[List[str]] = None
+    ) -> None:
+        """
+        Reflect a merge: drop the merged concept, fold its aliases into the survivor.
+        """
+        merged = self.concepts.get(merged_id)
+        self.remove_concepts([merged_id])
+
+        survivor = self.concepts.get(survivor_id)
+        if not survivor:
+            return
+
+        forms = list(survivor.get("surface_forms") or [])
+        extra = list(migrated_aliases or [])
+        if merged:
+            extra.extend(merged.get("surface_forms") or [])
+        for form in extra:
+            if form and form not in forms:
+                forms.append(form)
+        if forms != survivor.get("surface_forms"):
+            self.add_concepts([{**survivor, "surface_forms": forms}])
+
+    def rebuild(self, concepts: List[Dict[str, Any]]) -> None:
+        """Replace the whole index (full sweep)."""
+        self.concepts.clear()
+        self._acronym_index.clear()
+        self._prefix_index.clear()
+
+        if self.redis is not None:
+            try:
+                self.redis.delete(f"{self.prefix}concepts")
+            except Exception as e:
+                logger.warning(f"[BlockingIndex] Error clearing persisted index: {e}")
+
+        self._loaded = True
+        self.add_concepts(concepts)
+        self._set_meta(built_at=datetime.utcnow().isoformat())
+        self._bump_version(adopt=True)
+
+        logger.info(
+            f"[BlockingIndex] Rebuilt for tenant={self.tenant_id}: "
+            f"{len(self.concepts)} concepts, "
+            f"{len(self._acronym_index)} acronym groups, "
+            f"{len(self._prefix_index)} prefix groups"
+        )
+
+    # =========================================================================
+    # Persistence
+    # =========================================================================
+
+    def load(self) -> bool:
+        """
+        Load the persisted index from Redis.
+
+        A warm index is reused as long as the persisted version did not
+        change; otherwise it is reloaded (writes from another worker).
+
+        Returns:
+            True if a persisted index was found
+        """
+        if self._loaded and (self.redis is None or not self._is_stale()):
+            return True
+        if self.redis is None:
+            return False
+
+        try:
+            if not self.redis.exists(f"{self.prefix}meta"):
+                self._loaded = False
+                return False
+            version = self.redis.hget(f"{self.prefix}meta", "version")
+            raw = self.redis.hgetall(f"{self.prefix}concepts")
+        except Exception as e:
+            logger.warning(f"[BlockingIndex] Error loading index: {e}")
+            return False
+
+        self.concepts.clear()
+        self._acronym_index.clear()
+        self._prefix_index.clear()
+        for value in raw.values():
+            record = json.loads(value)
+            self.concepts[record["id"]] = record
+            self._index(record)
+
+        self._loaded = True
+        self._version = int(version or 0)
+        logger.info(
+            f"[BlockingIndex] Loaded {len(self.concepts)} concepts "
+            f"for tenant={self.tenant_id}"
+        )
+        return True
+
+    def _is_stale(self) -> bool:
+        """True if the persisted version differs from the one held in memory."""
+        if self._version is None:
+            return True
+        try:
+            version = self.redis.hget(f"{self.prefix}meta", "version")
+        except Exception as e:
+            logger.warning(f"[BlockingIndex] Error reading version: {e}")
+            return False
+        return int(version or 0) != self._version
+
+    def _bump_version(self, adopt: bool = False) -> None:
+        """
+        Bump the persisted version after a write.
+
+        The in-memory copy stays current only if nobody else wrote since it
+        was loaded (new version == ours + 1); otherwise the next load()
+        re-reads Redis. adopt=True (full rebuild) takes the new version as is.
+        """
+        if self.redis is None or not self._loaded:
+            return
+        try:
+            version = int(self.redis.hincrby(f"{self.prefix}meta", "version", 1))
+        except Exception as e:
+            logger.warning(f"[BlockingIndex] Error bumping version: {e}")
+            self._version = None
+            return
+        if adopt or (self._version is not None and version == self._version + 1):
+            self._version = version
+        else:
+            self._version = None
+
+    def _set_meta(self, **fields: str) -> None:
+        if self.redis is None:
+            return
+        try:
+            self.redis.hset(f"{self.prefix}meta", mapping=fields)
+        except Exception as e:
+            logger.warning(f"[BlockingIndex] Error writing meta: {e}")
+
+    def get_meta(self) -> Dict[str, Any]:
+        """Get persisted metadata (built_at, last_full_sweep_at)."""
+        if self.redis is None:
+            return {}
+        try:
+            return self.redis.hgetall(f"{self.prefix}meta") or {}
+        except Exception as e:
+            logger.warning(f"[BlockingIndex] Error reading meta: {e}")
+            return {}
+
+    def mark_full_sweep(self) -> None:
+        """Record the completion time of a full reconciliation sweep."""
+        self._set_meta(last_full_sweep_at=datetime.utcnow().isoformat())
+
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+
+    def lexical_candidates(self, concept: Dict[str, Any]) -> Set[str]:
+        """
+        Find lexical blocking candidates for a concept.
+
+        Same rules as CandidateFinder._find_lexical_candidates.
+        """
+        candidates: Set[str] = set()
+        concept_id = concept["id"]
+        name = concept.get("name") or ""
+
+        if BLOCKING_CONFIG["enable_acronym_blocking"]:
+            acronym = self._acronym_key(name)
+            if acronym and acronym in self._acronym_index:
+                candidates.update(self._acronym_index[acronym])
+
+            # Check if this concept is an expansion of an acronym
+            for acr, ids in self._acronym_index.items():
+                if is_acronym_of(acr, name):
+                    candidates.update(ids)
+
+        if BLOCKING_CONFIG["enable_prefix_blocking"]:
+            prefix = self._prefix_key(name)
+            if prefix and prefix in self._prefix_index:
+                candidates.update(self._prefix_index[prefix])
+
+        candidates.discard(concept_id)
+        return candidates
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            "tenant_id": self.tenant_id,
+            "loaded": self._loaded,
+            "concepts": len(self.concepts),
+            "acronym_groups": len(self._acronym_index),
+            "prefix_groups": len(self._prefix_index),
+            **self.get_meta(),
+        }
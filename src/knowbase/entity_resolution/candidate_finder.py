@@ -16,7 +16,7 @@ from __future__ import annotations
 import logging
 import re
 from collections import defaultdict
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any, TYPE_CHECKING
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import Filter, FieldCondition, MatchValue
@@ -29,6 +29,9 @@ from knowbase.config.settings import get_settings
 from .types import ConceptType, MergeCandidate, SignalBreakdown
 from .config import BLOCKING_CONFIG
 
+if TYPE_CHECKING:
+    from .blocking_index import BlockingIndex
+
 logger = logging.getLogger(__name__)
 
 
@@ -148,6 +151,26 @@ class CandidateFinder:
 
         return self._execute_query(query, params)
 
+    def _load_concepts_by_ids(self, concept_ids: List[str]) -> List[Dict[str, Any]]:
+        """Load a given set of concepts from Neo4j (same shape as _load_concepts)."""
+        if not concept_ids:
+            return []
+
+        query = """
+        UNWIND $concept_ids AS cid
+        MATCH (c:CanonicalConcept {canonical_id: cid, tenant_id: $tenant_id})
+        WHERE c.status IN ['active', 'PROVISIONAL']
+        RETURN c.canonical_id AS id,
+               c.canonical_name AS name,
+               c.concept_type AS type,
+               c.surface_forms AS surface_forms,
+               c.definition AS definition
+        """
+        return self._execute_query(query, {
+            "concept_ids": list(concept_ids),
+            "tenant_id": self.tenant_id,
+        })
+
     def _build_blocking_indices(self, concepts: List[Dict[str, Any]]) -> None:
         """Build blocking indices for fast lookup."""
         self._acronym_index.clear()
@@ -301,10 +324,6 @@ class CandidateFinder:
         # Build blocking indices
         self._build_blocking_indices(concepts)
 
-        # Find candidates
-        candidates_map: Dict[str, MergeCandidate] = {}
-        processed_pairs: Set[str] = set()
-
         # If targeting specific concept
         if target_concept_id:
             concepts_to_process = [concepts_by_id.get(target_concept_id)]
@@ -312,13 +331,62 @@ class CandidateFinder:
         else:
             concepts_to_process = concepts
 
+        return self._collect_candidates(
+            concepts_to_process,
+            concepts_by_id,
+            lambda concept: self._find_lexical_candidates(concept, concepts_by_id),
+        )
+
+    def find_candidates_for_concepts(
+        self,
+        new_concepts: List[Dict[str, Any]],
+        blocking_index: "BlockingIndex",
+    ) -> List[MergeCandidate]:
+        """
+        Find merge candidates for a delta of concepts against a standing index.
+
+        Incremental counterpart of find_candidates(): no tenant reload and no
+        index rebuild. The new concepts must already be in the index so that
+        they can also match each other.
+
+        Args:
+            new_concepts: Concept dicts (id, name, type, surface_forms, definition)
+            blocking_index: Warm BlockingIndex for the tenant
+
+        Returns:
+            List of merge candidates
+        """
+        if not new_concepts:
+            return []
+
+        logger.info(
+            f"[CandidateFinder] Finding candidates for {len(new_concepts)} new concepts "
+            f"(index size={len(blocking_index)})"
+        )
+
+        return self._collect_candidates(
+            new_concepts,
+            blocking_index.concepts,
+            blocking_index.lexical_candidates,
+        )
+
+    def _collect_candidates(
+        self,
+        concepts_to_process: List[Dict[str, Any]],
+        concepts_by_id: Dict[str, Dict[str, Any]],
+        lexical_lookup: Callable[[Dict[str, Any]], Set[str]],
+    ) -> List[MergeCandidate]:
+        """Combine lexical and semantic blocking into deduplicated pairs."""
+        candidates_map: Dict[str, MergeCandidate] = {}
+        processed_pairs: Set[str] = set()
+
         for concept in concepts_to_process:
             concept_id = concept["id"]
             concept_name = concept["name"] or ""
             concept_type_str = concept["type"] or "ENTITY"
 
             # Find lexical candidates
-            lexical_candidates = self._find_lexical_candidates(concept, concepts_by_id)
+            lexical_candidates = lexical_lookup(concept)
 
             # Find semantic candidates
             semantic_candidates = self._find_semantic_candidates(
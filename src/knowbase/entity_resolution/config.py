@@ -166,6 +166,22 @@ REJECT_STORE_CONFIG = {
 }
 
 
+# =============================================================================
+# INCREMENTAL MODE CONFIGURATION (v1.2)
+# =============================================================================
+
+INCREMENTAL_CONFIG = {
+    # Redis key prefix for the persisted blocking index
+    "redis_prefix": "er:blocking:",
+
+    # Full reconciliation sweep is recommended after this delay
+    "full_sweep_interval_hours": 24,
+
+    # Concepts loaded per Neo4j round-trip when resolving a delta
+    "load_batch_size": 500,
+}
+
+
 # =============================================================================
 # CROSS-ENCODER CONFIGURATION
 # =============================================================================
@@ -320,6 +320,9 @@ class DeferredReevaluator:
             # Promoted! Execute merge
             if not dry_run:
                 merge_result = self.resolver.merge(decision_result)
+                if merge_result.success:
+                    from .incremental import notify_concepts_merged
+                    notify_concepts_merged(self.tenant_id, [merge_result])
                 # Remove from deferred store
                 self.deferred_store.delete(deferred.pair_id)
                 return {
@@ -0,0 +1,253 @@
+"""
+Phase 2.12 v1.2 - Incremental Entity Resolution
+
+Resolves only the delta of newly created concepts against a standing
+blocking index, instead of reloading every CanonicalConcept of the tenant
+and rebuilding all blocking indices on each run.
+
+Flow (incremental):
+1. BlockingIndex.load() (Redis) or bootstrap from Neo4j once
+2. Load only the new concepts, add them to the index
+3. CandidateFinder.find_candidates_for_concepts() against the index
+4. EntityResolutionPipeline._process_candidates() (score/route/merge)
+5. Apply successful merges back to the index
+
+Index maintenance hooks (notify_concepts_created / notify_concepts_merged)
+are called by every path that creates or merges CanonicalConcepts: Gatekeeper
+promotion, full pipeline runs, incremental runs and DeferredReevaluator.
+
+The pair scorer keeps using the shared Redis ScoreCache, so scores computed
+by previous runs (full or incremental) are reused.
+
+A full sweep (rebuild index + full pipeline run) remains available for
+periodic reconciliation.
+
+Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .types import ConceptType, MergeResult
+from .blocking_index import BlockingIndex
+from .config import INCREMENTAL_CONFIG
+from .pipeline import EntityResolutionPipeline, PipelineResult, get_entity_resolution_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalEntityResolver:
+    """
+    Incremental ER service backed by a warm, persisted BlockingIndex.
+    """
+
+    def __init__(
+        self,
+        tenant_id: str = "default",
+        pipeline: Optional[EntityResolutionPipeline] = None,
+        blocking_index: Optional[BlockingIndex] = None,
+    ):
+        """
+        Initialize IncrementalEntityResolver.
+
+        Args:
+            tenant_id: Tenant ID
+            pipeline: ER pipeline (uses singleton if None)
+            blocking_index: Blocking index (Redis-backed if None)
+        """
+        self.tenant_id = tenant_id
+        self.pipeline = pipeline or get_entity_resolution_pipeline(tenant_id)
+        self.index = (
+            blocking_index if blocking_index is not None
+            else BlockingIndex(tenant_id=tenant_id)
+        )
+
+    @property
+    def candidate_finder(self):
+        return self.pipeline.candidate_finder
+
+    def ensure_index(self) -> BlockingIndex:
+        """Load the persisted index, bootstrapping it from Neo4j if absent."""
+        if not self.index.load():
+            logger.info(
+                f"[IncrementalER] No persisted index for tenant={self.tenant_id}, bootstrapping"
+            )
+            self.index.rebuild(self.candidate_finder._load_concepts())
+        return self.index
+
+    def _load_concepts(self, concept_ids: List[str]) -> List[Dict[str, Any]]:
+        """Load the delta from Neo4j in bounded batches."""
+        batch_size = INCREMENTAL_CONFIG["load_batch_size"]
+        concepts: List[Dict[str, Any]] = []
+        for i in range(0, len(concept_ids), batch_size):
+            concepts.extend(
+                self.candidate_finder._load_concepts_by_ids(concept_ids[i:i + batch_size])
+            )
+        return concepts
+
+    def register_concepts(self, concepts: List[Dict[str, Any]]) -> int:
+        """
+        Hook for concept creation: index concepts without resolving them.
+
+        No-op while no index is persisted (the bootstrap will load them).
+        """
+        if not self.index.load():
+            return 0
+        return self.index.add_concepts(concepts)
+
+    def register_concept_ids(self, concept_ids: List[str]) -> int:
+        """Hook for concept creation by ID (records loaded from Neo4j in batches)."""
+        if not concept_ids or not self.index.load():
+            return 0
+        return self.index.add_concepts(self._load_concepts(list(dict.fromkeys(concept_ids))))
+
+    def on_concepts_merged(self, merge_results: List[MergeResult]) -> int:
+        """Hook for merges: drop merged concepts and fold aliases into survivors."""
+        if not any(merge.success for merge in merge_results) or not self.index.load():
+            return 0
+        applied = 0
+        for merge in merge_results:
+            if not merge.success:
+                continue
+            self.index.apply_merge(
+                merge.survivor_id,
+                merge.merged_id,
+                migrated_aliases=merge.aliases_migrated,
+            )
+            applied += 1
+        return applied
+
+    def resolve_new_concepts(
+        self,
+        concept_ids: List[str],
+        dry_run: bool = False,
+        skip_reject_filter: bool = False,
+        concept_type: Optional[ConceptType] = None
+    ) -> PipelineResult:
+        """
+        Resolve a delta of new concepts against the standing index.
+
+        Args:
+            concept_ids: IDs of the newly created concepts
+            dry_run: If True, don't execute merges
+            skip_reject_filter: If True, don't filter by RejectStore
+            concept_type: Only resolve delta concepts of this type
+                (candidates are always same-type pairs)
+
+        Returns:
+            PipelineResult with statistics
+        """
+        result = PipelineResult()
+
+        try:
+            self.ensure_index()
+
+            new_concepts = self._load_concepts(list(dict.fromkeys(concept_ids)))
+            if not new_concepts:
+                logger.info("[IncrementalER] No active concepts in delta")
+                result.finalize()
+                return result
+
+            # Index first so that new concepts can also match each other
+            self.index.add_concepts(new_concepts)
+
+            if concept_type is not None:
+                new_concepts = [c for c in new_concepts if c.get("type") == concept_type.value]
+
+            candidates = self.candidate_finder.find_candidates_for_concepts(
+                new_concepts, self.index
+            )
+            result.candidates_generated = len(candidates)
+
+            logger.info(
+                f"[IncrementalER] Delta={len(new_concepts)} concepts, "
+                f"index={len(self.index)}, candidates={len(candidates)}"
+            )
+
+            if candidates:
+                self.pipeline._process_candidates(
+                    candidates, result,
+                    dry_run=dry_run,
+                    skip_reject_filter=skip_reject_filter,
+                    merge_listener=self.on_concepts_merged
+                )
+
+        except Exception as e:
+            error_msg = f"Incremental pipeline error: {e}"
+            logger.error(f"[IncrementalER] {error_msg}")
+            result.errors.append(error_msg)
+
+        result.finalize()
+        return result
+
+    def full_sweep(
+        self,
+        concept_type: Optional[ConceptType] = None,
+        dry_run: bool = False
+    ) -> PipelineResult:
+        """
+        Periodic reconciliation: full pipeline run, then rebuild the index.
+        """
+        result = self.pipeline.run(concept_type=concept_type, dry_run=dry_run)
+        try:
+            self.index.rebuild(self.candidate_finder._load_concepts())
+            self.index.mark_full_sweep()
+        except Exception as e:
+            result.errors.append(f"Index rebuild failed: {e}")
+        return result
+
+    def is_full_sweep_due(self) -> bool:
+        """True if no full sweep ran within full_sweep_interval_hours."""
+        last = self.index.get_meta().get("last_full_sweep_at")
+        if not last:
+            return True
+        interval = timedelta(hours=INCREMENTAL_CONFIG["full_sweep_interval_hours"])
+        return datetime.utcnow() - datetime.fromisoformat(last) > interval
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index and sweep statistics."""
+        return {
+            **self.index.get_stats(),
+            "full_sweep_due": self.is_full_sweep_due(),
+        }
+
+
+# Singleton (per tenant, keeps the index warm across runs)
+_incremental_instances: Dict[str, IncrementalEntityResolver] = {}
+
+
+def get_incremental_resolver(tenant_id: str = "default") -> IncrementalEntityResolver:
+    """Get or create IncrementalEntityResolver instance for a tenant."""
+    if tenant_id not in _incremental_instances:
+        _incremental_instances[tenant_id] = IncrementalEntityResolver(tenant_id=tenant_id)
+    return _incremental_instances[tenant_id]
+
+
+def notify_concepts_created(tenant_id: str, concept_ids: List[str]) -> int:
+    """
+    Index newly created CanonicalConcepts (e.g. after Gatekeeper promotion).
+
+    Never raises: the index is reconciled by the next full sweep anyway.
+    """
+    try:
+        return get_incremental_resolver(tenant_id).register_concept_ids(concept_ids)
+    except Exception as e:
+        logger.warning(f"[IncrementalER] Could not index new concepts: {e}")
+        return 0
+
+
+def notify_concepts_merged(tenant_id: str, merge_results: List[MergeResult]) -> int:
+    """
+    Apply merges executed outside the incremental resolver (full runs,
+    DeferredReevaluator) to the standing index.
+
+    Never raises: the index is reconciled by the next full sweep anyway.
+    """
+    try:
+        return get_incremental_resolver(tenant_id).on_concepts_merged(merge_results)
+    except Exception as e:
+        logger.warning(f"[IncrementalER] Could not apply merges to index: {e}")
+        return 0
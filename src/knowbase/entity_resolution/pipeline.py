@@ -17,6 +17,9 @@ v1.1 Improvements:
 - Incremental mode for new concepts only
 - Fingerprint-based invalidation
 
+v1.2: run_for_new_concept() delegates to IncrementalEntityResolver
+(warm blocking index, delta-only resolution).
+
 Author: Claude Code
 Date: 2025-12-26
 """
@@ -26,7 +29,7 @@ from __future__ import annotations
 import logging
 import hashlib
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Set
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from .types import (
     ConceptType, MergeCandidate, MergeResult,
@@ -164,60 +167,10 @@ class EntityResolutionPipeline:
                 result.finalize()
                 return result
 
-            # Step 2: Get concept data for scoring (needed for fingerprints)
-            concepts_data = self._get_concepts_data(candidates)
-            result.concepts_processed = len(concepts_data)
-
-            # Step 2.5 (v1.1): Filter out already-rejected pairs
-            if not skip_reject_filter:
-                candidates = self._filter_rejected_candidates(candidates, concepts_data)
-                logger.info(f"[ERPipeline] After RejectStore filter: {len(candidates)} candidates")
-
-            if not candidates:
-                logger.info("[ERPipeline] All candidates already rejected")
-                result.finalize()
-                return result
-
-            # Step 3: Score candidates
-            scored_candidates = self.scorer.score_batch(candidates, concepts_data)
-            result.candidates_scored = len(scored_candidates)
-
-            # Step 4: Route decisions
-            auto_results, defer_results, reject_results = self.router.route_batch(
-                scored_candidates
-            )
-
-            result.auto_decisions = len(auto_results)
-            result.defer_decisions = len(defer_results)
-            result.reject_decisions = len(reject_results)
-
-            # Step 5: Execute AUTO merges
-            if auto_results and not dry_run:
-                result.merges_attempted = len(auto_results)
-                merge_results = self.resolver.merge_batch(auto_results)
-                result.merge_results = merge_results
-                result.merges_successful = sum(1 for r in merge_results if r.success)
-                result.merges_failed = sum(1 for r in merge_results if not r.success)
-
-            # Step 6: Store DEFER candidates
-            for decision_result in defer_results:
-                try:
-                    deferred = decision_result.to_deferred(self.tenant_id)
-                    if self.deferred_store.store(deferred):
-                        result.deferred_stored += 1
-                except Exception as e:
-                    result.errors.append(f"Failed to store deferred: {e}")
-
-            # Step 7 (v1.1): Store REJECT in RejectStore
-            self._store_rejects(reject_results, concepts_data)
-
-            logger.info(
-                f"[ERPipeline] Complete: "
-                f"candidates={result.candidates_generated}, "
-                f"AUTO={result.auto_decisions}, "
-                f"DEFER={result.defer_decisions}, "
-                f"REJECT={result.reject_decisions}, "
-                f"merges={result.merges_successful}/{result.merges_attempted}"
+            self._process_candidates(
+                candidates, result,
+                dry_run=dry_run,
+                skip_reject_filter=skip_reject_filter
             )
 
         except Exception as e:
@@ -228,6 +181,78 @@ class EntityResolutionPipeline:
         result.finalize()
         return result
 
+    def _process_candidates(
+        self,
+        candidates: List[MergeCandidate],
+        result: PipelineResult,
+        dry_run: bool = False,
+        skip_reject_filter: bool = False,
+        merge_listener: Optional[Callable[[List[MergeResult]], Any]] = None
+    ) -> None:
+        """
+        Steps 2-7: filter, score, route, merge, store DEFER/REJECT.
+
+        Shared by the full run and the incremental resolver.
+
+        Executed merges are reported to merge_listener, or to the tenant's
+        incremental blocking index when no listener is given.
+        """
+        # Step 2: Get concept data for scoring (needed for fingerprints)
+        concepts_data = self._get_concepts_data(candidates)
+        result.concepts_processed = len(concepts_data)
+
+        # Step 2.5 (v1.1): Filter out already-rejected pairs
+        if not skip_reject_filter:
+            candidates = self._filter_rejected_candidates(candidates, concepts_data)
+            logger.info(f"[ERPipeline] After RejectStore filter: {len(candidates)} candidates")
+
+        if not candidates:
+            logger.info("[ERPipeline] All candidates already rejected")
+            return
+
+        # Step 3: Score candidates
+        scored_candidates = self.scorer.score_batch(candidates, concepts_data)
+        result.candidates_scored = len(scored_candidates)
+
+        # Step 4: Route decisions
+        auto_results, defer_results, reject_results = self.router.route_batch(
+            scored_candidates
+        )
+
+        result.auto_decisions = len(auto_results)
+        result.defer_decisions = len(defer_results)
+        result.reject_decisions = len(reject_results)
+
+        # Step 5: Execute AUTO merges
+        if auto_results and not dry_run:
+            result.merges_attempted = len(auto_results)
+            merge_results = self.resolver.merge_batch(auto_results)
+            result.merge_results = merge_results
+            result.merges_successful = sum(1 for r in merge_results if r.success)
+            result.merges_failed = sum(1 for r in merge_results if not r.success)
+            self._notify_merges(merge_results, merge_listener)
+
+        # Step 6: Store DEFER candidates
+        for decision_result in defer_results:
+            try:
+                deferred = decision_result.to_deferred(self.tenant_id)
+                if self.deferred_store.store(deferred):
+                    result.deferred_stored += 1
+            except Exception as e:
+                result.errors.append(f"Failed to store deferred: {e}")
+
+        # Step 7 (v1.1): Store REJECT in RejectStore
+        self._store_rejects(reject_results, concepts_data)
+
+        logger.info(
+            f"[ERPipeline] Complete: "
+            f"candidates={result.candidates_generated}, "
+            f"AUTO={result.auto_decisions}, "
+            f"DEFER={result.defer_decisions}, "
+            f"REJECT={result.reject_decisions}, "
+            f"merges={result.merges_successful}/{result.merges_attempted}"
+        )
+
     def _get_concepts_data(
         self,
         candidates: List[MergeCandidate]
@@ -370,6 +395,23 @@ class EntityResolutionPipeline:
         logger.info(f"[ERPipeline] Stored {stored} rejects in RejectStore")
         return stored
 
+    def _notify_merges(
+        self,
+        merge_results: List[MergeResult],
+        merge_listener: Optional[Callable[[List[MergeResult]], Any]] = None
+    ) -> None:
+        """Keep the standing blocking index in sync with executed merges."""
+        if not any(r.success for r in merge_results):
+            return
+        try:
+            if merge_listener is None:
+                from .incremental import notify_concepts_merged
+                notify_concepts_merged(self.tenant_id, merge_results)
+            else:
+                merge_listener(merge_results)
+        except Exception as e:
+            logger.warning(f"[ERPipeline] Blocking index update failed: {e}")
+
     def run_for_new_concept(
         self,
         concept_id: str,
@@ -396,10 +438,11 @@ class EntityResolutionPipeline:
             f"(id={concept_id}, type={concept_type.value})"
         )
 
-        return self.run(
-            concept_type=concept_type,
-            target_concept_id=concept_id,
-            dry_run=dry_run
+        # v1.2: resolve against the standing blocking index (no tenant reload)
+        from .incremental import get_incremental_resolver
+
+        return get_incremental_resolver(self.tenant_id).resolve_new_concepts(
+            [concept_id], dry_run=dry_run, concept_type=concept_type
         )
 
     def get_stats(self) -> EntityResolutionStats:
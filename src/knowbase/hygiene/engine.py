@@ -203,6 +203,10 @@ class HygieneEngine:
             f"{result.skipped_already_suppressed} skipped)"
         )
 
+        if result.applied and not dry_run:
+            from knowbase.wiki.atlas_views import invalidate_atlas_views
+            invalidate_atlas_views(self._tenant_id, reason=f"hygiene run ({result.applied} applied)")
+
         return result
 
     def _resolve_node_name(self, node_id: str, node_type: str) -> Optional[str]:
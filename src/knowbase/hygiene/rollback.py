@@ -85,6 +85,13 @@ class HygieneRollback:
             # Flag wiki articles as stale if applicable
             self._flag_wiki_stale_for_rollback(action)
 
+            from knowbase.wiki.atlas_views import invalidate_atlas_views
+            invalidate_atlas_views(action.tenant_id, reason=f"hygiene rollback {action_id}")
+
+            if action.action_type in (HygieneActionType.SUPPRESS_AXIS, HygieneActionType.MERGE_AXIS):
+                from knowbase.retrieval.axis_catalogue import bump_axis_catalogue_version
+                bump_axis_catalogue_version()
+
         return result
 
     def rollback_batch(self, batch_id: str, tenant_id: str = "default") -> List[Dict]:
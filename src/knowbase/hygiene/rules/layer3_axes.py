@@ -103,6 +103,15 @@ def _parse_llm_json(text: str) -> list:
 # Helpers de classification
 # ---------------------------------------------------------------------------
 
+def _bump_axis_catalogue() -> None:
+    """Invalide le catalogue d'axes runtime (QueryDecomposer) de tous les process."""
+    try:
+        from knowbase.retrieval.axis_catalogue import bump_axis_catalogue_version
+        bump_axis_catalogue_version()
+    except Exception as e:
+        logger.warning(f"[OSMOSE:Hygiene] Axis catalogue bump failed: {e}")
+
+
 def _normalize_axis_key(key: str) -> str:
     """Normalise une clé d'axe pour comparaison."""
     return re.sub(r"[_\-\s]+", "_", key.lower().strip())
@@ -282,6 +291,12 @@ class LowValueAxisRule(HygieneRule):
     def description(self) -> str:
         return "Détecte les axes à faible valeur de navigation (peu de docs, peu de valeurs)"
 
+    def apply_action(self, neo4j_driver, action: HygieneAction) -> bool:
+        applied = super().apply_action(neo4j_driver, action)
+        if applied:
+            _bump_axis_catalogue()
+        return applied
+
     def scan(
         self,
         neo4j_driver,
@@ -560,7 +575,10 @@ class RedundantAxisRule(HygieneRule):
           4. Marquer la source comme supprimée (_hygiene_status = 'suppressed')
         """
         if action.action_type == HygieneActionType.SUPPRESS_AXIS:
-            return self._apply_suppress(neo4j_driver, action)
+            applied = self._apply_suppress(neo4j_driver, action)
+            if applied:
+                _bump_axis_catalogue()
+            return applied
 
         if action.action_type != HygieneActionType.MERGE_AXIS:
             return False
@@ -654,6 +672,7 @@ class RedundantAxisRule(HygieneRule):
             logger.info(
                 f"  ✓ MERGE_AXIS appliqué : {source_id} → {merge_target_id}"
             )
+            _bump_axis_catalogue()
             return True
 
         except Exception as e:
@@ -693,6 +712,12 @@ class MisnamedAxisRule(HygieneRule):
     def description(self) -> str:
         return "Détecte les axes mal nommés ou incohérents (pré-filtre + LLM)"
 
+    def apply_action(self, neo4j_driver, action: HygieneAction) -> bool:
+        applied = super().apply_action(neo4j_driver, action)
+        if applied:
+            _bump_axis_catalogue()
+        return applied
+
     def scan(
         self,
         neo4j_driver,
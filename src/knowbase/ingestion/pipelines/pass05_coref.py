@@ -22,6 +22,7 @@ Invariants respectés:
 Ref: doc/ongoing/IMPLEMENTATION_PLAN_ADR_COMPLETION.md - Section 10.6
 """
 
+import bisect
 import logging
 import time
 from dataclasses import dataclass, field
@@ -41,9 +42,11 @@ from knowbase.linguistic.coref_models import (
     ReasonCode,
 )
 from knowbase.linguistic.coref_engine import (
+    CorefBatchStats,
     ICorefEngine,
     get_engine_for_language,
     get_available_engines,
+    resolve_texts,
 )
 from knowbase.linguistic.coref_gating import (
     CorefGatingPolicy,
@@ -97,6 +100,10 @@ class Pass05Config:
     fastcoref_batch_size: int = 50000     # 50k chars par batch (~12 pages)
     fastcoref_batch_overlap: int = 3000   # 3k chars overlap pour contexte coref
 
+    # nlp.pipe sur tous les batches (None = COREF_PIPE_BATCH_SIZE / COREF_PIPE_N_PROCESS)
+    coref_pipe_batch_size: Optional[int] = None  # Textes par batch nlp.pipe
+    coref_pipe_n_process: Optional[int] = None   # Process nlp.pipe (1 modèle par process)
+
     # Logging
     verbose: bool = False
 
@@ -127,10 +134,68 @@ class Pass05Result:
     # Timing
     processing_time_ms: float = 0.0
 
+    # Débit engine en segments/s (passage batch partagé si plusieurs documents)
+    coref_segments_per_s: float = 0.0
+    # Débit de bout en bout de l'appel process_documents (documents non skippés / durée)
+    docs_per_s: float = 0.0
+    peak_rss_mb: float = 0.0
+
     # Engine utilisé
     engine_used: str = "unknown"
 
 
+class DocumentOffsetIndex:
+    """
+    Offsets du texte complet → DocItem / chunk (intervalles triés + bisect).
+
+    full_text = "\n".join(textes non vides des DocItems, ordre de lecture) :
+    le DocItem k commence à sum(len(t_i) + 1 for i < k). Un chunk est
+    rattaché par ordre de lecture : celui dont reading_order_start est le
+    plus grand <= reading_order_index du DocItem.
+    """
+
+    def __init__(self, docitems: List[Dict[str, Any]], chunks: List[Dict[str, Any]]):
+        self._starts: List[int] = []
+        self._item_ids: List[Optional[str]] = []
+        self._orders: List[Optional[int]] = []
+        offset = 0
+        for item in docitems:
+            text = item.get("text")
+            if not text:
+                continue
+            self._starts.append(offset)
+            self._item_ids.append(item.get("item_id"))
+            self._orders.append(item.get("order_idx"))
+            offset += len(text) + 1
+
+        ordered_chunks = sorted(
+            (c for c in chunks if c.get("order_start") is not None),
+            key=lambda c: c["order_start"],
+        )
+        self._chunk_orders: List[int] = [c["order_start"] for c in ordered_chunks]
+        self._chunk_ids: List[Optional[str]] = [c.get("chunk_id") for c in ordered_chunks]
+        self._first_chunk_id: Optional[str] = chunks[0].get("chunk_id") if chunks else None
+
+    def _position(self, offset: int) -> Optional[int]:
+        if not self._starts:
+            return None
+        return max(bisect.bisect_right(self._starts, offset) - 1, 0)
+
+    def docitem_at(self, offset: int) -> Optional[str]:
+        """DocItem contenant l'offset (un séparateur \n appartient au DocItem précédent)."""
+        position = self._position(offset)
+        return self._item_ids[position] if position is not None else None
+
+    def chunk_at(self, offset: int) -> Optional[str]:
+        """Chunk couvrant le DocItem de l'offset (premier chunk si ordre inconnu)."""
+        position = self._position(offset)
+        order = self._orders[position] if position is not None else None
+        if order is None or not self._chunk_orders:
+            return self._first_chunk_id
+        k = bisect.bisect_right(self._chunk_orders, order) - 1
+        return self._chunk_ids[max(k, 0)]
+
+
 class Pass05CoreferencePipeline:
     """
     Pipeline Pass 0.5 - Résolution de coréférence.
@@ -210,71 +275,139 @@ class Pass05CoreferencePipeline:
         Returns:
             Pass05Result avec les métriques
         """
-        start_time = time.time()
-        result = Pass05Result(doc_id=doc_id, doc_version_id=doc_version_id)
+        return self.process_documents([(doc_id, doc_version_id)])[0]
 
-        try:
-            # 1. Vérifier si déjà traité (idempotence)
-            if self.config.skip_if_exists:
-                if self.persistence.check_coref_exists_for_document(doc_version_id):
-                    result.skipped = True
-                    result.success = True
-                    logger.info(f"[OSMOSE:Pass0.5] Skipping {doc_id} (already processed)")
-                    return result
-
-            # 2. Charger les données du document
-            doc_data = self._load_document_data(doc_id, doc_version_id)
-            if not doc_data:
-                result.error_message = "Failed to load document data"
-                return result
-
-            # 3. Détecter la langue
-            lang = self._detect_language(doc_data)
-            logger.info(f"[OSMOSE:Pass0.5] Document {doc_id} language: {lang}")
+    def process_documents(
+        self,
+        documents: List[Tuple[str, str]],
+    ) -> List[Pass05Result]:
+        """
+        Traite plusieurs documents, avec un seul passage engine par langue.
+
+        Les batches de sections de tous les documents d'une même langue sont
+        envoyés ensemble dans nlp.pipe (modèle chargé une fois), puis gating
+        et persistance sont faits document par document.
+
+        Args:
+            documents: Liste de (doc_id, doc_version_id)
+
+        Returns:
+            Pass05Result par document, dans l'ordre d'entrée
+        """
+        results: List[Pass05Result] = []
+        by_lang: Dict[str, List[Tuple[Pass05Result, Dict[str, Any], float]]] = {}
+        wall_start = time.time()
+
+        for doc_id, doc_version_id in documents:
+            start_time = time.time()
+            result = Pass05Result(doc_id=doc_id, doc_version_id=doc_version_id)
+            results.append(result)
+
+            try:
+                # 1. Vérifier si déjà traité (idempotence)
+                if self.config.skip_if_exists:
+                    if self.persistence.check_coref_exists_for_document(doc_version_id):
+                        result.skipped = True
+                        result.success = True
+                        logger.info(f"[OSMOSE:Pass0.5] Skipping {doc_id} (already processed)")
+                        continue
+
+                # 2. Charger les données du document
+                doc_data = self._load_document_data(doc_id, doc_version_id)
+                if not doc_data:
+                    result.error_message = "Failed to load document data"
+                    continue
+
+                # 3. Détecter la langue
+                lang = self._detect_language(doc_data)
+                logger.info(f"[OSMOSE:Pass0.5] Document {doc_id} language: {lang}")
+                by_lang.setdefault(lang, []).append((result, doc_data, start_time))
+
+            except Exception as e:
+                logger.error(f"[OSMOSE:Pass0.5] Error processing {doc_id}: {e}")
+                result.error_message = str(e)
+                result.processing_time_ms = (time.time() - start_time) * 1000
+
+        for lang, pending in by_lang.items():
+            self._process_language_group(lang, pending)
+
+        processed = sum(1 for r in results if not r.skipped)
+        elapsed_s = time.time() - wall_start
+        docs_per_s = processed / elapsed_s if processed and elapsed_s > 0 else 0.0
+        for result in results:
+            result.docs_per_s = docs_per_s
+        if processed:
+            logger.info(
+                f"[OSMOSE:Pass0.5] {processed} documents in {elapsed_s:.1f}s "
+                f"({docs_per_s:.2f} docs/s)"
+            )
 
+        return results
+
+    def _process_language_group(
+        self,
+        lang: str,
+        pending: List[Tuple[Pass05Result, Dict[str, Any], float]],
+    ) -> None:
+        """Résolution batch des documents d'une langue, puis finalisation par document."""
+        try:
             # 4. Sélectionner l'engine
             engine = get_engine_for_language(lang)
-            result.engine_used = engine.engine_name
             logger.info(f"[OSMOSE:Pass0.5] Using engine: {engine.engine_name}")
 
-            # 5. Résoudre les coréférences
-            coref_result = self._resolve_coreferences(
-                doc_data=doc_data,
-                engine=engine,
-                lang=lang,
+            # 5a. Passage engine unique sur les batches de tous les documents
+            clusters_per_doc, batch_stats = self._resolve_documents_clusters(
+                [doc_data for _, doc_data, _ in pending], engine, lang
             )
+        except Exception as e:
+            for result, doc_data, start_time in pending:
+                logger.error(f"[OSMOSE:Pass0.5] Error processing {doc_data['doc_id']}: {e}")
+                result.error_message = str(e)
+                result.processing_time_ms = (time.time() - start_time) * 1000
+            return
 
-            # 6. Persister la CorefGraph
-            stats = self.persistence.persist_coref_graph(coref_result)
+        for (result, doc_data, start_time), clusters in zip(pending, clusters_per_doc):
+            result.engine_used = engine.engine_name
+            result.coref_segments_per_s = batch_stats.segments_per_s
+            result.peak_rss_mb = batch_stats.peak_rss_mb
+            try:
+                # 5b. Gating et construction de la CorefGraph
+                coref_result = self._resolve_coreferences(
+                    doc_data=doc_data,
+                    engine=engine,
+                    lang=lang,
+                    clusters=clusters,
+                )
 
-            # 7. Créer les liens MATCHES_PROTOCONCEPT si applicable
-            if self.config.create_protoconcept_links:
-                self._create_protoconcept_links(coref_result, doc_data)
+                # 6. Persister la CorefGraph
+                stats = self.persistence.persist_coref_graph(coref_result)
 
-            # 8. Mettre à jour le résultat
-            result.success = True
-            result.mention_spans_created = stats["mention_spans"]
-            result.chains_created = stats["chains"]
-            result.links_created = stats["links"]
-            result.decisions_created = stats["decisions"]
-            result.resolution_rate = coref_result.resolution_rate
-            result.abstention_rate = coref_result.abstention_rate
+                # 7. Créer les liens MATCHES_PROTOCONCEPT si applicable
+                if self.config.create_protoconcept_links:
+                    self._create_protoconcept_links(coref_result, doc_data)
 
-        except Exception as e:
-            logger.error(f"[OSMOSE:Pass0.5] Error processing {doc_id}: {e}")
-            result.error_message = str(e)
+                # 8. Mettre à jour le résultat
+                result.success = True
+                result.mention_spans_created = stats["mention_spans"]
+                result.chains_created = stats["chains"]
+                result.links_created = stats["links"]
+                result.decisions_created = stats["decisions"]
+                result.resolution_rate = coref_result.resolution_rate
+                result.abstention_rate = coref_result.abstention_rate
 
-        result.processing_time_ms = (time.time() - start_time) * 1000
-        logger.info(
-            f"[OSMOSE:Pass0.5] Completed {doc_id}: "
-            f"{result.mention_spans_created} spans, "
-            f"{result.chains_created} chains, "
-            f"resolution={result.resolution_rate:.1%}, "
-            f"abstention={result.abstention_rate:.1%} "
-            f"({result.processing_time_ms:.0f}ms)"
-        )
+            except Exception as e:
+                logger.error(f"[OSMOSE:Pass0.5] Error processing {result.doc_id}: {e}")
+                result.error_message = str(e)
 
-        return result
+            result.processing_time_ms = (time.time() - start_time) * 1000
+            logger.info(
+                f"[OSMOSE:Pass0.5] Completed {result.doc_id}: "
+                f"{result.mention_spans_created} spans, "
+                f"{result.chains_created} chains, "
+                f"resolution={result.resolution_rate:.1%}, "
+                f"abstention={result.abstention_rate:.1%} "
+                f"({result.processing_time_ms:.0f}ms)"
+            )
 
     def _load_document_data(
         self,
@@ -369,6 +502,7 @@ class Pass05CoreferencePipeline:
         doc_data: Dict[str, Any],
         engine: ICorefEngine,
         lang: str,
+        clusters: Optional[List[CoreferenceCluster]] = None,
     ) -> CorefGraphResult:
         """
         Résout les coréférences avec l'engine et le gating policy.
@@ -380,6 +514,7 @@ class Pass05CoreferencePipeline:
             doc_data: Données du document
             engine: Engine de coréférence
             lang: Langue du document
+            clusters: Clusters déjà calculés (passage batch multi-documents)
 
         Returns:
             CorefGraphResult avec toutes les structures
@@ -393,31 +528,9 @@ class Pass05CoreferencePipeline:
         )
 
         full_text = doc_data["full_text"]
-        chunks = doc_data.get("chunks", [])
-        docitems = doc_data.get("docitems", [])
 
-        # Décider si batching nécessaire (OOM Fix pour gros documents)
-        batch_size = self.config.fastcoref_batch_size
-        if len(full_text) > batch_size and docitems:
-            # Traitement par batches de sections
-            logger.info(
-                f"[OSMOSE:Pass0.5] Large document ({len(full_text):,} chars > {batch_size:,}), "
-                f"using section batching"
-            )
-            clusters = self._resolve_with_section_batching(
-                docitems=docitems,
-                engine=engine,
-                lang=lang,
-                batch_size=batch_size,
-                overlap=self.config.fastcoref_batch_overlap,
-            )
-        else:
-            # Traitement normal (document entier)
-            clusters = engine.resolve(
-                document_text=full_text,
-                chunks=[{"text": c.get("text", ""), "chunk_id": c.get("chunk_id")} for c in chunks],
-                lang=lang,
-            )
+        if clusters is None:
+            clusters = self._resolve_documents_clusters([doc_data], engine, lang)[0][0]
 
         # 2. Filtrer les faux positifs Named↔Named (ADR_COREF_NAMED_NAMED_VALIDATION)
         if self.config.enable_named_gating:
@@ -439,76 +552,99 @@ class Pass05CoreferencePipeline:
         result.processing_time_ms = (time.time() - start_time) * 1000
         return result
 
-    def _resolve_with_section_batching(
-        self,
-        docitems: List[Dict[str, Any]],
-        engine: ICorefEngine,
-        lang: str,
-        batch_size: int,
-        overlap: int,
-    ) -> List[CoreferenceCluster]:
+    def _document_segments(self, doc_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
-        Résout les coréférences par batches de sections.
-
-        OOM Fix: Groupe les DocItems par sections jusqu'à batch_size chars,
-        puis appelle FastCoref sur chaque batch avec overlap pour le contexte.
-
-        Args:
-            docitems: Liste des DocItems avec text et section_id
-            engine: Engine de coréférence
-            lang: Langue
-            batch_size: Taille max d'un batch en chars
-            overlap: Chars d'overlap entre batches pour contexte
+        Textes à soumettre à l'engine pour un document, avec leur offset.
 
-        Returns:
-            Liste de tous les clusters (offsets ajustés au document complet)
+        OOM Fix: au-delà de fastcoref_batch_size chars, batches de sections
+        avec overlap ; sinon le document entier.
         """
-        all_clusters: List[CoreferenceCluster] = []
-
-        # Grouper les DocItems en batches
-        batches = self._create_section_batches(docitems, batch_size, overlap)
-
-        logger.info(
-            f"[OSMOSE:Pass0.5] Created {len(batches)} batches for section-based processing"
-        )
-
-        for batch_idx, batch in enumerate(batches):
-            batch_text = batch["text"]
-            batch_offset = batch["offset"]  # Offset dans le document complet
+        full_text = doc_data["full_text"]
+        docitems = doc_data.get("docitems", [])
+        batch_size = self.config.fastcoref_batch_size
 
-            # Appeler l'engine sur ce batch
-            batch_clusters = engine.resolve(
-                document_text=batch_text,
-                chunks=[],
-                lang=lang,
+        if len(full_text) > batch_size and docitems:
+            logger.info(
+                f"[OSMOSE:Pass0.5] Large document ({len(full_text):,} chars > {batch_size:,}), "
+                f"using section batching"
             )
-
-            # Ajuster les offsets des clusters au document complet
-            for cluster in batch_clusters:
-                adjusted_mentions = []
-                for mention in cluster.mentions:
-                    adjusted_mentions.append({
-                        "start": mention["start"] + batch_offset,
-                        "end": mention["end"] + batch_offset,
-                        "text": mention["text"],
-                        "sentence_idx": mention.get("sentence_idx", 0),
-                    })
-                cluster.mentions = adjusted_mentions
-                all_clusters.append(cluster)
-
-            logger.debug(
-                f"[OSMOSE:Pass0.5] Batch {batch_idx + 1}/{len(batches)}: "
-                f"{len(batch_text):,} chars, {len(batch_clusters)} clusters"
+            batches = self._create_section_batches(
+                docitems, batch_size, self.config.fastcoref_batch_overlap
             )
+            logger.info(
+                f"[OSMOSE:Pass0.5] Created {len(batches)} batches for section-based processing"
+            )
+            return batches
 
-        # Dédupliquer les clusters de l'overlap (même mentions = même cluster)
-        all_clusters = self._deduplicate_overlap_clusters(all_clusters)
+        return [{"text": full_text, "offset": 0}]
 
-        logger.info(
-            f"[OSMOSE:Pass0.5] Section batching complete: {len(all_clusters)} total clusters"
+    def _resolve_documents_clusters(
+        self,
+        docs: List[Dict[str, Any]],
+        engine: ICorefEngine,
+        lang: str,
+    ) -> Tuple[List[List[CoreferenceCluster]], CorefBatchStats]:
+        """Clusters de chaque document (offsets document), en un seul passage engine."""
+        return self._resolve_segments(
+            [self._document_segments(doc_data) for doc_data in docs], engine, lang
+        )
+
+    def _resolve_segments(
+        self,
+        segments_per_doc: List[List[Dict[str, Any]]],
+        engine: ICorefEngine,
+        lang: str,
+    ) -> Tuple[List[List[CoreferenceCluster]], CorefBatchStats]:
+        """
+        Passe tous les segments (batches de sections, un ou plusieurs documents)
+        dans resolve_texts, puis recale les offsets et déduplique l'overlap.
+        """
+        texts = [segment["text"] for segments in segments_per_doc for segment in segments]
+        segment_clusters, stats = resolve_texts(
+            engine,
+            texts,
+            lang=lang,
+            batch_size=self.config.coref_pipe_batch_size,
+            n_process=self.config.coref_pipe_n_process,
         )
 
-        return all_clusters
+        clusters_per_doc: List[List[CoreferenceCluster]] = []
+        cursor = 0
+        for segments in segments_per_doc:
+            doc_clusters: List[CoreferenceCluster] = []
+            for batch_idx, segment in enumerate(segments):
+                batch_clusters = segment_clusters[cursor]
+                cursor += 1
+                batch_offset = segment["offset"]  # Offset dans le document complet
+
+                # Ajuster les offsets des clusters au document complet
+                for cluster in batch_clusters:
+                    if batch_offset:
+                        cluster.mentions = [
+                            {
+                                "start": mention["start"] + batch_offset,
+                                "end": mention["end"] + batch_offset,
+                                "text": mention["text"],
+                                "sentence_idx": mention.get("sentence_idx", 0),
+                            }
+                            for mention in cluster.mentions
+                        ]
+                    doc_clusters.append(cluster)
+
+                logger.debug(
+                    f"[OSMOSE:Pass0.5] Batch {batch_idx + 1}/{len(segments)}: "
+                    f"{len(segment['text']):,} chars, {len(batch_clusters)} clusters"
+                )
+
+            if len(segments) > 1:
+                # Dédupliquer les clusters de l'overlap (même mentions = même cluster)
+                doc_clusters = self._deduplicate_overlap_clusters(doc_clusters)
+                logger.info(
+                    f"[OSMOSE:Pass0.5] Section batching complete: {len(doc_clusters)} total clusters"
+                )
+            clusters_per_doc.append(doc_clusters)
+
+        return clusters_per_doc, stats
 
     def _create_section_batches(
         self,
@@ -556,6 +692,9 @@ class Pass05CoreferencePipeline:
                 # Préparer l'overlap pour le prochain batch
                 full_batch_text = "\n".join([i.get("text", "") for i in current_batch_items])
                 previous_overlap_text = full_batch_text[-overlap:] if len(full_batch_text) > overlap else full_batch_text
+                # Le "\n" séparant les items dans full_text fait partie de l'overlap,
+                # sinon les offsets de l'overlap sont décalés d'un caractère
+                previous_overlap_text += "\n"
 
                 # Reset pour prochain batch
                 current_offset += current_batch_chars
@@ -626,19 +765,12 @@ class Pass05CoreferencePipeline:
 
         # Créer les MentionSpan pour chaque mention du cluster
         mention_spans: List[MentionSpan] = []
+        offset_index = self._offset_index(doc_data)
 
         for mention in cluster.mentions:
-            # Trouver le DocItem correspondant
-            docitem_id = self._find_docitem_for_offset(
-                offset=mention.get("start", 0),
-                docitems=doc_data.get("docitems", [])
-            )
-
-            # Trouver le chunk correspondant
-            chunk_id = self._find_chunk_for_offset(
-                offset=mention.get("start", 0),
-                chunks=doc_data.get("chunks", [])
-            )
+            # Trouver le DocItem et le chunk correspondants
+            docitem_id = offset_index.docitem_at(mention.get("start", 0))
+            chunk_id = offset_index.chunk_at(mention.get("start", 0))
 
             # Déterminer le type de mention
             mention_type = self._classify_mention(mention.get("text", ""), lang)
@@ -729,29 +861,13 @@ class Pass05CoreferencePipeline:
                 else:
                     result.non_referential_count += 1
 
-    def _find_docitem_for_offset(
-        self,
-        offset: int,
-        docitems: List[Dict],
-    ) -> Optional[str]:
-        """Trouve le DocItem contenant l'offset donné."""
-        # Pour l'instant, retourne le premier DocItem
-        # TODO: implémenter une recherche par offset
-        if docitems:
-            return docitems[0].get("item_id")
-        return None
-
-    def _find_chunk_for_offset(
-        self,
-        offset: int,
-        chunks: List[Dict],
-    ) -> Optional[str]:
-        """Trouve le chunk contenant l'offset donné."""
-        # Pour l'instant, retourne le premier chunk
-        # TODO: implémenter une recherche par offset
-        if chunks:
-            return chunks[0].get("chunk_id")
-        return None
+    def _offset_index(self, doc_data: Dict[str, Any]) -> DocumentOffsetIndex:
+        """Index offset → DocItem / chunk du document (construit une fois)."""
+        index = doc_data.get("offset_index")
+        if index is None:
+            index = DocumentOffsetIndex(doc_data.get("docitems", []), doc_data.get("chunks", []))
+            doc_data["offset_index"] = index
+        return index
 
     def _classify_mention(self, text: str, lang: str) -> MentionType:
         """Classifie le type de mention."""
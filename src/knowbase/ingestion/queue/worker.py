@@ -30,6 +30,8 @@ from knowbase.common.clients import (
     get_sentence_transformer,
 )
 
+from knowbase.wiki.batch_jobs import WIKI_QUEUE_NAME
+
 from .connection import DEFAULT_QUEUE_NAME, get_queue, get_redis_connection
 
 
@@ -136,17 +138,101 @@ def _recover_interrupted_jobs() -> None:
         logger.warning(f"[WORKER:STARTUP] Failed to recover interrupted jobs: {e}")
 
 
-def warm_clients() -> None:
+def _resume_wiki_batches() -> None:
+    """Reprend les batches de génération wiki interrompus (lanes mortes au restart).
+
+    Non-bloquant, comme _recover_interrupted_jobs.
+    """
+    logger = logging.getLogger(__name__)
+    try:
+        from knowbase.wiki.batch_jobs import resume_wiki_batches
+
+        stats = resume_wiki_batches()
+        if stats["lanes_spawned"]:
+            logger.info(f"[WORKER:STARTUP] Wiki batches resumed: {stats}")
+    except Exception as e:
+        logger.warning(f"[WORKER:STARTUP] Failed to resume wiki batches: {e}")
+
+
+def _warm_embeddings() -> None:
+    """Charge le modèle d'embedding, ou s'appuie sur le serveur partagé.
+
+    Avec EMBEDDINGS_SHARED_SOCKET, le premier worker démarré lance le serveur
+    d'embeddings (EMBEDDINGS_SHARED_AUTOSTART=true par défaut) et les autres
+    s'y connectent : une seule copie du modèle pour tous les processus. Si le
+    serveur ne répond pas, chargement en process comme avant.
+    """
+    from knowbase.common.clients.embedding_server import (
+        ensure_embedding_server,
+        get_shared_address,
+    )
+
+    if get_shared_address():
+        autostart = os.getenv("EMBEDDINGS_SHARED_AUTOSTART", "true").lower() == "true"
+        if ensure_embedding_server(autostart=autostart):
+            return
+        from knowbase.common.clients.embeddings import get_embedding_manager
+        get_embedding_manager().load_local_model()
+        return
+    get_sentence_transformer()  # Safe with SimpleWorker (no fork)
+
+
+def _warm_layer_r() -> None:
+    try:
+        from knowbase.retrieval.qdrant_layer_r import bootstrap_layer_r
+        bootstrap_layer_r()  # Collection + payload indexes Layer R, une fois par process
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"[Worker] Layer R bootstrap failed: {e}")
+
+
+def _warm_spacy() -> None:
+    """Modèles spaCy de l'extraction de prédicats (OSMOSE_PRELOAD_SPACY_LANGS, défaut fr,en)."""
+    langs = [l.strip() for l in os.getenv("OSMOSE_PRELOAD_SPACY_LANGS", "fr,en").split(",") if l.strip()]
+    try:
+        from knowbase.relations.predicate_extractor import get_spacy_model
+        for lang in langs:
+            get_spacy_model(lang)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"[Worker] spaCy preload failed: {e}")
+
+
+def _warm_reranker() -> None:
+    from knowbase.common.clients.reranker import get_cross_encoder
+    get_cross_encoder()
+
+
+WORKER_PRELOADERS = {
+    "openai": lambda: get_openai_client(),
+    "qdrant": lambda: get_qdrant_client(),
+    "embeddings": _warm_embeddings,
+    "layer_r": _warm_layer_r,
+    "spacy": _warm_spacy,
+    "reranker": _warm_reranker,
+}
+
+
+def preload_models(role: str | None = None):
+    """Précharge les clients / modèles du rôle worker (cf. knowbase.common.preload).
+
+    Rôle : OSMOSE_PROCESS_ROLE (ingestion_worker par défaut, pass2_worker pour
+    un worker dédié Pass 2) ; liste surchargeable par OSMOSE_PRELOAD_<ROLE>.
+    """
+    from knowbase.common.preload import ROLE_INGESTION_WORKER, get_process_role, run_preloads
+
+    return run_preloads(role or get_process_role(ROLE_INGESTION_WORKER), WORKER_PRELOADERS)
+
+
+def warm_clients(role: str | None = None) -> None:
     """Preload shared heavy clients so all jobs reuse the same instances.
 
     Using SimpleWorker (no fork), we can safely warm all clients including GPU models.
+    Only the models used by the process role are loaded (see preload_models).
     """
-    get_openai_client()
-    get_qdrant_client()
-    get_sentence_transformer()  # Safe with SimpleWorker (no fork)
+    preload_models(role)
     _restore_burst_state()
     _start_burst_resync_subscriber()  # CH-BURST.REL : écoute les events resync
     _recover_interrupted_jobs()
+    _resume_wiki_batches()
 
 
 def run_worker(*, queue_name: str | None = None, with_scheduler: bool = True) -> None:
@@ -171,11 +257,14 @@ def run_worker(*, queue_name: str | None = None, with_scheduler: bool = True) ->
 
     # IMPORTANT: Use SimpleWorker instead of Worker to avoid fork() with CUDA
     # SimpleWorker runs jobs in the same process (no fork), making it safe for GPU operations
-    # Écouter la queue principale + reprocess + benchmark (séquentiel)
+    # Écouter la queue principale + reprocess + benchmark + wiki (séquentiel)
+    # Ordre = priorité : un job wiki (lane bornée à WIKI_LANE_ITEMS_PER_JOB
+    # articles) n'est pris que si aucun job d'ingestion n'attend.
     reprocess_queue = get_queue("reprocess")
     benchmark_queue = get_queue("benchmark")
+    wiki_queue = get_queue(WIKI_QUEUE_NAME)
     worker = SimpleWorker(
-        [queue.name, reprocess_queue.name, benchmark_queue.name],
+        [queue.name, reprocess_queue.name, benchmark_queue.name, wiki_queue.name],
         connection=get_redis_connection(),
         job_monitoring_interval=30,  # Vérifier les jobs toutes les 30s au lieu de 10s par défaut
     )
@@ -195,6 +284,7 @@ def main() -> None:
 
 
 __all__ = [
+    "preload_models",
     "run_worker",
     "main",
 ]
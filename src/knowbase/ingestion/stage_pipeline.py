@@ -0,0 +1,249 @@
+"""
+Pipeline à étages pour l'ingestion — recouvrement CPU / GPU / LLM / DB.
+
+Les workers traitaient un document à la fois, phase après phase : pendant
+les appels LLM du document N, l'encodeur et Neo4j restaient inactifs, et
+pendant la persistance le LLM ne servait à rien.
+
+StagePipeline enchaîne des étages reliés par des files bornées :
+
+    items → [étage 1 × c1] → file → [étage 2 × c2] → file → [étage 3 × c3] → on_done
+
+- chaque étage a sa propre concurrence (threads) ; un étage à 1 thread
+  traite les items dans l'ordre d'arrivée
+- les files sont bornées (queue_size) : un étage lent bloque l'amont
+  (backpressure), la mémoire reste bornée à quelques documents en vol
+- une exception dans un étage écarte l'item (on_error), les autres continuent
+- stop() arrête l'alimentation et abandonne les items pas encore entrés dans
+  le premier étage (circuit breaker) ; les items en vol terminent
+- le rapport donne, par étage, le temps occupé / l'utilisation et le débit
+  global en documents/heure
+
+Les étages sont des fonctions synchrones (clients LLM / Neo4j / Qdrant
+bloquants) : les threads suffisent, le GIL est relâché sur les I/O et
+dans les kernels d'encodage.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_SENTINEL = object()
+
+
+@dataclass
+class Stage:
+    """Étage du pipeline : fn(payload) → payload de l'étage suivant."""
+
+    name: str
+    fn: Callable[[Any], Any]
+    concurrency: int = 1
+
+
+@dataclass
+class StageStats:
+    """Compteurs d'un étage."""
+
+    name: str
+    concurrency: int
+    processed: int = 0
+    failed: int = 0
+    busy_s: float = 0.0
+
+    def utilization(self, wall_s: float) -> float:
+        """Part du temps où les threads de l'étage travaillaient (0..1)."""
+        capacity = wall_s * self.concurrency
+        return min(1.0, self.busy_s / capacity) if capacity > 0 else 0.0
+
+
+@dataclass
+class StagePipelineReport:
+    """Résultat d'une exécution du pipeline."""
+
+    stages: List[StageStats]
+    wall_s: float = 0.0
+    completed: int = 0
+    failed: int = 0
+    unstarted: List[Any] = field(default_factory=list)
+    stopped: bool = False
+
+    @property
+    def docs_per_hour(self) -> float:
+        return self.completed * 3600.0 / self.wall_s if self.wall_s > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_s": round(self.wall_s, 2),
+            "completed": self.completed,
+            "failed": self.failed,
+            "unstarted": len(self.unstarted),
+            "stopped": self.stopped,
+            "docs_per_hour": round(self.docs_per_hour, 1),
+            "stages": {
+                s.name: {
+                    "concurrency": s.concurrency,
+                    "processed": s.processed,
+                    "failed": s.failed,
+                    "busy_s": round(s.busy_s, 2),
+                    "utilization": round(s.utilization(self.wall_s), 3),
+                }
+                for s in self.stages
+            },
+        }
+
+
+class StagePipeline:
+    """
+    Exécute une séquence d'étages sur une liste d'items avec recouvrement.
+
+    Usage:
+        pipeline = StagePipeline([
+            Stage("extract", extract_fn),
+            Stage("persist", persist_fn, concurrency=2),
+        ], queue_size=2)
+        report = pipeline.run(doc_ids, on_done=..., on_error=...)
+
+    Les callbacks sont appelés sous un verrou commun (pas d'accès concurrent
+    aux compteurs de l'appelant) avec l'item d'origine :
+        on_done(item, dernier_payload)
+        on_error(item, nom_etage, exception)
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 2):
+        if not stages:
+            raise ValueError("StagePipeline requires at least one stage")
+        self.stages = list(stages)
+        self.queue_size = max(1, queue_size)
+        self._stop = threading.Event()
+        self._callback_lock = threading.Lock()
+
+    def stop(self) -> None:
+        """Arrête l'alimentation ; les items déjà dans un étage terminent."""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def run(
+        self,
+        items: Sequence[Any],
+        on_done: Optional[Callable[[Any, Any], None]] = None,
+        on_error: Optional[Callable[[Any, str, BaseException], None]] = None,
+    ) -> StagePipelineReport:
+        self._stop.clear()
+        report = StagePipelineReport(
+            stages=[StageStats(s.name, max(1, s.concurrency)) for s in self.stages]
+        )
+        stats_lock = threading.Lock()
+
+        # queues[i] alimente l'étage i ; l'étage i écrit dans queues[i + 1]
+        queues: List[queue.Queue] = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        alive = [s.concurrency for s in report.stages]
+        unstarted: List[Any] = []
+
+        def _callback(fn, *args) -> None:
+            if fn is None:
+                return
+            with self._callback_lock:
+                try:
+                    fn(*args)
+                except Exception as exc:
+                    logger.error(f"[OSMOSE:StagePipeline] Callback failed: {exc}", exc_info=True)
+
+        def _feeder() -> None:
+            fed = 0
+            for item in items:
+                if self._stop.is_set():
+                    break
+                queues[0].put((item, item))
+                fed += 1
+            with stats_lock:
+                unstarted.extend(items[fed:])
+            for _ in range(report.stages[0].concurrency):
+                queues[0].put(_SENTINEL)
+
+        def _worker(index: int) -> None:
+            stage = self.stages[index]
+            stats = report.stages[index]
+            inbox = queues[index]
+            last = index == len(self.stages) - 1
+            while True:
+                entry = inbox.get()
+                if entry is _SENTINEL:
+                    break
+                item, payload = entry
+                if index == 0 and self._stop.is_set():
+                    with stats_lock:
+                        unstarted.append(item)
+                    continue
+
+                t0 = time.perf_counter()
+                try:
+                    value = stage.fn(payload)
+                except Exception as exc:
+                    with stats_lock:
+                        stats.busy_s += time.perf_counter() - t0
+                        stats.failed += 1
+                        report.failed += 1
+                    _callback(on_error, item, stage.name, exc)
+                    continue
+                with stats_lock:
+                    stats.busy_s += time.perf_counter() - t0
+                    stats.processed += 1
+
+                if last:
+                    with stats_lock:
+                        report.completed += 1
+                    _callback(on_done, item, value)
+                else:
+                    queues[index + 1].put((item, value))
+
+            # Le dernier thread sorti propage la fin à l'étage suivant
+            with stats_lock:
+                alive[index] -= 1
+                finished = alive[index] == 0
+            if finished and not last:
+                for _ in range(report.stages[index + 1].concurrency):
+                    queues[index + 1].put(_SENTINEL)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=_feeder, name="stage-feeder", daemon=True)]
+        for index, stats in enumerate(report.stages):
+            for n in range(stats.concurrency):
+                threads.append(threading.Thread(
+                    target=_worker, args=(index,), name=f"stage-{stats.name}-{n}", daemon=True,
+                ))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report.wall_s = time.perf_counter() - start
+        report.unstarted = unstarted
+        report.stopped = self._stop.is_set()
+
+        logger.info(
+            f"[OSMOSE:StagePipeline] {report.completed}/{len(items)} completed, "
+            f"{report.failed} failed, {len(unstarted)} unstarted in {report.wall_s:.1f}s "
+            f"({report.docs_per_hour:.1f} docs/h) — "
+            + ", ".join(
+                f"{s.name}={s.utilization(report.wall_s):.0%}" for s in report.stages
+            )
+        )
+        return report
+
+
+__all__ = [
+    "Stage",
+    "StagePipeline",
+    "StagePipelineReport",
+    "StageStats",
+]
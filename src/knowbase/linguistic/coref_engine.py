@@ -17,11 +17,19 @@ Stratégie multilingue (engine-per-language):
 
 NOTE: Coreferee doit rester swappable sans douleur (dernier release 2022).
 
+Batch: resolve_texts(engine, texts) fait passer N textes (batches de sections
+d'un ou plusieurs documents) dans un seul flux nlp.pipe (batch_size /
+n_process configurables : COREF_PIPE_BATCH_SIZE, COREF_PIPE_N_PROCESS),
+avec le modèle déjà chargé (singletons par engine/langue). Les Doc sont
+convertis en clusters au fil de l'eau (mémoire bornée à un batch).
+
 Ref: doc/ongoing/IMPLEMENTATION_PLAN_ADR_COMPLETION.md - Section 10.5
 """
 
 import logging
+import os
 import re
+import sys
 import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
@@ -46,6 +54,15 @@ FASTCOREF_AVAILABLE = False
 _FASTCOREF_ENGINE_INSTANCE: Optional["FastCorefEngine"] = None
 _FASTCOREF_ENGINE_LOCK = None  # Initialisé à l'import threading
 
+# Coreferee : un modèle chargé par langue (spacy.load à chaque document sinon)
+_COREFEREE_ENGINES: Dict[str, "CorefereeEngine"] = {}
+_COREFEREE_ENGINES_LOCK = threading.Lock()
+
+# nlp.pipe : textes par batch et nombre de process (1 = in-process ; >1 charge
+# une copie du modèle par process, à réserver aux workers CPU avec la RAM)
+PIPE_BATCH_SIZE = int(os.getenv("COREF_PIPE_BATCH_SIZE", "4"))
+PIPE_N_PROCESS = int(os.getenv("COREF_PIPE_N_PROCESS", "1"))
+
 try:
     import spacy
     SPACY_COREF_AVAILABLE = True
@@ -96,11 +113,130 @@ class ICorefEngine(Protocol):
         """Nom de l'engine pour logging/audit."""
         ...
 
+    # Optionnel : resolve_batch(texts, lang, batch_size, n_process) -> List[List[CoreferenceCluster]]
+    # (utilisé par resolve_texts ; à défaut, resolve() est appelé texte par texte)
+
     def is_available(self) -> bool:
         """Vérifie si l'engine est disponible."""
         ...
 
 
+@dataclass
+class CorefBatchStats:
+    """Métriques d'un passage batch (segments/s, pic mémoire).
+
+    `texts` compte les segments envoyés à l'engine (un document long en
+    donne plusieurs), pas les documents.
+    """
+    texts: int = 0
+    chars: int = 0
+    elapsed_s: float = 0.0
+    peak_rss_mb: float = 0.0
+
+    @property
+    def segments_per_s(self) -> float:
+        return self.texts / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "texts": self.texts,
+            "chars": self.chars,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "segments_per_s": round(self.segments_per_s, 2),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+        }
+
+
+def peak_rss_mb() -> float:
+    """Pic RSS du process (+ process enfants nlp.pipe), en Mo. 0.0 si indisponible."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss : Ko sous Linux, octets sous macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def resolve_texts(
+    engine: "ICorefEngine",
+    texts: List[str],
+    lang: str = "en",
+    batch_size: Optional[int] = None,
+    n_process: Optional[int] = None,
+) -> Tuple[List[List[CoreferenceCluster]], CorefBatchStats]:
+    """
+    Résout une liste de textes en un seul passage.
+
+    Returns:
+        (clusters par texte, dans l'ordre de `texts` ; stats du passage)
+    """
+    start = time.time()
+    if not texts:
+        results: List[List[CoreferenceCluster]] = []
+    elif hasattr(engine, "resolve_batch"):
+        results = engine.resolve_batch(texts, lang=lang, batch_size=batch_size, n_process=n_process)
+    else:
+        results = [engine.resolve(document_text=text, chunks=[], lang=lang) for text in texts]
+
+    stats = CorefBatchStats(
+        texts=len(texts),
+        chars=sum(len(t) for t in texts),
+        elapsed_s=time.time() - start,
+        peak_rss_mb=peak_rss_mb(),
+    )
+    logger.info(
+        f"[OSMOSE:CorefEngine] {getattr(engine, 'engine_name', type(engine).__name__)} batch: "
+        f"{stats.texts} texts, {stats.chars:,} chars, {stats.segments_per_s:.2f} segments/s, "
+        f"peak RSS {stats.peak_rss_mb:.0f} MB"
+    )
+    return results, stats
+
+
+class _SpacyPipeMixin:
+    """
+    resolve_batch commun aux engines spaCy (FastCoref, spaCy coref, Coreferee).
+
+    Les sous-classes fournissent _nlp, is_available(), _name et
+    _clusters_from_doc(doc, text).
+    """
+
+    def resolve_batch(
+        self,
+        texts: List[str],
+        lang: str = "en",
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[List[CoreferenceCluster]]:
+        """Résout `texts` via nlp.pipe (un Doc converti puis libéré à la fois)."""
+        if not texts:
+            return []
+        if not self.is_available():
+            logger.warning(f"[OSMOSE:{type(self).__name__}] Not available, returning empty")
+            return [[] for _ in texts]
+
+        results: List[List[CoreferenceCluster]] = []
+        try:
+            docs = self._nlp.pipe(
+                texts,
+                batch_size=batch_size or PIPE_BATCH_SIZE,
+                n_process=n_process or PIPE_N_PROCESS,
+            )
+            for text, doc in zip(texts, docs):
+                results.append(self._clusters_from_doc(doc, text))
+        except Exception as e:
+            logger.error(
+                f"[OSMOSE:{type(self).__name__}] Batch error after {len(results)}/{len(texts)} "
+                f"texts, falling back to per-text resolve: {e}"
+            )
+            for text in texts[len(results):]:
+                results.append(self.resolve(document_text=text, chunks=[], lang=lang))
+        return results
+
+
 class RuleBasedEngine:
     """
     Engine de coréférence basé sur des règles heuristiques.
@@ -297,7 +433,7 @@ class RuleBasedEngine:
         return candidates[0] if candidates else None
 
 
-class FastCorefEngine:
+class FastCorefEngine(_SpacyPipeMixin):
     """
     Engine de coréférence basé sur FastCoref.
 
@@ -369,31 +505,7 @@ class FastCorefEngine:
 
         try:
             doc = self._nlp(document_text)
-
-            # FastCoref stocke les clusters dans doc._.coref_clusters
-            # Format: [[(start1, end1), (start2, end2), ...], ...]
-            if hasattr(doc._, 'coref_clusters') and doc._.coref_clusters:
-                for cluster_spans in doc._.coref_clusters:
-                    mentions = []
-                    for span_start, span_end in cluster_spans:
-                        span_text = document_text[span_start:span_end]
-                        mentions.append({
-                            "start": span_start,
-                            "end": span_end,
-                            "text": span_text,
-                            "sentence_idx": 0,  # TODO: calculer
-                        })
-
-                    if len(mentions) >= 2:
-                        # Le premier mention est généralement le représentant
-                        cluster = CoreferenceCluster(
-                            mentions=mentions,
-                            representative_idx=0,
-                            confidence=0.85,
-                            method=self._name,
-                        )
-                        clusters.append(cluster)
-
+            clusters = self._clusters_from_doc(doc, document_text)
         except Exception as e:
             logger.error(f"[OSMOSE:FastCorefEngine] Error: {e}")
 
@@ -404,6 +516,35 @@ class FastCorefEngine:
 
         return clusters
 
+    def _clusters_from_doc(self, doc, document_text: str) -> List[CoreferenceCluster]:
+        clusters: List[CoreferenceCluster] = []
+
+        # FastCoref stocke les clusters dans doc._.coref_clusters
+        # Format: [[(start1, end1), (start2, end2), ...], ...]
+        if hasattr(doc._, 'coref_clusters') and doc._.coref_clusters:
+            for cluster_spans in doc._.coref_clusters:
+                mentions = []
+                for span_start, span_end in cluster_spans:
+                    span_text = document_text[span_start:span_end]
+                    mentions.append({
+                        "start": span_start,
+                        "end": span_end,
+                        "text": span_text,
+                        "sentence_idx": 0,  # TODO: calculer
+                    })
+
+                if len(mentions) >= 2:
+                    # Le premier mention est généralement le représentant
+                    cluster = CoreferenceCluster(
+                        mentions=mentions,
+                        representative_idx=0,
+                        confidence=0.85,
+                        method=self._name,
+                    )
+                    clusters.append(cluster)
+
+        return clusters
+
 
 def get_fastcoref_engine() -> Optional[FastCorefEngine]:
     """
@@ -439,7 +580,7 @@ def get_fastcoref_engine() -> Optional[FastCorefEngine]:
     return _FASTCOREF_ENGINE_INSTANCE
 
 
-class SpacyCorefEngine:
+class SpacyCorefEngine(_SpacyPipeMixin):
     """
     Engine de coréférence basé sur spaCy Transformer.
 
@@ -511,53 +652,7 @@ class SpacyCorefEngine:
 
         try:
             doc = self._nlp(document_text)
-
-            # Vérifier si le doc a des span groups de coréférence
-            if hasattr(doc, 'spans') and 'coref_clusters' in doc.spans:
-                # Modèle avec coréférence native
-                for cluster_spans in doc.spans['coref_clusters']:
-                    mentions = []
-                    for span in cluster_spans:
-                        mentions.append({
-                            "start": span.start_char,
-                            "end": span.end_char,
-                            "text": span.text,
-                            "sentence_idx": span.sent.start if span.sent else 0,
-                        })
-
-                    if len(mentions) >= 2:
-                        cluster = CoreferenceCluster(
-                            mentions=mentions,
-                            representative_idx=0,
-                            confidence=0.85,
-                            method=self._name,
-                        )
-                        clusters.append(cluster)
-            else:
-                # Fallback: utiliser les entités nommées
-                # Grouper les entités avec le même texte
-                entity_groups: Dict[str, List[Dict]] = {}
-                for ent in doc.ents:
-                    key = ent.text.lower()
-                    if key not in entity_groups:
-                        entity_groups[key] = []
-                    entity_groups[key].append({
-                        "start": ent.start_char,
-                        "end": ent.end_char,
-                        "text": ent.text,
-                        "sentence_idx": ent.sent.start if ent.sent else 0,
-                    })
-
-                for key, mentions in entity_groups.items():
-                    if len(mentions) >= 2:
-                        cluster = CoreferenceCluster(
-                            mentions=mentions,
-                            representative_idx=0,
-                            confidence=0.7,
-                            method=f"{self._name}_ner_fallback",
-                        )
-                        clusters.append(cluster)
-
+            clusters = self._clusters_from_doc(doc, document_text)
         except Exception as e:
             logger.error(f"[OSMOSE:SpacyCorefEngine] Error: {e}")
 
@@ -568,8 +663,59 @@ class SpacyCorefEngine:
 
         return clusters
 
+    def _clusters_from_doc(self, doc, document_text: str) -> List[CoreferenceCluster]:
+        clusters: List[CoreferenceCluster] = []
+
+        # Vérifier si le doc a des span groups de coréférence
+        if hasattr(doc, 'spans') and 'coref_clusters' in doc.spans:
+            # Modèle avec coréférence native
+            for cluster_spans in doc.spans['coref_clusters']:
+                mentions = []
+                for span in cluster_spans:
+                    mentions.append({
+                        "start": span.start_char,
+                        "end": span.end_char,
+                        "text": span.text,
+                        "sentence_idx": span.sent.start if span.sent else 0,
+                    })
 
-class CorefereeEngine:
+                if len(mentions) >= 2:
+                    cluster = CoreferenceCluster(
+                        mentions=mentions,
+                        representative_idx=0,
+                        confidence=0.85,
+                        method=self._name,
+                    )
+                    clusters.append(cluster)
+        else:
+            # Fallback: utiliser les entités nommées
+            # Grouper les entités avec le même texte
+            entity_groups: Dict[str, List[Dict]] = {}
+            for ent in doc.ents:
+                key = ent.text.lower()
+                if key not in entity_groups:
+                    entity_groups[key] = []
+                entity_groups[key].append({
+                    "start": ent.start_char,
+                    "end": ent.end_char,
+                    "text": ent.text,
+                    "sentence_idx": ent.sent.start if ent.sent else 0,
+                })
+
+            for key, mentions in entity_groups.items():
+                if len(mentions) >= 2:
+                    cluster = CoreferenceCluster(
+                        mentions=mentions,
+                        representative_idx=0,
+                        confidence=0.7,
+                        method=f"{self._name}_ner_fallback",
+                    )
+                    clusters.append(cluster)
+
+        return clusters
+
+
+class CorefereeEngine(_SpacyPipeMixin):
     """
     Engine de coréférence basé sur Coreferee.
 
@@ -652,38 +798,7 @@ class CorefereeEngine:
 
         try:
             doc = self._nlp(document_text)
-
-            if hasattr(doc._, 'coref_chains') and doc._.coref_chains:
-                for chain in doc._.coref_chains:
-                    mentions = []
-                    for mention in chain:
-                        # Coreferee retourne des indices de tokens
-                        token_indices = mention.token_indexes
-                        if not token_indices:
-                            continue
-
-                        start_token = doc[token_indices[0]]
-                        end_token = doc[token_indices[-1]]
-
-                        mentions.append({
-                            "start": start_token.idx,
-                            "end": end_token.idx + len(end_token.text),
-                            "text": doc[token_indices[0]:token_indices[-1]+1].text,
-                            "sentence_idx": start_token.sent.start if start_token.sent else 0,
-                        })
-
-                    if len(mentions) >= 2:
-                        # Trouver le représentant (mention la plus longue)
-                        rep_idx = max(range(len(mentions)), key=lambda i: len(mentions[i]["text"]))
-
-                        cluster = CoreferenceCluster(
-                            mentions=mentions,
-                            representative_idx=rep_idx,
-                            confidence=0.8,
-                            method=self._name,
-                        )
-                        clusters.append(cluster)
-
+            clusters = self._clusters_from_doc(doc, document_text)
         except Exception as e:
             logger.error(f"[OSMOSE:CorefereeEngine] Error: {e}")
 
@@ -694,6 +809,55 @@ class CorefereeEngine:
 
         return clusters
 
+    def _clusters_from_doc(self, doc, document_text: str) -> List[CoreferenceCluster]:
+        clusters: List[CoreferenceCluster] = []
+
+        if hasattr(doc._, 'coref_chains') and doc._.coref_chains:
+            for chain in doc._.coref_chains:
+                mentions = []
+                for mention in chain:
+                    # Coreferee retourne des indices de tokens
+                    token_indices = mention.token_indexes
+                    if not token_indices:
+                        continue
+
+                    start_token = doc[token_indices[0]]
+                    end_token = doc[token_indices[-1]]
+
+                    mentions.append({
+                        "start": start_token.idx,
+                        "end": end_token.idx + len(end_token.text),
+                        "text": doc[token_indices[0]:token_indices[-1]+1].text,
+                        "sentence_idx": start_token.sent.start if start_token.sent else 0,
+                    })
+
+                if len(mentions) >= 2:
+                    # Trouver le représentant (mention la plus longue)
+                    rep_idx = max(range(len(mentions)), key=lambda i: len(mentions[i]["text"]))
+
+                    cluster = CoreferenceCluster(
+                        mentions=mentions,
+                        representative_idx=rep_idx,
+                        confidence=0.8,
+                        method=self._name,
+                    )
+                    clusters.append(cluster)
+
+        return clusters
+
+
+def get_coreferee_engine(lang: str) -> "CorefereeEngine":
+    """Instance CorefereeEngine partagée par langue (modèle chargé une fois)."""
+    engine = _COREFEREE_ENGINES.get(lang)
+    if engine is None:
+        with _COREFEREE_ENGINES_LOCK:
+            engine = _COREFEREE_ENGINES.get(lang)
+            if engine is None:
+                engine = CorefereeEngine(lang=lang)
+                engine.is_available()
+                _COREFEREE_ENGINES[lang] = engine
+    return engine
+
 
 # Registry des engines par langue
 _ENGINE_REGISTRY: Dict[str, type] = {}
@@ -734,7 +898,7 @@ def get_engine_for_language(lang: str) -> ICorefEngine:
 
         # 2. Fallback Coreferee
         if COREFEREE_AVAILABLE:
-            coreferee_engine = CorefereeEngine(lang="en")
+            coreferee_engine = get_coreferee_engine("en")
             if coreferee_engine.is_available():
                 logger.info("[OSMOSE:CorefEngine] Using Coreferee for EN (fallback)")
                 return coreferee_engine
@@ -746,7 +910,7 @@ def get_engine_for_language(lang: str) -> ICorefEngine:
     # Français/Allemand: Coreferee ou rule-based
     if lang in ("fr", "de"):
         if COREFEREE_AVAILABLE:
-            engine = CorefereeEngine(lang=lang)
+            engine = get_coreferee_engine(lang)
             if engine.is_available():
                 logger.info(f"[OSMOSE:CorefEngine] Using Coreferee for {lang}")
                 return engine
@@ -6,25 +6,44 @@ Gestion des sessions de conversation avec:
 - LangChain Memory wrapper pour auto-summarization
 - Context Resolver pour références implicites
 - Intelligent Summarizer pour comptes-rendus métier
+
+Les sous-modules sont importés à la demande (PEP 562) : importer
+knowbase.memory.session_memory_store ne charge ni session_manager ni
+knowbase.db (et donc pas get_settings()).
 """
 
-from knowbase.memory.session_manager import (
-    SessionManager,
-    MessageData,
-    get_session_manager
-)
-from knowbase.memory.context_resolver import (
-    ContextResolver,
-    ResolvedReference,
-    ContextState,
-    get_context_resolver
-)
-from knowbase.memory.intelligent_summarizer import (
-    IntelligentSummarizer,
-    SessionSummary,
-    SummaryFormat,
-    get_intelligent_summarizer
-)
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_LAZY_EXPORTS = {
+    "SessionManager": ".session_manager",
+    "MessageData": ".session_manager",
+    "get_session_manager": ".session_manager",
+    "ContextResolver": ".context_resolver",
+    "ResolvedReference": ".context_resolver",
+    "ContextState": ".context_resolver",
+    "get_context_resolver": ".context_resolver",
+    "IntelligentSummarizer": ".intelligent_summarizer",
+    "SessionSummary": ".intelligent_summarizer",
+    "SummaryFormat": ".intelligent_summarizer",
+    "get_intelligent_summarizer": ".intelligent_summarizer",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "SessionManager",
@@ -5,7 +5,8 @@ Phase 2.5 - Memory Layer
 
 Architecture:
 - Persistence: PostgreSQL via SQLAlchemy (Session, SessionMessage models)
-- Memory: LangChain ConversationSummaryBufferMemory pour auto-summarization
+- Memory: SessionMemoryStore (résumé + fenêtre récente partagés via Redis,
+  LRU local borné) ; résumé incrémental via LangChain
 - Token Management: Limite configurable avec summarization automatique
 """
 
@@ -13,6 +14,7 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 from datetime import datetime, timezone
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
@@ -21,10 +23,9 @@ from sqlalchemy.orm import Session as DBSession
 from sqlalchemy import desc
 
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain.memory import ConversationSummaryBufferMemory
-from langchain_openai import ChatOpenAI
 
 from knowbase.common.llm_router import get_llm_router, TaskType
+from knowbase.memory.session_memory_store import SessionMemoryStore
 from knowbase.db.base import SessionLocal
 from knowbase.db.models import Session, SessionMessage, User
 from knowbase.config.settings import get_settings
@@ -86,8 +87,8 @@ class SessionManager:
         self.max_token_limit = max_token_limit
         self.summary_model = summary_model
 
-        # Cache des LangChain Memory par session (en mémoire)
-        self._memory_cache: Dict[str, ConversationSummaryBufferMemory] = {}
+        # Mémoire de conversation (Redis partagé + LRU local borné)
+        self._memory_store = SessionMemoryStore(summarizer=self._summarize_messages)
 
         logger.info(f"[SessionManager] Initialized with max_tokens={max_token_limit}")
 
@@ -107,6 +108,8 @@ class SessionManager:
             except ImportError:
                 logger.warning("[SessionManager] langchain_ollama not installed, falling back to ChatOpenAI")
 
+        from langchain_openai import ChatOpenAI
+
         return ChatOpenAI(model=self.summary_model, temperature=0)
 
     # =========================================================================
@@ -215,9 +218,8 @@ class SessionManager:
                 session.is_active = False
                 db.commit()
 
-                # Nettoyer le cache mémoire
-                if session_id in self._memory_cache:
-                    del self._memory_cache[session_id]
+                # Nettoyer la mémoire de conversation
+                self._memory_store.invalidate(session_id)
 
                 logger.info(f"[SessionManager] Archived session {session_id}")
                 return True
@@ -242,9 +244,8 @@ class SessionManager:
                 db.delete(session)  # CASCADE delete messages
                 db.commit()
 
-                # Nettoyer le cache mémoire
-                if session_id in self._memory_cache:
-                    del self._memory_cache[session_id]
+                # Nettoyer la mémoire de conversation
+                self._memory_store.invalidate(session_id)
 
                 logger.info(f"[SessionManager] Deleted session {session_id}")
                 return True
@@ -425,48 +426,33 @@ class SessionManager:
     # LangChain Memory Integration
     # =========================================================================
 
-    def _get_or_create_memory(self, session_id: str, db: DBSession) -> ConversationSummaryBufferMemory:
-        """
-        Obtient ou crée le LangChain Memory pour une session.
-
-        Args:
-            session_id: UUID de la session
-            db: Session DB active
-
-        Returns:
-            ConversationSummaryBufferMemory configuré
-        """
-        if session_id not in self._memory_cache:
-            # Créer le LLM langchain selon le mode actif
-            llm = self._get_langchain_llm()
-
-            memory = ConversationSummaryBufferMemory(
-                llm=llm,
-                max_token_limit=self.max_token_limit,
-                return_messages=True
-            )
-
-            # Charger l'historique existant depuis DB
+    def _memory_loader(self, session_id: str, db: DBSession):
+        """Loader PostgreSQL du SessionMemoryStore (résumé + fenêtre récente)."""
+        def load():
             session = db.query(Session).filter(Session.id == session_id).first()
-            if session and session.summary:
-                # Restaurer le résumé existant
-                memory.moving_summary_buffer = session.summary
-
-            # Charger les messages récents (non résumés)
             recent_messages = db.query(SessionMessage).filter(
                 SessionMessage.session_id == session_id
-            ).order_by(SessionMessage.created_at).limit(50).all()
-
-            for msg in recent_messages:
-                if msg.role == "user":
-                    memory.chat_memory.add_user_message(msg.content)
-                elif msg.role == "assistant":
-                    memory.chat_memory.add_ai_message(msg.content)
-
-            self._memory_cache[session_id] = memory
-            logger.debug(f"[SessionManager] Created LangChain Memory for session {session_id}")
-
-        return self._memory_cache[session_id]
+            ).order_by(desc(SessionMessage.created_at)).limit(self._memory_store.window).all()[::-1]
+            return (
+                session.summary if session else None,
+                [{"role": msg.role, "content": msg.content} for msg in recent_messages],
+            )
+        return load
+
+    def _summarize_messages(self, previous_summary: str, messages: List[Dict[str, str]]) -> str:
+        """Replie des messages dans le résumé (résumé progressif LangChain)."""
+        # Import différé : langchain.memory tire transformers (~4s au démarrage API)
+        from langchain.memory import ConversationSummaryBufferMemory
+
+        memory = ConversationSummaryBufferMemory(
+            llm=self._get_langchain_llm(),
+            max_token_limit=self.max_token_limit,
+        )
+        lc_messages = [
+            HumanMessage(content=m["content"]) if m["role"] == "user" else AIMessage(content=m["content"])
+            for m in messages
+        ]
+        return memory.predict_new_summary(lc_messages, previous_summary)
 
     def _update_langchain_memory(
         self,
@@ -475,29 +461,32 @@ class SessionManager:
         db: DBSession
     ) -> None:
         """
-        Met à jour le LangChain Memory avec un nouveau message.
+        Met à jour la mémoire de conversation avec un nouveau message.
 
         Args:
             session_id: UUID de la session
-            message: Message ajouté
+            message: Message ajouté (déjà committé)
             db: Session DB active
         """
         try:
-            memory = self._get_or_create_memory(session_id, db)
+            summary = self._memory_store.append(
+                session_id, message.role, message.content,
+                self._memory_loader(session_id, db),
+            )
 
-            if message.role == "user":
-                memory.chat_memory.add_user_message(message.content)
-            elif message.role == "assistant":
-                memory.chat_memory.add_ai_message(message.content)
-
-            # Persister le résumé mis à jour
-            session = db.query(Session).filter(Session.id == session_id).first()
-            if session and hasattr(memory, 'moving_summary_buffer'):
-                session.summary = memory.moving_summary_buffer
-                db.commit()
+            # Persister le résumé mis à jour (uniquement après un repli)
+            if summary is not None:
+                session = db.query(Session).filter(Session.id == session_id).first()
+                if session:
+                    session.summary = summary
+                    db.commit()
 
         except Exception as e:
-            logger.error(f"[SessionManager] Error updating LangChain Memory: {e}")
+            logger.error(f"[SessionManager] Error updating conversation memory: {e}")
+
+    def get_memory_stats(self) -> Dict[str, Any]:
+        """Métriques du cache de mémoire de conversation."""
+        return self._memory_store.stats()
 
     # =========================================================================
     # Context for LLM
@@ -575,8 +564,11 @@ class SessionManager:
         """
         db = SessionLocal()
         try:
-            memory = self._get_or_create_memory(session_id, db)
-            return memory.chat_memory.messages
+            memory = self._memory_store.get(session_id, self._memory_loader(session_id, db))
+            return [
+                HumanMessage(content=m["content"]) if m["role"] == "user" else AIMessage(content=m["content"])
+                for m in memory.messages
+            ]
         finally:
             db.close()
 
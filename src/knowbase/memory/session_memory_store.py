@@ -0,0 +1,401 @@
+"""
+SessionMemoryStore - Mémoire de conversation bornée et partagée entre workers.
+
+Phase 2.5 - Memory Layer
+
+Remplace le cache {session_id: ConversationSummaryBufferMemory} non borné
+de SessionManager :
+
+- Redis (partagé entre workers API) : par session, une fenêtre des N derniers
+  messages (list) + un hash {summary, ver}. TTL glissant.
+- LRU local (par process) borné en taille et en inactivité ; une entrée
+  locale n'est servie que si sa version == ver Redis (1 HGET par lecture).
+- Chargement paresseux : à la première lecture, résumé + fenêtre sont
+  chargés depuis PostgreSQL (loader fourni par l'appelant) puis publiés.
+- Mise à jour incrémentale à chaque add_message : RPUSH + HINCRBY ver ;
+  quand la fenêtre dépasse window + summary_batch, les messages les plus
+  anciens sont repliés dans le résumé (1 appel summarizer par batch).
+  Un seul worker replie une session à la fois (verrou SET NX) et les
+  messages ne sont retirés de la fenêtre qu'une fois le nouveau résumé
+  écrit : un résumé en échec ne perd aucun message.
+
+Sans Redis, le store fonctionne en LRU local seul (résumés non partagés).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REDIS_PREFIX = "osmose:session_mem"
+DEFAULT_WINDOW = int(os.getenv("SESSION_MEMORY_WINDOW", "50"))
+DEFAULT_MAX_SESSIONS = int(os.getenv("SESSION_MEMORY_LRU_MAX", "256"))
+DEFAULT_IDLE_TTL_S = float(os.getenv("SESSION_MEMORY_IDLE_TTL_S", "900"))
+DEFAULT_REDIS_TTL_S = int(os.getenv("SESSION_MEMORY_REDIS_TTL_S", str(7 * 24 * 3600)))
+DEFAULT_SUMMARY_BATCH = int(os.getenv("SESSION_MEMORY_SUMMARY_BATCH", "10"))
+# Durée max d'un repli (appel summarizer compris) avant expiration du verrou
+FOLD_LOCK_S = int(os.getenv("SESSION_MEMORY_FOLD_LOCK_S", "120"))
+
+# loader() -> (summary, derniers messages [{"role", "content"}] en ordre chronologique)
+MemoryLoader = Callable[[], Tuple[Optional[str], List[Dict[str, str]]]]
+# summarizer(résumé précédent, messages à replier) -> nouveau résumé
+Summarizer = Callable[[str, List[Dict[str, str]]], str]
+
+
+@dataclass
+class SessionMemory:
+    """Vue mémoire d'une session : résumé + fenêtre de messages récents."""
+    summary: str = ""
+    messages: List[Dict[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class _CachedMemory:
+    summary: str
+    messages: Deque[Dict[str, str]]
+    version: int
+    last_access: float
+
+
+class SessionMemoryStore:
+    """
+    Mémoire de sessions : LRU local borné + état partagé Redis.
+
+    Usage:
+        store = SessionMemoryStore(summarizer=my_summarizer)
+        memory = store.get(session_id, loader)
+        new_summary = store.append(session_id, "user", "Hello", loader)
+    """
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        window: int = DEFAULT_WINDOW,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_ttl_s: float = DEFAULT_IDLE_TTL_S,
+        redis_ttl_s: int = DEFAULT_REDIS_TTL_S,
+        summary_batch: int = DEFAULT_SUMMARY_BATCH,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        """
+        Args:
+            redis_client: Client redis-py (decode_responses=True). None = client
+                partagé get_redis_client() résolu au premier usage.
+            window: Nombre de messages récents conservés tels quels
+            max_sessions: Taille max du LRU local
+            idle_ttl_s: Inactivité max d'une entrée locale
+            redis_ttl_s: TTL glissant des clés Redis
+            summary_batch: Débordement toléré avant repli dans le résumé
+            summarizer: Fonction de résumé incrémental (None = messages
+                débordants simplement abandonnés, toujours en PostgreSQL)
+        """
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self.window = window
+        self.max_sessions = max_sessions
+        self.idle_ttl_s = idle_ttl_s
+        self.redis_ttl_s = redis_ttl_s
+        self.summary_batch = summary_batch
+        self.summarizer = summarizer
+
+        self._local: "OrderedDict[str, _CachedMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "redis_loads": 0,
+            "db_loads": 0,
+            "evictions": 0,
+            "summaries": 0,
+        }
+
+    # =========================================================================
+    # API
+    # =========================================================================
+
+    def get(self, session_id: str, loader: MemoryLoader) -> SessionMemory:
+        """Résumé + fenêtre récente d'une session (chargés paresseusement)."""
+        redis = self._get_redis()
+        cached = self._local_get(session_id)
+
+        if redis is None:
+            if cached is not None:
+                return self._hit(cached)
+            return self._miss(self._load_from_db(session_id, loader, redis=None))
+
+        try:
+            version = redis.hget(self._meta_key(session_id), "ver")
+            if version is None:
+                return self._miss(self._load_from_db(session_id, loader, redis))
+            if cached is not None and cached.version == int(version):
+                return self._hit(cached)
+            return self._miss(self._load_from_redis(session_id, redis))
+        except Exception as e:
+            logger.warning(f"[SessionMemory] Redis read failed for {session_id}: {e}")
+            if cached is not None:
+                return self._hit(cached)
+            return self._miss(self._load_from_db(session_id, loader, redis=None))
+
+    def append(
+        self,
+        session_id: str,
+        role: str,
+        content: str,
+        loader: MemoryLoader,
+    ) -> Optional[str]:
+        """
+        Ajoute un message (déjà persisté en PostgreSQL) à la mémoire.
+
+        Returns:
+            Nouveau résumé si un repli a eu lieu (à persister), sinon None
+        """
+        if role not in ("user", "assistant"):
+            return None
+        message = {"role": role, "content": content}
+        redis = self._get_redis()
+
+        if redis is None:
+            return self._append_local_only(session_id, message, loader)
+
+        try:
+            meta_key, win_key = self._meta_key(session_id), self._win_key(session_id)
+            if not redis.exists(meta_key):
+                # Premier accès : le loader voit déjà le message committé
+                self._load_from_db(session_id, loader, redis)
+                return None
+
+            pipe = redis.pipeline(transaction=True)
+            pipe.rpush(win_key, json.dumps(message))
+            pipe.hincrby(meta_key, "ver", 1)
+            pipe.expire(win_key, self.redis_ttl_s)
+            pipe.expire(meta_key, self.redis_ttl_s)
+            length, version = pipe.execute()[:2]
+
+            with self._lock:
+                cached = self._local.get(session_id)
+                if cached is not None and cached.version == version - 1:
+                    cached.messages.append(message)
+                    cached.version = version
+                else:
+                    self._local.pop(session_id, None)
+
+            if length > self.window + self.summary_batch:
+                return self._fold_redis(session_id, redis)
+            return None
+        except Exception as e:
+            logger.warning(f"[SessionMemory] Redis append failed for {session_id}: {e}")
+            self.invalidate(session_id, shared=False)
+            return None
+
+    def invalidate(self, session_id: str, shared: bool = True) -> None:
+        """Oublie la mémoire d'une session (archive / suppression)."""
+        with self._lock:
+            self._local.pop(session_id, None)
+        redis = self._get_redis() if shared else None
+        if redis is not None:
+            try:
+                redis.delete(self._meta_key(session_id), self._win_key(session_id))
+            except Exception as e:
+                logger.warning(f"[SessionMemory] Redis invalidate failed for {session_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Métriques du cache (hits locaux, chargements Redis/DB, évictions)."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "cached_sessions": len(self._local),
+                "max_sessions": self.max_sessions,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "shared": self._get_redis() is not None,
+            }
+
+    # =========================================================================
+    # Chargements
+    # =========================================================================
+
+    def _load_from_db(self, session_id: str, loader: MemoryLoader, redis) -> _CachedMemory:
+        summary, messages = loader()
+        summary = summary or ""
+        messages = [m for m in messages if m.get("role") in ("user", "assistant")][-self.window:]
+        version = 1
+        if redis is not None:
+            meta_key, win_key = self._meta_key(session_id), self._win_key(session_id)
+            pipe = redis.pipeline(transaction=True)
+            pipe.delete(win_key)
+            if messages:
+                pipe.rpush(win_key, *[json.dumps(m) for m in messages])
+            pipe.hset(meta_key, mapping={"summary": summary, "ver": version})
+            pipe.expire(win_key, self.redis_ttl_s)
+            pipe.expire(meta_key, self.redis_ttl_s)
+            pipe.execute()
+        with self._lock:
+            self._stats["db_loads"] += 1
+        return self._local_put(session_id, summary, messages, version)
+
+    def _load_from_redis(self, session_id: str, redis) -> _CachedMemory:
+        pipe = redis.pipeline(transaction=True)
+        pipe.hgetall(self._meta_key(session_id))
+        pipe.lrange(self._win_key(session_id), 0, -1)
+        meta, raw_messages = pipe.execute()
+        with self._lock:
+            self._stats["redis_loads"] += 1
+        return self._local_put(
+            session_id,
+            meta.get("summary", ""),
+            [json.loads(m) for m in raw_messages],
+            int(meta.get("ver", 0)),
+        )
+
+    # =========================================================================
+    # Repli dans le résumé
+    # =========================================================================
+
+    def _fold_redis(self, session_id: str, redis) -> Optional[str]:
+        meta_key, win_key = self._meta_key(session_id), self._win_key(session_id)
+        lock_key = f"{meta_key}:folding"
+        # Un autre worker replie déjà : il reprendra aussi nos messages en trop
+        if not redis.set(lock_key, "1", nx=True, ex=FOLD_LOCK_S):
+            return None
+        try:
+            pipe = redis.pipeline(transaction=True)
+            pipe.llen(win_key)
+            pipe.hget(meta_key, "summary")
+            length, previous = pipe.execute()
+            overflow = length - self.window
+            if overflow <= 0:
+                return None
+
+            folded = [json.loads(m) for m in redis.lrange(win_key, 0, overflow - 1)]
+            summary = self._summarize(session_id, previous or "", folded)
+            if summary is None:
+                return None  # messages gardés dans la fenêtre, repli au prochain append
+
+            # Seules les appends (RPUSH, à droite) concurrencent le repli :
+            # les `overflow` premiers messages sont toujours ceux résumés
+            pipe = redis.pipeline(transaction=True)
+            pipe.hset(meta_key, "summary", summary)
+            pipe.ltrim(win_key, overflow, -1)
+            pipe.hincrby(meta_key, "ver", 1)
+            pipe.execute()
+        finally:
+            try:
+                redis.delete(lock_key)
+            except Exception:
+                pass
+        with self._lock:
+            self._local.pop(session_id, None)
+        return summary
+
+    def _append_local_only(self, session_id: str, message: Dict[str, str], loader: MemoryLoader) -> Optional[str]:
+        cached = self._local_get(session_id)
+        if cached is None:
+            self._load_from_db(session_id, loader, redis=None)
+            return None
+        with self._lock:
+            cached.messages.append(message)
+            cached.version += 1
+            if len(cached.messages) <= self.window + self.summary_batch:
+                return None
+            folded = [cached.messages.popleft() for _ in range(len(cached.messages) - self.window)]
+            previous = cached.summary
+        summary = self._summarize(session_id, previous, folded)
+        with self._lock:
+            if summary is None:
+                cached.messages.extendleft(reversed(folded))
+                return None
+            cached.summary = summary
+        return summary
+
+    def _summarize(self, session_id: str, previous: str, folded: List[Dict[str, str]]) -> Optional[str]:
+        """Nouveau résumé, ou None si le summarizer a échoué (rien à retirer)."""
+        if self.summarizer is None or not folded:
+            return previous
+        try:
+            summary = self.summarizer(previous, folded)
+        except Exception as e:
+            logger.warning(f"[SessionMemory] Summarization failed for {session_id}: {e}")
+            return None
+        with self._lock:
+            self._stats["summaries"] += 1
+        logger.debug(f"[SessionMemory] Folded {len(folded)} messages into summary of {session_id}")
+        return summary
+
+    # =========================================================================
+    # LRU local
+    # =========================================================================
+
+    def _local_get(self, session_id: str) -> Optional[_CachedMemory]:
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            cached = self._local.get(session_id)
+            if cached is None:
+                return None
+            cached.last_access = now
+            self._local.move_to_end(session_id)
+            return cached
+
+    def _local_put(self, session_id: str, summary: str, messages: List[Dict[str, str]], version: int) -> _CachedMemory:
+        now = time.monotonic()
+        cached = _CachedMemory(
+            summary=summary,
+            messages=deque(messages, maxlen=self.window + self.summary_batch + 1),
+            version=version,
+            last_access=now,
+        )
+        with self._lock:
+            self._local[session_id] = cached
+            self._local.move_to_end(session_id)
+            self._evict(now)
+        return cached
+
+    def _evict(self, now: float) -> None:
+        # Ordre OrderedDict = ordre du dernier accès → l'entrée la plus ancienne en tête
+        while self._local:
+            oldest_id, oldest = next(iter(self._local.items()))
+            if len(self._local) <= self.max_sessions and now - oldest.last_access <= self.idle_ttl_s:
+                break
+            del self._local[oldest_id]
+            self._stats["evictions"] += 1
+
+    # =========================================================================
+    # Helpers
+    # =========================================================================
+
+    def _get_redis(self):
+        if not self._redis_resolved:
+            self._redis_resolved = True
+            try:
+                from knowbase.common.clients.redis_client import get_redis_client
+                self._redis = get_redis_client().client
+            except Exception as e:
+                logger.warning(f"[SessionMemory] Redis unavailable, local-only memory: {e}")
+                self._redis = None
+        return self._redis
+
+    def _hit(self, cached: _CachedMemory) -> SessionMemory:
+        with self._lock:
+            self._stats["hits"] += 1
+            return SessionMemory(summary=cached.summary, messages=list(cached.messages))
+
+    def _miss(self, cached: _CachedMemory) -> SessionMemory:
+        with self._lock:
+            self._stats["misses"] += 1
+            return SessionMemory(summary=cached.summary, messages=list(cached.messages))
+
+    @staticmethod
+    def _meta_key(session_id: str) -> str:
+        return f"{REDIS_PREFIX}:{session_id}:meta"
+
+    @staticmethod
+    def _win_key(session_id: str) -> str:
+        return f"{REDIS_PREFIX}:{session_id}:win"
@@ -3,7 +3,7 @@
 PerspectiveBuilder V2 — Construction theme-scoped des Perspectives.
 
 Algorithme :
-1. Charger TOUS les claims du tenant (avec embeddings, doc_id, facets)
+1. Charger TOUS les claims du tenant (export memory-mappe, doc_id, facets)
 2. Reduction UMAP (1024 -> 15 dim) sur les embeddings
 3. Clustering HDBSCAN par densite
 4. Pour chaque cluster valide :
@@ -30,6 +30,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 
+from .claim_export import ClaimExport, load_claim_metadata, refresh_claim_export
+from .incremental import PerspectiveModel
 from .models import Perspective, PerspectiveConfig
 
 logger = logging.getLogger(__name__)
@@ -39,49 +41,38 @@ logger = logging.getLogger(__name__)
 # 1. Chargement des claims
 # ---------------------------------------------------------------------------
 
-def load_all_claims_with_embeddings(
-    driver, tenant_id: str,
-) -> List[Dict[str, Any]]:
-    """Charge tous les claims du tenant avec embeddings, doc_id et facets."""
-    logger.info(f"[PERSPECTIVE:BUILD] Loading all claims for tenant={tenant_id}...")
-    with driver.session() as session:
-        result = session.run("""
-            MATCH (c:Claim {tenant_id: $tid})
-            WHERE c.embedding IS NOT NULL
-            OPTIONAL MATCH (c)-[:BELONGS_TO_FACET]->(f:Facet)
-            RETURN c.claim_id AS claim_id,
-                   c.text AS text,
-                   c.doc_id AS doc_id,
-                   c.confidence AS confidence,
-                   c.embedding AS embedding,
-                   collect(DISTINCT f.facet_name) AS facet_names
-        """, tid=tenant_id)
-
-        claims = []
-        for r in result:
-            claims.append({
-                "claim_id": r["claim_id"],
-                "text": r["text"] or "",
-                "doc_id": r["doc_id"] or "",
-                "confidence": r["confidence"] or 0.5,
-                "embedding": r["embedding"],
-                "facet_names": [f for f in r["facet_names"] if f],
-            })
+def load_claims(
+    driver, tenant_id: str, full_export: bool = False, with_metadata: bool = True,
+) -> ClaimExport:
+    """
+    Claims du tenant (doc_id, facets, ...) + embeddings memory-mappes.
 
-    logger.info(f"[PERSPECTIVE:BUILD] Loaded {len(claims)} claims")
-    return claims
+    Les embeddings ne transitent plus par Bolt en listes Python a chaque
+    rebuild : seuls les claims crees depuis le dernier export sont lus.
+    with_metadata relit text / confidence / facet_names (toujours a jour).
+    """
+    logger.info(f"[PERSPECTIVE:BUILD] Loading all claims for tenant={tenant_id}...")
+    export = refresh_claim_export(driver, tenant_id, full=full_export)
+    if with_metadata:
+        load_claim_metadata(driver, tenant_id, export)
+    logger.info(f"[PERSPECTIVE:BUILD] Loaded {len(export)} claims")
+    return export
 
 
 # ---------------------------------------------------------------------------
 # 2. Mapping doc_id -> sujets
 # ---------------------------------------------------------------------------
 
-def load_doc_to_subjects_map(driver, tenant_id: str) -> Dict[str, List[Tuple[str, str]]]:
+def load_doc_to_subjects_map(
+    driver, tenant_id: str, doc_ids: Optional[List[str]] = None,
+) -> Dict[str, List[Tuple[str, str]]]:
     """
     Construit un mapping doc_id -> [(subject_id, subject_name), ...]
 
     Le sujet d'un doc peut etre un SubjectAnchor (via ABOUT_SUBJECT) ou un
     ComparableSubject (via ABOUT_COMPARABLE).
+
+    doc_ids restreint le mapping a ces documents (mode incremental).
     """
     logger.info("[PERSPECTIVE:BUILD] Loading doc -> subjects map...")
     doc_to_subjects: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
@@ -90,8 +81,9 @@ def load_doc_to_subjects_map(driver, tenant_id: str) -> Dict[str, List[Tuple[str
         # SubjectAnchors
         result = session.run("""
             MATCH (sa:SubjectAnchor)<-[:ABOUT_SUBJECT]-(dc:DocumentContext)
+            WHERE $doc_ids IS NULL OR dc.doc_id IN $doc_ids
             RETURN sa.subject_id AS sid, sa.canonical_name AS name, dc.doc_id AS doc_id
-        """)
+        """, doc_ids=doc_ids)
         for r in result:
             if r["doc_id"] and r["sid"]:
                 doc_to_subjects[r["doc_id"]].append((r["sid"], r["name"] or ""))
@@ -99,8 +91,9 @@ def load_doc_to_subjects_map(driver, tenant_id: str) -> Dict[str, List[Tuple[str
         # ComparableSubjects
         result = session.run("""
             MATCH (cs:ComparableSubject {tenant_id: $tid})<-[:ABOUT_COMPARABLE]-(dc:DocumentContext)
+            WHERE $doc_ids IS NULL OR dc.doc_id IN $doc_ids
             RETURN cs.subject_id AS sid, cs.canonical_name AS name, dc.doc_id AS doc_id
-        """, tid=tenant_id)
+        """, tid=tenant_id, doc_ids=doc_ids)
         for r in result:
             if r["doc_id"] and r["sid"]:
                 doc_to_subjects[r["doc_id"]].append((r["sid"], r["name"] or ""))
@@ -137,6 +130,20 @@ def reduce_and_cluster(
     config: PerspectiveConfig,
 ) -> np.ndarray:
     """Reduction UMAP puis clustering HDBSCAN."""
+    labels, _, _ = fit_reduce_and_cluster(embeddings, config)
+    return labels
+
+
+def fit_reduce_and_cluster(
+    embeddings: np.ndarray,
+    config: PerspectiveConfig,
+) -> Tuple[np.ndarray, Any, np.ndarray]:
+    """
+    Reduction UMAP puis clustering HDBSCAN.
+
+    Retourne (labels, reducer ajuste, embeddings reduits) : le reducer et
+    l'espace reduit servent au mode incremental (cf incremental.py).
+    """
     import umap
     import hdbscan
 
@@ -167,7 +174,7 @@ def reduce_and_cluster(
     labels = clusterer.fit_predict(reduced)
     logger.info(f"[PERSPECTIVE:BUILD] HDBSCAN done in {time.time() - start:.1f}s")
 
-    return labels
+    return labels, reducer, reduced
 
 
 # ---------------------------------------------------------------------------
@@ -234,7 +241,7 @@ def compute_perspective_embedding(
     label: str,
     keywords: List[str],
     representative_texts: List[str],
-    cluster_claim_embeddings: List[np.ndarray],
+    cluster_claim_embeddings: np.ndarray,
 ) -> Optional[List[float]]:
     """
     Calcule l'embedding composite : 25% label + 75% claims centroid.
@@ -251,7 +258,7 @@ def compute_perspective_embedding(
         label_vec = np.array(model.encode([label_text])[0])
 
         # Claims centroid (depuis les embeddings deja en memoire)
-        if cluster_claim_embeddings:
+        if len(cluster_claim_embeddings):
             centroid = np.mean(np.array(cluster_claim_embeddings), axis=0)
         else:
             centroid = label_vec
@@ -284,23 +291,41 @@ def build_all_perspectives(
     Retourne (perspectives, claim_assignments)
     ou claim_assignments = {perspective_id: [claim_ids]}
     """
+    perspectives, claim_assignments, _ = build_perspectives_with_model(
+        driver, tenant_id, config=config, skip_llm=skip_llm,
+    )
+    return perspectives, claim_assignments
+
+
+def build_perspectives_with_model(
+    driver,
+    tenant_id: str,
+    config: Optional[PerspectiveConfig] = None,
+    skip_llm: bool = False,
+    full_export: bool = False,
+) -> Tuple[List[Perspective], Dict[str, List[str]], Optional[PerspectiveModel]]:
+    """
+    Comme build_all_perspectives, retourne en plus le PerspectiveModel
+    (reducer UMAP + centroides) utilise par le mode incremental.
+    """
     config = config or PerspectiveConfig()
 
     # 1. Charger toutes les donnees
-    claims = load_all_claims_with_embeddings(driver, tenant_id)
+    export = load_claims(driver, tenant_id, full_export=full_export)
+    claims = export.claims
     if not claims:
         logger.warning("[PERSPECTIVE:BUILD] No claims found")
-        return [], {}
+        return [], {}, None
 
     doc_to_subjects = load_doc_to_subjects_map(driver, tenant_id)
     tensions_map = load_tensions_map(driver, tenant_id)
 
-    # 2. Construire la matrice d'embeddings
-    embeddings = np.array([c["embedding"] for c in claims])
+    # 2. Matrice d'embeddings (export memory-mappe)
+    embeddings = export.embeddings()
     logger.info(f"[PERSPECTIVE:BUILD] Embeddings matrix: {embeddings.shape}")
 
     # 3. Clustering
-    labels = reduce_and_cluster(embeddings, config)
+    labels, reducer, reduced = fit_reduce_and_cluster(embeddings, config)
 
     unique_labels = set(labels.tolist())
     n_clusters = len(unique_labels) - (1 if -1 in unique_labels else 0)
@@ -322,6 +347,7 @@ def build_all_perspectives(
     # 5. Pour chaque cluster, construire la Perspective
     perspectives: List[Perspective] = []
     claim_assignments: Dict[str, List[str]] = {}
+    cluster_to_perspective: Dict[int, str] = {}
 
     n_to_process = min(len(cluster_sizes), config.max_clusters_to_label)
     logger.info(
@@ -331,9 +357,9 @@ def build_all_perspectives(
 
     for idx, (cluster_id, _) in enumerate(cluster_sizes[:n_to_process], 1):
         # Recuperer les claims du cluster
-        cluster_indices = [i for i in range(len(claims)) if labels[i] == cluster_id]
+        cluster_indices = np.flatnonzero(labels == cluster_id)
         cluster_claims = [claims[i] for i in cluster_indices]
-        cluster_embeddings = [np.array(c["embedding"]) for c in cluster_claims]
+        cluster_embeddings = embeddings[cluster_indices]
 
         # Filtres qualite
         doc_ids = set(c["doc_id"] for c in cluster_claims if c["doc_id"])
@@ -431,9 +457,21 @@ def build_all_perspectives(
 
         perspectives.append(p)
         claim_assignments[p.perspective_id] = [c["claim_id"] for c in cluster_claims]
+        cluster_to_perspective[cluster_id] = p.perspective_id
 
     logger.info(
         f"[PERSPECTIVE:BUILD] Done: {len(perspectives)} perspectives created "
         f"(claims totaux: {sum(p.claim_count for p in perspectives)})"
     )
-    return perspectives, claim_assignments
+    model = PerspectiveModel.fit(
+        tenant_id=tenant_id,
+        reducer=reducer,
+        reduced=np.asarray(reduced, dtype=np.float32),
+        labels=labels,
+        cluster_to_perspective=cluster_to_perspective,
+        n_claims=len(claims),
+        last_created_at=max((c.get("created_at", "") for c in claims), default=""),
+        config=config,
+        embeddings=embeddings,
+    )
+    return perspectives, claim_assignments, model
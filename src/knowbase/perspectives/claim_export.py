@@ -0,0 +1,304 @@
+# src/knowbase/perspectives/claim_export.py
+"""
+Export colonnaire des embeddings de claims pour le Perspective builder.
+
+Avant : le builder ramenait TOUS les embeddings via
+Bolt en listes Python (~33 Ko par claim 1024-d au lieu de 4 Ko en float32)
+a chaque rebuild.
+
+Maintenant, par tenant :
+
+    {PERSPECTIVE_DATA_DIR}/{tenant}/claims/
+        seg_00000.f32.npy   embeddings float32 [n, dim], np.load(mmap_mode="r")
+        seg_00000.jsonl     claim_id, doc_id, created_at
+        ...
+        manifest.json       segments, dim, n_claims, last_created_at / last_claim_id
+
+- Les claims sont streames depuis Neo4j par pages (keyset sur
+  (created_at, claim_id)) et ecrits directement dans un .npy memory-mappe.
+- refresh_claim_export() n'ajoute qu'un segment avec les claims crees
+  depuis le dernier export ; si le nombre de claims Neo4j ne correspond plus
+  (suppressions, purge), l'export est reecrit entierement.
+- Seuls les embeddings et les champs immuables sont exportes. text,
+  confidence et facet_names sont relus depuis Neo4j (sans embeddings) a
+  chaque build par load_claim_metadata() : les etapes post-import
+  (facets, facet_consolidate) reecrivent BELONGS_TO_FACET et les noms de
+  facets sans changer le nombre de claims.
+- manifest.json est ecrit en dernier (commit marker), fichiers en .tmp puis
+  os.replace : un lecteur concurrent voit l'ancien export ou le nouveau.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from knowbase.config.paths import DATA_DIR
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT_VERSION = 2
+PERSPECTIVE_DATA_DIR = Path(os.getenv("PERSPECTIVE_DATA_DIR", DATA_DIR / "perspectives")).expanduser()
+EXPORT_PAGE_SIZE = int(os.getenv("PERSPECTIVE_EXPORT_PAGE_SIZE", "5000"))
+
+
+@dataclass
+class ClaimExport:
+    """Claims exportes d'un tenant : metadonnees + embeddings memory-mappes."""
+    tenant_id: str
+    claims: List[Dict[str, Any]] = field(default_factory=list)
+    segments: List[np.ndarray] = field(default_factory=list)
+    dim: int = 0
+    last_created_at: str = ""
+    last_claim_id: str = ""
+
+    def __len__(self) -> int:
+        return len(self.claims)
+
+    def embeddings(self, indices: Optional[List[int]] = None) -> np.ndarray:
+        """Matrice float32 [n, dim] (copie en RAM : necessaire pour UMAP)."""
+        if not self.segments:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if indices is None:
+            if len(self.segments) == 1:
+                return np.asarray(self.segments[0])
+            return np.concatenate(self.segments, axis=0)
+        offsets = np.cumsum([0] + [len(s) for s in self.segments])
+        rows = np.empty((len(indices), self.dim), dtype=np.float32)
+        for out, i in enumerate(indices):
+            seg = int(np.searchsorted(offsets, i, side="right") - 1)
+            rows[out] = self.segments[seg][i - offsets[seg]]
+        return rows
+
+
+def export_dir(tenant_id: str) -> Path:
+    return PERSPECTIVE_DATA_DIR / tenant_id / "claims"
+
+
+def load_claim_export(tenant_id: str) -> Optional[ClaimExport]:
+    """Relit l'export du tenant (None si absent ou illisible)."""
+    d = export_dir(tenant_id)
+    try:
+        manifest = json.loads((d / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if manifest.get("format") != EXPORT_FORMAT_VERSION:
+        return None
+
+    export = ClaimExport(
+        tenant_id=tenant_id,
+        dim=manifest.get("dim", 0),
+        last_created_at=manifest.get("last_created_at", ""),
+        last_claim_id=manifest.get("last_claim_id", ""),
+    )
+    try:
+        for name in manifest["segments"]:
+            export.segments.append(np.load(d / f"{name}.f32.npy", mmap_mode="r"))
+            with open(d / f"{name}.jsonl", encoding="utf-8") as f:
+                export.claims.extend(json.loads(line) for line in f if line.strip())
+    except Exception as e:
+        logger.warning(f"[PERSPECTIVE:EXPORT] Corrupt export for tenant={tenant_id}: {e}")
+        return None
+    return export
+
+
+def refresh_claim_export(driver, tenant_id: str, full: bool = False) -> ClaimExport:
+    """
+    Met a jour l'export colonnaire des claims du tenant.
+
+    Args:
+        driver: Neo4j driver
+        tenant_id: Tenant ID
+        full: Reecrit l'export entier (sinon : append des nouveaux claims)
+
+    Returns:
+        ClaimExport a jour
+    """
+    t0 = time.time()
+    d = export_dir(tenant_id)
+    export = None if full else load_claim_export(tenant_id)
+
+    total = _count_claims(driver, tenant_id)
+    if export is not None:
+        new = _count_claims(driver, tenant_id, export.last_created_at, export.last_claim_id)
+        if len(export) + new != total:
+            logger.info(
+                f"[PERSPECTIVE:EXPORT] tenant={tenant_id}: export has {len(export)} claims + "
+                f"{new} new != {total} in Neo4j, full re-export"
+            )
+            export = None
+
+    if export is None:
+        shutil.rmtree(d, ignore_errors=True)
+        export = ClaimExport(tenant_id=tenant_id)
+        new = total
+
+    if new > 0:
+        d.mkdir(parents=True, exist_ok=True)
+        name = f"seg_{len(_manifest_segments(d)):05d}"
+        n_written = _write_segment(driver, tenant_id, d, name, new, export)
+        if n_written:
+            _write_manifest(d, _manifest_segments(d) + [name], export, len(export) + n_written)
+
+    export = load_claim_export(tenant_id) or export
+    logger.info(
+        f"[PERSPECTIVE:EXPORT] tenant={tenant_id}: {len(export)} claims exported "
+        f"({new} new) in {time.time() - t0:.1f}s"
+    )
+    return export
+
+
+def load_claim_metadata(driver, tenant_id: str, export: ClaimExport) -> int:
+    """
+    Relit text, confidence et facet_names des claims de l'export depuis Neo4j.
+
+    Pages keyset sur claim_id, sans les embeddings. Les claims absents de
+    Neo4j (supprimes depuis l'export) gardent des valeurs vides.
+
+    Returns:
+        Nombre de claims mis a jour
+    """
+    by_id = {c["claim_id"]: c for c in export.claims}
+    for claim in export.claims:
+        claim.update(text="", confidence=0.5, facet_names=[])
+
+    updated = 0
+    cid = ""
+    with driver.session() as session:
+        while True:
+            page = list(session.run("""
+                MATCH (c:Claim {tenant_id: $tid})
+                WHERE c.embedding IS NOT NULL AND c.claim_id > $cid
+                WITH c ORDER BY c.claim_id LIMIT $limit
+                OPTIONAL MATCH (c)-[:BELONGS_TO_FACET]->(f:Facet)
+                RETURN c.claim_id AS claim_id,
+                       c.text AS text,
+                       c.confidence AS confidence,
+                       collect(DISTINCT f.facet_name) AS facet_names
+                ORDER BY claim_id
+            """, tid=tenant_id, cid=cid, limit=EXPORT_PAGE_SIZE))
+            if not page:
+                break
+            for r in page:
+                claim = by_id.get(r["claim_id"])
+                if claim is None:
+                    continue  # cree apres l'export : pas d'embedding exporte
+                claim.update(
+                    text=r["text"] or "",
+                    confidence=r["confidence"] or 0.5,
+                    facet_names=[f for f in r["facet_names"] if f],
+                )
+                updated += 1
+            cid = page[-1]["claim_id"]
+    return updated
+
+
+def _count_claims(driver, tenant_id: str, after_created_at: Optional[str] = None,
+                  after_claim_id: str = "") -> int:
+    with driver.session() as session:
+        if after_created_at is None:
+            record = session.run("""
+                MATCH (c:Claim {tenant_id: $tid})
+                WHERE c.embedding IS NOT NULL
+                RETURN count(c) AS cnt
+            """, tid=tenant_id).single()
+        else:
+            record = session.run("""
+                MATCH (c:Claim {tenant_id: $tid})
+                WHERE c.embedding IS NOT NULL
+                  AND (coalesce(c.created_at, '') > $ca
+                       OR (coalesce(c.created_at, '') = $ca AND c.claim_id > $cid))
+                RETURN count(c) AS cnt
+            """, tid=tenant_id, ca=after_created_at, cid=after_claim_id).single()
+    return int(record["cnt"]) if record else 0
+
+
+def _write_segment(driver, tenant_id: str, d: Path, name: str, expected: int,
+                   export: ClaimExport) -> int:
+    """Streame les claims apres (last_created_at, last_claim_id) dans un segment."""
+    suffix = f".tmp{os.getpid()}"
+    npy_tmp = d / f"{name}.f32.npy{suffix}"
+    meta_tmp = d / f"{name}.jsonl{suffix}"
+    matrix = None
+    n = 0
+    ca, cid = export.last_created_at, export.last_claim_id
+
+    with driver.session() as session, open(meta_tmp, "w", encoding="utf-8") as meta:
+        while n < expected:
+            page = list(session.run("""
+                MATCH (c:Claim {tenant_id: $tid})
+                WHERE c.embedding IS NOT NULL
+                  AND (coalesce(c.created_at, '') > $ca
+                       OR (coalesce(c.created_at, '') = $ca AND c.claim_id > $cid))
+                RETURN c.claim_id AS claim_id,
+                       c.doc_id AS doc_id,
+                       c.embedding AS embedding,
+                       coalesce(c.created_at, '') AS created_at
+                ORDER BY created_at, claim_id
+                LIMIT $limit
+            """, tid=tenant_id, ca=ca, cid=cid, limit=min(EXPORT_PAGE_SIZE, expected - n)))
+            if not page:
+                break
+
+            if matrix is None:
+                export.dim = export.dim or len(page[0]["embedding"])
+                matrix = np.lib.format.open_memmap(
+                    npy_tmp, mode="w+", dtype=np.float32, shape=(expected, export.dim),
+                )
+            for r in page:
+                matrix[n] = r["embedding"]
+                meta.write(json.dumps({
+                    "claim_id": r["claim_id"],
+                    "doc_id": r["doc_id"] or "",
+                    "created_at": r["created_at"],
+                }) + "\n")
+                n += 1
+            ca, cid = page[-1]["created_at"], page[-1]["claim_id"]
+
+    if matrix is None:
+        meta_tmp.unlink(missing_ok=True)
+        return 0
+    if n < expected:
+        # Claims supprimes pendant l'export : tronque le segment
+        truncated = np.array(matrix[:n])
+        del matrix
+        with open(npy_tmp, "wb") as f:
+            np.save(f, truncated)
+    else:
+        matrix.flush()
+        del matrix
+    os.replace(npy_tmp, d / f"{name}.f32.npy")
+    os.replace(meta_tmp, d / f"{name}.jsonl")
+    export.last_created_at, export.last_claim_id = ca, cid
+    return n
+
+
+def _manifest_segments(d: Path) -> List[str]:
+    try:
+        return json.loads((d / "manifest.json").read_text(encoding="utf-8"))["segments"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _write_manifest(d: Path, segments: List[str], export: ClaimExport, n_claims: int) -> None:
+    manifest = {
+        "format": EXPORT_FORMAT_VERSION,
+        "tenant_id": export.tenant_id,
+        "segments": segments,
+        "dim": export.dim,
+        "n_claims": n_claims,
+        "last_created_at": export.last_created_at,
+        "last_claim_id": export.last_claim_id,
+        "exported_at": time.time(),
+    }
+    tmp = d / f"manifest.json.tmp{os.getpid()}"
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp, d / "manifest.json")
@@ -0,0 +1,288 @@
+# src/knowbase/perspectives/incremental.py
+"""
+Maintenance incrementale des Perspectives V2.
+
+Le rebuild complet (UMAP + HDBSCAN sur tout le tenant) coute des dizaines
+de minutes ; entre deux rebuilds, les nouveaux documents restaient
+invisibles pour les Perspectives.
+
+Au rebuild complet, le builder sauvegarde un PerspectiveModel :
+
+    {PERSPECTIVE_DATA_DIR}/{tenant}/model/
+        umap.pkl        reducer UMAP ajuste (projection des nouveaux claims)
+        centroids.npy   centroides des Perspectives dans l'espace reduit [k, n_components]
+        centroids_full.npy  centroides normalises dans l'espace d'embedding [k, dim]
+        model.json      perspective_ids, rayons, compteurs de derive (commit marker)
+
+En mode incremental, les claims crees depuis le modele sont projetes via
+reducer.transform() puis rattaches a la Perspective du centroide le plus
+proche si la distance reste sous le rayon du cluster (quantile des
+distances des membres au build). UMAP.transform projette tout point sur la
+variete apprise, meme hors distribution : le claim doit aussi rester assez
+proche (cosine) du centroide du cluster dans l'espace d'embedding d'origine.
+Les autres sont des outliers.
+
+Derive : outliers et claims ajoutes depuis le build sont cumules ; au-dela
+de incremental_max_outlier_ratio / incremental_max_growth_ratio (par
+rapport au nombre de claims du build), un rebuild complet est requis.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .claim_export import PERSPECTIVE_DATA_DIR, ClaimExport
+from .models import PerspectiveConfig
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT_VERSION = 1
+CALIBRATION_SAMPLE = int(os.getenv("PERSPECTIVE_RADIUS_CALIBRATION_SAMPLE", "200"))
+
+
+@dataclass
+class PerspectiveModel:
+    """Etat du dernier rebuild complet, suffisant pour rattacher de nouveaux claims."""
+    tenant_id: str
+    perspective_ids: List[str]
+    centroids: np.ndarray                   # [k, n_components] float32
+    radii: np.ndarray                       # [k] float32
+    reducer: Any = None                     # umap.UMAP ajuste
+    full_centroids: Optional[np.ndarray] = None  # [k, dim] float32 normalises
+    min_cosine: Optional[np.ndarray] = None      # [k] float32
+    n_claims_at_build: int = 0
+    last_created_at: str = ""
+    built_at: float = 0.0
+    assigned_since_build: int = 0
+    outliers_since_build: int = 0
+    increments: int = 0
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def fit(
+        cls,
+        tenant_id: str,
+        reducer: Any,
+        reduced: np.ndarray,
+        labels: np.ndarray,
+        cluster_to_perspective: Dict[int, str],
+        n_claims: int,
+        last_created_at: str,
+        config: PerspectiveConfig,
+        embeddings: Optional[np.ndarray] = None,
+    ) -> "PerspectiveModel":
+        """
+        Centroides + rayons des clusters retenus comme Perspectives.
+
+        Si embeddings est fourni, les rayons sont calibres sur un echantillon
+        de membres re-projetes par reducer.transform() : la projection hors
+        echantillon d'UMAP ne retombe pas exactement sur les positions du fit,
+        un rayon mesure sur `reduced` classerait des claims typiques en outliers.
+        """
+        rng = np.random.default_rng(42)
+        perspective_ids, centroids, radii = [], [], []
+        full_centroids, min_cosine = [], []
+        for cluster_id, pid in cluster_to_perspective.items():
+            rows = np.flatnonzero(labels == cluster_id)
+            if not len(rows):
+                continue
+            centroid = reduced[rows].mean(axis=0)
+            members = reduced[rows]
+            if embeddings is not None and reducer is not None:
+                sample = rng.choice(rows, size=min(len(rows), CALIBRATION_SAMPLE), replace=False)
+                members = np.asarray(reducer.transform(embeddings[np.sort(sample)]), dtype=np.float32)
+            distances = np.linalg.norm(members - centroid, axis=1)
+            if embeddings is not None:
+                full = _normalize(np.asarray(embeddings[rows], dtype=np.float32))
+                full_centroid = _normalize(full.mean(axis=0, keepdims=True))[0]
+                cos = full @ full_centroid
+                # Meme semantique que le rayon : (1 - cos) au quantile, avec marge
+                spread = 1.0 - float(np.quantile(cos, 1.0 - config.incremental_radius_quantile))
+                full_centroids.append(full_centroid)
+                min_cosine.append(1.0 - spread * config.incremental_radius_factor)
+            perspective_ids.append(pid)
+            centroids.append(centroid)
+            radii.append(
+                float(np.quantile(distances, config.incremental_radius_quantile))
+                * config.incremental_radius_factor
+            )
+        dim = reduced.shape[1] if reduced.ndim == 2 else 0
+        return cls(
+            tenant_id=tenant_id,
+            perspective_ids=perspective_ids,
+            centroids=np.array(centroids, dtype=np.float32).reshape(len(centroids), dim),
+            radii=np.array(radii, dtype=np.float32),
+            reducer=reducer,
+            full_centroids=np.array(full_centroids, dtype=np.float32) if full_centroids else None,
+            min_cosine=np.array(min_cosine, dtype=np.float32) if min_cosine else None,
+            n_claims_at_build=n_claims,
+            last_created_at=last_created_at,
+            built_at=time.time(),
+        )
+
+    def assign(self, reduced: np.ndarray, embeddings: Optional[np.ndarray] = None) -> List[Optional[str]]:
+        """perspective_id du centroide le plus proche (None si hors rayon)."""
+        if not len(reduced) or not len(self.perspective_ids):
+            return [None] * len(reduced)
+        distances = np.linalg.norm(reduced[:, None, :] - self.centroids[None, :, :], axis=2)
+        nearest = distances.argmin(axis=1)
+        within = distances[np.arange(len(reduced)), nearest] <= self.radii[nearest]
+        if embeddings is not None and self.full_centroids is not None:
+            cos = np.einsum(
+                "ij,ij->i", _normalize(np.asarray(embeddings, dtype=np.float32)),
+                self.full_centroids[nearest],
+            )
+            within &= cos >= self.min_cosine[nearest]
+        return [self.perspective_ids[j] if ok else None for j, ok in zip(nearest, within)]
+
+    def drift(self) -> Dict[str, float]:
+        base = max(1, self.n_claims_at_build)
+        return {
+            "outlier_ratio": self.outliers_since_build / base,
+            "growth_ratio": (self.assigned_since_build + self.outliers_since_build) / base,
+        }
+
+    def needs_rebuild(self, config: PerspectiveConfig) -> bool:
+        drift = self.drift()
+        return (
+            drift["outlier_ratio"] > config.incremental_max_outlier_ratio
+            or drift["growth_ratio"] > config.incremental_max_growth_ratio
+        )
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
+
+
+def model_dir(tenant_id: str) -> Path:
+    return PERSPECTIVE_DATA_DIR / tenant_id / "model"
+
+
+def save_perspective_model(model: PerspectiveModel) -> None:
+    """Ecrit le modele (model.json en dernier, fichiers .tmp + os.replace)."""
+    d = model_dir(model.tenant_id)
+    d.mkdir(parents=True, exist_ok=True)
+    suffix = f".tmp{os.getpid()}"
+    if model.reducer is not None:
+        with open(d / f"umap.pkl{suffix}", "wb") as f:
+            pickle.dump(model.reducer, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(d / f"umap.pkl{suffix}", d / "umap.pkl")
+    with open(d / f"centroids.npy{suffix}", "wb") as f:
+        np.save(f, model.centroids)
+    os.replace(d / f"centroids.npy{suffix}", d / "centroids.npy")
+    if model.full_centroids is not None:
+        with open(d / f"centroids_full.npy{suffix}", "wb") as f:
+            np.save(f, model.full_centroids)
+        os.replace(d / f"centroids_full.npy{suffix}", d / "centroids_full.npy")
+    meta = {
+        "format": MODEL_FORMAT_VERSION,
+        "tenant_id": model.tenant_id,
+        "perspective_ids": model.perspective_ids,
+        "radii": [float(r) for r in model.radii],
+        "min_cosine": [float(c) for c in model.min_cosine] if model.min_cosine is not None else None,
+        "n_claims_at_build": model.n_claims_at_build,
+        "last_created_at": model.last_created_at,
+        "built_at": model.built_at,
+        "assigned_since_build": model.assigned_since_build,
+        "outliers_since_build": model.outliers_since_build,
+        "increments": model.increments,
+        "extra": model.extra,
+    }
+    (d / f"model.json{suffix}").write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(d / f"model.json{suffix}", d / "model.json")
+
+
+def load_perspective_model(tenant_id: str, with_reducer: bool = True) -> Optional[PerspectiveModel]:
+    """Relit le modele du tenant (None si absent ou illisible)."""
+    d = model_dir(tenant_id)
+    try:
+        meta = json.loads((d / "model.json").read_text(encoding="utf-8"))
+        if meta.get("format") != MODEL_FORMAT_VERSION:
+            return None
+        reducer = None
+        if with_reducer and (d / "umap.pkl").exists():
+            with open(d / "umap.pkl", "rb") as f:
+                reducer = pickle.load(f)
+        return PerspectiveModel(
+            tenant_id=tenant_id,
+            perspective_ids=meta["perspective_ids"],
+            centroids=np.load(d / "centroids.npy"),
+            radii=np.array(meta["radii"], dtype=np.float32),
+            reducer=reducer,
+            full_centroids=np.load(d / "centroids_full.npy") if meta.get("min_cosine") else None,
+            min_cosine=np.array(meta["min_cosine"], dtype=np.float32) if meta.get("min_cosine") else None,
+            n_claims_at_build=meta.get("n_claims_at_build", 0),
+            last_created_at=meta.get("last_created_at", ""),
+            built_at=meta.get("built_at", 0.0),
+            assigned_since_build=meta.get("assigned_since_build", 0),
+            outliers_since_build=meta.get("outliers_since_build", 0),
+            increments=meta.get("increments", 0),
+            extra=meta.get("extra") or {},
+        )
+    except Exception as e:
+        logger.warning(f"[PERSPECTIVE:INCR] No usable model for tenant={tenant_id}: {e}")
+        return None
+
+
+def assign_new_claims(
+    model: PerspectiveModel,
+    export: ClaimExport,
+) -> Dict[str, Any]:
+    """
+    Rattache les claims de l'export crees apres le modele aux Perspectives.
+
+    Met a jour les compteurs de derive du modele (non persiste ici).
+
+    Returns:
+        {"assignments": {perspective_id: [claim_ids]}, "doc_ids": {...},
+         "assigned": n, "outliers": n, "new_claims": n}
+    """
+    new_rows = [
+        i for i, c in enumerate(export.claims)
+        if c.get("created_at", "") > model.last_created_at
+    ]
+    result = {"assignments": {}, "doc_ids": {}, "assigned": 0, "outliers": 0, "new_claims": len(new_rows)}
+    if not new_rows:
+        return result
+
+    t0 = time.time()
+    embeddings = export.embeddings(new_rows)
+    reduced = np.asarray(model.reducer.transform(embeddings), dtype=np.float32)
+    targets = model.assign(reduced, embeddings)
+
+    assignments: Dict[str, List[str]] = defaultdict(list)
+    doc_ids: Dict[str, set] = defaultdict(set)
+    for row, pid in zip(new_rows, targets):
+        if pid is None:
+            result["outliers"] += 1
+            continue
+        claim = export.claims[row]
+        assignments[pid].append(claim["claim_id"])
+        if claim.get("doc_id"):
+            doc_ids[pid].add(claim["doc_id"])
+        result["assigned"] += 1
+
+    model.assigned_since_build += result["assigned"]
+    model.outliers_since_build += result["outliers"]
+    model.last_created_at = max(export.claims[i].get("created_at", "") for i in new_rows)
+    model.increments += 1
+
+    result["assignments"] = dict(assignments)
+    result["doc_ids"] = {pid: sorted(d) for pid, d in doc_ids.items()}
+    logger.info(
+        f"[PERSPECTIVE:INCR] tenant={model.tenant_id}: {len(new_rows)} new claims -> "
+        f"{result['assigned']} assigned to {len(assignments)} perspectives, "
+        f"{result['outliers']} outliers in {time.time() - t0:.1f}s"
+    )
+    return result
@@ -0,0 +1,328 @@
+# src/knowbase/perspectives/index.py
+"""
+Index en memoire des Perspectives d'un tenant pour le scoring au runtime.
+
+Avant : chaque question rechargeait toutes les Perspectives depuis Neo4j
+(driver cree a chaque appel) puis calculait un cosine par Perspective en
+Python. Les Perspectives ne changent qu'au rebuild batch (orchestrator).
+
+Maintenant, par tenant et par process :
+- matrice (n, d) float32 des embeddings normalises (ligne nulle si absent)
+- tableaux paralleles tension_count / doc_count / importance_score
+- index inverse subject_id -> lignes (boost subject overlap)
+
+Le scoring devient 1 produit matrice-vecteur + bonus vectorises.
+
+Invalidation versionnee : le build incremente la cle Redis
+`osmose:perspectives:version:{tenant}` (bump_perspective_version). A chaque
+lecture, 1 GET compare la version avec celle de l'index local ; l'index
+n'est recharge depuis Neo4j que si elle a change. Sans Redis, l'index
+local est recharge apres PERSPECTIVE_INDEX_TTL_S.
+
+Un chargement en echec n'est jamais mis en cache (l'index precedent reste
+servi, sinon un index vide non memorise) ; un chargement vide n'est garde
+que PERSPECTIVE_INDEX_EMPTY_TTL_S (premier build en cours, Neo4j vide).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .models import Perspective, ScoredPerspective
+
+logger = logging.getLogger(__name__)
+
+REDIS_VERSION_PREFIX = "osmose:perspectives:version"
+LOCAL_TTL_S = float(os.getenv("PERSPECTIVE_INDEX_TTL_S", "300"))
+EMPTY_TTL_S = float(os.getenv("PERSPECTIVE_INDEX_EMPTY_TTL_S", "30"))
+
+# Bonus structurels (cf score_perspectives)
+TENSION_BONUS = 0.15
+DIVERSITY_BONUS = 0.10
+DIVERSITY_MIN_DOCS = 3
+IMPORTANCE_WEIGHT = 0.10
+IMPORTANCE_CAP = 10.0
+SUBJECT_BONUS = 0.20
+
+PerspectiveLoader = Callable[[str], List[Perspective]]
+
+
+@dataclass
+class PerspectiveIndex:
+    """Perspectives d'un tenant sous forme de tableaux prets au scoring."""
+    perspectives: List[Perspective]
+    matrix: np.ndarray                      # (n, d) float32, lignes normalisees
+    tension_count: np.ndarray               # (n,) int
+    doc_count: np.ndarray                   # (n,) int
+    importance_score: np.ndarray            # (n,) float32
+    subject_rows: Dict[str, np.ndarray] = field(default_factory=dict)
+    version: Optional[int] = None
+    loaded_at: float = 0.0
+
+    @classmethod
+    def build(cls, perspectives: List[Perspective], version: Optional[int] = None) -> "PerspectiveIndex":
+        n = len(perspectives)
+        dim = next((len(p.embedding) for p in perspectives if p.embedding), 0)
+        matrix = np.zeros((n, dim), dtype=np.float32)
+        subject_rows: Dict[str, List[int]] = {}
+
+        for i, p in enumerate(perspectives):
+            if p.embedding and len(p.embedding) == dim:
+                matrix[i] = p.embedding
+            elif p.embedding:
+                logger.warning(
+                    f"[PERSPECTIVE:INDEX] Embedding dim {len(p.embedding)} != {dim} "
+                    f"for {p.perspective_id}, semantic score forced to 0"
+                )
+            for sid in set(p.linked_subject_ids or []):
+                subject_rows.setdefault(sid, []).append(i)
+
+        if n and dim:
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            np.divide(matrix, norms, out=matrix, where=norms > 0)
+
+        return cls(
+            perspectives=list(perspectives),
+            matrix=matrix,
+            tension_count=np.array([p.tension_count for p in perspectives], dtype=np.int64),
+            doc_count=np.array([p.doc_count for p in perspectives], dtype=np.int64),
+            importance_score=np.array([p.importance_score for p in perspectives], dtype=np.float32),
+            subject_rows={sid: np.array(rows, dtype=np.int64) for sid, rows in subject_rows.items()},
+            version=version,
+            loaded_at=time.monotonic(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.perspectives)
+
+    def semantic_scores(self, question_embedding: Optional[List[float]]) -> np.ndarray:
+        """Cosine question / Perspectives (0 si embedding absent ou de dimension differente)."""
+        n, dim = self.matrix.shape
+        if not question_embedding or not n or len(question_embedding) != dim:
+            return np.zeros(n, dtype=np.float32)
+        q_vec = np.asarray(question_embedding, dtype=np.float32)
+        q_norm = float(np.linalg.norm(q_vec))
+        if q_norm == 0:
+            return np.zeros(n, dtype=np.float32)
+        return self.matrix @ (q_vec / q_norm)
+
+    def subject_mask(self, boost_subject_ids: Optional[List[str]]) -> np.ndarray:
+        """Masque des Perspectives touchant au moins un des sujets identifies."""
+        mask = np.zeros(len(self.perspectives), dtype=bool)
+        for sid in boost_subject_ids or []:
+            rows = self.subject_rows.get(sid)
+            if rows is not None:
+                mask[rows] = True
+        return mask
+
+    def score(
+        self,
+        question_embedding: Optional[List[float]],
+        boost_subject_ids: Optional[List[str]] = None,
+    ) -> List[ScoredPerspective]:
+        """Scores multi-signaux (cf score_perspectives), tries par pertinence decroissante."""
+        if not self.perspectives:
+            return []
+
+        semantic = self.semantic_scores(question_embedding).astype(np.float64)
+        subject_bonus = np.where(self.subject_mask(boost_subject_ids), SUBJECT_BONUS, 0.0)
+        total = (
+            semantic
+            + np.where(self.tension_count > 0, TENSION_BONUS, 0.0)
+            + np.where(self.doc_count >= DIVERSITY_MIN_DOCS, DIVERSITY_BONUS, 0.0)
+            + np.minimum(self.importance_score / IMPORTANCE_CAP, 1.0) * IMPORTANCE_WEIGHT
+            + subject_bonus
+        )
+
+        order = np.argsort(-total, kind="stable")
+        return [
+            ScoredPerspective(
+                perspective=self.perspectives[i],
+                relevance_score=float(total[i]),
+                semantic_score=float(semantic[i]),
+                subject_overlap_bonus=float(subject_bonus[i]),
+            )
+            for i in order
+        ]
+
+
+class PerspectiveIndexCache:
+    """
+    Cache process des PerspectiveIndex par tenant, invalide par version Redis.
+
+    Usage:
+        cache = get_perspective_index_cache()
+        index = cache.get(tenant_id)
+        scored = index.score(query_vector, subject_ids)
+    """
+
+    def __init__(
+        self,
+        loader: Optional[PerspectiveLoader] = None,
+        redis_client=None,
+        local_ttl_s: float = LOCAL_TTL_S,
+    ):
+        """
+        Args:
+            loader: loader(tenant_id) -> Perspectives (defaut: load_all_perspectives)
+            redis_client: Client redis-py. None = client partage get_redis_client()
+                resolu au premier usage.
+            local_ttl_s: Duree de vie de l'index local quand Redis est indisponible
+        """
+        self._loader = loader
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self.local_ttl_s = local_ttl_s
+        self._indexes: Dict[str, PerspectiveIndex] = {}
+        self._lock = threading.Lock()
+        self._tenant_locks: Dict[str, threading.Lock] = {}
+        self._stats = {"hits": 0, "reloads": 0, "redis_errors": 0, "load_errors": 0}
+
+    def get(self, tenant_id: str) -> PerspectiveIndex:
+        """Index du tenant, recharge si la version Redis a change."""
+        version = self._remote_version(tenant_id)
+        cached = self._indexes.get(tenant_id)
+        if cached is not None and self._is_fresh(cached, version):
+            self._count("hits")
+            return cached
+
+        with self._tenant_lock(tenant_id):
+            # Un autre thread a pu recharger pendant l'attente du lock
+            cached = self._indexes.get(tenant_id)
+            if cached is not None and self._is_fresh(cached, version):
+                self._count("hits")
+                return cached
+
+            t0 = time.time()
+            try:
+                perspectives = self._load(tenant_id)
+            except Exception as e:
+                # Echec non memorise : on ressaie a la prochaine question
+                self._count("load_errors")
+                logger.warning(f"[PERSPECTIVE:INDEX] Load failed for tenant={tenant_id}: {e}")
+                return cached if cached is not None else PerspectiveIndex.build([])
+
+            index = PerspectiveIndex.build(perspectives, version=version)
+            with self._lock:
+                self._indexes[tenant_id] = index
+            self._count("reloads")
+            logger.info(
+                f"[PERSPECTIVE:INDEX] tenant={tenant_id} version={version} "
+                f"{len(index)} perspectives indexed in {int((time.time() - t0) * 1000)}ms"
+            )
+            return index
+
+    def bump(self, tenant_id: str) -> Optional[int]:
+        """Incremente la version Redis du tenant et oublie l'index local."""
+        self.invalidate(tenant_id)
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            version = int(redis.incr(self._version_key(tenant_id)))
+            logger.info(f"[PERSPECTIVE:INDEX] tenant={tenant_id} version bumped to {version}")
+            return version
+        except Exception as e:
+            logger.warning(f"[PERSPECTIVE:INDEX] Version bump failed for tenant={tenant_id}: {e}")
+            return None
+
+    def invalidate(self, tenant_id: Optional[str] = None) -> None:
+        """Oublie l'index local d'un tenant (ou de tous)."""
+        with self._lock:
+            if tenant_id is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(tenant_id, None)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                **self._stats,
+                "tenants": {tid: {"size": len(idx), "version": idx.version} for tid, idx in self._indexes.items()},
+            }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _is_fresh(self, index: PerspectiveIndex, version: Optional[int]) -> bool:
+        if not len(index):
+            return time.monotonic() - index.loaded_at < min(EMPTY_TTL_S, self.local_ttl_s)
+        if version is not None:
+            return index.version == version
+        return time.monotonic() - index.loaded_at < self.local_ttl_s
+
+    def _remote_version(self, tenant_id: str) -> Optional[int]:
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            value = redis.get(self._version_key(tenant_id))
+            # Cle absente (jamais rebuild depuis le deploiement) : version 0
+            return int(value) if value is not None else 0
+        except Exception as e:
+            self._count("redis_errors")
+            logger.debug(f"[PERSPECTIVE:INDEX] Redis version read failed: {e}")
+            return None
+
+    def _load(self, tenant_id: str) -> List[Perspective]:
+        if self._loader is None:
+            from .scorer import load_all_perspectives
+            return load_all_perspectives(tenant_id, raise_errors=True)
+        return self._loader(tenant_id)
+
+    def _tenant_lock(self, tenant_id: str) -> threading.Lock:
+        with self._lock:
+            return self._tenant_locks.setdefault(tenant_id, threading.Lock())
+
+    def _get_redis(self):
+        if not self._redis_resolved:
+            self._redis_resolved = True
+            try:
+                from knowbase.common.clients.redis_client import get_redis_client
+                self._redis = get_redis_client().client
+            except Exception as e:
+                logger.warning(f"[PERSPECTIVE:INDEX] Redis unavailable, TTL-only invalidation: {e}")
+                self._redis = None
+        return self._redis
+
+    @staticmethod
+    def _version_key(tenant_id: str) -> str:
+        return f"{REDIS_VERSION_PREFIX}:{tenant_id}"
+
+
+_index_cache: Optional[PerspectiveIndexCache] = None
+_index_cache_lock = threading.Lock()
+
+
+def get_perspective_index_cache() -> PerspectiveIndexCache:
+    """Singleton du cache d'index Perspectives."""
+    global _index_cache
+    if _index_cache is None:
+        with _index_cache_lock:
+            if _index_cache is None:
+                _index_cache = PerspectiveIndexCache()
+    return _index_cache
+
+
+def reset_perspective_index_cache() -> None:
+    """Reset du singleton (tests)."""
+    global _index_cache
+    _index_cache = None
+
+
+def get_perspective_index(tenant_id: str) -> PerspectiveIndex:
+    """Index Perspectives du tenant (cache process, invalidation versionnee)."""
+    return get_perspective_index_cache().get(tenant_id)
+
+
+def bump_perspective_version(tenant_id: str) -> Optional[int]:
+    """A appeler apres tout rebuild des Perspectives d'un tenant."""
+    return get_perspective_index_cache().bump(tenant_id)
@@ -62,6 +62,19 @@ class PerspectiveConfig:
     drop_clusters_with_single_doc: bool = True
     """Si True, drop les clusters dont tous les claims viennent d'un seul doc."""
 
+    # Parametres mode incremental (rattachement au centroide le plus proche)
+    incremental_radius_quantile: float = 0.95
+    """Rayon d'un cluster = ce quantile des distances membres -> centroide (espace UMAP)."""
+
+    incremental_radius_factor: float = 1.25
+    """Marge appliquee au rayon avant de classer un nouveau claim comme outlier."""
+
+    incremental_max_outlier_ratio: float = 0.10
+    """Outliers cumules / claims du build au-dela duquel un rebuild complet est requis."""
+
+    incremental_max_growth_ratio: float = 0.30
+    """Nouveaux claims cumules / claims du build au-dela duquel un rebuild complet est requis."""
+
 
 class Perspective(BaseModel):
     """
@@ -2,8 +2,15 @@
 """
 Orchestrateur batch pour la construction des Perspectives V2 (theme-scoped).
 
+Modes :
+- full        : UMAP + HDBSCAN sur tout le tenant, sauvegarde du PerspectiveModel
+- incremental : rattache les nouveaux claims aux Perspectives existantes
+                (centroide le plus proche dans l'espace UMAP sauvegarde)
+- auto        : incremental, bascule en full si pas de modele ou si la
+                derive (outliers / croissance) depasse les seuils de PerspectiveConfig
+
 Usage :
-    python -m knowbase.perspectives.orchestrator [--tenant default] [--dry-run] [--skip-llm]
+    python -m knowbase.perspectives.orchestrator [--tenant default] [--mode auto] [--dry-run] [--skip-llm] [--full-export]
 """
 
 from __future__ import annotations
@@ -11,11 +18,18 @@ from __future__ import annotations
 import logging
 import os
 import time
+from collections import defaultdict
 from typing import Dict
 
-from .builder import build_all_perspectives
+from .builder import build_perspectives_with_model, load_claims, load_doc_to_subjects_map
+from .incremental import assign_new_claims, load_perspective_model, save_perspective_model
+from .index import bump_perspective_version
 from .models import PerspectiveConfig
-from .persister import delete_all_perspectives, persist_perspectives
+from .persister import (
+    delete_all_perspectives,
+    persist_incremental_assignments,
+    persist_perspectives,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +47,8 @@ def run_perspective_engine(
     dry_run: bool = False,
     skip_llm: bool = False,
     config: PerspectiveConfig = None,
+    mode: str = "full",
+    full_export: bool = False,
 ) -> Dict:
     """
     Execute le pipeline Perspective theme-scoped.
@@ -42,14 +58,26 @@ def run_perspective_engine(
         dry_run: Si True, ne pas persister
         skip_llm: Si True, ne pas labelliser (debug clustering)
         config: Configuration du builder
+        mode: "full" | "incremental" | "auto"
+        full_export: Reecrit l'export des embeddings de claims au rebuild complet
 
     Returns:
         Stats globales
     """
+    if mode not in ("full", "incremental", "auto"):
+        raise ValueError(f"Unknown perspective engine mode '{mode}'")
     config = config or PerspectiveConfig()
     start = time.time()
     driver = _get_neo4j_driver()
 
+    if mode != "full":
+        stats = run_incremental_update(driver, tenant_id, config=config, dry_run=dry_run)
+        if not stats.get("rebuild_required") or mode == "incremental":
+            driver.close()
+            stats["elapsed_s"] = round(time.time() - start, 1)
+            return stats
+        logger.info(f"[PERSPECTIVE:INCR] Full rebuild required: {stats.get('reason')}")
+
     logger.info("=" * 60)
     logger.info(f"PERSPECTIVE ENGINE V2 — {'DRY RUN' if dry_run else 'PRODUCTION'}")
     logger.info("=" * 60)
@@ -58,8 +86,8 @@ def run_perspective_engine(
     logger.info(f"Skip LLM: {skip_llm}")
 
     # 1. Construire les Perspectives
-    perspectives, claim_assignments = build_all_perspectives(
-        driver, tenant_id, config=config, skip_llm=skip_llm,
+    perspectives, claim_assignments, model = build_perspectives_with_model(
+        driver, tenant_id, config=config, skip_llm=skip_llm, full_export=full_export,
     )
 
     if not perspectives:
@@ -79,6 +107,10 @@ def run_perspective_engine(
         logger.info(f"Deleted {deleted} previous perspectives")
 
         stats = persist_perspectives(driver, tenant_id, perspectives, claim_assignments)
+        if model is not None:
+            save_perspective_model(model)
+        # Invalide les index runtime (API workers) de ce tenant
+        bump_perspective_version(tenant_id)
 
     elapsed = time.time() - start
     logger.info("\n" + "=" * 60)
@@ -90,6 +122,7 @@ def run_perspective_engine(
 
     driver.close()
     return {
+        "mode": "full",
         "perspectives": len(perspectives),
         "claims_linked": stats.get("claims_linked", 0),
         "subjects_linked": stats.get("subjects_linked", 0),
@@ -97,16 +130,78 @@ def run_perspective_engine(
     }
 
 
+def run_incremental_update(
+    driver,
+    tenant_id: str,
+    config: PerspectiveConfig = None,
+    dry_run: bool = False,
+) -> Dict:
+    """
+    Rattache les claims crees depuis le dernier build aux Perspectives existantes.
+
+    Retourne rebuild_required=True (sans rien persister) si aucun modele
+    n'est disponible ou si la derive cumulee depasse les seuils.
+    """
+    config = config or PerspectiveConfig()
+    model = load_perspective_model(tenant_id)
+    if model is None or model.reducer is None:
+        return {"mode": "incremental", "rebuild_required": True, "reason": "no_model"}
+
+    export = load_claims(driver, tenant_id, with_metadata=False)
+    result = assign_new_claims(model, export)
+    drift = model.drift()
+    stats = {
+        "mode": "incremental",
+        "new_claims": result["new_claims"],
+        "assigned": result["assigned"],
+        "outliers": result["outliers"],
+        "perspectives_updated": len(result["assignments"]),
+        "claims_linked": 0,
+        "subjects_linked": 0,
+        **{k: round(v, 4) for k, v in drift.items()},
+    }
+
+    if model.needs_rebuild(config):
+        stats.update(rebuild_required=True, reason=f"drift {stats['outlier_ratio']}/{stats['growth_ratio']}")
+        return stats
+    if dry_run or not result["new_claims"]:
+        return stats
+
+    doc_ids = sorted({d for docs in result["doc_ids"].values() for d in docs})
+    doc_to_subjects = load_doc_to_subjects_map(driver, tenant_id, doc_ids=doc_ids) if doc_ids else {}
+    subjects_by_perspective: Dict[str, list] = defaultdict(list)
+    for pid, docs in result["doc_ids"].items():
+        seen = set()
+        for doc_id in docs:
+            for sid, name in doc_to_subjects.get(doc_id, []):
+                if sid not in seen:
+                    seen.add(sid)
+                    subjects_by_perspective[pid].append((sid, name))
+
+    persisted = persist_incremental_assignments(
+        driver, tenant_id, result["assignments"], dict(subjects_by_perspective),
+    )
+    stats["claims_linked"] = persisted["claims_linked"]
+    stats["subjects_linked"] = persisted["subjects_linked"]
+    save_perspective_model(model)
+    if result["assigned"]:
+        bump_perspective_version(tenant_id)
+    return stats
+
+
 def main():
     """Point d'entree CLI."""
     import argparse
     parser = argparse.ArgumentParser(description="OSMOSIS Perspective Engine V2 (theme-scoped)")
     parser.add_argument("--tenant", default="default")
+    parser.add_argument("--mode", choices=["full", "incremental", "auto"], default="full")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--skip-llm", action="store_true", help="Skip LLM labelling (debug)")
     parser.add_argument("--min-cluster-size", type=int, default=30)
     parser.add_argument("--umap-dim", type=int, default=15)
     parser.add_argument("--max-clusters", type=int, default=60)
+    parser.add_argument("--full-export", action="store_true",
+                        help="Rewrite the claim embedding export before a full rebuild")
     args = parser.parse_args()
 
     logging.basicConfig(level=logging.INFO, format="%(message)s")
@@ -122,6 +217,8 @@ def main():
         dry_run=args.dry_run,
         skip_llm=args.skip_llm,
         config=config,
+        mode=args.mode,
+        full_export=args.full_export,
     )
 
 
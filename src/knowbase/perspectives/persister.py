@@ -14,7 +14,8 @@ les sujets touches (N:M, derive du contenu des claims).
 from __future__ import annotations
 
 import logging
-from typing import Dict, List
+from datetime import datetime
+from typing import Dict, List, Tuple
 
 from .models import Perspective
 
@@ -106,3 +107,84 @@ def delete_all_perspectives(driver, tenant_id: str) -> int:
 
     logger.info(f"[PERSPECTIVE:DELETE] {deleted} perspectives deleted for tenant={tenant_id}")
     return deleted
+
+
+def persist_incremental_assignments(
+    driver,
+    tenant_id: str,
+    assignments: Dict[str, List[str]],
+    subjects_by_perspective: Dict[str, List[Tuple[str, str]]],
+) -> Dict[str, int]:
+    """
+    Rattache de nouveaux claims a des Perspectives existantes (mode incremental).
+
+    Ajoute les INCLUDES_CLAIM / TOUCHES_SUBJECT manquants puis recalcule
+    claim_count, doc_count et importance_score depuis le graphe (tension_count
+    et embedding restent ceux du dernier rebuild complet).
+
+    Args:
+        driver: Neo4j driver
+        tenant_id: Tenant ID
+        assignments: {perspective_id: [claim_ids]} (nouveaux claims)
+        subjects_by_perspective: {perspective_id: [(subject_id, subject_name)]}
+            sujets des documents des nouveaux claims
+    """
+    stats = {"perspectives_updated": 0, "claims_linked": 0, "subjects_linked": 0}
+    if not assignments:
+        return stats
+
+    now = datetime.utcnow().isoformat()
+    with driver.session() as session:
+        for pid, claim_ids in assignments.items():
+            for i in range(0, len(claim_ids), 500):
+                chunk = claim_ids[i:i + 500]
+                session.run("""
+                    UNWIND $claim_ids AS cid
+                    MATCH (p:Perspective {perspective_id: $pid, tenant_id: $tid})
+                    MATCH (c:Claim {claim_id: cid})
+                    MERGE (p)-[:INCLUDES_CLAIM]->(c)
+                """, pid=pid, tid=tenant_id, claim_ids=chunk)
+                stats["claims_linked"] += len(chunk)
+
+        subject_batch = [
+            {"pid": pid, "subjects": [{"sid": sid, "name": name} for sid, name in subjects]}
+            for pid, subjects in subjects_by_perspective.items() if subjects
+        ]
+        if subject_batch:
+            session.run("""
+                UNWIND $batch AS item
+                MATCH (p:Perspective {perspective_id: item.pid, tenant_id: $tid})
+                WITH p, [s IN item.subjects
+                         WHERE NOT s.sid IN coalesce(p.linked_subject_ids, [])] AS added
+                SET p.linked_subject_ids = coalesce(p.linked_subject_ids, []) + [s IN added | s.sid],
+                    p.linked_subject_names = coalesce(p.linked_subject_names, []) + [s IN added | s.name]
+                WITH p, added
+                UNWIND added AS s
+                OPTIONAL MATCH (sa:SubjectAnchor {subject_id: s.sid})
+                OPTIONAL MATCH (cs:ComparableSubject {subject_id: s.sid})
+                WITH p, coalesce(sa, cs) AS subj
+                WHERE subj IS NOT NULL
+                MERGE (p)-[:TOUCHES_SUBJECT]->(subj)
+            """, batch=subject_batch, tid=tenant_id)
+            stats["subjects_linked"] = sum(len(item["subjects"]) for item in subject_batch)
+
+        # Metriques (meme formule d'importance que le builder)
+        result = session.run("""
+            UNWIND $pids AS pid
+            MATCH (p:Perspective {perspective_id: pid, tenant_id: $tid})-[:INCLUDES_CLAIM]->(c:Claim)
+            WITH p, count(c) AS claims, count(DISTINCT c.doc_id) AS docs
+            SET p.added_claim_count = coalesce(p.added_claim_count, 0) + (claims - coalesce(p.claim_count, 0)),
+                p.claim_count = claims,
+                p.doc_count = docs,
+                p.importance_score = log(1 + claims) + 1.5 * log(1 + docs)
+                                     + 0.5 * coalesce(p.tension_count, 0),
+                p.updated_at = $now
+            RETURN count(p) AS updated
+        """, pids=list(assignments), tid=tenant_id, now=now).single()
+        stats["perspectives_updated"] = result["updated"] if result else 0
+
+    logger.info(
+        f"[PERSPECTIVE:PERSIST] incremental: {stats['perspectives_updated']} perspectives, "
+        f"{stats['claims_linked']} claim links, {stats['subjects_linked']} subject links"
+    )
+    return stats
@@ -15,11 +15,11 @@ plusieurs ComparableSubjects (ex: "comparaison sécurité S/4HANA vs CPE").
 from __future__ import annotations
 
 import logging
-import os
 from typing import Any, Dict, List, Tuple
 
 import numpy as np
 
+from .index import PerspectiveIndex
 from .models import Perspective, ScoredPerspective
 
 logger = logging.getLogger(__name__)
@@ -30,6 +30,15 @@ SEMANTIC_HARD_GATE = 0.15
 TENSION_EXCEPTION_THRESHOLD = 2
 
 
+def _neo4j_session():
+    """Session sur le driver poole partage (get_neo4j_client), pas un driver par appel."""
+    from knowbase.common.clients.neo4j_client import get_neo4j_client
+    client = get_neo4j_client()
+    if client.driver is None:
+        raise RuntimeError("Neo4j driver not connected")
+    return client.driver.session(database=client.database)
+
+
 # ---------------------------------------------------------------------------
 # 1. Resolution des subject_ids (signal de boost, pas filtre)
 # ---------------------------------------------------------------------------
@@ -58,13 +67,7 @@ def resolve_subject_ids_from_claims(
         return [], "fallback"
 
     try:
-        from neo4j import GraphDatabase
-        uri = os.environ.get("NEO4J_URI", "bolt://neo4j:7687")
-        user = os.environ.get("NEO4J_USER", "neo4j")
-        password = os.environ.get("NEO4J_PASSWORD", "graphiti_neo4j_pass")
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-
-        with driver.session() as session:
+        with _neo4j_session() as session:
             result = session.run("""
                 UNWIND $doc_ids AS did
                 MATCH (dc:DocumentContext {doc_id: did})-[:ABOUT_SUBJECT]->(sa:SubjectAnchor)
@@ -74,7 +77,6 @@ def resolve_subject_ids_from_claims(
                 LIMIT 5
             """, doc_ids=list(doc_ids))
             candidates = [dict(r) for r in result]
-        driver.close()
     except Exception as e:
         logger.warning(f"[PERSPECTIVE:RESOLVE] Neo4j query failed: {e}")
         return [], "fallback"
@@ -95,21 +97,18 @@ def resolve_subject_ids_from_claims(
 # 2. Chargement des Perspectives (toutes, sans filtre subject)
 # ---------------------------------------------------------------------------
 
-def load_all_perspectives(tenant_id: str) -> List[Perspective]:
+def load_all_perspectives(tenant_id: str, raise_errors: bool = False) -> List[Perspective]:
     """
     Charge TOUTES les Perspectives d'un tenant.
 
     Plus de filtre par subject_id : la couche V2 est theme-scoped,
     le filtrage par sujet se fait via le boost de scoring si pertinent.
+
+    raise_errors=True propage les erreurs Neo4j au lieu de retourner []
+    (le cache d'index ne doit pas memoriser un echec).
     """
     try:
-        from neo4j import GraphDatabase
-        uri = os.environ.get("NEO4J_URI", "bolt://neo4j:7687")
-        user = os.environ.get("NEO4J_USER", "neo4j")
-        password = os.environ.get("NEO4J_PASSWORD", "graphiti_neo4j_pass")
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-
-        with driver.session() as session:
+        with _neo4j_session() as session:
             result = session.run("""
                 MATCH (p:Perspective {tenant_id: $tid})
                 RETURN p
@@ -119,12 +118,13 @@ def load_all_perspectives(tenant_id: str) -> List[Perspective]:
                 node = record["p"]
                 props = dict(node)
                 perspectives.append(Perspective.from_neo4j_record(props))
-        driver.close()
         logger.info(f"[PERSPECTIVE:LOAD] {len(perspectives)} perspectives loaded for tenant={tenant_id}")
         return perspectives
 
     except Exception as e:
         logger.warning(f"[PERSPECTIVE:LOAD] Failed: {e}")
+        if raise_errors:
+            raise
         return []
 
 
@@ -150,46 +150,12 @@ def score_perspectives(
 
     Le subject overlap est un BOOST, pas un filtre. Une Perspective sans
     overlap reste eligible si son score semantique est suffisant.
+
+    Calcul vectorise (1 produit matrice-vecteur). Au runtime, preferer
+    get_perspective_index(tenant_id).score(...) qui garde la matrice en
+    memoire entre les questions.
     """
-    q_vec = np.array(question_embedding) if question_embedding else None
-    boost_set = set(boost_subject_ids or [])
-
-    scored = []
-    for p in perspectives:
-        # Semantic score (cross-lingue par construction)
-        semantic = 0.0
-        if q_vec is not None and p.embedding:
-            p_vec = np.array(p.embedding)
-            dot = np.dot(q_vec, p_vec)
-            norms = np.linalg.norm(q_vec) * np.linalg.norm(p_vec)
-            semantic = float(dot / norms) if norms > 0 else 0.0
-
-        # Bonuses structurels
-        tension_bonus = 0.15 if p.tension_count > 0 else 0.0
-        diversity_bonus = 0.10 if p.doc_count >= 3 else 0.0
-
-        # Importance (log-normalise)
-        import math
-        importance_norm = min(p.importance_score / 10.0, 1.0)  # cap a 10
-        importance_bonus = importance_norm * 0.10
-
-        # Subject overlap : boost si la Perspective touche au moins un sujet identifie
-        subject_bonus = 0.0
-        if boost_set and p.linked_subject_ids:
-            overlap = boost_set.intersection(set(p.linked_subject_ids))
-            if overlap:
-                subject_bonus = 0.20
-
-        total = semantic + tension_bonus + diversity_bonus + importance_bonus + subject_bonus
-
-        scored.append(ScoredPerspective(
-            perspective=p,
-            relevance_score=total,
-            semantic_score=semantic,
-            subject_overlap_bonus=subject_bonus,
-        ))
-
-    return sorted(scored, key=lambda s: -s.relevance_score)
+    return PerspectiveIndex.build(perspectives).score(question_embedding, boost_subject_ids)
 
 
 # ---------------------------------------------------------------------------
@@ -223,13 +189,7 @@ def rerank_claims_in_perspective(
         return []
 
     try:
-        from neo4j import GraphDatabase
-        uri = os.environ.get("NEO4J_URI", "bolt://neo4j:7687")
-        user = os.environ.get("NEO4J_USER", "neo4j")
-        password = os.environ.get("NEO4J_PASSWORD", "graphiti_neo4j_pass")
-        driver = GraphDatabase.driver(uri, auth=(user, password))
-
-        with driver.session() as session:
+        with _neo4j_session() as session:
             result = session.run("""
                 MATCH (p:Perspective {perspective_id: $pid})-[:INCLUDES_CLAIM]->(c:Claim)
                 WHERE c.embedding IS NOT NULL
@@ -241,7 +201,6 @@ def rerank_claims_in_perspective(
                 LIMIT $max_load
             """, pid=perspective_id, max_load=max_load)
             claims = [dict(r) for r in result]
-        driver.close()
 
         if not claims:
             return []
@@ -24,6 +24,7 @@ from knowbase.relations.types import (
     # Phase 2.10
     RelationMaturity,
 )
+from knowbase.common.gazetteer import GazetteerMatcher
 from knowbase.common.llm_router import LLMRouter, TaskType, get_llm_router
 
 # Phase 2 Refactoring - Import depuis modules extraits
@@ -225,10 +226,13 @@ class LLMRelationExtractor:
             [(concept_A, concept_B, context_snippet), ...]
         """
         pairs = []
-        text_lower = full_text.lower()
 
-        # Pour chaque concept, trouver toutes ses mentions dans le texte
-        concept_mentions = []
+        # Toutes les formes (canonical_name + surface_forms) compilées en un
+        # gazetteer : une seule passe sur le texte pour tous les concepts.
+        # Hits triés par position puis ordre d'enregistrement (= ancien tri
+        # stable des recherches forme par forme).
+        matcher = GazetteerMatcher()
+        matcher_concepts: List[Dict[str, Any]] = []
         for concept in concepts:
             # Fix 2025-10-20: Skip concepts avec canonical_name None
             canonical_name = concept.get("canonical_name")
@@ -238,41 +242,22 @@ class LLMRelationExtractor:
                 )
                 continue
 
-            # Chercher canonical_name
-            canonical = canonical_name.lower()
-            start = 0
-            while True:
-                pos = text_lower.find(canonical, start)
-                if pos == -1:
-                    break
-                concept_mentions.append({
-                    "concept": concept,
-                    "position": pos,
-                    "length": len(canonical),
-                    "text": canonical
-                })
-                start = pos + 1
+            # Index dans la liste: les dicts concepts ne sont pas hashables
+            key = len(matcher_concepts)
+            matcher_concepts.append(concept)
+            matcher.add(key, canonical_name)
+            # Skip empty surface forms (ignorées par le matcher)
+            matcher.add_many(key, concept.get("surface_forms", []))
 
-            # Chercher surface_forms
-            for form in concept.get("surface_forms", []):
-                if not form:  # Skip empty surface forms
-                    continue
-                form_lower = form.lower()
-                start = 0
-                while True:
-                    pos = text_lower.find(form_lower, start)
-                    if pos == -1:
-                        break
-                    concept_mentions.append({
-                        "concept": concept,
-                        "position": pos,
-                        "length": len(form_lower),
-                        "text": form_lower
-                    })
-                    start = pos + 1
-
-        # Trier par position
-        concept_mentions.sort(key=lambda x: x["position"])
+        concept_mentions = [
+            {
+                "concept": matcher_concepts[hit.key],
+                "position": hit.start,
+                "length": hit.end - hit.start,
+                "text": hit.form,
+            }
+            for hit in matcher.find_all(full_text)
+        ]
 
         # Trouver paires dans fenêtre de co-occurrence
         for i, mention_a in enumerate(concept_mentions):
@@ -0,0 +1,208 @@
+"""
+Index des mentions par document — surface form → DocItems qui la contiennent.
+
+Avant : TextWindowBuilder._find_items_with_surface_forms relançait, pour
+CHAQUE candidat, un lower() de chaque DocItem puis une recherche de
+sous-chaîne par surface form (2 000 candidats × 3 000 DocItems = des
+millions d'opérations identiques).
+
+Maintenant :
+- les surface forms de tous les candidats du document sont compilées en
+  un automate Aho-Corasick, et chaque DocItem est parcouru une seule fois
+  → postings form → {item_id}
+- les fenêtres sont construites par union / intersection de postings
+- une forme inconnue au moment de la construction (candidat tardif) est
+  indexée à la demande, en un seul passage pour toutes les formes manquantes
+- les index sont gardés dans un LRU borné (par tenant + document) ;
+  run_pass3_consolidation invalide l'entrée du document au début de chaque
+  run, l'index ne sert donc qu'à l'intérieur d'un run Pass 3 (les
+  extracteurs Pass 2 travaillent sur des chunks, pas sur les DocItems)
+
+Sémantique identique à l'ancien `form.lower() in text.lower()`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from knowbase.common.aho_corasick import AhoCorasickAutomaton
+
+logger = logging.getLogger(__name__)
+
+MAX_DOCUMENTS = int(os.getenv("MENTION_INDEX_MAX_DOCS", "16"))
+TTL_S = float(os.getenv("MENTION_INDEX_TTL_S", "900"))
+
+
+class DocumentMentionIndex:
+    """
+    DocItems d'un document + postings des surface forms indexées.
+
+    Les formes sont normalisées en minuscules ; les items doivent porter
+    au minimum "item_id" et "text" ("section_id" pour le filtrage).
+    """
+
+    def __init__(self, document_id: str, docitems: List[Dict], forms: Iterable[str] = ()):
+        self.document_id = document_id
+        self.docitems = docitems
+        self.created_at = time.time()
+        self._lowered: List[str] = [(item.get("text") or "").lower() for item in docitems]
+        self._postings: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.add_forms(forms)
+
+    @property
+    def forms(self) -> Set[str]:
+        return set(self._postings)
+
+    def add_forms(self, forms: Iterable[str]) -> int:
+        """Indexe les formes encore absentes (un passage sur les DocItems). Retourne le nombre ajouté."""
+        with self._lock:
+            missing = sorted({f.lower() for f in forms if f is not None} - set(self._postings))
+            if not missing:
+                return 0
+
+            postings: Dict[str, Set[str]] = {form: set() for form in missing}
+            if "" in postings:
+                # "" in text est toujours vrai (comportement historique conservé)
+                postings[""] = {item["item_id"] for item in self.docitems}
+
+            automaton = AhoCorasickAutomaton(missing)
+            for item, text in zip(self.docitems, self._lowered):
+                if not text:
+                    continue
+                for pid in automaton.find_all(text):
+                    postings[missing[pid]].add(item["item_id"])
+
+            self._postings.update(postings)
+            return len(missing)
+
+    def items_with_any(self, forms: Iterable[str], sections: Optional[Set[str]] = None) -> Set[str]:
+        """item_ids contenant au moins une des formes (filtrés par section si fournie)."""
+        forms = [f.lower() for f in forms if f is not None]
+        if any(f not in self._postings for f in forms):
+            self.add_forms(forms)
+
+        found: Set[str] = set()
+        for form in forms:
+            found |= self._postings.get(form, set())
+        if sections:
+            found &= self.item_ids_in_sections(sections)
+        return found
+
+    def item_ids_in_sections(self, sections: Set[str]) -> Set[str]:
+        return {item["item_id"] for item in self.docitems if item.get("section_id") in sections}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "docitems": len(self.docitems),
+            "forms": len(self._postings),
+            "postings": sum(len(p) for p in self._postings.values()),
+        }
+
+
+class MentionIndexCache:
+    """
+    LRU des DocumentMentionIndex, borné en nombre de documents et en âge.
+
+    Clé : (tenant_id, document_id). invalidate() est appelé au début de
+    chaque run Pass 3 du document ; l'âge borne en plus le risque de servir
+    les DocItems d'une version précédente d'un document réingéré.
+    """
+
+    def __init__(self, max_documents: int = MAX_DOCUMENTS, ttl_s: float = TTL_S):
+        self.max_documents = max(1, max_documents)
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[Tuple[str, str], DocumentMentionIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get_or_build(
+        self,
+        tenant_id: str,
+        document_id: str,
+        load_docitems: Callable[[], List[Dict]],
+        forms: Iterable[str] = (),
+    ) -> DocumentMentionIndex:
+        """
+        Index du document, construit au premier accès.
+
+        Args:
+            load_docitems: Chargement des DocItems (appelé seulement en cas de miss)
+            forms: Surface forms à garantir dans l'index
+        """
+        key = (tenant_id, document_id)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None and time.time() - index.created_at > self.ttl_s:
+                del self._entries[key]
+                index = None
+            if index is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+
+        if index is None:
+            self._stats["misses"] += 1
+            t0 = time.time()
+            index = DocumentMentionIndex(document_id, load_docitems() or [], forms)
+            logger.debug(
+                f"[OSMOSE:MentionIndex] Built index for {document_id}: {index.stats()} "
+                f"in {int((time.time() - t0) * 1000)}ms"
+            )
+            # Un index vide (échec de chargement) n'est pas mis en cache
+            if index.docitems:
+                self._put(key, index)
+        else:
+            index.add_forms(forms)
+        return index
+
+    def invalidate(self, tenant_id: str, document_id: str) -> None:
+        with self._lock:
+            self._entries.pop((tenant_id, document_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._stats, "documents": len(self._entries)}
+
+    def _put(self, key: Tuple[str, str], index: DocumentMentionIndex) -> None:
+        with self._lock:
+            self._entries[key] = index
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_documents:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+
+_cache: Optional[MentionIndexCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_mention_index_cache() -> MentionIndexCache:
+    """Singleton du cache d'index de mentions (fenêtres Pass 3)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = MentionIndexCache()
+    return _cache
+
+
+def reset_mention_index_cache() -> None:
+    """Reset du singleton (tests)."""
+    global _cache
+    _cache = None
+
+
+__all__ = [
+    "DocumentMentionIndex",
+    "MentionIndexCache",
+    "get_mention_index_cache",
+    "reset_mention_index_cache",
+]
@@ -30,6 +30,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 
+from knowbase.relations.mention_index import (
+    DocumentMentionIndex,
+    MentionIndexCache,
+    get_mention_index_cache,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -1262,17 +1268,39 @@ class TextWindowBuilder:
     NEIGHBOR_LEVEL_1 = 1  # ±1
     NEIGHBOR_LEVEL_2 = 3  # ±3
 
-    def __init__(self, neo4j_client, tenant_id: str = "default"):
+    def __init__(
+        self,
+        neo4j_client,
+        tenant_id: str = "default",
+        mention_cache: Optional[MentionIndexCache] = None
+    ):
         """
         Initialise le builder.
 
         Args:
             neo4j_client: Client Neo4j
             tenant_id: ID du tenant
+            mention_cache: Cache d'index de mentions (défaut : singleton partagé)
         """
         self.neo4j = neo4j_client
         self.tenant_id = tenant_id
-        self._docitems_cache: Dict[str, List[Dict]] = {}  # doc_id -> items
+        # DocItems + postings surface form -> item_ids, LRU partagé entre passes
+        self._mention_cache = mention_cache or get_mention_index_cache()
+
+    def prime(self, document_id: str, candidates: List[RelationCandidate]) -> None:
+        """
+        Indexe en une passe les surface forms de tous les candidats du document.
+
+        Sans appel préalable, les formes sont indexées à la demande par
+        build_window (même résultat, plus de passages sur les DocItems).
+        """
+        forms: List[str] = []
+        for candidate in candidates:
+            subject_forms, object_forms = self._candidate_forms(candidate)
+            forms.extend(subject_forms)
+            forms.extend(object_forms)
+        index = self._get_mention_index(document_id, forms)
+        logger.info(f"[OSMOSE:Pass3:Window] Mention index for {document_id}: {index.stats()}")
 
     def build_window(
         self,
@@ -1291,8 +1319,9 @@ class TextWindowBuilder:
         Returns:
             TextWindow ou None si échec
         """
-        # Charger les DocItems du document (avec cache)
-        docitems = self._get_docitems_for_document(document_id)
+        # Charger les DocItems + index de mentions du document (avec cache)
+        index = self._get_mention_index(document_id)
+        docitems = index.docitems
         if not docitems:
             logger.warning(f"[OSMOSE:Pass3:Window] No DocItems for {document_id}")
             return None
@@ -1303,7 +1332,7 @@ class TextWindowBuilder:
         # V2 FIX: Rechercher d'abord les DocItems contenant les surface_forms
         # Car les ANCHORED_IN peuvent être incorrects
         seed_items = self._find_items_with_surface_forms(
-            docitems, candidate, candidate.shared_sections
+            index, candidate, candidate.shared_sections
         )
 
         # Fallback sur anchor_items si aucun DocItem avec surface_forms
@@ -1347,7 +1376,7 @@ class TextWindowBuilder:
 
     def _find_items_with_surface_forms(
         self,
-        docitems: List[Dict],
+        index: DocumentMentionIndex,
         candidate: RelationCandidate,
         priority_sections: List[str]
     ) -> set:
@@ -1359,41 +1388,19 @@ class TextWindowBuilder:
         2. DocItems dans les mêmes sections que les anchors
 
         Args:
-            docitems: Liste de tous les DocItems
+            index: Index des mentions du document
             candidate: Candidat avec surface_forms
             priority_sections: Sections prioritaires
 
         Returns:
             Set d'item_ids contenant au moins une surface_form
         """
-        subject_forms = [f.lower() for f in (candidate.subject_surface_forms or [candidate.subject_name])]
-        object_forms = [f.lower() for f in (candidate.object_surface_forms or [candidate.object_name])]
-
-        items_with_subject = set()
-        items_with_object = set()
+        subject_forms, object_forms = self._candidate_forms(candidate)
 
         # Filtrer d'abord par sections prioritaires
         priority_set = set(priority_sections)
-        filtered_items = [
-            item for item in docitems
-            if item.get("section_id") in priority_set
-        ] if priority_set else docitems
-
-        for item in filtered_items:
-            text_lower = (item.get("text") or "").lower()
-            item_id = item["item_id"]
-
-            # Chercher surface_forms du subject
-            for form in subject_forms:
-                if form in text_lower:
-                    items_with_subject.add(item_id)
-                    break
-
-            # Chercher surface_forms de l'object
-            for form in object_forms:
-                if form in text_lower:
-                    items_with_object.add(item_id)
-                    break
+        items_with_subject = index.items_with_any(subject_forms, priority_set)
+        items_with_object = index.items_with_any(object_forms, priority_set)
 
         # Idéalement on veut des items qui ont les DEUX
         items_with_both = items_with_subject & items_with_object
@@ -1413,11 +1420,28 @@ class TextWindowBuilder:
             )
         return all_found
 
+    @staticmethod
+    def _candidate_forms(candidate: RelationCandidate) -> Tuple[List[str], List[str]]:
+        """Surface forms (minuscules) du sujet et de l'objet, nom canonique à défaut."""
+        subject_forms = [f.lower() for f in (candidate.subject_surface_forms or [candidate.subject_name])]
+        object_forms = [f.lower() for f in (candidate.object_surface_forms or [candidate.object_name])]
+        return subject_forms, object_forms
+
+    def _get_mention_index(self, document_id: str, forms: List[str] = ()) -> DocumentMentionIndex:
+        """Index de mentions du document (DocItems chargés une fois, LRU partagé)."""
+        return self._mention_cache.get_or_build(
+            self.tenant_id,
+            document_id,
+            lambda: self._load_docitems(document_id),
+            forms,
+        )
+
     def _get_docitems_for_document(self, document_id: str) -> List[Dict]:
         """Récupère les DocItems d'un document (avec cache)."""
-        if document_id in self._docitems_cache:
-            return self._docitems_cache[document_id]
+        return self._get_mention_index(document_id).docitems
 
+    def _load_docitems(self, document_id: str) -> List[Dict]:
+        """Charge les DocItems d'un document depuis Neo4j."""
         query = """
         MATCH (d:DocItem {tenant_id: $tenant_id, doc_id: $document_id})
         WHERE d.text IS NOT NULL AND size(d.text) > 0
@@ -1448,7 +1472,6 @@ class TextWindowBuilder:
                         "charspan_start": record["charspan_start"] or 0
                     })
 
-            self._docitems_cache[document_id] = items
             logger.debug(f"[OSMOSE:Pass3:Window] Loaded {len(items)} DocItems for {document_id}")
 
         except Exception as e:
@@ -1663,6 +1686,9 @@ async def run_pass3_consolidation(
 
     logger.info(f"[OSMOSE:Pass3] Starting consolidation for {document_id}")
 
+    # DocItems relus à chaque run : le document a pu être réingéré
+    get_mention_index_cache().invalidate(tenant_id, document_id)
+
     # 1. Générer candidats
     generator = CandidateGenerator(neo4j_client, tenant_id)
     candidates = generator.generate_candidates(document_id, max_candidates)
@@ -1675,6 +1701,7 @@ async def run_pass3_consolidation(
 
     # 2. V2: Créer le TextWindowBuilder pour fenêtres ciblées
     window_builder = TextWindowBuilder(neo4j_client, tenant_id)
+    window_builder.prime(document_id, candidates)
 
     # 3. Vérifier les candidats EN PARALLÈLE avec escalade
     verifier = ExtractiveVerifier(llm_router, tenant_id)
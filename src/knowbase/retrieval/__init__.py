@@ -4,6 +4,9 @@ OSMOSE Retrieval Layer — Package principal.
 Modules:
 - rechunker: Re-chunking des TypeAwareChunks pour embeddings vectoriels
 - qdrant_layer_r: Gestion collection Qdrant knowbase_chunks_v2 (Layer R)
+- sparse_bm25: Vecteurs sparse BM25 (tokenizer, vecteurs document/query)
+- layer_r_profiles: Profils de collection (float32 / int8 / binary)
+- layer_r_migration: Migration blue/green + bascule d'alias
 """
 
 from knowbase.retrieval.rechunker import SubChunk, rechunk_for_retrieval
@@ -12,6 +15,9 @@ from knowbase.retrieval.qdrant_layer_r import (
     upsert_layer_r,
     delete_doc_from_layer_r,
     search_layer_r,
+    backfill_layer_r_sparse,
+    bootstrap_layer_r,
+    ensure_payload_indexes,
     COLLECTION_NAME,
 )
 
@@ -22,5 +28,8 @@ __all__ = [
     "upsert_layer_r",
     "delete_doc_from_layer_r",
     "search_layer_r",
+    "backfill_layer_r_sparse",
+    "bootstrap_layer_r",
+    "ensure_payload_indexes",
     "COLLECTION_NAME",
 ]
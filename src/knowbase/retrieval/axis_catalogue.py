@@ -0,0 +1,415 @@
+# src/knowbase/retrieval/axis_catalogue.py
+"""
+Catalogue exact des valeurs d'axes d'applicabilite (release_id, version...).
+
+Avant : chaque question passant par le QueryDecomposer relancait une requete
+Neo4j (ApplicabilityAxis) et un scroll Qdrant de 100 points pour echantillonner
+les champs axis_* — 2 allers-retours reseau par question, et les valeurs
+presentes uniquement au-dela des 100 premiers points etaient ignorees.
+
+Maintenant, par process :
+- valeurs exactes via les facet counts Qdrant (exact=True) sur les champs
+  axis_* indexes keyword (KEYWORD_INDEX_FIELDS + payload_schema), fusionnees
+  avec les known_values des noeuds ApplicabilityAxis
+- nombre de documents par valeur (facet doc_id filtre par valeur cote
+  Qdrant, HAS_AXIS_VALUE cote Neo4j ; max des deux sources)
+- le catalogue est garde en memoire : une question ne coute plus qu'un
+  lookup de dict
+
+Invalidation : l'ingestion appelle bump_axis_catalogue_version() apres
+l'upsert Layer R ou la persistance des axes. Le process courant oublie son
+catalogue immediatement ; les autres process voient la cle Redis
+`osmose:axis_catalogue:version` changer, relue au plus toutes les
+AXIS_CATALOGUE_VERSION_CHECK_S secondes (jamais a chaque question). Le
+catalogue est dans tous les cas recharge apres AXIS_CATALOGUE_TTL_S (borne
+haute, meme si la version Redis n'a pas bouge). L'hygiene KG (fusion /
+suppression d'axes) incremente aussi la version.
+
+Echecs : un chargement en echec n'est jamais mis en cache (le catalogue
+precedent reste servi) ; un chargement partiel (une des deux sources en
+echec) n'est garde que AXIS_CATALOGUE_PARTIAL_TTL_S.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REDIS_VERSION_KEY = "osmose:axis_catalogue:version"
+TTL_S = float(os.getenv("AXIS_CATALOGUE_TTL_S", "600"))
+VERSION_CHECK_S = float(os.getenv("AXIS_CATALOGUE_VERSION_CHECK_S", "5"))
+PARTIAL_TTL_S = float(os.getenv("AXIS_CATALOGUE_PARTIAL_TTL_S", "30"))
+# Nombre max de valeurs / documents remontes par requete facet
+FACET_LIMIT = int(os.getenv("AXIS_CATALOGUE_FACET_LIMIT", "10000"))
+
+AXIS_FIELD_PREFIX = "axis_"
+
+# {axis_key: {valeur: nb documents}}
+AxisValueCounts = Dict[str, Dict[str, int]]
+AxisLoader = Callable[[], AxisValueCounts]
+
+
+class PartialAxisValueCounts(dict):
+    """Resultat d'un loader dont une source a echoue (cache court)."""
+
+
+@dataclass
+class AxisCatalogue:
+    """Valeurs connues par axe, avec le nombre de documents de chaque valeur."""
+    value_counts: AxisValueCounts = field(default_factory=dict)
+    version: Optional[int] = None
+    loaded_at: float = 0.0
+    complete: bool = True
+    _known: Dict[Optional[int], Dict[str, List[str]]] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.value_counts)
+
+    def known_values(self, max_values_per_axis: Optional[int] = None) -> Dict[str, List[str]]:
+        """
+        {axis_key: [valeurs triees]} — format historique du decomposer.
+
+        Avec max_values_per_axis, seules les valeurs couvrant le plus de
+        documents sont gardees (puis retriees). Memoise par limite.
+        """
+        known = self._known.get(max_values_per_axis)
+        if known is None:
+            known = {}
+            for axis_key, counts in self.value_counts.items():
+                values = self.ranked_values(axis_key)
+                if max_values_per_axis is not None:
+                    values = values[:max_values_per_axis]
+                known[axis_key] = sorted(value for value, _ in values)
+            self._known[max_values_per_axis] = known
+        return known
+
+    def ranked_values(self, axis_key: str) -> List[Tuple[str, int]]:
+        """[(valeur, nb documents)] par nombre de documents decroissant."""
+        counts = self.value_counts.get(axis_key, {})
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def doc_count(self, axis_key: str, value: str) -> int:
+        return self.value_counts.get(axis_key, {}).get(value, 0)
+
+
+def _clean(value) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def _merge_counts(target: AxisValueCounts, source: AxisValueCounts) -> None:
+    """Fusionne deux sources : une valeur vue des deux cotes garde le max."""
+    for axis_key, counts in source.items():
+        merged = target.setdefault(axis_key, {})
+        for value, count in counts.items():
+            merged[value] = max(merged.get(value, 0), count)
+
+
+def load_neo4j_axis_values() -> AxisValueCounts:
+    """ApplicabilityAxis.known_values + documents par valeur (HAS_AXIS_VALUE)."""
+    from knowbase.common.clients.neo4j_client import get_neo4j_client
+
+    axes: AxisValueCounts = {}
+    driver = get_neo4j_client().driver
+    with driver.session() as session:
+        result = session.run(
+            "MATCH (a:ApplicabilityAxis) WHERE a._hygiene_status IS NULL "
+            "OPTIONAL MATCH (dc:DocumentContext)-[r:HAS_AXIS_VALUE]->(a) "
+            "WITH a, r.scalar_value AS value, count(DISTINCT dc.doc_id) AS docs "
+            "RETURN a.axis_key AS key, a.known_values AS vals, "
+            "collect(CASE WHEN value IS NULL THEN NULL ELSE [value, docs] END) AS counts"
+        )
+        for record in result:
+            key = record["key"]
+            if not key:
+                continue
+            counts = axes.setdefault(key, {})
+            for raw in record["vals"] or []:
+                value = _clean(raw)
+                if value is not None:
+                    counts.setdefault(value, 0)
+            for raw, docs in record["counts"] or []:
+                value = _clean(raw)
+                if value is not None:
+                    counts[value] = max(counts.get(value, 0), int(docs))
+    return {key: counts for key, counts in axes.items() if counts}
+
+
+def _axis_fields(client, collection: str, axis_keys: List[str]) -> List[str]:
+    """Champs axis_* candidats au facet : indexes declares + schema + axes Neo4j."""
+    from knowbase.retrieval.qdrant_layer_r import KEYWORD_INDEX_FIELDS
+
+    fields = [f for f in KEYWORD_INDEX_FIELDS if f.startswith(AXIS_FIELD_PREFIX)]
+    try:
+        schema = client.get_collection(collection).payload_schema or {}
+        fields.extend(f for f in schema if f.startswith(AXIS_FIELD_PREFIX))
+    except Exception as e:
+        logger.debug(f"[OSMOSE:AxisCatalogue] Cannot read payload schema of {collection}: {e}")
+    fields.extend(f"{AXIS_FIELD_PREFIX}{key}" for key in axis_keys)
+    return list(dict.fromkeys(fields))
+
+
+def load_qdrant_axis_values(
+    client=None,
+    collection: Optional[str] = None,
+    axis_keys: Optional[List[str]] = None,
+) -> AxisValueCounts:
+    """
+    Valeurs exactes des champs axis_* via facet counts Qdrant.
+
+    Le facet compte des points (sub-chunks) : le nombre de documents d'une
+    valeur est obtenu par un second facet sur doc_id filtre par la valeur.
+    Un champ sans index keyword est ignore (le facet echoue cote serveur) ;
+    si tous les facets echouent, l'erreur est propagee (Qdrant indisponible).
+    """
+    from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+    if client is None:
+        from knowbase.retrieval.qdrant_layer_r import get_qdrant_client
+        client = get_qdrant_client()
+    if collection is None:
+        from knowbase.config.settings import get_settings
+        collection = get_settings().qdrant_collection
+
+    axes: AxisValueCounts = {}
+    fields = _axis_fields(client, collection, axis_keys or [])
+    last_error: Optional[Exception] = None
+    faceted = 0
+    for field_name in fields:
+        try:
+            hits = client.facet(
+                collection_name=collection, key=field_name, limit=FACET_LIMIT, exact=True,
+            ).hits
+        except Exception as e:
+            logger.debug(f"[OSMOSE:AxisCatalogue] Facet on {field_name} failed: {e}")
+            last_error = e
+            continue
+        faceted += 1
+
+        counts: Dict[str, int] = {}
+        for hit in hits:
+            value = _clean(hit.value)
+            if value is None:
+                continue
+            try:
+                docs = client.facet(
+                    collection_name=collection,
+                    key="doc_id",
+                    facet_filter=Filter(must=[
+                        FieldCondition(key=field_name, match=MatchValue(value=hit.value)),
+                    ]),
+                    limit=FACET_LIMIT,
+                    exact=True,
+                ).hits
+                counts[value] = len(docs)
+            except Exception as e:
+                logger.debug(f"[OSMOSE:AxisCatalogue] doc_id facet for {field_name}={value} failed: {e}")
+                counts[value] = 0
+        if counts:
+            axes[field_name[len(AXIS_FIELD_PREFIX):]] = counts
+    if fields and not faceted and last_error is not None:
+        raise last_error
+    return axes
+
+
+def load_axis_value_counts() -> AxisValueCounts:
+    """
+    Neo4j ApplicabilityAxis complete par les facets Qdrant.
+
+    Une source en echec donne un PartialAxisValueCounts ; les deux en echec
+    propagent l'erreur (rien n'est mis en cache).
+    """
+    axes: AxisValueCounts = {}
+    errors: List[str] = []
+    try:
+        axes = load_neo4j_axis_values()
+    except Exception as e:
+        logger.warning(f"[OSMOSE:AxisCatalogue] Neo4j axis query failed: {e}")
+        errors.append(f"neo4j: {e}")
+    try:
+        _merge_counts(axes, load_qdrant_axis_values(axis_keys=list(axes)))
+    except Exception as e:
+        logger.warning(f"[OSMOSE:AxisCatalogue] Qdrant axis facets failed: {e}")
+        errors.append(f"qdrant: {e}")
+    if len(errors) == 2:
+        raise RuntimeError(f"Axis catalogue sources unavailable ({'; '.join(errors)})")
+    return PartialAxisValueCounts(axes) if errors else axes
+
+
+class AxisCatalogueCache:
+    """
+    Cache process du catalogue d'axes, invalide par version Redis.
+
+    Usage:
+        catalogue = get_axis_catalogue()
+        known_axes = catalogue.known_values()
+        catalogue.ranked_values("release_id")  # [("2023", 42), ("2022", 17), ...]
+    """
+
+    def __init__(
+        self,
+        loader: Optional[AxisLoader] = None,
+        redis_client=None,
+        ttl_s: float = TTL_S,
+        version_check_s: float = VERSION_CHECK_S,
+    ):
+        """
+        Args:
+            loader: loader() -> {axis_key: {valeur: nb documents}}
+                (defaut: load_axis_value_counts)
+            redis_client: Client redis-py. None = client partage get_redis_client()
+                resolu au premier usage.
+            ttl_s: Duree de vie maximale du catalogue (seule invalidation sans Redis)
+            version_check_s: Intervalle minimal entre deux lectures de la version Redis
+        """
+        self._loader = loader or load_axis_value_counts
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self.ttl_s = ttl_s
+        self.version_check_s = version_check_s
+        self._catalogue: Optional[AxisCatalogue] = None
+        self._checked_at = 0.0
+        self._invalidated = False
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "reloads": 0, "version_checks": 0, "redis_errors": 0, "load_errors": 0}
+
+    def get(self) -> AxisCatalogue:
+        """Catalogue courant ; recharge seulement si invalide ou perime."""
+        catalogue = self._catalogue
+        if catalogue is not None and self._is_fresh(catalogue):
+            self._stats["hits"] += 1
+            return catalogue
+
+        with self._lock:
+            catalogue = self._catalogue
+            if catalogue is not None and self._is_fresh(catalogue):
+                self._stats["hits"] += 1
+                return catalogue
+
+            t0 = time.time()
+            version = self._remote_version()
+            try:
+                value_counts = self._loader()
+            except Exception as e:
+                # Echec non memorise : catalogue precedent (ou vide) pour cette question
+                self._stats["load_errors"] += 1
+                logger.warning(f"[OSMOSE:AxisCatalogue] Load failed: {e}")
+                return catalogue if catalogue is not None else AxisCatalogue()
+            catalogue = AxisCatalogue(
+                value_counts=dict(value_counts),
+                version=version,
+                loaded_at=time.monotonic(),
+                complete=not isinstance(value_counts, PartialAxisValueCounts),
+            )
+            self._catalogue = catalogue
+            self._invalidated = False
+            self._checked_at = catalogue.loaded_at
+            self._stats["reloads"] += 1
+            logger.info(
+                f"[OSMOSE:AxisCatalogue] version={version} "
+                f"{{{', '.join(f'{k}: {len(v)} values' for k, v in catalogue.value_counts.items())}}} "
+                f"loaded in {int((time.time() - t0) * 1000)}ms"
+            )
+            return catalogue
+
+    def bump(self) -> Optional[int]:
+        """Incremente la version Redis et oublie le catalogue local."""
+        self.invalidate()
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            return int(redis.incr(REDIS_VERSION_KEY))
+        except Exception as e:
+            logger.warning(f"[OSMOSE:AxisCatalogue] Version bump failed: {e}")
+            return None
+
+    def invalidate(self) -> None:
+        """Perime le catalogue local (recharge au prochain get, garde en secours)."""
+        self._invalidated = True
+
+    def stats(self) -> Dict[str, object]:
+        catalogue = self._catalogue
+        return {
+            **self._stats,
+            "axes": len(catalogue) if catalogue is not None else None,
+            "version": catalogue.version if catalogue is not None else None,
+        }
+
+    def _is_fresh(self, catalogue: AxisCatalogue) -> bool:
+        if self._invalidated:
+            return False
+        now = time.monotonic()
+        ttl_s = self.ttl_s if catalogue.complete else min(self.ttl_s, PARTIAL_TTL_S)
+        if now - catalogue.loaded_at >= ttl_s:
+            return False
+        if now - self._checked_at < self.version_check_s:
+            return True
+        version = self._remote_version()
+        if version is None:
+            return True
+        self._checked_at = now
+        return catalogue.version == version
+
+    def _remote_version(self) -> Optional[int]:
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        self._stats["version_checks"] += 1
+        try:
+            value = redis.get(REDIS_VERSION_KEY)
+            # Cle absente (aucune ingestion depuis le deploiement) : version 0
+            return int(value) if value is not None else 0
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.debug(f"[OSMOSE:AxisCatalogue] Redis version read failed: {e}")
+            return None
+
+    def _get_redis(self):
+        if not self._redis_resolved:
+            self._redis_resolved = True
+            try:
+                from knowbase.common.clients.redis_client import get_redis_client
+                self._redis = get_redis_client().client
+            except Exception as e:
+                logger.warning(f"[OSMOSE:AxisCatalogue] Redis unavailable, TTL-only invalidation: {e}")
+                self._redis = None
+        return self._redis
+
+
+_catalogue_cache: Optional[AxisCatalogueCache] = None
+_catalogue_cache_lock = threading.Lock()
+
+
+def get_axis_catalogue_cache() -> AxisCatalogueCache:
+    """Singleton du cache de catalogue d'axes."""
+    global _catalogue_cache
+    if _catalogue_cache is None:
+        with _catalogue_cache_lock:
+            if _catalogue_cache is None:
+                _catalogue_cache = AxisCatalogueCache()
+    return _catalogue_cache
+
+
+def reset_axis_catalogue_cache() -> None:
+    """Reset du singleton (tests)."""
+    global _catalogue_cache
+    _catalogue_cache = None
+
+
+def get_axis_catalogue() -> AxisCatalogue:
+    """Catalogue d'axes courant (cache process, invalidation versionnee)."""
+    return get_axis_catalogue_cache().get()
+
+
+def bump_axis_catalogue_version() -> Optional[int]:
+    """A appeler apres toute ingestion modifiant des valeurs d'axes."""
+    return get_axis_catalogue_cache().bump()
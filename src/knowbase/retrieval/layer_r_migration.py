@@ -0,0 +1,217 @@
+"""
+OSMOSE Retrieval Layer R — Migration blue/green de knowbase_chunks_v2.
+
+Construit une nouvelle collection physique (profil cible, cf
+layer_r_profiles) depuis la collection servie, vérifie le recall@k contre
+elle puis bascule l'alias `knowbase_chunks_v2` en une seule opération
+update_collection_aliases (atomique côté Qdrant).
+
+    blue  = collection servie (physique, ou cible actuelle de l'alias)
+    green = knowbase_chunks_v2__{profile}_{timestamp}
+
+Recall : pour n_queries vecteurs échantillonnés dans blue, top-k exact
+(brute force) sur blue vs top-k sur green avec les SearchParams du profil
+(oversampling + rescoring). Sous min_recall, pas de bascule.
+
+Première migration d'un déploiement historique : `knowbase_chunks_v2` est
+une collection physique, un alias ne peut pas porter le même nom → il faut
+supprimer blue avant de créer l'alias (legacy_cutover=True, fenêtre de
+quelques ms sans collection). Les migrations suivantes sont atomiques.
+
+Les écritures faites dans blue pendant la copie ne sont pas rejouées :
+lancer hors ingestion (points_count blue/green comparé dans le rapport).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+from qdrant_client.models import (
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    SearchParams,
+)
+
+from knowbase.common.clients.qdrant_client import get_qdrant_client
+from knowbase.retrieval.layer_r_profiles import (
+    LayerRProfile,
+    get_profile,
+    invalidate_search_params_cache,
+)
+from knowbase.retrieval.qdrant_layer_r import (
+    COLLECTION_NAME,
+    copy_layer_r_points,
+    create_layer_r_collection,
+    ensure_payload_indexes,
+    layer_r_alias_target,
+    resolve_layer_r_collection,
+)
+from knowbase.retrieval.sparse_bm25 import collection_has_sparse, invalidate_sparse_support_cache
+
+logger = logging.getLogger(__name__)
+
+
+class LayerRMigrationError(Exception):
+    """Migration Layer R impossible (collection absente, cutover non autorisé)."""
+
+
+@dataclass
+class MigrationReport:
+    """Résultat d'une migration blue/green Layer R."""
+    source: str
+    target: str
+    profile: str
+    points_source: int = 0
+    points_copied: int = 0
+    recall_at_k: float = 0.0
+    k: int = 10
+    n_queries: int = 0
+    switched: bool = False
+    duration_s: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def measure_recall(
+    client,
+    reference: str,
+    candidate: str,
+    query_vectors: List[List[float]],
+    k: int = 10,
+    search_params: Optional[SearchParams] = None,
+) -> float:
+    """recall@k moyen de `candidate` par rapport au top-k exact de `reference`."""
+    if not query_vectors:
+        return 1.0
+    total = 0.0
+    for vector in query_vectors:
+        expected = {
+            p.id for p in client.query_points(
+                reference, query=vector, limit=k,
+                search_params=SearchParams(exact=True),
+            ).points
+        }
+        if not expected:
+            total += 1.0
+            continue
+        got = {
+            p.id for p in client.query_points(
+                candidate, query=vector, limit=k, search_params=search_params,
+            ).points
+        }
+        total += len(expected & got) / len(expected)
+    return total / len(query_vectors)
+
+
+def sample_query_vectors(client, collection: str, n: int) -> List[List[float]]:
+    """Vecteurs denses de n points de la collection (requêtes de recall)."""
+    records, _ = client.scroll(collection, limit=n, with_payload=False, with_vectors=True)
+    return [r.vector[""] if isinstance(r.vector, dict) else r.vector for r in records]
+
+
+def switch_layer_r_alias(client, target: str, legacy_cutover: bool = False) -> None:
+    """Fait pointer l'alias COLLECTION_NAME sur `target`."""
+    ops = []
+    if layer_r_alias_target(client) is not None:
+        ops.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=COLLECTION_NAME)))
+    elif client.collection_exists(COLLECTION_NAME):
+        if not legacy_cutover:
+            raise LayerRMigrationError(
+                f"{COLLECTION_NAME} is a physical collection; legacy_cutover=True is "
+                f"required to drop it and replace it with an alias"
+            )
+        logger.warning(f"[OSMOSE:LayerR] Legacy cutover: dropping physical {COLLECTION_NAME}")
+        client.delete_collection(COLLECTION_NAME)
+    ops.append(CreateAliasOperation(create_alias=CreateAlias(
+        collection_name=target, alias_name=COLLECTION_NAME,
+    )))
+    client.update_collection_aliases(change_aliases_operations=ops)
+    invalidate_search_params_cache(COLLECTION_NAME)
+    invalidate_sparse_support_cache(COLLECTION_NAME)
+
+
+def migrate_layer_r_collection(
+    profile: str | LayerRProfile,
+    *,
+    batch_size: int = 256,
+    k: int = 10,
+    n_queries: int = 200,
+    min_recall: float = 0.95,
+    switch: bool = True,
+    legacy_cutover: bool = False,
+    drop_old: bool = False,
+    client=None,
+) -> MigrationReport:
+    """
+    Migre Layer R vers `profile` (build green → recall → bascule d'alias).
+
+    Args:
+        profile: Nom ou LayerRProfile cible
+        batch_size: Taille des batches scroll/upsert
+        k: k du recall@k
+        n_queries: Nombre de vecteurs requêtes échantillonnés
+        min_recall: Recall minimum pour basculer
+        switch: False = construit et mesure sans basculer (dry run)
+        legacy_cutover: Autorise la suppression d'une collection physique
+            COLLECTION_NAME pour la remplacer par l'alias
+        drop_old: Supprime blue après bascule (sinon gardé pour rollback)
+
+    Returns:
+        MigrationReport
+    """
+    t0 = time.time()
+    client = client or get_qdrant_client()
+    profile = get_profile(profile) if isinstance(profile, str) else profile
+
+    source = resolve_layer_r_collection(client)
+    if not client.collection_exists(source):
+        raise LayerRMigrationError(f"Layer R collection {source} does not exist")
+    if switch and not legacy_cutover and layer_r_alias_target(client) is None:
+        raise LayerRMigrationError(
+            f"{COLLECTION_NAME} is a physical collection; legacy_cutover=True is "
+            f"required for the first migration to an alias"
+        )
+    target = f"{COLLECTION_NAME}__{profile.name}_{time.strftime('%Y%m%d%H%M%S')}"
+    report = MigrationReport(source=source, target=target, profile=profile.name, k=k)
+    report.points_source = client.get_collection(source).points_count or 0
+
+    create_layer_r_collection(
+        client, target, sparse=collection_has_sparse(client, source), profile=profile,
+    )
+    # Payload indexes (par collection physique) construits avant la bascule
+    ensure_payload_indexes(target, client=client)
+    report.points_copied = copy_layer_r_points(client, source, target, batch_size)
+    logger.info(
+        f"[OSMOSE:LayerR] Migration {source} -> {target}: "
+        f"{report.points_copied}/{report.points_source} points copied"
+    )
+
+    queries = sample_query_vectors(client, source, n_queries)
+    report.n_queries = len(queries)
+    report.recall_at_k = measure_recall(
+        client, source, target, queries, k=k, search_params=profile.search_params(),
+    )
+    logger.info(f"[OSMOSE:LayerR] Migration recall@{k}={report.recall_at_k:.4f} ({len(queries)} queries)")
+
+    if report.recall_at_k < min_recall:
+        logger.error(
+            f"[OSMOSE:LayerR] recall@{k} {report.recall_at_k:.4f} < {min_recall}: "
+            f"keeping {source}, {target} left for inspection"
+        )
+    elif switch:
+        was_legacy = layer_r_alias_target(client) is None
+        switch_layer_r_alias(client, target, legacy_cutover=legacy_cutover)
+        report.switched = True
+        if drop_old and not was_legacy:
+            client.delete_collection(source)
+        logger.info(f"[OSMOSE:LayerR] Alias {COLLECTION_NAME} -> {target}")
+
+    report.duration_s = round(time.time() - t0, 2)
+    return report
+
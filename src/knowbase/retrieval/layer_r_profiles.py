@@ -0,0 +1,158 @@
+"""
+OSMOSE Retrieval Layer R — Profils de collection Qdrant.
+
+Un profil fixe la représentation des vecteurs denses 1024-d de
+knowbase_chunks_v2 :
+
+- float32 : historique (vecteurs float32 en RAM, pas de quantization)
+- int8    : scalar quantization int8 en RAM (÷4), vecteurs originaux et
+            payload sur disque, rescoring float32 des candidats (oversampling ×2)
+- binary  : binary quantization en RAM (÷32), originaux sur disque,
+            rescoring (oversampling ×3)
+
+Le profil d'une nouvelle collection vient de LAYER_R_PROFILE ; côté
+recherche, les SearchParams sont déduits de la config de la collection
+réellement servie (un alias migré vers un autre profil n'exige pas de
+changer l'env des workers).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Distance,
+    HnswConfigDiff,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParams,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE = os.getenv("LAYER_R_PROFILE", "float32")
+
+
+@dataclass(frozen=True)
+class LayerRProfile:
+    """Configuration stockage/index/recherche d'une collection Layer R."""
+    name: str
+    quantization: Optional[str] = None      # None | "int8" | "binary"
+    on_disk_vectors: bool = False
+    on_disk_payload: bool = False
+    hnsw_m: Optional[int] = None            # None = défaut Qdrant (16)
+    hnsw_ef_construct: Optional[int] = None
+    hnsw_ef_search: Optional[int] = None
+    oversampling: float = 1.0
+    rescore: bool = False
+
+    def vector_params(self, size: int, distance: Distance) -> VectorParams:
+        return VectorParams(size=size, distance=distance, on_disk=self.on_disk_vectors or None)
+
+    def quantization_config(self):
+        if self.quantization == "int8":
+            return ScalarQuantization(scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8, quantile=0.99, always_ram=True,
+            ))
+        if self.quantization == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+        return None
+
+    def hnsw_config(self) -> Optional[HnswConfigDiff]:
+        if self.hnsw_m is None and self.hnsw_ef_construct is None:
+            return None
+        return HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def search_params(self) -> Optional[SearchParams]:
+        if self.quantization is None and self.hnsw_ef_search is None:
+            return None
+        return SearchParams(
+            hnsw_ef=self.hnsw_ef_search,
+            quantization=QuantizationSearchParams(
+                rescore=self.rescore, oversampling=self.oversampling,
+            ) if self.quantization else None,
+        )
+
+    def estimate_ram_bytes(self, n_points: int, dim: int) -> int:
+        """RAM résidente estimée (vecteurs servis en RAM + graphe HNSW niveau 0)."""
+        if self.quantization == "int8":
+            vectors = n_points * dim
+        elif self.quantization == "binary":
+            vectors = n_points * dim // 8
+        else:
+            vectors = 0 if self.on_disk_vectors else n_points * dim * 4
+        hnsw = n_points * 2 * (self.hnsw_m or 16) * 4
+        return vectors + hnsw
+
+
+PROFILES: Dict[str, LayerRProfile] = {
+    "float32": LayerRProfile(name="float32"),
+    "int8": LayerRProfile(
+        name="int8", quantization="int8", on_disk_vectors=True, on_disk_payload=True,
+        hnsw_m=32, hnsw_ef_construct=256, hnsw_ef_search=128, oversampling=2.0, rescore=True,
+    ),
+    "binary": LayerRProfile(
+        name="binary", quantization="binary", on_disk_vectors=True, on_disk_payload=True,
+        hnsw_m=32, hnsw_ef_construct=256, hnsw_ef_search=128, oversampling=3.0, rescore=True,
+    ),
+}
+
+
+def get_profile(name: Optional[str] = None) -> LayerRProfile:
+    """Profil par nom (default LAYER_R_PROFILE)."""
+    name = name or DEFAULT_PROFILE
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown Layer R profile '{name}' (expected one of {sorted(PROFILES)})")
+
+
+def profile_from_collection_info(info) -> LayerRProfile:
+    """Déduit le profil d'une collection existante depuis sa config Qdrant."""
+    config = info.config
+    quantization = config.quantization_config
+    vectors = config.params.vectors
+    if quantization is None and isinstance(vectors, VectorParams):
+        quantization = vectors.quantization_config
+    if isinstance(quantization, ScalarQuantization):
+        return PROFILES["int8"]
+    if isinstance(quantization, BinaryQuantization):
+        return PROFILES["binary"]
+    return PROFILES["float32"]
+
+
+# Cache collection -> (SearchParams, ts). TTL : une bascule d'alias faite par
+# un autre process (CLI de migration) est vue par les workers sans restart.
+SEARCH_PARAMS_TTL_S = 300.0
+_search_params_cache: Dict[str, Tuple[Optional[SearchParams], float]] = {}
+
+
+def search_params_for(client, collection_name: str) -> Optional[SearchParams]:
+    """SearchParams du profil de la collection servie (résultat caché, TTL)."""
+    cached = _search_params_cache.get(collection_name)
+    if cached is not None and time.monotonic() - cached[1] < SEARCH_PARAMS_TTL_S:
+        return cached[0]
+    try:
+        params = profile_from_collection_info(client.get_collection(collection_name)).search_params()
+    except Exception as e:
+        logger.debug(f"[OSMOSE:LayerR] Profile detection failed for {collection_name}: {e}")
+        return None
+    _search_params_cache[collection_name] = (params, time.monotonic())
+    return params
+
+
+def invalidate_search_params_cache(collection_name: Optional[str] = None) -> None:
+    """Oublie les SearchParams cachés (après création / bascule d'alias)."""
+    if collection_name is None:
+        _search_params_cache.clear()
+    else:
+        _search_params_cache.pop(collection_name, None)
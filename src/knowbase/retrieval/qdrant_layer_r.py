@@ -6,6 +6,10 @@ Responsabilités:
 - Upsert idempotent des sub-chunks avec embeddings
 - Suppression par document (pour re-import)
 - Recherche TEXT_ONLY (RAG fallback)
+- Vecteurs sparse BM25 (cf sparse_bm25) + backfill des collections existantes
+- Profils de collection (float32 / int8 / binary, cf layer_r_profiles) ;
+  COLLECTION_NAME peut être un alias vers la collection physique servie
+  (migration blue/green, cf layer_r_migration)
 
 Spec: ADR_QDRANT_RETRIEVAL_PROJECTION_V2.md
 """
@@ -14,6 +18,7 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
@@ -23,11 +28,26 @@ from qdrant_client.models import (
     Filter,
     MatchValue,
     PointStruct,
+    PointVectors,
     VectorParams,
 )
 
 from knowbase.common.clients.qdrant_client import get_qdrant_client
+from knowbase.retrieval.layer_r_profiles import (
+    LayerRProfile,
+    get_profile,
+    invalidate_search_params_cache,
+    profile_from_collection_info,
+    search_params_for,
+)
 from knowbase.retrieval.rechunker import SubChunk
+from knowbase.retrieval.sparse_bm25 import (
+    SPARSE_VECTOR_NAME,
+    build_document_sparse_vector,
+    collection_has_sparse,
+    invalidate_sparse_support_cache,
+    sparse_vectors_config,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,58 +56,185 @@ COLLECTION_NAME = "knowbase_chunks_v2"
 VECTOR_SIZE = 1024
 DISTANCE = Distance.COSINE
 SCHEMA_VERSION = "v2_layer_r_1"
+SPARSE_ENABLED = os.getenv("LAYER_R_SPARSE_ENABLED", "true").lower() == "true"
+
+
+# Payload indexes keyword : tous les filtres Layer R (search, scroll bridge,
+# delete par doc) portent sur tenant_id et souvent doc_id. tenant_id est
+# déclaré partition tenant (is_tenant) : Qdrant co-localise les points d'un
+# tenant et les recherches filtrées ne parcourent plus toute la collection.
+TENANT_FIELD = "tenant_id"
+KEYWORD_INDEX_FIELDS = (
+    "tenant_id", "doc_id", "chunk_id", "kind", "section_id",
+    "axis_release_id", "axis_version",
+)
+
+# Readiness process-wide : collection + indexes vérifiés une fois (startup)
+_layer_r_ready = False
+_layer_r_ready_lock = threading.Lock()
 
 
 def ensure_layer_r_collection() -> None:
     """Crée la collection knowbase_chunks_v2 si elle n'existe pas, + payload indexes."""
     client = get_qdrant_client()
-    if client.collection_exists(COLLECTION_NAME):
+    if layer_r_exists(client):
         logger.debug(f"[OSMOSE:LayerR] Collection {COLLECTION_NAME} already exists")
-        ensure_axis_indexes()
+        ensure_payload_indexes(resolve_layer_r_collection(client), client=client)
         return
 
-    client.create_collection(
-        collection_name=COLLECTION_NAME,
-        vectors_config=VectorParams(size=VECTOR_SIZE, distance=DISTANCE),
-    )
+    profile = get_profile()
+    create_layer_r_collection(client, COLLECTION_NAME, profile=profile)
     logger.info(
         f"[OSMOSE:LayerR] Created collection {COLLECTION_NAME} "
-        f"(size={VECTOR_SIZE}, distance={DISTANCE})"
+        f"(size={VECTOR_SIZE}, distance={DISTANCE}, sparse={SPARSE_ENABLED}, profile={profile.name})"
     )
-    ensure_axis_indexes()
+    ensure_payload_indexes(COLLECTION_NAME, client=client)
 
 
-def ensure_axis_indexes() -> None:
-    """Crée les payload indexes keyword sur axis_release_id et axis_version."""
-    from qdrant_client.models import PayloadSchemaType, TextIndexParams, TokenizerType
+def bootstrap_layer_r() -> None:
+    """
+    Bootstrap Layer R une fois par process (startup API / worker).
 
-    client = get_qdrant_client()
-    for field_name in ("axis_release_id", "axis_version"):
+    Crée la collection si besoin et ajoute les payload indexes manquants ;
+    les appels suivants ne touchent plus Qdrant (flag de readiness caché).
+    """
+    global _layer_r_ready
+    if _layer_r_ready:
+        return
+    with _layer_r_ready_lock:
+        if _layer_r_ready:
+            return
+        ensure_layer_r_collection()
+        _layer_r_ready = True
+
+
+def reset_layer_r_ready() -> None:
+    """Oublie le flag de readiness (tests, collection supprimée)."""
+    global _layer_r_ready
+    with _layer_r_ready_lock:
+        _layer_r_ready = False
+
+
+def _layer_r_available(client) -> bool:
+    """Lecture/suppression : True si Layer R est servie (sans check par appel une fois prête)."""
+    if _layer_r_ready:
+        return True
+    if not layer_r_exists(client):
+        return False
+    bootstrap_layer_r()
+    return True
+
+
+def create_layer_r_collection(
+    client,
+    collection_name: str,
+    sparse: bool = SPARSE_ENABLED,
+    profile: Optional[LayerRProfile] = None,
+) -> None:
+    profile = profile or get_profile("float32")
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=profile.vector_params(VECTOR_SIZE, DISTANCE),
+        sparse_vectors_config=sparse_vectors_config() if sparse else None,
+        quantization_config=profile.quantization_config(),
+        hnsw_config=profile.hnsw_config(),
+        on_disk_payload=profile.on_disk_payload or None,
+    )
+    invalidate_sparse_support_cache(collection_name)
+    invalidate_search_params_cache(collection_name)
+
+
+def layer_r_alias_target(client) -> Optional[str]:
+    """Collection physique derrière l'alias COLLECTION_NAME (None si pas d'alias)."""
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == COLLECTION_NAME:
+            return alias.collection_name
+    return None
+
+
+def resolve_layer_r_collection(client) -> str:
+    """Nom de la collection physique servie sous COLLECTION_NAME."""
+    return layer_r_alias_target(client) or COLLECTION_NAME
+
+
+def layer_r_exists(client) -> bool:
+    """True si COLLECTION_NAME existe (collection physique ou alias)."""
+    return client.collection_exists(COLLECTION_NAME) or layer_r_alias_target(client) is not None
+
+
+def ensure_payload_indexes(collection_name: str = COLLECTION_NAME, client=None) -> List[str]:
+    """
+    Crée les payload indexes manquants (keyword + text) d'une collection Layer R.
+
+    Idempotent : lit payload_schema et ne crée que les indexes absents ;
+    un index tenant_id existant sans is_tenant est recréé en partition tenant
+    (migration des collections historiques).
+
+    Returns:
+        Champs dont l'index a été créé
+    """
+    from qdrant_client.models import (
+        KeywordIndexParams,
+        KeywordIndexType,
+        PayloadSchemaType,
+        TextIndexParams,
+        TokenizerType,
+    )
+
+    client = client or get_qdrant_client()
+    try:
+        schema = client.get_collection(collection_name).payload_schema or {}
+    except Exception as e:
+        logger.warning(f"[OSMOSE:LayerR] Cannot read payload schema of {collection_name}: {e}")
+        schema = {}
+
+    created: List[str] = []
+    for field_name in KEYWORD_INDEX_FIELDS:
+        existing = schema.get(field_name)
+        is_tenant = field_name == TENANT_FIELD
+        if existing is not None and not (
+            is_tenant and not getattr(existing.params, "is_tenant", False)
+        ):
+            continue
         try:
             client.create_payload_index(
-                collection_name=COLLECTION_NAME,
+                collection_name=collection_name,
                 field_name=field_name,
-                field_schema=PayloadSchemaType.KEYWORD,
+                field_schema=(
+                    KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)
+                    if is_tenant else PayloadSchemaType.KEYWORD
+                ),
             )
-        except Exception:
-            pass
+            created.append(field_name)
+        except Exception as e:
+            logger.warning(f"[OSMOSE:LayerR] Payload index {field_name} on {collection_name} failed: {e}")
 
-    # Text index sur le champ 'text' pour hybrid BM25+dense search
-    try:
-        client.create_payload_index(
-            collection_name=COLLECTION_NAME,
-            field_name="text",
-            field_schema=TextIndexParams(
-                type="text",
-                tokenizer=TokenizerType.WORD,
-                min_token_len=2,
-                max_token_len=40,
-                lowercase=True,
-            ),
-        )
-        logger.info("[OSMOSE:LayerR] Created text index on 'text' field (hybrid BM25)")
-    except Exception:
-        pass
+    # Text index sur le champ 'text' (fallback MatchText des collections sans sparse)
+    if "text" not in schema:
+        try:
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name="text",
+                field_schema=TextIndexParams(
+                    type="text",
+                    tokenizer=TokenizerType.WORD,
+                    min_token_len=2,
+                    max_token_len=40,
+                    lowercase=True,
+                ),
+            )
+            created.append("text")
+        except Exception as e:
+            logger.warning(f"[OSMOSE:LayerR] Text index on {collection_name} failed: {e}")
+
+    if created:
+        logger.info(f"[OSMOSE:LayerR] Created payload indexes on {collection_name}: {created}")
+    return created
+
+
+def ensure_axis_indexes(collection_name: str = COLLECTION_NAME, client=None) -> None:
+    """Compat : les indexes axis font partie de ensure_payload_indexes."""
+    ensure_payload_indexes(collection_name, client=client)
 
 
 def upsert_layer_r(
@@ -121,8 +268,9 @@ def upsert_layer_r(
     if batch_size <= 0:
         batch_size = int(os.environ.get("QDRANT_UPSERT_BATCH_SIZE", "500"))
 
-    ensure_layer_r_collection()
+    bootstrap_layer_r()
     client = get_qdrant_client()
+    with_sparse = SPARSE_ENABLED and collection_has_sparse(client, COLLECTION_NAME)
 
     total = len(sub_chunks_with_embeddings)
     upserted = 0
@@ -160,9 +308,13 @@ def upsert_layer_r(
                 "axis_version": doc_axis_values.get("version") if doc_axis_values else None,
             }
 
+            dense = embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
             points.append(PointStruct(
                 id=sc.point_id(),
-                vector=embedding.tolist() if hasattr(embedding, "tolist") else list(embedding),
+                vector=(
+                    {"": dense, SPARSE_VECTOR_NAME: build_document_sparse_vector(sc.text)}
+                    if with_sparse else dense
+                ),
                 payload=payload,
             ))
 
@@ -215,6 +367,10 @@ def upsert_layer_r(
             f"[OSMOSE:LayerR] Upserted {upserted} points in {COLLECTION_NAME} "
             f"(tenant={tenant_id}, {n_batches} batches)"
         )
+    if upserted and doc_axis_values:
+        # Nouvelles valeurs axis_* : le catalogue du decomposer doit etre recalcule
+        from knowbase.retrieval.axis_catalogue import bump_axis_catalogue_version
+        bump_axis_catalogue_version()
     return upserted
 
 
@@ -229,7 +385,7 @@ def delete_doc_from_layer_r(doc_id: str, tenant_id: str) -> None:
         tenant_id: ID du tenant
     """
     client = get_qdrant_client()
-    if not client.collection_exists(COLLECTION_NAME):
+    if not _layer_r_available(client):
         return
 
     client.delete(
@@ -245,6 +401,9 @@ def delete_doc_from_layer_r(doc_id: str, tenant_id: str) -> None:
         f"[OSMOSE:LayerR] Deleted points for doc_id={doc_id}, tenant={tenant_id}"
     )
 
+    from knowbase.retrieval.axis_catalogue import bump_axis_catalogue_version
+    bump_axis_catalogue_version()
+
 
 def search_layer_r(
     query_vector: List[float],
@@ -267,7 +426,7 @@ def search_layer_r(
         Liste de dicts avec score, text, metadata
     """
     client = get_qdrant_client()
-    if not client.collection_exists(COLLECTION_NAME):
+    if not _layer_r_available(client):
         logger.warning(f"[OSMOSE:LayerR] Collection {COLLECTION_NAME} does not exist")
         return []
 
@@ -286,6 +445,7 @@ def search_layer_r(
         query_filter=Filter(must=must_conditions),
         limit=limit,
         score_threshold=score_threshold,
+        search_params=search_params_for(client, COLLECTION_NAME),
     )
 
     return [
@@ -305,3 +465,127 @@ def search_layer_r(
         }
         for hit in results
     ]
+
+
+
+def backfill_layer_r_sparse(batch_size: int = 256, rebuild: bool = False) -> int:
+    """
+    Calcule le vecteur sparse BM25 des points Layer R existants.
+
+    - Collection déjà déclarée avec `bm25` : update_vectors par batch (scroll
+      payload `text` uniquement), idempotent.
+    - Collection créée avant les vecteurs sparse : Qdrant ne permet pas
+      d'ajouter un vecteur nommé à une collection existante → `rebuild=True`
+      recrée la collection (copie vers une collection temporaire, recréation
+      avec la config sparse, recopie). Collection indisponible pendant la
+      recopie : à lancer hors trafic.
+
+    Returns:
+        Nombre de points mis à jour
+    """
+    client = get_qdrant_client()
+    if not layer_r_exists(client):
+        logger.warning(f"[OSMOSE:LayerR] Collection {COLLECTION_NAME} does not exist")
+        return 0
+
+    invalidate_sparse_support_cache(COLLECTION_NAME)
+    if not collection_has_sparse(client, COLLECTION_NAME):
+        if not rebuild:
+            logger.error(
+                f"[OSMOSE:LayerR] {COLLECTION_NAME} has no '{SPARSE_VECTOR_NAME}' sparse vector; "
+                f"re-run with rebuild=True to recreate the collection"
+            )
+            return 0
+        return _rebuild_with_sparse(client, batch_size)
+
+    updated = 0
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=COLLECTION_NAME,
+            limit=batch_size,
+            offset=offset,
+            with_payload=["text"],
+            with_vectors=False,
+        )
+        if records:
+            client.update_vectors(
+                collection_name=COLLECTION_NAME,
+                points=[
+                    PointVectors(
+                        id=r.id,
+                        vector={SPARSE_VECTOR_NAME: build_document_sparse_vector(
+                            (r.payload or {}).get("text", ""))},
+                    )
+                    for r in records
+                ],
+                wait=True,
+            )
+            updated += len(records)
+            logger.info(f"[OSMOSE:LayerR] Sparse backfill: {updated} points")
+        if offset is None:
+            break
+    return updated
+
+
+def copy_layer_r_points(client, source: str, target: str, batch_size: int = 256) -> int:
+    """
+    Copie tous les points source -> target (vecteurs + payload).
+
+    Si target déclare le vecteur sparse bm25, il est repris de la source ou
+    calculé depuis le payload `text` quand la source n'en a pas.
+    """
+    target_sparse = collection_has_sparse(client, target)
+    copied = 0
+    offset = None
+    while True:
+        records, offset = client.scroll(
+            collection_name=source,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        points = []
+        for r in records:
+            vectors = r.vector if isinstance(r.vector, dict) else {"": r.vector}
+            payload = r.payload or {}
+            if not target_sparse:
+                vector = vectors[""]
+            else:
+                sparse = vectors.get(SPARSE_VECTOR_NAME)
+                if sparse is None:
+                    sparse = build_document_sparse_vector(payload.get("text", ""))
+                vector = {"": vectors[""], SPARSE_VECTOR_NAME: sparse}
+            points.append(PointStruct(id=r.id, vector=vector, payload=payload))
+        if points:
+            client.upsert(collection_name=target, points=points, wait=True)
+            copied += len(points)
+        if offset is None:
+            break
+    return copied
+
+
+def _rebuild_with_sparse(client, batch_size: int) -> int:
+    if layer_r_alias_target(client) is not None:
+        # Collection servie via alias : la migration blue/green ajoute le sparse sans coupure
+        logger.error(
+            f"[OSMOSE:LayerR] {COLLECTION_NAME} is an alias; use "
+            f"app/scripts/migrate_layer_r_collection.py to add sparse vectors"
+        )
+        return 0
+    profile = profile_from_collection_info(client.get_collection(COLLECTION_NAME))
+    tmp_name = f"{COLLECTION_NAME}__sparse_rebuild"
+    if client.collection_exists(tmp_name):
+        client.delete_collection(tmp_name)
+    create_layer_r_collection(client, tmp_name, sparse=True, profile=profile)
+    n = copy_layer_r_points(client, COLLECTION_NAME, tmp_name, batch_size)
+    logger.info(f"[OSMOSE:LayerR] Sparse rebuild: {n} points staged in {tmp_name}")
+
+    client.delete_collection(COLLECTION_NAME)
+    create_layer_r_collection(client, COLLECTION_NAME, sparse=True, profile=profile)
+    n = copy_layer_r_points(client, tmp_name, COLLECTION_NAME, batch_size)
+    client.delete_collection(tmp_name)
+    ensure_payload_indexes(COLLECTION_NAME, client=client)
+    logger.info(f"[OSMOSE:LayerR] Sparse rebuild: {COLLECTION_NAME} recreated with {n} points")
+    return n
@@ -0,0 +1,126 @@
+"""
+OSMOSE Retrieval Layer R — Vecteurs sparse BM25.
+
+Remplace le "BM25" par MatchText (4 mots-clés max, filtre booléen, aucun
+TF ni IDF) par un vrai scoring BM25 côté Qdrant :
+
+- Ingestion : chaque sub-chunk porte un vecteur sparse nommé `bm25`
+  (indices = hash crc32 des tokens, valeurs = composante TF BM25 normalisée
+  par la longueur du chunk).
+- Collection : `SparseVectorParams(modifier=Modifier.IDF)` → Qdrant applique
+  l'IDF du corpus complet au moment de la requête (plus d'échantillon de
+  2000 points en mémoire process).
+- Requête : vecteur sparse de la question complète (poids 1 par token
+  unique), score = Σ idf(t) · tf_bm25(t, chunk).
+
+Le tokenizer garde les identifiants SAP/réglementaires intacts (/SCWM/,
+S/4HANA, SAP_NOTE, 25.788) et émet en plus leurs segments (scwm, 4hana)
+pour matcher les formes partielles.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from qdrant_client.models import Modifier, SparseVector, SparseVectorParams
+
+logger = logging.getLogger(__name__)
+
+# --- Constantes BM25 ---
+SPARSE_VECTOR_NAME = "bm25"
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Longueur moyenne (tokens) d'un sub-chunk Layer R (~1500 chars)
+BM25_AVG_DOC_LEN = float(os.getenv("LAYER_R_BM25_AVGDL", "200"))
+
+# Token = mot / identifiant ; "/", ".", "-" internes conservés (S/4HANA, 25.788)
+_TOKEN_RE = re.compile(r"[\w/][\w/.\-]*")
+_SEGMENT_SPLIT_RE = re.compile(r"[/.\-]+")
+
+# Cache collection -> (a un vecteur sparse bm25, ts) (évite get_collection par
+# requête). TTL : un rebuild fait par un autre process (backfill_layer_r_sparse
+# --rebuild) est vu par les workers sans restart.
+SPARSE_SUPPORT_TTL_S = 300.0
+_sparse_support_cache: Dict[str, Tuple[bool, float]] = {}
+
+
+def sparse_vectors_config() -> Dict[str, SparseVectorParams]:
+    """Config sparse à déclarer à la création de la collection."""
+    return {SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)}
+
+
+def tokenize_bm25(text: str) -> List[str]:
+    """Tokenise un texte pour BM25 (lowercase, identifiants préservés).
+
+    >>> tokenize_bm25("Run /SCWM/R_BW on S/4HANA 2023.")
+    ['run', '/scwm/r_bw', 'scwm', 'r_bw', 'on', 's/4hana', '4hana', '2023']
+    """
+    tokens: List[str] = []
+    for raw in _TOKEN_RE.findall(text.lower()):
+        token = raw.rstrip(".-")
+        if not _keep_token(token):
+            continue
+        tokens.append(token)
+        if _SEGMENT_SPLIT_RE.search(token):
+            for part in _SEGMENT_SPLIT_RE.split(token):
+                if part != token and _keep_token(part):
+                    tokens.append(part)
+    return tokens
+
+
+def _keep_token(token: str) -> bool:
+    # Lettres isolées = bruit ; chiffres isolés gardés ("Article 5")
+    return len(token) >= 2 or token.isdigit()
+
+
+def token_index(token: str) -> int:
+    """Indice sparse stable entre processus (uint32)."""
+    return zlib.crc32(token.encode("utf-8"))
+
+
+def build_document_sparse_vector(text: str) -> SparseVector:
+    """Vecteur sparse BM25 d'un chunk (composante TF, l'IDF est appliqué par Qdrant)."""
+    counts = Counter(token_index(t) for t in tokenize_bm25(text or ""))
+    doc_len = sum(counts.values())
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / BM25_AVG_DOC_LEN)
+    indices = sorted(counts)
+    values = [counts[i] * (BM25_K1 + 1) / (counts[i] + norm) for i in indices]
+    return SparseVector(indices=indices, values=values)
+
+
+def build_query_sparse_vector(question: str) -> Optional[SparseVector]:
+    """Vecteur sparse d'une question (tokens uniques, poids 1). None si vide."""
+    indices = sorted({token_index(t) for t in tokenize_bm25(question or "")})
+    if not indices:
+        return None
+    return SparseVector(indices=indices, values=[1.0] * len(indices))
+
+
+def collection_has_sparse(client, collection_name: str) -> bool:
+    """True si la collection déclare le vecteur sparse bm25 (résultat caché, TTL)."""
+    cached = _sparse_support_cache.get(collection_name)
+    if cached is not None and time.monotonic() - cached[1] < SPARSE_SUPPORT_TTL_S:
+        return cached[0]
+    try:
+        info = client.get_collection(collection_name)
+        sparse = info.config.params.sparse_vectors or {}
+        supported = SPARSE_VECTOR_NAME in sparse
+    except Exception as e:
+        logger.debug(f"[OSMOSE:LayerR] Sparse support check failed for {collection_name}: {e}")
+        return False
+    _sparse_support_cache[collection_name] = (supported, time.monotonic())
+    return supported
+
+
+def invalidate_sparse_support_cache(collection_name: Optional[str] = None) -> None:
+    """Oublie le flag caché (après création / rebuild de collection)."""
+    if collection_name is None:
+        _sparse_support_cache.clear()
+    else:
+        _sparse_support_cache.pop(collection_name, None)
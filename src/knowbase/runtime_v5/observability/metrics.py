@@ -25,6 +25,10 @@ from typing import Optional
 DEFAULT_LATENCY_BUCKETS_S = (
     0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 25.0, 60.0, 90.0, 180.0,
 )
+# Latence tool call en secondes (lookups structure en ms, find_in froid en s)
+DEFAULT_TOOL_LATENCY_BUCKETS_S = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
 # Tokens
 DEFAULT_TOKEN_BUCKETS = (
     100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 200_000,
@@ -16,7 +16,9 @@ Default : NoOpTracer (zero overhead).
 Span hierarchy ADR §3g :
     gen_ai.agent.answer (root)
         ├─ gen_ai.inference (LLM call per iter)
-        ├─ gen_ai.execute_tool (tool exec per call)
+        ├─ gen_ai.execute_tool (tool exec per call ; les appels side-effect-free
+        │                        d'un même tour se chevauchent dans le temps,
+        │                        attribut parallel_group_size)
         ├─ gen_ai.embeddings
         └─ verifier.check
 """
@@ -224,6 +226,21 @@ class InMemoryTracer:
     def get_children(self, parent: Span) -> list[Span]:
         return [s for s in self.spans if s.parent_id == parent.span_id]
 
+    def max_concurrency(self, name: str) -> int:
+        """Nombre max de spans `name` ouverts simultanément (chevauchement)."""
+        events = []
+        for s in self.get_spans_by_name(name):
+            if s.end_time is None:
+                continue
+            events.append((s.start_time, 1))
+            events.append((s.end_time, -1))
+        peak = current = 0
+        # À timestamp égal, les fins passent avant les débuts
+        for _, delta in sorted(events):
+            current += delta
+            peak = max(peak, current)
+        return peak
+
     def reset(self) -> None:
         self.spans = []
         self.active_spans = {}
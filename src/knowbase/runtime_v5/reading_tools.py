@@ -11,10 +11,12 @@ from __future__ import annotations
 
 import logging
 import re
-import threading
 from difflib import unified_diff
 from typing import Optional
 
+import numpy as np
+
+from knowbase.runtime_v5.section_index import get_section_index_store
 from knowbase.runtime_v5.structure_loader import (
     DocumentStructure,
     load_structure,
@@ -25,63 +27,15 @@ logger = logging.getLogger(__name__)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# TF-IDF index cache (A7 — pour find_in semantic search)
+# Section index (A7 TF-IDF + A8 embeddings) — cf section_index.py
 # ─────────────────────────────────────────────────────────────────────────────
-# Per-doc cache : doc_id → (vectorizer, section_matrix, section_indices)
-# Built lazily on first find_in() call per doc. Thread-safe.
-_TFIDF_CACHE: dict[str, tuple] = {}
-_TFIDF_LOCK = threading.Lock()
-
-
-def _build_tfidf_index(struct: DocumentStructure):
-    """Construit l'index TF-IDF pour les sections d'un doc.
-
-    Returns: (vectorizer, section_matrix, section_indices)
-      section_indices = list[int] mapping row → struct.sections[i]
-    """
-    from sklearn.feature_extraction.text import TfidfVectorizer
-
-    docs = []
-    indices = []
-    for i, s in enumerate(struct.sections):
-        title = (s.get("title") or "").strip()
-        text = (s.get("text") or "").strip()
-        if not text and not title:
-            continue
-        # Concat title + text pour scoring (title boost implicite via vocab repeat)
-        combined = f"{title} {title} {text}" if title else text
-        docs.append(combined)
-        indices.append(i)
-
-    if not docs:
-        return None, None, []
-
-    # TF-IDF avec n-grams 1-2 pour capturer expressions composées
-    # (ex: "WWI Monitor" comme bigram, pas seulement les deux mots séparés)
-    vectorizer = TfidfVectorizer(
-        lowercase=True,
-        ngram_range=(1, 2),
-        max_features=50000,
-        token_pattern=r"\b[A-Za-z_][A-Za-z0-9_]+\b",  # capture identifiants techniques
-        sublinear_tf=True,
-    )
-    matrix = vectorizer.fit_transform(docs)
-    return vectorizer, matrix, indices
+# Index persistant par doc (précalculé à l'ingestion, mmap float16 partagé
+# entre workers), LRU mémoire borné, build sous lock par doc.
 
 
 def _get_tfidf_index(doc_id: str, struct: DocumentStructure):
-    """Récupère (ou construit en cache) l'index TF-IDF du doc."""
-    with _TFIDF_LOCK:
-        if doc_id in _TFIDF_CACHE:
-            return _TFIDF_CACHE[doc_id]
-        try:
-            entry = _build_tfidf_index(struct)
-            _TFIDF_CACHE[doc_id] = entry
-            return entry
-        except Exception as exc:
-            logger.warning("[find_in] TF-IDF build failed for %s: %s", doc_id, exc)
-            _TFIDF_CACHE[doc_id] = (None, None, [])
-            return _TFIDF_CACHE[doc_id]
+    """Récupère (ou construit) l'index TF-IDF du doc : (vectorizer, matrix, indices)."""
+    return get_section_index_store().get_tfidf(doc_id, struct)
 
 
 def _tfidf_rank_sections(doc_id: str, struct: DocumentStructure, query: str, top_k: int = 10):
@@ -112,76 +66,9 @@ def _looks_like_regex(query: str) -> bool:
     return bool(_REGEX_HINT_PATTERN.search(query))
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# Embedding index cache (A8 — sentence_transformers multilingual-e5-large)
-# ─────────────────────────────────────────────────────────────────────────────
-# Singleton model + per-doc embedding cache (lazy build on first find_in() call).
-# Charte : modèle local open-source réutilisé du projet (V2 retriever, gatekeeper).
-
-_EMB_MODEL = None
-_EMB_MODEL_LOCK = threading.Lock()
-_EMB_INDEX_CACHE: dict[str, tuple] = {}  # doc_id → (matrix, indices) or (None, [])
-
-
-def _get_emb_model():
-    """Lazy load multilingual-e5-large singleton."""
-    global _EMB_MODEL
-    if _EMB_MODEL is not None:
-        return _EMB_MODEL
-    with _EMB_MODEL_LOCK:
-        if _EMB_MODEL is None:
-            try:
-                from sentence_transformers import SentenceTransformer
-                logger.info("[find_in] loading multilingual-e5-large (lazy first call)")
-                _EMB_MODEL = SentenceTransformer("intfloat/multilingual-e5-large")
-            except Exception as exc:
-                logger.warning("[find_in] embedding model load failed: %s", exc)
-                _EMB_MODEL = False  # sentinel : tried and failed
-    return _EMB_MODEL
-
-
-def _build_embedding_index(struct: DocumentStructure):
-    """Encode toutes les sections d'un doc. Returns (matrix, indices) ou (None, []).
-
-    Format e5 : prefixer "passage: " (corpus convention multilingual-e5-large).
-    """
-    model = _get_emb_model()
-    if not model:
-        return None, []
-    passages = []
-    indices = []
-    for i, s in enumerate(struct.sections):
-        title = (s.get("title") or "").strip()
-        text = (s.get("text") or "").strip()
-        if not title and not text:
-            continue
-        # Tronque à 1500 chars (e5 max 512 tokens ≈ 2000 chars), title+text suffit
-        combined = (
-            f"passage: {title}\n{text[:1500]}" if title else f"passage: {text[:1500]}"
-        )
-        passages.append(combined)
-        indices.append(i)
-    if not passages:
-        return None, []
-    try:
-        embeddings = model.encode(
-            passages, batch_size=16, show_progress_bar=False,
-            normalize_embeddings=True,
-        )
-        return embeddings, indices
-    except Exception as exc:
-        logger.warning("[find_in] embedding encode failed: %s", exc)
-        return None, []
-
-
 def _get_embedding_index(doc_id: str, struct: DocumentStructure):
-    """Cache-aware embedding index for a doc."""
-    with _TFIDF_LOCK:  # reuse lock — protects both TF-IDF & embedding caches
-        if doc_id in _EMB_INDEX_CACHE:
-            return _EMB_INDEX_CACHE[doc_id]
-        entry = _build_embedding_index(struct)
-        _EMB_INDEX_CACHE[doc_id] = entry
-        return entry
+    """Embeddings e5 du doc (float16, mmap) : (embeddings, indices) ou (None, [])."""
+    return get_section_index_store().get_embeddings(doc_id, struct)
 
 
 def _embedding_rank_sections(doc_id: str, struct: DocumentStructure, query: str, top_k: int = 10):
@@ -189,14 +76,11 @@ def _embedding_rank_sections(doc_id: str, struct: DocumentStructure, query: str,
     embeddings, indices = _get_embedding_index(doc_id, struct)
     if embeddings is None or not indices:
         return []
-    model = _get_emb_model()
-    if not model:
+    q_emb = get_section_index_store().encode_query(query)
+    if q_emb is None:
         return []
     try:
-        q_emb = model.encode(
-            [f"query: {query}"], normalize_embeddings=True,
-        )
-        scores = (embeddings @ q_emb.T).flatten()
+        scores = (np.asarray(embeddings, dtype=np.float32) @ q_emb.T).flatten()
         ranked = sorted(
             [(i, float(scores[k])) for k, i in enumerate(indices)],
             key=lambda x: -x[1],
@@ -493,7 +377,8 @@ def prewarm_find_in_caches(
 ):
     """Pré-charge TF-IDF indices (et embeddings si demandé) pour les docs.
 
-    Permet d'éviter la latence du premier find_in() en runtime (lazy).
+    Permet d'éviter la latence du premier find_in() en runtime (lazy). Les
+    docs déjà indexés à l'ingestion sont simplement relus depuis le disque.
     A9 : embeddings désactivés par défaut (A8 hybrid RRF régressait globalement).
     """
     docs = doc_ids if doc_ids is not None else list_available_doc_ids()
@@ -25,6 +25,8 @@ Architecture (cohérente ADR V1.5 §3e) :
         4. for each tool_call :
              a. sanitizer.sanitize() [registry validation]
              b. execute tool [budget.add_retrieved_chars]
+                (tools side_effect_free consécutifs : en parallèle, thread pool
+                borné + timeout par appel ; enregistrement dans l'ordre)
              c. tracker.record(...) → check should_stop() → conclude if thrash
              d. workspace.record_tool_call / add_evidence
         5. budget.increment_iteration
@@ -38,7 +40,9 @@ import asyncio
 import json
 import logging
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Callable, Optional
 
@@ -62,6 +66,7 @@ from knowbase.runtime_v5.agent.workspace import (
     Workspace,
 )
 from knowbase.runtime_v5.observability.metrics import (
+    DEFAULT_TOOL_LATENCY_BUCKETS_S,
     MetricsRegistry,
     get_default_metrics,
 )
@@ -74,6 +79,7 @@ from knowbase.runtime_v5.observability.tracer import (
 from knowbase.runtime_v5.tools.registry import (
     EvidenceType,
     ToolRegistry,
+    ToolSpec,
     get_default_registry,
 )
 from knowbase.runtime_v5.tools.sanitizer import (
@@ -110,6 +116,40 @@ class AgentRunResult:
         return d
 
 
+@dataclass
+class _PreparedToolCall:
+    """Tool call d'un tour LLM : parsé/sanitizé, puis résultat d'exécution."""
+    tc: dict
+    fn_name: str
+    fn_args: dict
+    args: Optional[dict] = None
+    spec: Optional[ToolSpec] = None
+    repair_applied: bool = False
+    sanitize_error: Optional[ToolCallError] = None
+    result: Optional[dict] = None
+    latency_ms: float = 0.0
+
+
+# ─── Thread pool partagé (tools side-effect-free) ────────────────────────────
+
+# Taille globale du pool (toutes requêtes confondues) ; la borne par tour est
+# `max_parallel_tools` de l'agent. Un appel en timeout libère le tour mais son
+# thread termine en arrière-plan.
+_TOOL_POOL_SIZE = int(os.getenv("V5_TOOL_POOL_SIZE", "16"))
+_tool_executor: Optional[ThreadPoolExecutor] = None
+_tool_executor_lock = threading.Lock()
+
+
+def _get_tool_executor() -> ThreadPoolExecutor:
+    global _tool_executor
+    with _tool_executor_lock:
+        if _tool_executor is None:
+            _tool_executor = ThreadPoolExecutor(
+                max_workers=_TOOL_POOL_SIZE, thread_name_prefix="v5-tool",
+            )
+        return _tool_executor
+
+
 # ─── LLM call interface (abstrait pour tests) ────────────────────────────────
 
 
@@ -141,6 +181,10 @@ class ReasoningAgentV51:
         registry : ToolRegistry à utiliser (default singleton)
         sanitizer : ToolCallSanitizer (default = wrap registry)
         max_message_history : limite messages gardés (default 60)
+        max_parallel_tools : appels side-effect-free simultanés par tour
+            (default env V5_MAX_PARALLEL_TOOLS=4 ; 1 = exécution séquentielle)
+        tool_timeout_s : timeout par appel parallèle si le ToolSpec n'en
+            déclare pas (default env V5_TOOL_TIMEOUT_S=30)
     """
 
     def __init__(
@@ -152,6 +196,8 @@ class ReasoningAgentV51:
         tracer: Optional[ObservabilityTracer] = None,
         metrics: Optional[MetricsRegistry] = None,
         verifier=None,  # GroundingVerifier optional (Mode A passive S7.7)
+        max_parallel_tools: Optional[int] = None,
+        tool_timeout_s: Optional[float] = None,
     ):
         self.llm = llm_caller
         self.registry = registry or get_default_registry()
@@ -160,6 +206,14 @@ class ReasoningAgentV51:
         self.tracer = tracer or get_default_tracer()
         self.metrics = metrics or get_default_metrics()
         self.verifier = verifier  # None = skip verification
+        self.max_parallel_tools = (
+            max_parallel_tools if max_parallel_tools is not None
+            else int(os.getenv("V5_MAX_PARALLEL_TOOLS", "4"))
+        )
+        self.tool_timeout_s = (
+            tool_timeout_s if tool_timeout_s is not None
+            else float(os.getenv("V5_TOOL_TIMEOUT_S", "30"))
+        )
         # Pre-register metrics (low-cardinality SLO ADR §3g)
         self._m_agent_duration = self.metrics.histogram(
             "agent_answer_duration_s",
@@ -177,6 +231,12 @@ class ReasoningAgentV51:
             help_text="Total tool calls",
             label_keys=["tool", "outcome"],  # outcome=ok|repaired|error
         )
+        self._m_tool_duration = self.metrics.histogram(
+            "tool_call_duration_s",
+            help_text="Tool call latency (seconds)",
+            label_keys=["tool"],
+            buckets=DEFAULT_TOOL_LATENCY_BUCKETS_S,
+        )
         self._m_tool_repair = self.metrics.counter(
             "tool_call_repair_total",
             help_text="Tool calls with sanitizer repair applied",
@@ -329,107 +389,17 @@ class ReasoningAgentV51:
                     final_answer_content = content
                     break
 
-                # 6. Execute each tool call
-                for tc in tool_calls:
-                    await token.check_async()  # check between tool calls
-                    iter_idx = budgets.iterations - 1
-                    fn_name = tc["function"]["name"]
-                    try:
-                        fn_args = json.loads(tc["function"]["arguments"] or "{}")
-                    except json.JSONDecodeError:
-                        fn_args = {}
-
-                    # 6a. Sanitize via ToolCallSanitizer
-                    try:
-                        sanitized = self.sanitizer.sanitize(fn_name, fn_args)
-                        tool_args_clean = sanitized.args
-                        spec = sanitized.spec
-                        repair_applied = sanitized.report.has_repairs()
-                    except ToolCallError as e:
-                        # Tool inconnu / retired / invalid → record + inject error
-                        workspace.record_tool_call(
-                            iter_idx=iter_idx, tool_name=fn_name,
-                            args=fn_args, error=str(e), repair_applied=False,
-                        )
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tc["id"],
-                            "content": json.dumps({"error": str(e),
-                                                   "error_type": e.error_type}),
-                        })
-                        budgets.increment_tool_call()
-                        continue
-
-                    # 6b. Execute tool (sub-span : gen_ai.execute_tool)
-                    with SpanContext(
-                        self.tracer, "gen_ai.execute_tool",
-                        parent_span=root_span,
-                        attributes={
-                            "tool_name": fn_name,
-                            "iter": iter_idx,
-                            "repair_applied": repair_applied,
-                        },
-                    ) as tool_span:
-                        t_tool = time.time()
-                        try:
-                            if spec.handler is None:
-                                tool_result = {"error": f"tool '{fn_name}' has no handler"}
-                            else:
-                                tool_result = {"result": spec.handler(**tool_args_clean)}
-                        except Exception as ex:
-                            tool_result = {"error": f"{type(ex).__name__}: {ex}"}
-                            tool_span.set_status(SpanStatus.ERROR, str(ex))
-                        tool_latency_ms = (time.time() - t_tool) * 1000.0
-                        tool_span.set_attribute("latency_ms", tool_latency_ms)
-                    budgets.increment_tool_call()
-                    # Metric counter
-                    outcome = (
-                        "error" if "error" in tool_result
-                        else "repaired" if repair_applied
-                        else "ok"
-                    )
-                    self._m_tool_calls.inc(labels={"tool": fn_name, "outcome": outcome})
-                    if repair_applied:
-                        self._m_tool_repair.inc(labels={"tool": fn_name})
-
-                    # 6c. Compress + inject result
-                    result_str = json.dumps(tool_result, ensure_ascii=False)
-                    result_chars = len(result_str)
-                    budgets.add_retrieved_chars(result_chars)
-                    truncated = result_str
-                    if len(result_str) > 12000:
-                        truncated = result_str[:12000] + "\n... [TRUNCATED]"
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tc["id"],
-                        "content": truncated,
-                    })
-
-                    # 6d. Record loop signature (anti-thrash)
-                    extracted_text = self._extract_evidence_text(tool_result)
-                    loop_tracker.record(
-                        tool=fn_name,
-                        args=tool_args_clean,
-                        new_evidence_text=extracted_text,
-                        prior_evidence_chars=budgets.retrieved_chars - result_chars,
-                        iter_idx=iter_idx,
-                    )
-
-                    # 6e. Record in workspace
-                    workspace.record_tool_call(
-                        iter_idx=iter_idx, tool_name=fn_name,
-                        args=tool_args_clean, result_summary=extracted_text[:300],
-                        result_chars=result_chars,
-                        latency_ms=tool_latency_ms,
-                        error=tool_result.get("error"),
-                        repair_applied=repair_applied,
-                    )
-                    # Add evidence if successful
-                    if "result" in tool_result and isinstance(tool_result["result"], dict):
-                        self._extract_and_add_evidence(
-                            workspace, tool_result["result"],
-                            evidence_type=spec.evidence_type_returned,
-                            source_tool=fn_name, iter_idx=iter_idx,
+                # 6. Execute tool calls — les tools side-effect-free consécutifs
+                #    tournent en parallèle ; l'enregistrement (messages, budgets,
+                #    loop tracker, workspace) reste dans l'ordre des tool_calls.
+                iter_idx = budgets.iterations - 1
+                prepared = [self._prepare_tool_call(tc) for tc in tool_calls]
+                for group in self._group_tool_calls(prepared):
+                    await token.check_async()  # check between tool groups
+                    await self._execute_tool_group(group, root_span, iter_idx)
+                    for call in group:
+                        self._record_tool_call(
+                            call, iter_idx, messages, budgets, loop_tracker, workspace,
                         )
 
                 # 7. Enforce hard caps (raise if absolute limit hit)
@@ -534,6 +504,224 @@ class ReasoningAgentV51:
             verifier_report=verifier_report,
         )
 
+    # ─── Tool execution (S4 + exécution parallèle des tools read-only) ───────
+
+    def _prepare_tool_call(self, tc: dict) -> "_PreparedToolCall":
+        """Parse + sanitize un tool_call (aucune exécution)."""
+        fn_name = tc["function"]["name"]
+        try:
+            fn_args = json.loads(tc["function"]["arguments"] or "{}")
+        except json.JSONDecodeError:
+            fn_args = {}
+        call = _PreparedToolCall(tc=tc, fn_name=fn_name, fn_args=fn_args)
+        try:
+            sanitized = self.sanitizer.sanitize(fn_name, fn_args)
+            call.args = sanitized.args
+            call.spec = sanitized.spec
+            call.repair_applied = sanitized.report.has_repairs()
+        except ToolCallError as e:
+            # Tool inconnu / retired / invalid → record + inject error
+            call.sanitize_error = e
+        return call
+
+    def _group_tool_calls(
+        self, prepared: list["_PreparedToolCall"],
+    ) -> list[list["_PreparedToolCall"]]:
+        """Découpe les appels d'un tour en groupes exécutables.
+
+        Les appels side-effect-free consécutifs forment un groupe parallèle ;
+        un appel avec effets de bord est seul dans son groupe (barrière), de
+        sorte que l'ordre relatif lectures/écritures est préservé.
+        """
+        groups: list[list[_PreparedToolCall]] = []
+        current: list[_PreparedToolCall] = []
+        for call in prepared:
+            if call.sanitize_error is not None or self._is_parallelizable(call):
+                current.append(call)
+                continue
+            if current:
+                groups.append(current)
+                current = []
+            groups.append([call])
+        if current:
+            groups.append(current)
+        return groups
+
+    def _is_parallelizable(self, call: "_PreparedToolCall") -> bool:
+        return (
+            self.max_parallel_tools > 1
+            and call.spec is not None
+            and call.spec.handler is not None
+            and call.spec.side_effect_free
+        )
+
+    async def _execute_tool_group(
+        self,
+        group: list["_PreparedToolCall"],
+        root_span,
+        iter_idx: int,
+    ) -> None:
+        """Exécute un groupe (sub-span gen_ai.execute_tool par appel).
+
+        Appels parallélisables : thread pool borné (max_parallel_tools) +
+        timeout par appel. Sinon : exécution inline comme avant.
+        """
+        runnable = [c for c in group if c.sanitize_error is None]
+        if not runnable:
+            return
+        parallel = [c for c in runnable if self._is_parallelizable(c)]
+        if not parallel:
+            for call in runnable:
+                self._execute_tool_inline(call, root_span, iter_idx)
+            return
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        executor = _get_tool_executor()
+
+        async def _run(call: _PreparedToolCall) -> None:
+            async with semaphore:
+                with SpanContext(
+                    self.tracer, "gen_ai.execute_tool",
+                    parent_span=root_span,
+                    attributes={
+                        "tool_name": call.fn_name,
+                        "iter": iter_idx,
+                        "repair_applied": call.repair_applied,
+                        "parallel_group_size": len(parallel),
+                    },
+                ) as tool_span:
+                    timeout_s = call.spec.timeout_s or self.tool_timeout_s
+                    t_tool = time.time()
+                    try:
+                        value = await asyncio.wait_for(
+                            loop.run_in_executor(
+                                executor, lambda: call.spec.handler(**call.args),
+                            ),
+                            timeout=timeout_s,
+                        )
+                        call.result = {"result": value}
+                    except asyncio.TimeoutError:
+                        call.result = {
+                            "error": f"TimeoutError: tool '{call.fn_name}' exceeded {timeout_s}s"
+                        }
+                        tool_span.set_status(SpanStatus.ERROR, "timeout")
+                    except Exception as ex:
+                        call.result = {"error": f"{type(ex).__name__}: {ex}"}
+                        tool_span.set_status(SpanStatus.ERROR, str(ex))
+                    call.latency_ms = (time.time() - t_tool) * 1000.0
+                    tool_span.set_attribute("latency_ms", call.latency_ms)
+
+        await asyncio.gather(*(_run(c) for c in parallel))
+        for call in runnable:
+            if call.result is None:
+                self._execute_tool_inline(call, root_span, iter_idx)
+
+    def _execute_tool_inline(self, call: "_PreparedToolCall", root_span, iter_idx: int) -> None:
+        """Exécution synchrone (tools avec effets de bord ou parallélisme désactivé)."""
+        with SpanContext(
+            self.tracer, "gen_ai.execute_tool",
+            parent_span=root_span,
+            attributes={
+                "tool_name": call.fn_name,
+                "iter": iter_idx,
+                "repair_applied": call.repair_applied,
+            },
+        ) as tool_span:
+            t_tool = time.time()
+            try:
+                if call.spec.handler is None:
+                    call.result = {"error": f"tool '{call.fn_name}' has no handler"}
+                else:
+                    call.result = {"result": call.spec.handler(**call.args)}
+            except Exception as ex:
+                call.result = {"error": f"{type(ex).__name__}: {ex}"}
+                tool_span.set_status(SpanStatus.ERROR, str(ex))
+            call.latency_ms = (time.time() - t_tool) * 1000.0
+            tool_span.set_attribute("latency_ms", call.latency_ms)
+
+    def _record_tool_call(
+        self,
+        call: "_PreparedToolCall",
+        iter_idx: int,
+        messages: list[dict],
+        budgets: BudgetTracker,
+        loop_tracker: LoopSignatureTracker,
+        workspace: Workspace,
+    ) -> None:
+        """Budgets + métriques + message tool + loop tracker + workspace (ordre déterministe)."""
+        fn_name = call.fn_name
+        tc = call.tc
+
+        if call.sanitize_error is not None:
+            e = call.sanitize_error
+            workspace.record_tool_call(
+                iter_idx=iter_idx, tool_name=fn_name,
+                args=call.fn_args, error=str(e), repair_applied=False,
+            )
+            messages.append({
+                "role": "tool",
+                "tool_call_id": tc["id"],
+                "content": json.dumps({"error": str(e),
+                                       "error_type": e.error_type}),
+            })
+            budgets.increment_tool_call()
+            return
+
+        tool_result = call.result
+        repair_applied = call.repair_applied
+        budgets.increment_tool_call()
+        # Metric counter
+        outcome = (
+            "error" if "error" in tool_result
+            else "repaired" if repair_applied
+            else "ok"
+        )
+        self._m_tool_calls.inc(labels={"tool": fn_name, "outcome": outcome})
+        self._m_tool_duration.observe(call.latency_ms / 1000.0, labels={"tool": fn_name})
+        if repair_applied:
+            self._m_tool_repair.inc(labels={"tool": fn_name})
+
+        # 6c. Compress + inject result
+        result_str = json.dumps(tool_result, ensure_ascii=False)
+        result_chars = len(result_str)
+        budgets.add_retrieved_chars(result_chars)
+        truncated = result_str
+        if len(result_str) > 12000:
+            truncated = result_str[:12000] + "\n... [TRUNCATED]"
+        messages.append({
+            "role": "tool",
+            "tool_call_id": tc["id"],
+            "content": truncated,
+        })
+
+        # 6d. Record loop signature (anti-thrash)
+        extracted_text = self._extract_evidence_text(tool_result)
+        loop_tracker.record(
+            tool=fn_name,
+            args=call.args,
+            new_evidence_text=extracted_text,
+            prior_evidence_chars=budgets.retrieved_chars - result_chars,
+            iter_idx=iter_idx,
+        )
+
+        # 6e. Record in workspace
+        workspace.record_tool_call(
+            iter_idx=iter_idx, tool_name=fn_name,
+            args=call.args, result_summary=extracted_text[:300],
+            result_chars=result_chars,
+            latency_ms=call.latency_ms,
+            error=tool_result.get("error"),
+            repair_applied=repair_applied,
+        )
+        # Add evidence if successful
+        if "result" in tool_result and isinstance(tool_result["result"], dict):
+            self._extract_and_add_evidence(
+                workspace, tool_result["result"],
+                evidence_type=call.spec.evidence_type_returned,
+                source_tool=fn_name, iter_idx=iter_idx,
+            )
+
     # ─── Verifier passive (Mode A S7.7) ──────────────────────────────────────
 
     def _run_verifier_passive(
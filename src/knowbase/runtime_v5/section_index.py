@@ -0,0 +1,467 @@
+"""Section index persistant pour find_in (TF-IDF + embeddings e5 par doc).
+
+Remplace les caches module `_TFIDF_CACHE` / `_EMB_INDEX_CACHE` de
+reading_tools (non bornés, reconstruits par chaque worker API et à chaque
+restart, encodage sous un lock global).
+
+Index précalculé à l'ingestion (build_section_index) et relu à froid en
+quelques ms :
+
+    {structures_dir}/_section_index/{doc_id}/
+        meta.json      source_mtime_ns, source_size, indices, model, dim
+        tfidf.pkl      TfidfVectorizer (pickle)
+        tfidf.npz      matrice TF-IDF CSR (scipy.sparse.save_npz)
+        emb.f16.npy    embeddings float16 [n_sections, dim], np.load(mmap_mode="r")
+
+- Partagé entre processus : fichiers + page cache OS (mmap), aucun worker
+  ne ré-encode un doc déjà indexé.
+- Validité : meta.json porte (mtime_ns, size) du JSON de structure ; un
+  fichier de structure modifié invalide l'index (rebuild).
+- En mémoire : LRU borné (V5_SECTION_INDEX_LRU docs), build sous lock
+  par doc (un doc lent ne bloque plus les lookups des autres docs).
+- Embeddings : EmbeddingModelManager partagé (même modèle que le reste du
+  projet, auto-unload GPU) au lieu d'une instance SentenceTransformer dédiée.
+
+meta.json est écrit en dernier (commit marker) ; chaque fichier est écrit
+en .tmp puis os.replace, donc un lecteur concurrent voit l'ancien index ou
+le nouveau, jamais un index partiel.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from knowbase.runtime_v5.structure_loader import (
+    DEFAULT_STRUCTURES_DIR,
+    DocumentStructure,
+    structure_path,
+)
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_DIRNAME = "_section_index"
+INDEX_FORMAT_VERSION = 1
+DEFAULT_LRU_SIZE = int(os.getenv("V5_SECTION_INDEX_LRU", "32"))
+
+# Tronque à 1500 chars (e5 max 512 tokens ≈ 2000 chars), title+text suffit
+PASSAGE_MAX_CHARS = 1500
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Builders (purs)
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def indexable_sections(struct: DocumentStructure) -> list[int]:
+    """Indices des sections avec titre ou texte (lignes des matrices)."""
+    return [
+        i for i, s in enumerate(struct.sections)
+        if (s.get("title") or "").strip() or (s.get("text") or "").strip()
+    ]
+
+
+def build_tfidf(struct: DocumentStructure, indices: list[int]):
+    """Construit (vectorizer, matrix) TF-IDF pour les sections `indices`."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    docs = []
+    for i in indices:
+        s = struct.sections[i]
+        title = (s.get("title") or "").strip()
+        text = (s.get("text") or "").strip()
+        # Concat title + text pour scoring (title boost implicite via vocab repeat)
+        docs.append(f"{title} {title} {text}" if title else text)
+    if not docs:
+        return None, None
+
+    # TF-IDF avec n-grams 1-2 pour capturer expressions composées
+    # (ex: "WWI Monitor" comme bigram, pas seulement les deux mots séparés)
+    vectorizer = TfidfVectorizer(
+        lowercase=True,
+        ngram_range=(1, 2),
+        max_features=50000,
+        token_pattern=r"\b[A-Za-z_][A-Za-z0-9_]+\b",  # capture identifiants techniques
+        sublinear_tf=True,
+    )
+    matrix = vectorizer.fit_transform(docs)
+    return vectorizer, matrix
+
+
+def build_passages(struct: DocumentStructure, indices: list[int]) -> list[str]:
+    """Passages e5 (préfixe "passage: ", convention multilingual-e5-large)."""
+    passages = []
+    for i in indices:
+        s = struct.sections[i]
+        title = (s.get("title") or "").strip()
+        text = (s.get("text") or "").strip()
+        passages.append(
+            f"passage: {title}\n{text[:PASSAGE_MAX_CHARS]}" if title
+            else f"passage: {text[:PASSAGE_MAX_CHARS]}"
+        )
+    return passages
+
+
+def _default_encoder(texts: list[str]) -> np.ndarray:
+    from knowbase.common.clients.embeddings import get_embedding_manager
+    return get_embedding_manager().encode(
+        texts, batch_size=16, show_progress_bar=False, normalize_embeddings=True,
+    )
+
+
+def _default_model_name() -> str:
+    try:
+        from knowbase.config.settings import get_settings
+        return get_settings().embeddings_model
+    except Exception:
+        return "unknown"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Entry
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class SectionIndexEntry:
+    """Index d'un doc : TF-IDF (toujours) + embeddings (optionnel, mmap)."""
+    doc_id: str
+    source_sig: Optional[tuple[int, int]]  # (mtime_ns, size) du JSON structure
+    indices: list[int]
+    vectorizer: Any = None
+    tfidf_matrix: Any = None
+    embeddings: Optional[np.ndarray] = None
+    embeddings_failed: bool = False
+
+    @property
+    def has_embeddings(self) -> bool:
+        return self.embeddings is not None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Store
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class SectionIndexStore:
+    """Index de sections persistant + LRU mémoire borné.
+
+    Args:
+        structures_dir : dossier des structures JSON (default DEFAULT_STRUCTURES_DIR)
+        max_docs : taille du LRU mémoire
+        encoder : callable(list[str]) -> np.ndarray normalisé (default
+            EmbeddingModelManager partagé)
+        persist : False = LRU mémoire uniquement (tests, docs synthétiques)
+    """
+
+    def __init__(
+        self,
+        structures_dir: Optional[Path] = None,
+        max_docs: int = DEFAULT_LRU_SIZE,
+        encoder: Optional[Callable[[list[str]], np.ndarray]] = None,
+        persist: bool = True,
+    ):
+        self.structures_dir = Path(structures_dir or DEFAULT_STRUCTURES_DIR)
+        self.index_root = self.structures_dir / INDEX_DIRNAME
+        self.max_docs = max(1, max_docs)
+        self.encoder = encoder or _default_encoder
+        self.persist = persist
+        self._lru: "OrderedDict[str, SectionIndexEntry]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self._doc_locks: dict[str, threading.Lock] = {}
+        self._n_hits = 0
+        self._n_disk_loads = 0
+        self._n_builds = 0
+
+    # ─── Public API ──────────────────────────────────────────────────────────
+
+    def get(
+        self,
+        doc_id: str,
+        struct: DocumentStructure,
+        *,
+        with_embeddings: bool = False,
+    ) -> SectionIndexEntry:
+        """Index du doc : LRU → disque → build (sous lock du doc)."""
+        sig = self._source_sig(doc_id)
+        entry = self._lru_get(doc_id, sig, with_embeddings)
+        if entry is not None:
+            return entry
+
+        with self._doc_lock(doc_id):
+            entry = self._lru_get(doc_id, sig, with_embeddings)
+            if entry is not None:
+                return entry
+            entry = self._load_or_build(doc_id, struct, sig, with_embeddings)
+            self._lru_put(entry)
+            return entry
+
+    def build(
+        self,
+        doc_id: str,
+        struct: DocumentStructure,
+        *,
+        with_embeddings: bool = True,
+    ) -> SectionIndexEntry:
+        """Build forcé (ingestion) : recalcule et persiste l'index du doc."""
+        sig = self._source_sig(doc_id)
+        with self._doc_lock(doc_id):
+            entry = self._build(doc_id, struct, sig, with_embeddings)
+            self._lru_put(entry)
+            return entry
+
+    def get_tfidf(self, doc_id: str, struct: DocumentStructure):
+        """(vectorizer, matrix, indices) — signature historique de reading_tools."""
+        entry = self.get(doc_id, struct)
+        return entry.vectorizer, entry.tfidf_matrix, entry.indices
+
+    def get_embeddings(self, doc_id: str, struct: DocumentStructure):
+        """(embeddings, indices) ou (None, [])."""
+        entry = self.get(doc_id, struct, with_embeddings=True)
+        if entry.embeddings is None:
+            return None, []
+        return entry.embeddings, entry.indices
+
+    def encode_query(self, query: str) -> Optional[np.ndarray]:
+        """Encode une query e5 ("query: " prefix)."""
+        try:
+            return np.asarray(self.encoder([f"query: {query}"]), dtype=np.float32)
+        except Exception as exc:
+            logger.warning("[SectionIndex] query encode failed: %s", exc)
+            return None
+
+    def invalidate(self, doc_id: str) -> None:
+        with self._lru_lock:
+            self._lru.pop(doc_id, None)
+
+    def clear(self) -> None:
+        with self._lru_lock:
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        with self._lru_lock:
+            return {
+                "cached_docs": len(self._lru),
+                "max_docs": self.max_docs,
+                "hits": self._n_hits,
+                "disk_loads": self._n_disk_loads,
+                "builds": self._n_builds,
+            }
+
+    # ─── LRU ─────────────────────────────────────────────────────────────────
+
+    def _doc_lock(self, doc_id: str) -> threading.Lock:
+        with self._lru_lock:
+            lock = self._doc_locks.get(doc_id)
+            if lock is None:
+                lock = self._doc_locks[doc_id] = threading.Lock()
+            return lock
+
+    def _lru_get(
+        self, doc_id: str, sig: Optional[tuple[int, int]], with_embeddings: bool,
+    ) -> Optional[SectionIndexEntry]:
+        with self._lru_lock:
+            entry = self._lru.get(doc_id)
+            if entry is None or entry.source_sig != sig:
+                return None
+            if with_embeddings and not entry.has_embeddings and not entry.embeddings_failed:
+                return None
+            self._lru.move_to_end(doc_id)
+            self._n_hits += 1
+            return entry
+
+    def _lru_put(self, entry: SectionIndexEntry) -> None:
+        with self._lru_lock:
+            self._lru[entry.doc_id] = entry
+            self._lru.move_to_end(entry.doc_id)
+            while len(self._lru) > self.max_docs:
+                self._lru.popitem(last=False)
+
+    # ─── Disk ────────────────────────────────────────────────────────────────
+
+    def _source_sig(self, doc_id: str) -> Optional[tuple[int, int]]:
+        try:
+            st = structure_path(doc_id, self.structures_dir).stat()
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def index_dir(self, doc_id: str) -> Path:
+        return self.index_root / doc_id
+
+    def _load_or_build(
+        self,
+        doc_id: str,
+        struct: DocumentStructure,
+        sig: Optional[tuple[int, int]],
+        with_embeddings: bool,
+    ) -> SectionIndexEntry:
+        # Réutilise l'entrée LRU (TF-IDF) si seules les embeddings manquent
+        with self._lru_lock:
+            cached = self._lru.get(doc_id)
+        if cached is not None and cached.source_sig == sig:
+            entry = cached
+        else:
+            entry = self._load(doc_id, sig)
+        if entry is None:
+            return self._build(doc_id, struct, sig, with_embeddings)
+        if with_embeddings and not entry.has_embeddings:
+            self._add_embeddings(entry, struct)
+            self._write(entry)
+        return entry
+
+    def _load(self, doc_id: str, sig: Optional[tuple[int, int]]) -> Optional[SectionIndexEntry]:
+        if not self.persist or sig is None:
+            return None
+        d = self.index_dir(doc_id)
+        try:
+            meta = json.loads((d / "meta.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if (
+            meta.get("format") != INDEX_FORMAT_VERSION
+            or tuple(meta.get("source_sig") or ()) != sig
+        ):
+            return None
+        try:
+            t0 = time.perf_counter()
+            entry = SectionIndexEntry(doc_id=doc_id, source_sig=sig, indices=meta["indices"])
+            if meta.get("has_tfidf"):
+                import scipy.sparse
+                with open(d / "tfidf.pkl", "rb") as f:
+                    entry.vectorizer = pickle.load(f)
+                entry.tfidf_matrix = scipy.sparse.load_npz(d / "tfidf.npz")
+            if meta.get("has_embeddings"):
+                entry.embeddings = np.load(d / "emb.f16.npy", mmap_mode="r")
+            self._n_disk_loads += 1
+            logger.debug(
+                "[SectionIndex] loaded %s from disk in %.1fms",
+                doc_id, (time.perf_counter() - t0) * 1000,
+            )
+            return entry
+        except Exception as exc:
+            logger.warning("[SectionIndex] corrupt index for %s, rebuilding: %s", doc_id, exc)
+            return None
+
+    def _build(
+        self,
+        doc_id: str,
+        struct: DocumentStructure,
+        sig: Optional[tuple[int, int]],
+        with_embeddings: bool,
+    ) -> SectionIndexEntry:
+        t0 = time.perf_counter()
+        indices = indexable_sections(struct)
+        entry = SectionIndexEntry(doc_id=doc_id, source_sig=sig, indices=indices)
+        try:
+            entry.vectorizer, entry.tfidf_matrix = build_tfidf(struct, indices)
+        except Exception as exc:
+            logger.warning("[SectionIndex] TF-IDF build failed for %s: %s", doc_id, exc)
+        if with_embeddings:
+            self._add_embeddings(entry, struct)
+        self._n_builds += 1
+        self._write(entry)
+        logger.info(
+            "[SectionIndex] built %s (%d sections, embeddings=%s) in %.2fs",
+            doc_id, len(indices), entry.has_embeddings, time.perf_counter() - t0,
+        )
+        return entry
+
+    def _add_embeddings(self, entry: SectionIndexEntry, struct: DocumentStructure) -> None:
+        if not entry.indices:
+            return
+        try:
+            embeddings = self.encoder(build_passages(struct, entry.indices))
+            entry.embeddings = np.asarray(embeddings, dtype=np.float16)
+            entry.embeddings_failed = False
+        except Exception as exc:
+            # Pas persisté : un autre process / restart retentera
+            logger.warning("[SectionIndex] embedding encode failed for %s: %s", entry.doc_id, exc)
+            entry.embeddings_failed = True
+
+    def _write(self, entry: SectionIndexEntry) -> None:
+        if not self.persist or entry.source_sig is None:
+            return
+        d = self.index_dir(entry.doc_id)
+        try:
+            d.mkdir(parents=True, exist_ok=True)
+            suffix = f".tmp{os.getpid()}"
+            has_tfidf = entry.vectorizer is not None and entry.tfidf_matrix is not None
+            if has_tfidf:
+                import scipy.sparse
+                with open(d / f"tfidf.pkl{suffix}", "wb") as f:
+                    pickle.dump(entry.vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(d / f"tfidf.pkl{suffix}", d / "tfidf.pkl")
+                # save_npz ajoute ".npz" si absent
+                scipy.sparse.save_npz(d / f"tfidf{suffix}.npz", entry.tfidf_matrix.tocsr())
+                os.replace(d / f"tfidf{suffix}.npz", d / "tfidf.npz")
+            if entry.has_embeddings:
+                with open(d / f"emb.f16.npy{suffix}", "wb") as f:
+                    np.save(f, np.asarray(entry.embeddings, dtype=np.float16))
+                os.replace(d / f"emb.f16.npy{suffix}", d / "emb.f16.npy")
+            meta = {
+                "format": INDEX_FORMAT_VERSION,
+                "doc_id": entry.doc_id,
+                "source_sig": list(entry.source_sig),
+                "indices": entry.indices,
+                "has_tfidf": has_tfidf,
+                "has_embeddings": entry.has_embeddings,
+                "model": _default_model_name() if entry.has_embeddings else None,
+                "dim": int(entry.embeddings.shape[1]) if entry.has_embeddings else None,
+                "built_at": time.time(),
+            }
+            (d / f"meta.json{suffix}").write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(d / f"meta.json{suffix}", d / "meta.json")
+            if entry.has_embeddings:
+                # Remap en mmap : la copie mémoire du build est libérée
+                entry.embeddings = np.load(d / "emb.f16.npy", mmap_mode="r")
+        except Exception as exc:
+            logger.warning("[SectionIndex] persist failed for %s: %s", entry.doc_id, exc)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Singleton + ingestion hook
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+_default_store: Optional[SectionIndexStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_section_index_store() -> SectionIndexStore:
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = SectionIndexStore()
+        return _default_store
+
+
+def reset_section_index_store() -> None:
+    """Reset singleton (utile pour tests)."""
+    global _default_store
+    with _default_store_lock:
+        _default_store = None
+
+
+def build_section_index(
+    doc_id: str,
+    struct: DocumentStructure,
+    structures_dir: Optional[Path] = None,
+    with_embeddings: bool = True,
+) -> SectionIndexEntry:
+    """Hook ingestion : précalcule l'index juste après l'écriture du JSON structure."""
+    if structures_dir is None:
+        store = get_section_index_store()
+    else:
+        store = SectionIndexStore(structures_dir=structures_dir, max_docs=1)
+    return store.build(doc_id, struct, with_embeddings=with_embeddings)
@@ -10,15 +10,44 @@ Format attendu (cf scripts/poc_a_build_structures.py) :
   ],
   "root_section_ids": [...]
 }
+
+Les tools reading (outline, read, find_in, expand_context, compare_sections)
+appellent load_structure à chaque tool call : les structures parsées sont
+gardées dans un StructureStore (LRU borné V5_STRUCTURE_LRU docs, validé par
+(inode, mtime_ns, size) du fichier source), un JSON réécrit est donc relu
+au call suivant.
+
+Forme compacte optionnelle `{doc_id}.v5s` (write_compact_structure, écrite
+par le hook d'ingestion ou à la volée si V5_STRUCTURE_COMPACT=1) :
+
+    b"V5STRUC1" | uint64 LE header_len | header JSON | blob texte UTF-8
+
+Le header porte les sections SANS texte + (offset, length) de chaque texte
+dans le blob ; seul le header est parsé, le texte d'une section est lu via
+mmap au premier accès (LazySection).
 """
 from __future__ import annotations
 
 import json
+import logging
+import mmap
+import os
+import struct as _struct
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
 
 
 DEFAULT_STRUCTURES_DIR = Path("/app/data/poc_a/structures")
+DEFAULT_LRU_SIZE = int(os.getenv("V5_STRUCTURE_LRU", "32"))
+
+COMPACT_SUFFIX = ".v5s"
+COMPACT_MAGIC = b"V5STRUC1"
+_HEADER_LEN = _struct.Struct("<Q")
 
 
 class DocumentStructure:
@@ -41,6 +70,18 @@ class DocumentStructure:
         self.section_index: dict[str, int] = {
             s["section_id"]: i for i, s in enumerate(self.sections)
         }
+        # Index par path : exact (1re section gagnante) + suffixe (paths
+        # inversés triés, un suffixe devient un préfixe → bisect)
+        self.by_path: dict[str, dict] = {}
+        reversed_paths: list[tuple[str, int]] = []
+        for i, s in enumerate(self.sections):
+            sp = (s.get("section_path") or "").lower()
+            self.by_path.setdefault(sp, s)
+            reversed_paths.append((sp[::-1], i))
+        reversed_paths.sort()
+        self._rev_paths: list[str] = [r for r, _ in reversed_paths]
+        self._rev_order: list[int] = [i for _, i in reversed_paths]
+        self._suffix_cache: dict[str, Optional[dict]] = {}
 
     def find_by_path(self, section_path: str) -> Optional[dict]:
         """Cherche une section par section_path (exact ou par suffixe)."""
@@ -48,15 +89,29 @@ class DocumentStructure:
         if not path_clean.startswith("/"):
             path_clean = "/" + path_clean
         # Match exact d'abord
-        for s in self.sections:
-            if (s.get("section_path") or "").lower() == path_clean:
-                return s
-        # Match suffixe (ex. "/Article 5" matche "/CHAPTER II/Article 5")
-        for s in self.sections:
-            sp = (s.get("section_path") or "").lower()
-            if sp.endswith(path_clean) or sp.endswith(path_clean.lstrip("/")):
-                return s
-        return None
+        s = self.by_path.get(path_clean)
+        if s is not None:
+            return s
+        # Match suffixe (ex. "/Article 5" matche "/CHAPTER II/Article 5").
+        # endswith("/article 5") implique endswith("article 5") : seul le
+        # suffixe sans "/" initial compte.
+        return self._find_by_suffix(path_clean.lstrip("/"))
+
+    def _find_by_suffix(self, suffix: str) -> Optional[dict]:
+        """1re section (ordre du doc) dont le path se termine par `suffix`."""
+        if suffix in self._suffix_cache:
+            return self._suffix_cache[suffix]
+        prefix = suffix[::-1]
+        best: Optional[int] = None
+        j = bisect_left(self._rev_paths, prefix)
+        while j < len(self._rev_paths) and self._rev_paths[j].startswith(prefix):
+            i = self._rev_order[j]
+            if best is None or i < best:
+                best = i
+            j += 1
+        s = self.sections[best] if best is not None else None
+        self._suffix_cache[suffix] = s
+        return s
 
     def find_by_numbering(self, numbering: str) -> list[dict]:
         return self.by_numbering.get(numbering.strip().lower(), [])
@@ -70,16 +125,312 @@ class DocumentStructure:
         return {"previous": previous, "next": nxt}
 
 
-def load_structure(doc_id: str, base_dir: Optional[Path] = None) -> Optional[DocumentStructure]:
-    base = base_dir or DEFAULT_STRUCTURES_DIR
-    f = base / f"{doc_id}.json"
-    if not f.exists():
+# ─────────────────────────────────────────────────────────────────────────────
+# Forme compacte (.v5s) — texte des sections lu à la demande
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class _TextBlob:
+    """Blob texte UTF-8 d'un fichier .v5s, mappé en lecture seule."""
+
+    def __init__(self, path: Path, base_offset: int):
+        self.path = path
+        self.base_offset = base_offset
+        self._mm: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    def read(self, offset: int, length: int) -> str:
+        if length == 0:
+            return ""
+        with self._lock:
+            if self._mm is None:
+                with open(self.path, "rb") as f:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            start = self.base_offset + offset
+            return self._mm[start:start + length].decode("utf-8")
+
+
+class LazySection(dict):
+    """Section dont le champ "text" est lu dans le blob au premier accès.
+
+    Se comporte comme le dict JSON d'origine pour `s["text"]`, `s.get("text")`
+    et `"text" in s`. Les copies C (`dict(s)`, `{**s}`, json.dumps) ne voient
+    le texte qu'une fois chargé : passer par materialize() pour sérialiser.
+    """
+
+    __slots__ = ("_blob", "_span")
+
+    def __init__(self, data: dict, blob: _TextBlob, span: Optional[list[int]]):
+        super().__init__(data)
+        self._blob = blob
+        self._span = span
+
+    def _load_text(self) -> Optional[str]:
+        if self._span is None:
+            return None
+        text = self._blob.read(*self._span)
+        dict.__setitem__(self, "text", text)
+        self._span = None
+        return text
+
+    def __missing__(self, key: str) -> Any:
+        if key == "text" and self._span is not None:
+            return self._load_text()
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key == "text" and self._span is not None and not dict.__contains__(self, key):
+            return self._load_text()
+        return dict.get(self, key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or (key == "text" and self._span is not None)
+
+    def materialize(self) -> dict:
+        if self._span is not None:
+            self._load_text()
+        return dict(self)
+
+
+def compact_structure_path(doc_id: str, base_dir: Optional[Path] = None) -> Path:
+    """Chemin de la forme compacte (.v5s) d'un doc."""
+    return (base_dir or DEFAULT_STRUCTURES_DIR) / f"{doc_id}{COMPACT_SUFFIX}"
+
+
+def _file_sig(path: Path) -> Optional[tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def write_compact_structure(
+    data: dict,
+    base_dir: Optional[Path] = None,
+    source_sig: Optional[tuple[int, int, int]] = None,
+) -> Path:
+    """Écrit `{doc_id}.v5s` (écriture atomique .tmp + os.replace).
+
+    source_sig : signature du JSON source ; par défaut celle du JSON présent
+    dans base_dir (le .v5s est ignoré dès que le JSON change).
+    """
+    doc_id = data["doc_id"]
+    if source_sig is None:
+        source_sig = _file_sig(structure_path(doc_id, base_dir))
+    chunks: list[bytes] = []
+    spans: list[Optional[list[int]]] = []
+    sections: list[dict] = []
+    offset = 0
+    for s in data["sections"]:
+        s = s.materialize() if isinstance(s, LazySection) else s
+        text = s.get("text")
+        if text is None:
+            spans.append(None)
+        else:
+            encoded = text.encode("utf-8")
+            chunks.append(encoded)
+            spans.append([offset, len(encoded)])
+            offset += len(encoded)
+        sections.append({k: v for k, v in s.items() if k != "text"})
+
+    header = {k: v for k, v in data.items() if k != "sections"}
+    header["sections"] = sections
+    header["text_spans"] = spans
+    header["source_sig"] = list(source_sig) if source_sig else None
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+
+    path = compact_structure_path(doc_id, base_dir)
+    tmp = path.with_name(path.name + f".tmp{os.getpid()}")
+    with open(tmp, "wb") as f:
+        f.write(COMPACT_MAGIC)
+        f.write(_HEADER_LEN.pack(len(header_bytes)))
+        f.write(header_bytes)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+
+def read_compact_structure(path: Path) -> tuple[dict, Optional[tuple[int, int, int]]]:
+    """Parse le header d'un .v5s → (data avec LazySection, source_sig)."""
+    with open(path, "rb") as f:
+        magic = f.read(len(COMPACT_MAGIC))
+        if magic != COMPACT_MAGIC:
+            raise ValueError(f"not a compact structure file: {path}")
+        (header_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    blob = _TextBlob(path, len(COMPACT_MAGIC) + _HEADER_LEN.size + header_len)
+    spans = header.pop("text_spans")
+    source_sig = header.pop("source_sig")
+    header["sections"] = [
+        LazySection(s, blob, span) for s, span in zip(header["sections"], spans)
+    ]
+    return header, tuple(source_sig) if source_sig else None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# StructureStore — LRU de DocumentStructure parsées
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class StructureStore:
+    """LRU mémoire de DocumentStructure, validé par la signature du fichier.
+
+    Args:
+        max_docs : taille du LRU
+        compact : True = écrit la forme .v5s après chaque parse JSON
+            (default V5_STRUCTURE_COMPACT) ; un .v5s à jour est toujours
+            préféré au JSON, qu'il ait été écrit ici ou à l'ingestion.
+    """
+
+    def __init__(self, max_docs: int = DEFAULT_LRU_SIZE, compact: Optional[bool] = None):
+        self.max_docs = max(1, max_docs)
+        self.compact = (
+            compact if compact is not None
+            else os.getenv("V5_STRUCTURE_COMPACT", "0") == "1"
+        )
+        self._lru: "OrderedDict[str, tuple[tuple, DocumentStructure]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+        self._n_hits = 0
+        self._n_json_loads = 0
+        self._n_compact_loads = 0
+
+    def get(self, doc_id: str, base_dir: Optional[Path] = None) -> Optional[DocumentStructure]:
+        json_path = structure_path(doc_id, base_dir)
+        key = str(json_path)
+        sig = self._current_sig(doc_id, base_dir)
+        if sig is None:
+            self.invalidate(doc_id, base_dir)
+            return None
+
+        struct = self._lru_get(key, sig)
+        if struct is not None:
+            return struct
+        with self._load_lock(key):
+            struct = self._lru_get(key, sig)
+            if struct is not None:
+                return struct
+            struct = self._load(doc_id, base_dir, sig)
+            if struct is None:
+                return None
+            with self._lock:
+                self._lru[key] = (sig, struct)
+                self._lru.move_to_end(key)
+                while len(self._lru) > self.max_docs:
+                    self._lru.popitem(last=False)
+            return struct
+
+    def invalidate(self, doc_id: str, base_dir: Optional[Path] = None) -> None:
+        with self._lock:
+            self._lru.pop(str(structure_path(doc_id, base_dir)), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_docs": len(self._lru),
+                "max_docs": self.max_docs,
+                "hits": self._n_hits,
+                "json_loads": self._n_json_loads,
+                "compact_loads": self._n_compact_loads,
+            }
+
+    # ─── Internals ───────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _current_sig(doc_id: str, base_dir: Optional[Path]) -> Optional[tuple]:
+        # JSON = source de vérité ; .v5s seul (déploiement sans JSON) accepté
+        sig = _file_sig(structure_path(doc_id, base_dir))
+        if sig is not None:
+            return ("json",) + sig
+        sig = _file_sig(compact_structure_path(doc_id, base_dir))
+        if sig is not None:
+            return ("v5s",) + sig
         return None
-    return DocumentStructure(json.load(open(f)))
+
+    def _load_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._load_locks.get(key)
+            if lock is None:
+                lock = self._load_locks[key] = threading.Lock()
+            return lock
+
+    def _lru_get(self, key: str, sig: tuple) -> Optional[DocumentStructure]:
+        with self._lock:
+            cached = self._lru.get(key)
+            if cached is None or cached[0] != sig:
+                return None
+            self._lru.move_to_end(key)
+            self._n_hits += 1
+            return cached[1]
+
+    def _load(self, doc_id: str, base_dir: Optional[Path], sig: tuple) -> Optional[DocumentStructure]:
+        compact_path = compact_structure_path(doc_id, base_dir)
+        json_sig = sig[1:] if sig[0] == "json" else None
+        if compact_path.exists():
+            try:
+                data, source_sig = read_compact_structure(compact_path)
+                if json_sig is None or source_sig == json_sig:
+                    with self._lock:
+                        self._n_compact_loads += 1
+                    return DocumentStructure(data)
+            except (OSError, ValueError, KeyError) as exc:
+                logger.warning("[StructureStore] unreadable %s: %s", compact_path.name, exc)
+        if json_sig is None:
+            return None
+
+        try:
+            with open(structure_path(doc_id, base_dir), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._n_json_loads += 1
+        if self.compact:
+            try:
+                write_compact_structure(data, base_dir, source_sig=json_sig)
+            except OSError as exc:
+                logger.warning("[StructureStore] compact write failed for %s: %s", doc_id, exc)
+        return DocumentStructure(data)
+
+
+_default_store: Optional[StructureStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_structure_store() -> StructureStore:
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = StructureStore()
+        return _default_store
+
+
+def reset_structure_store() -> None:
+    """Reset singleton (utile pour tests)."""
+    global _default_store
+    with _default_store_lock:
+        _default_store = None
+
+
+def structure_path(doc_id: str, base_dir: Optional[Path] = None) -> Path:
+    """Chemin du JSON de structure d'un doc."""
+    return (base_dir or DEFAULT_STRUCTURES_DIR) / f"{doc_id}.json"
+
+
+def load_structure(doc_id: str, base_dir: Optional[Path] = None) -> Optional[DocumentStructure]:
+    return get_structure_store().get(doc_id, base_dir)
 
 
 def list_available_doc_ids(base_dir: Optional[Path] = None) -> list[str]:
     base = base_dir or DEFAULT_STRUCTURES_DIR
     if not base.exists():
         return []
-    return sorted(p.stem for p in base.glob("*.json"))
+    stems = {p.stem for p in base.glob("*.json")}
+    stems.update(p.stem for p in base.glob(f"*{COMPACT_SUFFIX}"))
+    return sorted(stems)
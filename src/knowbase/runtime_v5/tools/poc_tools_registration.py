@@ -66,6 +66,7 @@ def _outline_spec() -> ToolSpec:
             "required": ["doc_id"],
         },
         handler=reading_tools.outline,
+        side_effect_free=True,
     )
 
 
@@ -99,6 +100,7 @@ def _read_spec() -> ToolSpec:
             "required": ["doc_id", "section_path_or_numbering"],
         },
         handler=reading_tools.read,
+        side_effect_free=True,
     )
 
 
@@ -134,6 +136,7 @@ def _find_in_spec() -> ToolSpec:
             "required": ["doc_id", "query"],
         },
         handler=reading_tools.find_in,
+        side_effect_free=True,
     )
 
 
@@ -163,6 +166,7 @@ def _resolve_ref_spec() -> ToolSpec:
             "required": ["doc_id", "ref_text"],
         },
         handler=reading_tools.resolve_ref,
+        side_effect_free=True,
     )
 
 
@@ -194,6 +198,7 @@ def _expand_context_spec() -> ToolSpec:
             "required": ["doc_id", "section_id"],
         },
         handler=reading_tools.expand_context,
+        side_effect_free=True,
     )
 
 
@@ -226,6 +231,7 @@ def _compare_sections_spec() -> ToolSpec:
             "required": ["doc_id_a", "section_a", "doc_id_b", "section_b"],
         },
         handler=reading_tools.compare_sections,
+        side_effect_free=True,
     )
 
 
@@ -251,6 +257,7 @@ def _list_versions_spec() -> ToolSpec:
             "required": ["doc_subject"],
         },
         handler=reading_tools.list_versions,
+        side_effect_free=True,
         is_experimental=True,
     )
 
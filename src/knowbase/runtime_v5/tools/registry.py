@@ -9,6 +9,9 @@ pour les tools en cours d'évaluation. Chaque tool déclare :
 - `evidence_type_returned` : enum (désambigue l'overlap sémantique)
 - `parameters_schema` : JSON Schema strict (additionalProperties: false)
 - `handler` : Callable Python qui exécute le tool
+- `side_effect_free` : le handler ne fait que lire (structure, DSG, index) →
+  l'agent peut exécuter plusieurs appels du même tour en parallèle
+- `timeout_s` : timeout par appel (exécution parallèle), sinon default agent
 
 Pourquoi un registry formel :
 - Le LLM choisit son outil parmi un set publié → réduire le "tool zoo"
@@ -103,6 +106,13 @@ class ToolSpec(BaseModel):
     handler: Optional[Callable[..., Any]] = Field(
         default=None, description="Fonction Python exécutant le tool"
     )
+    side_effect_free: bool = Field(
+        default=False,
+        description="Read-only handler : exécutable en parallèle avec d'autres appels du même tour",
+    )
+    timeout_s: Optional[float] = Field(
+        default=None, gt=0, description="Timeout par appel (None = default agent)"
+    )
     is_experimental: bool = False
     is_retired: bool = False
     retired_reason: str = ""
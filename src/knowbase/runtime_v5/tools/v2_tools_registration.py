@@ -54,6 +54,7 @@ def _navigate_by_toc_spec() -> ToolSpec:
             "required": ["doc_id", "target"],
         },
         handler=reading_tools_v2.navigate_by_toc,
+        side_effect_free=True,
     )
 
 
@@ -93,6 +94,7 @@ def _read_with_footnotes_spec() -> ToolSpec:
             "required": ["doc_id", "section_path_or_numbering"],
         },
         handler=reading_tools_v2.read_with_footnotes,
+        side_effect_free=True,
     )
 
 
@@ -129,6 +131,7 @@ def _find_cross_references_spec() -> ToolSpec:
             "required": ["doc_id", "section_id"],
         },
         handler=reading_tools_v2.find_cross_references,
+        side_effect_free=True,
     )
 
 
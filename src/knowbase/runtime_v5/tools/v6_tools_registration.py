@@ -221,6 +221,7 @@ def _find_procedures_spec() -> ToolSpec:
             "required": [],
         },
         handler=find_procedures,
+        side_effect_free=True,
     )
 
 
@@ -408,6 +409,7 @@ def _find_references_spec() -> ToolSpec:
             "required": [],
         },
         handler=find_references,
+        side_effect_free=True,
     )
 
 
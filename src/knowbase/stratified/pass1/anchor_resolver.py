@@ -23,6 +23,7 @@ from knowbase.stratified.models import (
     AssertionLogReason,
 )
 from knowbase.stratified.pass1.assertion_extractor import RawAssertion, ConceptLink
+from knowbase.stratified.pass1.fuzzy_anchor_index import FuzzyAnchorIndex
 
 logger = logging.getLogger(__name__)
 
@@ -76,7 +77,9 @@ class AnchorResolverV2:
     Stratégies de résolution:
     1. Mapping direct: Si le chunk correspond exactement à un DocItem
     2. Matching texte: Chercher le texte de l'assertion dans les DocItems
-    3. Fuzzy matching: En cas d'échec, utiliser SequenceMatcher
+    3. Fuzzy matching: En cas d'échec, utiliser SequenceMatcher, restreint aux
+       DocItems dont une borne supérieure du ratio atteint le seuil
+       (FuzzyAnchorIndex, construit une fois par contexte)
     """
 
     # Seuil de similarité pour le fuzzy matching
@@ -98,6 +101,7 @@ class AnchorResolverV2:
         self.docitems = docitems or {}
         self.chunks = chunks or {}
         self.stats = AnchorResolverStats()
+        self._fuzzy_index: Optional[FuzzyAnchorIndex] = None
 
     def set_context(
         self,
@@ -110,6 +114,13 @@ class AnchorResolverV2:
         self.docitems = docitems
         self.chunks = chunks
         self.stats = AnchorResolverStats()
+        self._fuzzy_index = None
+
+    def _get_fuzzy_index(self) -> FuzzyAnchorIndex:
+        """Index des DocItems du contexte courant (construit au premier fallback)."""
+        if self._fuzzy_index is None or len(self._fuzzy_index) != len(self.docitems):
+            self._fuzzy_index = FuzzyAnchorIndex(self.docitems)
+        return self._fuzzy_index
 
     def resolve_all(
         self,
@@ -271,7 +282,7 @@ class AnchorResolverV2:
                 )
 
             # Calcul du score de similarité
-            score = SequenceMatcher(None, assertion.text, docitem.text).ratio()
+            score = self._get_fuzzy_index().ratio(assertion.text, docitem_id)
             if score > best_score:
                 best_score = score
                 best_match = docitem_id
@@ -306,13 +317,19 @@ class AnchorResolverV2:
         )
 
     def _resolve_by_text_search(self, assertion: RawAssertion) -> AnchorResolutionResult:
-        """Recherche le texte de l'assertion dans tous les DocItems."""
-        best_match = None
-        best_span = None
-        best_score = 0
+        """
+        Recherche le texte de l'assertion dans tous les DocItems.
 
-        for docitem_id, docitem in self.docitems.items():
-            span_result = self._find_span_in_docitem(assertion.text, docitem)
+        Match exact (premier DocItem dans l'ordre), sinon meilleur ratio
+        SequenceMatcher >= FUZZY_THRESHOLD. Le ratio n'est calculé que pour
+        la shortlist de l'index (bornes exactes : mêmes ancrages qu'un scan
+        complet) ; le score rapporté en échec est le meilleur score évalué.
+        """
+        index = self._get_fuzzy_index()
+
+        docitem_id = index.first_containing(assertion.text)
+        if docitem_id is not None:
+            span_result = self._find_span_in_docitem(assertion.text, self.docitems[docitem_id])
             if span_result:
                 # Match exact trouvé
                 return AnchorResolutionResult(
@@ -325,13 +342,10 @@ class AnchorResolverV2:
                     )
                 )
 
-            # Fuzzy matching
-            score = SequenceMatcher(None, assertion.text, docitem.text).ratio()
-            if score > best_score:
-                best_score = score
-                best_match = docitem_id
+        # Fuzzy matching
+        best_match, best_score = index.best_match(assertion.text, self.FUZZY_THRESHOLD)
 
-        if best_score >= self.FUZZY_THRESHOLD and best_match:
+        if best_match:
             docitem = self.docitems[best_match]
             return AnchorResolutionResult(
                 assertion_id=assertion.assertion_id,
@@ -416,20 +430,24 @@ class AnchorResolverV2:
 
 def build_chunk_to_docitem_mapping(
     chunks: Dict[str, str],
-    docitems: Dict[str, DocItem]
+    docitems: Dict[str, DocItem],
+    fuzzy_index: Optional[FuzzyAnchorIndex] = None
 ) -> Dict[str, List[str]]:
     """
     Construit le mapping chunk_id → [docitem_ids].
 
     Stratégie:
     1. Si chunk_id contient un docitem_id (convention) → mapping direct
-    2. Sinon, matching par texte
+    2. Sinon, matching par texte (inclusion, puis ratio > 0.8 calculé
+       uniquement sur la shortlist du FuzzyAnchorIndex)
     """
     mapping = {}
+    index = fuzzy_index or FuzzyAnchorIndex(docitems)
 
     for chunk_id, chunk_text in chunks.items():
         # Convention: chunk_id peut contenir docitem_id (ex: "chunk_docitem_123_0")
         docitem_ids_found = []
+        fuzzy_ids = index.matches_above(chunk_text, 0.8) if chunk_text else set()
 
         for docitem_id, docitem in docitems.items():
             if docitem_id in chunk_id:
@@ -438,7 +456,7 @@ def build_chunk_to_docitem_mapping(
                 # Matching par overlap de texte
                 if chunk_text in docitem.text or docitem.text in chunk_text:
                     docitem_ids_found.append(docitem_id)
-                elif SequenceMatcher(None, chunk_text, docitem.text).ratio() > 0.8:
+                elif docitem_id in fuzzy_ids:
                     docitem_ids_found.append(docitem_id)
 
         mapping[chunk_id] = docitem_ids_found
@@ -0,0 +1,163 @@
+"""
+OSMOSE Pipeline V2 - Index de matching approché DocItems (Pass 1.3b)
+=====================================================================
+
+Accélère les fallbacks fuzzy de l'AnchorResolverV2 et de
+build_chunk_to_docitem_mapping, qui comparaient chaque texte à TOUS les
+DocItems avec difflib.SequenceMatcher(...).ratio() (quadratique en longueur
+de texte → minutes de CPU par gros document).
+
+Construit une fois par document :
+- DocItems triés par longueur (bisect)
+- histogramme de caractères par DocItem
+- texte à espaces normalisés (recherche exacte normalisée)
+- SequenceMatcher par DocItem avec seq2 fixé (table b2j calculée une fois)
+
+Shortlist sans perte : deux bornes supérieures exactes de ratio()
+- longueur   : 2·min(la, lb) / (la + lb)       (= real_quick_ratio)
+- caractères : 2·|A ∩ B|multiset / (la + lb)   (= quick_ratio)
+Seuls les DocItems dont la borne atteint le seuil sont vérifiés par ratio(),
+par borne décroissante, avec arrêt dès que la borne passe sous le meilleur
+score trouvé. Les ancrages retournés sont donc identiques au scan complet
+(mêmes seuils, même départage par ordre des DocItems).
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from knowbase.stratified.models import DocItem
+
+
+def normalize_whitespace(text: str) -> str:
+    return ' '.join(text.split())
+
+
+class FuzzyAnchorIndex:
+    """Index des DocItems d'un document pour le matching exact / approché."""
+
+    def __init__(self, docitems: Mapping[str, DocItem]):
+        self._ids: List[str] = list(docitems.keys())
+        self._texts: List[str] = [docitems[i].text or "" for i in self._ids]
+        self._order: Dict[str, int] = {docitem_id: n for n, docitem_id in enumerate(self._ids)}
+        self._normalized: List[str] = [normalize_whitespace(t) for t in self._texts]
+        self._counts: List[Counter] = [Counter(t) for t in self._texts]
+
+        by_length = sorted(range(len(self._ids)), key=lambda n: len(self._texts[n]))
+        self._sorted_lengths: List[int] = [len(self._texts[n]) for n in by_length]
+        self._sorted_positions: List[int] = by_length
+
+        self._matchers: Dict[int, SequenceMatcher] = {}
+        self.ratio_calls = 0
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def first_containing(self, text: str) -> Optional[str]:
+        """
+        Premier DocItem (ordre d'origine) contenant `text`, tel quel ou à
+        espaces normalisés — même critère que AnchorResolverV2._find_span_in_docitem.
+        """
+        normalized = None
+        for n, docitem_text in enumerate(self._texts):
+            if text in docitem_text:
+                return self._ids[n]
+            if normalized is None:
+                normalized = normalize_whitespace(text)
+            if normalized in self._normalized[n]:
+                return self._ids[n]
+        return None
+
+    def ratio(self, text: str, docitem_id: str) -> float:
+        """SequenceMatcher(None, text, docitem.text).ratio(), b2j du DocItem réutilisé."""
+        return self._ratio(text, self._order[docitem_id])
+
+    def best_match(self, text: str, threshold: float) -> Tuple[Optional[str], float]:
+        """
+        DocItem de meilleur ratio si ce ratio atteint `threshold`.
+
+        Équivalent à un argmax sur tous les DocItems (premier dans l'ordre en
+        cas d'égalité) suivi du test `best_score >= threshold`.
+
+        Returns:
+            (docitem_id ou None, meilleur score évalué)
+        """
+        best_position: Optional[int] = None
+        best_score = 0.0
+        for bound, position in self._shortlist(text, threshold, strict=False):
+            if bound < best_score:
+                break
+            score = self._ratio(text, position)
+            if score > best_score or (
+                score == best_score and best_position is not None and position < best_position
+            ):
+                best_score = score
+                best_position = position
+
+        if best_position is not None and best_score > 0 and best_score >= threshold:
+            return self._ids[best_position], best_score
+        return None, best_score
+
+    def matches_above(self, text: str, threshold: float) -> Set[str]:
+        """DocItems dont ratio(text, docitem) > threshold (strict)."""
+        return {
+            self._ids[position]
+            for _bound, position in self._shortlist(text, threshold, strict=True)
+            if self._ratio(text, position) > threshold
+        }
+
+    def _shortlist(self, text: str, threshold: float, strict: bool) -> List[Tuple[float, int]]:
+        """(borne supérieure, position) des DocItems pouvant atteindre le seuil, borne décroissante."""
+        la = len(text)
+        if la == 0:
+            return []
+
+        # Fenêtre de longueur issue de 2·min/(la+lb) >= threshold (marge flottante,
+        # la borne exacte est recalculée ensuite)
+        if threshold > 0:
+            lo = int(la * threshold / (2 - threshold)) - 1
+            hi = int(la * (2 - threshold) / threshold) + 1
+        else:
+            lo, hi = 0, max(self._sorted_lengths, default=0)
+        start = bisect.bisect_left(self._sorted_lengths, lo)
+        end = bisect.bisect_right(self._sorted_lengths, hi)
+
+        counts = Counter(text)
+        shortlist: List[Tuple[float, int]] = []
+        for k in range(start, end):
+            position = self._sorted_positions[k]
+            lb = self._sorted_lengths[k]
+            total = la + lb
+            if not self._passes(2.0 * min(la, lb) / total, threshold, strict):
+                continue
+            doc_counts = self._counts[position]
+            if len(counts) <= len(doc_counts):
+                common = sum(min(c, doc_counts[ch]) for ch, c in counts.items() if ch in doc_counts)
+            else:
+                common = sum(min(c, counts[ch]) for ch, c in doc_counts.items() if ch in counts)
+            bound = 2.0 * common / total
+            if self._passes(bound, threshold, strict):
+                shortlist.append((bound, position))
+
+        shortlist.sort(key=lambda item: (-item[0], item[1]))
+        return shortlist
+
+    @staticmethod
+    def _passes(bound: float, threshold: float, strict: bool) -> bool:
+        return bound > threshold if strict else bound >= threshold
+
+    def _ratio(self, text: str, position: int) -> float:
+        matcher = self._matchers.get(position)
+        if matcher is None:
+            matcher = SequenceMatcher(None)
+            matcher.set_seq2(self._texts[position])
+            self._matchers[position] = matcher
+        matcher.set_seq1(text)
+        self.ratio_calls += 1
+        return matcher.ratio()
+
+
+__all__ = ["FuzzyAnchorIndex", "normalize_whitespace"]
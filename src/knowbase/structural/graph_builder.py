@@ -24,12 +24,13 @@ Spec: doc/ongoing/ADR_STRUCTURAL_GRAPH_FROM_DOCLING.md
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from knowbase.structural.docitem_builder import DocItemBuilder, DocItemBuildResult
 from knowbase.structural.section_profiler import SectionProfiler, analyze_document_structure
@@ -42,6 +43,7 @@ from knowbase.structural.models import (
     TypeAwareChunk,
     ChunkKind,
 )
+from knowbase.common.gazetteer import GazetteerMatcher
 from knowbase.config.feature_flags import is_feature_enabled
 
 if TYPE_CHECKING:
@@ -63,6 +65,12 @@ DOCLING_ARTIFACTS_PATH = os.getenv(
     "data/docling_artifacts"
 )
 
+# Statement Cypher paramétré: (query, params)
+Statement = Tuple[str, Dict[str, Any]]
+
+# Taille des batchs UNWIND (DocItems / chunks par transaction)
+STRUCTURAL_PERSIST_BATCH_SIZE = int(os.getenv("STRUCTURAL_PERSIST_BATCH_SIZE", "2000"))
+
 
 # ===================================
 # GRAPH BUILD RESULT
@@ -343,7 +351,7 @@ class StructuralGraphBuilder:
         result: StructuralGraphBuildResult,
         driver: "AsyncDriver",
         database: str,
-    ) -> None:
+    ) -> Dict[str, int]:
         """
         Persiste le Structural Graph dans Neo4j.
 
@@ -358,9 +366,13 @@ class StructuralGraphBuilder:
         - (DocumentContext)-[:HAS_VERSION]->(DocumentVersion)
         - (DocumentVersion)-[:HAS_PAGE]->(PageContext)
         - (DocumentVersion)-[:HAS_SECTION]->(SectionContext)
+        - (SectionContext)-[:SUBSECTION_OF]->(SectionContext)
         - (SectionContext)-[:CONTAINS]->(DocItem)
         - (DocItem)-[:ON_PAGE]->(PageContext)
         - (TypeAwareChunk)-[:DERIVED_FROM]->(DocItem)
+
+        Returns:
+            Stats {transactions, statements, written}
         """
         # ADR ARCH_STRATIFIED_PIPELINE_V2: Skip PageContext si V2 activé
         # PageContext est fusionné dans Document pour V2
@@ -370,50 +382,29 @@ class StructuralGraphBuilder:
 
         logger.info(f"[StructuralGraphBuilder] Persisting to Neo4j...")
 
-        async with driver.session(database=database) as session:
-            # Batch les opérations pour performance
-            # Si V2: passer liste vide pour pages (skip PageContext)
-            pages_to_create = [] if skip_page_context else result.page_contexts
-            await session.execute_write(
-                self._create_version_and_pages_tx,
-                result.doc_version,
-                pages_to_create,
-            )
+        plan = self._persist_plan(result, use_stratified_v2=skip_page_context)
+        written = 0
 
-            await session.execute_write(
-                self._create_sections_tx,
-                result.sections,
-            )
-
-            # Batch les DocItems (peuvent être nombreux)
-            batch_size = 500
-            for i in range(0, len(result.doc_items), batch_size):
-                batch = result.doc_items[i:i + batch_size]
-                await session.execute_write(
-                    self._create_docitems_tx,
-                    batch,
-                )
-
-            # Batch les chunks
-            for i in range(0, len(result.chunks), batch_size):
-                batch = result.chunks[i:i + batch_size]
-                await session.execute_write(
-                    self._create_chunks_tx,
-                    batch,
-                )
+        async with driver.session(database=database) as session:
+            await _ensure_persist_constraints_async(session)
+            for statements in plan:
+                written += await session.execute_write(self._run_statements_tx_async, statements)
 
+        stats = _plan_stats(plan, written)
         logger.info(
             f"[StructuralGraphBuilder] Persisted: "
             f"{len(result.doc_items)} items, "
             f"{len(result.sections)} sections, "
-            f"{len(result.chunks)} chunks"
+            f"{len(result.chunks)} chunks "
+            f"({stats['written']} nodes written, {stats['transactions']} tx)"
         )
+        return stats
 
     def persist_to_neo4j_sync(
         self,
         result: StructuralGraphBuildResult,
         neo4j_client: Any = None,
-    ) -> None:
+    ) -> Optional[Dict[str, int]]:
         """
         Persiste le Structural Graph dans Neo4j (version synchrone).
 
@@ -422,6 +413,9 @@ class StructuralGraphBuilder:
         Args:
             result: Résultat de build_from_docling()
             neo4j_client: Instance de Neo4jClient (ou None pour auto-detect)
+
+        Returns:
+            Stats {transactions, statements, written}, None si Neo4j indisponible
         """
         # Auto-detect Neo4j client si non fourni
         if neo4j_client is None:
@@ -438,11 +432,11 @@ class StructuralGraphBuilder:
                 )
             except Exception as e:
                 logger.warning(f"[StructuralGraphBuilder] Could not get Neo4j client: {e}")
-                return
+                return None
 
         if not neo4j_client.is_connected():
             logger.warning("[StructuralGraphBuilder] Neo4j not connected, skipping persistence")
-            return
+            return None
 
         # ADR ARCH_STRATIFIED_PIPELINE_V2: Skip PageContext si V2 activé
         skip_page_context = is_feature_enabled("stratified_pipeline_v2")
@@ -451,236 +445,369 @@ class StructuralGraphBuilder:
 
         logger.info(f"[StructuralGraphBuilder] Persisting to Neo4j (sync)...")
 
+        plan = self._persist_plan(result, use_stratified_v2=skip_page_context)
+        written = 0
+
         try:
             with neo4j_client.driver.session(database="neo4j") as session:
-                # Créer DocumentVersion et Pages (si V2: liste vide pour skip PageContext)
-                pages_to_create = [] if skip_page_context else result.page_contexts
-                session.execute_write(
-                    self._create_version_and_pages_tx,
-                    result.doc_version,
-                    pages_to_create,
-                )
-
-                # Créer Sections
-                session.execute_write(
-                    self._create_sections_tx,
-                    result.sections,
-                )
-
-                # Batch les DocItems (peuvent être nombreux)
-                batch_size = 500
-                for i in range(0, len(result.doc_items), batch_size):
-                    batch = result.doc_items[i:i + batch_size]
-                    session.execute_write(
-                        self._create_docitems_tx,
-                        batch,
-                    )
-
-                # Batch les chunks
-                for i in range(0, len(result.chunks), batch_size):
-                    batch = result.chunks[i:i + batch_size]
-                    session.execute_write(
-                        self._create_chunks_tx,
-                        batch,
-                    )
+                _ensure_persist_constraints(session)
+                for statements in plan:
+                    written += session.execute_write(self._run_statements_tx, statements)
 
+            stats = _plan_stats(plan, written)
             logger.info(
                 f"[StructuralGraphBuilder] Persisted (sync): "
                 f"{len(result.doc_items)} items, "
                 f"{len(result.sections)} sections, "
-                f"{len(result.chunks)} chunks"
+                f"{len(result.chunks)} chunks "
+                f"({stats['written']} nodes written, {stats['transactions']} tx)"
             )
+            return stats
 
         except Exception as e:
             logger.error(f"[StructuralGraphBuilder] Neo4j persistence failed: {e}")
             raise
 
+    def _persist_plan(
+        self,
+        result: StructuralGraphBuildResult,
+        use_stratified_v2: bool,
+    ) -> List[List[Statement]]:
+        """
+        Découpe la persistance en transactions de statements UNWIND.
+
+        - tx 1 : DocumentVersion + PageContext + SectionContext
+        - puis une tx par batch de DocItems, puis par batch de chunks
+
+        Si V2 (stratified_pipeline_v2): node Document créé, pas de PageContext.
+        """
+        pages = [] if use_stratified_v2 else result.page_contexts
+        plan = [
+            self._version_statements(result.doc_version, pages, use_stratified_v2)
+            + self._section_statements(result.sections)
+        ]
+
+        batch_size = STRUCTURAL_PERSIST_BATCH_SIZE
+        for i in range(0, len(result.doc_items), batch_size):
+            plan.append(self._docitem_statements(result.doc_items[i:i + batch_size]))
+        for i in range(0, len(result.chunks), batch_size):
+            plan.append(self._chunk_statements(result.chunks[i:i + batch_size]))
+        return plan
+
     @staticmethod
-    def _create_version_and_pages_tx(tx, doc_version: DocumentVersion, pages: List[PageContext]):
-        """Transaction pour créer DocumentVersion et PageContext."""
-        # ADR ARCH_STRATIFIED_PIPELINE_V2: Créer node Document si V2 activé
-        # Le node Document est requis pour Pass 1 (Subject, Concepts, etc.)
-        use_stratified_v2 = is_feature_enabled("stratified_pipeline_v2")
-
-        if use_stratified_v2:
-            # V2: Créer Document + DocumentVersion
-            tx.run("""
-                MERGE (d:Document {
-                    tenant_id: $tenant_id,
-                    doc_id: $doc_id
-                })
-                SET d.created_at = datetime()
-                MERGE (v:DocumentVersion {
-                    tenant_id: $tenant_id,
-                    doc_id: $doc_id,
-                    doc_version_id: $doc_version_id
-                })
-                SET v += $props
-                MERGE (d)-[:HAS_VERSION]->(v)
-            """, {
-                "tenant_id": doc_version.tenant_id,
-                "doc_id": doc_version.doc_id,
-                "doc_version_id": doc_version.doc_version_id,
-                "props": doc_version.to_neo4j_properties(),
-            })
-        else:
-            # Legacy: Créer DocumentVersion et lier à DocumentContext existant
-            tx.run("""
-                MERGE (v:DocumentVersion {
-                    tenant_id: $tenant_id,
-                    doc_id: $doc_id,
-                    doc_version_id: $doc_version_id
-                })
-                SET v += $props
-                WITH v
-                MATCH (d:DocumentContext {tenant_id: $tenant_id, doc_id: $doc_id})
-                MERGE (d)-[:HAS_VERSION]->(v)
-            """, {
+    def _run_statements_tx(tx, statements: List[Statement]) -> int:
+        """Transaction: exécute les statements, retourne le nombre de nœuds écrits."""
+        written = 0
+        for query, params in statements:
+            record = tx.run(query, params).single()
+            written += record["written"] if record else 0
+        return written
+
+    @staticmethod
+    async def _run_statements_tx_async(tx, statements: List[Statement]) -> int:
+        """Version async de _run_statements_tx."""
+        written = 0
+        for query, params in statements:
+            cursor = await tx.run(query, params)
+            record = await cursor.single()
+            written += record["written"] if record else 0
+        return written
+
+    @staticmethod
+    def _version_statements(
+        doc_version: DocumentVersion,
+        pages: List[PageContext],
+        use_stratified_v2: bool,
+    ) -> List[Statement]:
+        """Statements DocumentVersion (+ Document si V2) et PageContext."""
+        props = doc_version.to_neo4j_properties()
+        statements: List[Statement] = [(
+            _VERSION_V2_QUERY if use_stratified_v2 else _VERSION_QUERY,
+            {
                 "tenant_id": doc_version.tenant_id,
                 "doc_id": doc_version.doc_id,
                 "doc_version_id": doc_version.doc_version_id,
-                "props": doc_version.to_neo4j_properties(),
-            })
-
-        # Créer les PageContext
-        for page in pages:
-            tx.run("""
-                MERGE (p:PageContext {
-                    tenant_id: $tenant_id,
-                    doc_version_id: $doc_version_id,
-                    page_no: $page_no
-                })
-                SET p += $props
-                WITH p
-                MATCH (v:DocumentVersion {
-                    tenant_id: $tenant_id,
-                    doc_version_id: $doc_version_id
-                })
-                MERGE (v)-[:HAS_PAGE]->(p)
-            """, {
-                "tenant_id": page.tenant_id,
-                "doc_version_id": page.doc_version_id,
-                "page_no": page.page_no,
-                "props": page.to_neo4j_properties(),
-            })
+                "props": props,
+                "props_hash": _props_hash(props),
+            },
+        )]
+
+        if pages:
+            statements.append((_PAGES_QUERY, {"rows": [
+                _node_row(page.to_neo4j_properties(), _PAGE_KEYS)
+                for page in pages
+            ]}))
+        return statements
 
     @staticmethod
-    def _create_sections_tx(tx, sections: List[SectionInfo]):
-        """Transaction pour créer les SectionContext."""
-        for section in sections:
-            tx.run("""
-                MERGE (s:SectionContext {
-                    tenant_id: $tenant_id,
-                    doc_version_id: $doc_version_id,
-                    section_id: $section_id
-                })
-                SET s += $props
-                WITH s
-                MATCH (v:DocumentVersion {
-                    tenant_id: $tenant_id,
-                    doc_version_id: $doc_version_id
-                })
-                MERGE (v)-[:HAS_SECTION]->(s)
-            """, {
-                "tenant_id": section.tenant_id,
-                "doc_version_id": section.doc_version_id,
-                "section_id": section.section_id,
-                "props": section.to_neo4j_properties(),
-            })
-
-            # Créer relation parent si applicable
-            if section.parent_section_id:
-                tx.run("""
-                    MATCH (child:SectionContext {
-                        tenant_id: $tenant_id,
-                        doc_version_id: $doc_version_id,
-                        section_id: $child_id
-                    })
-                    MATCH (parent:SectionContext {
-                        tenant_id: $tenant_id,
-                        doc_version_id: $doc_version_id,
-                        section_id: $parent_id
-                    })
-                    MERGE (child)-[:SUBSECTION_OF]->(parent)
-                """, {
-                    "tenant_id": section.tenant_id,
-                    "doc_version_id": section.doc_version_id,
-                    "child_id": section.section_id,
-                    "parent_id": section.parent_section_id,
-                })
+    def _section_statements(sections: List[SectionInfo]) -> List[Statement]:
+        """Statement SectionContext (HAS_SECTION + SUBSECTION_OF)."""
+        if not sections:
+            return []
+        return [(_SECTIONS_QUERY, {"rows": [
+            _node_row(
+                section.to_neo4j_properties(), _SECTION_KEYS,
+                parent_section_id=section.parent_section_id,
+            )
+            for section in sections
+        ]})]
 
     @staticmethod
-    def _create_docitems_tx(tx, items: List[DocItem]):
-        """Transaction pour créer les DocItem (batch)."""
-        for item in items:
-            tx.run("""
-                MERGE (i:DocItem {
-                    tenant_id: $tenant_id,
-                    doc_id: $doc_id,
-                    doc_version_id: $doc_version_id,
-                    item_id: $item_id
-                })
-                SET i += $props
-                WITH i
-                OPTIONAL MATCH (s:SectionContext {
-                    tenant_id: $tenant_id,
-                    doc_version_id: $doc_version_id,
-                    section_id: $section_id
-                })
-                FOREACH (_ IN CASE WHEN s IS NOT NULL THEN [1] ELSE [] END |
-                    MERGE (s)-[:CONTAINS]->(i)
-                )
-                WITH i
-                OPTIONAL MATCH (p:PageContext {
-                    tenant_id: $tenant_id,
-                    doc_version_id: $doc_version_id,
-                    page_no: $page_no
-                })
-                FOREACH (_ IN CASE WHEN p IS NOT NULL THEN [1] ELSE [] END |
-                    MERGE (i)-[:ON_PAGE]->(p)
-                )
-            """, {
-                "tenant_id": item.tenant_id,
-                "doc_id": item.doc_id,
-                "doc_version_id": item.doc_version_id,
-                "item_id": item.item_id,
-                "section_id": item.section_id,
-                "page_no": item.page_no,
-                "props": item.to_neo4j_properties(),
-            })
+    def _docitem_statements(items: List[DocItem]) -> List[Statement]:
+        """Statement DocItem (CONTAINS + ON_PAGE)."""
+        if not items:
+            return []
+        return [(_DOCITEMS_QUERY, {"rows": [
+            _node_row(item.to_neo4j_properties(), _DOCITEM_KEYS, section_id=item.section_id)
+            for item in items
+        ]})]
 
     @staticmethod
-    def _create_chunks_tx(tx, chunks: List[TypeAwareChunk]):
-        """Transaction pour créer les TypeAwareChunk (batch)."""
-        for chunk in chunks:
-            tx.run("""
-                MERGE (c:TypeAwareChunk {
-                    tenant_id: $tenant_id,
-                    chunk_id: $chunk_id
-                })
-                SET c += $props
-            """, {
-                "tenant_id": chunk.tenant_id,
-                "chunk_id": chunk.chunk_id,
-                "props": chunk.to_neo4j_properties(),
-            })
-
-            # Créer relations DERIVED_FROM vers les DocItems
-            for item_id in chunk.item_ids:
-                tx.run("""
-                    MATCH (c:TypeAwareChunk {tenant_id: $tenant_id, chunk_id: $chunk_id})
-                    MATCH (i:DocItem {
-                        tenant_id: $tenant_id,
-                        doc_version_id: $doc_version_id,
-                        item_id: $item_id
-                    })
-                    MERGE (c)-[:DERIVED_FROM]->(i)
-                """, {
-                    "tenant_id": chunk.tenant_id,
-                    "chunk_id": chunk.chunk_id,
-                    "doc_version_id": chunk.doc_version_id,
-                    "item_id": item_id,
-                })
+    def _chunk_statements(chunks: List[TypeAwareChunk]) -> List[Statement]:
+        """Statement TypeAwareChunk (DERIVED_FROM)."""
+        if not chunks:
+            return []
+        return [(_CHUNKS_QUERY, {"rows": [
+            _node_row(chunk.to_neo4j_properties(), _CHUNK_KEYS) for chunk in chunks
+        ]})]
+
+
+# ===================================
+# PERSISTENCE NEO4J (UNWIND)
+# ===================================
+# Un statement UNWIND par type de nœud et par batch. Chaque ligne porte un
+# props_hash (propriétés hors timestamps) : un nœud dont le hash n'a pas
+# changé n'est ni réécrit ni reconnecté, ce qui rend la re-persistance d'une
+# version inchangée idempotente et quasi gratuite.
+#
+# Les MERGE/MATCH utilisent toutes les propriétés des contraintes d'unicité
+# (neo4j_schema.CONSTRAINT_QUERIES) pour passer par leurs index.
+
+# Propriétés exclues du props_hash (changent à chaque build)
+_VOLATILE_PROPS = frozenset({"created_at", "ingested_at"})
+
+# Contraintes requises par les MERGE de la persistance
+_PERSIST_CONSTRAINTS = (
+    "doc_version_unique",
+    "docitem_unique",
+    "page_unique",
+    "section_unique",
+    "chunk_unique",
+)
+
+_constraints_ensured = False
+
+# Clés lues dans chaque ligne UNWIND (MERGE + MATCH des relations)
+_PAGE_KEYS = ("tenant_id", "doc_id", "doc_version_id", "page_no")
+_SECTION_KEYS = ("tenant_id", "doc_id", "doc_version_id", "section_id")
+_DOCITEM_KEYS = ("tenant_id", "doc_id", "doc_version_id", "item_id", "page_no")
+_CHUNK_KEYS = ("tenant_id", "doc_id", "doc_version_id", "chunk_id", "item_ids")
+
+_VERSION_QUERY = """
+    MERGE (v:DocumentVersion {
+        tenant_id: $tenant_id,
+        doc_id: $doc_id,
+        doc_version_id: $doc_version_id
+    })
+    WITH v, coalesce(v.props_hash <> $props_hash, true) AS changed
+    FOREACH (_ IN CASE WHEN changed THEN [1] ELSE [] END |
+        SET v += $props, v.props_hash = $props_hash
+    )
+    WITH v, changed
+    CALL {
+        WITH v
+        MATCH (d:DocumentContext {tenant_id: $tenant_id, doc_id: $doc_id})
+        MERGE (d)-[:HAS_VERSION]->(v)
+    }
+    RETURN CASE WHEN changed THEN 1 ELSE 0 END AS written
+"""
+
+# ADR ARCH_STRATIFIED_PIPELINE_V2: node Document requis pour Pass 1
+_VERSION_V2_QUERY = """
+    MERGE (d:Document {tenant_id: $tenant_id, doc_id: $doc_id})
+    ON CREATE SET d.created_at = datetime()
+    MERGE (v:DocumentVersion {
+        tenant_id: $tenant_id,
+        doc_id: $doc_id,
+        doc_version_id: $doc_version_id
+    })
+    WITH d, v, coalesce(v.props_hash <> $props_hash, true) AS changed
+    FOREACH (_ IN CASE WHEN changed THEN [1] ELSE [] END |
+        SET v += $props, v.props_hash = $props_hash
+    )
+    MERGE (d)-[:HAS_VERSION]->(v)
+    RETURN CASE WHEN changed THEN 1 ELSE 0 END AS written
+"""
+
+_PAGES_QUERY = """
+    UNWIND $rows AS row
+    MERGE (p:PageContext {
+        tenant_id: row.tenant_id,
+        doc_version_id: row.doc_version_id,
+        page_no: row.page_no
+    })
+    WITH p, row
+    WHERE coalesce(p.props_hash <> row.props_hash, true)
+    SET p += row.props, p.props_hash = row.props_hash
+    WITH p, row
+    CALL {
+        WITH p, row
+        MATCH (v:DocumentVersion {
+            tenant_id: row.tenant_id,
+            doc_id: row.doc_id,
+            doc_version_id: row.doc_version_id
+        })
+        MERGE (v)-[:HAS_PAGE]->(p)
+    }
+    RETURN count(p) AS written
+"""
+
+# collect() = barrière : toutes les sections existent avant SUBSECTION_OF
+_SECTIONS_QUERY = """
+    UNWIND $rows AS row
+    MERGE (s:SectionContext {
+        tenant_id: row.tenant_id,
+        doc_version_id: row.doc_version_id,
+        section_id: row.section_id
+    })
+    WITH s, row
+    WHERE coalesce(s.props_hash <> row.props_hash, true)
+    SET s += row.props, s.props_hash = row.props_hash
+    WITH collect({section: s, row: row}) AS changed
+    UNWIND changed AS entry
+    WITH entry.section AS s, entry.row AS row
+    CALL {
+        WITH s, row
+        MATCH (v:DocumentVersion {
+            tenant_id: row.tenant_id,
+            doc_id: row.doc_id,
+            doc_version_id: row.doc_version_id
+        })
+        MERGE (v)-[:HAS_SECTION]->(s)
+    }
+    CALL {
+        WITH s, row
+        MATCH (parent:SectionContext {
+            tenant_id: row.tenant_id,
+            doc_version_id: row.doc_version_id,
+            section_id: row.parent_section_id
+        })
+        MERGE (s)-[:SUBSECTION_OF]->(parent)
+    }
+    RETURN count(s) AS written
+"""
+
+_DOCITEMS_QUERY = """
+    UNWIND $rows AS row
+    MERGE (i:DocItem {
+        tenant_id: row.tenant_id,
+        doc_id: row.doc_id,
+        doc_version_id: row.doc_version_id,
+        item_id: row.item_id
+    })
+    WITH i, row
+    WHERE coalesce(i.props_hash <> row.props_hash, true)
+    SET i += row.props, i.props_hash = row.props_hash
+    WITH i, row
+    CALL {
+        WITH i, row
+        MATCH (s:SectionContext {
+            tenant_id: row.tenant_id,
+            doc_version_id: row.doc_version_id,
+            section_id: row.section_id
+        })
+        MERGE (s)-[:CONTAINS]->(i)
+    }
+    CALL {
+        WITH i, row
+        MATCH (p:PageContext {
+            tenant_id: row.tenant_id,
+            doc_version_id: row.doc_version_id,
+            page_no: row.page_no
+        })
+        MERGE (i)-[:ON_PAGE]->(p)
+    }
+    RETURN count(i) AS written
+"""
+
+_CHUNKS_QUERY = """
+    UNWIND $rows AS row
+    MERGE (c:TypeAwareChunk {tenant_id: row.tenant_id, chunk_id: row.chunk_id})
+    WITH c, row
+    WHERE coalesce(c.props_hash <> row.props_hash, true)
+    SET c += row.props, c.props_hash = row.props_hash
+    WITH c, row
+    CALL {
+        WITH c, row
+        UNWIND row.item_ids AS item_id
+        MATCH (i:DocItem {
+            tenant_id: row.tenant_id,
+            doc_id: row.doc_id,
+            doc_version_id: row.doc_version_id,
+            item_id: item_id
+        })
+        MERGE (c)-[:DERIVED_FROM]->(i)
+    }
+    RETURN count(c) AS written
+"""
+
+
+def _props_hash(props: Dict[str, Any], **extra: Any) -> str:
+    """Hash stable des propriétés (hors timestamps) + clés de relations."""
+    stable = {k: v for k, v in props.items() if k not in _VOLATILE_PROPS}
+    stable.update(extra)
+    payload = json.dumps(stable, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _node_row(props: Dict[str, Any], keys: Tuple[str, ...], **extra: Any) -> Dict[str, Any]:
+    """Ligne UNWIND: clés de MERGE/relations, propriétés du nœud et props_hash."""
+    row = {key: props.get(key) for key in keys}
+    row.update(extra)
+    row["props"] = props
+    row["props_hash"] = _props_hash(props, **extra)
+    return row
+
+
+def _plan_stats(plan: List[List[Statement]], written: int) -> Dict[str, int]:
+    return {
+        "transactions": len(plan),
+        "statements": sum(len(statements) for statements in plan),
+        "written": written,
+    }
+
+
+def _persist_constraint_queries() -> List[Tuple[str, str]]:
+    from knowbase.structural.neo4j_schema import CONSTRAINT_QUERIES
+
+    return [(name, query) for name, query in CONSTRAINT_QUERIES if name in _PERSIST_CONSTRAINTS]
+
+
+def _ensure_persist_constraints(session) -> None:
+    """Crée (une fois par processus) les contraintes d'unicité utilisées par les MERGE."""
+    global _constraints_ensured
+    if _constraints_ensured:
+        return
+    for name, query in _persist_constraint_queries():
+        try:
+            session.run(query).consume()
+        except Exception as e:
+            logger.warning(f"[StructuralGraphBuilder] Constraint {name} failed: {e}")
+    _constraints_ensured = True
+
+
+async def _ensure_persist_constraints_async(session) -> None:
+    """Version async de _ensure_persist_constraints."""
+    global _constraints_ensured
+    if _constraints_ensured:
+        return
+    for name, query in _persist_constraint_queries():
+        try:
+            cursor = await session.run(query)
+            await cursor.consume()
+        except Exception as e:
+            logger.warning(f"[StructuralGraphBuilder] Constraint {name} failed: {e}")
+    _constraints_ensured = True
 
 
 # ===================================
@@ -774,26 +901,23 @@ def convert_chunks_for_relation_extraction(
                 proto_by_surface[form] = []
             proto_by_surface[form].append(proto_id)
 
-    # 4. Pour chaque chunk, trouver les concepts mentionnés
+    # 4. Compiler toutes les surface forms (une passe par chunk au lieu
+    # d'un test `form in text` par forme et par chunk)
+    matcher = GazetteerMatcher()
+    for form, proto_ids in proto_by_surface.items():
+        for proto_id in proto_ids:
+            matcher.add(proto_id, form)
+
+    # 5. Pour chaque chunk, trouver les concepts mentionnés
     result_chunks = []
     char_offset = 0
 
     for chunk in filtered_chunks:
-        chunk_text_lower = chunk.text.lower()
-
-        # Trouver les concepts ancrés dans ce chunk
-        anchored_concepts = []
-        seen_protos = set()
-
-        for form, proto_ids in proto_by_surface.items():
-            if form in chunk_text_lower:
-                for proto_id in proto_ids:
-                    if proto_id not in seen_protos:
-                        seen_protos.add(proto_id)
-                        anchored_concepts.append({
-                            "concept_id": proto_id,
-                            "surface_form": form,
-                        })
+        # Concepts ancrés dans ce chunk (première forme trouvée par concept)
+        anchored_concepts = [
+            {"concept_id": proto_id, "surface_form": form}
+            for proto_id, form in matcher.keys_in(chunk.text).items()
+        ]
 
         # Construire le dict au format attendu
         chunk_dict = {
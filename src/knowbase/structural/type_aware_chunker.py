@@ -14,6 +14,7 @@ Spec: doc/ongoing/ADR_STRUCTURAL_GRAPH_FROM_DOCLING.md - Section "Chunking Type-
 
 from __future__ import annotations
 
+import hashlib
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
@@ -100,6 +101,16 @@ class TypeAwareChunker:
         self.max_chunk_size = max_chunk_size
         self.overlap_ratio = overlap_ratio
 
+    def _chunk_id(self, kind: ChunkKind, item_ids: List[str]) -> str:
+        """
+        ID déterministe (version + kind + items couverts).
+
+        Un même document ré-ingéré produit les mêmes chunk_ids, ce qui rend
+        la persistance Neo4j idempotente (MERGE sur chunk_id).
+        """
+        key = "|".join([self.tenant_id, self.doc_version_id, kind.value, *item_ids])
+        return f"chunk_{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}"
+
     def create_chunks(
         self,
         items: List[DocItem],
@@ -249,14 +260,17 @@ class TypeAwareChunker:
         # Section ID (premier item)
         section_id = items[0].section_id
 
+        item_ids = [i.item_id for i in items]
+
         return TypeAwareChunk(
+            chunk_id=self._chunk_id(ChunkKind.NARRATIVE_TEXT, item_ids),
             tenant_id=self.tenant_id,
             doc_id=self.doc_id,
             doc_version_id=self.doc_version_id,
             section_id=section_id,
             kind=ChunkKind.NARRATIVE_TEXT,
             text=merged_text,
-            item_ids=[i.item_id for i in items],
+            item_ids=item_ids,
             page_no=page_no,
             page_span_min=page_span_min,
             page_span_max=page_span_max,
@@ -288,6 +302,7 @@ class TypeAwareChunker:
         text = item.text or ""
 
         return TypeAwareChunk(
+            chunk_id=self._chunk_id(kind, [item.item_id]),
             tenant_id=self.tenant_id,
             doc_id=self.doc_id,
             doc_version_id=self.doc_version_id,
@@ -0,0 +1,302 @@
+"""
+Vues matérialisées Atlas — payloads home / domaine précalculés par tenant.
+
+Avant : chaque GET /wiki/home relançait les 8 agrégations de
+WikiArticlePersister.get_home_data (stats corpus, domaines, récents,
+Tier 1, contradictions, blind spots, start-here, corpus narrative), et
+chaque page domaine les 7 requêtes de get_domain_data.
+
+Maintenant :
+
+    osmose:atlas:version:{tenant}          compteur, INCR à chaque événement
+    osmose:atlas:view:{tenant}:{view}      {payload, version, computed_at} (JSON)
+
+- view = "home" ou "domain:{facet_key}".
+- Lecture : snapshot servi s'il porte la version courante et a moins de
+  ATLAS_VIEW_MAX_AGE_S. Sinon il est servi quand même (stale) et un
+  recalcul part en arrière-plan, dédoublonné par un verrou Redis
+  (stale-while-revalidate). Calcul synchrone seulement sans snapshot.
+- Événements (fin d'ingestion, sauvegarde/suppression d'article, hygiène
+  appliquée/rollback) : invalidate_atlas_views() incrémente la version ;
+  la fin d'un job d'ingestion recalcule aussi la home, dans le worker.
+- Sans Redis : calcul direct à chaque requête (comportement historique).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("[OSMOSE] atlas_views")
+
+REDIS_PREFIX = "osmose:atlas"
+MAX_AGE_S = float(os.getenv("ATLAS_VIEW_MAX_AGE_S", "3600"))
+SNAPSHOT_TTL_S = int(os.getenv("ATLAS_VIEW_TTL_S", str(7 * 24 * 3600)))
+REFRESH_LOCK_S = int(os.getenv("ATLAS_VIEW_REFRESH_LOCK_S", "300"))
+
+HOME_VIEW = "home"
+
+ViewComputer = Callable[[str, str], Optional[Dict[str, Any]]]
+
+
+def domain_view(facet_key: str) -> str:
+    return f"domain:{facet_key}"
+
+
+@dataclass
+class AtlasView:
+    """Payload matérialisé + métadonnées de fraîcheur."""
+    payload: Dict[str, Any]
+    version: Optional[int]
+    computed_at: float
+    stale: bool = False
+
+    @property
+    def age_s(self) -> float:
+        return max(0.0, time.time() - self.computed_at)
+
+
+class AtlasViewStore:
+    """
+    Snapshots Redis des vues Atlas, invalidés par version de tenant.
+
+    Usage:
+        store = get_atlas_view_store()
+        view = store.get(tenant_id, HOME_VIEW)
+        data, age = view.payload, view.age_s
+    """
+
+    def __init__(
+        self,
+        compute: Optional[ViewComputer] = None,
+        redis_client=None,
+        max_age_s: float = MAX_AGE_S,
+        spawn: Optional[Callable[[Callable[[], None]], None]] = None,
+    ):
+        """
+        Args:
+            compute: compute(tenant_id, view) -> payload (None = vue inexistante).
+                Défaut : WikiArticlePersister.get_home_data / get_domain_data.
+            redis_client: Client redis-py. None = client partagé get_redis_client()
+                résolu au premier usage.
+            max_age_s: Âge au-delà duquel un snapshot à jour est tout de même recalculé
+            spawn: Lance un recalcul en arrière-plan (défaut : thread daemon)
+        """
+        self._compute = compute or _compute_view
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self.max_age_s = max_age_s
+        self._spawn = spawn or _spawn_thread
+        self._stats = {"hits": 0, "stale": 0, "misses": 0, "refreshes": 0, "redis_errors": 0}
+
+    def get(self, tenant_id: str, view: str) -> Optional[AtlasView]:
+        """Vue du tenant (snapshot, éventuellement stale) ; None si la vue n'existe pas."""
+        redis = self._get_redis()
+        if redis is None:
+            return self._build(tenant_id, view, version=None)
+
+        try:
+            version = self._current_version(redis, tenant_id)
+            raw = redis.get(self._view_key(tenant_id, view))
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.warning(f"[ATLAS:VIEWS] Redis read failed, computing {view} directly: {e}")
+            return self._build(tenant_id, view, version=None)
+
+        if raw:
+            snap = json.loads(raw)
+            cached = AtlasView(
+                payload=snap["payload"], version=snap["version"], computed_at=snap["computed_at"],
+            )
+            if cached.version == version and cached.age_s < self.max_age_s:
+                self._stats["hits"] += 1
+                return cached
+            cached.stale = True
+            self._stats["stale"] += 1
+            self.refresh_async(tenant_id, view)
+            return cached
+
+        self._stats["misses"] += 1
+        return self.refresh(tenant_id, view)
+
+    def refresh(self, tenant_id: str, view: str) -> Optional[AtlasView]:
+        """Recalcule la vue et écrit le snapshot (version lue AVANT le calcul)."""
+        redis = self._get_redis()
+        version = None
+        if redis is not None:
+            try:
+                version = self._current_version(redis, tenant_id)
+            except Exception as e:
+                self._stats["redis_errors"] += 1
+                logger.warning(f"[ATLAS:VIEWS] Redis version read failed: {e}")
+                redis = None
+
+        result = self._build(tenant_id, view, version)
+        if result is None or redis is None:
+            return result
+
+        try:
+            redis.set(
+                self._view_key(tenant_id, view),
+                json.dumps({
+                    "payload": result.payload,
+                    "version": version,
+                    "computed_at": result.computed_at,
+                }, default=str),
+                ex=SNAPSHOT_TTL_S,
+            )
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.warning(f"[ATLAS:VIEWS] Snapshot write failed for {tenant_id}/{view}: {e}")
+        return result
+
+    def refresh_async(self, tenant_id: str, view: str) -> bool:
+        """Lance un recalcul en arrière-plan, sauf si un autre process s'en charge déjà."""
+        redis = self._get_redis()
+        if redis is None:
+            return False
+        lock_key = f"{self._view_key(tenant_id, view)}:refreshing"
+        try:
+            if not redis.set(lock_key, "1", nx=True, ex=REFRESH_LOCK_S):
+                return False
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.debug(f"[ATLAS:VIEWS] Refresh lock failed: {e}")
+            return False
+
+        def run() -> None:
+            try:
+                self.refresh(tenant_id, view)
+            except Exception as e:
+                logger.warning(f"[ATLAS:VIEWS] Background refresh failed for {tenant_id}/{view}: {e}")
+            finally:
+                try:
+                    redis.delete(lock_key)
+                except Exception:
+                    pass
+
+        self._spawn(run)
+        return True
+
+    def invalidate(self, tenant_id: str, reason: str = "") -> Optional[int]:
+        """Incrémente la version du tenant : tous ses snapshots deviennent stale."""
+        redis = self._get_redis()
+        if redis is None:
+            return None
+        try:
+            version = int(redis.incr(self._version_key(tenant_id)))
+            logger.info(f"[ATLAS:VIEWS] tenant={tenant_id} version={version} ({reason or 'invalidate'})")
+            return version
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.warning(f"[ATLAS:VIEWS] Invalidation failed for tenant={tenant_id}: {e}")
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats)
+
+    def _build(self, tenant_id: str, view: str, version: Optional[int]) -> Optional[AtlasView]:
+        t0 = time.time()
+        payload = self._compute(tenant_id, view)
+        if payload is None:
+            return None
+        self._stats["refreshes"] += 1
+        logger.info(
+            f"[ATLAS:VIEWS] tenant={tenant_id} view={view} version={version} "
+            f"computed in {int((time.time() - t0) * 1000)}ms"
+        )
+        return AtlasView(payload=payload, version=version, computed_at=time.time())
+
+    def _current_version(self, redis, tenant_id: str) -> int:
+        value = redis.get(self._version_key(tenant_id))
+        return int(value) if value is not None else 0
+
+    def _get_redis(self):
+        if not self._redis_resolved:
+            self._redis_resolved = True
+            try:
+                from knowbase.common.clients.redis_client import get_redis_client
+                self._redis = get_redis_client().client
+            except Exception as e:
+                logger.warning(f"[ATLAS:VIEWS] Redis unavailable, views computed per request: {e}")
+                self._redis = None
+        return self._redis
+
+    @staticmethod
+    def _version_key(tenant_id: str) -> str:
+        return f"{REDIS_PREFIX}:version:{tenant_id}"
+
+    @staticmethod
+    def _view_key(tenant_id: str, view: str) -> str:
+        return f"{REDIS_PREFIX}:view:{tenant_id}:{view}"
+
+
+def _compute_view(tenant_id: str, view: str) -> Optional[Dict[str, Any]]:
+    from knowbase.common.clients.neo4j_client import get_neo4j_client
+    from knowbase.wiki.persistence import WikiArticlePersister
+
+    persister = WikiArticlePersister(get_neo4j_client().driver)
+    if view == HOME_VIEW:
+        return persister.get_home_data(tenant_id)
+    if view.startswith("domain:"):
+        return persister.get_domain_data(view[len("domain:"):], tenant_id)
+    raise ValueError(f"Vue Atlas inconnue : {view}")
+
+
+def _spawn_thread(fn: Callable[[], None]) -> None:
+    threading.Thread(target=fn, name="atlas-view-refresh", daemon=True).start()
+
+
+_store: Optional[AtlasViewStore] = None
+_store_lock = threading.Lock()
+
+
+def get_atlas_view_store() -> AtlasViewStore:
+    """Singleton du store de vues Atlas."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = AtlasViewStore()
+    return _store
+
+
+def reset_atlas_view_store() -> None:
+    """Reset du singleton (tests)."""
+    global _store
+    _store = None
+
+
+def invalidate_atlas_views(tenant_id: str, reason: str = "", refresh_home: bool = False) -> None:
+    """
+    À appeler après tout changement du graphe visible dans l'Atlas.
+
+    Best-effort : n'échoue jamais l'appelant.
+
+    Args:
+        refresh_home: Recalcule aussi la home, de façon synchrone (jobs worker) :
+            la prochaine visite est servie fraîche.
+    """
+    try:
+        store = get_atlas_view_store()
+        store.invalidate(tenant_id, reason)
+        if refresh_home:
+            store.refresh(tenant_id, HOME_VIEW)
+    except Exception as e:
+        logger.warning(f"[ATLAS:VIEWS] invalidate_atlas_views failed for tenant={tenant_id}: {e}")
+
+
+__all__ = [
+    "AtlasView",
+    "AtlasViewStore",
+    "HOME_VIEW",
+    "domain_view",
+    "get_atlas_view_store",
+    "invalidate_atlas_views",
+    "reset_atlas_view_store",
+]
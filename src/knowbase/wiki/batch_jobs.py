@@ -0,0 +1,659 @@
+"""
+Génération wiki batch — file Redis + lanes RQ à concurrence bornée par tenant.
+
+Avant : /admin/batch-generate lançait une BackgroundTask FastAPI qui
+générait les articles un par un, état en mémoire du process API (perdu
+au restart, invisible des autres workers API).
+
+Maintenant :
+
+    osmose:wiki:batch:{batch_id}          hash  meta + compteurs (HINCRBY, O(1))
+    osmose:wiki:batch:{batch_id}:items    hash  idx -> item JSON
+    osmose:wiki:tenant:{tid}:pending      list  "{batch_id}:{idx}" à générer
+    osmose:wiki:tenant:{tid}:lanes        hash  lane_id -> {owner, batch_id, idx}
+    osmose:wiki:lane:{lane_id}            str   heartbeat (TTL WIKI_LANE_TTL_S)
+    osmose:wiki:job:{job_id}              str   WikiJobState JSON (TTL 24h)
+    osmose:wiki:tenants                   set   tenants ayant des batches actifs
+
+- Une lane est un job RQ (queue "wiki") qui génère au plus
+  WIKI_LANE_ITEMS_PER_JOB items du tenant, puis rend la main : ensure_lanes
+  relance une nouvelle lane tant que des items sont en file. Au plus
+  WIKI_BATCH_CONCURRENCY lanes par tenant.
+- La queue wiki est servie par les SimpleWorker d'ingestion, après les
+  queues ingestion / reprocess / benchmark : entre deux lanes, un job
+  d'ingestion en attente passe devant. Un batch de 500 concepts n'occupe
+  donc jamais un worker plus d'un article (ou d'un petit lot) d'affilée.
+- Le WikiBatchPrefetch (scope, titres, concepts liés, importance) est chargé
+  une fois par batch et par process, partagé par les lanes successives.
+- Progression écrite dans osmose:wiki:job:* à chaque étape : /status et
+  /article la lisent comme pour un job unitaire.
+- Reprise : au démarrage du worker, les lanes mortes (heartbeat expiré,
+  ou lancées par le process précédent du même hôte) sont retirées et leur
+  item en cours est remis en tête de file, puis les lanes sont relancées.
+- vLLM indisponible : le batch passe "suspended", ses items en file sont
+  annulés ; POST /admin/batch-resume/{batch_id} les remet en file.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("[OSMOSE] wiki_batch")
+
+WIKI_QUEUE_NAME = os.getenv("WIKI_QUEUE", "wiki")
+BATCH_CONCURRENCY = int(os.getenv("WIKI_BATCH_CONCURRENCY", "2"))
+LANE_TTL_S = int(os.getenv("WIKI_LANE_TTL_S", "1800"))
+LANE_ITEMS_PER_JOB = max(1, int(os.getenv("WIKI_LANE_ITEMS_PER_JOB", "1")))
+LANE_JOB_TIMEOUT = os.getenv("WIKI_LANE_JOB_TIMEOUT", "1h")
+PREFETCH_CACHE_SIZE = int(os.getenv("WIKI_PREFETCH_CACHE_SIZE", "4"))
+JOB_TTL_S = int(os.getenv("WIKI_JOB_TTL_S", str(24 * 3600)))
+BATCH_TTL_S = int(os.getenv("WIKI_BATCH_TTL_S", str(7 * 24 * 3600)))
+
+KEY_PREFIX = "osmose:wiki"
+LANE_QUEUED = "queued"
+
+# Identité de ce process : "{hostname}:{token}". Un conteneur redémarré garde
+# son hostname mais change de token → ses anciennes lanes sont reconnues mortes.
+_PROCESS_OWNER = f"{socket.gethostname()}:{uuid.uuid4().hex[:8]}"
+
+LaneEnqueuer = Callable[[str, str], None]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class WikiBatchStore:
+    """
+    État Redis des batches de génération wiki et des lanes qui les exécutent.
+
+    Usage:
+        store = get_wiki_batch_store()
+        batch_id = store.create_batch(tenant_id, language, items)
+        store.ensure_lanes(tenant_id)
+        status = store.get_batch(batch_id)
+    """
+
+    def __init__(
+        self,
+        redis_client=None,
+        enqueue: Optional[LaneEnqueuer] = None,
+        concurrency: int = BATCH_CONCURRENCY,
+    ):
+        """
+        Args:
+            redis_client: Client redis-py (decode_responses=True). None = client
+                partagé get_redis_client() résolu au premier usage.
+            enqueue: enqueue(tenant_id, lane_id) — défaut : job RQ sur la queue wiki
+            concurrency: Lanes simultanées max par tenant
+        """
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self._enqueue = enqueue or _enqueue_lane
+        self.concurrency = max(1, concurrency)
+
+    # ── Jobs unitaires ──────────────────────────────────────────────────
+
+    def save_job(self, job) -> None:
+        """Écrit l'état d'un WikiJobState (best-effort)."""
+        try:
+            self._r().set(self._job_key(job.job_id), json.dumps(job.to_dict()), ex=JOB_TTL_S)
+        except Exception as e:
+            logger.warning(f"[OSMOSE:Wiki:Batch] Job state write failed for {job.job_id}: {e}")
+
+    def load_job(self, job_id: str):
+        """WikiJobState depuis Redis (None si absent ou Redis indisponible)."""
+        from knowbase.wiki.jobs import WikiJobState
+
+        try:
+            raw = self._r().get(self._job_key(job_id))
+        except Exception as e:
+            logger.warning(f"[OSMOSE:Wiki:Batch] Job state read failed for {job_id}: {e}")
+            return None
+        return WikiJobState.from_dict(json.loads(raw)) if raw else None
+
+    # ── Batches ─────────────────────────────────────────────────────────
+
+    def create_batch(self, tenant_id: str, language: str, items: List[Dict[str, Any]]) -> str:
+        """
+        Enregistre un batch et met ses items en file.
+
+        Args:
+            items: [{concept_name, entity_type, importance_tier, entity_id}, ...]
+        """
+        r = self._r()
+        batch_id = str(uuid.uuid4())
+        batch_key = self._batch_key(batch_id)
+        items_key = self._items_key(batch_id)
+
+        r.hset(items_key, mapping={
+            str(idx): json.dumps({
+                "concept_name": item["concept_name"],
+                "entity_type": item.get("entity_type", "concept"),
+                "importance_tier": item.get("importance_tier", 3),
+                "entity_id": item.get("entity_id"),
+                "status": "queued",
+                "job_id": None,
+                "article_slug": None,
+                "error": None,
+            })
+            for idx, item in enumerate(items)
+        })
+        r.hset(batch_key, mapping={
+            "batch_id": batch_id,
+            "tenant_id": tenant_id,
+            "language": language,
+            "status": "running",
+            "total": len(items),
+            "completed": 0,
+            "failed": 0,
+            "running": 0,
+            "queued": len(items),
+            "cancelled": 0,
+            "created_at": _now(),
+        })
+        r.expire(batch_key, BATCH_TTL_S)
+        r.expire(items_key, BATCH_TTL_S)
+        r.rpush(self._pending_key(tenant_id), *[f"{batch_id}:{idx}" for idx in range(len(items))])
+        r.sadd(self._tenants_key(), tenant_id)
+        return batch_id
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Meta + items du batch (champs de WikiBatchStatus), None si inconnu."""
+        r = self._r()
+        meta = r.hgetall(self._batch_key(batch_id))
+        if not meta:
+            return None
+        items = r.hgetall(self._items_key(batch_id))
+        jobs = [json.loads(items[idx]) for idx in sorted(items, key=int)]
+        return {
+            "batch_id": batch_id,
+            "status": meta.get("status", "running"),
+            "total": int(meta.get("total", 0)),
+            "completed": int(meta.get("completed", 0)),
+            "failed": int(meta.get("failed", 0)),
+            "running": int(meta.get("running", 0)),
+            "queued": int(meta.get("queued", 0)),
+            "language": meta.get("language", "français"),
+            "jobs": jobs,
+        }
+
+    def batch_entity_ids(self, batch_id: str) -> List[str]:
+        items = self._r().hvals(self._items_key(batch_id))
+        return [eid for eid in (json.loads(raw).get("entity_id") for raw in items) if eid]
+
+    def claim_next(
+        self, tenant_id: str, lane_id: str
+    ) -> Optional[Tuple[str, int, Dict[str, Any], Dict[str, str]]]:
+        """Dépile le prochain item à générer → (batch_id, idx, item, batch_meta)."""
+        r = self._r()
+        while True:
+            entry = r.lpop(self._pending_key(tenant_id))
+            if entry is None:
+                return None
+            batch_id, _, idx = entry.rpartition(":")
+            meta = r.hgetall(self._batch_key(batch_id))
+            raw = r.hget(self._items_key(batch_id), idx)
+            if not meta or raw is None or meta.get("status") != "running":
+                continue  # batch expiré ou suspendu (items annulés)
+            item = json.loads(raw)
+            if item["status"] != "queued":
+                continue
+
+            item.update(status="running", job_id=str(uuid.uuid4()), lane_id=lane_id, error=None)
+            r.hset(self._items_key(batch_id), idx, json.dumps(item))
+            r.hincrby(self._batch_key(batch_id), "queued", -1)
+            r.hincrby(self._batch_key(batch_id), "running", 1)
+            self._set_lane(tenant_id, lane_id, batch_id=batch_id, idx=int(idx))
+            return batch_id, int(idx), item, meta
+
+    def finish_item(
+        self,
+        tenant_id: str,
+        lane_id: str,
+        batch_id: str,
+        idx: int,
+        status: str,
+        article_slug: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Termine un item (status: completed | failed).
+
+        Returns:
+            État final du batch si cet item le clôt, sinon None
+        """
+        r = self._r()
+        self._set_lane(tenant_id, lane_id)
+        raw = r.hget(self._items_key(batch_id), str(idx))
+        if raw is None:
+            return None
+        item = json.loads(raw)
+        if item.get("lane_id") != lane_id or item["status"] != "running":
+            return None  # item repris par une autre lane (lane considérée morte)
+
+        item.update(status=status, article_slug=article_slug, error=error)
+        r.hset(self._items_key(batch_id), str(idx), json.dumps(item))
+        r.hincrby(self._batch_key(batch_id), "running", -1)
+        r.hincrby(self._batch_key(batch_id), status, 1)
+        return self._maybe_finalize(batch_id)
+
+    def suspend_batch(self, tenant_id: str, batch_id: str) -> int:
+        """Suspend le batch et annule ses items encore en file. Retourne le nb annulé."""
+        r = self._r()
+        r.hset(self._batch_key(batch_id), "status", "suspended")
+        pending_key = self._pending_key(tenant_id)
+        cancelled = 0
+        for entry in r.lrange(pending_key, 0, -1):
+            if not entry.startswith(f"{batch_id}:") or not r.lrem(pending_key, 1, entry):
+                continue
+            idx = entry.rpartition(":")[2]
+            item = json.loads(r.hget(self._items_key(batch_id), idx))
+            item["status"] = "cancelled"
+            r.hset(self._items_key(batch_id), idx, json.dumps(item))
+            r.hincrby(self._batch_key(batch_id), "queued", -1)
+            r.hincrby(self._batch_key(batch_id), "cancelled", 1)
+            cancelled += 1
+        return cancelled
+
+    def resume_batch(self, batch_id: str) -> int:
+        """Remet en file les items annulés d'un batch suspendu et relance les lanes."""
+        r = self._r()
+        meta = r.hgetall(self._batch_key(batch_id))
+        if not meta or meta.get("status") != "suspended":
+            return 0
+        tenant_id = meta["tenant_id"]
+        requeued = []
+        for idx, raw in r.hgetall(self._items_key(batch_id)).items():
+            item = json.loads(raw)
+            if item["status"] != "cancelled":
+                continue
+            item.update(status="queued", error=None)
+            r.hset(self._items_key(batch_id), idx, json.dumps(item))
+            requeued.append(int(idx))
+        if requeued:
+            r.hincrby(self._batch_key(batch_id), "cancelled", -len(requeued))
+            r.hincrby(self._batch_key(batch_id), "queued", len(requeued))
+            r.rpush(self._pending_key(tenant_id), *[f"{batch_id}:{idx}" for idx in sorted(requeued)])
+        r.hset(self._batch_key(batch_id), "status", "running")
+        r.sadd(self._tenants_key(), tenant_id)
+        self._maybe_finalize(batch_id)
+        self.ensure_lanes(tenant_id)
+        return len(requeued)
+
+    def _maybe_finalize(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        r = self._r()
+        meta = r.hgetall(self._batch_key(batch_id))
+        if not meta or meta.get("status") != "running":
+            return None
+        done = sum(int(meta.get(k, 0)) for k in ("completed", "failed", "cancelled"))
+        if done < int(meta.get("total", 0)):
+            return None
+        # Une seule lane clôt le batch (et déclenche le résumé éditorial)
+        if not r.hsetnx(self._batch_key(batch_id), "finalized_at", _now()):
+            return None
+        status = "completed_with_errors" if int(meta.get("failed", 0)) else "completed"
+        r.hset(self._batch_key(batch_id), "status", status)
+        return self.get_batch(batch_id)
+
+    # ── Lanes ───────────────────────────────────────────────────────────
+
+    def ensure_lanes(self, tenant_id: str, restarted_host: Optional[str] = None) -> List[str]:
+        """
+        Relance des lanes jusqu'à `concurrency` tant que des items sont en file.
+
+        Args:
+            restarted_host: Hostname dont le process précédent est mort (reprise
+                au démarrage du worker) — ses lanes sont considérées mortes.
+
+        Returns:
+            lane_ids lancées
+        """
+        r = self._r()
+        with r.lock(f"{self._lanes_key(tenant_id)}:lock", timeout=30, blocking_timeout=30):
+            self.reap_dead_lanes(tenant_id, restarted_host=restarted_host)
+            pending = r.llen(self._pending_key(tenant_id))
+            if not pending:
+                if not r.hlen(self._lanes_key(tenant_id)):
+                    r.srem(self._tenants_key(), tenant_id)
+                return []
+
+            n_new = min(self.concurrency - r.hlen(self._lanes_key(tenant_id)), pending)
+            spawned = []
+            for _ in range(max(0, n_new)):
+                lane_id = uuid.uuid4().hex[:12]
+                self._set_lane(tenant_id, lane_id, owner=LANE_QUEUED)
+                r.set(self._heartbeat_key(lane_id), LANE_QUEUED, ex=LANE_TTL_S)
+                self._enqueue(tenant_id, lane_id)
+                spawned.append(lane_id)
+
+        if spawned:
+            logger.info(
+                f"[OSMOSE:Wiki:Batch] tenant={tenant_id}: {len(spawned)} lane(s) lancée(s), "
+                f"{pending} items en file"
+            )
+        return spawned
+
+    def start_lane(self, tenant_id: str, lane_id: str) -> bool:
+        """Marque la lane démarrée par ce process. False si elle a été retirée entre-temps."""
+        lane = self._get_lane(tenant_id, lane_id)
+        if lane is None:
+            return False
+        self._set_lane(tenant_id, lane_id, owner=_PROCESS_OWNER)
+        self._r().set(self._heartbeat_key(lane_id), _PROCESS_OWNER, ex=LANE_TTL_S)
+        return True
+
+    def heartbeat(self, tenant_id: str, lane_id: str) -> bool:
+        """Prolonge le heartbeat. False si la lane a été retirée (considérée morte)."""
+        r = self._r()
+        if not r.hexists(self._lanes_key(tenant_id), lane_id):
+            return False
+        r.set(self._heartbeat_key(lane_id), _PROCESS_OWNER, ex=LANE_TTL_S)
+        return True
+
+    def release_lane(self, tenant_id: str, lane_id: str) -> None:
+        r = self._r()
+        r.hdel(self._lanes_key(tenant_id), lane_id)
+        r.delete(self._heartbeat_key(lane_id))
+
+    def reap_dead_lanes(self, tenant_id: str, restarted_host: Optional[str] = None) -> int:
+        """Retire les lanes mortes et remet leur item en cours en tête de file."""
+        r = self._r()
+        requeued = 0
+        for lane_id, raw in r.hgetall(self._lanes_key(tenant_id)).items():
+            owner = r.get(self._heartbeat_key(lane_id))
+            lane = json.loads(raw)
+            if owner is not None and not self._owned_by_dead_process(lane.get("owner"), restarted_host):
+                continue
+
+            r.hdel(self._lanes_key(tenant_id), lane_id)
+            r.delete(self._heartbeat_key(lane_id))
+            batch_id, idx = lane.get("batch_id"), lane.get("idx")
+            if batch_id is not None and self._requeue_item(tenant_id, lane_id, batch_id, idx):
+                requeued += 1
+            logger.warning(
+                f"[OSMOSE:Wiki:Batch] tenant={tenant_id}: lane {lane_id} morte "
+                f"(owner={lane.get('owner')}), item requeue={batch_id is not None}"
+            )
+        return requeued
+
+    def _requeue_item(self, tenant_id: str, lane_id: str, batch_id: str, idx: int) -> bool:
+        r = self._r()
+        raw = r.hget(self._items_key(batch_id), str(idx))
+        if raw is None:
+            return False
+        item = json.loads(raw)
+        if item.get("lane_id") != lane_id or item["status"] != "running":
+            return False
+
+        # Job interrompu : visible comme tel via /status
+        job = self.load_job(item["job_id"]) if item.get("job_id") else None
+        if job is not None and job.status in ("pending", "running"):
+            job.status, job.error, job.progress = "failed", "Interrompu (redémarrage worker)", None
+            self.save_job(job)
+
+        item.update(status="queued", lane_id=None, job_id=None)
+        r.hset(self._items_key(batch_id), str(idx), json.dumps(item))
+        r.hincrby(self._batch_key(batch_id), "running", -1)
+        r.hincrby(self._batch_key(batch_id), "queued", 1)
+        r.lpush(self._pending_key(tenant_id), f"{batch_id}:{idx}")
+        return True
+
+    @staticmethod
+    def _owned_by_dead_process(owner: Optional[str], restarted_host: Optional[str]) -> bool:
+        if not restarted_host or not owner or owner == LANE_QUEUED or owner == _PROCESS_OWNER:
+            return False
+        return owner.rpartition(":")[0] == restarted_host
+
+    def _get_lane(self, tenant_id: str, lane_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._r().hget(self._lanes_key(tenant_id), lane_id)
+        return json.loads(raw) if raw else None
+
+    def _set_lane(self, tenant_id: str, lane_id: str, owner: Optional[str] = None,
+                  batch_id: Optional[str] = None, idx: Optional[int] = None) -> None:
+        """Met à jour l'entrée de la lane (owner conservé si non fourni, lane retirée ignorée)."""
+        if owner is None:
+            lane = self._get_lane(tenant_id, lane_id)
+            if lane is None:
+                return
+            owner = lane.get("owner", _PROCESS_OWNER)
+        self._r().hset(self._lanes_key(tenant_id), lane_id, json.dumps({
+            "owner": owner, "batch_id": batch_id, "idx": idx,
+        }))
+
+    def tenants(self) -> List[str]:
+        return sorted(self._r().smembers(self._tenants_key()))
+
+    # ── Redis ───────────────────────────────────────────────────────────
+
+    def _r(self):
+        if not self._redis_resolved:
+            from knowbase.common.clients.redis_client import get_redis_client
+            self._redis = get_redis_client().client
+            self._redis_resolved = True
+        return self._redis
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"{KEY_PREFIX}:job:{job_id}"
+
+    @staticmethod
+    def _batch_key(batch_id: str) -> str:
+        return f"{KEY_PREFIX}:batch:{batch_id}"
+
+    @staticmethod
+    def _items_key(batch_id: str) -> str:
+        return f"{KEY_PREFIX}:batch:{batch_id}:items"
+
+    @staticmethod
+    def _pending_key(tenant_id: str) -> str:
+        return f"{KEY_PREFIX}:tenant:{tenant_id}:pending"
+
+    @staticmethod
+    def _lanes_key(tenant_id: str) -> str:
+        return f"{KEY_PREFIX}:tenant:{tenant_id}:lanes"
+
+    @staticmethod
+    def _heartbeat_key(lane_id: str) -> str:
+        return f"{KEY_PREFIX}:lane:{lane_id}"
+
+    @staticmethod
+    def _tenants_key() -> str:
+        return f"{KEY_PREFIX}:tenants"
+
+
+def _enqueue_lane(tenant_id: str, lane_id: str) -> None:
+    from knowbase.ingestion.queue.connection import get_queue
+
+    get_queue(WIKI_QUEUE_NAME).enqueue(
+        run_wiki_batch_lane,
+        tenant_id,
+        lane_id,
+        job_id=f"wiki-lane-{lane_id}",
+        job_timeout=LANE_JOB_TIMEOUT,  # par job, soit LANE_ITEMS_PER_JOB articles
+        result_ttl=3600,
+    )
+
+
+# ── Lane RQ ─────────────────────────────────────────────────────────────
+
+
+def run_wiki_batch_lane(
+    tenant_id: str, lane_id: str, max_items: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Job RQ : génère au plus `max_items` items en file du tenant (défaut
+    LANE_ITEMS_PER_JOB), puis libère la lane ; ensure_lanes en relance une
+    en fin de file wiki s'il reste des items.
+    """
+    from knowbase.common.llm_router import VLLMUnavailableError
+    from knowbase.wiki.jobs import WikiJobState, regenerate_corpus_summary, run_wiki_pipeline
+
+    store = get_wiki_batch_store()
+    if not store.start_lane(tenant_id, lane_id):
+        logger.info(f"[OSMOSE:Wiki:Batch] Lane {lane_id} retirée avant démarrage, abandon")
+        return {"completed": 0, "failed": 0}
+
+    budget = max(1, max_items or LANE_ITEMS_PER_JOB)
+    stats = {"completed": 0, "failed": 0}
+    try:
+        while budget > 0 and store.heartbeat(tenant_id, lane_id):
+            claimed = store.claim_next(tenant_id, lane_id)
+            if claimed is None:
+                break
+            budget -= 1
+            batch_id, idx, item, meta = claimed
+            prefetch = _get_prefetch(store, tenant_id, batch_id)
+
+            job = WikiJobState(
+                job_id=item["job_id"],
+                concept_name=item["concept_name"],
+                language=meta.get("language", "français"),
+                tenant_id=tenant_id,
+                created_at=_now(),
+            )
+            store.save_job(job)
+
+            def on_update(j) -> None:
+                store.save_job(j)
+                store.heartbeat(tenant_id, lane_id)
+
+            logger.info(
+                f"[OSMOSE:Wiki:Batch] lane={lane_id} batch={batch_id} "
+                f"[{idx + 1}/{meta.get('total')}] Génération '{item['concept_name']}'..."
+            )
+            try:
+                run_wiki_pipeline(job, prefetch=prefetch, on_update=on_update)
+            except VLLMUnavailableError:
+                store.finish_item(tenant_id, lane_id, batch_id, idx, "failed", error="vLLM indisponible")
+                stats["failed"] += 1
+                cancelled = store.suspend_batch(tenant_id, batch_id)
+                logger.error(
+                    f"[OSMOSE:Wiki:Batch] vLLM DOWN — batch {batch_id} suspendu, "
+                    f"{cancelled} articles annulés"
+                )
+                continue
+
+            ok = job.status in ("completed", "completed_with_warnings")
+            stats["completed" if ok else "failed"] += 1
+            final = store.finish_item(
+                tenant_id, lane_id, batch_id, idx,
+                "completed" if ok else "failed",
+                article_slug=job.article_slug,
+                error=None if ok else job.error,
+            )
+            if final is not None:
+                _drop_prefetch(batch_id)
+                logger.info(
+                    f"[OSMOSE:Wiki:Batch] Batch {batch_id} terminé : "
+                    f"{final['completed']} OK, {final['failed']} échecs sur {final['total']}"
+                )
+                if final["completed"] > 0:
+                    try:
+                        regenerate_corpus_summary(tenant_id)
+                    except Exception as e:
+                        logger.warning(f"[OSMOSE:Wiki:Batch] Résumé éditorial non regénéré: {e}")
+    finally:
+        store.release_lane(tenant_id, lane_id)
+        try:
+            store.ensure_lanes(tenant_id)  # items mis en file pendant la sortie de la lane
+        except Exception as e:
+            logger.warning(f"[OSMOSE:Wiki:Batch] ensure_lanes failed for tenant={tenant_id}: {e}")
+
+    logger.info(f"[OSMOSE:Wiki:Batch] lane={lane_id} terminée : {stats}")
+    return stats
+
+
+_prefetches: "OrderedDict[str, Any]" = OrderedDict()
+_prefetches_lock = threading.Lock()
+
+
+def _get_prefetch(store: WikiBatchStore, tenant_id: str, batch_id: str):
+    """Prefetch du batch, chargé une fois par process (LRU de PREFETCH_CACHE_SIZE batches).
+
+    Les échecs (None) ne sont pas mémorisés : la lane suivante retente.
+    """
+    with _prefetches_lock:
+        if batch_id in _prefetches:
+            _prefetches.move_to_end(batch_id)
+            return _prefetches[batch_id]
+    prefetch = _load_prefetch(store, tenant_id, batch_id)
+    if prefetch is None:
+        return None
+    with _prefetches_lock:
+        _prefetches[batch_id] = prefetch
+        while len(_prefetches) > max(1, PREFETCH_CACHE_SIZE):
+            _prefetches.popitem(last=False)
+    return prefetch
+
+
+def _drop_prefetch(batch_id: str) -> None:
+    with _prefetches_lock:
+        _prefetches.pop(batch_id, None)
+
+
+def _load_prefetch(store: WikiBatchStore, tenant_id: str, batch_id: str):
+    """WikiBatchPrefetch du batch (None si le chargement échoue : lectures unitaires)."""
+    try:
+        from knowbase.common.clients.neo4j_client import get_neo4j_client
+        from knowbase.wiki.batch_prefetch import WikiBatchPrefetch
+        from knowbase.wiki.importance_scorer import ImportanceScorer
+
+        driver = get_neo4j_client().driver
+        return WikiBatchPrefetch.load(
+            driver, tenant_id, store.batch_entity_ids(batch_id), scorer=ImportanceScorer(driver)
+        )
+    except Exception as e:
+        logger.warning(f"[OSMOSE:Wiki:Batch] Prefetch failed for batch {batch_id}: {e}")
+        return None
+
+
+def resume_wiki_batches() -> Dict[str, int]:
+    """
+    Reprise au démarrage du worker : retire les lanes mortes, remet leurs
+    items en file et relance les lanes des tenants ayant des items en attente.
+    """
+    store = get_wiki_batch_store()
+    host = socket.gethostname()
+    spawned = 0
+    for tenant_id in store.tenants():
+        spawned += len(store.ensure_lanes(tenant_id, restarted_host=host))
+    return {"lanes_spawned": spawned}
+
+
+_store: Optional[WikiBatchStore] = None
+_store_lock = threading.Lock()
+
+
+def get_wiki_batch_store() -> WikiBatchStore:
+    """Singleton du store de batches wiki."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = WikiBatchStore()
+    return _store
+
+
+def reset_wiki_batch_store() -> None:
+    """Reset du singleton (tests)."""
+    global _store
+    _store = None
+
+
+__all__ = [
+    "WIKI_QUEUE_NAME",
+    "WikiBatchStore",
+    "get_wiki_batch_store",
+    "reset_wiki_batch_store",
+    "resume_wiki_batches",
+    "run_wiki_batch_lane",
+]
@@ -0,0 +1,134 @@
+"""
+WikiBatchPrefetch — Données partagées par tous les articles d'un batch wiki.
+
+Avant : chaque article du batch relançait les mêmes lectures Neo4j
+(DocumentContext ×2 pour scope + titres, co-occurrence des concepts liés,
+et ImportanceScorer.score_all_concepts() complet à la persistence).
+
+Maintenant, une lane de génération charge une fois par batch :
+- tous les DocumentContext du tenant (scope + titre) en 1 requête
+- les concepts co-mentionnés (top 10) de chaque entity_id candidat, en
+  1 requête UNWIND
+- la table d'importance (nom → ScoredConcept)
+
+EvidencePackBuilder(prefetch=...) lit ces tables et ne retombe sur ses
+requêtes unitaires que pour ce qui n'y est pas (doc ingéré pendant le
+batch, concept résolu sur plusieurs entités).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RELATED_LIMIT = 10
+
+
+@dataclass
+class WikiBatchPrefetch:
+    """Snapshot des lectures communes à un batch de génération."""
+    tenant_id: str
+    doc_contexts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    related_by_entity: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    scored_map: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(
+        cls,
+        driver,
+        tenant_id: str,
+        entity_ids: Iterable[str],
+        scorer=None,
+    ) -> "WikiBatchPrefetch":
+        """
+        Charge le snapshot du batch.
+
+        Args:
+            driver: Neo4j driver
+            tenant_id: Tenant ID
+            entity_ids: entity_id des concepts candidats du batch
+            scorer: ImportanceScorer (None = pas de table d'importance)
+        """
+        t0 = time.time()
+        prefetch = cls(tenant_id=tenant_id)
+        entity_ids = sorted({eid for eid in entity_ids if eid})
+
+        with driver.session() as session:
+            for r in session.run(
+                """
+                MATCH (dc:DocumentContext)
+                WHERE dc.tenant_id = $tenant_id
+                RETURN dc.doc_id AS doc_id, dc.document_type AS document_type,
+                       dc.temporal_scope AS temporal_scope,
+                       dc.primary_subject AS primary_subject
+                """,
+                tenant_id=tenant_id,
+            ):
+                prefetch.doc_contexts[r["doc_id"]] = {
+                    "document_type": r["document_type"],
+                    "temporal_scope": r["temporal_scope"],
+                    "primary_subject": r["primary_subject"],
+                }
+
+            if entity_ids:
+                for eid in entity_ids:
+                    prefetch.related_by_entity[eid] = []
+                for r in session.run(
+                    """
+                    UNWIND $entity_ids AS eid
+                    CALL {
+                        WITH eid
+                        MATCH (c:Claim)-[:ABOUT]->(e1:Entity {entity_id: eid}),
+                              (c)-[:ABOUT]->(e2:Entity)
+                        WHERE e2.entity_id <> eid
+                              AND c.tenant_id = $tenant_id
+                        WITH e2.name AS name, e2.entity_type AS etype,
+                             count(DISTINCT c) AS co_count,
+                             collect(DISTINCT c.claim_id) AS claim_ids
+                        ORDER BY co_count DESC
+                        LIMIT $limit
+                        RETURN name, etype, co_count, claim_ids
+                    }
+                    RETURN eid, name, etype, co_count, claim_ids
+                    """,
+                    entity_ids=entity_ids,
+                    tenant_id=tenant_id,
+                    limit=RELATED_LIMIT,
+                ):
+                    prefetch.related_by_entity[r["eid"]].append({
+                        "name": r["name"],
+                        "etype": r["etype"],
+                        "co_count": r["co_count"],
+                        "claim_ids": r["claim_ids"],
+                    })
+
+        if scorer is not None:
+            prefetch.scored_map = {
+                s.entity_name.lower(): s for s in scorer.score_all_concepts(tenant_id)
+            }
+
+        logger.info(
+            f"[OSMOSE:WikiBatchPrefetch] tenant={tenant_id}: "
+            f"{len(prefetch.doc_contexts)} doc contexts, "
+            f"{len(prefetch.related_by_entity)} entities, "
+            f"{len(prefetch.scored_map)} scored concepts in {time.time() - t0:.1f}s"
+        )
+        return prefetch
+
+    def related_rows(self, entity_ids: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Concepts co-mentionnés préchargés, ou None si non couverts.
+
+        Le top 10 d'un concept multi-entités n'est pas dérivable des top 10
+        par entité : seul le cas mono-entité est servi depuis le snapshot.
+        """
+        if len(entity_ids) != 1:
+            return None
+        return self.related_by_entity.get(entity_ids[0])
+
+
+__all__ = ["WikiBatchPrefetch"]
@@ -74,10 +74,16 @@ class EvidencePackBuilder:
 
     DOC_CAP_PCT = 0.40  # max 40% d'un doc
 
-    def __init__(self, neo4j_driver, qdrant_client, embedding_manager):
+    def __init__(self, neo4j_driver, qdrant_client, embedding_manager, prefetch=None):
+        """
+        Args:
+            prefetch: WikiBatchPrefetch optionnel (génération batch) — scope,
+                titres et concepts liés lus depuis le snapshot du batch.
+        """
         self._driver = neo4j_driver
         self._qdrant = qdrant_client
         self._embeddings = embedding_manager
+        self._prefetch = prefetch
 
     def build(self, concept: ResolvedConcept, tenant_id: str = "default") -> EvidencePack:
         """Pipeline 8 étapes → EvidencePack."""
@@ -154,35 +160,24 @@ class EvidencePackBuilder:
         if not doc_ids:
             return {}
 
-        query = """
-        MATCH (dc:DocumentContext)
-        WHERE dc.doc_id IN $doc_ids AND dc.tenant_id = $tenant_id
-        RETURN dc.doc_id AS doc_id, dc.document_type AS document_type,
-               dc.temporal_scope AS temporal_scope,
-               dc.primary_subject AS primary_subject,
-               dc.qualifiers_json AS qualifiers_json
-        """
         cache: Dict[str, ScopeSignature] = {}
-        with self._driver.session() as session:
-            result = session.run(query, doc_ids=doc_ids, tenant_id=tenant_id)
-            for r in result:
-                doc_id = r["doc_id"]
-                doc_type = r.get("document_type") or None
-                temporal = r.get("temporal_scope") or None
-
-                # Déterminer temporal_scope_kind
-                temporal_kind = "timeless"
-                axis_values: Dict[str, str] = {}
-                if temporal:
-                    temporal_kind = "versioned"
-                    axis_values["temporal_scope"] = temporal
-
-                cache[doc_id] = ScopeSignature(
-                    doc_type=doc_type,
-                    axis_values=axis_values,
-                    generality_level=self._infer_generality(doc_type),
-                    temporal_scope_kind=temporal_kind,
-                )
+        for doc_id, ctx in self._doc_contexts(doc_ids, tenant_id).items():
+            doc_type = ctx.get("document_type") or None
+            temporal = ctx.get("temporal_scope") or None
+
+            # Déterminer temporal_scope_kind
+            temporal_kind = "timeless"
+            axis_values: Dict[str, str] = {}
+            if temporal:
+                temporal_kind = "versioned"
+                axis_values["temporal_scope"] = temporal
+
+            cache[doc_id] = ScopeSignature(
+                doc_type=doc_type,
+                axis_values=axis_values,
+                generality_level=self._infer_generality(doc_type),
+                temporal_scope_kind=temporal_kind,
+            )
 
         logger.info(f"[OSMOSE:EvidencePackBuilder] Scope cache : {len(cache)}/{len(doc_ids)} docs")
         return cache
@@ -192,18 +187,39 @@ class EvidencePackBuilder:
         if not doc_ids:
             return {}
 
+        return {
+            doc_id: ctx["primary_subject"]
+            for doc_id, ctx in self._doc_contexts(doc_ids, tenant_id).items()
+            if ctx.get("primary_subject")
+        }
+
+    def _doc_contexts(self, doc_ids: List[str], tenant_id: str) -> Dict[str, Dict[str, Any]]:
+        """DocumentContext des docs : snapshot du batch, requête pour les absents."""
+        contexts: Dict[str, Dict[str, Any]] = {}
+        missing = list(doc_ids)
+        if self._prefetch is not None:
+            known = self._prefetch.doc_contexts
+            contexts = {d: known[d] for d in doc_ids if d in known}
+            missing = [d for d in doc_ids if d not in known]
+            if not missing:
+                return contexts
+
         query = """
         MATCH (dc:DocumentContext)
         WHERE dc.doc_id IN $doc_ids AND dc.tenant_id = $tenant_id
-        RETURN dc.doc_id AS doc_id, dc.primary_subject AS title
+        RETURN dc.doc_id AS doc_id, dc.document_type AS document_type,
+               dc.temporal_scope AS temporal_scope,
+               dc.primary_subject AS primary_subject
         """
-        titles: Dict[str, str] = {}
         with self._driver.session() as session:
-            result = session.run(query, doc_ids=doc_ids, tenant_id=tenant_id)
+            result = session.run(query, doc_ids=missing, tenant_id=tenant_id)
             for r in result:
-                if r["title"]:
-                    titles[r["doc_id"]] = r["title"]
-        return titles
+                contexts[r["doc_id"]] = {
+                    "document_type": r["document_type"],
+                    "temporal_scope": r["temporal_scope"],
+                    "primary_subject": r["primary_subject"],
+                }
+        return contexts
 
     @staticmethod
     def _infer_generality(doc_type: Optional[str]) -> str:
@@ -762,25 +778,31 @@ class EvidencePackBuilder:
             u.source_id: u.unit_id for u in units if u.source_type == "claim"
         }
 
+        rows = None
+        if self._prefetch is not None:
+            rows = self._prefetch.related_rows(concept.entity_ids)
+        if rows is None:
+            with self._driver.session() as session:
+                result = session.run(
+                    query, entity_ids=concept.entity_ids, tenant_id=tenant_id
+                )
+                rows = [dict(r) for r in result]
+
         related: List[RelatedConcept] = []
-        with self._driver.session() as session:
-            result = session.run(
-                query, entity_ids=concept.entity_ids, tenant_id=tenant_id
-            )
-            for r in result:
-                supporting = [
-                    claim_to_unit[cid]
-                    for cid in (r["claim_ids"] or [])
-                    if cid in claim_to_unit
-                ]
-                related.append(
-                    RelatedConcept(
-                        entity_name=r["name"],
-                        entity_type=r["etype"] or "concept",
-                        co_occurrence_count=r["co_count"],
-                        supporting_unit_ids=supporting,
-                    )
+        for r in rows:
+            supporting = [
+                claim_to_unit[cid]
+                for cid in (r["claim_ids"] or [])
+                if cid in claim_to_unit
+            ]
+            related.append(
+                RelatedConcept(
+                    entity_name=r["name"],
+                    entity_type=r["etype"] or "concept",
+                    co_occurrence_count=r["co_count"],
+                    supporting_unit_ids=supporting,
                 )
+            )
 
         return related
 
@@ -0,0 +1,326 @@
+"""
+Jobs de génération wiki — état d'un job + pipeline complet.
+
+Pipeline : ConceptResolver → EvidencePackBuilder → SectionPlanner →
+ConstrainedGenerator → persistence Neo4j → linking incrémental.
+
+Partagé par le router (génération unitaire, BackgroundTasks) et les lanes
+RQ de génération batch (knowbase.wiki.batch_jobs, process worker).
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from knowbase.wiki.batch_prefetch import WikiBatchPrefetch
+
+logger = logging.getLogger("[OSMOSE] wiki_jobs")
+
+
+@dataclass
+class WikiJobState:
+    job_id: str
+    concept_name: str
+    language: str
+    tenant_id: str
+    status: str = "pending"  # pending | running | completed | completed_with_warnings | failed
+    progress: Optional[str] = None
+    error: Optional[str] = None
+    markdown: Optional[str] = None
+    article_data: Optional[dict] = None
+    resolution_info: Optional[dict] = None
+    article_slug: Optional[str] = None
+    created_at: str = ""
+    completed_at: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WikiJobState":
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+def run_wiki_pipeline(
+    job: WikiJobState,
+    prefetch: Optional["WikiBatchPrefetch"] = None,
+    on_update: Optional[Callable[[WikiJobState], None]] = None,
+) -> None:
+    """
+    Exécute le pipeline wiki complet + persistence Neo4j, en mettant à jour `job`.
+
+    Args:
+        job: État du job (muté en place)
+        prefetch: Snapshot partagé du batch (None = lectures unitaires)
+        on_update: Appelé à chaque changement d'étape / statut terminal
+            (ex: écriture Redis pour les jobs batch)
+    """
+    concept_name, language, tenant_id = job.concept_name, job.language, job.tenant_id
+
+    def _step(progress: Optional[str]) -> None:
+        job.progress = progress
+        if on_update is not None:
+            on_update(job)
+
+    try:
+        job.status = "running"
+
+        # 1. Résolution du concept
+        _step("Résolution du concept...")
+        from knowbase.common.clients.neo4j_client import get_neo4j_client
+        from knowbase.wiki.concept_resolver import ConceptResolver
+
+        neo4j_client = get_neo4j_client()
+        resolver = ConceptResolver(neo4j_client.driver)
+        resolved = resolver.resolve(concept_name, tenant_id)
+
+        job.resolution_info = {
+            "resolution_method": resolved.resolution_method,
+            "resolution_confidence": resolved.resolution_confidence,
+            "matched_entities": len(resolved.entity_ids),
+            "ambiguity_notes": resolved.ambiguity_notes,
+        }
+
+        # 2. Construction de l'evidence pack
+        _step("Construction de l'evidence pack...")
+        from knowbase.common.clients.embeddings import get_embedding_manager
+        from knowbase.common.clients import get_qdrant_client
+        from knowbase.wiki.evidence_pack_builder import EvidencePackBuilder
+
+        qdrant_client = get_qdrant_client()
+        embedding_manager = get_embedding_manager()
+        builder = EvidencePackBuilder(
+            neo4j_client.driver, qdrant_client, embedding_manager, prefetch=prefetch
+        )
+        pack = builder.build(resolved, tenant_id)
+
+        # 3. Planification des sections
+        _step("Planification des sections...")
+        from knowbase.wiki.section_planner import SectionPlanner
+
+        planner = SectionPlanner()
+        plan = planner.plan(pack)
+
+        # 4. Génération de l'article
+        section_count = len(plan.sections)
+        _step(f"Génération de l'article ({section_count} sections)...")
+        from knowbase.wiki.constrained_generator import ConstrainedGenerator
+
+        generator = ConstrainedGenerator(language)
+        article = generator.generate(pack, plan)
+        markdown = generator.render_markdown(article)
+
+        # 5. Déterminer statut terminal
+        confidence = article.average_confidence
+        gap_count = len(article.all_gaps)
+        is_fuzzy = resolved.resolution_method == "fuzzy"
+
+        if confidence < 0.5 or gap_count > 3 or is_fuzzy:
+            terminal_status = "completed_with_warnings"
+        else:
+            terminal_status = "completed"
+
+        # 6. Persistence Neo4j (non-bloquant pour le statut du job)
+        _step("Persistence de l'article...")
+        article_slug = plan.slug
+        try:
+            from knowbase.wiki.persistence import WikiArticlePersister
+            from knowbase.wiki.importance_scorer import ImportanceScorer, compute_importance
+
+            persister = WikiArticlePersister(neo4j_client.driver)
+
+            # Calcul de l'importance pour cette entité (table partagée en batch)
+            if prefetch is not None and prefetch.scored_map:
+                scored_map = prefetch.scored_map
+            else:
+                scorer = ImportanceScorer(neo4j_client.driver)
+                all_scored = scorer.score_all_concepts(tenant_id)
+                scored_map = {s.entity_name.lower(): s for s in all_scored}
+            entity_scored = scored_map.get(resolved.canonical_name.lower())
+
+            importance_score = entity_scored.importance_score if entity_scored else compute_importance(
+                resolved.claim_count, len(resolved.doc_ids), 0
+            )
+            importance_tier = entity_scored.importance_tier if entity_scored else 3
+
+            # Construire source_details depuis le pack
+            source_details = [
+                {
+                    "doc_id": s.doc_id,
+                    "doc_title": s.doc_title,
+                    "doc_type": s.doc_type,
+                    "unit_count": s.unit_count,
+                    "contribution_pct": round(s.contribution_pct, 1),
+                }
+                for s in pack.source_index
+            ]
+
+            # Construire related_concepts (co-occurrence) + enrichir depuis le markdown
+            related_concepts_data = [
+                {
+                    "entity_name": rc.entity_name,
+                    "entity_type": rc.entity_type,
+                    "co_occurrence_count": rc.co_occurrence_count,
+                }
+                for rc in pack.related_concepts[:8]
+            ]
+            related_concepts_data = persister.enrich_related_from_markdown(
+                markdown=markdown,
+                existing_related=related_concepts_data,
+                concept_name=resolved.canonical_name,
+                tenant_id=tenant_id,
+            )
+
+            persister.save_article(
+                slug=article_slug,
+                title=resolved.canonical_name,
+                tenant_id=tenant_id,
+                entity_type=resolved.entity_type,
+                language=language,
+                markdown=markdown,
+                sections_count=len(article.sections),
+                total_citations=article.total_citations,
+                generation_confidence=round(confidence, 3),
+                all_gaps=article.all_gaps,
+                source_count=len(pack.source_index),
+                unit_count=len(pack.units),
+                source_details=source_details,
+                resolution_method=resolved.resolution_method,
+                resolution_confidence=resolved.resolution_confidence,
+                importance_score=importance_score,
+                importance_tier=importance_tier,
+                entity_ids=resolved.entity_ids,
+                related_concepts=related_concepts_data,
+            )
+
+            job.article_slug = article_slug
+            logger.info(
+                f"[OSMOSE:Wiki] Article '{article_slug}' persisté en Neo4j "
+                f"(tier={importance_tier})"
+            )
+
+            # V2 : Linking incrémental — linker ce nouvel article + re-linker les impactés
+            _step("Linking incrémental...")
+            try:
+                from knowbase.wiki.concept_linker import ConceptLinker
+
+                linker = ConceptLinker(neo4j_client.driver, tenant_id)
+                link_summary = linker.link_incrementally(article_slug)
+
+                new_result = link_summary.get("new_article")
+                impacted = link_summary.get("impacted", [])
+                link_count = new_result.link_count if new_result and new_result.success else 0
+
+                logger.info(
+                    f"[OSMOSE:Wiki] Linking incrémental pour '{article_slug}' : "
+                    f"{link_count} liens, {len(impacted)} articles re-linkés"
+                )
+            except Exception as link_err:
+                # Le linking incrémental est best-effort — ne bloque pas la génération
+                logger.warning(
+                    f"[OSMOSE:Wiki] Linking incrémental échoué pour '{article_slug}': {link_err}"
+                )
+
+        except Exception as persist_err:
+            # La persistence échoue silencieusement — l'article est toujours disponible via job_id
+            logger.error(
+                f"[OSMOSE:Wiki] Erreur persistence pour '{concept_name}': {persist_err}",
+                exc_info=True,
+            )
+
+        job.status = terminal_status
+        job.markdown = markdown
+        job.article_data = {
+            "sections_count": len(article.sections),
+            "total_citations": article.total_citations,
+            "generation_confidence": round(confidence, 3),
+            "all_gaps": article.all_gaps,
+            "source_count": len(pack.source_index),
+            "unit_count": len(pack.units),
+            "generated_at": article.generated_at,
+        }
+        job.completed_at = datetime.now(timezone.utc).isoformat()
+        _step(None)
+
+        logger.info(
+            f"[OSMOSE:Wiki] Article généré pour '{concept_name}' — "
+            f"statut={terminal_status}, confiance={confidence:.2f}, "
+            f"sections={len(article.sections)}, citations={article.total_citations}"
+        )
+
+    except ValueError as e:
+        job.status = "failed"
+        job.error = str(e)
+        _step(None)
+        logger.warning(f"[OSMOSE:Wiki] Concept introuvable : {e}")
+
+    except Exception as e:
+        # Propager VLLMUnavailableError pour que le batch puisse s'arrêter
+        from knowbase.common.llm_router import VLLMUnavailableError
+        if isinstance(e, VLLMUnavailableError):
+            job.status = "failed"
+            job.error = "vLLM indisponible"
+            _step(None)
+            logger.error(f"[OSMOSE:Wiki] vLLM down — pipeline arrêté pour '{concept_name}'")
+            raise  # remonter au batch
+
+        job.status = "failed"
+        job.error = f"Erreur interne : {str(e)}"
+        _step(None)
+        logger.error(f"[OSMOSE:Wiki] Erreur pipeline pour '{concept_name}': {e}", exc_info=True)
+
+
+def regenerate_corpus_summary(tenant_id: str) -> None:
+    """Regénère le domain_summary via LLM (appel synchrone pour background tasks)."""
+    from knowbase.common.clients.neo4j_client import get_neo4j_client
+    from knowbase.wiki.persistence import WikiArticlePersister
+
+    neo4j_client = get_neo4j_client()
+    persister = WikiArticlePersister(neo4j_client.driver)
+    data = persister.get_home_data(tenant_id)
+    narrative = data.get("corpus_narrative", {})
+    stats = data.get("corpus_stats", {})
+    domains = data.get("knowledge_domains", [])
+
+    top_entities = [e["name"] for e in narrative.get("top_entities", [])[:8]]
+    doc_types = [d["type"] for d in narrative.get("doc_type_distribution", [])[:5]]
+    domain_names = [d["name"] for d in domains[:6]]
+
+    prompt = f"""Tu es un rédacteur éditorial pour un Atlas de connaissances.
+Écris un résumé de 2-3 phrases décrivant le contenu de ce corpus documentaire.
+Le résumé doit être informatif, professionnel, et donner envie d'explorer les articles.
+Pas de formule de politesse, pas de "bienvenue", va droit au sujet.
+
+Données du corpus :
+- {stats.get('total_documents', 0)} documents sources
+- {stats.get('total_claims', 0)} faits extraits
+- {stats.get('total_articles', 0)} articles de synthèse
+- Types de documents : {', '.join(doc_types) if doc_types else 'non spécifié'}
+- Concepts les plus documentés : {', '.join(top_entities) if top_entities else 'non spécifié'}
+- Domaines thématiques : {', '.join(domain_names) if domain_names else 'non spécifié'}
+
+Résumé (en français, 2-3 phrases max) :"""
+
+    from knowbase.common.llm_router import get_llm_router, TaskType
+
+    router_llm = get_llm_router()
+    summary = router_llm.complete(prompt, task=TaskType.SHORT_ENRICHMENT)
+    summary = summary.strip().strip('"').strip()
+
+    if len(summary) >= 30:
+        from knowbase.ontology.domain_context_store import DomainContextStore
+
+        store = DomainContextStore()
+        profile = store.get_profile(tenant_id)
+        if profile:
+            profile.domain_summary = summary
+            store.save_profile(profile)
+            logger.info(f"[ATLAS] domain_summary auto-regénéré ({len(summary)} chars)")
+
+
+__all__ = ["WikiJobState", "regenerate_corpus_summary", "run_wiki_pipeline"]
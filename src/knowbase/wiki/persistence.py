@@ -135,6 +135,9 @@ class WikiArticlePersister:
         if entity_ids:
             self._link_about(slug, tenant_id, entity_ids)
 
+        from knowbase.wiki.atlas_views import invalidate_atlas_views
+        invalidate_atlas_views(tenant_id, reason=f"wiki save {slug}")
+
         logger.info(
             f"[OSMOSE:WikiPersister] Article '{slug}' persisté "
             f"(tier={importance_tier}, score={importance_score:.2f})"
@@ -355,6 +358,8 @@ class WikiArticlePersister:
             deleted = result.single()["deleted"]
             if deleted > 0:
                 logger.info(f"[OSMOSE:WikiPersister] Article '{slug}' supprimé")
+                from knowbase.wiki.atlas_views import invalidate_atlas_views
+                invalidate_atlas_views(tenant_id, reason=f"wiki delete {slug}")
                 return True
             return False
 
@@ -400,3 +400,13 @@ def test_end_to_end_realistic_scenario():
               f"score={entity['embedding_score']:.3f} "
               f"(prim={entity['embedding_primary_similarity']:.2f}, "
               f"comp={entity['embedding_competitor_similarity']:.2f})")
+
+
+def test_extract_contexts_offsets_survive_lowercase_expansion():
+    """Extraction contexte - « İ ».lower() fait 2 caractères, dans le texte comme dans le nom."""
+    scorer = EmbeddingsContextualScorer(context_window=2)
+
+    text = "İİ İstanbul İİ SAP BTP runs here."
+    contexts = scorer._extract_contexts_for_entities(["SAP BTP", "İstanbul"], text)
+
+    assert contexts == {"SAP BTP": ["İİ SAP BTP runs"], "İstanbul": ["İİ İstanbul İİ"]}
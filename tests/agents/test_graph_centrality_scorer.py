@@ -315,3 +315,110 @@ def test_end_to_end_scoring_realistic():
               f"(tfidf={entity['tf_idf_score']:.2f}, "
               f"cent={entity['centrality_score']:.2f}, "
               f"sal={entity['salience_score']:.2f})")
+
+
+# Coût borné : graphe creux, PageRank / betweenness approximés, budget par échéance
+
+def _reference_cooccurrences(scorer, candidates, text):
+    """Ancienne boucle : test « entité dans fenêtre » pour chaque fenêtre."""
+    import math
+    import re
+    from collections import defaultdict
+
+    window_size = scorer._get_adaptive_window_size(len(text))
+    names = [(e.get("text") or e.get("name")).lower() for e in candidates]
+    words = re.findall(r'\b\w+\b', text.lower())
+    counts = defaultdict(int)
+    for i in range(len(words) - window_size + 1):
+        window = words[i:i + window_size]
+        present = [n for n in names if all(w in window for w in n.split())]
+        for j, e1 in enumerate(present):
+            for e2 in present[j + 1:]:
+                counts[tuple(sorted([e1, e2]))] += 1
+    return {pair: round(math.log(c + 1), 9) for pair, c in counts.items()}
+
+
+def _random_document(seed, n_words=600, n_entities=40):
+    import random
+
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice("abcdefg") for _ in range(rng.randint(2, 4))) for _ in range(120)]
+    text = " ".join(rng.choice(vocab) for _ in range(n_words))
+    names = [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 2))) for _ in range(n_entities)]
+    names += names[:3]  # doublons de candidats
+    return [{"text": name.upper()} for name in names], text
+
+
+def test_sparse_cooccurrence_graph_matches_window_loop():
+    scorer = GraphCentralityScorer()
+    for seed in range(5):
+        candidates, text = _random_document(seed)
+        graph = scorer._build_cooccurrence_graph(candidates, text)
+        edges = {tuple(sorted((u, v))): round(d["weight"], 9) for u, v, d in graph.edges(data=True)}
+        assert edges == _reference_cooccurrences(scorer, candidates, text)
+
+
+def test_centrality_is_exact_below_pivot_bound():
+    from knowbase.agents.gatekeeper.graph_centrality_scorer import betweenness_pivots
+
+    scorer = GraphCentralityScorer()
+    candidates, text = _random_document(7)
+    graph = scorer._build_cooccurrence_graph(candidates, text)
+    assert betweenness_pivots(graph.number_of_nodes(), 0.2, 0.1) >= graph.number_of_nodes()
+
+    pagerank = nx.pagerank(graph, weight="weight")
+    degree = nx.degree_centrality(graph)
+    betweenness = nx.betweenness_centrality(graph, weight="weight")
+    max_pr = max(pagerank.values())
+
+    scores = scorer._calculate_centrality(graph)
+    for node in graph:
+        expected = 0.5 * pagerank[node] / max_pr + 0.3 * degree[node] + 0.2 * betweenness[node]
+        assert scores[node] == pytest.approx(expected, abs=1e-6)
+    assert scorer.last_centrality_stats["betweenness_epsilon"] == 0.0
+
+
+def test_sampled_betweenness_within_error_bound():
+    import numpy as np
+    from scipy import sparse
+    from scipy.stats import spearmanr
+    from knowbase.agents.gatekeeper.graph_centrality_scorer import (
+        betweenness_error_bound,
+        sampled_betweenness,
+    )
+
+    graph = nx.connected_watts_strogatz_graph(400, 6, 0.1, seed=3)
+    for u, v in graph.edges():
+        graph[u][v]["weight"] = 1.0 + (u * v) % 3
+    nodes = list(graph.nodes())
+    weights = sparse.csr_matrix(nx.to_scipy_sparse_array(graph, nodelist=nodes, weight="weight"))
+
+    approx, pivots = sampled_betweenness(weights, 150)
+    exact = nx.betweenness_centrality(graph, weight="weight")
+    exact = np.array([exact[v] for v in nodes])
+
+    assert pivots == 150
+    assert np.max(np.abs(approx - exact)) <= betweenness_error_bound(400, pivots, 0.1)
+    assert spearmanr(approx, exact)[0] > 0.9
+
+
+def test_centrality_budget_applies_outside_main_thread():
+    import threading
+
+    candidates, text = _random_document(11, n_words=2000, n_entities=80)
+    scorer = GraphCentralityScorer(centrality_budget_s=0.0, pagerank_tol=1e-15)
+    result = {}
+
+    def job():
+        scorer.score_entities(candidates, text)
+        result.update(scorer.last_centrality_stats)
+
+    worker = threading.Thread(target=job)
+    worker.start()
+    worker.join()
+
+    # Échéance immédiate : 1 itération PageRank, 1 pivot de betweenness, scores quand même produits
+    assert result["budget_exhausted"] is True
+    assert result["pagerank_iterations"] == 1 and not result["pagerank_converged"]
+    assert result["betweenness_pivots"] == 1
+    assert all("centrality_score" in c for c in candidates)
@@ -0,0 +1,115 @@
+"""
+Tests du registre de routers — montage, désactivation, montage différé.
+"""
+
+from __future__ import annotations
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from knowbase.api import router_registry
+from knowbase.api.router_registry import ROUTER_SPECS, RouterSpec, include_routers
+
+ROUTERS_DIR = Path(router_registry.__file__).with_name("routers")
+
+
+@pytest.fixture
+def fake_routers(monkeypatch):
+    """Modules de routers factices enregistrés sous knowbase.api.routers."""
+    imported = []
+
+    def make(name, prefix, path="/ping"):
+        module = types.ModuleType(f"{router_registry.ROUTERS_PACKAGE}.{name}")
+        router = APIRouter(prefix=prefix)
+
+        @router.get(path)
+        def ping():
+            return {"router": name}
+
+        module.router = router
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+        imported.append(name)
+        return module
+
+    return make
+
+
+def _paths(app):
+    return {getattr(route, "path", None) for route in app.routes}
+
+
+def test_registry_covers_existing_modules():
+    modules = [spec.module for spec in ROUTER_SPECS]
+
+    assert len(modules) == len(set(modules))
+    for module in modules:
+        assert (ROUTERS_DIR / f"{module}.py").exists(), module
+    assert {"search", "ingest", "runtime_v5", "referentiel"} <= set(modules)
+
+
+def test_include_routers_mounts_in_order_and_skips_disabled(fake_routers):
+    fake_routers("_fake_a", "/a")
+    fake_routers("_fake_b", "/b")
+    fake_routers("_fake_c", "/c")
+    specs = [
+        RouterSpec("_fake_a", "/api"),
+        RouterSpec("_fake_b", group="legacy"),
+        RouterSpec("_fake_c"),
+    ]
+    app = FastAPI()
+
+    report = include_routers(app, specs, disabled="legacy", lazy="")
+
+    assert {"/api/a/ping", "/c/ping"} <= _paths(app)
+    assert "/b/ping" not in _paths(app)
+    assert list(report.import_s) == ["_fake_a", "_fake_c"]
+    assert report.disabled == ["_fake_b"]
+
+
+def test_lazy_router_mounted_on_first_matching_request(fake_routers):
+    fake_routers("_fake_eager", "/eager")
+    lazy_module = fake_routers("_fake_lazy", "/lazy")
+    specs = [
+        RouterSpec("_fake_eager", "/api"),
+        RouterSpec("_fake_lazy", "/api", group="legacy", path_prefix="/api/lazy"),
+    ]
+    app = FastAPI()
+    report = include_routers(app, specs, disabled="", lazy="legacy")
+
+    assert report.deferred == ["_fake_lazy"]
+    assert "/api/lazy/ping" not in _paths(app)
+
+    client = TestClient(app)
+    assert client.get("/api/eager/ping").json() == {"router": "_fake_eager"}
+    assert "/api/lazy/ping" not in _paths(app)
+
+    assert client.get("/api/lazy/ping").json() == {"router": "_fake_lazy"}
+    assert "_fake_lazy" in report.import_s
+    assert app.state.lazy_router_mounter.pending == []
+    assert lazy_module.router.prefix == "/lazy"
+
+
+def test_openapi_mounts_pending_routers(fake_routers):
+    fake_routers("_fake_docs", "/docs-lazy")
+    specs = [RouterSpec("_fake_docs", path_prefix="/docs-lazy")]
+    app = FastAPI()
+    include_routers(app, specs, disabled="", lazy="_fake_docs")
+
+    schema = TestClient(app).get("/openapi.json").json()
+
+    assert "/docs-lazy/ping" in schema["paths"]
+
+
+def test_lazy_without_path_prefix_is_mounted_eagerly(fake_routers):
+    fake_routers("_fake_noprefix", "")
+    app = FastAPI()
+
+    report = include_routers(app, [RouterSpec("_fake_noprefix")], disabled="", lazy="_fake_noprefix")
+
+    assert report.deferred == []
+    assert "/ping" in _paths(app)
@@ -0,0 +1,121 @@
+"""
+Tests du mode pipeline "overlapped" du worker ClaimFirst.
+
+Orchestrateur factice : on vérifie l'enchaînement extract → graph → vectors
+par document, la comptabilité (processed / skipped / failed) et le circuit
+breaker (arrêt de l'alimentation, documents restants).
+"""
+
+import threading
+import types
+from unittest.mock import Mock
+
+import pytest
+
+from knowbase.claimfirst import worker_job
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.lock = threading.Lock()
+
+    def hgetall(self, key):
+        with self.lock:
+            return {k.encode(): v.encode() for k, v in self.hashes.get(key, {}).items()}
+
+    def hset(self, key, mapping):
+        with self.lock:
+            self.hashes.setdefault(key, {}).update(mapping)
+
+    def get(self, key):
+        return None
+
+
+class _FakeOrchestrator:
+    def __init__(self, claims_per_doc=3, fail_graph=()):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.claims_per_doc = claims_per_doc
+        self.fail_graph = set(fail_graph)
+
+    def _log(self, stage, doc_id):
+        with self.lock:
+            self.calls.append((stage, doc_id))
+
+    def extract_stage(self, doc_id, cache_result, tenant_id=None, job_manager=None):
+        self._log("extract", doc_id)
+        return types.SimpleNamespace(doc_id=doc_id, claim_count=self.claims_per_doc, entity_count=1)
+
+    def persist_graph_stage(self, result, job_manager=None):
+        self._log("graph", result.doc_id)
+        if result.doc_id in self.fail_graph:
+            raise RuntimeError("neo4j down")
+        return result
+
+    def persist_vectors_stage(self, result, cache_result, job_manager=None):
+        self._log("vectors", result.doc_id)
+        return result
+
+
+@pytest.fixture
+def run(monkeypatch):
+    monkeypatch.setattr(
+        "knowbase.stratified.pass0.cache_loader.load_pass0_from_cache",
+        lambda path, tenant_id: types.SimpleNamespace(success=path != "broken"),
+    )
+    monkeypatch.setattr("knowbase.ingestion.resilience.JobManager", lambda: Mock())
+
+    def _run(orchestrator, doc_ids, cache_map, vllm_down=False):
+        monkeypatch.setattr(worker_job, "_vllm_confirmed_down", lambda client: vllm_down)
+        results = {
+            "processed": 0, "failed": 0, "skipped": 0,
+            "total_claims": 0, "total_entities": 0, "errors": [],
+        }
+        report = worker_job._run_overlapped_pipeline(
+            doc_ids=doc_ids,
+            orchestrator=orchestrator,
+            tenant_id="default",
+            cache_map=cache_map,
+            filename_map={},
+            results=results,
+            redis_client=_FakeRedis(),
+            neo4j_driver=None,
+            facet_registry=Mock(),
+            facet_persist_interval=10,
+            max_consecutive_empty=2,
+        )
+        return results, report
+    return _run
+
+
+def test_each_document_goes_through_stages_in_order(run):
+    orchestrator = _FakeOrchestrator(fail_graph={"d3"})
+    doc_ids = [f"d{i}" for i in range(6)]
+    cache_map = {d: f"/cache/{d}" for d in doc_ids if d != "d4"}
+    cache_map["d5"] = "broken"
+
+    results, report = run(orchestrator, doc_ids, cache_map)
+
+    assert results["processed"] == 3
+    assert results["skipped"] == 1
+    assert results["failed"] == 2
+    assert results["total_claims"] == 9
+    for doc_id in ("d0", "d1", "d2"):
+        stages = [stage for stage, d in orchestrator.calls if d == doc_id]
+        assert stages == ["extract", "graph", "vectors"]
+    assert set(report["stages"]) == {"extract", "graph", "vectors"}
+    assert report["completed"] == 3
+
+
+def test_circuit_breaker_stops_feeding(run):
+    orchestrator = _FakeOrchestrator(claims_per_doc=0)
+    doc_ids = [f"d{i}" for i in range(40)]
+
+    results, report = run(orchestrator, doc_ids, {d: d for d in doc_ids}, vllm_down=True)
+
+    assert results["circuit_breaker"] is True
+    remaining = results["remaining_doc_ids"]
+    assert remaining and remaining == doc_ids[-len(remaining):]
+    extracted = {d for stage, d in orchestrator.calls if stage == "extract"}
+    assert extracted.isdisjoint(remaining)
@@ -0,0 +1,162 @@
+"""
+Tests serveur d'embeddings partagé — micro-batching, protocole socket Unix,
+intégration EmbeddingModelManager (proxy + fallback en process).
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from knowbase.common.clients import embedding_server as es
+from knowbase.common.clients.embedding_server import (
+    EmbeddingServer,
+    EmbeddingServerClient,
+    MicroBatcher,
+    SharedEmbeddingUnavailable,
+    UnsupportedEncodeKwargs,
+    split_encode_kwargs,
+)
+
+
+class _FakeEncoder:
+    """Embedding déterministe : [len(text), premier code, normalisé?]."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, texts, normalize_embeddings=False, **kwargs):
+        with self.lock:
+            self.calls.append(list(texts))
+        return np.array(
+            [[len(t), ord(t[0]) if t else 0, float(normalize_embeddings)] for t in texts],
+            dtype=np.float32,
+        )
+
+
+def _concurrent(fn, args_list):
+    results = [None] * len(args_list)
+    barrier = threading.Barrier(len(args_list))
+
+    def run(i, args):
+        barrier.wait()
+        results[i] = fn(*args[0], **args[1])
+
+    threads = [threading.Thread(target=run, args=(i, a)) for i, a in enumerate(args_list)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestMicroBatcher:
+
+    def test_concurrent_requests_share_one_encode_call(self):
+        encoder = _FakeEncoder()
+        batcher = MicroBatcher(encoder, max_batch=64, max_wait_ms=200)
+        requests = [((["a" * (i + 1), "b"],), {}) for i in range(8)]
+
+        results = _concurrent(batcher.submit, requests)
+        batcher.close()
+
+        assert len(encoder.calls) <= 2
+        for i, result in enumerate(results):
+            assert result[:, 0].tolist() == [i + 1, 1]
+        assert batcher.stats()["requests"] == 8
+
+    def test_kwargs_groups_encoded_separately(self):
+        encoder = _FakeEncoder()
+        batcher = MicroBatcher(encoder, max_batch=64, max_wait_ms=200)
+        requests = [((["x"],), {"normalize_embeddings": i % 2 == 0}) for i in range(4)]
+
+        results = _concurrent(batcher.submit, requests)
+        batcher.close()
+
+        assert [r[0, 2] for r in results] == [1.0, 0.0, 1.0, 0.0]
+        assert all(len(set(map(len, call))) == 1 for call in encoder.calls)
+
+    def test_split_encode_kwargs(self):
+        assert split_encode_kwargs({"batch_size": 8, "normalize_embeddings": True}) == {"normalize_embeddings": True}
+        with pytest.raises(UnsupportedEncodeKwargs):
+            split_encode_kwargs({"convert_to_tensor": True})
+
+
+@pytest.fixture
+def server(tmp_path):
+    encoder = _FakeEncoder()
+    address = str(tmp_path / "emb.sock")
+    srv = EmbeddingServer(address, encoder, info_fn=lambda: {"dimension": 3}, max_wait_ms=1).start()
+    yield srv, encoder
+    srv.shutdown()
+
+
+class TestServerProtocol:
+
+    def test_round_trip_and_info(self, server):
+        srv, _ = server
+        client = EmbeddingServerClient(srv.address)
+
+        embeddings = client.encode(["hello", "hi"], normalize_embeddings=True, batch_size=4)
+
+        assert embeddings.dtype == np.float32
+        assert embeddings.tolist() == [[5, ord("h"), 1], [2, ord("h"), 1]]
+        embeddings /= 2  # modifiable, comme un encode local
+        assert client.info()["dimension"] == 3
+        assert client.encode([]).shape[0] == 0
+        client.close()
+
+    def test_server_error_and_unreachable(self, tmp_path):
+        def failing(texts, **kwargs):
+            raise ValueError("boom")
+
+        srv = EmbeddingServer(str(tmp_path / "bad.sock"), failing, max_wait_ms=1).start()
+        try:
+            with pytest.raises(SharedEmbeddingUnavailable, match="boom"):
+                EmbeddingServerClient(srv.address).encode(["x"])
+        finally:
+            srv.shutdown()
+
+        assert EmbeddingServerClient(str(tmp_path / "missing.sock")).ping(timeout=0.5) is False
+
+
+class TestManagerSharedMode:
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        from knowbase.common.clients.embeddings import EmbeddingModelManager
+
+        manager = EmbeddingModelManager()
+        local = _FakeEncoder()
+        local_model = type("LocalModel", (), {"encode": lambda self, s, **kw: local(s, **kw) * -1})()
+        monkeypatch.setattr(manager, "load_local_model", lambda: local_model)
+        monkeypatch.setattr(manager, "_shared_down_until", 0.0)
+        monkeypatch.setattr(manager, "_burst_mode", False)
+        monkeypatch.setattr(manager, "_last_burst_check", 1e18, raising=False)
+        yield manager
+        es.reset_shared_embedding_client()
+
+    def test_encode_and_get_model_go_through_server(self, server, manager, monkeypatch):
+        srv, encoder = server
+        monkeypatch.setenv(es.SHARED_SOCKET_ENV, srv.address)
+        es.reset_shared_embedding_client()
+
+        assert manager.encode(["abc"])[0, 0] == 3
+        model = manager.get_model()
+        assert model.encode("abcd")[0] == 4
+        assert model.get_sentence_embedding_dimension() == 3
+        assert len(encoder.calls) == 2
+
+        # kwarg non servable : local, serveur toujours utilisable
+        assert manager.encode(["abc"], convert_to_tensor=False)[0, 0] == -3
+        assert manager._shared_down_until == 0.0
+
+    def test_falls_back_to_local_when_server_down(self, manager, monkeypatch, tmp_path):
+        monkeypatch.setenv(es.SHARED_SOCKET_ENV, str(tmp_path / "down.sock"))
+        es.reset_shared_embedding_client()
+
+        assert manager.encode(["abc"])[0, 0] == -3
+        assert manager._shared_down_until > 0
+        # Pendant la fenêtre de retry, plus de tentative réseau
+        assert manager._shared_client() is None
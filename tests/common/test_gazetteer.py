@@ -0,0 +1,95 @@
+"""
+Tests du gazetteer compilé (knowbase.common.gazetteer).
+
+- Sans word_boundary : mêmes résultats que `form.lower() in text.lower()`
+- word_boundary / accent_fold : bornes de mots, diacritiques
+- Spans exprimés dans le texte d'origine
+"""
+
+import random
+
+from knowbase.common.gazetteer import GazetteerHit, GazetteerMatcher
+
+
+def _naive_positions(forms, text):
+    text_lower = text.lower()
+    hits = []
+    for order, form in enumerate(forms):
+        start = text_lower.find(form, 0)
+        while start != -1:
+            hits.append((start, order))
+            start = text_lower.find(form, start + 1)
+    return sorted(hits)
+
+
+class TestSubstringSemantics:
+
+    def test_matches_naive_find_loop_on_random_texts(self):
+        rng = random.Random(3)
+        alphabet = "ab c"
+        forms = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)})
+        forms = [f for f in forms if f.strip()]
+        matcher = GazetteerMatcher()
+        for form in forms:
+            matcher.add(form, form.upper())
+
+        for _ in range(50):
+            text = "".join(rng.choice(alphabet + "AB") for _ in range(rng.randint(0, 60)))
+            expected = [(start, forms[order]) for start, order in _naive_positions(forms, text)]
+            assert [(h.start, h.key) for h in matcher.find_all(text)] == expected
+
+    def test_keys_in_follows_form_registration_order(self):
+        matcher = GazetteerMatcher()
+        matcher.add_many("p1", ["hana", "sap hana"])
+        matcher.add("p2", "SAP")
+        matcher.add("p3", "hana")
+
+        assert matcher.keys_in("SAP HANA Cloud") == {"p1": "hana", "p3": "hana", "p2": "sap"}
+        assert list(matcher.keys_in("SAP HANA Cloud")) == ["p1", "p3", "p2"]
+        assert matcher.keys_in("nothing here") == {}
+
+    def test_duplicate_registrations_and_empty_forms(self):
+        matcher = GazetteerMatcher()
+        matcher.add("c", "hana")
+        matcher.add("c", "HANA")
+        matcher.add("c", "")
+        matcher.add("c", None)
+
+        assert len(matcher) == 1
+        assert matcher.find_all("hana") == [GazetteerHit("c", "hana", 0, 4)] * 2
+
+
+class TestOptions:
+
+    def test_word_boundary(self):
+        matcher = GazetteerMatcher.from_forms({"sap": ["SAP"], "cpp": ["C++"]}, word_boundary=True)
+
+        assert [h.start for h in matcher.find_all("SAP sapphire (SAP) SAP_X")] == [0, 14]
+        assert [h.key for h in matcher.find_all("uses C++17 and c++")] == ["cpp", "cpp"]
+        assert matcher.find_all("abc++") == []
+
+    def test_accent_fold(self):
+        matcher = GazetteerMatcher.from_forms({"s": ["schéma"]}, accent_fold=True)
+
+        assert matcher.find_all("Le SCHEMA et le Schéma") == [
+            GazetteerHit("s", "schema", 3, 9),
+            GazetteerHit("s", "schema", 16, 22),
+        ]
+        assert GazetteerMatcher().find_all("schema") == []
+
+    def test_spans_refer_to_original_text(self):
+        text = "Cédric et İstanbul — Cédric"
+        matcher = GazetteerMatcher.from_forms({"c": ["cedric"]}, accent_fold=True)
+
+        assert [text[h.start:h.end] for h in matcher.find_all(text)] == ["Cédric", "Cédric"]
+
+        matcher = GazetteerMatcher.from_forms({"i": ["stanbul"], "e": ["et"]})
+        assert [text[h.start:h.end] for h in matcher.find_all(text)] == ["et", "stanbul"]
+
+    def test_lazy_recompile_after_add(self):
+        matcher = GazetteerMatcher()
+        matcher.add("a", "alpha")
+        assert matcher.keys_in("alpha beta") == {"a": "alpha"}
+
+        matcher.add("b", "beta")
+        assert matcher.keys_in("alpha beta") == {"a": "alpha", "b": "beta"}
@@ -180,6 +180,48 @@ class TestLLMRouter:
             assert result == "fallback response"
 
 
+class TestCallInstrumentation:
+    """Latence/erreurs des _call_<provider> envoyées au token tracker."""
+
+    @patch('knowbase.common.llm_router.get_settings')
+    def test_provider_call_records_latency(self, mock_settings, mock_config, mock_available_providers):
+        mock_settings.return_value = Mock()
+
+        with patch.object(LLMRouter, '_load_config', return_value=mock_config), \
+             patch.object(LLMRouter, '_detect_available_providers', return_value=mock_available_providers), \
+             patch('knowbase.common.llm_router.track_tokens'), \
+             patch('knowbase.common.llm_router.track_llm_call') as mock_track:
+            router = LLMRouter()
+            router._get_deepinfra_client = Mock(return_value=Mock(chat=Mock(completions=Mock(create=Mock(
+                return_value=Mock(choices=[Mock(message=Mock(content="ok"))],
+                                  usage=Mock(prompt_tokens=10, completion_tokens=5))
+            )))))
+
+            router._call_deepinfra("Qwen/Qwen3-14B", [{"role": "user", "content": "x"}], 0.0, 16,
+                                   TaskType.KNOWLEDGE_EXTRACTION)
+
+            args, kwargs = mock_track.call_args
+            assert args[0] == "deepinfra/Qwen/Qwen3-14B"
+            assert args[1] == TaskType.KNOWLEDGE_EXTRACTION.value
+            assert kwargs["provider"] == "deepinfra"
+            assert kwargs["error_type"] is None
+
+    @patch('knowbase.common.llm_router.get_settings')
+    def test_provider_call_records_error(self, mock_settings, mock_config, mock_available_providers):
+        mock_settings.return_value = Mock()
+
+        with patch.object(LLMRouter, '_load_config', return_value=mock_config), \
+             patch.object(LLMRouter, '_detect_available_providers', return_value=mock_available_providers), \
+             patch('knowbase.common.llm_router.track_llm_call') as mock_track:
+            router = LLMRouter()
+            router._get_deepinfra_client = Mock(side_effect=TimeoutError("slow"))
+
+            with pytest.raises(TimeoutError):
+                router._call_deepinfra("Qwen/Qwen3-14B", [], 0.0, 16, TaskType.KNOWLEDGE_EXTRACTION)
+
+            assert mock_track.call_args.kwargs["error_type"] == "TimeoutError"
+
+
 class TestTaskType:
     """Tests pour l'enum TaskType."""
 
@@ -0,0 +1,77 @@
+"""
+Tests préchargement par rôle (knowbase.common.preload) et profil d'import
+(knowbase.common.startup_profile).
+"""
+
+import pytest
+
+from knowbase.common import preload
+from knowbase.common.preload import get_preload_list, run_preloads
+from knowbase.common.startup_profile import parse_importtime, profile_imports
+
+
+class TestPreloadList:
+
+    def test_role_defaults(self, monkeypatch):
+        monkeypatch.delenv("OSMOSE_PRELOAD_PASS2_WORKER", raising=False)
+
+        assert get_preload_list("pass2_worker") == list(preload.ROLE_PRELOADS["pass2_worker"])
+        assert "embeddings" not in get_preload_list("pass2_worker")
+        assert get_preload_list("unknown_role") == []
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("OSMOSE_PRELOAD_API", " OpenAI , reranker ")
+        assert get_preload_list("api") == ["openai", "reranker"]
+
+        monkeypatch.setenv("OSMOSE_PRELOAD_API", "none")
+        assert get_preload_list("api") == []
+
+    def test_process_role(self, monkeypatch):
+        monkeypatch.delenv(preload.PROCESS_ROLE_ENV, raising=False)
+        assert preload.get_process_role("ingestion_worker") == "ingestion_worker"
+
+        monkeypatch.setenv(preload.PROCESS_ROLE_ENV, "PASS2_WORKER")
+        assert preload.get_process_role("ingestion_worker") == "pass2_worker"
+
+
+class TestRunPreloads:
+
+    def test_runs_selected_in_order_and_skips_unknown(self, monkeypatch):
+        monkeypatch.setenv("OSMOSE_PRELOAD_API", "b,missing,a")
+        calls = []
+        preloaders = {name: (lambda n=name: calls.append(n)) for name in ("a", "b", "c")}
+
+        report = run_preloads("api", preloaders)
+
+        assert calls == ["b", "a"]
+        assert list(report.timings) == ["b", "a"]
+        assert report.unknown == ["missing"]
+        assert report.rss_mb > 0
+
+    def test_errors_propagate(self):
+        def fail():
+            raise RuntimeError("qdrant down")
+
+        with pytest.raises(RuntimeError, match="qdrant down"):
+            run_preloads("api", {"qdrant": fail}, items=["qdrant"])
+
+
+class TestStartupProfile:
+
+    def test_parse_importtime(self):
+        lines = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     colorsys",
+            "import time:      2500 |       4000 | json",
+            "not an importtime line",
+        ]
+
+        assert parse_importtime(lines) == [("colorsys", 0.00012, 0.00012), ("json", 0.0025, 0.004)]
+
+    def test_profile_imports_in_fresh_interpreter(self):
+        costs = profile_imports(["colorsys", "no_such_module_xyz"], top=3)
+
+        assert [c.module for c in costs] == ["colorsys", "no_such_module_xyz"]
+        assert costs[0].error is None and costs[0].seconds >= 0
+        assert any(name == "colorsys" for name, _ in costs[0].top_dependencies)
+        assert "ModuleNotFoundError" in costs[1].error
@@ -223,7 +223,8 @@ class TestAddUsage:
             output_tokens=50
         )
 
-        # Check file was written
+        # Check file was written (writer thread)
+        token_tracker_with_file.flush()
         assert token_tracker_with_file.log_file.exists()
 
         # Parse file content
@@ -506,6 +507,7 @@ class TestFileLogging:
     ) -> None:
         """Adding usage should create log file."""
         token_tracker_with_file.add_usage("gpt-4o", "test", 100, 50)
+        token_tracker_with_file.flush()
         assert token_tracker_with_file.log_file.exists()
 
     def test_file_logging_appends_jsonl(
@@ -514,6 +516,7 @@ class TestFileLogging:
         """Multiple usages should append to file."""
         token_tracker_with_file.add_usage("gpt-4o", "task1", 100, 50)
         token_tracker_with_file.add_usage("claude-3.5-sonnet", "task2", 200, 100)
+        token_tracker_with_file.flush()
 
         with open(token_tracker_with_file.log_file) as f:
             lines = f.readlines()
@@ -538,6 +541,7 @@ class TestFileLogging:
             output_tokens=500,
             context="slide_1"
         )
+        token_tracker_with_file.flush()
 
         with open(token_tracker_with_file.log_file) as f:
             entry = json.loads(f.readline())
@@ -587,7 +591,7 @@ class TestUtilityFunctions:
             )
 
             mock_tracker.add_usage.assert_called_once_with(
-                "gpt-4o", "test", 100, 50, "test_context"
+                "gpt-4o", "test", 100, 50, "test_context", None
             )
 
 
@@ -633,3 +637,80 @@ class TestModelPricingAccuracy:
 
         # Smaller models should generally be cheaper
         assert pricing["qwen2.5:7b"].input_price_per_1k < pricing["qwen2.5:32b"].input_price_per_1k
+
+
+# ============================================
+# Test Bounded Aggregates
+# ============================================
+
+class TestBoundedAggregates:
+    """Tests for rolling aggregates and bounded history."""
+
+    def test_history_is_bounded_but_totals_exact(self) -> None:
+        """History keeps a window, aggregates keep exact totals."""
+        tracker = TokenTracker(log_file=None, history_max=10)
+        for _ in range(100):
+            tracker.add_usage("gpt-4o", "task", 1000, 1000)
+
+        assert len(tracker.usage_history) <= 10 + 10 // 4 + 1
+        assert tracker.get_stats_by_model()["gpt-4o"]["total_calls"] == 100
+        assert tracker.get_total_cost() == pytest.approx(100 * 0.02, rel=1e-6)
+
+    def test_session_stats_reset_on_start_session(self, token_tracker: TokenTracker) -> None:
+        """start_session should only reset the session view."""
+        token_tracker.add_usage("gpt-4o", "task", 100, 50)
+        token_tracker.start_session()
+        token_tracker.add_usage("gpt-4o-mini", "task", 100, 50)
+
+        assert set(token_tracker.get_session_stats()) == {"gpt-4o-mini"}
+        assert set(token_tracker.get_stats_by_model()) == {"gpt-4o", "gpt-4o-mini"}
+
+    def test_stats_by_task_type(self, token_tracker: TokenTracker) -> None:
+        """Stats should group by task type across models."""
+        token_tracker.add_usage("gpt-4o", "extraction", 100, 50)
+        token_tracker.add_usage("gpt-4o-mini", "extraction", 100, 50)
+        token_tracker.add_usage("gpt-4o", "summary", 100, 50)
+
+        stats = token_tracker.get_stats_by_task_type()
+        assert stats["extraction"]["total_calls"] == 2
+        assert stats["summary"]["total_calls"] == 1
+
+    def test_record_call_latency_and_errors(self, token_tracker: TokenTracker) -> None:
+        """record_call should feed latency percentiles and error counts."""
+        token_tracker.add_usage("deepinfra/Qwen/Qwen3-14B", "extraction", 100, 50)
+        for latency in (1.0, 2.0, 3.0):
+            token_tracker.record_call("deepinfra/Qwen/Qwen3-14B", "extraction", latency)
+        token_tracker.record_call("deepinfra/Qwen/Qwen3-14B", "extraction", 9.0, error_type="Timeout")
+
+        (agg,) = token_tracker.get_aggregates()
+        assert agg["provider"] == "deepinfra"
+        assert agg["calls"] == 1
+        assert agg["errors"] == 1
+        assert agg["latency_p50_s"] == pytest.approx(3.0)
+
+    def test_usage_and_calls_share_caller_provider(self, token_tracker: TokenTracker) -> None:
+        """A provider given by the router must key both tokens and latency."""
+        # SageMaker-hosted model whose name alone resolves to "unknown"
+        token_tracker.add_usage("qwen-14b-endpoint", "extraction", 100, 50, provider="sagemaker")
+        token_tracker.record_call("qwen-14b-endpoint", "extraction", 1.5, provider="sagemaker")
+
+        (agg,) = token_tracker.get_aggregates()
+        assert agg["provider"] == "sagemaker"
+        assert agg["calls"] == 1
+        assert agg["latency_p50_s"] == pytest.approx(1.5)
+
+    def test_provider_for_model(self, token_tracker: TokenTracker) -> None:
+        """Provider should come from router prefix or pricing table."""
+        assert token_tracker.provider_for_model("burst/Qwen/Qwen3-14B-AWQ") == "burst"
+        assert token_tracker.provider_for_model("ollama/qwen2.5:14b") == "ollama"
+        assert token_tracker.provider_for_model("claude-3-haiku") == "anthropic"
+        assert token_tracker.provider_for_model("gpt-4.1") == "openai"
+
+    def test_reset_clears_everything(self, token_tracker: TokenTracker) -> None:
+        """reset should clear history and aggregates."""
+        token_tracker.add_usage("gpt-4o", "task", 100, 50)
+        token_tracker.reset()
+
+        assert token_tracker.usage_history == []
+        assert token_tracker.get_total_cost() == 0.0
+        assert token_tracker.get_aggregates() == []
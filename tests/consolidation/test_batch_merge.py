@@ -0,0 +1,119 @@
+"""
+Tests pour l'exécution batch des merges Corpus ER.
+
+Tests:
+- MergeChainResolver: union-find, chaînes A->B->C, doublons, cycles
+- MergeStore.execute_merges_batch: regroupement UNWIND, métadonnées de rollback
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from knowbase.consolidation.merge_chains import resolve_merge_chains
+from knowbase.consolidation.merge_store import MergeStore, TYPED_EDGE_TYPES
+from knowbase.consolidation.types import MergeRequest
+
+
+def _req(source_id, target_id):
+    return MergeRequest(
+        source_id=source_id,
+        target_id=target_id,
+        lex_score=0.99,
+        sem_score=0.95,
+        compat_score=1.0,
+        merge_reason="test",
+    )
+
+
+class TestMergeChainResolver:
+
+    def test_chain_collapses_to_final_target(self):
+        resolution = resolve_merge_chains([_req("A", "B"), _req("B", "C"), _req("C", "D")])
+        targets = {m.source_id: m.target_id for m in resolution.merges}
+        assert targets == {"A": "D", "B": "D", "C": "D"}
+        assert resolution.clusters == {"D": ["A", "B", "C"]}
+        assert [m.collapsed for m in resolution.merges] == [True, True, False]
+
+    def test_chain_declared_in_reverse_order(self):
+        resolution = resolve_merge_chains([_req("B", "C"), _req("A", "B")])
+        targets = {m.source_id: m.target_id for m in resolution.merges}
+        assert targets == {"A": "C", "B": "C"}
+
+    def test_duplicate_source_keeps_first_decision(self):
+        resolution = resolve_merge_chains([_req("A", "B"), _req("A", "C")])
+        assert [(m.source_id, m.target_id) for m in resolution.merges] == [("A", "B")]
+        assert [(r.source_id, r.target_id) for r in resolution.skipped] == [("A", "C")]
+        # B et C restent indépendants
+        assert "C" not in resolution.clusters
+
+    def test_cycle_is_skipped(self):
+        resolution = resolve_merge_chains([_req("A", "B"), _req("B", "A"), _req("C", "C")])
+        assert [(m.source_id, m.target_id) for m in resolution.merges] == [("A", "B")]
+        assert len(resolution.skipped) == 2
+
+    def test_cluster_ids(self):
+        resolution = resolve_merge_chains([_req("A", "C"), _req("B", "C")])
+        assert resolution.cluster_ids("C") == ["C", "A", "B"]
+
+
+class TestExecuteMergesBatch:
+
+    @pytest.fixture
+    def store(self):
+        with patch("knowbase.consolidation.merge_store.get_settings"), \
+             patch("knowbase.consolidation.merge_store.Neo4jClient"):
+            store = MergeStore(tenant_id="default")
+        store._execute_query = MagicMock(side_effect=self._fake_query)
+        return store
+
+    @staticmethod
+    def _fake_query(query, params):
+        rows = params["merges"]
+        if "CREATE (source)-[:MERGED_INTO" in query:
+            # Le concept "missing" n'existe pas
+            return [{"source_id": m["source_id"]} for m in rows if m["source_id"] != "missing"]
+        if "-[r:REQUIRES]->(other" in query:
+            return [{"source_id": m["source_id"], "count": 2} for m in rows]
+        if "INSTANCE_OF" in query:
+            return [{"source_id": m["source_id"], "count": 1} for m in rows]
+        return []
+
+    def test_grouped_transactions_and_rollback_metadata(self, store):
+        requests = [_req("A", "B"), _req("B", "C"), _req("missing", "C")]
+        results, stats = store.execute_merges_batch(requests)
+
+        calls = store._execute_query.call_args_list
+        # 1 création + 2 par type d'arête + INSTANCE_OF + MENTIONED_IN
+        assert len(calls) == 1 + 2 * len(TYPED_EDGE_TYPES) + 2
+        assert stats.transactions == len(calls)
+
+        create_query, create_params = calls[0].args
+        assert "merged_into_id = m.target_id" in create_query
+        assert "merged_from" in create_query
+        rows = {m["source_id"]: m for m in create_params["merges"]}
+        assert rows["A"]["target_id"] == "C"
+        assert rows["A"]["decided_target_id"] == "B"
+
+        _, rewire_params = calls[1].args
+        assert {m["source_id"] for m in rewire_params["merges"]} == {"A", "B"}
+        assert all(m["cluster_ids"] == ["C", "A", "B", "missing"] for m in rewire_params["merges"])
+        assert "rewired_from = m.source_id" in calls[1].args[0]
+
+        by_source = {r.source_id: r for r in results}
+        assert by_source["A"].success and by_source["A"].target_id == "C"
+        assert by_source["A"].edges_rewired == 2
+        assert by_source["A"].instance_of_rewired == 1
+        assert not by_source["missing"].success
+
+        assert stats.merges == 2
+        assert stats.failed == 1
+        assert stats.chains_collapsed == 1
+        assert stats.edges_rewired == 4
+        assert stats.merges_per_s > 0
+
+    def test_chunking(self, store):
+        requests = [_req(f"S{i}", "T") for i in range(5)]
+        results, stats = store.execute_merges_batch(requests, batch_size=2)
+        assert stats.merges == 5
+        assert stats.transactions == 3 * (1 + 2 * len(TYPED_EDGE_TYPES) + 2)
@@ -0,0 +1,123 @@
+"""
+Tests pour le similarity join du blocking CorpusER.
+
+Le moteur doit produire EXACTEMENT les mêmes paires que l'ancien scan O(K²) :
+- lex_keys : |Δlen| <= 5 et Jaro-Winkler >= 0.85
+- acronymes : is_acronym_of pour chaque (groupe d'acronymes × concept)
+"""
+
+import random
+import string
+
+import pytest
+
+from knowbase.consolidation.lex_utils import (
+    compute_lex_key,
+    extract_acronym,
+    is_acronym_of,
+    lex_score,
+)
+from knowbase.consolidation.similarity_join import (
+    AcronymIndex,
+    LexKeySimilarityJoin,
+    find_acronym_pairs,
+)
+
+
+def _brute_force_lex_pairs(keys, threshold=0.85, max_len_diff=5):
+    pairs = []
+    for i, key_a in enumerate(keys):
+        for j in range(i + 1, len(keys)):
+            key_b = keys[j]
+            if abs(len(key_a) - len(key_b)) > max_len_diff:
+                continue
+            if lex_score(key_a, key_b) >= threshold:
+                pairs.append((i, j))
+    return pairs
+
+
+def _brute_force_acronym_pairs(names, acronym_groups):
+    pairs = []
+    for acronym, members in acronym_groups.items():
+        for i, name in enumerate(names):
+            if i in members:
+                continue
+            if is_acronym_of(acronym, name):
+                pairs.append((acronym, i))
+    return pairs
+
+
+def _random_keys(n, seed):
+    rng = random.Random(seed)
+    vocab = [
+        "sales", "order", "management", "material", "ledger", "general",
+        "data", "protection", "cloud", "platform", "business", "warehouse",
+        "extended", "planning", "integration", "suite", "identity", "access",
+    ]
+    keys = set()
+    while len(keys) < n:
+        words = rng.sample(vocab, rng.randint(1, 3))
+        key = " ".join(words)
+        # Variantes typographiques
+        if rng.random() < 0.5 and len(key) > 3:
+            pos = rng.randrange(len(key))
+            key = key[:pos] + rng.choice(string.ascii_lowercase) + key[pos + 1:]
+        if rng.random() < 0.2:
+            key = key[:-1]
+        keys.add(compute_lex_key(key))
+    return sorted(k for k in keys if k)
+
+
+class TestLexKeySimilarityJoin:
+    """Le join doit être exact."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_identical_to_brute_force(self, seed):
+        keys = _random_keys(400, seed)
+        join = LexKeySimilarityJoin(threshold=0.85, max_len_diff=5)
+
+        assert join.join(keys) == _brute_force_lex_pairs(keys)
+        assert join.stats["pairs_verified"] < join.stats["pairs_in_window"]
+
+    def test_short_and_transposed_keys(self):
+        keys = ["ab", "ba", "abc", "abcd", "badc", "gdpr", "gpdr", "s4hana", "s 4hana", "x"]
+        assert LexKeySimilarityJoin().join(keys) == _brute_force_lex_pairs(keys)
+
+    def test_empty_keys_ignored(self):
+        assert LexKeySimilarityJoin().join(["", "abc", ""]) == []
+
+
+class TestAcronymIndex:
+    """L'index des initiales doit reproduire is_acronym_of."""
+
+    NAMES = [
+        "GDPR",
+        "General Data Protection Regulation",
+        "EU General Data Protection Regulation",
+        "Network Information Security",
+        "NIS2",
+        "SAP Business Technology Platform (BTP)",
+        "Business Technology Platform",
+        "Artificial Intelligence",
+        "AI",
+        "Single",
+        "2 Factor Authentication",
+        "FA",
+    ]
+
+    def test_identical_to_brute_force(self):
+        groups = {}
+        for i, name in enumerate(self.NAMES):
+            acronym = extract_acronym(name)
+            if acronym:
+                groups.setdefault(acronym, []).append(i)
+
+        assert find_acronym_pairs(self.NAMES, groups) == _brute_force_acronym_pairs(
+            self.NAMES, groups
+        )
+
+    def test_match(self):
+        index = AcronymIndex(["GDPR", "NIS2", "AI"])
+        assert index.match("General Data Protection Regulation") == {"GDPR"}
+        assert index.match("Network Information Security") == {"NIS2"}
+        assert index.match("Single") == set()
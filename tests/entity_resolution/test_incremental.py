@@ -0,0 +1,244 @@
+"""
+Tests for Phase 2.12 v1.2 - Incremental Entity Resolution.
+
+Tests:
+- BlockingIndex: same lexical blocking as CandidateFinder, merges, persistence
+- IncrementalEntityResolver: delta-only resolution against the standing index
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from knowbase.entity_resolution.blocking_index import BlockingIndex
+from knowbase.entity_resolution.candidate_finder import CandidateFinder
+from knowbase.entity_resolution.incremental import IncrementalEntityResolver
+from knowbase.entity_resolution.pipeline import PipelineResult
+from knowbase.entity_resolution.types import ConceptType, MergeResult, SignalBreakdown
+
+
+class _DictRedis:
+    """Minimal in-memory stand-in for the Redis hash commands used by the index."""
+
+    def __init__(self):
+        self.data = {}
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hincrby(self, key, field, amount=1):
+        bucket = self.data.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.data.get(key, {}).pop(field, None)
+
+    def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    def exists(self, key):
+        return int(key in self.data)
+
+
+def _concept(cid, name, ctype="ENTITY", forms=None):
+    return {
+        "id": cid,
+        "name": name,
+        "type": ctype,
+        "surface_forms": forms or [name],
+        "definition": None,
+    }
+
+
+CONCEPTS = [
+    _concept("c1", "GDPR"),
+    _concept("c2", "General Data Protection Regulation"),
+    _concept("c3", "General Ledger"),
+    _concept("c4", "SAP S/4HANA"),
+    _concept("c5", "SAP BTP"),
+    _concept("c6", "Business Technology Platform"),
+    _concept("c7", "BTP"),
+    _concept("c8", "ab"),
+]
+
+
+@pytest.fixture
+def finder():
+    return CandidateFinder(
+        neo4j_client=MagicMock(), qdrant_client=MagicMock(), tenant_id="t1"
+    )
+
+
+class TestBlockingIndex:
+    """BlockingIndex must block exactly like CandidateFinder."""
+
+    def test_lexical_candidates_match_candidate_finder(self, finder):
+        finder._build_blocking_indices(CONCEPTS)
+        by_id = {c["id"]: c for c in CONCEPTS}
+
+        index = BlockingIndex(tenant_id="t1", persist=False)
+        index.rebuild(CONCEPTS)
+
+        for concept in CONCEPTS:
+            expected = finder._find_lexical_candidates(concept, by_id)
+            assert index.lexical_candidates(concept) == expected, concept["name"]
+
+    def test_apply_merge_removes_source_and_folds_aliases(self):
+        index = BlockingIndex(tenant_id="t1", persist=False)
+        index.rebuild(CONCEPTS)
+
+        index.apply_merge("c2", "c1", migrated_aliases=["EU GDPR"])
+
+        assert "c1" not in index
+        assert "GDPR" in index.concepts["c2"]["surface_forms"]
+        assert "EU GDPR" in index.concepts["c2"]["surface_forms"]
+        assert "c1" not in index.lexical_candidates(index.concepts["c2"])
+
+    def test_persistence_roundtrip(self):
+        redis_client = _DictRedis()
+        index = BlockingIndex(tenant_id="t1", redis_client=redis_client)
+        index.rebuild(CONCEPTS)
+        index.remove_concepts(["c8"])
+
+        reloaded = BlockingIndex(tenant_id="t1", redis_client=redis_client)
+        assert reloaded.load() is True
+        assert set(reloaded.concepts) == set(index.concepts)
+        for concept in reloaded.concepts.values():
+            assert reloaded.lexical_candidates(concept) == index.lexical_candidates(concept)
+
+    def test_warm_index_reloads_after_remote_write(self):
+        redis_client = _DictRedis()
+        worker_a = BlockingIndex(tenant_id="t1", redis_client=redis_client)
+        worker_a.rebuild(CONCEPTS)
+        worker_b = BlockingIndex(tenant_id="t1", redis_client=redis_client)
+        assert worker_b.load() is True
+
+        # Own writes keep the warm copy in sync (no reload)
+        worker_a.add_concepts([_concept("c9", "GDPR Fines")])
+        assert worker_a.load() is True
+        assert worker_a._version == int(redis_client.hget(f"{worker_a.prefix}meta", "version"))
+
+        # Worker B sees A's write and A's merge
+        assert "c9" not in worker_b
+        assert worker_b.load() is True
+        assert "c9" in worker_b
+        worker_a.apply_merge("c2", "c1")
+        worker_b.load()
+        assert "c1" not in worker_b
+        assert "GDPR" in worker_b.concepts["c2"]["surface_forms"]
+
+        # A write from B while A is warm: A's next load re-reads Redis
+        worker_b.remove_concepts(["c8"])
+        worker_a.add_concepts([_concept("c10", "SAP Analytics Cloud")])
+        assert worker_a.load() is True
+        assert "c8" not in worker_a and "c10" in worker_a
+
+    def test_load_without_persisted_index(self):
+        index = BlockingIndex(tenant_id="t1", redis_client=_DictRedis())
+        assert index.load() is False
+
+
+class TestIncrementalEntityResolver:
+    """Delta-only resolution."""
+
+    @pytest.fixture
+    def resolver(self, finder):
+        finder._find_semantic_candidates = MagicMock(return_value=set())
+        finder._load_concepts = MagicMock(return_value=CONCEPTS[:-1])
+        finder._load_concepts_by_ids = MagicMock(
+            return_value=[_concept("n1", "GDPR Compliance")]
+        )
+
+        pipeline = MagicMock()
+        pipeline.candidate_finder = finder
+
+        def _process(candidates, result, dry_run=False, skip_reject_filter=False,
+                     merge_listener=None):
+            result.merge_results = [
+                MergeResult(
+                    success=True,
+                    survivor_id="c1",
+                    merged_id="n1",
+                    merge_reason="test",
+                    similarity_score=0.99,
+                    signals=SignalBreakdown(),
+                )
+            ]
+            merge_listener(result.merge_results)
+
+        pipeline._process_candidates.side_effect = _process
+        index = BlockingIndex(tenant_id="t1", redis_client=_DictRedis())
+        return IncrementalEntityResolver(
+            tenant_id="t1", pipeline=pipeline, blocking_index=index
+        )
+
+    def test_bootstraps_once_then_resolves_delta_only(self, resolver, finder):
+        result = resolver.resolve_new_concepts(["n1"])
+
+        assert finder._load_concepts.call_count == 1
+        assert result.candidates_generated == 1
+        candidates = resolver.pipeline._process_candidates.call_args[0][0]
+        pair = {candidates[0].concept_a_id, candidates[0].concept_b_id}
+        assert pair == {"n1", "c1"}  # prefix block "gdp"
+
+        # Merge applied to the standing index
+        assert "n1" not in resolver.index
+
+        resolver.resolve_new_concepts(["n1"])
+        assert finder._load_concepts.call_count == 1
+
+    def test_full_sweep_rebuilds_index(self, resolver, finder):
+        resolver.pipeline.run.return_value = PipelineResult()
+        assert resolver.is_full_sweep_due() is True
+
+        resolver.full_sweep()
+
+        assert finder._load_concepts.call_count == 1
+        assert len(resolver.index) == len(CONCEPTS) - 1
+        assert resolver.is_full_sweep_due() is False
+
+    def test_concept_type_filters_the_delta(self, resolver, finder):
+        result = resolver.resolve_new_concepts(["n1"], concept_type=ConceptType.STANDARD)
+
+        assert result.candidates_generated == 0
+        resolver.pipeline._process_candidates.assert_not_called()
+        assert "n1" in resolver.index  # still indexed for later deltas
+
+    def test_register_concept_ids_only_when_index_exists(self, resolver, finder):
+        assert resolver.register_concept_ids(["n1"]) == 0
+        finder._load_concepts_by_ids.assert_not_called()
+
+        resolver.ensure_index()
+        assert resolver.register_concept_ids(["n1", "n1"]) == 1
+        assert "n1" in resolver.index
+
+
+def test_pipeline_merges_reach_the_tenant_index(monkeypatch):
+    from knowbase.entity_resolution import incremental
+    from knowbase.entity_resolution.pipeline import EntityResolutionPipeline
+
+    index = BlockingIndex(tenant_id="t1", persist=False)
+    index.rebuild(CONCEPTS)
+    monkeypatch.setitem(
+        incremental._incremental_instances, "t1",
+        IncrementalEntityResolver(tenant_id="t1", pipeline=MagicMock(), blocking_index=index),
+    )
+
+    pipeline = EntityResolutionPipeline.__new__(EntityResolutionPipeline)
+    pipeline.tenant_id = "t1"
+    merge = MergeResult(
+        success=True, survivor_id="c2", merged_id="c1", merge_reason="test",
+        similarity_score=0.99, signals=SignalBreakdown(),
+    )
+    pipeline._notify_merges([merge])
+
+    assert "c1" not in index
+    assert "GDPR" in index.concepts["c2"]["surface_forms"]
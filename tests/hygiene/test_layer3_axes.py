@@ -309,3 +309,31 @@ class TestMisnamedAxisRule:
         actions = self._run_rule(axes, llm_response=llm)
         assert len(actions) >= 1
         assert actions[0].target_node_id == "ax_hetero"
+
+
+class TestAxisCatalogueInvalidation:
+    """Les fusions / suppressions d'axes invalident le catalogue runtime."""
+
+    def _action(self, action_type, **after_state):
+        return HygieneAction(
+            action_type=action_type, target_node_id="ax_src",
+            target_node_type="ApplicabilityAxis", after_state=after_state,
+            layer=3, reason="test", rule_name="test", batch_id="b", scope="tenant",
+        )
+
+    def test_merge_axis_bumps_catalogue_version(self):
+        rule = RedundantAxisRule()
+        action = self._action(HygieneActionType.MERGE_AXIS, merge_target_id="ax_tgt")
+        with patch("knowbase.retrieval.axis_catalogue.bump_axis_catalogue_version") as bump:
+            assert rule.apply_action(MagicMock(), action) is True
+        bump.assert_called_once()
+
+    def test_failed_suppress_does_not_bump(self):
+        rule = LowValueAxisRule()
+        action = self._action(HygieneActionType.SUPPRESS_AXIS)
+        driver = MagicMock()
+        session = driver.session.return_value.__enter__.return_value
+        session.run.return_value.single.return_value = None
+        with patch("knowbase.retrieval.axis_catalogue.bump_axis_catalogue_version") as bump:
+            assert rule.apply_action(driver, action) is False
+        bump.assert_not_called()
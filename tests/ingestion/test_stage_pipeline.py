@@ -0,0 +1,100 @@
+"""
+Tests StagePipeline — étages recouverts, files bornées, erreurs, arrêt.
+"""
+
+import threading
+import time
+
+from knowbase.ingestion.stage_pipeline import Stage, StagePipeline
+
+
+class _Probe:
+    """Trace les étages actifs simultanément et les items en vol."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = set()
+        self.max_active_stages = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def stage(self, name, delay, first=False, last=False):
+        def fn(payload):
+            with self.lock:
+                if first:
+                    self.in_flight += 1
+                    self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                self.active.add(name)
+                self.max_active_stages = max(self.max_active_stages, len(self.active))
+            time.sleep(delay)
+            with self.lock:
+                self.active.discard(name)
+                if last:
+                    self.in_flight -= 1
+            return payload + [name]
+        return fn
+
+
+class TestStagePipeline:
+
+    def test_items_go_through_all_stages(self):
+        done = {}
+        pipeline = StagePipeline([
+            Stage("a", lambda p: p + ["a"]),
+            Stage("b", lambda p: p + ["b"], concurrency=3),
+            Stage("c", lambda p: p + ["c"]),
+        ])
+        report = pipeline.run([[i] for i in range(20)], on_done=lambda item, v: done.__setitem__(item[0], v))
+
+        assert report.completed == 20
+        assert done == {i: [i, "a", "b", "c"] for i in range(20)}
+        assert [s.processed for s in report.stages] == [20, 20, 20]
+
+    def test_stages_overlap_with_bounded_queues(self):
+        probe = _Probe()
+        pipeline = StagePipeline([
+            Stage("extract", probe.stage("extract", 0.01, first=True)),
+            Stage("persist", probe.stage("persist", 0.03, last=True)),
+        ], queue_size=1)
+        report = pipeline.run([[i] for i in range(10)])
+
+        assert report.completed == 10
+        assert probe.max_active_stages == 2
+        # extract en cours + 1 en file + persist en cours
+        assert probe.max_in_flight <= 3
+        stats = report.to_dict()["stages"]
+        assert stats["persist"]["utilization"] > stats["extract"]["utilization"]
+        assert report.docs_per_hour > 0
+
+    def test_failed_item_is_dropped_others_continue(self):
+        errors, done = [], []
+
+        def flaky(payload):
+            if payload == 3:
+                raise ValueError("boom")
+            return payload
+
+        pipeline = StagePipeline([Stage("a", lambda p: p), Stage("b", flaky)])
+        report = pipeline.run(
+            list(range(6)),
+            on_done=lambda item, v: done.append(item),
+            on_error=lambda item, stage, exc: errors.append((item, stage, str(exc))),
+        )
+
+        assert errors == [(3, "b", "boom")]
+        assert sorted(done) == [0, 1, 2, 4, 5]
+        assert report.failed == 1 and report.stages[1].failed == 1
+
+    def test_stop_leaves_unstarted_items(self):
+        done = []
+        pipeline = StagePipeline([Stage("a", lambda p: p), Stage("b", lambda p: p)], queue_size=1)
+
+        def on_done(item, value):
+            done.append(item)
+            pipeline.stop()
+
+        report = pipeline.run(list(range(50)), on_done=on_done)
+
+        assert report.stopped
+        assert report.unstarted
+        assert sorted(done + report.unstarted) == list(range(50))
@@ -0,0 +1,186 @@
+"""
+Tests du passage batch de coréférence (Pass 0.5).
+
+- resolve_texts : mêmes clusters que resolve() texte par texte, stats
+- _SpacyPipeMixin : un seul nlp.pipe, repli par texte en cas d'erreur
+- DocumentOffsetIndex : offset → DocItem / chunk
+- Pipeline : offsets recalés par batch, plusieurs documents en un passage
+"""
+
+from unittest.mock import Mock
+
+from knowbase.ingestion.pipelines.pass05_coref import (
+    DocumentOffsetIndex,
+    Pass05Config,
+    Pass05CoreferencePipeline,
+)
+from knowbase.linguistic.coref_engine import (
+    FastCorefEngine,
+    RuleBasedEngine,
+    resolve_texts,
+)
+from knowbase.linguistic.coref_models import CoreferenceCluster
+
+
+class _FakeDoc:
+    def __init__(self, text):
+        self.text = text
+
+
+class _FakeNlp:
+    """Pipeline spaCy minimal : __call__ et pipe()."""
+
+    def __init__(self, fail_pipe=False):
+        self.pipe_calls = []
+        self.fail_pipe = fail_pipe
+
+    def __call__(self, text):
+        return _FakeDoc(text)
+
+    def pipe(self, texts, batch_size=1, n_process=1):
+        self.pipe_calls.append((list(texts), batch_size, n_process))
+        if self.fail_pipe:
+            raise RuntimeError("pipe failed")
+        return (_FakeDoc(t) for t in texts)
+
+
+class _PipeEngine(FastCorefEngine):
+    """FastCorefEngine dont le modèle est remplacé par _FakeNlp."""
+
+    def __init__(self, nlp):
+        super().__init__()
+        self._nlp = nlp
+        self._load_attempted = True
+
+    def is_available(self):
+        return True
+
+    def _clusters_from_doc(self, doc, document_text):
+        return [CoreferenceCluster(
+            mentions=[
+                {"start": 0, "end": 3, "text": document_text[:3], "sentence_idx": 0},
+                {"start": 4, "end": 6, "text": document_text[4:6], "sentence_idx": 0},
+            ],
+            method="fake",
+        )]
+
+
+class TestResolveTexts:
+
+    def test_rule_based_matches_per_text_resolve(self):
+        engine = RuleBasedEngine()
+        texts = ["The server is running. It handles requests.", "SAP HANA is fast. It scales."]
+
+        batched, stats = resolve_texts(engine, texts, lang="en")
+        expected = [engine.resolve(document_text=t, chunks=[], lang="en") for t in texts]
+
+        assert [[c.mentions for c in cl] for cl in batched] == [[c.mentions for c in cl] for cl in expected]
+        assert stats.texts == 2
+        assert stats.chars == sum(len(t) for t in texts)
+        assert stats.peak_rss_mb > 0
+
+    def test_spacy_engine_uses_single_pipe(self):
+        nlp = _FakeNlp()
+        engine = _PipeEngine(nlp)
+
+        results, _ = resolve_texts(engine, ["abc de", "xyz uv", "ijk lm"], batch_size=2, n_process=1)
+
+        assert len(nlp.pipe_calls) == 1
+        assert nlp.pipe_calls[0][1:] == (2, 1)
+        assert [r[0].mentions[0]["text"] for r in results] == ["abc", "xyz", "ijk"]
+
+    def test_pipe_failure_falls_back_per_text(self):
+        engine = _PipeEngine(_FakeNlp(fail_pipe=True))
+        results, _ = resolve_texts(engine, ["abc de", "xyz uv"])
+        assert [r[0].mentions[0]["text"] for r in results] == ["abc", "xyz"]
+
+
+class TestDocumentOffsetIndex:
+
+    def test_offsets_map_to_docitems_and_chunks(self):
+        docitems = [
+            {"item_id": "d1", "text": "Alpha beta.", "order_idx": 0},
+            {"item_id": "d_empty", "text": "", "order_idx": 1},
+            {"item_id": "d2", "text": "Gamma.", "order_idx": 2},
+            {"item_id": "d3", "text": "Delta it.", "order_idx": 5},
+        ]
+        chunks = [
+            {"chunk_id": "c2", "order_start": 4},
+            {"chunk_id": "c1", "order_start": 0},
+        ]
+        index = DocumentOffsetIndex(docitems, chunks)
+        full_text = "\n".join(d["text"] for d in docitems if d["text"])
+
+        assert index.docitem_at(full_text.index("beta")) == "d1"
+        assert index.docitem_at(full_text.index("Gamma")) == "d2"
+        assert index.docitem_at(full_text.index("it.")) == "d3"
+        assert index.chunk_at(full_text.index("Gamma")) == "c1"
+        assert index.chunk_at(full_text.index("it.")) == "c2"
+
+    def test_empty_document(self):
+        index = DocumentOffsetIndex([], [])
+        assert index.docitem_at(10) is None
+        assert index.chunk_at(10) is None
+
+
+class TestPipelineBatching:
+
+    def _pipeline(self, **config):
+        pipeline = Pass05CoreferencePipeline.__new__(Pass05CoreferencePipeline)
+        pipeline.tenant_id = "default"
+        pipeline.config = Pass05Config(enable_named_gating=False, **config)
+        return pipeline
+
+    def test_segments_of_all_documents_in_one_pass(self):
+        nlp = _FakeNlp()
+        engine = _PipeEngine(nlp)
+        pipeline = self._pipeline(fastcoref_batch_size=30, fastcoref_batch_overlap=5)
+
+        long_items = [
+            {"item_id": f"d{i}", "text": f"Item{i} is here.", "section_id": "s"} for i in range(6)
+        ]
+        docs = [
+            {"doc_id": "big", "full_text": "\n".join(d["text"] for d in long_items), "docitems": long_items},
+            {"doc_id": "small", "full_text": "Small doc.", "docitems": []},
+        ]
+
+        clusters_per_doc, stats = pipeline._resolve_documents_clusters(docs, engine, "en")
+
+        segments = pipeline._document_segments(docs[0])
+        assert len(segments) > 1
+        assert len(nlp.pipe_calls) == 1
+        assert stats.texts == len(segments) + 1
+
+        # Offsets recalés sur le texte complet du document
+        full_text = docs[0]["full_text"]
+        for cluster in clusters_per_doc[0]:
+            first = cluster.mentions[0]
+            assert full_text[first["start"]:first["end"]] == first["text"]
+        assert clusters_per_doc[1][0].mentions[0]["text"] == "Sma"
+
+    def test_process_documents_shares_engine_pass(self, monkeypatch):
+        engine = _PipeEngine(_FakeNlp())
+        monkeypatch.setattr(
+            "knowbase.ingestion.pipelines.pass05_coref.get_engine_for_language", lambda lang: engine
+        )
+        pipeline = self._pipeline(skip_if_exists=False, create_protoconcept_links=False)
+        pipeline.gating_policy = Mock()
+        pipeline.persistence = Mock()
+        pipeline.persistence.persist_coref_graph.return_value = {
+            "mention_spans": 2, "chains": 1, "links": 0, "decisions": 0,
+        }
+        pipeline._load_document_data = lambda doc_id, version: {
+            "doc_id": doc_id, "doc_version_id": version, "language": "en",
+            "full_text": f"{doc_id} is a document.",
+            "docitems": [{"item_id": f"{doc_id}-1", "text": f"{doc_id} is a document.", "order_idx": 0}],
+            "chunks": [],
+        }
+
+        results = pipeline.process_documents([("doc", "v1"), ("abc", "v2")])
+
+        assert [r.success for r in results] == [True, True]
+        assert engine._nlp.pipe_calls[0][0] == ["doc is a document.", "abc is a document."]
+        spans = pipeline.persistence.persist_coref_graph.call_args_list[1][0][0].mention_spans
+        assert {s.docitem_id for s in spans} == {"abc-1"}
+        assert results[0].coref_segments_per_s > 0
+        assert results[0].docs_per_s == results[1].docs_per_s > 0
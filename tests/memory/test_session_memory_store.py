@@ -0,0 +1,221 @@
+"""
+Tests SessionMemoryStore - mémoire de conversation bornée et partagée.
+
+Tests:
+- Chargement paresseux depuis le loader puis lecture locale / Redis
+- Partage entre deux stores (deux workers) via Redis
+- Repli des messages débordants dans le résumé (verrou, aucun message perdu)
+- LRU local borné (taille, inactivité)
+"""
+
+from knowbase.memory.session_memory_store import SessionMemoryStore
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._ops = []
+
+    def __getattr__(self, name):
+        def op(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+        return op
+
+    def execute(self):
+        ops, self._ops = self._ops, []
+        return [getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in ops]
+
+
+class _DictRedis:
+    """Sous-ensemble redis-py (decode_responses=True) utilisé par le store."""
+
+    def __init__(self):
+        self.hashes, self.lists, self.strings = {}, {}, {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def exists(self, key):
+        return int(key in self.hashes or key in self.lists)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.lists.pop(key, None)
+            self.strings.pop(key, None)
+
+    def expire(self, key, ttl):
+        return True
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        entry = self.hashes.setdefault(key, {})
+        for k, v in (mapping or {field: value}).items():
+            entry[k] = str(v)
+
+    def hincrby(self, key, field, amount):
+        entry = self.hashes.setdefault(key, {})
+        entry[field] = str(int(entry.get(field, 0)) + amount)
+        return int(entry[field])
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def lrange(self, key, start, end):
+        values = self.lists.get(key, [])
+        return values[start:] if end == -1 else values[start:end + 1]
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lrange(key, start, end)
+
+
+def _loader(messages, summary=None, calls=None):
+    def load():
+        if calls is not None:
+            calls.append(1)
+        return summary, list(messages)
+    return load
+
+
+class TestSessionMemoryStore:
+
+    def test_lazy_load_then_local_hit(self):
+        calls = []
+        store = SessionMemoryStore(redis_client=_DictRedis())
+        loader = _loader([{"role": "user", "content": "hi"}], summary="s", calls=calls)
+
+        first = store.get("s1", loader)
+        second = store.get("s1", loader)
+
+        assert first.summary == "s" and first.messages == [{"role": "user", "content": "hi"}]
+        assert second == first
+        assert len(calls) == 1
+        assert store.stats()["hits"] == 1
+
+    def test_append_shared_between_workers(self):
+        redis = _DictRedis()
+        worker_a = SessionMemoryStore(redis_client=redis)
+        worker_b = SessionMemoryStore(redis_client=redis)
+        loader = _loader([{"role": "user", "content": "q1"}])
+
+        worker_a.get("s1", loader)
+        worker_b.get("s1", loader)
+        worker_a.append("s1", "assistant", "a1", loader)
+
+        contents = [m["content"] for m in worker_b.get("s1", loader).messages]
+        assert contents == ["q1", "a1"]
+        # Worker B recharge depuis Redis (version changée), A a été mis à jour en place
+        assert worker_b.stats()["redis_loads"] == 2
+        assert [m["content"] for m in worker_a.get("s1", loader).messages] == ["q1", "a1"]
+        assert worker_a.stats()["redis_loads"] == 0
+
+    def test_overflow_folded_into_summary(self):
+        folded = []
+
+        def summarizer(previous, messages):
+            folded.extend(messages)
+            return previous + "+" + ",".join(m["content"] for m in messages)
+
+        store = SessionMemoryStore(redis_client=_DictRedis(), window=3, summary_batch=2, summarizer=summarizer)
+        loader = _loader([], summary="s")
+        store.get("s1", loader)
+
+        summaries = [store.append("s1", "user", f"m{i}", loader) for i in range(6)]
+
+        assert summaries[:5] == [None] * 5
+        assert summaries[5] == "s+m0,m1,m2"
+        memory = store.get("s1", loader)
+        assert [m["content"] for m in memory.messages] == ["m3", "m4", "m5"]
+        assert memory.summary == "s+m0,m1,m2"
+
+    def test_failed_summary_keeps_messages(self):
+        calls = []
+
+        def summarizer(previous, messages):
+            calls.append(len(messages))
+            if len(calls) == 1:
+                raise TimeoutError("llm down")
+            return previous + "+" + ",".join(m["content"] for m in messages)
+
+        store = SessionMemoryStore(redis_client=_DictRedis(), window=3, summary_batch=2, summarizer=summarizer)
+        loader = _loader([], summary="s")
+        store.get("s1", loader)
+
+        summaries = [store.append("s1", "user", f"m{i}", loader) for i in range(7)]
+
+        assert summaries[5] is None  # echec : rien retire de la fenetre
+        assert summaries[6] == "s+m0,m1,m2,m3"
+        memory = store.get("s1", loader)
+        assert [m["content"] for m in memory.messages] == ["m4", "m5", "m6"]
+
+    def test_concurrent_fold_is_skipped(self):
+        redis = _DictRedis()
+        store = SessionMemoryStore(
+            redis_client=redis, window=3, summary_batch=2,
+            summarizer=lambda previous, messages: previous + "+" + ",".join(m["content"] for m in messages),
+        )
+        loader = _loader([], summary="s")
+        store.get("s1", loader)
+        for i in range(5):
+            store.append("s1", "user", f"m{i}", loader)
+
+        # Un autre worker tient le verrou de repli de la session
+        redis.set("osmose:session_mem:s1:meta:folding", "1")
+        assert store.append("s1", "user", "m5", loader) is None
+        assert len(store.get("s1", loader).messages) == 6
+
+        redis.delete("osmose:session_mem:s1:meta:folding")
+        assert store.append("s1", "user", "m6", loader) == "s+m0,m1,m2,m3"
+
+    def test_local_only_without_redis(self):
+        store = SessionMemoryStore(redis_client=None, window=2, summary_batch=1)
+        store._redis_resolved = True
+        loader = _loader([])
+
+        store.get("s1", loader)
+        for i in range(4):
+            store.append("s1", "user", f"m{i}", loader)
+
+        assert [m["content"] for m in store.get("s1", loader).messages] == ["m2", "m3"]
+
+    def test_lru_bounded(self):
+        store = SessionMemoryStore(redis_client=_DictRedis(), max_sessions=2)
+        for sid in ("s1", "s2", "s3"):
+            store.get(sid, _loader([]))
+
+        stats = store.stats()
+        assert stats["cached_sessions"] == 2
+        assert stats["evictions"] == 1
+
+    def test_idle_entries_evicted(self):
+        store = SessionMemoryStore(redis_client=_DictRedis(), idle_ttl_s=0.0)
+        store.get("s1", _loader([]))
+        store.get("s2", _loader([]))
+
+        assert store.stats()["cached_sessions"] <= 1
+
+    def test_invalidate_drops_shared_state(self):
+        redis = _DictRedis()
+        store = SessionMemoryStore(redis_client=redis)
+        store.get("s1", _loader([{"role": "user", "content": "q"}]))
+
+        store.invalidate("s1")
+
+        assert redis.hashes == {} and redis.lists == {}
+        assert store.stats()["cached_sessions"] == 0
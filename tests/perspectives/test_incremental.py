@@ -0,0 +1,203 @@
+"""
+Tests du mode incremental des Perspectives (export claims + PerspectiveModel).
+"""
+
+import numpy as np
+import pytest
+
+from knowbase.perspectives import claim_export, incremental
+from knowbase.perspectives.claim_export import (
+    ClaimExport,
+    load_claim_export,
+    load_claim_metadata,
+    refresh_claim_export,
+)
+from knowbase.perspectives.incremental import (
+    PerspectiveModel,
+    assign_new_claims,
+    load_perspective_model,
+    save_perspective_model,
+)
+from knowbase.perspectives.models import PerspectiveConfig
+
+
+class _IdentityReducer:
+    """Projection identite (picklable) a la place d'un UMAP ajuste."""
+
+    def transform(self, x):
+        return np.asarray(x)
+
+
+class _Result(list):
+    def single(self):
+        return self[0] if self else None
+
+
+class _FakeSession:
+    def __init__(self, claims):
+        self.claims = claims
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, tid=None, ca=None, cid="", limit=None, **_):
+        rows = sorted(
+            (c for c in self.claims if c["tenant_id"] == tid),
+            key=lambda c: (c["created_at"], c["claim_id"]),
+        )
+        if ca is not None:
+            rows = [c for c in rows if (c["created_at"], c["claim_id"]) > (ca, cid)]
+        elif "c.text" in query:
+            rows = sorted((c for c in rows if c["claim_id"] > cid), key=lambda c: c["claim_id"])
+        if "count(c)" in query:
+            return _Result([{"cnt": len(rows)}])
+        return _Result([{**c, "facet_names": c.get("facets", [])} for c in rows[:limit]])
+
+
+class _FakeDriver:
+    def __init__(self, claims):
+        self.claims = claims
+
+    def session(self):
+        return _FakeSession(self.claims)
+
+
+def _claim(i, vec, created_at, doc="doc1"):
+    return {
+        "tenant_id": "t1", "claim_id": f"c{i:03d}", "text": f"claim {i}", "doc_id": doc,
+        "confidence": 0.9, "embedding": list(vec), "created_at": created_at,
+    }
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(claim_export, "PERSPECTIVE_DATA_DIR", tmp_path)
+    monkeypatch.setattr(incremental, "PERSPECTIVE_DATA_DIR", tmp_path)
+    monkeypatch.setattr(claim_export, "EXPORT_PAGE_SIZE", 3)
+    return tmp_path
+
+
+def test_export_appends_new_claims_and_reexports_after_delete(data_dir):
+    claims = [_claim(i, [i, 0.0], f"2026-01-0{1 + i % 3}") for i in range(7)]
+    driver = _FakeDriver(claims)
+
+    export = refresh_claim_export(driver, "t1")
+    assert len(export) == 7
+    assert export.embeddings().dtype == np.float32
+    assert sorted(c["claim_id"] for c in export.claims) == [c["claim_id"] for c in claims]
+
+    claims.append(_claim(7, [7, 1.0], "2026-02-01"))
+    export = refresh_claim_export(driver, "t1")
+    assert len(export) == 8
+    assert len(export.segments) == 2
+    assert export.claims[-1]["claim_id"] == "c007"
+    np.testing.assert_allclose(export.embeddings([7, 1]), [[7, 1.0], [3, 0.0]])
+
+    del claims[0]
+    export = refresh_claim_export(driver, "t1")
+    assert len(export) == 7
+    assert len(export.segments) == 1
+    assert "c000" not in {c["claim_id"] for c in export.claims}
+    assert load_claim_export("t1").last_created_at == "2026-02-01"
+
+
+def test_metadata_is_reread_after_facet_rewrite(data_dir):
+    claims = [_claim(i, [i, 0.0], "2026-01-01") for i in range(5)]
+    claims[1]["facets"] = ["security"]
+    driver = _FakeDriver(claims)
+
+    export = refresh_claim_export(driver, "t1")
+    assert load_claim_metadata(driver, "t1", export) == 5
+    assert export.claims[1]["facet_names"] == ["security"]
+
+    # facet_consolidate : renommage + texte edite, meme nombre de claims
+    claims[1]["facets"] = ["security-compliance"]
+    claims[2]["text"] = "edited"
+    export = refresh_claim_export(driver, "t1")
+    assert "facet_names" not in load_claim_export("t1").claims[1]
+    load_claim_metadata(driver, "t1", export)
+    assert export.claims[1]["facet_names"] == ["security-compliance"]
+    assert export.claims[2]["text"] == "edited"
+
+
+def _model():
+    reduced = np.array([[0, 0], [0.1, 0], [0, 0.1], [5, 5], [5.1, 5], [5, 5.1]], dtype=np.float32)
+    labels = np.array([0, 0, 0, 1, 1, 1])
+    return PerspectiveModel.fit(
+        tenant_id="t1", reducer=_IdentityReducer(), reduced=reduced, labels=labels,
+        cluster_to_perspective={0: "persp_a", 1: "persp_b"}, n_claims=6,
+        last_created_at="2026-01-01", config=PerspectiveConfig(),
+    )
+
+
+def test_assign_nearest_centroid_and_outliers():
+    model = _model()
+    export = ClaimExport(
+        tenant_id="t1",
+        claims=[
+            {"claim_id": "old", "doc_id": "d0", "created_at": "2026-01-01"},
+            {"claim_id": "n1", "doc_id": "d1", "created_at": "2026-01-02"},
+            {"claim_id": "n2", "doc_id": "d2", "created_at": "2026-01-03"},
+            {"claim_id": "n3", "doc_id": "d3", "created_at": "2026-01-03"},
+        ],
+        segments=[np.array([[0, 0], [0.05, 0.05], [5.05, 5.0], [20, -20]], dtype=np.float32)],
+        dim=2,
+    )
+
+    result = assign_new_claims(model, export)
+
+    assert result["new_claims"] == 3
+    assert result["assignments"] == {"persp_a": ["n1"], "persp_b": ["n2"]}
+    assert result["doc_ids"] == {"persp_a": ["d1"], "persp_b": ["d2"]}
+    assert result["outliers"] == 1
+    assert model.last_created_at == "2026-01-03"
+    assert model.drift() == {"outlier_ratio": 1 / 6, "growth_ratio": 3 / 6}
+    assert model.needs_rebuild(PerspectiveConfig())
+    assert not model.needs_rebuild(PerspectiveConfig(
+        incremental_max_outlier_ratio=0.5, incremental_max_growth_ratio=1.0,
+    ))
+
+    # Deja rattaches : rien de nouveau
+    assert assign_new_claims(model, export)["new_claims"] == 0
+
+
+def test_model_roundtrip(data_dir):
+    model = _model()
+    model.outliers_since_build = 4
+    save_perspective_model(model)
+
+    loaded = load_perspective_model("t1")
+
+    assert loaded.perspective_ids == ["persp_a", "persp_b"]
+    np.testing.assert_allclose(loaded.centroids, model.centroids)
+    np.testing.assert_allclose(loaded.radii, model.radii)
+    assert loaded.outliers_since_build == 4
+    assert isinstance(loaded.reducer, _IdentityReducer)
+    assert load_perspective_model("other") is None
+
+
+def test_cosine_gate_rejects_off_distribution_claims(data_dir):
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(2, 32))
+    embeddings = np.concatenate([c + 0.1 * rng.normal(size=(50, 32)) for c in centers]).astype(np.float32)
+    labels = np.repeat([0, 1], 50)
+    # Espace reduit degenere : seul le gate cosine discrimine
+    reduced = np.zeros((100, 2), dtype=np.float32)
+    model = PerspectiveModel.fit(
+        tenant_id="t1", reducer=None, reduced=reduced, labels=labels,
+        cluster_to_perspective={0: "persp_a", 1: "persp_b"}, n_claims=100,
+        last_created_at="", config=PerspectiveConfig(), embeddings=embeddings,
+    )
+    inside = (centers[0] + 0.1 * rng.normal(size=(1, 32))).astype(np.float32)
+    outside = rng.normal(size=(1, 32)).astype(np.float32)
+
+    assert model.assign(np.zeros((1, 2), dtype=np.float32), inside) == ["persp_a"]
+    assert model.assign(np.zeros((1, 2), dtype=np.float32), outside) == [None]
+
+    save_perspective_model(model)
+    loaded = load_perspective_model("t1")
+    np.testing.assert_allclose(loaded.min_cosine, model.min_cosine)
+    assert loaded.assign(np.zeros((1, 2), dtype=np.float32), outside) == [None]
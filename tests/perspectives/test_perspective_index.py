@@ -0,0 +1,177 @@
+"""
+Tests PerspectiveIndex / PerspectiveIndexCache.
+
+Le scoring vectorise doit reproduire l'ancienne boucle par Perspective
+(cosine + bonus tension / diversite / importance / subject overlap).
+"""
+
+import numpy as np
+import pytest
+
+from knowbase.perspectives.index import PerspectiveIndex, PerspectiveIndexCache
+from knowbase.perspectives.models import Perspective
+from knowbase.perspectives.scorer import score_perspectives
+
+
+def _perspective(i, embedding, tension=0, docs=1, importance=0.0, subjects=()):
+    return Perspective(
+        perspective_id=f"persp_{i}",
+        tenant_id="default",
+        label=f"P{i}",
+        cluster_id_in_run=i,
+        embedding=embedding,
+        tension_count=tension,
+        doc_count=docs,
+        importance_score=importance,
+        linked_subject_ids=list(subjects),
+    )
+
+
+def _loop_scores(question_embedding, perspectives, boost_subject_ids):
+    """Reference : ancienne implementation (1 cosine Python par Perspective)."""
+    q_vec = np.array(question_embedding)
+    boost = set(boost_subject_ids or [])
+    out = {}
+    for p in perspectives:
+        semantic = 0.0
+        if p.embedding:
+            p_vec = np.array(p.embedding)
+            norms = np.linalg.norm(q_vec) * np.linalg.norm(p_vec)
+            semantic = float(np.dot(q_vec, p_vec) / norms) if norms > 0 else 0.0
+        subject = 0.20 if boost & set(p.linked_subject_ids) else 0.0
+        out[p.perspective_id] = (
+            semantic
+            + (0.15 if p.tension_count > 0 else 0.0)
+            + (0.10 if p.doc_count >= 3 else 0.0)
+            + min(p.importance_score / 10.0, 1.0) * 0.10
+            + subject
+        )
+    return out
+
+
+@pytest.fixture
+def perspectives():
+    rng = np.random.default_rng(0)
+    items = [
+        _perspective(
+            i, rng.normal(size=16).tolist(),
+            tension=i % 3, docs=i % 5, importance=float(i * 1.7),
+            subjects=[f"s{i % 4}"],
+        )
+        for i in range(40)
+    ]
+    items.append(_perspective(40, None, tension=2, subjects=["s1"]))
+    items.append(_perspective(41, [0.0] * 16, docs=4))
+    return items
+
+
+def test_scores_match_reference_loop(perspectives):
+    q = np.random.default_rng(1).normal(size=16).tolist()
+    expected = _loop_scores(q, perspectives, ["s1", "s3"])
+
+    scored = PerspectiveIndex.build(perspectives).score(q, ["s1", "s3"])
+
+    assert len(scored) == len(perspectives)
+    for sp in scored:
+        assert sp.relevance_score == pytest.approx(expected[sp.perspective.perspective_id], abs=1e-5)
+    totals = [sp.relevance_score for sp in scored]
+    assert totals == sorted(totals, reverse=True)
+
+
+def test_subject_bonus_from_inverted_index(perspectives):
+    index = PerspectiveIndex.build(perspectives)
+    scored = index.score(None, ["s2"])
+
+    for sp in scored:
+        assert sp.semantic_score == 0.0
+        has_subject = "s2" in sp.perspective.linked_subject_ids
+        assert sp.subject_overlap_bonus == (0.20 if has_subject else 0.0)
+
+
+def test_score_perspectives_keeps_signature(perspectives):
+    q = np.random.default_rng(2).normal(size=16).tolist()
+    scored = score_perspectives(q, "question", perspectives, boost_subject_ids=["s0"])
+    expected = _loop_scores(q, perspectives, ["s0"])
+    best = max(expected, key=expected.get)
+    assert scored[0].perspective.perspective_id == best
+
+
+def test_empty_index():
+    assert PerspectiveIndex.build([]).score([0.1, 0.2], ["s0"]) == []
+
+
+class _VersionRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def test_cache_reloads_only_on_version_bump(perspectives):
+    loads = []
+
+    def loader(tenant_id):
+        loads.append(tenant_id)
+        return perspectives
+
+    redis = _VersionRedis()
+    cache = PerspectiveIndexCache(loader=loader, redis_client=redis)
+    first = cache.get("default")
+    assert cache.get("default") is first
+    assert loads == ["default"]
+
+    # Rebuild dans un autre process : seule la cle Redis change
+    redis.incr("osmose:perspectives:version:default")
+    second = cache.get("default")
+    assert second is not first
+    assert second.version == 1
+    assert loads == ["default", "default"]
+
+
+def test_cache_without_redis_uses_ttl(perspectives):
+    loads = []
+    cache = PerspectiveIndexCache(loader=lambda t: loads.append(t) or perspectives, local_ttl_s=0.0)
+    cache._redis_resolved = True  # pas de Redis
+
+    cache.get("default")
+    cache.get("default")
+    assert len(loads) == 2
+
+
+def test_failed_load_is_not_cached(perspectives):
+    calls = []
+
+    def loader(tenant_id):
+        calls.append(tenant_id)
+        if len(calls) in (1, 3):
+            raise ConnectionError("neo4j down")
+        return perspectives
+
+    redis = _VersionRedis()
+    cache = PerspectiveIndexCache(loader=loader, redis_client=redis)
+
+    assert len(cache.get("default")) == 0  # echec : index vide non memorise
+    loaded = cache.get("default")
+    assert len(loaded) == len(perspectives)
+
+    # Echec apres un rebuild : l'index precedent reste servi
+    redis.incr("osmose:perspectives:version:default")
+    assert cache.get("default") is loaded
+    assert cache.get("default") is not loaded
+    assert cache.stats()["load_errors"] == 2
+
+
+def test_empty_load_expires_quickly(perspectives, monkeypatch):
+    from knowbase.perspectives import index as index_module
+
+    results = [[], perspectives]
+    cache = PerspectiveIndexCache(loader=lambda t: results.pop(0), redis_client=_VersionRedis())
+    assert len(cache.get("default")) == 0
+
+    monkeypatch.setattr(index_module, "EMPTY_TTL_S", 0.0)
+    assert len(cache.get("default")) == len(perspectives)
@@ -0,0 +1,155 @@
+"""
+Tests index de mentions Pass 3 (Aho-Corasick + LRU).
+
+Tests:
+- Automate : mêmes résultats que `pattern in text` (chevauchements, doublons)
+- DocumentMentionIndex : postings, filtrage par section, formes tardives
+- MentionIndexCache : un seul chargement par document, éviction LRU,
+  invalidation au début de chaque run Pass 3
+- TextWindowBuilder : seeds identiques à l'ancienne recherche par sous-chaîne
+"""
+
+import asyncio
+import random
+
+from knowbase.common.aho_corasick import AhoCorasickAutomaton
+from knowbase.relations.mention_index import DocumentMentionIndex, MentionIndexCache
+from knowbase.relations.semantic_consolidation_pass3 import (
+    RelationCandidate,
+    TextWindowBuilder,
+)
+
+
+DOCITEMS = [
+    {"item_id": "i1", "section_id": "s1", "text": "SAP HANA requires an SAP S/4HANA license.", "reading_order_index": 0},
+    {"item_id": "i2", "section_id": "s1", "text": "Fiori runs on top of the ABAP stack.", "reading_order_index": 1},
+    {"item_id": "i3", "section_id": "s2", "text": "HANA Cloud is a managed HANA database.", "reading_order_index": 0},
+    {"item_id": "i4", "section_id": "s2", "text": "", "reading_order_index": 1},
+]
+
+
+def _naive_items(docitems, forms, sections=None):
+    return {
+        item["item_id"] for item in docitems
+        if (not sections or item["section_id"] in sections)
+        and any(f in (item["text"] or "").lower() for f in forms)
+    }
+
+
+class TestAhoCorasickAutomaton:
+
+    def test_overlapping_and_nested_patterns(self):
+        automaton = AhoCorasickAutomaton(["he", "she", "his", "hers", "s"])
+        matches = sorted(automaton.iter_matches("ushers"))
+        assert matches == [(1, 4), (3, 0), (3, 1), (5, 3), (5, 4)]
+
+    def test_matches_substring_semantics(self):
+        rng = random.Random(7)
+        alphabet = "ab c"
+        patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(40)]
+        automaton = AhoCorasickAutomaton(patterns)
+        for _ in range(200):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            expected = {i for i, p in enumerate(patterns) if p in text}
+            assert automaton.find_all(text) == expected
+
+    def test_empty_pattern_never_reported(self):
+        assert AhoCorasickAutomaton(["", "a"]).find_all("abc") == {1}
+
+
+class TestDocumentMentionIndex:
+
+    def test_postings_match_naive_search(self):
+        forms = ["hana", "sap s/4hana", "abap", "missing"]
+        index = DocumentMentionIndex("doc", DOCITEMS, forms)
+        for form in forms:
+            assert index.items_with_any([form]) == _naive_items(DOCITEMS, [form])
+        assert index.items_with_any(["hana"], {"s2"}) == {"i3"}
+
+    def test_late_forms_indexed_on_demand(self):
+        index = DocumentMentionIndex("doc", DOCITEMS, ["hana"])
+        assert index.items_with_any(["FIORI"]) == {"i2"}
+        assert "fiori" in index.forms
+
+    def test_empty_form_matches_every_item(self):
+        index = DocumentMentionIndex("doc", DOCITEMS)
+        assert index.items_with_any([""]) == {"i1", "i2", "i3", "i4"}
+
+
+class TestMentionIndexCache:
+
+    def test_loads_once_and_evicts_lru(self):
+        loads = []
+
+        def loader(doc_id):
+            def load():
+                loads.append(doc_id)
+                return DOCITEMS
+            return load
+
+        cache = MentionIndexCache(max_documents=2)
+        cache.get_or_build("t", "d1", loader("d1"), ["hana"])
+        cache.get_or_build("t", "d1", loader("d1"), ["abap"])
+        cache.get_or_build("t", "d2", loader("d2"))
+        cache.get_or_build("t", "d1", loader("d1"))   # d1 devient le plus récent
+        cache.get_or_build("t", "d3", loader("d3"))   # évince d2
+        cache.get_or_build("t", "d2", loader("d2"))
+
+        assert loads == ["d1", "d2", "d3", "d2"]
+        assert cache.stats()["evictions"] == 2
+        assert cache.stats()["documents"] == 2
+
+    def test_pass3_run_drops_cached_document(self, monkeypatch):
+        from knowbase.relations import semantic_consolidation_pass3 as pass3
+
+        cache = MentionIndexCache()
+        cache.get_or_build("t", "d", lambda: [dict(item) for item in DOCITEMS])
+        monkeypatch.setattr(pass3, "get_mention_index_cache", lambda: cache)
+        monkeypatch.setattr(
+            pass3.CandidateGenerator, "generate_candidates", lambda self, doc_id, max_candidates: []
+        )
+
+        asyncio.run(pass3.run_pass3_consolidation("d", neo4j_client=None, llm_router=None, tenant_id="t"))
+        assert cache.stats()["documents"] == 0
+
+    def test_empty_document_not_cached(self):
+        loads = []
+        cache = MentionIndexCache()
+        for _ in range(2):
+            cache.get_or_build("t", "d", lambda: loads.append(1) or [])
+        assert len(loads) == 2
+
+
+class TestTextWindowBuilderSeeds:
+
+    def _builder(self):
+        cache = MentionIndexCache()
+        builder = TextWindowBuilder(neo4j_client=None, tenant_id="t", mention_cache=cache)
+        builder._load_docitems = lambda document_id: [dict(item) for item in DOCITEMS]
+        return builder
+
+    def test_seeds_prefer_items_with_both_forms(self):
+        builder = self._builder()
+        candidate = RelationCandidate(
+            subject_concept_id="c1", subject_name="SAP HANA",
+            object_concept_id="c2", object_name="S/4HANA",
+            shared_sections=[], shared_topics=[], co_occurrence_count=2,
+        )
+        builder.prime("doc", [candidate])
+        index = builder._get_mention_index("doc")
+        assert builder._find_items_with_surface_forms(index, candidate, []) == {"i1"}
+
+        window = builder.build_window(candidate, "doc", escalation_level=1)
+        assert window.item_ids == ["i1", "i2"]
+
+    def test_union_restricted_to_priority_sections(self):
+        builder = self._builder()
+        candidate = RelationCandidate(
+            subject_concept_id="c1", subject_name="Fiori",
+            object_concept_id="c3", object_name="HANA Cloud",
+            shared_sections=["s2"], shared_topics=[], co_occurrence_count=2,
+            subject_surface_forms=["Fiori"], object_surface_forms=["hana"],
+        )
+        index = builder._get_mention_index("doc")
+        assert builder._find_items_with_surface_forms(index, candidate, ["s2"]) == {"i3"}
+        assert builder._find_items_with_surface_forms(index, candidate, []) == {"i1", "i2", "i3"}
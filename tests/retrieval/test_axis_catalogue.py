@@ -0,0 +1,214 @@
+"""
+Tests du catalogue d'axes (knowbase.retrieval.axis_catalogue).
+
+- Valeurs exactes via facet Qdrant (y compris au-dela des 100 premiers points)
+- Nombre de documents par valeur, fusion avec Neo4j
+- Cache : lookup sans I/O, invalidation par version Redis / TTL
+- Echecs : jamais mis en cache, chargements partiels a TTL court
+"""
+
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from knowbase.retrieval import axis_catalogue
+from knowbase.retrieval.axis_catalogue import (
+    AxisCatalogue,
+    AxisCatalogueCache,
+    PartialAxisValueCounts,
+    _merge_counts,
+    load_qdrant_axis_values,
+)
+
+
+@pytest.fixture
+def qdrant():
+    client = QdrantClient(":memory:")
+    client.create_collection("chunks", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+    points = []
+    for i in range(300):
+        doc = i // 10  # 30 documents de 10 sub-chunks
+        payload = {"doc_id": f"doc_{doc}", "axis_release_id": "2021" if doc < 20 else "2022"}
+        if doc == 29:
+            payload["axis_release_id"] = "2025"  # seulement en fin de collection
+        if doc % 2 == 0:
+            payload["axis_version"] = f"v{doc % 3}"
+        points.append(PointStruct(id=i, vector=[1.0, 0.0], payload=payload))
+    client.upsert("chunks", points)
+    return client
+
+
+def test_qdrant_facets_are_exact_and_count_documents(qdrant):
+    axes = load_qdrant_axis_values(client=qdrant, collection="chunks")
+
+    assert axes["release_id"] == {"2021": 20, "2022": 9, "2025": 1}
+    assert axes["version"] == {"v0": 5, "v1": 5, "v2": 5}
+
+
+def test_neo4j_axis_keys_are_faceted_too(qdrant):
+    qdrant.set_payload("chunks", {"axis_edition": "PCE"}, points=[0, 1, 15])
+
+    axes = load_qdrant_axis_values(client=qdrant, collection="chunks", axis_keys=["edition"])
+
+    assert axes["edition"] == {"PCE": 2}
+
+
+def test_merge_keeps_max_document_count():
+    neo4j = {"release_id": {"2021": 3, "2023": 0}, "phase": {"I": 1}}
+    _merge_counts(neo4j, {"release_id": {"2021": 5, "2022": 2}})
+
+    assert neo4j == {"release_id": {"2021": 5, "2023": 0, "2022": 2}, "phase": {"I": 1}}
+
+
+def test_known_values_ranking_and_limit():
+    catalogue = AxisCatalogue(value_counts={"release_id": {"2021": 3, "2022": 9, "2023": 5}})
+
+    assert catalogue.known_values() == {"release_id": ["2021", "2022", "2023"]}
+    assert catalogue.known_values(2) == {"release_id": ["2022", "2023"]}
+    assert catalogue.known_values(2) is catalogue.known_values(2)
+    assert catalogue.ranked_values("release_id")[0] == ("2022", 9)
+    assert catalogue.doc_count("release_id", "2023") == 5
+    assert catalogue.doc_count("phase", "I") == 0
+
+
+class _VersionRedis:
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def test_cache_is_a_lookup_between_version_checks():
+    loads = []
+    redis = _VersionRedis()
+    cache = AxisCatalogueCache(
+        loader=lambda: loads.append(1) or {"release_id": {"2021": 1}},
+        redis_client=redis,
+        version_check_s=3600,
+    )
+
+    first = cache.get()
+    gets = redis.gets
+    for _ in range(100):
+        assert cache.get() is first
+    assert redis.gets == gets
+    assert len(loads) == 1
+
+    # Ingestion dans le meme process : invalidation immediate
+    cache.bump()
+    assert cache.get() is not first
+    assert len(loads) == 2
+
+
+def test_cache_reloads_on_remote_version_bump():
+    loads = []
+    redis = _VersionRedis()
+    cache = AxisCatalogueCache(
+        loader=lambda: loads.append(1) or {}, redis_client=redis, version_check_s=0.0,
+    )
+
+    first = cache.get()
+    assert cache.get() is first
+
+    # Ingestion dans un autre process : seule la cle Redis change
+    redis.incr(axis_catalogue.REDIS_VERSION_KEY)
+    second = cache.get()
+    assert second is not first
+    assert second.version == 1
+    assert len(loads) == 2
+
+
+def test_cache_without_redis_uses_ttl():
+    loads = []
+    cache = AxisCatalogueCache(loader=lambda: loads.append(1) or {}, ttl_s=0.0, version_check_s=0.0)
+    cache._redis_resolved = True  # pas de Redis
+
+    cache.get()
+    cache.get()
+    assert len(loads) == 2
+    assert cache.bump() is None
+
+
+def test_ttl_is_an_upper_bound_with_redis():
+    loads = []
+    cache = AxisCatalogueCache(
+        loader=lambda: loads.append(1) or {}, redis_client=_VersionRedis(),
+        ttl_s=0.0, version_check_s=3600,
+    )
+
+    cache.get()
+    cache.get()
+    assert len(loads) == 2
+
+
+def test_failed_load_is_not_cached():
+    results = [{"release_id": {"2021": 1}}, ConnectionError("neo4j down"), {"release_id": {"2022": 1}}]
+
+    def loader():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    cache = AxisCatalogueCache(loader=loader, redis_client=_VersionRedis(), version_check_s=3600)
+    first = cache.get()
+    cache.bump()
+    assert cache.get() is first  # echec : catalogue precedent servi, non memorise
+    assert cache.get().known_values() == {"release_id": ["2022"]}
+    assert cache.stats()["load_errors"] == 1
+
+
+def test_partial_load_uses_short_ttl(monkeypatch):
+    loads = []
+    cache = AxisCatalogueCache(
+        loader=lambda: loads.append(1) or PartialAxisValueCounts({"release_id": {"2021": 1}}),
+        redis_client=_VersionRedis(),
+        version_check_s=3600,
+    )
+
+    catalogue = cache.get()
+    assert catalogue.complete is False
+    assert cache.get() is catalogue
+
+    monkeypatch.setattr(axis_catalogue, "PARTIAL_TTL_S", 0.0)
+    cache.get()
+    assert len(loads) == 2
+
+
+def test_one_source_down_gives_partial_both_down_raises(monkeypatch, qdrant):
+    def neo4j_down():
+        raise ConnectionError("neo4j down")
+
+    monkeypatch.setattr(axis_catalogue, "load_neo4j_axis_values", neo4j_down)
+    monkeypatch.setattr(
+        axis_catalogue, "load_qdrant_axis_values",
+        lambda axis_keys=None: load_qdrant_axis_values(client=qdrant, collection="chunks"),
+    )
+    axes = axis_catalogue.load_axis_value_counts()
+    assert isinstance(axes, PartialAxisValueCounts)
+    assert axes["release_id"]["2025"] == 1
+
+    monkeypatch.setattr(axis_catalogue, "load_qdrant_axis_values", lambda axis_keys=None: neo4j_down())
+    with pytest.raises(RuntimeError):
+        axis_catalogue.load_axis_value_counts()
+
+
+def test_decomposer_reads_the_catalogue(monkeypatch):
+    from knowbase.api.services import query_decomposer
+
+    cache = AxisCatalogueCache(
+        loader=lambda: {"release_id": {str(2000 + i): i for i in range(60)}},
+        version_check_s=3600,
+    )
+    cache._redis_resolved = True
+    monkeypatch.setattr(axis_catalogue, "_catalogue_cache", cache)
+    monkeypatch.setattr(query_decomposer, "MAX_AXIS_VALUES", 3)
+
+    assert query_decomposer._get_known_axis_values() == {"release_id": ["2057", "2058", "2059"]}
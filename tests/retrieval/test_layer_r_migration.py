@@ -0,0 +1,127 @@
+"""
+Tests profils de collection Layer R + migration blue/green.
+
+Tests:
+- LayerRProfile: quantization, SearchParams, détection depuis la config
+- migrate_layer_r_collection: legacy cutover, bascule d'alias, recall, rollback
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import (
+    BinaryQuantization,
+    Distance,
+    PointStruct,
+    ScalarQuantization,
+    VectorParams,
+)
+
+from knowbase.retrieval import qdrant_layer_r
+from knowbase.retrieval.layer_r_migration import LayerRMigrationError, migrate_layer_r_collection
+from knowbase.retrieval.layer_r_profiles import (
+    PROFILES,
+    get_profile,
+    invalidate_search_params_cache,
+    profile_from_collection_info,
+)
+from knowbase.retrieval.sparse_bm25 import collection_has_sparse, invalidate_sparse_support_cache
+
+
+class TestProfiles:
+
+    def test_int8_profile(self):
+        profile = get_profile("int8")
+        assert isinstance(profile.quantization_config(), ScalarQuantization)
+        assert profile.vector_params(1024, Distance.COSINE).on_disk is True
+        params = profile.search_params()
+        assert params.quantization.rescore is True
+        assert params.quantization.oversampling == 2.0
+
+    def test_float32_profile_is_historical_default(self):
+        profile = get_profile("float32")
+        assert profile.quantization_config() is None
+        assert profile.search_params() is None
+        assert profile.hnsw_config() is None
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            get_profile("fp8")
+
+    def test_ram_estimate_ordering(self):
+        est = {name: p.estimate_ram_bytes(100_000, 1024) for name, p in PROFILES.items()}
+        assert est["float32"] > est["int8"] > est["binary"]
+
+    @pytest.mark.parametrize("quantization, expected", [
+        (None, "float32"),
+        (PROFILES["int8"].quantization_config(), "int8"),
+        (PROFILES["binary"].quantization_config(), "binary"),
+    ])
+    def test_profile_from_collection_info(self, quantization, expected):
+        info = SimpleNamespace(config=SimpleNamespace(
+            quantization_config=quantization,
+            params=SimpleNamespace(vectors=VectorParams(size=4, distance=Distance.COSINE)),
+        ))
+        assert profile_from_collection_info(info).name == expected
+
+
+def _vec(seed):
+    v = np.random.default_rng(seed).normal(size=qdrant_layer_r.VECTOR_SIZE).astype(np.float32)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(":memory:")
+    invalidate_sparse_support_cache()
+    invalidate_search_params_cache()
+    qdrant_layer_r.reset_layer_r_ready()
+    with patch.object(qdrant_layer_r, "get_qdrant_client", return_value=client):
+        qdrant_layer_r.create_layer_r_collection(client, qdrant_layer_r.COLLECTION_NAME, sparse=True)
+        client.upsert(qdrant_layer_r.COLLECTION_NAME, points=[
+            PointStruct(id=i, vector={"": _vec(i)}, payload={"text": f"chunk {i}", "tenant_id": "default"})
+            for i in range(30)
+        ])
+        yield client
+    invalidate_sparse_support_cache()
+    invalidate_search_params_cache()
+    qdrant_layer_r.reset_layer_r_ready()
+
+
+class TestMigration:
+
+    def test_first_migration_requires_legacy_cutover(self, client):
+        with pytest.raises(LayerRMigrationError):
+            migrate_layer_r_collection("int8", client=client)
+        assert len(client.get_collections().collections) == 1
+
+    def test_blue_green_migration(self, client):
+        name = qdrant_layer_r.COLLECTION_NAME
+        report = migrate_layer_r_collection("int8", client=client, n_queries=5, legacy_cutover=True)
+        assert report.switched
+        assert report.points_copied == report.points_source == 30
+        assert report.recall_at_k == pytest.approx(1.0)
+        assert qdrant_layer_r.layer_r_alias_target(client) == report.target
+        assert report.target.startswith(f"{name}__int8_")
+        assert collection_has_sparse(client, report.target)
+
+        # Layer R reste servie sous le même nom
+        hits = qdrant_layer_r.search_layer_r(_vec(3), tenant_id="default", limit=1, score_threshold=0.0)
+        assert hits[0]["text"] == "chunk 3"
+
+        # 2e migration : bascule d'alias atomique + drop de l'ancienne green
+        with patch("knowbase.retrieval.layer_r_migration.time.strftime", return_value="next"):
+            second = migrate_layer_r_collection("float32", client=client, n_queries=5, drop_old=True)
+        assert second.source == report.target
+        assert qdrant_layer_r.layer_r_alias_target(client) == second.target
+        assert not client.collection_exists(report.target)
+
+    def test_low_recall_keeps_blue(self, client):
+        with patch("knowbase.retrieval.layer_r_migration.measure_recall", return_value=0.5):
+            report = migrate_layer_r_collection("binary", client=client, legacy_cutover=True)
+        assert not report.switched
+        assert qdrant_layer_r.layer_r_alias_target(client) is None
+        assert client.collection_exists(report.target)
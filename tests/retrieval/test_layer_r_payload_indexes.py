@@ -0,0 +1,95 @@
+"""
+Tests layout payload Layer R (indexes keyword, partition tenant, bootstrap).
+
+Tests:
+- ensure_payload_indexes: création des indexes manquants, upgrade tenant_id
+- bootstrap_layer_r: une seule vérification Qdrant par process
+"""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from qdrant_client.models import KeywordIndexParams, PayloadSchemaType
+
+from knowbase.retrieval import qdrant_layer_r
+
+
+def _schema_entry(is_tenant=None):
+    params = KeywordIndexParams(type="keyword", is_tenant=is_tenant) if is_tenant is not None else None
+    return SimpleNamespace(data_type=PayloadSchemaType.KEYWORD, params=params, points=0)
+
+
+def _client(schema=None, exists=True):
+    client = MagicMock()
+    client.get_collection.return_value = SimpleNamespace(payload_schema=schema or {})
+    client.collection_exists.return_value = exists
+    client.get_aliases.return_value = SimpleNamespace(aliases=[])
+    return client
+
+
+def _indexed_fields(client):
+    return {c.kwargs["field_name"]: c.kwargs["field_schema"] for c in client.create_payload_index.call_args_list}
+
+
+@pytest.fixture(autouse=True)
+def _reset_ready():
+    qdrant_layer_r.reset_layer_r_ready()
+    yield
+    qdrant_layer_r.reset_layer_r_ready()
+
+
+class TestEnsurePayloadIndexes:
+
+    def test_creates_all_missing_indexes(self):
+        client = _client()
+        created = qdrant_layer_r.ensure_payload_indexes("c", client=client)
+
+        assert set(created) == set(qdrant_layer_r.KEYWORD_INDEX_FIELDS) | {"text"}
+        tenant_schema = _indexed_fields(client)["tenant_id"]
+        assert isinstance(tenant_schema, KeywordIndexParams) and tenant_schema.is_tenant
+        assert _indexed_fields(client)["doc_id"] == PayloadSchemaType.KEYWORD
+
+    def test_existing_indexes_are_kept(self):
+        schema = {f: _schema_entry() for f in qdrant_layer_r.KEYWORD_INDEX_FIELDS}
+        schema["tenant_id"] = _schema_entry(is_tenant=True)
+        schema["text"] = _schema_entry()
+        client = _client(schema)
+
+        assert qdrant_layer_r.ensure_payload_indexes("c", client=client) == []
+        client.create_payload_index.assert_not_called()
+
+    def test_legacy_tenant_index_upgraded(self):
+        schema = {f: _schema_entry() for f in qdrant_layer_r.KEYWORD_INDEX_FIELDS}
+        schema["text"] = _schema_entry()
+        client = _client(schema)
+
+        assert qdrant_layer_r.ensure_payload_indexes("c", client=client) == ["tenant_id"]
+        assert _indexed_fields(client)["tenant_id"].is_tenant
+
+
+class TestBootstrap:
+
+    def test_bootstrap_runs_once(self):
+        client = _client()
+        with patch.object(qdrant_layer_r, "get_qdrant_client", return_value=client):
+            qdrant_layer_r.bootstrap_layer_r()
+            qdrant_layer_r.bootstrap_layer_r()
+        assert client.collection_exists.call_count == 1
+
+    def test_search_skips_existence_check_once_ready(self):
+        client = _client()
+        client.query_points.return_value = SimpleNamespace(points=[])
+        with patch.object(qdrant_layer_r, "get_qdrant_client", return_value=client):
+            qdrant_layer_r.bootstrap_layer_r()
+            client.collection_exists.reset_mock()
+            qdrant_layer_r.search_layer_r([0.0] * qdrant_layer_r.VECTOR_SIZE, tenant_id="default")
+            qdrant_layer_r.delete_doc_from_layer_r("doc", tenant_id="default")
+        client.collection_exists.assert_not_called()
+        client.delete.assert_called_once()
+
+    def test_missing_collection_not_created_on_read(self):
+        client = _client(exists=False)
+        with patch.object(qdrant_layer_r, "get_qdrant_client", return_value=client):
+            assert qdrant_layer_r.search_layer_r([0.0] * qdrant_layer_r.VECTOR_SIZE, tenant_id="default") == []
+        client.create_collection.assert_not_called()
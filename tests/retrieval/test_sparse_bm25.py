@@ -0,0 +1,170 @@
+"""
+Tests vecteurs sparse BM25 Layer R.
+
+Tests:
+- tokenize_bm25: identifiants SAP/réglementaires préservés
+- vecteurs document/query: TF BM25, indices stables
+- upsert + backfill + _hybrid_search sur Qdrant local (:memory:)
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import FieldCondition, Filter, MatchValue, PointStruct, VectorParams
+
+from knowbase.retrieval import qdrant_layer_r
+from knowbase.retrieval.rechunker import SubChunk
+from knowbase.retrieval.sparse_bm25 import (
+    SPARSE_VECTOR_NAME,
+    build_document_sparse_vector,
+    build_query_sparse_vector,
+    collection_has_sparse,
+    invalidate_sparse_support_cache,
+    token_index,
+    tokenize_bm25,
+)
+
+
+class TestTokenizer:
+
+    def test_keeps_identifiers_and_segments(self):
+        tokens = tokenize_bm25("Run /SCWM/R_BW on S/4HANA (SAP_NOTE 2008727).")
+        assert "/scwm/r_bw" in tokens
+        assert "s/4hana" in tokens
+        assert "sap_note" in tokens
+        assert {"scwm", "r_bw", "4hana", "2008727"} <= set(tokens)
+
+    def test_decimal_references_and_single_digits(self):
+        tokens = tokenize_bm25("CS 25.788, Article 5.")
+        assert tokens == ["cs", "25.788", "25", "788", "article", "5"]
+
+    def test_single_letters_dropped(self):
+        assert tokenize_bm25("a b SAP") == ["sap"]
+
+
+class TestVectors:
+
+    def test_document_vector_bm25_saturation(self):
+        vec = build_document_sparse_vector("engine engine engine fuel")
+        weights = dict(zip(vec.indices, vec.values))
+        assert weights[token_index("engine")] > weights[token_index("fuel")]
+        # Saturation k1 : tf=3 < 3 × tf=1
+        assert weights[token_index("engine")] < 3 * weights[token_index("fuel")]
+        assert vec.indices == sorted(vec.indices)
+
+    def test_longer_document_lower_weight(self):
+        short = build_document_sparse_vector("fuel tank")
+        long = build_document_sparse_vector("fuel " + "filler " * 400)
+        idx = token_index("fuel")
+        assert dict(zip(short.indices, short.values))[idx] > dict(zip(long.indices, long.values))[idx]
+
+    def test_query_vector(self):
+        vec = build_query_sparse_vector("fuel fuel tank")
+        assert vec.values == [1.0, 1.0]
+        assert build_query_sparse_vector("?!") is None
+
+
+def _sub_chunk(i, text, doc_id="doc_a"):
+    return SubChunk(
+        chunk_id=f"c{i}", sub_index=0, text=text, parent_chunk_id=f"c{i}",
+        section_id=None, doc_id=doc_id, tenant_id="default", kind="NARRATIVE_TEXT",
+        page_no=1, page_span_min=1, page_span_max=1, item_ids=[], text_origin=None,
+    )
+
+
+def _vec(seed):
+    v = np.random.default_rng(seed).normal(size=qdrant_layer_r.VECTOR_SIZE).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(":memory:")
+    invalidate_sparse_support_cache()
+    qdrant_layer_r.reset_layer_r_ready()
+    with patch.object(qdrant_layer_r, "get_qdrant_client", return_value=client), \
+         patch.object(qdrant_layer_r, "ensure_payload_indexes"):
+        yield client
+    invalidate_sparse_support_cache()
+    qdrant_layer_r.reset_layer_r_ready()
+
+
+class TestLayerRSparse:
+
+    def test_upsert_writes_sparse_vectors(self, client):
+        texts = ["Configure /SCWM/R_BW in S/4HANA", "Fuel tank inspection", "Engine maintenance"]
+        n = qdrant_layer_r.upsert_layer_r(
+            [(_sub_chunk(i, t), _vec(i)) for i, t in enumerate(texts)], tenant_id="default",
+        )
+        assert n == 3
+        assert collection_has_sparse(client, qdrant_layer_r.COLLECTION_NAME)
+
+        hits = client.query_points(
+            qdrant_layer_r.COLLECTION_NAME,
+            query=build_query_sparse_vector("how to run /SCWM/R_BW"),
+            using=SPARSE_VECTOR_NAME, limit=3, with_payload=True,
+        ).points
+        assert hits[0].payload["chunk_id"] == "c0"
+
+    def test_backfill_requires_rebuild_for_legacy_collection(self, client):
+        name = qdrant_layer_r.COLLECTION_NAME
+        client.create_collection(name, vectors_config=VectorParams(
+            size=qdrant_layer_r.VECTOR_SIZE, distance=qdrant_layer_r.DISTANCE))
+        client.upsert(name, points=[
+            PointStruct(id=i, vector=_vec(i).tolist(), payload={"text": t, "tenant_id": "default"})
+            for i, t in enumerate(["Fuel tank inspection", "Engine maintenance"])
+        ])
+
+        assert qdrant_layer_r.backfill_layer_r_sparse() == 0
+        assert qdrant_layer_r.backfill_layer_r_sparse(rebuild=True) == 2
+        assert collection_has_sparse(client, name)
+        assert not client.collection_exists(f"{name}__sparse_rebuild")
+
+        hits = client.query_points(
+            name, query=build_query_sparse_vector("engine"), using=SPARSE_VECTOR_NAME, limit=2,
+        ).points
+        assert [h.id for h in hits] == [1]
+        # Vecteur dense conservé
+        dense = client.query_points(name, query=_vec(0).tolist(), limit=1).points
+        assert dense[0].id == 0
+        # Collection déjà sparse : update_vectors idempotent
+        assert qdrant_layer_r.backfill_layer_r_sparse() == 2
+
+    def test_negative_sparse_support_expires(self, client, monkeypatch):
+        from knowbase.retrieval import sparse_bm25
+
+        name = "legacy"
+        dense = VectorParams(size=4, distance=qdrant_layer_r.DISTANCE)
+        client.create_collection(name, vectors_config=dense)
+        assert not collection_has_sparse(client, name)
+
+        # Rebuild fait par un autre process : aucun invalidate dans celui-ci
+        client.delete_collection(name)
+        client.create_collection(
+            name, vectors_config=dense, sparse_vectors_config=sparse_bm25.sparse_vectors_config(),
+        )
+        assert not collection_has_sparse(client, name)
+
+        monkeypatch.setattr(sparse_bm25, "SPARSE_SUPPORT_TTL_S", 0.0)
+        assert collection_has_sparse(client, name)
+
+    def test_hybrid_search_uses_sparse_branch(self, client):
+        from knowbase.api.services.retriever import _hybrid_search
+
+        texts = ["Generic overview of the platform"] * 5 + ["Transaction /SCWM/MON monitor setup"]
+        qdrant_layer_r.upsert_layer_r(
+            [(_sub_chunk(i, t), _vec(i)) for i, t in enumerate(texts)], tenant_id="default",
+        )
+        with patch.object(client, "scroll", side_effect=AssertionError("MatchText path used")):
+            results = _hybrid_search(
+                qdrant_client=client,
+                collection_name=qdrant_layer_r.COLLECTION_NAME,
+                query_vector=_vec(0).tolist(),
+                question="How do I set up /SCWM/MON?",
+                query_filter=Filter(must=[FieldCondition(key="tenant_id", match=MatchValue(value="default"))]),
+                top_k=3,
+            )
+        ids = [r.payload["chunk_id"] for r in results]
+        assert "c5" in ids and "c0" in ids
@@ -393,3 +393,93 @@ class TestStatsAfterRun:
         assert ws.budgets_snapshot.iterations == 4
         assert ws.budgets_snapshot.tool_calls == 3
         assert result.epistemic_status == EpistemicStatus.COMPLETE
+
+
+# ─── Exécution parallèle des tools side-effect-free ──────────────────────────
+
+
+def _slow_spec(name: str, handler, *, side_effect_free: bool = True, timeout_s=None) -> ToolSpec:
+    return ToolSpec(
+        name=name,
+        category=ToolCategory.READING,
+        description=f"Slow fake tool {name} for concurrency tests.",
+        preferred_when="concurrency tests only",
+        evidence_type_returned=EvidenceType.FULL_SECTION_TEXT,
+        parameters_schema={
+            "type": "object", "additionalProperties": False,
+            "properties": {"key": {"type": "string"}},
+            "required": ["key"],
+        },
+        handler=handler,
+        side_effect_free=side_effect_free,
+        timeout_s=timeout_s,
+    )
+
+
+class TestParallelTools:
+    @staticmethod
+    def _slow_read(key: str) -> dict:
+        import time as _time
+        _time.sleep(0.2 if key == "a" else 0.05)
+        return {"doc_id": "doc_x", "section_id": f"sec_{key}", "text": f"text {key} unique"}
+
+    def _run(self, registry, tool_calls, **agent_kwargs):
+        from knowbase.runtime_v5.observability.tracer import InMemoryTracer
+        tracer = InMemoryTracer()
+        llm = MockLLMCaller([_resp_tool_calls(tool_calls), _resp_final("done")])
+        agent = ReasoningAgentV51(
+            llm_caller=llm, registry=registry, tracer=tracer, **agent_kwargs,
+        )
+        return agent.run(question="q", tenant_id="default"), agent, tracer
+
+    def test_read_only_calls_overlap_and_keep_order(self):
+        reg = ToolRegistry()
+        reg.register(_slow_spec("slow_read", self._slow_read))
+        calls = [_tc(f"c{k}", "slow_read", {"key": k}) for k in ("a", "b", "c", "d")]
+
+        result, agent, tracer = self._run(reg, calls, max_parallel_tools=4)
+
+        assert tracer.max_concurrency("gen_ai.execute_tool") == 4
+        ws = result.workspace
+        assert [tc.args["key"] for tc in ws.tool_calls] == ["a", "b", "c", "d"]
+        assert ws.budgets_snapshot.tool_calls == 4
+        # Messages tool dans l'ordre des tool_calls, malgré "a" plus lent
+        assert result.answer == "done"
+
+    def test_side_effect_tool_is_a_barrier(self):
+        reg = ToolRegistry()
+        reg.register(_slow_spec("slow_read", self._slow_read))
+        reg.register(_slow_spec("write_note", lambda key: {"ok": key}, side_effect_free=False))
+        calls = [
+            _tc("c1", "slow_read", {"key": "a"}),
+            _tc("c2", "write_note", {"key": "w"}),
+            _tc("c3", "slow_read", {"key": "b"}),
+        ]
+
+        result, _, tracer = self._run(reg, calls, max_parallel_tools=4)
+
+        spans = sorted(tracer.get_spans_by_name("gen_ai.execute_tool"), key=lambda s: s.start_time)
+        assert [s.attributes["tool_name"] for s in spans] == ["slow_read", "write_note", "slow_read"]
+        assert tracer.max_concurrency("gen_ai.execute_tool") == 1
+        assert [tc.tool_name for tc in result.workspace.tool_calls] == [
+            "slow_read", "write_note", "slow_read",
+        ]
+
+    def test_parallelism_disabled(self):
+        reg = ToolRegistry()
+        reg.register(_slow_spec("slow_read", self._slow_read))
+        calls = [_tc(f"c{k}", "slow_read", {"key": k}) for k in ("a", "b")]
+
+        _, _, tracer = self._run(reg, calls, max_parallel_tools=1)
+
+        assert tracer.max_concurrency("gen_ai.execute_tool") == 1
+
+    def test_per_tool_timeout(self):
+        reg = ToolRegistry()
+        reg.register(_slow_spec("slow_read", self._slow_read, timeout_s=0.05))
+        calls = [_tc("c1", "slow_read", {"key": "a"}), _tc("c2", "slow_read", {"key": "b"})]
+
+        result, _, _ = self._run(reg, calls)
+
+        errors = [tc.error for tc in result.workspace.tool_calls]
+        assert errors[0] and "TimeoutError" in errors[0]
@@ -0,0 +1,109 @@
+"""Tests SectionIndexStore — index find_in persistant (TF-IDF + embeddings mmap)."""
+from __future__ import annotations
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from knowbase.runtime_v5.section_index import SectionIndexStore
+from knowbase.runtime_v5.structure_loader import load_structure
+
+
+def _write_structure(base, doc_id="doc_a", extra_text=""):
+    data = {
+        "doc_id": doc_id,
+        "n_pages": 2,
+        "sections": [
+            {"section_id": "s1", "level": 1, "numbering": "1", "title": "Scope",
+             "text": "This regulation covers engine maintenance" + extra_text,
+             "section_path": "/1"},
+            {"section_id": "s2", "level": 1, "numbering": "2", "title": "",
+             "text": "", "section_path": "/2"},
+            {"section_id": "s3", "level": 1, "numbering": "3", "title": "Fuel",
+             "text": "Fuel tank inspection intervals", "section_path": "/3"},
+        ],
+        "root_section_ids": ["s1", "s2", "s3"],
+    }
+    (base / f"{doc_id}.json").write_text(json.dumps(data), encoding="utf-8")
+    return load_structure(doc_id, base)
+
+
+class _CountingEncoder:
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.n_texts = 0
+
+    def __call__(self, texts):
+        self.n_texts += len(texts)
+        rng = np.random.default_rng(len(texts))
+        v = rng.normal(size=(len(texts), self.dim)).astype(np.float32)
+        return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+def test_build_persists_and_cold_store_loads_without_encoding(tmp_path):
+    struct = _write_structure(tmp_path)
+    encoder = _CountingEncoder()
+    SectionIndexStore(structures_dir=tmp_path, encoder=encoder).build("doc_a", struct)
+    assert encoder.n_texts == 2  # section vide ignorée
+
+    index_dir = tmp_path / "_section_index" / "doc_a"
+    assert {"meta.json", "tfidf.pkl", "tfidf.npz", "emb.f16.npy"} <= set(os.listdir(index_dir))
+
+    cold_encoder = _CountingEncoder()
+    cold = SectionIndexStore(structures_dir=tmp_path, encoder=cold_encoder)
+    vectorizer, matrix, indices = cold.get_tfidf("doc_a", struct)
+    embeddings, emb_indices = cold.get_embeddings("doc_a", struct)
+
+    assert indices == emb_indices == [0, 2]
+    assert matrix.shape[0] == 2
+    assert isinstance(embeddings, np.memmap)
+    assert embeddings.dtype == np.float16
+    assert cold_encoder.n_texts == 0
+    assert cold.stats()["builds"] == 0
+
+
+def test_structure_change_invalidates_index(tmp_path):
+    struct = _write_structure(tmp_path)
+    store = SectionIndexStore(structures_dir=tmp_path, encoder=_CountingEncoder())
+    store.get("doc_a", struct)
+    assert store.stats()["builds"] == 1
+
+    st = os.stat(tmp_path / "doc_a.json")
+    struct = _write_structure(tmp_path, extra_text=" and propellers")
+    os.utime(tmp_path / "doc_a.json", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    vectorizer, _, _ = store.get_tfidf("doc_a", struct)
+
+    assert store.stats()["builds"] == 2
+    assert "propellers" in vectorizer.vocabulary_
+
+
+def test_lru_is_bounded(tmp_path):
+    store = SectionIndexStore(structures_dir=tmp_path, max_docs=2, encoder=_CountingEncoder())
+    for doc_id in ("d1", "d2", "d3"):
+        store.get(doc_id, _write_structure(tmp_path, doc_id=doc_id))
+    assert store.stats()["cached_docs"] == 2
+
+
+def test_embeddings_added_lazily_to_tfidf_only_index(tmp_path):
+    struct = _write_structure(tmp_path)
+    encoder = _CountingEncoder()
+    store = SectionIndexStore(structures_dir=tmp_path, encoder=encoder)
+    store.get("doc_a", struct)
+    assert encoder.n_texts == 0
+
+    embeddings, indices = store.get_embeddings("doc_a", struct)
+    assert embeddings.shape == (2, 8)
+    meta = json.loads((tmp_path / "_section_index" / "doc_a" / "meta.json").read_text())
+    assert meta["has_embeddings"] is True
+
+
+def test_encoder_failure_falls_back_to_tfidf(tmp_path):
+    def _broken(texts):
+        raise RuntimeError("no GPU")
+
+    struct = _write_structure(tmp_path)
+    store = SectionIndexStore(structures_dir=tmp_path, encoder=_broken)
+    assert store.get_embeddings("doc_a", struct) == (None, [])
+    assert store.get_tfidf("doc_a", struct)[0] is not None
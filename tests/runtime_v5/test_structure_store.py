@@ -0,0 +1,130 @@
+"""Tests StructureStore — LRU de structures parsées, index de paths, forme compacte .v5s."""
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+from knowbase.runtime_v5.structure_loader import (
+    DocumentStructure,
+    LazySection,
+    StructureStore,
+    compact_structure_path,
+    list_available_doc_ids,
+    write_compact_structure,
+)
+
+
+def _data(doc_id="doc_a", title="Scope"):
+    return {
+        "doc_id": doc_id,
+        "n_pages": 3,
+        "sections": [
+            {"section_id": "s1", "level": 1, "numbering": "I", "title": "Chapter I",
+             "text": "Intro", "section_path": "/CHAPTER I"},
+            {"section_id": "s2", "level": 2, "numbering": "5", "title": title,
+             "text": "Engine maintenance — révision", "section_path": "/CHAPTER I/Article 5"},
+            {"section_id": "s3", "level": 2, "numbering": "15", "title": "Fuel",
+             "text": "", "section_path": "/CHAPTER II/Article 15"},
+            {"section_id": "s4", "level": 2, "numbering": "5", "title": "Other",
+             "section_path": "/CHAPTER II/Article 5"},
+        ],
+        "root_section_ids": ["s1"],
+    }
+
+
+def _write(base, data):
+    (base / f"{data['doc_id']}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def _scan_find_by_path(struct, section_path):
+    """Implémentation de référence (double scan d'origine)."""
+    path_clean = section_path.strip().rstrip("/").lower()
+    if not path_clean.startswith("/"):
+        path_clean = "/" + path_clean
+    for s in struct.sections:
+        if (s.get("section_path") or "").lower() == path_clean:
+            return s
+    for s in struct.sections:
+        sp = (s.get("section_path") or "").lower()
+        if sp.endswith(path_clean) or sp.endswith(path_clean.lstrip("/")):
+            return s
+    return None
+
+
+@pytest.mark.parametrize("query", [
+    "/CHAPTER I/Article 5", "Article 5", "/article 5/", "icle 5", "5",
+    "Article 15", "/CHAPTER II", "chapter i", "/", "nope",
+])
+def test_find_by_path_matches_scan(query):
+    struct = DocumentStructure(_data())
+    assert struct.find_by_path(query) is _scan_find_by_path(struct, query)
+
+
+def test_store_caches_and_revalidates_on_change(tmp_path):
+    _write(tmp_path, _data())
+    store = StructureStore(compact=False)
+    first = store.get("doc_a", tmp_path)
+    assert store.get("doc_a", tmp_path) is first
+    assert store.stats()["json_loads"] == 1
+    assert store.stats()["hits"] == 1
+
+    st = os.stat(tmp_path / "doc_a.json")
+    _write(tmp_path, _data(title="Scope v2"))
+    os.utime(tmp_path / "doc_a.json", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    second = store.get("doc_a", tmp_path)
+    assert second is not first
+    assert second.by_id["s2"]["title"] == "Scope v2"
+
+    os.remove(tmp_path / "doc_a.json")
+    assert store.get("doc_a", tmp_path) is None
+    assert store.stats()["cached_docs"] == 0
+
+
+def test_store_lru_is_bounded(tmp_path):
+    store = StructureStore(max_docs=2, compact=False)
+    for doc_id in ("d1", "d2", "d3"):
+        _write(tmp_path, _data(doc_id=doc_id))
+        store.get(doc_id, tmp_path)
+    assert store.stats()["cached_docs"] == 2
+
+
+def test_compact_form_reads_text_lazily(tmp_path):
+    _write(tmp_path, _data())
+    write_compact_structure(_data(), tmp_path)
+    assert list_available_doc_ids(tmp_path) == ["doc_a"]
+
+    store = StructureStore(compact=False)
+    struct = store.get("doc_a", tmp_path)
+    assert store.stats()["compact_loads"] == 1
+    assert store.stats()["json_loads"] == 0
+
+    s2 = struct.by_id["s2"]
+    assert isinstance(s2, LazySection)
+    assert "text" in s2
+    assert s2.get("text") == "Engine maintenance — révision"
+    assert struct.by_id["s3"]["text"] == ""
+    # Section sans champ text dans le JSON : reste absente
+    assert struct.by_id["s4"].get("text") is None
+    assert "text" not in struct.by_id["s4"]
+    assert struct.by_id["s1"].materialize() == _data()["sections"][0]
+
+
+def test_stale_compact_form_falls_back_to_json(tmp_path):
+    _write(tmp_path, _data())
+    write_compact_structure(_data(), tmp_path)
+    st = os.stat(tmp_path / "doc_a.json")
+    _write(tmp_path, _data(title="Scope v2"))
+    os.utime(tmp_path / "doc_a.json", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    store = StructureStore(compact=True)
+    struct = store.get("doc_a", tmp_path)
+    assert struct.by_id["s2"]["title"] == "Scope v2"
+    assert store.stats()["json_loads"] == 1
+
+    # compact=True a réécrit un .v5s à jour
+    fresh = StructureStore(compact=False)
+    assert fresh.get("doc_a", tmp_path).by_id["s2"]["title"] == "Scope v2"
+    assert fresh.stats()["compact_loads"] == 1
+    assert compact_structure_path("doc_a", tmp_path).exists()
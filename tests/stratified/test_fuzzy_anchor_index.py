@@ -0,0 +1,131 @@
+"""
+Tests FuzzyAnchorIndex - shortlist sans perte du fallback fuzzy Pass 1.3b.
+
+Vérifie l'égalité stricte avec le scan SequenceMatcher complet d'origine
+(mêmes ancrages, même départage, mêmes seuils).
+"""
+
+import random
+from difflib import SequenceMatcher
+
+from knowbase.stratified.models import AssertionType, DocItem, DocItemType
+from knowbase.stratified.pass1 import AnchorResolverV2, RawAssertion, build_chunk_to_docitem_mapping
+from knowbase.stratified.pass1.fuzzy_anchor_index import FuzzyAnchorIndex
+
+
+WORDS = "sap hana fiori cloud data role user access must the of and is".split()
+
+
+def _docitems(texts):
+    return {
+        f"docitem_{n}": DocItem(
+            docitem_id=f"docitem_{n}", type=DocItemType.PARAGRAPH, text=text,
+            char_start=0, char_end=len(text), order=n, section_id="s1",
+        )
+        for n, text in enumerate(texts)
+    }
+
+
+def _random_corpus(seed, n_items=80):
+    rng = random.Random(seed)
+    texts = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 12))) for _ in range(n_items)]
+    queries = []
+    for _ in range(60):
+        base = list(rng.choice(texts))
+        for i in range(len(base)):
+            if rng.random() < 0.08:
+                base[i] = rng.choice("abcdefghij ")
+        queries.append("".join(base))
+        queries.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 10))))
+    return texts, queries
+
+
+def _brute_best(texts, query, threshold):
+    best_n, best = None, 0
+    for n, text in enumerate(texts):
+        score = SequenceMatcher(None, query, text).ratio()
+        if score > best:
+            best, best_n = score, n
+    return (f"docitem_{best_n}" if best >= threshold and best_n is not None else None)
+
+
+class TestFuzzyAnchorIndex:
+
+    def test_best_match_equals_full_scan(self):
+        for seed in range(3):
+            texts, queries = _random_corpus(seed)
+            index = FuzzyAnchorIndex(_docitems(texts))
+            for query in queries:
+                assert index.best_match(query, 0.85)[0] == _brute_best(texts, query, 0.85)
+
+    def test_ties_resolved_by_docitem_order(self):
+        index = FuzzyAnchorIndex(_docitems(["abcd", "zzzz", "abce", "abcd"]))
+        assert index.best_match("abcx", 0.7) == ("docitem_0", 0.75)
+
+    def test_matches_above_is_strict(self):
+        texts, queries = _random_corpus(7)
+        index = FuzzyAnchorIndex(_docitems(texts))
+        for query in queries:
+            expected = {
+                f"docitem_{n}" for n, text in enumerate(texts)
+                if SequenceMatcher(None, query, text).ratio() > 0.8
+            }
+            assert index.matches_above(query, 0.8) == expected
+        assert FuzzyAnchorIndex(_docitems(["abcd"])).matches_above("abcd", 1.0) == set()
+
+    def test_first_containing_uses_normalized_whitespace(self):
+        index = FuzzyAnchorIndex(_docitems(["alpha beta", "gamma   delta\nepsilon"]))
+        assert index.first_containing("delta epsilon") == "docitem_1"
+        assert index.first_containing("beta") == "docitem_0"
+        assert index.first_containing("omega") is None
+
+
+class TestAnchorResolverWithIndex:
+
+    def test_text_search_anchors_unchanged(self):
+        texts, queries = _random_corpus(11, n_items=40)
+        docitems = _docitems(texts)
+        resolver = AnchorResolverV2()
+        resolver.set_context({}, docitems, {})
+
+        for n, query in enumerate(queries):
+            assertion = RawAssertion(
+                assertion_id=f"a{n}", text=query, assertion_type=AssertionType.FACTUAL,
+                chunk_id="unmapped", start_char=0, end_char=len(query), confidence=0.9,
+            )
+            result = resolver.resolve_single(assertion)
+
+            expected = None
+            for docitem_id, docitem in docitems.items():
+                span = resolver._find_span_in_docitem(query, docitem)
+                if span:
+                    expected = (docitem_id, span)
+                    break
+            if expected is None:
+                best = _brute_best(texts, query, resolver.FUZZY_THRESHOLD)
+                if best:
+                    expected = (best, (0, min(len(query), len(docitems[best].text))))
+
+            got = (result.anchor.docitem_id, (result.anchor.span_start, result.anchor.span_end)) \
+                if result.success else None
+            assert got == expected
+
+    def test_chunk_mapping_unchanged(self):
+        texts, queries = _random_corpus(3, n_items=40)
+        docitems = _docitems(texts)
+        chunks = {f"chunk_{n}": q for n, q in enumerate(queries[:40])}
+        chunks["chunk_docitem_5_0"] = "unrelated"
+
+        expected = {}
+        for chunk_id, chunk_text in chunks.items():
+            found = []
+            for docitem_id, docitem in docitems.items():
+                if docitem_id in chunk_id:
+                    found.append(docitem_id)
+                elif chunk_text in docitem.text or docitem.text in chunk_text:
+                    found.append(docitem_id)
+                elif SequenceMatcher(None, chunk_text, docitem.text).ratio() > 0.8:
+                    found.append(docitem_id)
+            expected[chunk_id] = found
+
+        assert build_chunk_to_docitem_mapping(chunks, docitems) == expected
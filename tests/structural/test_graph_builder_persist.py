@@ -0,0 +1,162 @@
+"""
+Tests for OSMOSE Structural Graph - Persistance Neo4j (UNWIND)
+
+Vérifie le découpage en transactions/statements UNWIND et le props_hash
+qui rend la re-persistance idempotente. Neo4j est remplacé par une session
+qui enregistre les statements exécutés.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from knowbase.structural import graph_builder
+from knowbase.structural.graph_builder import StructuralGraphBuilder, StructuralGraphBuildResult
+from knowbase.structural.models import (
+    DocItem,
+    DocItemType,
+    DocumentVersion,
+    PageContext,
+    SectionInfo,
+)
+from knowbase.structural.type_aware_chunker import TypeAwareChunker
+
+
+def make_result(n_items=20, n_pages=4, created_at=None):
+    created_at = created_at or datetime(2026, 1, 1)
+    version = DocumentVersion(tenant_id="t", doc_id="d", doc_version_id="v1:abc", ingested_at=created_at)
+    sections = [
+        SectionInfo(section_id="s0", doc_id="d", doc_version_id="v1:abc", tenant_id="t", section_path="A"),
+        SectionInfo(
+            section_id="s1", doc_id="d", doc_version_id="v1:abc", tenant_id="t",
+            section_path="A / B", section_level=2, parent_section_id="s0",
+        ),
+    ]
+    items = [
+        DocItem(
+            tenant_id="t", doc_id="d", doc_version_id="v1:abc",
+            item_id=f"i{n}", item_type=DocItemType.TABLE if n % 5 == 4 else DocItemType.TEXT,
+            text=f"Paragraph {n}.", page_no=n % n_pages + 1, reading_order_index=n,
+            section_id=sections[n % 2].section_id, created_at=created_at,
+        )
+        for n in range(n_items)
+    ]
+    pages = [
+        PageContext(tenant_id="t", doc_id="d", doc_version_id="v1:abc", page_no=p, page_width=612.0, page_height=792.0)
+        for p in range(1, n_pages + 1)
+    ]
+    chunks = TypeAwareChunker(tenant_id="t", doc_id="d", doc_version_id="v1:abc").create_chunks(items, sections)
+    for chunk in chunks:
+        chunk.created_at = created_at
+    return StructuralGraphBuildResult(
+        doc_items=items, sections=sections, chunks=chunks,
+        doc_version=version, page_contexts=pages, doc_dict={},
+    )
+
+
+class RecordingTx:
+    def __init__(self, log):
+        self.log = log
+
+    def run(self, query, params=None):
+        self.log.append((query, params or {}))
+        return self
+
+    def single(self):
+        return {"written": 0}
+
+    def consume(self):
+        return None
+
+
+class RecordingSession(RecordingTx):
+    def __init__(self, log, transactions):
+        super().__init__(log)
+        self.transactions = transactions
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn, *args):
+        self.transactions.append(fn.__name__)
+        return fn(RecordingTx(self.log), *args)
+
+
+class RecordingClient:
+    def __init__(self):
+        self.log = []
+        self.transactions = []
+        self.driver = self
+
+    def is_connected(self):
+        return True
+
+    def session(self, database=None):
+        return RecordingSession(self.log, self.transactions)
+
+
+@pytest.fixture(autouse=True)
+def legacy_pipeline(monkeypatch):
+    monkeypatch.setattr(graph_builder, "is_feature_enabled", lambda name: False)
+    monkeypatch.setattr(graph_builder, "_constraints_ensured", False)
+
+
+class TestPersistPlan:
+
+    def test_one_unwind_statement_per_node_type_and_batch(self, monkeypatch):
+        monkeypatch.setattr(graph_builder, "STRUCTURAL_PERSIST_BATCH_SIZE", 8)
+        result = make_result(n_items=20)
+
+        plan = StructuralGraphBuilder()._persist_plan(result, use_stratified_v2=False)
+
+        # version+pages+sections, 3 batches DocItems, 1 batch chunks
+        assert [len(statements) for statements in plan] == [3, 1, 1, 1, 1]
+        assert sum(len(params["rows"]) for q, params in plan[0][1:2]) == 4
+        assert [len(plan[i][0][1]["rows"]) for i in (1, 2, 3)] == [8, 8, 4]
+        assert all("UNWIND $rows" in query for statements in plan[1:] for query, _ in statements)
+        assert plan[4][0][1]["rows"][0]["item_ids"]
+
+    def test_stratified_v2_creates_document_without_pages(self):
+        plan = StructuralGraphBuilder()._persist_plan(make_result(), use_stratified_v2=True)
+
+        queries = [query for query, _ in plan[0]]
+        assert "MERGE (d:Document" in queries[0]
+        assert not any("PageContext {" in q and "MERGE (p" in q for q in queries)
+
+    def test_props_hash_ignores_timestamps(self):
+        first = make_result(created_at=datetime(2026, 1, 1))
+        second = make_result(created_at=datetime(2026, 1, 1) + timedelta(days=3))
+        plan_a = StructuralGraphBuilder()._persist_plan(first, use_stratified_v2=False)
+        plan_b = StructuralGraphBuilder()._persist_plan(second, use_stratified_v2=False)
+
+        hashes = lambda plan: [
+            row["props_hash"]
+            for statements in plan for _, params in statements for row in params.get("rows", [])
+        ]
+        assert hashes(plan_a) == hashes(plan_b)
+        assert plan_a[0][0][1]["props_hash"] == plan_b[0][0][1]["props_hash"]
+
+        second.doc_items[3].text = "Edited."
+        changed = hashes(StructuralGraphBuilder()._persist_plan(second, use_stratified_v2=False))
+        assert sum(a != b for a, b in zip(hashes(plan_a), changed)) >= 1
+
+
+class TestPersistSync:
+
+    def test_persist_uses_few_statements_and_ensures_constraints_once(self, monkeypatch):
+        monkeypatch.setattr(graph_builder, "STRUCTURAL_PERSIST_BATCH_SIZE", 500)
+        client = RecordingClient()
+        result = make_result(n_items=1200, n_pages=30)
+
+        stats = StructuralGraphBuilder().persist_to_neo4j_sync(result, neo4j_client=client)
+        constraint_runs = [q for q, _ in client.log if "CREATE CONSTRAINT" in q]
+
+        assert stats["transactions"] == len(client.transactions) == 1 + 3 + 1
+        assert stats["statements"] == len(client.log) - len(constraint_runs) == 3 + 3 + 1
+        assert len(constraint_runs) == len(graph_builder._PERSIST_CONSTRAINTS)
+
+        StructuralGraphBuilder().persist_to_neo4j_sync(result, neo4j_client=client)
+        assert len([q for q, _ in client.log if "CREATE CONSTRAINT" in q]) == len(constraint_runs)
@@ -188,6 +188,37 @@ class TestTypeAwareChunker:
         assert chunks[0].kind == ChunkKind.FIGURE_TEXT
         assert chunks[0].text == ""  # Texte vide OK
 
+    def test_chunk_ids_are_deterministic(self):
+        """Même version + mêmes items → mêmes chunk_ids (persistance idempotente)."""
+        items = [
+            DocItem(
+                tenant_id="t", doc_id="d", doc_version_id="v",
+                item_id="t1", item_type=DocItemType.TEXT,
+                text="Paragraph.", page_no=1, reading_order_index=0, section_id="sec1",
+            ),
+            DocItem(
+                tenant_id="t", doc_id="d", doc_version_id="v",
+                item_id="tab1", item_type=DocItemType.TABLE,
+                text="| A |", page_no=1, reading_order_index=1, section_id="sec1",
+            ),
+        ]
+        sections = [
+            SectionInfo(
+                section_id="sec1", doc_id="d", doc_version_id="v", tenant_id="t",
+                section_path="root", section_level=0,
+                structural_profile=StructuralProfile.from_items(items),
+            )
+        ]
+
+        first = TypeAwareChunker(tenant_id="t", doc_id="d", doc_version_id="v").create_chunks(items, sections)
+        second = TypeAwareChunker(tenant_id="t", doc_id="d", doc_version_id="v").create_chunks(items, sections)
+        other = TypeAwareChunker(tenant_id="t", doc_id="d", doc_version_id="v2").create_chunks(items, sections)
+
+        ids = [c.chunk_id for c in first]
+        assert len(set(ids)) == 2
+        assert ids == [c.chunk_id for c in second]
+        assert not set(ids) & {c.chunk_id for c in other}
+
     def test_large_text_split(self):
         """Grand texte → split en plusieurs chunks."""
         # Créer items avec beaucoup de texte
@@ -0,0 +1,109 @@
+"""
+Tests AtlasViewStore - vues Atlas matérialisées (stale-while-revalidate).
+
+Tests:
+- Premier accès calculé puis servi depuis le snapshot
+- Invalidation par version : snapshot servi stale + un seul recalcul
+- Vue inexistante (domaine inconnu) non matérialisée
+- Sans Redis : calcul direct
+"""
+
+from knowbase.wiki.atlas_views import HOME_VIEW, AtlasViewStore, domain_view
+
+
+class _KVRedis:
+    """Sous-ensemble redis-py (decode_responses=True) utilisé par le store."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def _counting_compute(calls):
+    def compute(tenant_id, view):
+        calls.append((tenant_id, view))
+        if view == domain_view("unknown"):
+            return None
+        return {"view": view, "n": len(calls)}
+    return compute
+
+
+class TestAtlasViewStore:
+
+    def test_miss_then_hit(self):
+        calls = []
+        store = AtlasViewStore(compute=_counting_compute(calls), redis_client=_KVRedis())
+
+        first = store.get("t1", HOME_VIEW)
+        second = store.get("t1", HOME_VIEW)
+
+        assert first.payload == second.payload == {"view": "home", "n": 1}
+        assert not second.stale and second.version == 0
+        assert len(calls) == 1
+        assert store.stats()["hits"] == 1
+
+    def test_invalidation_serves_stale_and_revalidates_once(self):
+        calls, spawned = [], []
+        store = AtlasViewStore(
+            compute=_counting_compute(calls), redis_client=_KVRedis(), spawn=spawned.append,
+        )
+        store.get("t1", HOME_VIEW)
+        assert store.invalidate("t1", "wiki save") == 1
+
+        stale = store.get("t1", HOME_VIEW)
+        again = store.get("t1", HOME_VIEW)
+        assert stale.stale and stale.payload["n"] == 1
+        assert again.stale
+        assert len(spawned) == 1  # verrou : un seul recalcul en vol
+
+        spawned[0]()
+        fresh = store.get("t1", HOME_VIEW)
+        assert not fresh.stale and fresh.version == 1 and fresh.payload["n"] == 2
+        # Autre tenant non impacté
+        assert store.get("t2", HOME_VIEW).version == 0
+
+    def test_max_age_triggers_revalidation(self):
+        calls, spawned = [], []
+        store = AtlasViewStore(
+            compute=_counting_compute(calls), redis_client=_KVRedis(),
+            max_age_s=0.0, spawn=spawned.append,
+        )
+        store.get("t1", HOME_VIEW)
+        assert store.get("t1", HOME_VIEW).stale
+        assert len(spawned) == 1
+
+    def test_unknown_domain_not_materialized(self):
+        calls = []
+        redis = _KVRedis()
+        store = AtlasViewStore(compute=_counting_compute(calls), redis_client=redis)
+
+        assert store.get("t1", domain_view("unknown")) is None
+        assert store.get("t1", domain_view("unknown")) is None
+        assert len(calls) == 2
+        assert not any(":view:" in k for k in redis.data)
+
+    def test_without_redis_computes_each_time(self):
+        calls = []
+        store = AtlasViewStore(compute=_counting_compute(calls))
+        store._redis_resolved = True  # pas de Redis
+
+        assert store.get("t1", HOME_VIEW).version is None
+        store.get("t1", HOME_VIEW)
+        assert len(calls) == 2
+        assert store.invalidate("t1") is None
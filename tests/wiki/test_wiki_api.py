@@ -38,6 +38,7 @@ _fa = sys.modules["fastapi"]
 _fa.APIRouter = lambda **kw: type("_R", (), {
     "post": lambda self=None, *a, **k: (lambda f: f),
     "get": lambda self=None, *a, **k: (lambda f: f),
+    "delete": lambda self=None, *a, **k: (lambda f: f),
 })()
 _fa.BackgroundTasks = MagicMock
 _fa.Depends = lambda x: x
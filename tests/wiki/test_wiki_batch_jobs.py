@@ -0,0 +1,376 @@
+"""
+Tests génération wiki batch — file Redis, lanes RQ bornées, reprise, prefetch.
+
+Tests:
+- Compteurs O(1) et clôture unique du batch
+- Concurrence bornée par tenant
+- Reprise des items d'une lane morte (restart worker)
+- Suspension vLLM puis reprise
+- Lane RQ de bout en bout (pipeline mocké), bornée en items par job
+- EvidencePackBuilder servi par le WikiBatchPrefetch
+"""
+
+from contextlib import nullcontext
+from unittest.mock import MagicMock
+
+import pytest
+
+from knowbase.common.llm_router import VLLMUnavailableError
+from knowbase.wiki import batch_jobs, jobs
+from knowbase.wiki.batch_jobs import WikiBatchStore
+from knowbase.wiki.batch_prefetch import WikiBatchPrefetch
+from knowbase.wiki.evidence_pack_builder import EvidencePackBuilder
+from knowbase.wiki.models import EvidenceUnit, ResolvedConcept
+
+
+class _DictRedis:
+    """Sous-ensemble redis-py (decode_responses=True) utilisé par le store."""
+
+    def __init__(self):
+        self.strings, self.hashes, self.lists, self.sets = {}, {}, {}, {}
+
+    def lock(self, name, timeout=None, blocking_timeout=None):
+        return nullcontext()
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def set(self, key, value, ex=None):
+        self.strings[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            for store in (self.strings, self.hashes, self.lists, self.sets):
+                store.pop(key, None)
+
+    def expire(self, key, ttl):
+        return True
+
+    def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hvals(self, key):
+        return list(self.hashes.get(key, {}).values())
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        entry = self.hashes.setdefault(key, {})
+        for k, v in (mapping or {field: value}).items():
+            entry[k] = str(v)
+
+    def hsetnx(self, key, field, value):
+        entry = self.hashes.setdefault(key, {})
+        if field in entry:
+            return False
+        entry[field] = str(value)
+        return True
+
+    def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    def hexists(self, key, field):
+        return field in self.hashes.get(key, {})
+
+    def hlen(self, key):
+        return len(self.hashes.get(key, {}))
+
+    def hincrby(self, key, field, amount):
+        entry = self.hashes.setdefault(key, {})
+        entry[field] = str(int(entry.get(field, 0)) + amount)
+        return int(entry[field])
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def lpush(self, key, *values):
+        for v in values:
+            self.lists.setdefault(key, []).insert(0, v)
+
+    def lpop(self, key):
+        values = self.lists.get(key)
+        return values.pop(0) if values else None
+
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def lrange(self, key, start, end):
+        values = self.lists.get(key, [])
+        return list(values[start:] if end == -1 else values[start:end + 1])
+
+    def lrem(self, key, count, value):
+        values = self.lists.get(key, [])
+        if value in values:
+            values.remove(value)
+            return 1
+        return 0
+
+    def sadd(self, key, *values):
+        self.sets.setdefault(key, set()).update(values)
+
+    def srem(self, key, *values):
+        self.sets.get(key, set()).difference_update(values)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+
+ITEMS = [
+    {"concept_name": "GDPR", "entity_type": "regulation", "importance_tier": 1, "entity_id": "e1"},
+    {"concept_name": "DPO", "entity_type": "actor", "importance_tier": 2, "entity_id": "e2"},
+    {"concept_name": "DPIA", "entity_type": "concept", "importance_tier": 2, "entity_id": "e3"},
+]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    enqueued = []
+    s = WikiBatchStore(
+        redis_client=_DictRedis(),
+        enqueue=lambda tid, lane_id: enqueued.append((tid, lane_id)),
+        concurrency=2,
+    )
+    s.enqueued = enqueued
+    monkeypatch.setattr(batch_jobs, "_store", s)
+    monkeypatch.setattr(batch_jobs, "_prefetches", batch_jobs.OrderedDict())
+    return s
+
+
+class TestWikiBatchStore:
+
+    def test_counters_and_single_finalization(self, store):
+        batch_id = store.create_batch("t1", "français", ITEMS)
+        lane = store.ensure_lanes("t1")[0]
+        store.start_lane("t1", lane)
+
+        claimed = []
+        while (c := store.claim_next("t1", lane)) is not None:
+            claimed.append(c)
+        assert [c[2]["concept_name"] for c in claimed] == ["GDPR", "DPO", "DPIA"]
+        batch = store.get_batch(batch_id)
+        assert (batch["running"], batch["queued"]) == (3, 0)
+
+        assert store.finish_item("t1", lane, batch_id, 0, "completed", article_slug="gdpr") is None
+        assert store.finish_item("t1", lane, batch_id, 1, "failed", error="boom") is None
+        final = store.finish_item("t1", lane, batch_id, 2, "completed", article_slug="dpia")
+        assert final["status"] == "completed_with_errors"
+        assert (final["completed"], final["failed"], final["running"]) == (2, 1, 0)
+        assert final["jobs"][0]["article_slug"] == "gdpr"
+        # Item déjà terminé : pas de double comptage
+        assert store.finish_item("t1", lane, batch_id, 2, "completed") is None
+        assert store.get_batch(batch_id)["completed"] == 2
+
+    def test_concurrency_bounded_per_tenant(self, store):
+        store.create_batch("t1", "fr", ITEMS)
+        store.create_batch("t1", "fr", ITEMS)
+        assert len(store.ensure_lanes("t1")) == 2
+        assert store.ensure_lanes("t1") == []
+        # Autre tenant : ses propres lanes
+        store.create_batch("t2", "fr", ITEMS[:1])
+        assert len(store.ensure_lanes("t2")) == 1
+        assert len(store.enqueued) == 3
+
+    def test_restart_requeues_items_of_dead_lanes(self, store, monkeypatch):
+        batch_id = store.create_batch("t1", "fr", ITEMS)
+        lane = store.ensure_lanes("t1")[0]
+        monkeypatch.setattr(batch_jobs, "_PROCESS_OWNER", "worker-1:old")
+        store.start_lane("t1", lane)
+        _, idx, item, _ = store.claim_next("t1", lane)
+        store.save_job(jobs.WikiJobState(
+            job_id=item["job_id"], concept_name="GDPR", language="fr",
+            tenant_id="t1", status="running",
+        ))
+
+        # Le worker redémarre : même hostname, nouveau process
+        monkeypatch.setattr(batch_jobs, "_PROCESS_OWNER", "worker-1:new")
+        store.enqueued.clear()
+        spawned = store.ensure_lanes("t1", restarted_host="worker-1")
+
+        # La 2e lane, encore en file RQ, reste vivante : une seule relance
+        assert lane not in spawned and len(spawned) == 1
+        assert store.load_job(item["job_id"]).status == "failed"
+        batch = store.get_batch(batch_id)
+        assert (batch["running"], batch["queued"]) == (0, 3)
+        # Item interrompu repris en premier, par une nouvelle lane
+        new_lane = spawned[0]
+        store.start_lane("t1", new_lane)
+        assert store.claim_next("t1", new_lane)[1] == idx
+        # L'ancienne lane (zombie) ne peut plus clore l'item
+        assert store.finish_item("t1", lane, batch_id, idx, "completed") is None
+
+    def test_suspend_then_resume(self, store):
+        batch_id = store.create_batch("t1", "fr", ITEMS)
+        lane = store.ensure_lanes("t1")[0]
+        store.start_lane("t1", lane)
+        store.claim_next("t1", lane)
+
+        assert store.suspend_batch("t1", batch_id) == 2
+        batch = store.get_batch(batch_id)
+        assert batch["status"] == "suspended"
+        assert [j["status"] for j in batch["jobs"]] == ["running", "cancelled", "cancelled"]
+        assert store.claim_next("t1", lane) is None
+
+        assert store.resume_batch(batch_id) == 2
+        batch = store.get_batch(batch_id)
+        assert (batch["status"], batch["queued"]) == ("running", 2)
+
+
+class TestLane:
+
+    def test_lanes_run_batch_with_shared_prefetch(self, store, monkeypatch):
+        batch_id = store.create_batch("t1", "fr", ITEMS)
+        store.ensure_lanes("t1")
+        prefetch_calls, summaries, seen = [], [], []
+
+        def fake_pipeline(job, prefetch=None, on_update=None):
+            seen.append(prefetch)
+            job.status = "failed" if job.concept_name == "DPO" else "completed"
+            job.error = "introuvable" if job.status == "failed" else None
+            job.article_slug = job.concept_name.lower()
+            on_update(job)
+
+        monkeypatch.setattr(jobs, "run_wiki_pipeline", fake_pipeline)
+        monkeypatch.setattr(jobs, "regenerate_corpus_summary", summaries.append)
+        monkeypatch.setattr(
+            batch_jobs, "_load_prefetch",
+            lambda s, tid, bid: prefetch_calls.append(bid) or "PREFETCH",
+        )
+
+        # Worker RQ simulé : chaque job traite un item puis la lane est relancée
+        runs = []
+        while store.enqueued:
+            tid, lane = store.enqueued.pop(0)
+            runs.append(batch_jobs.run_wiki_batch_lane(tid, lane))
+
+        assert [sum(r.values()) for r in runs] == [1, 1, 1, 0]
+        assert sum(r["completed"] for r in runs) == 2
+        assert prefetch_calls == [batch_id] and seen == ["PREFETCH"] * 3
+        assert summaries == ["t1"]
+        batch = store.get_batch(batch_id)
+        assert batch["status"] == "completed_with_errors"
+        job = store.load_job(batch["jobs"][0]["job_id"])
+        assert (job.status, job.article_slug) == ("completed", "gdpr")
+        # Lanes libérées, prefetch du batch clos oublié
+        assert store._r().hlen(store._lanes_key("t1")) == 0
+        assert store.tenants() == []
+        assert batch_id not in batch_jobs._prefetches
+
+    def test_lane_job_is_bounded_and_relaunched(self, store, monkeypatch):
+        store.create_batch("t1", "fr", ITEMS)
+        lane = store.ensure_lanes("t1")[0]
+        store.enqueued.clear()
+
+        def fake_pipeline(job, prefetch=None, on_update=None):
+            job.status = "completed"
+
+        monkeypatch.setattr(jobs, "run_wiki_pipeline", fake_pipeline)
+        monkeypatch.setattr(batch_jobs, "_load_prefetch", lambda *a: None)
+
+        assert batch_jobs.run_wiki_batch_lane("t1", lane, max_items=2) == {"completed": 2, "failed": 0}
+        assert store._r().llen(store._pending_key("t1")) == 1
+        # La lane est rendue et une nouvelle est mise en file pour l'item restant
+        assert not store._r().hexists(store._lanes_key("t1"), lane)
+        assert len(store.enqueued) == 1 and store.enqueued[0][1] != lane
+
+    def test_vllm_down_suspends_batch(self, store, monkeypatch):
+        batch_id = store.create_batch("t1", "fr", ITEMS)
+        lane = store.ensure_lanes("t1")[0]
+
+        def fake_pipeline(job, prefetch=None, on_update=None):
+            raise VLLMUnavailableError("down")
+
+        monkeypatch.setattr(jobs, "run_wiki_pipeline", fake_pipeline)
+        monkeypatch.setattr(batch_jobs, "_load_prefetch", lambda *a: None)
+
+        assert batch_jobs.run_wiki_batch_lane("t1", lane) == {"completed": 0, "failed": 1}
+        batch = store.get_batch(batch_id)
+        assert batch["status"] == "suspended"
+        assert [j["status"] for j in batch["jobs"]] == ["failed", "cancelled", "cancelled"]
+        assert batch["jobs"][0]["error"] == "vLLM indisponible"
+
+    def test_removed_lane_exits_without_work(self, store):
+        store.create_batch("t1", "fr", ITEMS)
+        assert batch_jobs.run_wiki_batch_lane("t1", "unknown") == {"completed": 0, "failed": 0}
+        assert store._r().llen(store._pending_key("t1")) == 3
+
+
+# ── Prefetch ─────────────────────────────────────────────────────────────
+
+
+class _Session:
+    def __init__(self, results):
+        self.results = results
+        self.queries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.queries.append((query, params))
+        return self.results.pop(0) if self.results else []
+
+
+def _driver(*results):
+    session = _Session(list(results))
+    driver = MagicMock()
+    driver.session.return_value = session
+    return driver, session
+
+
+class TestPrefetch:
+
+    def test_load_groups_related_by_entity(self):
+        driver, session = _driver(
+            [{"doc_id": "d1", "document_type": "regulation", "temporal_scope": "2024",
+              "primary_subject": "Règlement"}],
+            [{"eid": "e1", "name": "DPO", "etype": "actor", "co_count": 4, "claim_ids": ["c1"]}],
+        )
+        scorer = MagicMock()
+        scorer.score_all_concepts.return_value = [MagicMock(entity_name="GDPR")]
+
+        prefetch = WikiBatchPrefetch.load(driver, "t1", ["e1", "e2", "e1"], scorer=scorer)
+
+        assert len(session.queries) == 2
+        assert session.queries[1][1]["entity_ids"] == ["e1", "e2"]
+        assert prefetch.doc_contexts["d1"]["primary_subject"] == "Règlement"
+        assert prefetch.related_rows(["e1"])[0]["co_count"] == 4
+        assert prefetch.related_rows(["e2"]) == []
+        assert prefetch.related_rows(["e1", "e2"]) is None
+        assert set(prefetch.scored_map) == {"gdpr"}
+
+    def test_builder_reads_prefetch_and_falls_back(self):
+        prefetch = WikiBatchPrefetch(
+            tenant_id="t1",
+            doc_contexts={"d1": {"document_type": "regulation", "temporal_scope": "2024",
+                                 "primary_subject": "Règlement"}},
+            related_by_entity={"e1": [{"name": "DPO", "etype": None, "co_count": 2,
+                                       "claim_ids": ["c1", "c9"]}]},
+        )
+        driver, session = _driver(
+            [{"doc_id": "d2", "document_type": None, "temporal_scope": None,
+              "primary_subject": "Guide"}],
+        )
+        builder = EvidencePackBuilder(driver, None, None, prefetch=prefetch)
+
+        scope = builder._load_scope_cache(["d1"], "t1")
+        assert scope["d1"].temporal_scope_kind == "versioned"
+        assert builder._load_doc_titles(["d1"], "t1") == {"d1": "Règlement"}
+        assert session.queries == []
+
+        # Doc absent du snapshot : requête unitaire limitée aux absents
+        assert builder._load_doc_titles(["d1", "d2"], "t1") == {"d1": "Règlement", "d2": "Guide"}
+        assert session.queries[0][1]["doc_ids"] == ["d2"]
+
+        concept = ResolvedConcept(canonical_name="GDPR", entity_type="regulation", entity_ids=["e1"])
+        unit = EvidenceUnit(
+            unit_id="u1", source_type="claim", source_id="c1", text="t",
+            doc_id="d1", doc_title="D1", rhetorical_role="mention",
+        )
+        related = builder._step6_related(concept, "t1", [unit])
+        assert related[0].entity_type == "concept"
+        assert related[0].supporting_unit_ids == ["u1"]
+        assert len(session.queries) == 1